@@ -122,6 +122,7 @@ class Database:
                     artist TEXT,
                     frame_version TEXT,
                     border_color TEXT,
+                    keywords TEXT,
                     FOREIGN KEY (set_code) REFERENCES sets(code)
                 )
             """)
@@ -4,6 +4,7 @@ Repository for MTG card and set data operations.
 
 import logging
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 from decimal import Decimal
 from datetime import datetime
 
@@ -13,6 +14,9 @@ from app.models.ruling import CardRuling, RulingsSummary
 
 logger = logging.getLogger(__name__)
 
+# UUIDs per IN (...) query in batch lookups (stays under SQLite's variable limit)
+UUID_BATCH_SIZE = 500
+
 
 class MTGRepository:
     """
@@ -402,6 +406,57 @@ class MTGRepository:
         
         return self._row_to_card(row, legalities, prices)
 
+    def get_cards_by_uuids(self, uuids: List[str]) -> Dict[str, Card]:
+        """
+        Get full card details for many UUIDs at once.
+        
+        Cards, legalities and prices are each read with one query per batch
+        of UUIDs instead of three queries per card.
+        
+        Args:
+            uuids: Card UUIDs
+            
+        Returns:
+            Card objects by UUID (UUIDs not found are left out)
+        """
+        uuids = list(dict.fromkeys(uuids))
+        cards = {}
+        for start in range(0, len(uuids), UUID_BATCH_SIZE):
+            batch = uuids[start:start + UUID_BATCH_SIZE]
+            placeholders = ', '.join('?' for _ in batch)
+            
+            legalities = defaultdict(dict)
+            cursor = self.db.execute(
+                f"SELECT uuid, format, status FROM card_legalities WHERE uuid IN ({placeholders})",
+                batch
+            )
+            for row in cursor.fetchall():
+                legalities[row['uuid']][row['format']] = row['status']
+            
+            prices = defaultdict(dict)
+            cursor = self.db.execute(f"""
+                SELECT uuid, provider, currency, price
+                FROM card_prices
+                WHERE uuid IN ({placeholders})
+                ORDER BY last_updated DESC
+            """, batch)
+            for row in cursor.fetchall():
+                if row['price']:
+                    key = f"{row['provider']}_{row['currency']}"
+                    prices[row['uuid']][key] = Decimal(str(row['price']))
+            
+            cursor = self.db.execute(f"""
+                SELECT c.*, ci.scryfall_id, ci.multiverse_id, ci.mtgo_id
+                FROM cards c
+                LEFT JOIN card_identifiers ci ON c.uuid = ci.uuid
+                WHERE c.uuid IN ({placeholders})
+            """, batch)
+            for row in cursor.fetchall():
+                cards[row['uuid']] = self._row_to_card(
+                    row, legalities.get(row['uuid'], {}), prices.get(row['uuid'], {})
+                )
+        return cards
+
     def get_card_by_name(self, name: str) -> Optional[Card]:
         """
         Lookup a card by exact name (case-insensitive).
@@ -588,6 +643,9 @@ class MTGRepository:
             text=row['text'],
             oracle_text=row['oracle_text'],
             flavor_text=row['flavor_text'],
+            # Indexes built before the keywords column have none
+            keywords=[k.strip() for k in row['keywords'].split(',')]
+            if 'keywords' in row.keys() and row['keywords'] else None,
             power=row['power'],
             toughness=row['toughness'],
             loyalty=row['loyalty'],
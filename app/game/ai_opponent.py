@@ -15,8 +15,7 @@ Classes:
 Features:
     - Land drop decisions
     - Spell casting priority
-    - Attacker selection
-    - Blocker assignment
+    - Attacker selection and blocker assignment searched by CombatPlanner
     - Mana management
     - Threat assessment
     - Multiple difficulty levels
@@ -34,6 +33,9 @@ from typing import List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+from app.game.combat_planner import CombatPlanner
+from app.game.zones import card_has_type
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,15 +50,8 @@ class ThreatAssessment:
 class AIStrategy(ABC):
     """Base class for AI strategies."""
     
-    @abstractmethod
-    def prioritize_attacks(self, creatures: List) -> List:
-        """Determine which creatures should attack."""
-        pass
-    
-    @abstractmethod
-    def prioritize_blocks(self, blockers: List, attackers: List) -> Dict:
-        """Determine blocking assignments."""
-        pass
+    # How little the combat planner fears the crack-back (0-1)
+    aggression = 0.5
     
     @abstractmethod
     def prioritize_spells(self, hand: List, mana_available: Dict) -> List:
@@ -72,47 +67,7 @@ class AIStrategy(ABC):
 class AggressiveStrategy(AIStrategy):
     """Aggressive strategy - attack frequently, prioritize damage."""
     
-    def prioritize_attacks(self, creatures: List) -> List:
-        """Attack with everything that can attack."""
-        attackers = []
-        
-        for creature in creatures:
-            # Skip defenders
-            if 'defender' in creature.oracle_text.lower():
-                continue
-            
-            # Attack if power > 0
-            if hasattr(creature, 'power') and creature.power > 0:
-                attackers.append(creature)
-        
-        logger.debug(f"Aggressive strategy: attacking with {len(attackers)} creatures")
-        return attackers
-    
-    def prioritize_blocks(self, blockers: List, attackers: List) -> Dict:
-        """Block only the biggest threats."""
-        assignments = {}
-        
-        # Sort attackers by power (descending)
-        sorted_attackers = sorted(
-            attackers,
-            key=lambda a: getattr(a.creature, 'power', 0),
-            reverse=True
-        )
-        
-        # Sort blockers by toughness (descending) - use tough blockers on big attackers
-        sorted_blockers = sorted(
-            blockers,
-            key=lambda b: getattr(b, 'toughness', 0),
-            reverse=True
-        )
-        
-        # Assign blockers to biggest attackers
-        for i, attacker in enumerate(sorted_attackers):
-            if i < len(sorted_blockers):
-                assignments[attacker] = [sorted_blockers[i]]
-        
-        logger.debug(f"Aggressive strategy: blocking {len(assignments)} attackers")
-        return assignments
+    aggression = 0.9
     
     def prioritize_spells(self, hand: List, mana_available: Dict) -> List:
         """Prioritize creatures and damage spells."""
@@ -122,7 +77,7 @@ class AggressiveStrategy(AIStrategy):
             score = 0
             
             # Creatures high priority
-            if 'creature' in card.type_line.lower():
+            if card_has_type(card, 'Creature'):
                 score = 80
                 # Bonus for power
                 if hasattr(card, 'power'):
@@ -166,71 +121,7 @@ class AggressiveStrategy(AIStrategy):
 class ControlStrategy(AIStrategy):
     """Control strategy - defensive, prioritize removal and card advantage."""
     
-    def prioritize_attacks(self, creatures: List) -> List:
-        """Only attack when safe or when it wins the game."""
-        attackers = []
-        
-        # TODO: Implement life total checking for lethal attacks
-        # For now, only attack with flying/unblockable
-        for creature in creatures:
-            text = creature.oracle_text.lower()
-            if 'flying' in text or 'unblockable' in text:
-                attackers.append(creature)
-        
-        logger.debug(f"Control strategy: attacking with {len(attackers)} evasive creatures")
-        return attackers
-    
-    def prioritize_blocks(self, blockers: List, attackers: List) -> Dict:
-        """Block everything possible to prevent damage."""
-        assignments = {}
-        
-        # Sort attackers by power (biggest first)
-        sorted_attackers = sorted(
-            attackers,
-            key=lambda a: getattr(a.creature, 'power', 0),
-            reverse=True
-        )
-        
-        available_blockers = blockers[:]
-        
-        for attacker in sorted_attackers:
-            if not available_blockers:
-                break
-            
-            # Find best blocker (can survive or trade)
-            attacker_power = getattr(attacker.creature, 'power', 0)
-            
-            best_blocker = None
-            best_score = -999
-            
-            for blocker in available_blockers:
-                blocker_toughness = getattr(blocker, 'toughness', 0)
-                blocker_power = getattr(blocker, 'power', 0)
-                attacker_toughness = getattr(attacker.creature, 'toughness', 0)
-                
-                score = 0
-                
-                # Prefer blockers that survive
-                if blocker_toughness > attacker_power:
-                    score += 50
-                
-                # Prefer blockers that kill attacker
-                if blocker_power >= attacker_toughness:
-                    score += 30
-                
-                # Prefer lower-value blockers
-                score -= blocker_power + blocker_toughness
-                
-                if score > best_score:
-                    best_score = score
-                    best_blocker = blocker
-            
-            if best_blocker:
-                assignments[attacker] = [best_blocker]
-                available_blockers.remove(best_blocker)
-        
-        logger.debug(f"Control strategy: blocking {len(assignments)} attackers")
-        return assignments
+    aggression = 0.2
     
     def prioritize_spells(self, hand: List, mana_available: Dict) -> List:
         """Prioritize removal, card draw, counters."""
@@ -253,7 +144,7 @@ class ControlStrategy(AIStrategy):
                 score = 80
             
             # Creatures medium priority
-            elif 'creature' in card.type_line.lower():
+            elif card_has_type(card, 'Creature'):
                 score = 50
             
             # Other spells low priority
@@ -293,50 +184,6 @@ class ControlStrategy(AIStrategy):
 class MidrangeStrategy(AIStrategy):
     """Midrange strategy - balanced approach."""
     
-    def prioritize_attacks(self, creatures: List) -> List:
-        """Attack with creatures that have power >= 2."""
-        attackers = []
-        
-        for creature in creatures:
-            if 'defender' in creature.oracle_text.lower():
-                continue
-            
-            if hasattr(creature, 'power') and creature.power >= 2:
-                attackers.append(creature)
-        
-        logger.debug(f"Midrange strategy: attacking with {len(attackers)} creatures")
-        return attackers
-    
-    def prioritize_blocks(self, blockers: List, attackers: List) -> Dict:
-        """Block favorably - when we can kill attacker or survive."""
-        assignments = {}
-        
-        available_blockers = blockers[:]
-        
-        for attacker in attackers:
-            if not available_blockers:
-                break
-            
-            attacker_power = getattr(attacker.creature, 'power', 0)
-            attacker_toughness = getattr(attacker.creature, 'toughness', 0)
-            
-            # Find blocker that makes favorable trade
-            for blocker in available_blockers:
-                blocker_toughness = getattr(blocker, 'toughness', 0)
-                blocker_power = getattr(blocker, 'power', 0)
-                
-                # Block if we survive and kill attacker
-                survives = blocker_toughness > attacker_power
-                kills = blocker_power >= attacker_toughness
-                
-                if survives and kills:
-                    assignments[attacker] = [blocker]
-                    available_blockers.remove(blocker)
-                    break
-        
-        logger.debug(f"Midrange strategy: blocking {len(assignments)} attackers")
-        return assignments
-    
     def prioritize_spells(self, hand: List, mana_available: Dict) -> List:
         """Balanced spell priority."""
         priority = []
@@ -346,7 +193,7 @@ class MidrangeStrategy(AIStrategy):
             text = card.oracle_text.lower()
             
             # Creatures good priority
-            if 'creature' in card.type_line.lower():
+            if card_has_type(card, 'Creature'):
                 score = 70
                 if hasattr(card, 'power'):
                     score += card.power * 3
@@ -397,6 +244,13 @@ class AIOpponent:
         'midrange': MidrangeStrategy,
     }
     
+    # Combat planner evaluations per decision
+    SEARCH_BUDGETS = {
+        'easy': 500,
+        'normal': 5000,
+        'hard': 20000,
+    }
+    
     def __init__(self, game_engine, player_index: int,
                  strategy: str = 'midrange', difficulty: str = 'normal'):
         """
@@ -426,8 +280,18 @@ class AIOpponent:
         else:  # hard
             self.mistake_chance = 0.0  # No mistakes
         
+        self.combat_planner = CombatPlanner(
+            max_evaluations=self.SEARCH_BUDGETS.get(difficulty, 20000),
+            aggression=self.strategy.aggression
+        )
+        
         logger.info(f"AI opponent initialized: {strategy} strategy, {difficulty} difficulty")
     
+    @property
+    def legal_actions(self):
+        """The game's shared legal action generator."""
+        return self.game_engine.legal_actions
+    
     def should_play_land(self) -> bool:
         """
         Decide if AI should play a land this turn.
@@ -436,35 +300,40 @@ class AIOpponent:
             True if AI should play land
         """
         # Always play land if available and possible
-        if not self.player.has_played_land_this_turn:
-            # Check if hand has lands
-            lands = [c for c in self.player.hand if 'land' in c.type_line.lower()]
-            return len(lands) > 0
-        
-        return False
+        return bool(self.legal_actions.playable_lands(self.player_index))
     
     def choose_land_to_play(self) -> Optional[object]:
         """
         Choose which land to play.
         
+        Prefers a land that makes a spell in hand castable, then one adding
+        a color the current mana sources can't make.
+        
         Returns:
             Land card to play, or None
         """
-        lands = [c for c in self.player.hand if 'land' in c.type_line.lower()]
+        lands = [action.card for action in self.legal_actions.playable_lands(self.player_index)]
         
         if not lands:
             return None
         
-        # Count current mana sources
-        mana_counts = {'W': 0, 'U': 0, 'B': 0, 'R': 0, 'G': 0, 'C': 0}
-        for permanent in self.player.battlefield:
-            if 'land' in permanent.type_line.lower():
-                # Simplified - would need to parse mana abilities
-                pass
+        from app.game.mana_cost import mana_options, solve_payment
+        
+        facts = self.legal_actions.facts(self.player_index)
+        spells = [card for card in self.player.hand if not card.is_land()]
+        produced = set()
+        for _, options in facts.mana_sources:
+            produced |= options
         
-        # TODO: Smarter land selection based on hand
-        # For now, play first land
-        return lands[0]
+        def value(land):
+            sources = facts.mana_sources + [(land, mana_options(land))]
+            enabled = sum(
+                solve_payment(card.mana_cost, facts.pool, sources) is not None
+                for card in spells
+            )
+            return enabled, len(mana_options(land) - produced)
+        
+        return max(lands, key=value)
     
     def should_cast_spell(self, card) -> bool:
         """
@@ -472,18 +341,18 @@ class AIOpponent:
         
         Args:
             card: Card to potentially cast
-            
+        
         Returns:
             True if AI should cast
         """
-        # Check if we have mana
-        # TODO: Implement mana checking
+        # Only legal casts: timing and a mana payment
+        if not self.legal_actions.can_cast(self.player_index, card):
+            return False
         
         # Make mistakes occasionally
         if random.random() < self.mistake_chance:
             return random.choice([True, False])
         
-        # Basic decision: cast if it's our main phase
         return True
     
     def take_turn_actions(self):
@@ -493,82 +362,104 @@ class AIOpponent:
         # Play land if possible
         if self.should_play_land():
             land = self.choose_land_to_play()
-            if land:
-                try:
-                    self.game_engine.play_land(self.player_index, land)
-                    logger.info(f"AI played land: {land.name}")
-                except Exception as e:
-                    logger.error(f"AI failed to play land: {e}")
-        
-        # Consider casting spells
+            if land and self.game_engine.play_land(self.player, land):
+                logger.info(f"AI played land: {land.name}")
+        
+        # Cast spells in strategy order while they stay castable
+        castable = [action.card for action in self.legal_actions.castable_spells(self.player_index)]
         prioritized_spells = self.strategy.prioritize_spells(
-            self.player.hand,
+            castable,
             self.player.mana_pool
         )
         
         for spell in prioritized_spells:
-            if self.should_cast_spell(spell):
-                # TODO: Implement spell casting through stack manager
-                logger.debug(f"AI would cast: {spell.name}")
+            if not self.should_cast_spell(spell):
+                continue
+            action = next(
+                a for a in self.legal_actions.castable_spells(self.player_index)
+                if a.card is spell
+            )
+            self.legal_actions.tap_payment(self.player_index, action.payment)
+            if self.game_engine.cast_spell(self.player_index, spell):
+                logger.info(f"AI cast: {spell.name}")
+    
+    def _defending_player_index(self) -> int:
+        """Index of the opponent this AI attacks."""
+        return (self.player_index + 1) % len(self.game_engine.players)
     
     def declare_attackers(self, combat_manager) -> List:
         """
         Declare attackers for combat.
         
+        The combat planner weighs the opponent's best blocks and their
+        attack back next turn; the strategy sets how much the latter counts.
+        
         Args:
             combat_manager: CombatManager instance
             
         Returns:
             List of creatures to attack with
         """
-        # Get all creatures that can attack
-        potential_attackers = [
-            c for c in self.player.battlefield
-            if 'creature' in c.type_line.lower()
-            and combat_manager.can_attack(c, self.player_index)
-        ]
+        defender_index = self._defending_player_index()
+        defender = self.game_engine.players[defender_index]
         
-        # Use strategy to choose attackers
-        attackers = self.strategy.prioritize_attacks(potential_attackers)
+        # Get all creatures that can attack
+        creatures = self.player.battlefield.creatures()
+        potential_attackers = self.legal_actions.attackers(self.player_index, defender_index)
+        attacker_ids = {id(c) for c in potential_attackers}
+        
+        plan = self.combat_planner.plan_attacks(
+            potential_attackers,
+            [c for c in defender.battlefield.creatures() if not c.tapped],
+            self.player.life,
+            defender.life,
+            own_creatures=[c for c in creatures if id(c) not in attacker_ids and not c.tapped],
+            opponent_creatures=defender.battlefield.creatures()
+        )
+        attackers = plan.attackers
         
         # Apply mistakes
-        if random.random() < self.mistake_chance:
+        if attackers and random.random() < self.mistake_chance:
             # Randomly don't attack with some creatures
             attackers = random.sample(attackers, max(1, len(attackers) // 2))
         
         logger.info(f"AI declaring {len(attackers)} attackers")
         return attackers
     
-    def declare_blockers(self, combat_manager, attackers: List) -> Dict:
+    def declare_blockers(self, combat_manager, attackers: List) -> List[Tuple]:
         """
         Declare blockers for combat.
         
+        The combat planner searches single and multi-blocks, trades and
+        chump blocks against all attackers together.
+        
         Args:
             combat_manager: CombatManager instance
-            attackers: List of Attacker objects
+            attackers: List of Attacker objects (or attacking creatures)
             
         Returns:
-            Dictionary mapping attackers to lists of blockers
+            List of (blocker, attacking creature) pairs in declaration order
         """
         # Get all creatures that can block
         potential_blockers = [
-            c for c in self.player.battlefield
-            if 'creature' in c.type_line.lower()
-            and not c.tapped
+            c for c in self.player.battlefield.creatures()
+            if not c.tapped
         ]
         
-        # Use strategy to assign blockers
-        assignments = self.strategy.prioritize_blocks(potential_blockers, attackers)
+        plan = self.combat_planner.plan_blocks(attackers, potential_blockers, self.player.life)
+        assignments = [
+            (blocker, attacker) for blocker, attacker in plan.pairs
+            if combat_manager.can_block(blocker, attacker)[0]
+        ]
         
         # Apply mistakes
         if random.random() < self.mistake_chance:
             # Randomly change some blocking decisions
             if assignments and random.random() < 0.5:
                 # Remove a random block
-                random_attacker = random.choice(list(assignments.keys()))
-                del assignments[random_attacker]
+                del assignments[random.randrange(len(assignments))]
         
-        logger.info(f"AI declaring blockers for {len(assignments)} attackers")
+        logger.info(f"AI declaring {len(assignments)} blockers")
         return assignments
     
     def assess_threats(self) -> List[ThreatAssessment]:
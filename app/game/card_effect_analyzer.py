@@ -11,8 +11,17 @@ The system:
 4. Generates comprehensive visual designs for runtime rendering
 5. Detects high-impact events for cinematic moments
 
+Every match pattern in the libraries is compiled once into a PatternMatcher
+(an Aho-Corasick automaton), so tagging a card or checking its high-impact
+events is one pass over its text instead of one substring search per
+pattern. The whole card database can be profiled up front in a process pool
+and the profiles persisted in a CardProfileStore keyed by index version, so
+gameplay only looks profiles up.
+
 Key Components:
+- PatternMatcher: Finds every library pattern in a text in one pass
 - CardAnalyzer: Parses and tags cards with mechanic/tribal/flavor tags
+- CardProfileStore: SQLite store of analyzed profiles keyed by version
 - VisualDesignBuilder: Constructs layered visual profiles
 - HighImpactDetector: Identifies board wipes, combo turns, etc.
 - EffectMapper: Maps tags to particle/animation/audio effects
@@ -22,6 +31,11 @@ Usage:
     card_profile = analyzer.analyze_card(card_data)
     visual_design = analyzer.build_visual_design(card_profile)
     
+    # Once per index build (later runs just load the stored profiles)
+    store = CardProfileStore("data/card_profiles.sqlite")
+    analyzer.build_profile_index("data/mtg_index.sqlite", store,
+                                 read_index_version("data/INDEX_VERSION.json"))
+    
     # During gameplay
     events = analyzer.detect_high_impact_events(card, board_state, cast_context)
 """
@@ -29,11 +43,39 @@ Usage:
 from __future__ import annotations
 
 import json
+import logging
+import os
 import re
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from app.utils.versioned_store import VersionedStore, content_version
+
+logger = logging.getLogger(__name__)
+
+# Effect library categories whose entries tag mechanics
+MECHANIC_CATEGORIES = (
+    "combatAbilities",
+    "activatedAbilities",
+    "triggeredAbilities",
+    "staticEffects",
+    "zoneInteractions",
+    "mechanicKeywords"
+)
+
+# Cards handed to a worker process at a time when profiling in batch
+PROFILE_CHUNK_SIZE = 500
+
+# What a compiled pattern tags: (kind, tag) values in the matchers
+MECHANIC = "mechanic"
+TRIBAL = "tribal"
+FLAVOR = "flavor"
+IMPACT = "impact"
 
 # ============================================================================
 # Data Structures
@@ -79,6 +121,9 @@ class CardProfile:
     # Effect mapping
     novelty_score: float = 0.0
     requires_custom_design: bool = False
+    
+    # High-impact events whose card text patterns match (None until analyzed)
+    impact_event_tags: Optional[Set[str]] = None
 
 
 @dataclass
@@ -106,6 +151,109 @@ class CastContext:
     additional_costs_paid: List[str] = field(default_factory=list)
 
 
+# ============================================================================
+# Pattern Matching
+# ============================================================================
+
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of case-insensitive patterns.
+    
+    Each pattern carries a value; search() walks the text once and returns
+    the values of every pattern occurring in it (overlapping and nested
+    occurrences included), which is what `pattern.lower() in text.lower()`
+    over every pattern would find.
+    """
+    
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        """
+        Compile the automaton.
+        
+        Args:
+            patterns: (pattern, value) pairs; a value may have several patterns
+        """
+        # Trie of the patterns, then a full transition table so that
+        # search() never follows failure links
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[Hashable]] = [set()]
+        always = set()
+        for pattern, value in patterns:
+            pattern = pattern.lower()
+            if not pattern:
+                always.add(value)
+                continue
+            node = 0
+            for char in pattern:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    outputs.append(set())
+                node = child
+            outputs[node].add(value)
+        self._always = frozenset(always)
+        
+        self._transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            inherited = self._transitions[fail[node]]
+            transitions = self._transitions[node]
+            transitions.update(inherited)
+            for char, child in goto[node].items():
+                fail[child] = inherited.get(char, 0)
+                transitions[char] = child
+                queue.append(child)
+            outputs[node] |= outputs[fail[node]]
+        self._outputs: List[FrozenSet[Hashable]] = [frozenset(out) for out in outputs]
+        self.pattern_count = sum(1 for out in outputs if out) + len(always)
+    
+    def search(self, text: str) -> Set[Hashable]:
+        """
+        Find which patterns occur in a text.
+        
+        Args:
+            text: Text to scan (compared case-insensitively)
+        
+        Returns:
+            Values of every matching pattern
+        """
+        return self.search_prefix(text, "")[1]
+    
+    def search_prefix(self, prefix: str, rest: str) -> Tuple[Set[Hashable], Set[Hashable]]:
+        """
+        Scan `prefix + rest` once, also reporting what occurs within the prefix.
+        
+        Args:
+            prefix: Start of the text
+            rest: Remainder of the text
+        
+        Returns:
+            (values matching within prefix, values matching anywhere)
+        """
+        found = set(self._always)
+        transitions, outputs = self._transitions, self._outputs
+        node = 0
+        for char in prefix.lower():
+            node = transitions[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        in_prefix = set(found)
+        for char in rest.lower():
+            node = transitions[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        return in_prefix, found
+
+
+def _tags_of_kind(matches: Set[Tuple[str, str]], kind: str) -> Set[str]:
+    """Get the tags of one kind from (kind, tag) matches."""
+    return {tag for match_kind, tag in matches if match_kind == kind}
+
+
 # ============================================================================
 # Card Analyzer
 # ============================================================================
@@ -134,13 +282,75 @@ class CardAnalyzer:
             high_impact_events_path: Path to high_impact_events.json
             card_profile_template_path: Path to card_profile_template.json
         """
-        self.effect_library = self._load_json(effect_library_path)
-        self.high_impact_events = self._load_json(high_impact_events_path)
-        self.card_template = self._load_json(card_profile_template_path)
+        self._setup(
+            self._load_json(effect_library_path),
+            self._load_json(high_impact_events_path),
+            self._load_json(card_profile_template_path)
+        )
+    
+    @classmethod
+    def from_libraries(cls,
+                       effect_library: Dict[str, Any],
+                       high_impact_events: Dict[str, Any],
+                       card_template: Optional[Dict[str, Any]] = None) -> CardAnalyzer:
+        """
+        Create an analyzer from already-loaded libraries.
+        
+        Args:
+            effect_library: Parsed effect_library.json
+            high_impact_events: Parsed high_impact_events.json
+            card_template: Parsed card_profile_template.json
+        
+        Returns:
+            CardAnalyzer
+        """
+        analyzer = cls.__new__(cls)
+        analyzer._setup(effect_library, high_impact_events, card_template or {})
+        return analyzer
+    
+    def _setup(self,
+               effect_library: Dict[str, Any],
+               high_impact_events: Dict[str, Any],
+               card_template: Dict[str, Any]) -> None:
+        """Store the libraries and compile their match patterns."""
+        self.effect_library = effect_library
+        self.high_impact_events = high_impact_events
+        self.card_template = card_template
         
         # Cache for analyzed cards
         self._card_cache: Dict[str, CardProfile] = {}
         
+        mechanic_patterns = [
+            (pattern, (MECHANIC, entry.get("mechanicTag", "")))
+            for category in MECHANIC_CATEGORIES
+            for entry in self.effect_library.get(category, [])
+            for pattern in entry.get("matchPatterns", [])
+        ]
+        # Oracle and flavor text are scanned once for every kind of tag
+        self._text_matcher = PatternMatcher(mechanic_patterns + [
+            (pattern, (FLAVOR, flavor_profile.get("flavorTag", "")))
+            for flavor_profile in self.effect_library.get("flavorCues", [])
+            for pattern in flavor_profile.get("matchPatterns", [])
+        ] + [
+            (pattern, (IMPACT, event.get("eventTag", "")))
+            for event in self.high_impact_events.get("highImpactEventProfiles", [])
+            for pattern in event.get("triggerHeuristics", {}).get("cardTextPatterns", [])
+        ])
+        self._type_matcher = PatternMatcher(mechanic_patterns + [
+            (type_profile.get("cardTypeTag", ""),
+             (MECHANIC, f"type::{type_profile.get('cardTypeTag', '').lower()}"))
+            for type_profile in self.effect_library.get("cardTypeProfiles", [])
+        ] + [
+            (pattern, (TRIBAL, tribal_profile.get("tribalTag", "")))
+            for tribal_profile in self.effect_library.get("tribalAndFlavorProfiles", [])
+            for pattern in tribal_profile.get("matchPatterns", [])
+        ])
+    
+    @property
+    def library_version(self) -> str:
+        """Short hash of the libraries; profiles are only reusable under the same one."""
+        return content_version([self.effect_library, self.high_impact_events])
+    
     def _load_json(self, path: Path) -> Dict[str, Any]:
         """Load JSON file safely"""
         try:
@@ -187,14 +397,11 @@ class CardAnalyzer:
             collector_number=card_data.get("number", "")
         )
         
-        # Tag mechanics
-        self._tag_mechanics(profile)
-        
-        # Tag tribal types
-        self._tag_tribal(profile)
+        # Tag mechanics, flavor cues and high-impact events from the text
+        self._tag_text(profile)
         
-        # Tag flavor cues
-        self._tag_flavor(profile)
+        # Tag card types and tribal types
+        self._tag_types(profile)
         
         # Calculate novelty score
         profile.novelty_score = self._calculate_novelty(profile)
@@ -204,64 +411,21 @@ class CardAnalyzer:
         self._card_cache[card_name] = profile
         return profile
     
-    def _tag_mechanics(self, profile: CardProfile) -> None:
-        """Tag card with mechanic identifiers from effect library"""
-        text_lower = profile.oracle_text.lower()
-        type_line = " ".join(profile.types + profile.subtypes).lower()
-        
-        # Check all mechanic categories
-        categories = [
-            "combatAbilities",
-            "activatedAbilities",
-            "triggeredAbilities",
-            "staticEffects",
-            "zoneInteractions",
-            "mechanicKeywords"
-        ]
-        
-        for category in categories:
-            for entry in self.effect_library.get(category, []):
-                mechanic_tag = entry.get("mechanicTag", "")
-                match_patterns = entry.get("matchPatterns", [])
-                
-                # Check if any pattern matches
-                for pattern in match_patterns:
-                    pattern_lower = pattern.lower()
-                    if pattern_lower in text_lower or pattern_lower in type_line:
-                        profile.mechanic_tags.add(mechanic_tag)
-                        break
-        
-        # Check card type profiles
-        for type_profile in self.effect_library.get("cardTypeProfiles", []):
-            card_type = type_profile.get("cardTypeTag", "").lower()
-            if card_type in type_line:
-                profile.mechanic_tags.add(f"type::{card_type}")
-    
-    def _tag_tribal(self, profile: CardProfile) -> None:
-        """Tag card with tribal creature types"""
-        type_line = " ".join(profile.subtypes).lower()
-        
-        for tribal_profile in self.effect_library.get("tribalAndFlavorProfiles", []):
-            tribal_tag = tribal_profile.get("tribalTag", "")
-            match_patterns = tribal_profile.get("matchPatterns", [])
-            
-            for pattern in match_patterns:
-                if pattern.lower() in type_line:
-                    profile.tribal_tags.add(tribal_tag)
-                    break
+    def _tag_text(self, profile: CardProfile) -> None:
+        """Tag mechanics, flavor cues and high-impact events in one pass over the text"""
+        in_oracle, in_combined = self._text_matcher.search_prefix(
+            profile.oracle_text, " " + profile.flavor_text
+        )
+        profile.mechanic_tags |= _tags_of_kind(in_oracle, MECHANIC)
+        profile.impact_event_tags = _tags_of_kind(in_oracle, IMPACT)
+        profile.flavor_tags |= _tags_of_kind(in_combined, FLAVOR)
     
-    def _tag_flavor(self, profile: CardProfile) -> None:
-        """Tag card with flavor cues from oracle and flavor text"""
-        combined_text = (profile.oracle_text + " " + profile.flavor_text).lower()
-        
-        for flavor_profile in self.effect_library.get("flavorCues", []):
-            flavor_tag = flavor_profile.get("flavorTag", "")
-            match_patterns = flavor_profile.get("matchPatterns", [])
-            
-            for pattern in match_patterns:
-                if pattern.lower() in combined_text:
-                    profile.flavor_tags.add(flavor_tag)
-                    break
+    def _tag_types(self, profile: CardProfile) -> None:
+        """Tag mechanics and card types from the type line, and tribal types from subtypes"""
+        type_line = " ".join(profile.types + profile.subtypes)
+        profile.mechanic_tags |= _tags_of_kind(self._type_matcher.search(type_line), MECHANIC)
+        subtypes = " ".join(profile.subtypes)
+        profile.tribal_tags |= _tags_of_kind(self._type_matcher.search(subtypes), TRIBAL)
     
     def _calculate_novelty(self, profile: CardProfile) -> float:
         """
@@ -380,16 +544,7 @@ class CardAnalyzer:
     
     def _add_mechanic_visuals(self, profile: CardProfile, design: Dict[str, Any]) -> None:
         """Add visual layers from mechanic tags"""
-        categories = [
-            "combatAbilities",
-            "activatedAbilities",
-            "triggeredAbilities",
-            "staticEffects",
-            "zoneInteractions",
-            "mechanicKeywords"
-        ]
-        
-        for category in categories:
+        for category in MECHANIC_CATEGORIES:
             for entry in self.effect_library.get(category, []):
                 mechanic_tag = entry.get("mechanicTag", "")
                 
@@ -470,6 +625,10 @@ class CardAnalyzer:
         Returns:
             List of matching high-impact event profiles
         """
+        if profile.impact_event_tags is None:
+            matches = self._text_matcher.search(profile.oracle_text)
+            profile.impact_event_tags = _tags_of_kind(matches, IMPACT)
+        
         matches = []
         
         for event in self.high_impact_events.get("highImpactEventProfiles", []):
@@ -486,10 +645,10 @@ class CardAnalyzer:
         """Check if event profile matches current situation"""
         heuristics = event.get("triggerHeuristics", {})
         
-        # 1. Check card text patterns
+        # 1. Check card text patterns (matched once per card)
         card_text_patterns = heuristics.get("cardTextPatterns", [])
         if card_text_patterns:
-            if not self._text_matches_patterns(profile.oracle_text, card_text_patterns):
+            if event.get("eventTag", "") not in profile.impact_event_tags:
                 return False
         
         # 2. Check board state conditions
@@ -506,14 +665,6 @@ class CardAnalyzer:
         
         return True
     
-    def _text_matches_patterns(self, text: str, patterns: List[str]) -> bool:
-        """Check if card text matches any pattern"""
-        text_lower = text.lower()
-        for pattern in patterns:
-            if pattern.lower() in text_lower:
-                return True
-        return False
-    
     def _check_board_conditions(self, board: BoardState, controller: str, conditions: List[str]) -> bool:
         """Check board state conditions"""
         for condition in conditions:
@@ -614,32 +765,7 @@ class CardAnalyzer:
     
     def export_profile(self, profile: CardProfile, output_path: Path) -> None:
         """Export card profile to JSON file"""
-        data = {
-            "cardName": profile.card_name,
-            "manaCost": profile.mana_cost,
-            "colors": profile.colors,
-            "types": profile.types,
-            "subtypes": profile.subtypes,
-            "supertypes": profile.supertypes,
-            "rarity": profile.rarity,
-            "power": profile.power,
-            "toughness": profile.toughness,
-            "loyalty": profile.loyalty,
-            "oracleText": profile.oracle_text,
-            "flavorText": profile.flavor_text,
-            "setCode": profile.set_code,
-            "collectorNumber": profile.collector_number,
-            "parsedMechanics": {
-                "mechanicTags": list(profile.mechanic_tags),
-                "tribalTags": list(profile.tribal_tags),
-                "flavorTags": list(profile.flavor_tags)
-            },
-            "visualDesign": profile.visual_design,
-            "effectMapping": {
-                "noveltyScore": profile.novelty_score,
-                "requiresCustomDesign": profile.requires_custom_design
-            }
-        }
+        data = profile_to_dict(profile)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
@@ -647,6 +773,346 @@ class CardAnalyzer:
     def clear_cache(self) -> None:
         """Clear analyzed card cache"""
         self._card_cache.clear()
+    
+    # ------------------------------------------------------------------------
+    # Batch Profiling
+    # ------------------------------------------------------------------------
+    
+    def analyze_batch(self,
+                      cards: Iterable[Dict[str, Any]],
+                      max_workers: Optional[int] = None,
+                      chunk_size: int = PROFILE_CHUNK_SIZE) -> List[CardProfile]:
+        """
+        Analyze many cards, in parallel worker processes.
+        
+        Cards already cached (or repeated by name) are analyzed once.
+        
+        Args:
+            cards: Raw card data from MTGJSON
+            max_workers: Worker processes (1 analyzes in this process;
+                None uses one per CPU)
+            chunk_size: Cards sent to a worker at a time
+        
+        Returns:
+            Profiles of the new cards, in input order
+        """
+        pending: Dict[str, Dict[str, Any]] = {}
+        for card_data in cards:
+            name = card_data.get("name", "")
+            if name not in self._card_cache and name not in pending:
+                pending[name] = card_data
+        batch = list(pending.values())
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers == 1 or len(batch) <= chunk_size:
+            return [self.analyze_card(card_data) for card_data in batch]
+        
+        chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
+        profiles = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_profile_worker,
+            initargs=(self.effect_library, self.high_impact_events)
+        ) as executor:
+            for chunk_profiles in executor.map(_profile_chunk, chunks):
+                profiles.extend(chunk_profiles)
+        
+        for profile in profiles:
+            self._card_cache[profile.card_name] = profile
+        logger.info(f"Analyzed {len(profiles)} cards in {len(chunks)} chunks")
+        return profiles
+    
+    def load_profiles(self, store: CardProfileStore, index_version: str) -> int:
+        """
+        Fill the cache from stored profiles.
+        
+        Args:
+            store: Profile store
+            index_version: Card index version the profiles were built from
+        
+        Returns:
+            Number of profiles loaded
+        """
+        profiles = store.load(self.profile_version(index_version))
+        self._card_cache.update(profiles)
+        return len(profiles)
+    
+    def profile_version(self, index_version: str) -> str:
+        """
+        Get the key stored profiles are filed under.
+        
+        Args:
+            index_version: Card index version
+        
+        Returns:
+            Index version combined with the library version
+        """
+        return f"{index_version}/{self.library_version}"
+    
+    def build_profile_index(self,
+                            db_path: Union[str, Path],
+                            store: CardProfileStore,
+                            index_version: str,
+                            max_workers: Optional[int] = None) -> int:
+        """
+        Load the profiles for an index version, building them if needed.
+        
+        Profiles from other index or library versions are removed once the
+        new ones are stored.
+        
+        Args:
+            db_path: Card index database (cards table)
+            store: Profile store
+            index_version: Version of the card index (see read_index_version)
+            max_workers: Worker processes used when building
+        
+        Returns:
+            Number of profiles cached
+        """
+        version = self.profile_version(index_version)
+        if store.has_version(version):
+            return self.load_profiles(store, index_version)
+        
+        self.analyze_batch(load_card_data(db_path), max_workers=max_workers)
+        store.save(version, self._card_cache.values())
+        store.prune(keep=version)
+        logger.info(f"Stored {len(self._card_cache)} card profiles for {version}")
+        return len(self._card_cache)
+
+
+# ============================================================================
+# Batch Workers
+# ============================================================================
+
+
+_worker_analyzer: Optional[CardAnalyzer] = None
+
+
+def _init_profile_worker(effect_library: Dict[str, Any], high_impact_events: Dict[str, Any]) -> None:
+    """Compile the libraries once per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = CardAnalyzer.from_libraries(effect_library, high_impact_events)
+
+
+def _profile_chunk(cards: List[Dict[str, Any]]) -> List[CardProfile]:
+    """Analyze a chunk of cards in a worker process."""
+    return [_worker_analyzer.analyze_card(card_data) for card_data in cards]
+
+
+# ============================================================================
+# Profile Persistence
+# ============================================================================
+
+
+PROFILE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS card_profiles (
+        version TEXT NOT NULL,
+        card_name TEXT NOT NULL,
+        profile TEXT NOT NULL,
+        PRIMARY KEY (version, card_name)
+    );
+"""
+
+CARD_DATA_QUERY = """
+    SELECT name, mana_cost, colors, types, subtypes, supertypes, rarity,
+           COALESCE(oracle_text, text) AS text, flavor_text, power, toughness,
+           loyalty, set_code, collector_number
+    FROM cards
+    WHERE is_token = 0
+    ORDER BY name, set_code, collector_number
+"""
+
+
+def profile_to_dict(profile: CardProfile) -> Dict[str, Any]:
+    """
+    Convert a profile to its JSON form (as written by export_profile).
+    
+    Args:
+        profile: Card profile
+    
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {
+        "cardName": profile.card_name,
+        "manaCost": profile.mana_cost,
+        "colors": profile.colors,
+        "types": profile.types,
+        "subtypes": profile.subtypes,
+        "supertypes": profile.supertypes,
+        "rarity": profile.rarity,
+        "power": profile.power,
+        "toughness": profile.toughness,
+        "loyalty": profile.loyalty,
+        "oracleText": profile.oracle_text,
+        "flavorText": profile.flavor_text,
+        "setCode": profile.set_code,
+        "collectorNumber": profile.collector_number,
+        "parsedMechanics": {
+            "mechanicTags": sorted(profile.mechanic_tags),
+            "tribalTags": sorted(profile.tribal_tags),
+            "flavorTags": sorted(profile.flavor_tags)
+        },
+        "visualDesign": profile.visual_design,
+        "effectMapping": {
+            "noveltyScore": profile.novelty_score,
+            "requiresCustomDesign": profile.requires_custom_design,
+            "impactEventTags": (
+                None if profile.impact_event_tags is None else sorted(profile.impact_event_tags)
+            )
+        }
+    }
+
+
+def profile_from_dict(data: Dict[str, Any]) -> CardProfile:
+    """
+    Rebuild a profile from its JSON form.
+    
+    Args:
+        data: Dictionary from profile_to_dict
+    
+    Returns:
+        CardProfile
+    """
+    mechanics = data.get("parsedMechanics", {})
+    mapping = data.get("effectMapping", {})
+    impact_tags = mapping.get("impactEventTags")
+    return CardProfile(
+        card_name=data["cardName"],
+        mana_cost=data.get("manaCost", ""),
+        colors=data.get("colors", []),
+        types=data.get("types", []),
+        subtypes=data.get("subtypes", []),
+        supertypes=data.get("supertypes", []),
+        rarity=data.get("rarity", ""),
+        power=data.get("power"),
+        toughness=data.get("toughness"),
+        loyalty=data.get("loyalty"),
+        oracle_text=data.get("oracleText", ""),
+        flavor_text=data.get("flavorText", ""),
+        set_code=data.get("setCode", ""),
+        collector_number=data.get("collectorNumber", ""),
+        mechanic_tags=set(mechanics.get("mechanicTags", [])),
+        tribal_tags=set(mechanics.get("tribalTags", [])),
+        flavor_tags=set(mechanics.get("flavorTags", [])),
+        visual_design=data.get("visualDesign"),
+        novelty_score=mapping.get("noveltyScore", 0.0),
+        requires_custom_design=mapping.get("requiresCustomDesign", False),
+        impact_event_tags=None if impact_tags is None else set(impact_tags)
+    )
+
+
+def card_data_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """
+    Convert a cards table row to MTGJSON-style card data.
+    
+    Args:
+        row: Row from CARD_DATA_QUERY
+    
+    Returns:
+        Card data accepted by CardAnalyzer.analyze_card
+    """
+    def split(value: Optional[str]) -> List[str]:
+        return value.split(',') if value else []
+    
+    return {
+        "name": row['name'],
+        "manaCost": row['mana_cost'] or "",
+        "colors": split(row['colors']),
+        "types": split(row['types']),
+        "subtypes": split(row['subtypes']),
+        "supertypes": split(row['supertypes']),
+        "rarity": row['rarity'] or "",
+        "power": row['power'],
+        "toughness": row['toughness'],
+        "loyalty": row['loyalty'],
+        "text": row['text'] or "",
+        "flavorText": row['flavor_text'] or "",
+        "setCode": row['set_code'] or "",
+        "number": row['collector_number'] or ""
+    }
+
+
+def load_card_data(db_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Read every non-token card from the card index, one printing per name.
+    
+    Args:
+        db_path: Card index database
+    
+    Returns:
+        Card data for CardAnalyzer.analyze_batch
+    """
+    connection = sqlite3.connect(str(db_path))
+    connection.row_factory = sqlite3.Row
+    try:
+        cards: Dict[str, Dict[str, Any]] = {}
+        for row in connection.execute(CARD_DATA_QUERY):
+            if row['name'] not in cards:
+                cards[row['name']] = card_data_from_row(row)
+        return list(cards.values())
+    finally:
+        connection.close()
+
+
+def read_index_version(version_file: Union[str, Path]) -> str:
+    """
+    Get the version of the current card index build.
+    
+    Args:
+        version_file: INDEX_VERSION.json written by the index builder
+    
+    Returns:
+        MTGJSON version and build time, or "unversioned" without a build
+    """
+    from app.utils.version_tracker import VersionTracker
+    
+    info = VersionTracker(str(version_file)).load_version_info()
+    if not info:
+        return "unversioned"
+    return f"{info.get('mtgjson_version', 'unknown')}@{info.get('build_timestamp', '')}"
+
+
+class CardProfileStore(VersionedStore):
+    """
+    SQLite store of analyzed card profiles per version (CardAnalyzer.profile_version).
+    """
+    
+    SCHEMA = PROFILE_SCHEMA
+    TABLES = ('card_profiles',)
+    
+    def save(self, version: str, profiles: Iterable[CardProfile]) -> None:
+        """
+        Store profiles under a version (replacing same-named ones).
+        
+        Args:
+            version: Profile version
+            profiles: Profiles to store
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO card_profiles (version, card_name, profile) VALUES (?, ?, ?)",
+                ((version, profile.card_name, json.dumps(profile_to_dict(profile)))
+                 for profile in profiles)
+            )
+    
+    def load(self, version: str) -> Dict[str, CardProfile]:
+        """
+        Load every profile stored under a version.
+        
+        Args:
+            version: Profile version
+        
+        Returns:
+            Profiles by card name
+        """
+        return {
+            name: profile_from_dict(json.loads(data))
+            for name, data in self.connection.execute(
+                "SELECT card_name, profile FROM card_profiles WHERE version = ?", (version,)
+            )
+        }
 
 
 # ============================================================================
@@ -656,8 +1122,6 @@ class CardAnalyzer:
 
 if __name__ == "__main__":
     # Example usage
-    from pathlib import Path
-    
     # Setup paths
     base_path = Path(__file__).parent
     effect_lib = base_path / "effect_library.json"
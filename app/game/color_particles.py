@@ -3,14 +3,47 @@ Color-based particle system for MTG visual effects.
 
 Provides particle emitters and effects for each mana color (WUBRG + Colorless)
 with intelligent blending for multicolor cards.
+
+Particles live in a structure-of-arrays ParticleStore (one array per field)
+so spawning, aging, moving, fading and culling a frame's particles are a
+handful of NumPy operations instead of a Python call per particle.
+
+Classes:
+    ManaColor: MTG mana colors
+    ColorProfile: Visual profile for a mana color
+    Particle: Snapshot of one particle
+    ParticleStore: Structure-of-arrays particle storage with batched update
+    ParticleEmitter: Emits particles with a color's behavior
+    MulticolorParticleEmitter: Emitter blending several colors
+    ManaOrbEffect: Mana pool orb animation
+    ParticleSystem: Updates every live effect once per frame
+    ColorEffectFactory: Builds effects for spells, mana and ETBs
+
+Usage:
+    system = ParticleSystem(bounds=(0, 0, 1280, 720))
+    system.add(ColorEffectFactory.create_spell_cast_effect(100, 100, ['R']))
+    system.update(1 / 60)
+    for emitter in system.emitters:
+        xs, ys = emitter.store.column('x'), emitter.store.column('y')
 """
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 import random
 import math
 
+import numpy as np
+
+# Fields stored per particle, in Particle field order (color is stored separately)
+PARTICLE_FIELDS = (
+    'x', 'y', 'velocity_x', 'velocity_y', 'lifetime', 'age',
+    'size', 'alpha', 'rotation', 'rotation_speed'
+)
+
+# Initial particle capacity of a store (grows by doubling)
+INITIAL_CAPACITY = 64
+
 
 class ManaColor(Enum):
     """MTG mana colors."""
@@ -129,23 +162,192 @@ class Particle:
         return True
 
 
+# Behaviors that launch particles at a random angle:
+# behavior -> (min speed, max speed, vertical scale, rotation speed range)
+RADIAL_BEHAVIORS = {
+    "radiate_outward": (50, 150, 1.0, None),
+    "ripple": (30, 100, 0.5, None),  # Flatter
+    "swirl_inward": (-50, -20, 1.0, (90, 180)),  # Negative = inward
+    "spiral": (40, 120, 1.0, (180, 360)),
+}
+
+# Straight lines in cardinal directions ("geometric" behavior)
+CARDINAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class ParticleStore:
+    """
+    Structure-of-arrays storage for live particles.
+    
+    Each field in PARTICLE_FIELDS is one NumPy array and `color` holds
+    (r, g, b) rows; the first `len(store)` entries are the live particles.
+    Dead and culled particles are dropped in the same pass that moves the
+    survivors; use column() to read a field.
+    """
+    
+    def __init__(self, capacity: int = INITIAL_CAPACITY,
+                 bounds: Optional[Tuple[float, float, float, float]] = None):
+        """
+        Initialize an empty store.
+        
+        Args:
+            capacity: Initial array capacity (grows as needed)
+            bounds: (min x, min y, max x, max y) outside which particles are culled
+        """
+        self.bounds = bounds
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name in PARTICLE_FIELDS:
+            setattr(self, name, np.zeros(self.capacity))
+        self.color = np.zeros((self.capacity, 3), dtype=np.uint8)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def spawn(self, x, y, velocity_x: Sequence[float], velocity_y: Sequence[float],
+              lifetime: Sequence[float], color: Sequence, size: Sequence[float],
+              rotation_speed=0.0):
+        """
+        Add a batch of particles.
+        
+        Per-particle arguments are equal-length sequences or arrays;
+        x, y and rotation_speed may also be single values shared by the batch.
+        
+        Args:
+            x: Spawn x position(s)
+            y: Spawn y position(s)
+            velocity_x: Horizontal velocities (pixels per second)
+            velocity_y: Vertical velocities (pixels per second)
+            lifetime: Lifetimes in seconds
+            color: (r, g, b) per particle
+            size: Sizes in pixels
+            rotation_speed: Rotation speed(s) in degrees per second
+        """
+        count = len(lifetime)
+        if count == 0:
+            return
+        values = {
+            'x': x, 'y': y, 'velocity_x': velocity_x, 'velocity_y': velocity_y,
+            'lifetime': lifetime, 'age': 0.0, 'size': size, 'alpha': 1.0,
+            'rotation': 0.0, 'rotation_speed': rotation_speed,
+        }
+        
+        self._reserve(self.count + count)
+        start, end = self.count, self.count + count
+        for name in PARTICLE_FIELDS:
+            getattr(self, name)[start:end] = values[name]
+        self.color[start:end] = color
+        self.count += count
+    
+    def _reserve(self, needed: int):
+        """Grow the arrays (by doubling) to hold at least `needed` particles."""
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in PARTICLE_FIELDS:
+            array = np.zeros(capacity)
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        color[:self.count] = self.color[:self.count]
+        self.color = color
+        self.capacity = capacity
+    
+    def update(self, delta_time: float):
+        """
+        Age, move, rotate and fade every particle, dropping dead and culled ones.
+        
+        Args:
+            delta_time: Seconds since the last update
+        """
+        if self.count == 0:
+            return
+        n = self.count
+        age, lifetime = self.age[:n], self.lifetime[:n]
+        x, y = self.x[:n], self.y[:n]
+        age += delta_time
+        x += self.velocity_x[:n] * delta_time
+        y += self.velocity_y[:n] * delta_time
+        self.rotation[:n] += self.rotation_speed[:n] * delta_time
+        
+        alive = age < lifetime
+        if self.bounds is not None:
+            min_x, min_y, max_x, max_y = self.bounds
+            alive &= (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+        
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            for name in PARTICLE_FIELDS:
+                array = getattr(self, name)
+                array[:n] = array[keep]
+            self.color[:n] = self.color[keep]
+            self.count = n
+        
+        # Fade out over lifetime
+        np.divide(self.age[:n], self.lifetime[:n], out=self.alpha[:n])
+        np.subtract(1.0, self.alpha[:n], out=self.alpha[:n])
+    
+    def column(self, name: str) -> Sequence:
+        """
+        Get one field of the live particles, for renderers.
+        
+        Args:
+            name: A field from PARTICLE_FIELDS, or 'color'
+        
+        Returns:
+            Array view of the live values
+        """
+        return getattr(self, name)[:self.count]
+    
+    def particles(self) -> List['Particle']:
+        """
+        Get a snapshot of the live particles as Particle objects.
+        
+        Returns:
+            List of Particle
+        """
+        columns = [getattr(self, name)[:self.count].tolist() for name in PARTICLE_FIELDS]
+        rows = zip(*columns, self.color[:self.count].tolist())
+        return [
+            Particle(**dict(zip(PARTICLE_FIELDS, row)), color=tuple(row[-1]))
+            for row in rows
+        ]
+    
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+
+
 class ParticleEmitter:
     """Emits particles with specific behavior."""
     
     def __init__(self, x: float, y: float, color_profile: ColorProfile,
-                 emission_rate: int = 10, duration: float = 1.0):
+                 emission_rate: int = 10, duration: float = 1.0,
+                 bounds: Optional[Tuple[float, float, float, float]] = None,
+                 seed: Optional[int] = None):
         self.x = x
         self.y = y
         self.color_profile = color_profile
         self.emission_rate = emission_rate  # particles per second
         self.duration = duration
         self.elapsed = 0.0
-        self.particles: List[Particle] = []
+        self.store = ParticleStore(bounds=bounds)
         self.active = True
+        # Fractional particles owed from earlier frames (short frames emit < 1)
+        self._emission_carry = 0.0
+        self._rng = np.random.default_rng(seed)
+    
+    @property
+    def particles(self) -> List[Particle]:
+        """Snapshot of the live particles (renderers should read `store` directly)."""
+        return self.store.particles()
     
     def update(self, delta_time: float):
         """Update emitter and all particles."""
-        if not self.active:
+        if not self.active and not self.store:
             return
         
         self.elapsed += delta_time
@@ -156,104 +358,106 @@ class ParticleEmitter:
         
         # Emit new particles
         if self.active:
-            particles_to_emit = int(self.emission_rate * delta_time)
-            for _ in range(particles_to_emit):
-                self.emit_particle()
+            self._emission_carry += self.emission_rate * delta_time
+            particles_to_emit = int(self._emission_carry)
+            self._emission_carry -= particles_to_emit
+            if particles_to_emit:
+                self._emit(particles_to_emit)
         
-        # Update existing particles
-        self.particles = [p for p in self.particles if p.update(delta_time)]
+        # Update existing particles (emitted ones keep living after the emitter stops)
+        self.store.update(delta_time)
     
     def emit_particle(self):
         """Emit a single particle based on behavior."""
-        behavior = self.color_profile.particle_behavior
-        
-        # Base particle properties
-        particle = Particle(
-            x=self.x,
-            y=self.y,
-            velocity_x=0.0,
-            velocity_y=0.0,
-            lifetime=random.uniform(0.5, 1.5),
-            color=self._blend_colors(),
-            size=random.uniform(3, 8)
-        )
-        
-        # Apply behavior-specific velocity
-        if behavior == "radiate_outward":
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            particle.velocity_x = math.cos(angle) * speed
-            particle.velocity_y = math.sin(angle) * speed
-        
-        elif behavior == "ripple":
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(30, 100)
-            particle.velocity_x = math.cos(angle) * speed
-            particle.velocity_y = math.sin(angle) * speed * 0.5  # Flatter
-        
-        elif behavior == "swirl_inward":
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(-50, -20)  # Negative = inward
-            particle.velocity_x = math.cos(angle) * speed
-            particle.velocity_y = math.sin(angle) * speed
-            particle.rotation_speed = random.uniform(90, 180)
-        
-        elif behavior == "flicker_upward":
-            particle.velocity_x = random.uniform(-20, 20)
-            particle.velocity_y = random.uniform(-150, -50)  # Upward
-            particle.size = random.uniform(5, 12)
-        
-        elif behavior == "spiral":
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(40, 120)
-            particle.velocity_x = math.cos(angle) * speed
-            particle.velocity_y = math.sin(angle) * speed
-            particle.rotation_speed = random.uniform(180, 360)
-        
-        elif behavior == "geometric":
-            # Straight lines in cardinal directions
-            directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-            dx, dy = random.choice(directions)
-            speed = random.uniform(60, 100)
-            particle.velocity_x = dx * speed
-            particle.velocity_y = dy * speed
-        
-        self.particles.append(particle)
+        self._emit(1)
+    
+    def _emit(self, count: int):
+        """Emit a batch of particles."""
+        self._emit_profile(self.color_profile, count)
+    
+    def _emit_profile(self, profile: ColorProfile, count: int):
+        """Emit a batch of particles with one color profile's behavior and colors."""
+        self.store.spawn(self.x, self.y, **_spawn_columns(profile, count, self._rng))
     
     def _blend_colors(self) -> Tuple[int, int, int]:
         """Blend primary and secondary colors."""
-        mix = random.random()
-        r1, g1, b1 = self.color_profile.primary_rgb
-        r2, g2, b2 = self.color_profile.secondary_rgb
-        
-        r = int(r1 * (1 - mix) + r2 * mix)
-        g = int(g1 * (1 - mix) + g2 * mix)
-        b = int(b1 * (1 - mix) + b2 * mix)
-        
-        return (r, g, b)
+        return _blend(self.color_profile, random.random())
     
     def is_finished(self) -> bool:
         """Check if emitter is done and all particles are gone."""
-        return not self.active and len(self.particles) == 0
+        return not self.active and len(self.store) == 0
+
+
+def _blend(profile: ColorProfile, mix: float) -> Tuple[int, int, int]:
+    """Mix a profile's primary and secondary colors (0 = primary, 1 = secondary)."""
+    r1, g1, b1 = profile.primary_rgb
+    r2, g2, b2 = profile.secondary_rgb
+    return (
+        int(r1 * (1 - mix) + r2 * mix),
+        int(g1 * (1 - mix) + g2 * mix),
+        int(b1 * (1 - mix) + b2 * mix),
+    )
+
+
+def _spawn_columns(profile: ColorProfile, count: int, rng) -> Dict:
+    """Spawn columns for a batch of particles with a profile's behavior and colors."""
+    behavior = profile.particle_behavior
+    velocity_x = np.zeros(count)
+    velocity_y = np.zeros(count)
+    rotation_speed = np.zeros(count)
+    lifetime = rng.uniform(0.5, 1.5, count)
+    size = rng.uniform(3, 8, count)
+    
+    if behavior in RADIAL_BEHAVIORS:
+        low, high, vertical, spin = RADIAL_BEHAVIORS[behavior]
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(low, high, count)
+        velocity_x = np.cos(angle) * speed
+        velocity_y = np.sin(angle) * speed * vertical
+        if spin:
+            rotation_speed = rng.uniform(spin[0], spin[1], count)
+    elif behavior == "flicker_upward":
+        velocity_x = rng.uniform(-20, 20, count)
+        velocity_y = rng.uniform(-150, -50, count)  # Upward
+        size = rng.uniform(5, 12, count)
+    elif behavior == "geometric":
+        directions = np.array(CARDINAL_DIRECTIONS)[rng.integers(0, len(CARDINAL_DIRECTIONS), count)]
+        speed = rng.uniform(60, 100, count)
+        velocity_x = directions[:, 0] * speed
+        velocity_y = directions[:, 1] * speed
+    
+    mix = rng.random(count)[:, None]
+    color = (np.array(profile.primary_rgb) * (1 - mix) + np.array(profile.secondary_rgb) * mix)
+    return {
+        'velocity_x': velocity_x, 'velocity_y': velocity_y, 'lifetime': lifetime,
+        'color': color.astype(np.uint8), 'size': size, 'rotation_speed': rotation_speed,
+    }
 
 
 class MulticolorParticleEmitter(ParticleEmitter):
     """Emitter that blends multiple mana colors."""
     
     def __init__(self, x: float, y: float, colors: List[ManaColor],
-                 emission_rate: int = 15, duration: float = 1.0):
+                 emission_rate: int = 15, duration: float = 1.0,
+                 bounds: Optional[Tuple[float, float, float, float]] = None,
+                 seed: Optional[int] = None):
         # Use first color as base
         base_profile = COLOR_PROFILES[colors[0]]
-        super().__init__(x, y, base_profile, emission_rate, duration)
+        super().__init__(x, y, base_profile, emission_rate, duration, bounds, seed)
         
         self.colors = colors
         self.color_profiles = [COLOR_PROFILES[c] for c in colors]
     
-    def emit_particle(self):
-        """Emit particle with one of the colors."""
-        # Randomly choose which color to use for this particle
-        self.color_profile = random.choice(self.color_profiles)
-        super().emit_particle()
+    def _emit(self, count: int):
+        """Emit a batch, each particle taking one of the colors at random."""
+        picks = np.bincount(
+            self._rng.integers(0, len(self.color_profiles), count),
+            minlength=len(self.color_profiles)
+        ).tolist()
+        
+        for profile, profile_count in zip(self.color_profiles, picks):
+            if profile_count:
+                self._emit_profile(profile, profile_count)
 
 
 class ManaOrbEffect:
@@ -298,6 +502,67 @@ class ManaOrbEffect:
         return self.consumed and self.alpha <= 0.0
 
 
+class ParticleSystem:
+    """
+    Owns the live effects on screen and updates them once per frame.
+    
+    Finished emitters and orbs are dropped after each update.
+    """
+    
+    def __init__(self, bounds: Optional[Tuple[float, float, float, float]] = None):
+        """
+        Initialize an empty system.
+        
+        Args:
+            bounds: Visible area (min x, min y, max x, max y); particles leaving it are culled
+        """
+        self.bounds = bounds
+        self.emitters: List[ParticleEmitter] = []
+        self.orbs: List[ManaOrbEffect] = []
+    
+    def add(self, effect):
+        """
+        Add an emitter or mana orb.
+        
+        Args:
+            effect: ParticleEmitter or ManaOrbEffect
+        """
+        if isinstance(effect, ManaOrbEffect):
+            self.orbs.append(effect)
+            return
+        if effect.store.bounds is None:
+            effect.store.bounds = self.bounds
+        self.emitters.append(effect)
+    
+    def update(self, delta_time: float):
+        """
+        Advance every effect by one frame.
+        
+        Args:
+            delta_time: Seconds since the last frame
+        """
+        for emitter in self.emitters:
+            emitter.update(delta_time)
+        for orb in self.orbs:
+            orb.update(delta_time)
+        self.emitters = [e for e in self.emitters if not e.is_finished()]
+        self.orbs = [o for o in self.orbs if not o.is_finished()]
+    
+    @property
+    def particle_count(self) -> int:
+        """Number of live particles across all emitters."""
+        return sum(len(emitter.store) for emitter in self.emitters)
+    
+    def is_finished(self) -> bool:
+        """Check if every effect has finished."""
+        return not self.emitters and not self.orbs
+    
+    def clear(self):
+        """Remove every effect."""
+        self.emitters.clear()
+        self.orbs.clear()
+
+
 class ColorEffectFactory:
     """Factory for creating color-based effects."""
     
@@ -368,7 +633,7 @@ if __name__ == "__main__":
     
     # Red instant (Lightning Bolt)
     red_effect = factory.create_spell_cast_effect(100, 100, ['R'])
-    print(f"Created red effect with {len(red_effect.particles)} particles")
+    print(f"Created red effect with {len(red_effect.store)} particles")
     
     # Multicolor creature (Azorius)
     wu_effect = factory.create_etb_effect(200, 200, ['W', 'U'])
@@ -384,4 +649,4 @@ if __name__ == "__main__":
         wu_effect.update(0.1)
         green_mana.update(0.1)
     
-    print(f"After updates: {len(red_effect.particles)} red particles remaining")
+    print(f"After updates: {len(red_effect.store)} red particles remaining")
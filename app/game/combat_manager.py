@@ -106,6 +106,7 @@ class CombatManager:
         self.attackers: List[Attacker] = []
         self.blockers: List[Blocker] = []
         self.combat_damage: List[CombatDamage] = []
+        self.deathtouched: Set[int] = set()  # ids of creatures dealt deathtouch damage this combat
         logger.info("CombatManager initialized")
     
     def start_combat(self):
@@ -113,6 +114,7 @@ class CombatManager:
         self.attackers.clear()
         self.blockers.clear()
         self.combat_damage.clear()
+        self.deathtouched.clear()
         self.game_engine.log_event("Combat begins")
     
     def can_attack(self, creature, defending_player_id: int) -> Tuple[bool, str]:
@@ -185,7 +187,8 @@ class CombatManager:
         self.attackers.append(attacker)
         
         self.game_engine.log_event(
-            f"{creature.name} attacks player {defending_player_id}"
+            "%s attacks player %s",
+            creature.name, defending_player_id
         )
         
         return True
@@ -267,9 +270,7 @@ class CombatManager:
         )
         self.blockers.append(blocker_obj)
         
-        self.game_engine.log_event(
-            f"{blocker.name} blocks {attacker.name}"
-        )
+        self.game_engine.log_event("%s blocks %s", blocker.name, attacker.name)
         
         return True
     
@@ -284,7 +285,8 @@ class CombatManager:
             if self._has_ability(attacker.creature, CombatAbility.MENACE):
                 if attacker.is_blocked() and len(attacker.blockers) < 2:
                     self.game_engine.log_event(
-                        f"{attacker.creature.name} has menace - illegal block!"
+                        "%s has menace - illegal block!",
+                        attacker.creature.name
                     )
                     return False
         return True
@@ -319,7 +321,8 @@ class CombatManager:
         """Assign normal combat damage."""
         self.game_engine.log_event("Combat damage")
         
-        # All creatures deal damage (except those that only have first strike)
+        # All creatures deal damage (except those that only have first strike,
+        # and those destroyed by first strike damage)
         all_combatants = []
         
         for attacker in self.attackers:
@@ -327,6 +330,8 @@ class CombatManager:
             if (self._has_ability(attacker.creature, CombatAbility.FIRST_STRIKE) and
                 not self._has_ability(attacker.creature, CombatAbility.DOUBLE_STRIKE)):
                 continue
+            if self.is_destroyed(attacker.creature):
+                continue
             all_combatants.append(('attacker', attacker))
         
         for blocker in self.blockers:
@@ -334,6 +339,8 @@ class CombatManager:
             if (self._has_ability(blocker.creature, CombatAbility.FIRST_STRIKE) and
                 not self._has_ability(blocker.creature, CombatAbility.DOUBLE_STRIKE)):
                 continue
+            if self.is_destroyed(blocker.creature):
+                continue
             all_combatants.append(('blocker', blocker))
         
         # Assign damage
@@ -380,13 +387,15 @@ class CombatManager:
             attacker.damage_dealt = power
         
         else:
-            # Deal damage to blockers
+            # Deal damage to blockers (a blocked attacker whose blockers were all
+            # destroyed deals no damage unless it tramples)
             has_trample = self._has_ability(attacker.creature, CombatAbility.TRAMPLE)
+            blockers = [b for b in attacker.blockers if not self.is_destroyed(b)]
             
             # Active player assigns damage order among blockers
             damage_remaining = power
             
-            for blocker in attacker.blockers:
+            for blocker in blockers:
                 if damage_remaining <= 0:
                     break
                 
@@ -394,7 +403,7 @@ class CombatManager:
                 # If only a single blocker, special rules apply: if attacker has trample,
                 # assign only enough to be lethal to blocker and pass the rest to player;
                 # otherwise (no trample), attacker may assign all damage to the single blocker.
-                if len(attacker.blockers) == 1:
+                if len(blockers) == 1:
                     if has_trample:
                         damage_to_blocker = min(damage_remaining, blocker_toughness)
                     else:
@@ -459,16 +468,20 @@ class CombatManager:
                     controller = self.game_engine.players[damage_obj.source.controller]
                     controller.life += damage_obj.amount
                     self.game_engine.log_event(
-                        f"{damage_obj.source.name} lifelink: +{damage_obj.amount} life"
+                        "%s lifelink: +%s life",
+                        damage_obj.source.name, damage_obj.amount
                     )
                 
                 self.game_engine.log_event(
-                    f"{damage_obj.source.name} deals {damage_obj.amount} damage to player {damage_obj.target.player_id}"
+                    "%s deals %s damage to player %s",
+                    damage_obj.source.name, damage_obj.amount, damage_obj.target.player_id
                 )
             
             # Damage to creature
             elif hasattr(damage_obj.target, 'damage'):
                 damage_obj.target.damage += damage_obj.amount
+                if damage_obj.amount > 0 and self._has_ability(damage_obj.source, CombatAbility.DEATHTOUCH):
+                    self.deathtouched.add(id(damage_obj.target))
                 
                 # Lifelink
                 if self._has_ability(damage_obj.source, CombatAbility.LIFELINK):
@@ -476,7 +489,8 @@ class CombatManager:
                     controller.life += damage_obj.amount
                 
                 self.game_engine.log_event(
-                    f"{damage_obj.source.name} deals {damage_obj.amount} damage to {damage_obj.target.name}"
+                    "%s deals %s damage to %s",
+                    damage_obj.source.name, damage_obj.amount, damage_obj.target.name
                 )
         
         # Clear damage queue
@@ -486,24 +500,32 @@ class CombatManager:
         """Remove creatures that died from combat damage."""
         # Check all creatures for lethal damage
         for player in self.game_engine.players:
-            for creature in player.battlefield[:]:
-                if not creature.is_creature():
-                    continue
-                
+            for creature in player.battlefield.creatures():
                 toughness = creature.toughness or 0
                 
-                # Lethal damage
-                if creature.damage >= toughness:
+                # Lethal damage, or any damage from a deathtouch source
+                if creature.damage >= toughness or id(creature) in self.deathtouched:
                     self.game_engine.move_to_graveyard(creature)
-                
-                # Deathtouch (any damage is lethal)
-                elif creature.damage > 0:
-                    # Check if any damage source had deathtouch
-                    for damage_obj in self.combat_damage:
-                        if (damage_obj.target == creature and
-                            self._has_ability(damage_obj.source, CombatAbility.DEATHTOUCH)):
-                            self.game_engine.move_to_graveyard(creature)
-                            break
+    
+    def is_destroyed(self, creature) -> bool:
+        """
+        Check if a combatant was destroyed earlier in this combat.
+        
+        A creature that left the battlefield, has lethal damage marked, or
+        was dealt damage by a deathtouch source deals no further combat damage.
+        
+        Args:
+            creature: Attacking or blocking creature
+            
+        Returns:
+            True if the creature was destroyed
+        """
+        from app.game.game_engine import Zone
+        
+        if getattr(creature, 'zone', Zone.BATTLEFIELD) != Zone.BATTLEFIELD:
+            return True
+        return (getattr(creature, 'damage', 0) >= (creature.toughness or 0) or
+                id(creature) in self.deathtouched)
     
     def end_combat(self):
         """End combat phase - clean up."""
@@ -513,6 +535,7 @@ class CombatManager:
         self.attackers.clear()
         self.blockers.clear()
         self.combat_damage.clear()
+        self.deathtouched.clear()
     
     def _has_ability(self, creature, ability: CombatAbility) -> bool:
         """
@@ -0,0 +1,771 @@
+"""
+Combat planner for AI attack and block decisions.
+
+Enumerates attack and block assignments and scores them by simulating
+combat damage with CombatManager's rules (first strike, double strike,
+deathtouch, trample, lifelink, flying/reach and menace), so the AI weighs
+multi-blocks, trades and the opponent's crack-back next turn instead of
+sorting creatures by power.
+
+Creatures are reduced to stat signatures: identical creatures (tokens) are
+searched once, and results are memoized by board signature. Searches are
+branch-and-bound from a greedy plan under an evaluation budget; once the
+budget is spent the best plan found so far is used, which keeps planning
+fast with 20+ creatures on the battlefield. A search takes the same steps
+whatever its budget, so a larger budget never gives a worse plan.
+
+Classes:
+    GroupOutcome: Result of one attacker fighting its blockers
+    BlockPlan: Chosen blocks with their predicted result
+    AttackPlan: Chosen attackers with the expected blocks
+    CombatPlanner: Attack and block search
+
+Functions:
+    creature_signature: Combat stat signature of a creature
+    signature_value: Material value of a creature signature
+    resolve_group: Simulate combat damage for one attacker and its blockers
+
+Usage:
+    planner = CombatPlanner(max_evaluations=20000)
+    attack = planner.plan_attacks(my_attackers, their_untapped, my_life, their_life)
+    blocks = planner.plan_blocks(attackers, my_untapped, my_life)
+    for blocker, attacker in blocks.pairs:
+        combat_manager.declare_blocker(blocker, attacker)
+"""
+
+import logging
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.game.combat_manager import CombatAbility
+
+logger = logging.getLogger(__name__)
+
+# (power, toughness, damage marked, ability bitmask)
+Signature = Tuple[int, int, int, int]
+
+ABILITY_BITS = {ability: 1 << index for index, ability in enumerate(CombatAbility)}
+FLYING = ABILITY_BITS[CombatAbility.FLYING]
+REACH = ABILITY_BITS[CombatAbility.REACH]
+FIRST_STRIKE = ABILITY_BITS[CombatAbility.FIRST_STRIKE]
+DOUBLE_STRIKE = ABILITY_BITS[CombatAbility.DOUBLE_STRIKE]
+TRAMPLE = ABILITY_BITS[CombatAbility.TRAMPLE]
+VIGILANCE = ABILITY_BITS[CombatAbility.VIGILANCE]
+MENACE = ABILITY_BITS[CombatAbility.MENACE]
+DEATHTOUCH = ABILITY_BITS[CombatAbility.DEATHTOUCH]
+LIFELINK = ABILITY_BITS[CombatAbility.LIFELINK]
+DEFENDER = ABILITY_BITS[CombatAbility.DEFENDER]
+
+# Value added to a creature per keyword, on top of its stats
+KEYWORD_VALUES = {
+    FLYING: 1.5,
+    REACH: 0.5,
+    FIRST_STRIKE: 1.0,
+    DOUBLE_STRIKE: 2.0,
+    TRAMPLE: 0.5,
+    VIGILANCE: 0.5,
+    MENACE: 1.0,
+    DEATHTOUCH: 1.5,
+    LIFELINK: 1.0,
+}
+
+# Score of losing the game; dominates any material swing
+LETHAL = 10000.0
+# Value of one life point at 1 life (scaled down as life grows)
+LIFE_SCALE = 6.0
+
+
+def creature_signature(card: Any) -> Signature:
+    """
+    Get the combat stat signature of a creature.
+
+    Abilities are read from oracle text the way CombatManager._has_ability
+    does, so the planner and the engine agree on keywords.
+
+    Args:
+        card: Creature card (engine Card or any object with power/toughness)
+
+    Returns:
+        (power, toughness, damage, ability bitmask) tuple
+    """
+    text = (getattr(card, 'oracle_text', '') or '').lower()
+    mask = 0
+    for ability, bit in ABILITY_BITS.items():
+        if ability.value.replace('_', ' ') in text:
+            mask |= bit
+    return (
+        max(getattr(card, 'power', 0) or 0, 0),
+        getattr(card, 'toughness', 0) or 0,
+        getattr(card, 'damage', 0) or 0,
+        mask,
+    )
+
+
+@lru_cache(maxsize=4096)
+def signature_value(signature: Signature) -> float:
+    """Material value of a creature: stats plus keyword bonuses."""
+    power, toughness, _, mask = signature
+    value = 1.0 + 1.5 * power + toughness
+    for bit, bonus in KEYWORD_VALUES.items():
+        if mask & bit:
+            value += bonus
+    return value
+
+
+def life_point_value(life: int) -> float:
+    """Value of one point of life; each point matters more at low life."""
+    return LIFE_SCALE / max(life, 1)
+
+
+def can_block_signature(blocker: Signature, attacker: Signature) -> bool:
+    """Check the flying/reach restriction between two signatures."""
+    return not attacker[3] & FLYING or bool(blocker[3] & (FLYING | REACH))
+
+
+def _deals_damage(mask: int, first_strike_step: bool) -> bool:
+    """Whether a creature deals damage in the first strike or regular step."""
+    if first_strike_step:
+        return bool(mask & (FIRST_STRIKE | DOUBLE_STRIKE))
+    return not mask & FIRST_STRIKE or bool(mask & DOUBLE_STRIKE)
+
+
+@dataclass(frozen=True)
+class GroupOutcome:
+    """Result of one attacker fighting its blockers."""
+    attacker_dies: bool
+    blockers_dead: Tuple[bool, ...]
+    player_damage: int
+    attacker_life_gain: int = 0
+    defender_life_gain: int = 0
+
+
+@lru_cache(maxsize=65536)
+def resolve_group(attacker: Signature, blockers: Tuple[Signature, ...]) -> GroupOutcome:
+    """
+    Simulate combat damage between one attacker and its blockers.
+
+    Mirrors CombatManager: first strike and double strike creatures deal
+    damage first and creatures killed then deal no regular damage; the
+    attacker assigns lethal damage to each blocker in order (one point with
+    deathtouch), a lone remaining blocker takes everything unless the
+    attacker tramples, and trample excess goes to the defending player.
+
+    Args:
+        attacker: Attacker signature
+        blockers: Blocker signatures in damage assignment order
+
+    Returns:
+        GroupOutcome
+    """
+    a_power, a_toughness, a_marked, a_mask = attacker
+    marked = [b[2] for b in blockers]
+    alive = [b[1] - b[2] > 0 for b in blockers]
+    touched = [False] * len(blockers)
+    attacker_alive = a_toughness - a_marked > 0
+    attacker_touched = False
+    player_damage = attacker_gain = defender_gain = 0
+
+    for first_strike_step in (True, False):
+        hits = []
+        if attacker_alive and a_power > 0 and _deals_damage(a_mask, first_strike_step):
+            remaining = a_power
+            if not blockers:
+                player_damage += a_power
+                remaining = 0
+            else:
+                living = [i for i, is_alive in enumerate(alive) if is_alive]
+                for position, i in enumerate(living):
+                    if remaining <= 0:
+                        break
+                    if a_mask & DEATHTOUCH:
+                        amount = 1
+                    elif position == len(living) - 1 and not a_mask & TRAMPLE:
+                        amount = remaining
+                    else:
+                        amount = min(remaining, blockers[i][1] - marked[i])
+                    hits.append((i, amount))
+                    remaining -= amount
+                if a_mask & TRAMPLE and remaining > 0:
+                    player_damage += remaining
+                    remaining = 0
+            if a_mask & LIFELINK:
+                attacker_gain += a_power - remaining
+
+        to_attacker = 0
+        for i, blocker in enumerate(blockers):
+            power, _, _, mask = blocker
+            if alive[i] and power > 0 and _deals_damage(mask, first_strike_step):
+                to_attacker += power
+                attacker_touched = attacker_touched or bool(mask & DEATHTOUCH)
+                if mask & LIFELINK:
+                    defender_gain += power
+
+        # Damage is dealt simultaneously within a step
+        for i, amount in hits:
+            marked[i] += amount
+            touched[i] = touched[i] or (amount > 0 and bool(a_mask & DEATHTOUCH))
+        a_marked += to_attacker
+        for i, blocker in enumerate(blockers):
+            if alive[i] and (marked[i] >= blocker[1] or touched[i]):
+                alive[i] = False
+        if attacker_alive and (a_marked >= a_toughness or attacker_touched):
+            attacker_alive = False
+
+    return GroupOutcome(
+        attacker_dies=not attacker_alive,
+        blockers_dead=tuple(not is_alive for is_alive in alive),
+        player_damage=player_damage,
+        attacker_life_gain=attacker_gain,
+        defender_life_gain=defender_gain,
+    )
+
+
+@dataclass
+class BlockPlan:
+    """Chosen blocks and their predicted result."""
+    pairs: List[Tuple[Any, Any]] = field(default_factory=list)  # (blocker, attacker)
+    value: float = 0.0  # Defender's score: material swing minus life cost
+    damage_taken: int = 0
+    exact: bool = True  # False when the budget ran out before the search finished
+
+
+@dataclass
+class AttackPlan:
+    """Chosen attackers and the blocks expected in response."""
+    attackers: List[Any] = field(default_factory=list)
+    expected_blocks: List[Tuple[Any, Any]] = field(default_factory=list)
+    score: float = 0.0
+    lethal: bool = False
+    exact: bool = True
+
+
+class _SignaturePool:
+    """Maps signatures back to the concrete cards they came from."""
+
+    def __init__(self, cards: Sequence[Any]):
+        self.cards: Dict[Signature, List[Any]] = defaultdict(list)
+        for card in cards:
+            self.cards[creature_signature(card)].append(card)
+
+    def take(self, signature: Signature) -> Any:
+        """Take a card with the given signature."""
+        return self.cards[signature].pop()
+
+
+class CombatPlanner:
+    """
+    Plans attacks and blocks by searching combat outcomes.
+
+    Blocks are searched attacker by attacker (biggest first) over groups of
+    up to max_blockers_per_attacker blockers, with an upper bound of
+    "every remaining attacker dies for free" pruning branches that can't
+    beat the best plan found. Attacks are scored against the defender's
+    best blocks plus the damage the opponent's survivors can swing back
+    with next turn; small boards enumerate every attack, large ones
+    hill-climb from the most promising attacks.
+    """
+
+    def __init__(self, max_evaluations: int = 20000, max_blockers_per_attacker: int = 2,
+                 aggression: float = 0.5, exhaustive_attack_limit: int = 128,
+                 cache_size: int = 4096):
+        """
+        Initialize planner.
+
+        Args:
+            max_evaluations: Search nodes and damage simulations per plan
+            max_blockers_per_attacker: Largest block group considered
+            aggression: 0-1, how little the crack-back next turn is feared
+            exhaustive_attack_limit: Try every attack when there are at most
+                this many distinct attacks, otherwise search locally
+            cache_size: Block plans memoized across calls
+        """
+        self.max_evaluations = max_evaluations
+        self.max_blockers_per_attacker = max(1, max_blockers_per_attacker)
+        self.aggression = aggression
+        self.exhaustive_attack_limit = exhaustive_attack_limit
+        self.cache_size = cache_size
+        self.evaluations = 0  # Evaluations used by the last plan
+        self._remaining = 0
+        self._block_cache: 'OrderedDict[Tuple, Tuple[float, Tuple, bool]]' = OrderedDict()
+
+    def clear_cache(self):
+        """Forget memoized block plans."""
+        self._block_cache.clear()
+
+    def plan_blocks(self, attackers: Sequence[Any], blockers: Sequence[Any],
+                    life: int) -> BlockPlan:
+        """
+        Choose blocks against declared attackers.
+
+        Args:
+            attackers: Attacking creatures (or Attacker objects)
+            blockers: Untapped creatures able to block
+            life: Defending player's life
+
+        Returns:
+            BlockPlan with (blocker, attacker) pairs; each attacker's blockers
+            are listed in the order they should be declared
+        """
+        attackers = [getattr(a, 'creature', a) for a in attackers]
+        self._remaining = self.max_evaluations
+        attacker_sigs = self._order(creature_signature(a) for a in attackers)
+        blocker_sigs = tuple(sorted(creature_signature(b) for b in blockers))
+
+        value, plan, exact = self._best_blocks(attacker_sigs, blocker_sigs, life,
+                                               self.max_evaluations)
+        self.evaluations = self.max_evaluations - self._remaining
+
+        attacker_pool = _SignaturePool(attackers)
+        blocker_pool = _SignaturePool(blockers)
+        pairs = []
+        damage = 0
+        for attacker_sig, group in zip(attacker_sigs, plan):
+            attacker = attacker_pool.take(attacker_sig)
+            pairs.extend((blocker_pool.take(sig), attacker) for sig in group)
+            damage += resolve_group(attacker_sig, group).player_damage
+
+        logger.debug(f"Block plan: {len(pairs)} blocks, value {value:.1f}, "
+                     f"{self.evaluations} evaluations")
+        return BlockPlan(pairs=pairs, value=value, damage_taken=damage, exact=exact)
+
+    def plan_attacks(self, candidates: Sequence[Any], blockers: Sequence[Any], life: int,
+                     opponent_life: int, own_creatures: Sequence[Any] = (),
+                     opponent_creatures: Optional[Sequence[Any]] = None) -> AttackPlan:
+        """
+        Choose which creatures attack.
+
+        Args:
+            candidates: Creatures able to attack
+            blockers: Opponent's untapped creatures able to block
+            life: Attacking player's life
+            opponent_life: Defending player's life
+            own_creatures: Other creatures staying home (blockers next turn)
+            opponent_creatures: All opponent creatures that can attack next
+                turn (defaults to blockers)
+
+        Returns:
+            AttackPlan
+        """
+        self._remaining = self.max_evaluations
+        if opponent_creatures is None:
+            opponent_creatures = blockers
+        candidate_sigs = [creature_signature(c) for c in candidates]
+        distinct = sorted(set(candidate_sigs), key=signature_value, reverse=True)
+        limits = tuple(Counter(candidate_sigs)[sig] for sig in distinct)
+        blocker_sigs = tuple(sorted(creature_signature(b) for b in blockers))
+        opponent_sigs = [creature_signature(c) for c in opponent_creatures]
+        own_sigs = [creature_signature(c) for c in own_creatures]
+        # Each response gets the budget plan_blocks would have, so attacks
+        # are judged against the blocks the defender will actually find
+        block_budget = self.max_evaluations
+        crack_weight = 1.0 - 0.5 * self.aggression
+        own_life_point = life_point_value(life)
+        results: Dict[Tuple[int, ...], Tuple[float, Tuple, bool]] = {}
+
+        def attack_sigs(counts):
+            return self._order(sig for sig, count in zip(distinct, counts) for _ in range(count))
+
+        def evaluate(counts):
+            if counts in results:
+                return results[counts][0]
+            attacking = attack_sigs(counts)
+            defender_value, plan, exact = self._best_blocks(
+                attacking, blocker_sigs, opponent_life, block_budget
+            )
+            outcomes = [resolve_group(a, group) for a, group in zip(attacking, plan)]
+            gained = sum(outcome.attacker_life_gain for outcome in outcomes)
+            score = -defender_value + gained * own_life_point
+            if defender_value > -LETHAL / 2:
+                dead = Counter(
+                    sig for group, outcome in zip(plan, outcomes)
+                    for sig, is_dead in zip(group, outcome.blockers_dead) if is_dead
+                )
+                survivors = list((Counter(opponent_sigs) - dead).elements())
+                home = own_sigs + [
+                    sig for sig, count, limit in zip(distinct, counts, limits)
+                    for _ in range(limit - count)
+                ] + [
+                    sig for sig, outcome in zip(attacking, outcomes)
+                    if sig[3] & VIGILANCE and not outcome.attacker_dies
+                ]
+                score -= crack_weight * self._crack_back(survivors, home, life + gained)
+            results[counts] = (score, plan, exact)
+            return score
+
+        def upper_bound(counts):
+            # Unblocked damage plus lifelink, ignoring the crack-back
+            damage = lifelink = 0
+            for sig, count in zip(distinct, counts):
+                hit = sig[0] * (2 if sig[3] & DOUBLE_STRIKE else 1) * count
+                damage += hit
+                if sig[3] & LIFELINK:
+                    lifelink += hit
+            cost = LETHAL if damage >= opponent_life else damage * life_point_value(opponent_life)
+            return cost + lifelink * own_life_point
+
+        none = tuple(0 for _ in distinct)
+        best = none
+        best_score = evaluate(none)
+        space = 1
+        for limit in limits:
+            space *= limit + 1
+
+        if space <= self.exhaustive_attack_limit:
+            options = sorted(product(*(range(limit + 1) for limit in limits)),
+                             key=upper_bound, reverse=True)
+            for counts in options:
+                if upper_bound(counts) <= best_score or self._remaining <= 0:
+                    break
+                score = evaluate(counts)
+                if score > best_score:
+                    best, best_score = counts, score
+        else:
+            best, best_score = self._hill_climb(
+                distinct, limits, evaluate, upper_bound, best, best_score, blocker_sigs
+            )
+
+        self.evaluations = self.max_evaluations - self._remaining
+        score, plan, exact = results[best]
+        attacking = attack_sigs(best)
+        candidate_pool = _SignaturePool(candidates)
+        blocker_pool = _SignaturePool(blockers)
+        chosen = [candidate_pool.take(sig) for sig in attacking]
+        expected = [
+            (blocker_pool.take(sig), attacker)
+            for attacker, group in zip(chosen, plan) for sig in group
+        ]
+        lethal = score >= LETHAL / 2
+        logger.debug(f"Attack plan: {len(chosen)} of {len(candidates)} attack, "
+                     f"score {score:.1f}, {self.evaluations} evaluations")
+        return AttackPlan(attackers=chosen, expected_blocks=expected, score=score,
+                          lethal=lethal, exact=exact and self._remaining > 0)
+
+    def _hill_climb(self, distinct, limits, evaluate, upper_bound, best, best_score,
+                    blocker_sigs):
+        """Improve an attack one creature at a time until no move helps."""
+        everything = tuple(limits)
+        # Creatures no single blocker can kill while surviving
+        safe = tuple(
+            limit if not any(
+                can_block_signature(b, sig) and resolve_group(sig, (b,)).attacker_dies
+                and not resolve_group(sig, (b,)).blockers_dead[0]
+                for b in set(blocker_sigs)
+            ) else 0
+            for sig, limit in zip(distinct, limits)
+        )
+        for start in (everything, safe):
+            if self._remaining <= 0:
+                break
+            score = evaluate(start)
+            if score > best_score:
+                best, best_score = start, score
+
+        improved = True
+        while improved and self._remaining > 0:
+            improved = False
+            moves = []
+            for k, limit in enumerate(limits):
+                for step in (1, -1):
+                    count = best[k] + step
+                    if 0 <= count <= limit:
+                        moves.append(best[:k] + (count,) + best[k + 1:])
+            for counts in sorted(moves, key=upper_bound, reverse=True):
+                if self._remaining <= 0:
+                    break
+                if upper_bound(counts) <= best_score:
+                    continue
+                score = evaluate(counts)
+                if score > best_score:
+                    best, best_score = counts, score
+                    improved = True
+                    break
+        return best, best_score
+
+    def _crack_back(self, attackers: List[Signature], blockers: List[Signature],
+                    life: int) -> float:
+        """
+        Estimate the cost of the opponent's attack next turn.
+
+        The opponent attacks with everything; our cheapest creatures chump
+        the biggest attackers they can legally block (two for menace).
+        """
+        attackers = sorted(
+            (sig for sig in attackers if sig[0] > 0 and not sig[3] & DEFENDER),
+            key=lambda sig: sig[0], reverse=True
+        )
+        available = sorted(blockers, key=signature_value)
+        damage = 0
+        for attacker in attackers:
+            power = attacker[0] * (2 if attacker[3] & DOUBLE_STRIKE else 1)
+            legal = [i for i, b in enumerate(available) if can_block_signature(b, attacker)]
+            needed = 2 if attacker[3] & MENACE else 1
+            if len(legal) < needed:
+                damage += power
+                continue
+            group = [available[i] for i in legal[:needed]]
+            for i in reversed(legal[:needed]):
+                del available[i]
+            if attacker[3] & TRAMPLE:
+                damage += max(power - sum(b[1] - b[2] for b in group), 0)
+        if damage >= life:
+            return LETHAL
+        return damage * life_point_value(life)
+
+    @staticmethod
+    def _order(signatures) -> Tuple[Signature, ...]:
+        """Order attackers for the block search: most valuable first."""
+        return tuple(sorted(signatures, key=lambda sig: (-signature_value(sig), sig)))
+
+    def _block_options(self, attacker: Signature, distinct: Tuple[Signature, ...],
+                       totals: Tuple[int, ...], life_point: float, budget: List[int],
+                       multi: bool = False) -> Optional[List]:
+        """
+        List block groups for one attacker, best first.
+
+        Groups are tuples of indexes into distinct in damage assignment order
+        (the attacker kills its most valuable blocker first). The basic
+        groups are no block, each lone blocker and, for a menace attacker,
+        the pair of its least valuable legal blockers; with multi the
+        cheapest other multi-blocks are listed instead (at most one per
+        legal blocker), skipping those that include a lone blocker that
+        already kills the attacker and survives.
+
+        Basic groups are always listed; multi-blocks stop when the budget
+        runs out, and then None is returned.
+        """
+        legal = [k for k, sig in enumerate(distinct) if can_block_signature(sig, attacker)]
+        attacker_value = signature_value(attacker)
+        menace = attacker[3] & MENACE
+        options = []
+
+        def resolve(group):
+            ordered = tuple(sorted(group, key=lambda k: (-signature_value(distinct[k]), k)))
+            return ordered, resolve_group(attacker, tuple(distinct[k] for k in ordered))
+
+        def add(ordered, outcome):
+            budget[0] -= 1
+            material = outcome.defender_life_gain * life_point
+            if outcome.attacker_dies:
+                material += attacker_value
+            for k, is_dead in zip(ordered, outcome.blockers_dead):
+                if is_dead:
+                    material -= signature_value(distinct[k])
+            options.append((ordered, material, outcome.player_damage))
+
+        # The cheapest legal pair: blockers are sorted by signature, which
+        # puts the least valuable first
+        pair = tuple((legal[:1] * 2 if legal and totals[legal[0]] > 1 else legal)[:2])
+        if not multi:
+            add(*resolve(()))
+            if menace:
+                if len(pair) == 2:
+                    add(*resolve(pair))
+            else:
+                for k in legal:
+                    add(*resolve((k,)))
+            options.sort(key=lambda option: option[1] - option[2] * life_point, reverse=True)
+            return options
+
+        clean = set()
+        if not menace:
+            for k in legal:
+                _, outcome = resolve((k,))
+                if outcome.attacker_dies and not outcome.blockers_dead[0]:
+                    clean.add(k)
+        groups = []
+        for size in range(2, self.max_blockers_per_attacker + 1):
+            for group in combinations_with_replacement(legal, size):
+                if menace and group == pair:
+                    continue
+                if clean.intersection(group):
+                    continue
+                # Groups that can't kill the attacker are no better than a lone
+                # block (menace attackers can't be blocked alone)
+                if (not menace and sum(distinct[k][0] for k in group) < attacker[1] - attacker[2]
+                        and not any(distinct[k][3] & DEATHTOUCH for k in group)):
+                    continue
+                if any(group.count(k) > totals[k] for k in set(group)):
+                    continue
+                groups.append(group)
+        # The cheapest groups, at most one per legal blocker
+        groups.sort(key=lambda group: (sum(signature_value(distinct[k]) for k in group), group))
+        for group in groups[:len(legal)]:
+            if budget[0] <= 0:
+                return None
+            add(*resolve(group))
+
+        options.sort(key=lambda option: option[1] - option[2] * life_point, reverse=True)
+        return options
+
+    def _best_blocks(self, attackers: Tuple[Signature, ...], blockers: Tuple[Signature, ...],
+                     life: int, limit: int) -> Tuple[float, Tuple, bool]:
+        """
+        Search block assignments for the defender.
+
+        Every step the search takes is the same whatever the budget; the
+        budget only decides where it stops, and the best plan found by then
+        is kept. A larger budget therefore never gives a worse plan.
+
+        Args:
+            attackers: Attacker signatures, search order
+            blockers: Sorted blocker signatures
+            life: Defender's life
+            limit: Evaluations this search may use (also capped by the
+                planner's remaining budget)
+
+        Returns:
+            Tuple of (value, groups of blocker signatures per attacker, exact)
+        """
+        key = (attackers, blockers, life)
+        cached = self._block_cache.get(key)
+        if cached is not None:
+            self._block_cache.move_to_end(key)
+            return cached
+
+        n = len(attackers)
+        distinct = tuple(sorted(set(blockers)))
+        totals = tuple(blockers.count(sig) for sig in distinct)
+        life_point = life_point_value(life)
+        budget = [min(limit, self._remaining)]
+        start = budget[0]
+        cut = [False]
+        # Greedy completions tried at the first search nodes
+        probes = [n]
+
+        def penalty(taken):
+            return LETHAL if taken >= life else taken * life_point
+
+        def available(group, counts):
+            if len(group) == 1:
+                return counts[group[0]] > 0
+            return all(counts[k] >= group.count(k) for k in group)
+
+        def remove(group, counts):
+            counts = list(counts)
+            for k in group:
+                counts[k] -= 1
+            return tuple(counts)
+
+        def greedy(options, i=0, counts=None, taken=0):
+            # Best block for each attacker in turn, with and without
+            # multi-blocks; if that lets lethal damage through, block to take
+            # the least damage instead
+            results = []
+            start_counts, start_taken = totals if counts is None else counts, taken
+            for survive, single in product((False, True), (True, False)):
+                counts, taken = start_counts, start_taken
+                total = 0.0
+                plan = []
+                for j in range(i, n):
+                    best = None
+                    for group, material, damage in options[j]:
+                        if single and len(group) > 1 or not available(group, counts):
+                            continue
+                        if survive:
+                            score = (-damage, -len(group), material)
+                        else:
+                            score = (material - penalty(taken + damage) + penalty(taken), 0)
+                        if best is None or score > best[0]:
+                            best = (score, group, material, damage)
+                    _, group, material, damage = best
+                    counts = remove(group, counts)
+                    taken += damage
+                    total += material
+                    plan.append(group)
+                results.append((total - penalty(taken), tuple(plan)))
+            return max(results, key=lambda result: result[0])
+
+        def make_search(options):
+            suffix = [0.0] * (n + 1)
+            for i in range(n - 1, -1, -1):
+                suffix[i] = suffix[i + 1] + max(option[1] for option in options[i])
+            memo = {}
+
+            def search(i, counts, taken, floor):
+                if i == n:
+                    return -penalty(taken), ()
+                state = (i, counts, min(taken, life))
+                entry = memo.get(state)
+                if entry is not None:
+                    value, plan, is_exact = entry
+                    if is_exact or value <= floor:
+                        return value, plan
+                bound = suffix[i] - penalty(taken)
+                if bound <= floor:
+                    return bound, None
+
+                best, best_plan = float('-inf'), None
+                if probes[0] > 0 and budget[0] > 0:
+                    # A greedy completion is a plan to beat that doesn't
+                    # depend on where the budget runs out
+                    probes[0] -= 1
+                    budget[0] -= n - i
+                    best, best_plan = greedy(options, i, counts, taken)
+                # Options are sorted by material minus linear life cost, which
+                # never underestimates them, so the first one below the floor
+                # ends the loop
+                base = suffix[i + 1] - taken * life_point
+                for group, material, damage in options[i]:
+                    if material - damage * life_point + base <= max(floor, best):
+                        break
+                    if not available(group, counts):
+                        continue
+                    if material + suffix[i + 1] - penalty(taken + damage) <= max(floor, best):
+                        continue
+                    if budget[0] <= 0:
+                        cut[0] = True
+                        break
+                    budget[0] -= 1
+                    value, plan = search(i + 1, remove(group, counts), taken + damage,
+                                         max(floor, best) - material)
+                    if material + value > best:
+                        # A pruned child (plan None) never beats the floor, so
+                        # the parent discards this node's plan as well
+                        best = material + value
+                        best_plan = None if plan is None else (group,) + plan
+                # A node cut short wasn't searched fully: only the best plan
+                # found in it so far goes up, and nothing is memoized
+                if not cut[0]:
+                    memo[state] = (best, best_plan, best > floor)
+                return best, best_plan
+
+            return search
+
+        # Lone blocks (and menace chump pairs) give the first greedy plan;
+        # multi-blocks are listed next and the search starts from the better
+        # greedy plan with or without them
+        basic = {}
+        for sig in attackers:
+            if sig not in basic:
+                basic[sig] = self._block_options(sig, distinct, totals, life_point, budget)
+        options = [basic[sig] for sig in attackers]
+        value, plan = greedy(options)
+
+        merged = dict(basic)
+        if self.max_blockers_per_attacker > 1:
+            for sig in basic:
+                multi = self._block_options(sig, distinct, totals, life_point, budget, multi=True)
+                if multi is None:
+                    cut[0] = True
+                    break
+                merged[sig] = sorted(basic[sig] + multi, reverse=True,
+                                     key=lambda option: option[1] - option[2] * life_point)
+        if not cut[0]:
+            options = [merged[sig] for sig in attackers]
+            merged_value, merged_plan = greedy(options)
+            if merged_value > value:
+                value, plan = merged_value, merged_plan
+            found, found_plan = make_search(options)(0, totals, 0, value)
+            if found_plan is not None and found > value:
+                value, plan = found, found_plan
+
+        self._remaining -= start - budget[0]
+        result = (value, tuple(tuple(distinct[k] for k in group) for group in plan), not cut[0])
+        if result[2]:
+            self._block_cache[key] = result
+            if len(self._block_cache) > self.cache_size:
+                self._block_cache.popitem(last=False)
+        return result
@@ -12,7 +12,8 @@ Classes:
     AIStrategy: Enum of AI strategies
     AIDifficulty: Enum of difficulty levels
     AIDecision: AI decision with reasoning
-    BoardEvaluator: Evaluates board position
+    ZoneAggregate: Running totals for one zone
+    BoardEvaluator: Evaluates board position incrementally
     EnhancedAI: Main AI opponent
 
 Usage:
@@ -32,9 +33,37 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from app.game.combat_planner import CombatPlanner
+from app.game.zones import CardZone
+
 logger = logging.getLogger(__name__)
 
 
+def _is_creature(card: Any) -> bool:
+    """Check whether a card is a creature (engine cards or plain objects)."""
+    is_creature = getattr(card, 'is_creature', None)
+    if callable(is_creature):
+        return is_creature()
+    return getattr(card, 'power', None) is not None
+
+
+def _is_land(card: Any) -> bool:
+    """Check whether a card is a land."""
+    is_land = getattr(card, 'is_land', False)
+    return is_land() if callable(is_land) else bool(is_land)
+
+
+def _is_tapped(card: Any) -> bool:
+    """Check a card's tapped state (engine cards use 'tapped', others 'is_tapped')."""
+    return bool(getattr(card, 'tapped', False) or getattr(card, 'is_tapped', False))
+
+
+def _mana_value(card: Any) -> int:
+    """Get a card's mana value from its mana cost string."""
+    from app.game.mana_cost import compile_mana_cost
+    return compile_mana_cost(getattr(card, 'mana_cost', '') or '').mana_value
+
+
 class AIStrategy(Enum):
     """AI play strategies."""
     AGGRO = auto()          # Aggressive, fast damage
@@ -66,9 +95,53 @@ class AIDecision:
         return f"{self.decision_type}: {self.action} ({self.confidence:.2f})"
 
 
+# Card attributes the board score and creature values read
+EVALUATION_ATTRIBUTES = frozenset({
+    'power', 'toughness', 'keywords', 'types', 'type_line',
+})
+
+# Creature value added per keyword (others count 0.5)
+KEYWORD_BONUS = {
+    'flying': 2.0,
+    'trample': 1.5,
+    'first_strike': 1.5,
+    'double_strike': 3.0,
+    'deathtouch': 2.0,
+    'lifelink': 1.5,
+    'haste': 1.0,
+    'vigilance': 1.0,
+}
+
+
+@dataclass
+class ZoneAggregate:
+    """Running totals for one zone, kept current by zone events."""
+    creature_power: int = 0
+    lands: int = 0
+    # id(card) -> (power counted, is land) for cards that report changes
+    contributions: Dict[int, Tuple[int, bool]] = field(default_factory=dict)
+    # Cards that can't report their own changes are re-read on every use
+    untracked: Dict[int, Any] = field(default_factory=dict)
+    best_target: Optional[Any] = None
+    best_target_valid: bool = False
+
+
+def _contribution(card: Any) -> Tuple[int, bool]:
+    """A card's share of the zone totals: (creature power, is land)."""
+    power = (card.power or 0) if _is_creature(card) else 0
+    return power, _is_land(card)
+
+
 class BoardEvaluator:
     """
     Evaluates board position and assigns scores.
+    
+    Zone totals (creature power, land count) and per-creature values are
+    kept incrementally: the evaluator subscribes to each CardZone it reads
+    and updates its aggregates from enter/leave/change events, so scoring a
+    board costs a few lookups instead of a rescan. Cards that can't report
+    their own changes and zones that are plain lists are read in full every
+    time, so scores always equal a full recomputation.
     """
     
     def __init__(self):
@@ -80,6 +153,89 @@ class BoardEvaluator:
             'mana_sources': 1.5,
             'tempo': 2.0,
         }
+        self._aggregates: Dict[int, ZoneAggregate] = {}
+        self._zones: Dict[int, CardZone] = {}
+        self._creature_values: Dict[int, Tuple[Any, float]] = {}
+    
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+    
+    def _aggregate(self, zone) -> Optional[ZoneAggregate]:
+        """Totals for a zone, subscribing to it on first use (None for lists)."""
+        if not isinstance(zone, CardZone):
+            return None
+        aggregate = self._aggregates.get(id(zone))
+        if aggregate is None:
+            aggregate = ZoneAggregate()
+            self._aggregates[id(zone)] = aggregate
+            self._zones[id(zone)] = zone
+            zone.add_listener(self._on_zone_event)
+            for card in zone:
+                self._add_card(aggregate, card)
+        return aggregate
+    
+    def _add_card(self, aggregate: ZoneAggregate, card: Any):
+        """Count a card that entered a zone."""
+        if not getattr(type(card), 'TRACKS_CHANGES', False):
+            aggregate.untracked[id(card)] = card
+            return
+        power, is_land = _contribution(card)
+        aggregate.contributions[id(card)] = (power, is_land)
+        aggregate.creature_power += power
+        aggregate.lands += is_land
+    
+    def _remove_card(self, aggregate: ZoneAggregate, card: Any):
+        """Stop counting a card that left a zone."""
+        if aggregate.untracked.pop(id(card), None) is not None:
+            return
+        power, is_land = aggregate.contributions.pop(id(card), (0, False))
+        aggregate.creature_power -= power
+        aggregate.lands -= is_land
+    
+    def _on_zone_event(self, event: str, zone, card, attribute: Optional[str]):
+        """Update zone totals and cached values from a zone event."""
+        aggregate = self._aggregates.get(id(zone))
+        if aggregate is None:
+            return
+        if event == 'change':
+            if attribute is not None and attribute not in EVALUATION_ATTRIBUTES:
+                return
+            self._remove_card(aggregate, card)
+            self._add_card(aggregate, card)
+        elif event == 'enter':
+            self._add_card(aggregate, card)
+        else:
+            self._remove_card(aggregate, card)
+        self._creature_values.pop(id(card), None)
+        aggregate.best_target_valid = False
+    
+    def detach(self):
+        """Unsubscribe from every zone and drop cached state."""
+        for zone in self._zones.values():
+            zone.remove_listener(self._on_zone_event)
+        self._zones.clear()
+        self._aggregates.clear()
+        self._creature_values.clear()
+    
+    def _zone_totals(self, zone) -> Tuple[int, int]:
+        """(creature power, land count) of a zone."""
+        aggregate = self._aggregate(zone)
+        if aggregate is None:
+            cards = list(zone)
+            power, lands = 0, 0
+        else:
+            cards = aggregate.untracked.values()
+            power, lands = aggregate.creature_power, aggregate.lands
+        for card in cards:
+            card_power, is_land = _contribution(card)
+            power += card_power
+            lands += is_land
+        return power, lands
+    
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
     
     def evaluate_board(self, game_engine, player_id: int) -> float:
         """
@@ -87,74 +243,91 @@ class BoardEvaluator:
         Returns score (positive = good, negative = bad).
         """
         score = 0.0
+        zones = game_engine.zones
+        opponents = [i for i in range(len(game_engine.players)) if i != player_id]
         
         # Life total
         player_life = game_engine.players[player_id].life
         opponent_life = sum(
-            p.life for i, p in enumerate(game_engine.players)
-            if i != player_id
+            game_engine.players[i].life for i in opponents
         ) / max(1, len(game_engine.players) - 1)
         
         score += (player_life - opponent_life) * self.weights['life']
         
         # Card advantage
-        hand_size = len(game_engine.zones[player_id]['hand'])
+        hand_size = len(zones[player_id]['hand'])
         opponent_hand = sum(
-            len(game_engine.zones[i]['hand'])
-            for i in range(len(game_engine.players))
-            if i != player_id
+            len(zones[i]['hand']) for i in opponents
         ) / max(1, len(game_engine.players) - 1)
         
         score += (hand_size - opponent_hand) * self.weights['cards_in_hand']
         
         # Board presence
-        battlefield = game_engine.zones[player_id]['battlefield']
-        creatures = [c for c in battlefield if hasattr(c, 'power')]
-        creature_power = sum(c.power for c in creatures if hasattr(c, 'power'))
-        
-        opponent_creatures = []
-        for i in range(len(game_engine.players)):
-            if i != player_id:
-                opponent_bf = game_engine.zones[i]['battlefield']
-                opponent_creatures.extend([c for c in opponent_bf if hasattr(c, 'power')])
-        
-        opponent_power = sum(c.power for c in opponent_creatures if hasattr(c, 'power'))
+        creature_power, lands = self._zone_totals(zones[player_id]['battlefield'])
+        opponent_power = sum(
+            self._zone_totals(zones[i]['battlefield'])[0] for i in opponents
+        )
         
         score += (creature_power - opponent_power) * self.weights['creatures']
         
         # Mana sources
-        lands = [c for c in battlefield if hasattr(c, 'is_land') and c.is_land]
-        score += len(lands) * self.weights['mana_sources']
+        score += lands * self.weights['mana_sources']
         
         return score
     
     def evaluate_creature(self, creature: Any) -> float:
-        """Evaluate a creature's value."""
-        if not hasattr(creature, 'power') or not hasattr(creature, 'toughness'):
+        """
+        Evaluate a creature's value.
+        
+        Values of cards in a tracked zone are cached until one of the
+        attributes they depend on is written or the card changes zones.
+        """
+        container = getattr(creature, '__dict__', {}).get('_zone_container')
+        cacheable = container is not None and self._aggregate(container) is not None
+        if cacheable:
+            cached = self._creature_values.get(id(creature))
+            if cached is not None and cached[0] is creature:
+                return cached[1]
+        
+        value = self._creature_value(creature)
+        if cacheable:
+            self._creature_values[id(creature)] = (creature, value)
+        return value
+    
+    @staticmethod
+    def _creature_value(creature: Any) -> float:
+        """Compute a creature's value from its stats and keywords."""
+        if not _is_creature(creature):
             return 0.0
         
         # Base value from stats
-        value = creature.power + creature.toughness
+        value = (creature.power or 0) + (getattr(creature, 'toughness', None) or 0)
         
         # Bonus for keywords
         if hasattr(creature, 'keywords'):
-            keyword_bonus = {
-                'flying': 2.0,
-                'trample': 1.5,
-                'first_strike': 1.5,
-                'double_strike': 3.0,
-                'deathtouch': 2.0,
-                'lifelink': 1.5,
-                'haste': 1.0,
-                'vigilance': 1.0,
-            }
-            
             for keyword in creature.keywords:
                 kw_name = keyword.value if hasattr(keyword, 'value') else str(keyword)
-                value += keyword_bonus.get(kw_name.lower(), 0.5)
+                value += KEYWORD_BONUS.get(kw_name.lower(), 0.5)
         
         return value
     
+    def _best_in_zone(self, zone) -> Optional[Tuple[float, Any]]:
+        """Highest-valued creature of a zone (first in zone order on ties)."""
+        aggregate = self._aggregate(zone)
+        if aggregate is not None and aggregate.best_target_valid and not aggregate.untracked:
+            best = aggregate.best_target
+        else:
+            best = None
+            for card in zone:
+                if _is_creature(card):
+                    value = self.evaluate_creature(card)
+                    if best is None or value > best[0]:
+                        best = (value, card)
+            if aggregate is not None:
+                aggregate.best_target = best
+                aggregate.best_target_valid = True
+        return best
+    
     def find_best_target(
         self,
         game_engine,
@@ -162,25 +335,21 @@ class BoardEvaluator:
         target_type: str = "creature"
     ) -> Optional[Any]:
         """Find best target for removal/damage."""
-        targets = []
+        if target_type != "creature":
+            return None
         
-        # Find all valid targets
+        # Best creature of each opponent, kept per zone between calls
+        best = None
+        zones = game_engine.zones
         for i in range(len(game_engine.players)):
             if i == player_id:
                 continue
             
-            battlefield = game_engine.zones[i]['battlefield']
-            if target_type == "creature":
-                targets.extend([c for c in battlefield if hasattr(c, 'power')])
-        
-        if not targets:
-            return None
-        
-        # Evaluate and sort
-        scored = [(self.evaluate_creature(t), t) for t in targets]
-        scored.sort(reverse=True, key=lambda x: x[0])
+            candidate = self._best_in_zone(zones[i]['battlefield'])
+            if candidate is not None and (best is None or candidate[0] > best[0]):
+                best = candidate
         
-        return scored[0][1] if scored else None
+        return best[1] if best else None
 
 
 class EnhancedAI:
@@ -207,6 +376,10 @@ class EnhancedAI:
         # Strategy-specific parameters
         self.aggression = self._get_aggression()
         self.risk_tolerance = self._get_risk_tolerance()
+        self.combat_planner = CombatPlanner(
+            max_evaluations=self._get_search_budget(),
+            aggression=self.aggression
+        )
         
         logger.info(
             f"AI Player {player_id} initialized: "
@@ -235,6 +408,16 @@ class EnhancedAI:
         }
         return tolerance_map.get(self.difficulty, 0.5)
     
+    def _get_search_budget(self) -> int:
+        """Get combat planner evaluations per decision based on difficulty."""
+        budget_map = {
+            AIDifficulty.EASY: 500,
+            AIDifficulty.MEDIUM: 5000,
+            AIDifficulty.HARD: 20000,
+            AIDifficulty.EXPERT: 50000,
+        }
+        return budget_map.get(self.difficulty, 5000)
+    
     def make_decision(self, game_engine) -> AIDecision:
         """
         Make a decision based on current game state.
@@ -256,15 +439,15 @@ class EnhancedAI:
     
     def _decide_aggro(self, game_engine, board_score: float) -> AIDecision:
         """Make aggressive decisions."""
-        hand = game_engine.zones[self.player_id]['hand']
+        castable = self._castable(game_engine)
         
         # Priority: Play creatures, attack, burn spells
         
         # 1. Play cheap creatures
-        creatures = [c for c in hand if hasattr(c, 'power') and hasattr(c, 'mana_cost')]
+        creatures = [c for c in castable if _is_creature(c)]
         if creatures:
             # Sort by cost (play cheapest first)
-            creatures.sort(key=lambda c: len(c.mana_cost))
+            creatures.sort(key=_mana_value)
             return AIDecision(
                 decision_type="play_creature",
                 action=creatures[0],
@@ -276,7 +459,7 @@ class EnhancedAI:
         battlefield = game_engine.zones[self.player_id]['battlefield']
         attackers = [
             c for c in battlefield
-            if hasattr(c, 'power') and not getattr(c, 'is_tapped', False)
+            if _is_creature(c) and not _is_tapped(c)
         ]
         if attackers:
             return AIDecision(
@@ -288,7 +471,7 @@ class EnhancedAI:
         
         # 3. Play burn spells
         damage_spells = [
-            c for c in hand
+            c for c in castable
             if hasattr(c, 'spell_effect') and 'damage' in c.oracle_text.lower()
         ]
         if damage_spells:
@@ -326,9 +509,11 @@ class EnhancedAI:
                 confidence=0.9
             )
         
+        castable = self._castable(game_engine)
+        
         # 2. Remove threats
         removal = [
-            c for c in hand
+            c for c in castable
             if 'destroy' in c.oracle_text.lower() or 'exile' in c.oracle_text.lower()
         ]
         if removal:
@@ -343,7 +528,7 @@ class EnhancedAI:
         
         # 3. Draw cards
         draw_spells = [
-            c for c in hand
+            c for c in castable
             if 'draw' in c.oracle_text.lower()
         ]
         if draw_spells:
@@ -356,7 +541,7 @@ class EnhancedAI:
         
         # 4. Play threats when safe
         if board_score > 5.0:  # We're ahead
-            creatures = [c for c in hand if hasattr(c, 'power')]
+            creatures = [c for c in castable if _is_creature(c)]
             if creatures:
                 return AIDecision(
                     decision_type="play_creature",
@@ -375,20 +560,14 @@ class EnhancedAI:
     
     def _decide_midrange(self, game_engine, board_score: float) -> AIDecision:
         """Make balanced midrange decisions."""
-        hand = game_engine.zones[self.player_id]['hand']
-        
         # Balanced approach: value creatures, removal, card advantage
         
         # 1. Play on-curve threats
-        available_mana = self._estimate_available_mana(game_engine)
-        playable = [
-            c for c in hand
-            if hasattr(c, 'mana_cost') and len(c.mana_cost) <= available_mana
-        ]
+        playable = self._castable(game_engine)
         
         if playable:
             # Play best value card
-            creatures = [c for c in playable if hasattr(c, 'power')]
+            creatures = [c for c in playable if _is_creature(c)]
             if creatures:
                 # Evaluate creatures
                 best = max(creatures, key=self.evaluator.evaluate_creature)
@@ -404,7 +583,7 @@ class EnhancedAI:
             battlefield = game_engine.zones[self.player_id]['battlefield']
             attackers = [
                 c for c in battlefield
-                if hasattr(c, 'power') and not getattr(c, 'is_tapped', False)
+                if _is_creature(c) and not _is_tapped(c)
             ]
             return AIDecision(
                 decision_type="attack",
@@ -438,7 +617,7 @@ class EnhancedAI:
             )
         elif choice == 'attack':
             battlefield = game_engine.zones[self.player_id]['battlefield']
-            creatures = [c for c in battlefield if hasattr(c, 'power')]
+            creatures = [c for c in battlefield if _is_creature(c)]
             if creatures:
                 attackers = random.sample(creatures, k=random.randint(1, len(creatures)))
                 return AIDecision(
@@ -456,14 +635,15 @@ class EnhancedAI:
         )
     
     def _estimate_available_mana(self, game_engine) -> int:
-        """Estimate available mana."""
-        battlefield = game_engine.zones[self.player_id]['battlefield']
-        lands = [
-            c for c in battlefield
-            if hasattr(c, 'is_land') and c.is_land
-            and not getattr(c, 'is_tapped', False)
+        """Estimate available mana (floating mana plus untapped sources)."""
+        return game_engine.legal_actions.available_mana(self.player_id)
+    
+    def _castable(self, game_engine) -> List[Any]:
+        """Cards in hand that can be cast right now, timing and mana included."""
+        return [
+            action.card
+            for action in game_engine.legal_actions.castable_spells(self.player_id)
         ]
-        return len(lands)
     
     def _should_attack(self, game_engine, board_score: float) -> bool:
         """Determine if we should attack."""
@@ -471,6 +651,77 @@ class EnhancedAI:
         threshold = -5.0 + (self.aggression * 10.0)
         return board_score > threshold
     
+    def choose_attackers(self, game_engine) -> List[Any]:
+        """
+        Choose creatures to attack with this combat.
+        
+        Aggressive strategies attack with everything that can; otherwise
+        the combat planner picks the attack with the best outcome against
+        the opponent's best blocks and their attack back next turn. When the
+        board doesn't favor attacking, only a lethal attack is made.
+        
+        Args:
+            game_engine: GameEngine in the declare attackers step
+        
+        Returns:
+            List of attacking creatures
+        """
+        defender = (self.player_id + 1) % len(game_engine.players)
+        candidates = game_engine.legal_actions.attackers(self.player_id, defender)
+        if not candidates:
+            return []
+        
+        board_score = self.evaluator.evaluate_board(game_engine, self.player_id)
+        if self.aggression >= 0.9:
+            return candidates
+        
+        candidate_ids = {id(c) for c in candidates}
+        own = [
+            c for c in game_engine.zones[self.player_id]['battlefield']
+            if _is_creature(c) and not _is_tapped(c) and id(c) not in candidate_ids
+        ]
+        opponents = [c for c in game_engine.zones[defender]['battlefield'] if _is_creature(c)]
+        plan = self.combat_planner.plan_attacks(
+            candidates,
+            [c for c in opponents if not _is_tapped(c)],
+            game_engine.players[self.player_id].life,
+            game_engine.players[defender].life,
+            own_creatures=own,
+            opponent_creatures=opponents
+        )
+        if not plan.lethal and not self._should_attack(game_engine, board_score):
+            return []
+        return plan.attackers
+    
+    def choose_blockers(self, game_engine, attackers: List[Any]) -> List[Tuple[Any, Any]]:
+        """
+        Choose blocks against declared attackers.
+        
+        The combat planner searches single and multi-blocks, trades and
+        chump blocks; the pairs come back in declaration order.
+        
+        Args:
+            game_engine: GameEngine in the declare blockers step
+            attackers: Attacking creatures
+            
+        Returns:
+            List of (blocker, attacker) pairs
+        """
+        combat_manager = getattr(game_engine, 'combat_manager', None)
+        blockers = [
+            c for c in game_engine.zones[self.player_id]['battlefield']
+            if _is_creature(c) and not _is_tapped(c)
+        ]
+        life = game_engine.players[self.player_id].life
+        plan = self.combat_planner.plan_blocks(attackers, blockers, life)
+        
+        if combat_manager is None:
+            return plan.pairs
+        return [
+            (blocker, attacker) for blocker, attacker in plan.pairs
+            if combat_manager.can_block(blocker, attacker)[0]
+        ]
+    
     def execute_decision(self, game_engine, decision: AIDecision) -> bool:
         """
         Execute a decision.
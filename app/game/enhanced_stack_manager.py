@@ -128,7 +128,7 @@ class EnhancedStackManager:
         logger.info(f"Player {controller} casts {name}")
         
         if hasattr(self.game_engine, 'log_event'):
-            self.game_engine.log_event(f"Player {controller} casts {name}")
+            self.game_engine.log_event("Player %s casts %s", controller, name)
         
         return True
     
@@ -164,7 +164,7 @@ class EnhancedStackManager:
         logger.info(f"Player {controller} activates {name}")
         
         if hasattr(self.game_engine, 'log_event'):
-            self.game_engine.log_event(f"Player {controller} activates {name}")
+            self.game_engine.log_event("Player %s activates %s", controller, name)
         
         return True
     
@@ -200,7 +200,7 @@ class EnhancedStackManager:
         logger.info(f"Triggered: {name}")
         
         if hasattr(self.game_engine, 'log_event'):
-            self.game_engine.log_event(f"Triggered: {name}")
+            self.game_engine.log_event("Triggered: %s", name)
         
         return True
     
@@ -221,7 +221,7 @@ class EnhancedStackManager:
         logger.info(f"{top.name} is countered")
         
         if hasattr(self.game_engine, 'log_event'):
-            self.game_engine.log_event(f"{top.name} is countered")
+            self.game_engine.log_event("%s is countered", top.name)
         
         return True
     
@@ -241,7 +241,7 @@ class EnhancedStackManager:
                 logger.info(f"{name} is countered")
                 
                 if hasattr(self.game_engine, 'log_event'):
-                    self.game_engine.log_event(f"{name} is countered")
+                    self.game_engine.log_event("%s is countered", name)
                 
                 return True
         
@@ -264,7 +264,7 @@ class EnhancedStackManager:
         if item.countered:
             logger.info(f"{item.name} was countered and does not resolve")
             if hasattr(self.game_engine, 'log_event'):
-                self.game_engine.log_event(f"{item.name} was countered")
+                self.game_engine.log_event("%s was countered", item.name)
             return False
         
         # Resolve the item
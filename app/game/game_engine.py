@@ -37,7 +37,9 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict
-from datetime import datetime
+
+from app.game.game_log import DEFAULT_LOG_CAPACITY, GameEventType, GameLog
+from app.game.zones import CardZone, CombinedZoneView, TrackedCard
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,7 @@ try:
     from app.game.phase_manager import PhaseManager
     from app.game.enhanced_stack_manager import EnhancedStackManager
     from app.game.combat_manager import CombatManager
+    from app.game.legal_actions import LegalActionGenerator
 except ImportError as e:
     logger.warning(f"Could not import game systems: {e}")
     TriggerManager = None
@@ -61,6 +64,7 @@ except ImportError as e:
     PhaseManager = None
     EnhancedStackManager = None
     CombatManager = None
+    LegalActionGenerator = None
 
 
 class GamePhase(Enum):
@@ -117,8 +121,8 @@ class CardType(Enum):
 
 
 @dataclass
-class Card:
-    """Represents a card in the game."""
+class Card(TrackedCard):
+    """Represents a card in the game (attribute writes are reported to its zone)."""
     name: str
     types: List[str]
     mana_cost: str = ""
@@ -169,6 +173,20 @@ class Card:
         return self.is_land() or "add" in self.oracle_text.lower()
 
 
+# Player attributes that bump Player.state_version (player-level SBAs read these)
+PLAYER_STATE_FIELDS = frozenset({'life', 'poison_counters', 'lost_game'})
+
+# Player attribute name -> zone, used to bind CardZones in Player.__setattr__
+PLAYER_ZONES = {
+    'library': Zone.LIBRARY,
+    'hand': Zone.HAND,
+    'battlefield': Zone.BATTLEFIELD,
+    'graveyard': Zone.GRAVEYARD,
+    'exile': Zone.EXILE,
+    'command_zone': Zone.COMMAND,
+}
+
+
 @dataclass
 class Player:
     """Represents a player in the game."""
@@ -177,13 +195,13 @@ class Player:
     life: int = 20
     poison_counters: int = 0
     
-    # Zones
-    library: List[Card] = field(default_factory=list)
-    hand: List[Card] = field(default_factory=list)
-    battlefield: List[Card] = field(default_factory=list)
-    graveyard: List[Card] = field(default_factory=list)
-    exile: List[Card] = field(default_factory=list)
-    command_zone: List[Card] = field(default_factory=list)
+    # Zones (plain lists passed in or assigned later are wrapped in CardZones)
+    library: CardZone = field(default_factory=list)
+    hand: CardZone = field(default_factory=list)
+    battlefield: CardZone = field(default_factory=list)
+    graveyard: CardZone = field(default_factory=list)
+    exile: CardZone = field(default_factory=list)
+    command_zone: CardZone = field(default_factory=list)
     
     # Mana pool - using proper ManaPool class
     mana_pool: 'ManaPool' = field(default=None)
@@ -199,6 +217,35 @@ class Player:
         if self.mana_pool is None and ManaPool is not None:
             self.mana_pool = ManaPool(self.player_id)
     
+    def __setattr__(self, name, value):
+        """
+        Wrap zone assignments in CardZones sharing this player's location index
+        (and listed in `zones` by name), and bump `state_version` when life,
+        poison or loss status changes.
+        """
+        zone = PLAYER_ZONES.get(name)
+        if zone is not None:
+            locations = self.__dict__.setdefault('_card_locations', {})
+            if not (isinstance(value, CardZone) and value._locations is locations):
+                value = CardZone(zone, value, locations=locations)
+            zone_name = 'command' if name == 'command_zone' else name
+            self.__dict__.setdefault('zones', {})[zone_name] = value
+        elif name in PLAYER_STATE_FIELDS:
+            self.__dict__['state_version'] = self.__dict__.get('state_version', 0) + 1
+        super().__setattr__(name, value)
+    
+    def zone_of(self, card) -> Optional[CardZone]:
+        """
+        Find which of this player's zones holds a card (O(1)).
+        
+        Args:
+            card: Card to look up
+            
+        Returns:
+            CardZone holding the card, or None
+        """
+        return self._card_locations.get(id(card))
+    
     def add_mana(self, color: str, amount: int = 1):
         """
         Add mana to pool.
@@ -292,15 +339,14 @@ class Player:
             logger.warning(f"Player {self.player_id} tried to draw from empty library")
             return None
         
-        card = self.library.pop(0)
-        card.zone = Zone.HAND
+        card = self.library.popleft()
         self.hand.append(card)
         logger.info(f"Player {self.player_id} drew {card.name}")
         return card
     
     def shuffle_library(self):
         """Shuffle library."""
-        random.shuffle(self.library)
+        self.library.shuffle()
         logger.info(f"Player {self.player_id} shuffled library")
 
 
@@ -321,13 +367,16 @@ class GameEngine:
     Handles turn structure, priority, state-based actions, and win conditions.
     """
     
-    def __init__(self, num_players: int = 2, starting_life: int = 20):
+    def __init__(self, num_players: int = 2, starting_life: int = 20,
+                 log_enabled: bool = True, log_capacity: int = DEFAULT_LOG_CAPACITY):
         """
         Initialize game engine.
         
         Args:
             num_players: Number of players (2-4 typically)
             starting_life: Starting life total
+            log_enabled: Record game events (turn off for simulations)
+            log_capacity: Number of recent events kept in the game log
         """
         self.num_players = num_players
         self.starting_life = starting_life
@@ -341,11 +390,16 @@ class GameEngine:
         self.current_step: GameStep = GameStep.UNTAP
         
         self.stack: List[Dict] = []  # Stack of spells/abilities
+        self._battlefield_view: Optional[CombinedZoneView] = None
+        self._zones: List[Dict[str, CardZone]] = []
         self.game_over: bool = False
         self.winner: Optional[int] = None
         
         # Game log
-        self.game_log: List[str] = []
+        self.game_log = GameLog(capacity=log_capacity, enabled=log_enabled)
+        
+        # Called with the engine at the end of each step (safe points for snapshots)
+        self.step_listeners: List[Callable] = []
         
         # Initialize new game systems
         self.trigger_manager = TriggerManager(self) if TriggerManager else None
@@ -355,6 +409,7 @@ class GameEngine:
         self.phase_manager = PhaseManager(self) if PhaseManager else None
         self.stack_manager = EnhancedStackManager(self) if EnhancedStackManager else None
         self.combat_manager = CombatManager(self) if CombatManager else None
+        self.legal_actions = LegalActionGenerator(self) if LegalActionGenerator else None
         # Note: Tests should not rely on toggling engine behavior via flags.
         # Use deterministic test helpers / fixtures (e.g. resolve_stack_and_check_sbas)
         # to avoid changing runtime semantics for production code.
@@ -426,16 +481,72 @@ class GameEngine:
         """Get the player with priority."""
         return self.players[self.priority_player_index]
     
-    def log_event(self, message: str):
-        """Log a game event."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_msg = f"[{timestamp}] Turn {self.turn_number} - {message}"
-        self.game_log.append(log_msg)
-        logger.info(message)
+    def log_event(self, message: str, *args):
+        """
+        Log a game event.
+        
+        Args:
+            message: Message, or %-style template when args are given
+            *args: Template arguments, formatted only if the log is read
+        """
+        if self.game_log.enabled:
+            self.game_log.message(message, *args, turn=self.turn_number)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(message % args if args else message)
+    
+    def record_event(self, event_type: GameEventType, *payload):
+        """
+        Record a structured game event.
+        
+        Args:
+            event_type: Event type id
+            *payload: Event data, rendered only if the log is read
+        """
+        if self.game_log.enabled:
+            self.game_log.record(event_type, *payload, turn=self.turn_number)
+    
+    def set_logging(self, enabled: bool):
+        """
+        Switch game event logging on or off.
+        
+        Args:
+            enabled: False to record nothing (e.g. for simulations)
+        """
+        self.game_log.enabled = enabled
+    
+    def add_step_listener(self, callback: Callable):
+        """
+        Register a callback run at the end of each step.
+        
+        The game state is consistent at these points (no half-applied
+        actions), so they are where auto-save takes its snapshots.
+        
+        Args:
+            callback: Function called with this engine
+        """
+        self.step_listeners.append(callback)
+    
+    def remove_step_listener(self, callback: Callable):
+        """
+        Unregister a step listener.
+        
+        Args:
+            callback: Previously registered callback
+        """
+        if callback in self.step_listeners:
+            self.step_listeners.remove(callback)
+    
+    def notify_step_end(self):
+        """Run the step listeners (called when a step ends)."""
+        for callback in list(self.step_listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Step listener failed: {e}")
     
     def begin_turn(self):
         """Begin a new turn."""
-        self.log_event(f"=== Turn {self.turn_number} - {self.active_player.name} ===")
+        self.record_event(GameEventType.TURN_BEGIN, self.turn_number, self.active_player.name)
         
         # Reset turn-based flags
         self.active_player.has_drawn_this_turn = False
@@ -480,11 +591,11 @@ class GameEngine:
         
         # Skip draw on first turn for first player (optional rule)
         if self.turn_number == 1 and self.active_player_index == 0:
-            self.log_event(f"{self.active_player.name} skips first draw")
+            self.log_event("%s skips first draw", self.active_player.name)
         else:
             card = self.active_player.draw_card()
             if card:
-                self.log_event(f"{self.active_player.name} draws a card")
+                self.record_event(GameEventType.DRAW, self.active_player.name)
             else:
                 # Drawing from empty library loses the game
                 self.active_player.lost_game = True
@@ -495,7 +606,7 @@ class GameEngine:
     def main_phase(self):
         """Main phase - play lands, cast spells."""
         phase_name = "precombat main" if self.current_phase == GamePhase.PRECOMBAT_MAIN else "postcombat main"
-        self.log_event(f"Main phase ({phase_name})")
+        self.log_event("Main phase (%s)", phase_name)
         self.current_step = GameStep.MAIN
         self.give_priority()
     
@@ -563,7 +674,7 @@ class GameEngine:
                     self.log_event(f"ERROR: Player {player_id} failed to pay cost for {card.name}")
                     return False
         # For now, just log it
-        self.log_event(f"{player.name} casts {card.name}")
+        self.record_event(GameEventType.CAST, player.name, card.name)
         
         # Move card from hand to stack
         player.hand.remove(card)
@@ -585,7 +696,7 @@ class GameEngine:
                     card.summoning_sick = card.is_creature()
                     player.battlefield.append(card)
                 
-                game_engine.log_event(f"{card.name} resolves")
+                game_engine.record_event(GameEventType.RESOLVE, card.name)
                 game_engine.check_state_based_actions()
             
             effect_to_use = resolve_effect if resolve_effect is not None else internal_resolve_effect
@@ -706,14 +817,12 @@ class GameEngine:
             # Would prompt for discard choice
             # For now, discard randomly
             card = self.active_player.hand.pop()
-            card.zone = Zone.GRAVEYARD
             self.active_player.graveyard.append(card)
-            self.log_event(f"{self.active_player.name} discards {card.name}")
+            self.record_event(GameEventType.DISCARD, self.active_player.name, card.name)
         
         # Remove damage from creatures
-        for card in self.active_player.battlefield:
-            if card.is_creature():
-                card.damage = 0
+        for card in self.active_player.battlefield.creatures():
+            card.damage = 0
         
         # Empty mana pools
         for player in self.players:
@@ -724,7 +833,8 @@ class GameEngine:
     
     def end_turn(self):
         """End the current turn."""
-        self.log_event(f"=== End of turn {self.turn_number} ===\n")
+        self.notify_step_end()
+        self.record_event(GameEventType.TURN_END, self.turn_number)
         
         # Move to next player
         self.active_player_index = (self.active_player_index + 1) % len(self.players)
@@ -762,7 +872,7 @@ class GameEngine:
             return
         
         item = self.stack.pop()
-        self.log_event(f"Resolving: {item.get('name', 'unknown')}")
+        self.log_event("Resolving: %s", item.get('name', 'unknown'))
         # Resolution logic would go here
         
         # After resolving, give priority again
@@ -770,6 +880,7 @@ class GameEngine:
     
     def advance_step(self):
         """Advance to the next step/phase."""
+        self.notify_step_end()
         # This is a simplified version - real game has complex step progression
         if self.current_step == GameStep.DRAW:
             self.current_phase = GamePhase.PRECOMBAT_MAIN
@@ -795,31 +906,30 @@ class GameEngine:
             # Life <= 0
             if player.life <= 0:
                 player.lost_game = True
-                self.log_event(f"{player.name} loses (life <= 0)")
+                self.record_event(GameEventType.PLAYER_LOSES, player.name, "life <= 0")
             
             # Poison counters >= 10
             if player.poison_counters >= 10:
                 player.lost_game = True
-                self.log_event(f"{player.name} loses (poison)")
+                self.record_event(GameEventType.PLAYER_LOSES, player.name, "poison")
             
             # Tried to draw from empty library
             if not player.library and player.has_drawn_this_turn:
                 player.lost_game = True
-                self.log_event(f"{player.name} loses (decked)")
+                self.record_event(GameEventType.PLAYER_LOSES, player.name, "decked")
         
         # Check creature damage
         for player in self.players:
-            for card in player.battlefield[:]:  # Copy list for safe removal
-                if card.is_creature():
-                    # Lethal damage
-                    if card.damage >= (card.toughness or 0):
-                        self.move_to_graveyard(card)
-                        self.log_event(f"{card.name} dies (lethal damage)")
-                    
-                    # 0 toughness
-                    if (card.toughness or 0) <= 0:
-                        self.move_to_graveyard(card)
-                        self.log_event(f"{card.name} dies (0 toughness)")
+            for card in player.battlefield.creatures():
+                # Lethal damage
+                if card.damage >= (card.toughness or 0):
+                    self.move_to_graveyard(card)
+                    self.record_event(GameEventType.DIES, card.name, "lethal damage")
+                
+                # 0 toughness
+                elif (card.toughness or 0) <= 0:
+                    self.move_to_graveyard(card)
+                    self.record_event(GameEventType.DIES, card.name, "0 toughness")
         
         # Check for game over
         alive_players = [p for p in self.players if not p.lost_game]
@@ -827,7 +937,7 @@ class GameEngine:
             self.game_over = True
             if alive_players:
                 self.winner = alive_players[0].player_id
-                self.log_event(f"GAME OVER - {alive_players[0].name} wins!")
+                self.record_event(GameEventType.GAME_OVER, alive_players[0].name)
             else:
                 self.log_event("GAME OVER - Draw!")
     
@@ -835,14 +945,8 @@ class GameEngine:
         """Move a card to its owner's graveyard."""
         owner = self.players[card.controller]
         
-        # Remove from current zone
-        if card in owner.battlefield:
-            owner.battlefield.remove(card)
-        elif card in owner.hand:
-            owner.hand.remove(card)
-        
-        # Add to graveyard
-        card.zone = Zone.GRAVEYARD
+        # Adding to the graveyard removes the card from whichever of the
+        # owner's zones currently holds it
         owner.graveyard.append(card)
     
     def play_land(self, player: Player, card: Card) -> bool:
@@ -881,37 +985,59 @@ class GameEngine:
             logger.warning("Card is not a land")
             return False
         
-        # Play the land
-        player.hand.remove(card)
-        card.zone = Zone.BATTLEFIELD
+        # Play the land (entering the battlefield takes it out of hand)
         player.battlefield.append(card)
         player.lands_played_this_turn += 1
         
-        self.log_event(f"{player.name} plays {card.name}")
+        self.record_event(GameEventType.PLAY_LAND, player.name, card.name)
         self.check_state_based_actions()
         
         return True
     
     def get_zone(self, zone_name: str, player_id: Optional[int] = None):
-        """Get a zone by name."""
-        # Helper for compatibility with new systems
+        """
+        Get a zone by name.
+        
+        Args:
+            zone_name: 'library', 'hand', 'battlefield', 'graveyard', 'exile' or 'command'
+            player_id: Player whose zone to return; for 'battlefield' without a
+                player, a cached view over every player's battlefield is returned
+            
+        Returns:
+            CardZone (or CombinedZoneView), both exposing `.cards`; None if unknown
+        """
         if player_id is not None:
-            player = self.players[player_id]
-            if zone_name == "library":
-                return type('obj', (object,), {'cards': player.library})
-            elif zone_name == "hand":
-                return type('obj', (object,), {'cards': player.hand})
-            elif zone_name == "graveyard":
-                return type('obj', (object,), {'cards': player.graveyard})
+            attr = 'command_zone' if zone_name == 'command' else zone_name
+            if PLAYER_ZONES.get(attr) is not None:
+                return getattr(self.players[player_id], attr)
+            return None
         
         if zone_name == "battlefield":
-            all_battlefield = []
-            for player in self.players:
-                all_battlefield.extend(player.battlefield)
-            return type('obj', (object,), {'cards': all_battlefield})
+            return self.battlefield
         
         return None
     
+    @property
+    def battlefield(self) -> CombinedZoneView:
+        """Cached view over every player's battlefield."""
+        if self._battlefield_view is None:
+            self._battlefield_view = CombinedZoneView(
+                lambda: [player.battlefield for player in self.players]
+            )
+        return self._battlefield_view
+    
+    @property
+    def zones(self) -> List[Dict[str, CardZone]]:
+        """
+        Each player's zones by name (indexed by player id), as used by the AI.
+        
+        The dicts are the players' own `zones`, so the list is only rebuilt
+        when a player is added.
+        """
+        if len(self._zones) != len(self.players):
+            self._zones = [player.zones for player in self.players]
+        return self._zones
+    
     def is_game_over(self) -> bool:
         """Check if game is over."""
         return self.game_over
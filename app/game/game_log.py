@@ -0,0 +1,275 @@
+"""
+Structured game event log.
+
+Game events are recorded as compact tuples (sequence number, time, turn,
+event type id, payload) in a bounded ring buffer. Nothing is formatted when
+an event is recorded: text is rendered only when the viewer or a replay
+reads the log. When the buffer is full the oldest events are dropped, or
+written to a spill file if one is configured. Logging can be switched off
+entirely for simulation runs.
+
+Payloads hold turn numbers and the names the engine already has as
+strings, not integer card or player ids: the engine has no stable ids to
+encode, and names keep rendering and replay independent of game state.
+Message arguments that aren't numbers or strings are stored as str(arg)
+when recorded, so the log never keeps live game objects.
+
+Classes:
+    GameEventType: Event type ids and their text templates
+    GameEvent: A recorded event
+    GameLog: Ring buffer of events that reads like a list of strings
+
+Usage:
+    log = GameLog(capacity=5000)
+    log.record(GameEventType.CAST, "Alice", "Lightning Bolt", turn=3)
+    log.message("%s loses %d life", "Bob", 3, turn=3)
+    print(log[-1])  # "[12:00:01] Turn 3 - Bob loses 3 life"
+    log.enabled = False  # Simulation: record nothing
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from enum import IntEnum
+from pathlib import Path
+from typing import Deque, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_CAPACITY = 5000
+
+
+class GameEventType(IntEnum):
+    """Game event type ids."""
+    MESSAGE = 0  # Free text: payload is (template, *args as numbers or strings)
+    TURN_BEGIN = 1
+    TURN_END = 2
+    DRAW = 3
+    CAST = 4
+    RESOLVE = 5
+    PLAY_LAND = 6
+    DIES = 7
+    PLAYER_LOSES = 8
+    GAME_OVER = 9
+    DISCARD = 10
+
+
+# Text templates, filled with the event payload when rendered
+EVENT_TEMPLATES = {
+    GameEventType.TURN_BEGIN: "=== Turn {0} - {1} ===",
+    GameEventType.TURN_END: "=== End of turn {0} ===\n",
+    GameEventType.DRAW: "{0} draws a card",
+    GameEventType.CAST: "{0} casts {1}",
+    GameEventType.RESOLVE: "{0} resolves",
+    GameEventType.PLAY_LAND: "{0} plays {1}",
+    GameEventType.DIES: "{0} dies ({1})",
+    GameEventType.PLAYER_LOSES: "{0} loses ({1})",
+    GameEventType.GAME_OVER: "GAME OVER - {0} wins!",
+    GameEventType.DISCARD: "{0} discards {1}",
+}
+
+
+class GameEvent(NamedTuple):
+    """A recorded game event."""
+    seq: int
+    time: float
+    turn: int
+    event_type: int
+    payload: Tuple
+
+
+def render_event(event: GameEvent, timestamps: bool = True) -> str:
+    """
+    Render an event as log text.
+
+    Args:
+        event: Event to render
+        timestamps: Include the wall-clock time prefix
+
+    Returns:
+        Human-readable log line
+    """
+    if event.event_type == GameEventType.MESSAGE:
+        template, *args = event.payload
+        text = template % tuple(args) if args else template
+    else:
+        template = EVENT_TEMPLATES.get(event.event_type)
+        if template is None:
+            text = f"Event {event.event_type}: {event.payload}"
+        else:
+            text = template.format(*event.payload)
+
+    line = f"Turn {event.turn} - {text}"
+    if timestamps:
+        line = f"[{time.strftime('%H:%M:%S', time.localtime(event.time))}] {line}"
+    return line
+
+
+class GameLog:
+    """
+    Bounded ring buffer of game events.
+
+    Indexing and iterating yield rendered text, so the log can be used
+    wherever a list of log strings was used before. Use events() or
+    since() for the raw records.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_LOG_CAPACITY,
+        enabled: bool = True,
+        spill_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Initialize game log.
+
+        Args:
+            capacity: Maximum number of events kept in memory
+            enabled: If False, record() and message() do nothing
+            spill_path: JSON lines file that receives events evicted from
+                the buffer (None to discard them)
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._events: Deque[GameEvent] = deque(maxlen=capacity)
+        self._next_seq = 1
+        self._spill_file = None
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent event (0 if none)."""
+        return self._next_seq - 1
+
+    @property
+    def total_events(self) -> int:
+        """Number of events recorded, including evicted ones."""
+        return self._next_seq - 1
+
+    def record(self, event_type: GameEventType, *payload, turn: int = 0):
+        """
+        Record an event.
+
+        Args:
+            event_type: Event type id
+            *payload: Event data (ints and existing strings; not formatted here)
+            turn: Turn number
+        """
+        if not self.enabled:
+            return
+
+        events = self._events
+        if len(events) == self.capacity and self.spill_path is not None:
+            self._spill(events[0])
+
+        events.append(GameEvent(self._next_seq, time.time(), turn, event_type, payload))
+        self._next_seq += 1
+
+    def message(self, template: str, *args, turn: int = 0):
+        """
+        Record a free-text event.
+
+        Args:
+            template: Message, or %-style template when args are given
+            *args: Template arguments, formatted only when rendered
+                (other than numbers and strings, stored as str(arg))
+            turn: Turn number
+        """
+        if self.enabled:
+            args = [arg if isinstance(arg, (int, float, str)) else str(arg) for arg in args]
+            self.record(GameEventType.MESSAGE, template, *args, turn=turn)
+
+    def events(self) -> List[GameEvent]:
+        """Get the buffered events, oldest first."""
+        return list(self._events)
+
+    def since(self, seq: int) -> List[GameEvent]:
+        """
+        Get buffered events newer than a sequence number.
+
+        Args:
+            seq: Last sequence number already seen
+
+        Returns:
+            Events with a higher sequence number, oldest first
+        """
+        newer = []
+        for event in reversed(self._events):
+            if event.seq <= seq:
+                break
+            newer.append(event)
+        newer.reverse()
+        return newer
+
+    def render(self, timestamps: bool = True) -> List[str]:
+        """
+        Render all buffered events as text.
+
+        Args:
+            timestamps: Include the wall-clock time prefix
+
+        Returns:
+            List of log lines
+        """
+        return [render_event(event, timestamps) for event in self._events]
+
+    def clear(self):
+        """Drop all buffered events (sequence numbers keep increasing)."""
+        self._events.clear()
+
+    def close(self):
+        """Close the spill file, if open."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def read_spilled(self) -> Iterator[GameEvent]:
+        """
+        Read events that were spilled to disk.
+
+        Yields:
+            Spilled events, oldest first (payloads as JSON values)
+        """
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        with open(self.spill_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                seq, timestamp, turn, event_type, payload = json.loads(line)
+                yield GameEvent(seq, timestamp, turn, event_type, tuple(payload))
+
+    def _spill(self, event: GameEvent):
+        """Append an evicted event to the spill file."""
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+            self._spill_file.write(json.dumps(
+                [event.seq, event.time, event.turn, int(event.event_type), event.payload],
+                default=str
+            ) + '\n')
+        except OSError as e:
+            logger.error(f"Failed to spill game log to {self.spill_path}: {e}")
+            self.spill_path = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __bool__(self) -> bool:
+        return bool(self._events)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [render_event(event) for event in list(self._events)[index]]
+        return render_event(self._events[index])
+
+    def __iter__(self) -> Iterator[str]:
+        for event in list(self._events):
+            yield render_event(event)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_spill_file'] = None
+        return state
@@ -18,7 +18,10 @@ Usage:
     replay = recorder.stop_recording()
     replay.save_to_file("game.replay")
     
-    # Playback
+    # Or stream to a compact indexed file while playing
+    recorder.start_recording(stream_path="game.mtgr")
+    
+    # Playback (stream files are read lazily)
     player = ReplayPlayer()
     player.load_from_file("game.replay")
     while not player.is_finished():
@@ -33,6 +36,7 @@ from enum import Enum, auto
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -201,12 +205,15 @@ class GameReplay:
         
         Args:
             filepath: Path to save to
-            format: 'json' or 'pickle'
+            format: 'json', 'pickle' or 'stream' (compact indexed container)
         """
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        if format == 'json':
+        if format == 'stream':
+            from app.game.replay_stream import write_replay
+            write_replay(self, path)
+        elif format == 'json':
             with open(path, 'w') as f:
                 json.dump(self.to_dict(), f, indent=2)
         elif format == 'pickle':
@@ -224,11 +231,15 @@ class GameReplay:
         
         Args:
             filepath: Path to load from
-            format: 'json' or 'pickle'
+            format: 'json', 'pickle' or 'stream'
         """
         path = Path(filepath)
         
-        if format == 'json':
+        if format == 'stream':
+            from app.game.replay_stream import ReplayReader
+            with ReplayReader(path) as reader:
+                replay = reader.to_replay(lazy=False)
+        elif format == 'json':
             with open(path, 'r') as f:
                 data = json.load(f)
             replay = cls.from_dict(data)
@@ -265,6 +276,7 @@ class ReplayManager:
         self.current_replay: Optional[GameReplay] = None
         self.is_recording = False
         self.action_count = 0
+        self.stream_writer = None  # ReplayWriter when streaming to disk
         
         logger.info("ReplayManager initialized")
     
@@ -272,9 +284,19 @@ class ReplayManager:
         self,
         game_id: Optional[str] = None,
         player_names: List[str] = None,
-        record_decklists: bool = False
+        record_decklists: bool = False,
+        stream_path: Optional[str] = None
     ):
-        """Start recording a game."""
+        """
+        Start recording a game.
+        
+        Args:
+            game_id: Replay id (default: timestamp based)
+            player_names: Player names
+            record_decklists: Record each player's library
+            stream_path: Also write actions to this replay stream file as
+                they are recorded
+        """
         if self.is_recording:
             logger.warning("Already recording, stopping current replay")
             self.stop_recording()
@@ -293,13 +315,17 @@ class ReplayManager:
         # Record decklists if requested
         if record_decklists:
             for player_id in range(len(self.game_engine.players)):
-                library = self.game_engine.zones[player_id]['library']
+                library = self._zone(player_id, 'library')
                 decklist = [card.name for card in library]
                 self.current_replay.decklists[player_id] = decklist
         
         self.is_recording = True
         self.action_count = 0
         
+        if stream_path:
+            from app.game.replay_stream import ReplayWriter
+            self.stream_writer = ReplayWriter(stream_path, self.current_replay)
+        
         # Record start game action
         self.record_action(
             ActionType.START_GAME,
@@ -329,6 +355,10 @@ class ReplayManager:
             # Calculate statistics
             self._calculate_stats()
             
+            if self.stream_writer:
+                self.stream_writer.close(self.current_replay)
+                self.stream_writer = None
+            
             logger.info(f"Stopped recording game {self.current_replay.game_id}")
             logger.info(f"Recorded {len(self.current_replay.actions)} actions")
         
@@ -359,7 +389,7 @@ class ReplayManager:
             action_type=action_type,
             timestamp=datetime.now().timestamp(),
             turn_number=getattr(self.game_engine, 'turn_number', 0),
-            active_player=getattr(self.game_engine, 'active_player', 0),
+            active_player=self._active_player(),
             actor=actor,
             data=data or {}
         )
@@ -370,29 +400,37 @@ class ReplayManager:
         
         self.current_replay.add_action(action)
         self.action_count += 1
+        if self.stream_writer:
+            self.stream_writer.write_action(action)
         
         logger.debug(f"Recorded action: {action}")
     
     def _capture_state_snapshot(self) -> Dict:
-        """Capture current game state."""
+        """Capture current game state (per-player values indexed by player id)."""
+        players = range(len(self.game_engine.players))
         snapshot = {
             'turn': getattr(self.game_engine, 'turn_number', 0),
-            'active_player': getattr(self.game_engine, 'active_player', 0),
-            'life_totals': {
-                i: player.life 
-                for i, player in enumerate(self.game_engine.players)
-            },
-            'hand_sizes': {
-                i: len(self.game_engine.zones[i]['hand'])
-                for i in range(len(self.game_engine.players))
-            },
-            'library_sizes': {
-                i: len(self.game_engine.zones[i]['library'])
-                for i in range(len(self.game_engine.players))
-            }
+            'active_player': self._active_player(),
+            'life_totals': [player.life for player in self.game_engine.players],
+            'hand_sizes': [len(self._zone(i, 'hand')) for i in players],
+            'library_sizes': [len(self._zone(i, 'library')) for i in players]
         }
         return snapshot
     
+    def _active_player(self) -> int:
+        """Get the active player's id (GameEngine.active_player is a Player)."""
+        index = getattr(self.game_engine, 'active_player_index', None)
+        if index is not None:
+            return index
+        return getattr(self.game_engine, 'active_player', 0)
+    
+    def _zone(self, player_id: int, zone_name: str):
+        """Get a player's zone from the engine's players or zones mapping."""
+        zones = getattr(self.game_engine, 'zones', None)
+        if zones is not None:
+            return zones[player_id][zone_name]
+        return getattr(self.game_engine.players[player_id], zone_name)
+    
     def _calculate_stats(self):
         """Calculate statistics for the replay."""
         if not self.current_replay:
@@ -422,19 +460,66 @@ class ReplayPlayer:
         self.replay: Optional[GameReplay] = None
         self.current_action_index = 0
         self.playback_speed = 1.0  # 1.0 = real-time, 2.0 = 2x speed
+        self._turns: List[int] = []  # Turn numbers where the turn changes
+        self._turn_starts: List[int] = []  # First action index of each entry in _turns
+        self._reader = None  # Open ReplayReader of a lazily loaded stream
         
         logger.info("ReplayPlayer initialized")
     
     def load_replay(self, replay: GameReplay):
         """Load a replay for playback."""
+        self.close()
         self.replay = replay
         self.current_action_index = 0
+        self._build_turn_index()
         logger.info(f"Loaded replay: {replay.game_id}")
     
     def load_from_file(self, filepath: str, format: str = 'json'):
-        """Load replay from file."""
-        self.replay = GameReplay.load_from_file(filepath, format)
+        """
+        Load replay from file.
+        
+        Stream files are opened lazily: actions are read as playback
+        reaches them, and the file stays open until close() or the next load.
+        
+        Args:
+            filepath: Path to load from
+            format: 'json', 'pickle' or 'stream'
+        """
+        self.close()
+        if format == 'stream':
+            from app.game.replay_stream import ReplayReader
+            self._reader = ReplayReader(filepath)
+            self.replay = self._reader.to_replay(lazy=True)
+        else:
+            self.replay = GameReplay.load_from_file(filepath, format)
         self.current_action_index = 0
+        self._build_turn_index()
+    
+    def close(self):
+        """Close the stream file of a lazily loaded replay, if any."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+    
+    def __enter__(self) -> 'ReplayPlayer':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _build_turn_index(self):
+        """Index where each turn starts, for bisect seeking."""
+        actions = self.replay.actions
+        turns = getattr(actions, 'turns', None)
+        if turns is None:
+            turns = []
+            for i, action in enumerate(actions):
+                if not turns or turns[-1][0] != action.turn_number:
+                    turns.append((action.turn_number, i))
+        self._turns = [turn for turn, _ in turns]
+        self._turn_starts = [start for _, start in turns]
+        if any(a > b for a, b in zip(self._turns, self._turns[1:])):
+            logger.warning("Replay turn numbers are not in order, seeking may be inexact")
     
     def is_finished(self) -> bool:
         """Check if playback is finished."""
@@ -464,11 +549,11 @@ class ReplayPlayer:
         if not self.replay:
             return
         
-        for i, action in enumerate(self.replay.actions):
-            if action.turn_number >= turn_number:
-                self.current_action_index = i
-                logger.info(f"Seeked to turn {turn_number}")
-                return
+        i = bisect_left(self._turns, turn_number)
+        if i < len(self._turns):
+            self.current_action_index = self._turn_starts[i]
+            logger.info(f"Seeked to turn {turn_number}")
+            return
         
         # If turn not found, go to end
         self.current_action_index = len(self.replay.actions)
@@ -501,10 +586,35 @@ class ReplayPlayer:
         if not self.replay:
             return []
         
-        return [
-            action for action in self.replay.actions
-            if action.turn_number == turn_number
-        ]
+        actions = []
+        for i in range(bisect_left(self._turns, turn_number), bisect_right(self._turns, turn_number)):
+            end = self._turn_starts[i + 1] if i + 1 < len(self._turn_starts) else len(self.replay.actions)
+            actions.extend(self.replay.actions[self._turn_starts[i]:end])
+        return actions
+    
+    def get_state_at(self, action_index: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get the latest recorded state snapshot at or before an action.
+        
+        Args:
+            action_index: Action index (default: current position)
+            
+        Returns:
+            State snapshot, or None if none was recorded that early
+        """
+        if not self.replay:
+            return None
+        
+        if action_index is None:
+            action_index = self.current_action_index
+        actions = self.replay.actions
+        if hasattr(actions, 'state_at'):
+            return actions.state_at(action_index)
+        
+        for i in range(min(action_index, len(actions) - 1), -1, -1):
+            if actions[i].state_snapshot is not None:
+                return actions[i].state_snapshot
+        return None
     
     def get_summary(self) -> str:
         """Get replay summary."""
@@ -20,7 +20,7 @@ Features:
     - Combat visualization
     - Player life/poison tracking
     - Game log with filtering
-    - Interactive controls
+    - Interactive controls (play buttons enabled from the engine's legal actions)
 
 Usage:
     viewer = GameStateWidget(game_engine)
@@ -38,6 +38,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QColor, QPalette
 
+from app.game.game_log import GameLog, render_event
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,7 +127,10 @@ class PlayerInfoPanel(QWidget):
         
         # Mana pool
         if player.mana_pool:
-            mana_str = ", ".join([f"{count}{color}" for color, count in player.mana_pool.items() if count > 0])
+            pool = getattr(player.mana_pool, 'mana', player.mana_pool)  # ManaPool or legacy dict
+            mana_str = ", ".join([
+                f"{count}{getattr(color, 'value', color)}" for color, count in pool.items() if count > 0
+            ])
             self.mana_label.setText(f"Mana Pool: {mana_str}")
         else:
             self.mana_label.setText("Mana Pool: Empty")
@@ -157,16 +162,18 @@ class ZoneViewer(QWidget):
         self.card_list.itemClicked.connect(self.on_card_clicked)
         layout.addWidget(self.card_list)
     
-    def update_cards(self, cards: List):
+    def update_cards(self, cards: List, playable: Optional[set] = None):
         """
         Update displayed cards.
         
         Args:
             cards: List of card objects
+            playable: ids of the cards that can be played now (marked in the list)
         """
         self.card_list.clear()
+        self.cards = list(cards)
         
-        for card in cards:
+        for card in self.cards:
             # Format: "Card Name (Type)"
             display_text = f"{card.name}"
             
@@ -181,8 +188,18 @@ class ZoneViewer(QWidget):
             if hasattr(card, 'tapped') and card.tapped:
                 display_text += " [TAPPED]"
             
+            # Show if it can be played right now
+            if playable and id(card) in playable:
+                display_text += " [PLAYABLE]"
+            
             self.card_list.addItem(display_text)
     
+    def selected_card(self):
+        """Get the selected card object, or None."""
+        row = self.card_list.currentRow()
+        cards = getattr(self, 'cards', [])
+        return cards[row] if 0 <= row < len(cards) else None
+    
     def on_card_clicked(self, item):
         """Handle card click."""
         # TODO: Emit card object instead of text
@@ -319,8 +336,13 @@ class CombatViewer(QWidget):
 class GameLogViewer(QWidget):
     """Viewer for game log."""
     
+    # Lines kept in the text view
+    MAX_LINES = 2000
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._last_seq = 0  # Last GameLog event shown
+        self._shown_count = 0  # Entries shown from a plain list
         self.init_ui()
     
     def init_ui(self):
@@ -337,6 +359,7 @@ class GameLogViewer(QWidget):
         # Log display
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(self.MAX_LINES)
         layout.addWidget(self.log_text)
         
         # Controls
@@ -359,16 +382,31 @@ class GameLogViewer(QWidget):
         """
         self.log_text.append(entry)
     
-    def update_log(self, log_entries: List[str]):
+    def update_log(self, log_entries):
         """
-        Update entire log.
+        Update log with entries not shown yet.
+        
+        Only new events are rendered and appended; the view is rebuilt
+        only if the log was replaced or cleared.
         
         Args:
-            log_entries: List of log entries
+            log_entries: GameLog, or list of log entry strings
         """
-        self.log_text.clear()
-        for entry in log_entries:
+        if isinstance(log_entries, GameLog):
+            if log_entries.last_seq < self._last_seq:
+                self.log_text.clear()
+                self._last_seq = 0
+            for event in log_entries.since(self._last_seq)[-self.MAX_LINES:]:
+                self.log_text.append(render_event(event))
+            self._last_seq = log_entries.last_seq
+            return
+        
+        if len(log_entries) < self._shown_count:
+            self.log_text.clear()
+            self._shown_count = 0
+        for entry in log_entries[self._shown_count:]:
             self.log_text.append(entry)
+        self._shown_count = len(log_entries)
     
     def clear_log(self):
         """Clear the log."""
@@ -389,6 +427,7 @@ class GameStateWidget(QWidget):
     def __init__(self, game_engine=None, parent=None):
         super().__init__(parent)
         self.game_engine = game_engine
+        self.playable_actions: Dict[int, object] = {}  # id(card) -> LegalAction
         self.init_ui()
     
     def init_ui(self):
@@ -484,6 +523,15 @@ class GameStateWidget(QWidget):
         self.pass_priority_btn.clicked.connect(self.pass_priority)
         controls_layout.addWidget(self.pass_priority_btn)
         
+        # Enabled from the engine's legal actions for the player with priority
+        self.play_land_btn = QPushButton("Play Land")
+        self.play_land_btn.clicked.connect(self.play_selected_land)
+        controls_layout.addWidget(self.play_land_btn)
+        
+        self.cast_spell_btn = QPushButton("Cast Spell")
+        self.cast_spell_btn.clicked.connect(self.cast_selected_spell)
+        controls_layout.addWidget(self.cast_spell_btn)
+        
         controls_layout.addStretch()
         
         self.step_btn = QPushButton("Advance Step")
@@ -523,11 +571,16 @@ class GameStateWidget(QWidget):
                     panel.update_info(self.game_engine.players[i])
             
             # Update zones
+            self.update_actions()
+            priority_player = self.game_engine.priority_player_index
             for i in range(len(self.game_engine.players)):
                 player = self.game_engine.players[i]
                 
                 self.battlefield_viewers[i].update_cards(player.battlefield)
-                self.hand_viewers[i].update_cards(player.hand)
+                self.hand_viewers[i].update_cards(
+                    player.hand,
+                    set(self.playable_actions) if i == priority_player else None
+                )
                 self.graveyard_viewers[i].update_cards(player.graveyard)
             
             # Update stack (would need stack manager reference)
@@ -542,6 +595,46 @@ class GameStateWidget(QWidget):
         except Exception as e:
             logger.error(f"Error updating display: {e}")
     
+    def update_actions(self):
+        """Enable the play buttons from the legal actions of the player with priority."""
+        generator = getattr(self.game_engine, 'legal_actions', None)
+        player_id = self.game_engine.priority_player_index
+        lands, spells = [], []
+        if generator is not None and 0 <= player_id < len(self.game_engine.players):
+            lands = generator.playable_lands(player_id)
+            spells = generator.castable_spells(player_id)
+        
+        self.playable_actions = {id(action.card): action for action in lands + spells}
+        self.play_land_btn.setEnabled(bool(lands))
+        self.cast_spell_btn.setEnabled(bool(spells))
+    
+    def _selected_action(self, action_type: str):
+        """Legal action for the card selected in the priority player's hand, if any."""
+        player_id = self.game_engine.priority_player_index
+        if not 0 <= player_id < len(self.hand_viewers):
+            return None
+        card = self.hand_viewers[player_id].selected_card()
+        action = self.playable_actions.get(id(card)) if card is not None else None
+        if action is None or action.action_type.value != action_type:
+            return None
+        return action
+    
+    def play_selected_land(self):
+        """Handle play land button (plays the land selected in hand)."""
+        action = self._selected_action('play_land')
+        if action is not None:
+            self.action_requested.emit('play_land', {
+                'player': self.game_engine.priority_player_index, 'action': action
+            })
+    
+    def cast_selected_spell(self):
+        """Handle cast spell button (casts the spell selected in hand)."""
+        action = self._selected_action('cast_spell')
+        if action is not None:
+            self.action_requested.emit('cast_spell', {
+                'player': self.game_engine.priority_player_index, 'action': action
+            })
+    
     def pass_priority(self):
         """Handle pass priority button."""
         self.action_requested.emit('pass_priority', {})
@@ -33,6 +33,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict
 
+from app.game.triggers import TriggerRegistry
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,7 +162,7 @@ class InteractionManager:
         self.game_engine = game_engine
         
         # Trigger tracking
-        self.triggers: Dict[str, List[Tuple]] = defaultdict(list)  # event -> [(card, trigger_obj, callback)]
+        self.triggers = TriggerRegistry()  # event -> (card, trigger_obj, callback)
         self.triggered_abilities_waiting: List[Dict] = []
         
         # Effect tracking
@@ -176,7 +178,8 @@ class InteractionManager:
     
     def register_trigger(self, card, event: TriggerEvent, callback: Callable,
                         condition: Optional[Callable] = None,
-                        once_per_turn: bool = False):
+                        once_per_turn: bool = False,
+                        source_only: bool = False) -> Tuple:
         """
         Register a triggered ability.
         
@@ -186,16 +189,47 @@ class InteractionManager:
             callback: Function to call when triggered
             condition: Optional additional condition
             once_per_turn: If True, only triggers once per turn
+            source_only: If True, only triggers for events about the card itself
+            
+        Returns:
+            Registered (card, trigger, callback) entry, for unregister_trigger
         """
+        from app.game.game_engine import Zone
+        
         trigger = TriggerCondition(
             event=event,
             condition=condition,
             once_per_turn=once_per_turn
         )
         
-        event_key = event.value
-        self.triggers[event_key].append((card, trigger, callback))
+        entry = (card, trigger, callback)
+        self.triggers.register(
+            entry,
+            event,
+            source=card,
+            source_only=source_only,
+            zone=Zone.BATTLEFIELD
+        )
         logger.debug(f"Registered trigger for {card.name}: {event.value}")
+        return entry
+    
+    def unregister_trigger(self, entry: Tuple):
+        """
+        Remove a triggered ability.
+        
+        Args:
+            entry: Entry returned by register_trigger
+        """
+        self.triggers.unregister(entry)
+    
+    def clear_card_triggers(self, card):
+        """
+        Remove all triggered abilities of a card.
+        
+        Args:
+            card: Source card
+        """
+        self.triggers.unregister_source(card)
     
     def check_triggers(self, event: TriggerEvent, context: Optional[Dict] = None):
         """
@@ -206,17 +240,9 @@ class InteractionManager:
             context: Event context data
         """
         context = context or {}
-        event_key = event.value
-        
-        if event_key not in self.triggers:
-            return
         
-        for card, trigger, callback in self.triggers[event_key]:
-            # Check if card is still on battlefield (or appropriate zone)
-            from app.game.game_engine import Zone
-            if card.zone != Zone.BATTLEFIELD:
-                continue
-            
+        # Only triggers whose card is on the battlefield are candidates
+        for card, trigger, callback in self.triggers.candidates(event, context):
             # Check if trigger should fire
             if trigger.should_trigger(event, context):
                 # Add to waiting triggers
@@ -349,9 +375,8 @@ class InteractionManager:
         self.effects_until_eot.clear()
         
         # Reset turn-based trigger tracking
-        for event_triggers in self.triggers.values():
-            for card, trigger, callback in event_triggers:
-                trigger.reset_turn_tracking()
+        for card, trigger, callback in self.triggers:
+            trigger.reset_turn_tracking()
         
         logger.debug("Cleaned up end-of-turn effects")
     
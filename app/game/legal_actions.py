@@ -0,0 +1,620 @@
+"""
+Legal action generation for AI players and the game UI.
+
+One generator answers "what can this player do right now?" for every
+consumer: land drops, castable spells (each with the mana sources that pay
+for it), activated abilities and attacks. The timing rules used by the
+stack and phase managers live here too, so a spell the AI considers
+castable is one the stack will accept.
+
+Per-turn facts (priority, sorcery timing, the land drop, untapped mana
+sources and floating mana) are computed once per player and reused until
+the game moves on: the cache key covers the turn, phase, step, priority,
+stack size, mana pool and the versions of the player's hand and
+battlefield, and tapping or retyping a permanent is picked up through zone
+change events. Payments are memoized per cost within those facts.
+
+Classes:
+    ActionType: Kinds of legal actions
+    LegalAction: One legal play, with its mana payment
+    ActivatedAbilityText: An activated ability parsed from oracle text
+    TurnFacts: Cached per-player facts the actions are built from
+    LegalActionGenerator: Generates and caches legal actions for a game
+
+Functions:
+    is_main_phase: Check whether a phase is a main phase
+    sorcery_timing_error: Why sorcery-speed actions aren't allowed, if they aren't
+    cast_timing_error: Why a spell can't be cast now, if it can't
+    parse_activated_abilities: Non-mana activated abilities in oracle text
+
+Usage:
+    generator = game_engine.legal_actions
+    for action in generator.legal_actions(player_id):
+        if action.action_type == ActionType.CAST_SPELL:
+            generator.tap_payment(player_id, action.payment)
+            game_engine.cast_spell(player_id, action.card)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.game.mana_cost import ManaPayment, solve_payment
+
+logger = logging.getLogger(__name__)
+
+# Phase names (GamePhase and PhaseManager's Phase) that allow sorcery-speed actions
+MAIN_PHASES = frozenset({'PRECOMBAT_MAIN', 'POSTCOMBAT_MAIN'})
+
+# Card attributes whose change can alter what a player may play
+PLAY_ATTRIBUTES = frozenset({
+    'tapped', 'is_tapped', 'summoning_sick', 'types', 'type_line',
+    'oracle_text', 'mana_cost', 'controller'
+})
+
+# Lands a player may play per turn
+LAND_DROPS_PER_TURN = 1
+
+# "[Cost]: [Effect]" lines; the cost must contain a symbol or a known cost word
+_ABILITY_LINE = re.compile(r'^(?P<cost>[^:"]+):\s*(?P<effect>.+)$')
+_COST_WORDS = ('sacrifice', 'pay', 'discard', 'exile', 'remove', 'tap an untapped')
+_SYMBOL = re.compile(r'\{([^}]*)\}')
+_NON_MANA_SYMBOLS = frozenset({'T', 'Q', 'E'})
+
+
+class ActionType(Enum):
+    """Kinds of legal actions."""
+    PLAY_LAND = "play_land"
+    CAST_SPELL = "cast_spell"
+    ACTIVATE_ABILITY = "activate_ability"
+    ATTACK = "attack"
+
+
+@dataclass
+class LegalAction:
+    """A legal play for a player."""
+    action_type: ActionType
+    card: Any
+    payment: Optional[ManaPayment] = None  # Pool mana and sources that pay for it
+    ability: Optional['ActivatedAbilityText'] = None
+    defender: Optional[int] = None  # Player attacked (attacks only)
+
+
+@dataclass(frozen=True)
+class ActivatedAbilityText:
+    """An activated ability parsed from oracle text."""
+    text: str
+    mana_cost: str = ""
+    tap_cost: bool = False
+    sorcery_speed: bool = False
+
+
+@dataclass
+class TurnFacts:
+    """Per-player facts legal actions are built from (valid for one cache key)."""
+    key: Tuple
+    has_priority: bool
+    sorcery_error: Optional[str]
+    land_drop: bool
+    mana_sources: List[Tuple[Any, FrozenSet]]
+    pool: Dict
+    payments: Dict[Tuple, Optional[ManaPayment]] = field(default_factory=dict)
+    lands: Optional[List[LegalAction]] = None
+    spells: Optional[List[LegalAction]] = None
+    abilities: Optional[List[LegalAction]] = None
+    attackers: Dict[int, List[Any]] = field(default_factory=dict)
+
+    @property
+    def sorcery_timing(self) -> bool:
+        """Whether sorcery-speed actions are allowed."""
+        return self.sorcery_error is None
+
+    @property
+    def available_mana(self) -> int:
+        """Mana the player could make: floating mana plus untapped sources."""
+        return len(self.mana_sources) + sum(self.pool.values())
+
+
+def is_main_phase(phase) -> bool:
+    """
+    Check whether a phase is a main phase.
+
+    Args:
+        phase: GamePhase or PhaseManager Phase
+
+    Returns:
+        True for the precombat and postcombat main phases
+    """
+    return getattr(phase, 'name', None) in MAIN_PHASES
+
+
+def sorcery_timing_error(player_id: int, active_player: Optional[int], phase,
+                         stack_empty: bool) -> Optional[str]:
+    """
+    Check sorcery timing: the active player's main phase with an empty stack.
+
+    Args:
+        player_id: Player acting
+        active_player: Active player's index
+        phase: Current phase
+        stack_empty: Whether the stack is empty
+
+    Returns:
+        Reason the action isn't allowed, or None if it is
+    """
+    if player_id != active_player:
+        return "Only active player can cast sorcery-speed spells"
+    if not is_main_phase(phase):
+        return "Can only cast sorcery-speed spells during main phase"
+    if not stack_empty:
+        return "Can only cast sorcery-speed spells when stack is empty"
+    return None
+
+
+def cast_timing_error(card, player_id: int, priority_player: Optional[int],
+                      active_player: Optional[int], phase, stack_empty: bool) -> Optional[str]:
+    """
+    Check whether a spell may be cast now (ignoring its cost).
+
+    Args:
+        card: Spell to cast
+        player_id: Player casting it
+        priority_player: Player with priority
+        active_player: Active player's index
+        phase: Current phase
+        stack_empty: Whether the stack is empty
+
+    Returns:
+        Reason the spell can't be cast, or None if it can
+    """
+    if player_id != priority_player:
+        return "Player doesn't have priority"
+    if _is_instant_speed(card):
+        return None
+    return sorcery_timing_error(player_id, active_player, phase, stack_empty)
+
+
+def parse_activated_abilities(oracle_text: str) -> Tuple[ActivatedAbilityText, ...]:
+    """
+    Find the non-mana activated abilities in a card's oracle text.
+
+    Mana abilities ("{T}: Add {G}.") are left out: they're mana sources,
+    not actions.
+
+    Args:
+        oracle_text: Card oracle text
+
+    Returns:
+        Parsed abilities in text order
+    """
+    return _parse_abilities(oracle_text or "")
+
+
+@lru_cache(maxsize=4096)
+def _parse_abilities(oracle_text: str) -> Tuple[ActivatedAbilityText, ...]:
+    """Parsed abilities for one oracle text (cached)."""
+    abilities = []
+    for line in oracle_text.splitlines():
+        match = _ABILITY_LINE.match(line.strip())
+        if not match:
+            continue
+        cost, effect = match.group('cost').strip(), match.group('effect').strip()
+        if '{' not in cost and not cost.lower().startswith(_COST_WORDS):
+            continue
+        if effect.lower().startswith('add '):
+            continue
+        symbols = _SYMBOL.findall(cost)
+        abilities.append(ActivatedAbilityText(
+            text=line.strip(),
+            mana_cost=''.join(f"{{{s}}}" for s in symbols if s.upper() not in _NON_MANA_SYMBOLS),
+            tap_cost='T' in symbols,
+            sorcery_speed='activate only as a sorcery' in effect.lower()
+        ))
+    return tuple(abilities)
+
+
+def _is_instant_speed(card) -> bool:
+    """Check whether a card can be cast any time its controller has priority."""
+    check = getattr(card, 'is_instant_or_flash', None)
+    if check is not None:
+        return check()
+    types = getattr(card, 'types', None) or getattr(card, 'type_line', '')
+    return 'Instant' in types or 'flash' in (getattr(card, 'oracle_text', '') or '').lower()
+
+
+def _is_land(card) -> bool:
+    check = getattr(card, 'is_land', None)
+    return check() if check is not None else 'Land' in (getattr(card, 'type_line', '') or '')
+
+
+def _is_tapped(card) -> bool:
+    return bool(getattr(card, 'tapped', False) or getattr(card, 'is_tapped', False))
+
+
+class LegalActionGenerator:
+    """
+    Generates every legal action for a player from the current game state.
+
+    One generator is shared by everything attached to a GameEngine (as
+    `game_engine.legal_actions`). Results are cached per player until the
+    state they depend on changes. Cards that don't report their attribute
+    writes (see TrackedCard) disable caching for the battlefield they're on;
+    call `invalidate()` after changing mana abilities by hand.
+    """
+
+    def __init__(self, game_engine):
+        """
+        Initialize the generator.
+
+        Args:
+            game_engine: GameEngine to generate actions for
+        """
+        self.game_engine = game_engine
+        self._facts: Dict[int, TurnFacts] = {}
+        self._epochs: Dict[int, int] = {}
+        self._zones: Dict[int, Tuple[Any, int]] = {}  # id(zone) -> (zone, player id)
+        self._untracked: Dict[int, int] = {}  # id(battlefield) -> cards not reporting changes
+
+    # ------------------------------------------------------------------
+    # Per-turn facts
+    # ------------------------------------------------------------------
+
+    def facts(self, player_id: int) -> TurnFacts:
+        """
+        Get the cached facts for a player, recomputing them if stale.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            TurnFacts for the current state
+        """
+        player = self.game_engine.players[player_id]
+        self._watch(player.hand, player_id)
+        self._watch(player.battlefield, player_id)
+        key = self._key(player_id, player)
+        facts = self._facts.get(player_id)
+        if facts is not None and facts.key == key and key is not None:
+            return facts
+
+        facts = self._compute_facts(player_id, player, key)
+        self._facts[player_id] = facts
+        return facts
+
+    def invalidate(self, player_id: Optional[int] = None):
+        """
+        Drop cached facts.
+
+        Args:
+            player_id: Player to invalidate, or None for everyone
+        """
+        if player_id is None:
+            self._facts.clear()
+        else:
+            self._facts.pop(player_id, None)
+
+    def detach(self):
+        """Stop listening to zone events and drop all cached facts."""
+        for zone, _ in self._zones.values():
+            zone.remove_listener(self._on_zone_event)
+        self._zones.clear()
+        self._untracked.clear()
+        self._facts.clear()
+
+    def _key(self, player_id: int, player) -> Optional[Tuple]:
+        """Cache key for a player's facts (None when they can't be cached)."""
+        battlefield = player.battlefield
+        if self._untracked.get(id(battlefield)):
+            return None
+        engine = self.game_engine
+        pool = self._pool(player_id)
+        mana_manager = getattr(engine, 'mana_manager', None)
+        return (
+            engine.turn_number, engine.current_phase, engine.current_step,
+            engine.active_player_index, engine.priority_player_index, self._stack_size(),
+            player.lands_played_this_turn, self._epochs.get(player_id, 0),
+            id(player.hand), player.hand.version, id(battlefield), battlefield.version,
+            tuple(pool.items()) if pool else (),
+            len(mana_manager.mana_abilities) if mana_manager else 0,
+        )
+
+    def _compute_facts(self, player_id: int, player, key: Optional[Tuple]) -> TurnFacts:
+        """Compute a player's facts from the game state."""
+        engine = self.game_engine
+        mana_manager = getattr(engine, 'mana_manager', None)
+        has_priority = player_id == engine.priority_player_index and not player.lost_game
+        sorcery_error = sorcery_timing_error(
+            player_id, engine.active_player_index, engine.current_phase, self._stack_size() == 0
+        )
+        return TurnFacts(
+            key=key,
+            has_priority=has_priority,
+            sorcery_error=sorcery_error,
+            land_drop=(has_priority and sorcery_error is None
+                       and player.lands_played_this_turn < LAND_DROPS_PER_TURN),
+            mana_sources=mana_manager.get_mana_sources(player_id) if mana_manager else [],
+            pool=dict(self._pool(player_id) or {})
+        )
+
+    def _pool(self, player_id: int) -> Optional[Dict]:
+        """Floating mana in the player's mana manager pool."""
+        mana_manager = getattr(self.game_engine, 'mana_manager', None)
+        pool = mana_manager.get_mana_pool(player_id) if mana_manager else None
+        return pool.mana if pool else None
+
+    def _stack_size(self) -> int:
+        """Number of objects on the stack."""
+        stack_manager = getattr(self.game_engine, 'stack_manager', None)
+        if stack_manager is not None:
+            return stack_manager.get_size()
+        return len(self.game_engine.stack)
+
+    def _watch(self, zone, player_id: int):
+        """Subscribe to a zone's events (once)."""
+        if id(zone) in self._zones or not hasattr(zone, 'add_listener'):
+            return
+        self._zones[id(zone)] = (zone, player_id)
+        zone.add_listener(self._on_zone_event)
+        self._untracked[id(zone)] = sum(
+            not getattr(type(card), 'TRACKS_CHANGES', False) for card in zone
+        )
+
+    def _on_zone_event(self, event: str, zone, card, attribute: Optional[str]):
+        """Invalidate a player's facts when their cards change in a way that matters."""
+        entry = self._zones.get(id(zone))
+        if entry is None:
+            return
+        if event != 'change' and not getattr(type(card), 'TRACKS_CHANGES', False):
+            self._untracked[id(zone)] += 1 if event == 'enter' else -1
+        if event == 'change' and attribute is not None and attribute not in PLAY_ATTRIBUTES:
+            return
+        player_id = entry[1]
+        self._epochs[player_id] = self._epochs.get(player_id, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    def can_play_sorcery(self, player_id: int) -> bool:
+        """
+        Check if a player may take sorcery-speed actions now.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            True during the player's main phase with an empty stack
+        """
+        return self.facts(player_id).sorcery_timing
+
+    def can_play_land(self, player_id: int) -> bool:
+        """
+        Check if a player has a land drop available now.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            True if a land could be played (ignoring which lands are in hand)
+        """
+        return self.facts(player_id).land_drop
+
+    def available_mana(self, player_id: int) -> int:
+        """
+        Count the mana a player could make right now.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            Floating mana plus untapped mana sources
+        """
+        return self.facts(player_id).available_mana
+
+    def payment_for(self, player_id: int, cost: str, exclude=None) -> Optional[ManaPayment]:
+        """
+        Find (and memoize) how a player pays a mana cost.
+
+        Args:
+            player_id: Player ID
+            cost: Mana cost string
+            exclude: Permanent that can't tap for mana (it taps for the cost itself)
+
+        Returns:
+            ManaPayment, or None if the cost can't be paid
+        """
+        facts = self.facts(player_id)
+        cache_key = (cost or "", id(exclude) if exclude is not None else None)
+        if cache_key not in facts.payments:
+            sources = facts.mana_sources
+            if exclude is not None:
+                sources = [source for source in sources if source[0] is not exclude]
+            facts.payments[cache_key] = solve_payment(cost, facts.pool, sources)
+        return facts.payments[cache_key]
+
+    def can_cast(self, player_id: int, card) -> bool:
+        """
+        Check if a player can cast a card from hand now, timing and cost included.
+
+        Args:
+            player_id: Player ID
+            card: Card in the player's hand
+
+        Returns:
+            True if the spell is castable
+        """
+        return any(action.card is card for action in self.castable_spells(player_id))
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def playable_lands(self, player_id: int) -> List[LegalAction]:
+        """
+        Get the land drops a player can make.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            One PLAY_LAND action per land in hand (none without a land drop)
+        """
+        facts = self.facts(player_id)
+        if facts.lands is None:
+            hand = self.game_engine.players[player_id].hand
+            lands = hand.lands() if hasattr(hand, 'lands') else [c for c in hand if _is_land(c)]
+            facts.lands = [
+                LegalAction(ActionType.PLAY_LAND, card) for card in lands
+            ] if facts.land_drop else []
+        return list(facts.lands)
+
+    def castable_spells(self, player_id: int) -> List[LegalAction]:
+        """
+        Get the spells a player can cast, each with a mana payment.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            CAST_SPELL actions in hand order
+        """
+        facts = self.facts(player_id)
+        if facts.spells is None:
+            spells = []
+            if facts.has_priority:
+                for card in self.game_engine.players[player_id].hand:
+                    if _is_land(card):
+                        continue
+                    if facts.sorcery_error is not None and not _is_instant_speed(card):
+                        continue
+                    payment = self.payment_for(player_id, getattr(card, 'mana_cost', ''))
+                    if payment is not None:
+                        spells.append(LegalAction(ActionType.CAST_SPELL, card, payment=payment))
+            facts.spells = spells
+        return list(facts.spells)
+
+    def activatable_abilities(self, player_id: int) -> List[LegalAction]:
+        """
+        Get the non-mana activated abilities a player can activate.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            ACTIVATE_ABILITY actions, each with a mana payment
+        """
+        facts = self.facts(player_id)
+        if facts.abilities is None:
+            actions = []
+            if facts.has_priority:
+                for card in self.game_engine.players[player_id].battlefield:
+                    for ability in parse_activated_abilities(getattr(card, 'oracle_text', '')):
+                        if self._can_activate(player_id, card, ability, facts):
+                            payment = self.payment_for(
+                                player_id, ability.mana_cost,
+                                exclude=card if ability.tap_cost else None
+                            )
+                            if payment is not None:
+                                actions.append(LegalAction(
+                                    ActionType.ACTIVATE_ABILITY, card,
+                                    payment=payment, ability=ability
+                                ))
+            facts.abilities = actions
+        return list(facts.abilities)
+
+    def _can_activate(self, player_id: int, card, ability: ActivatedAbilityText,
+                      facts: TurnFacts) -> bool:
+        """Check an ability's timing and tap cost."""
+        if ability.sorcery_speed and not facts.sorcery_timing:
+            return False
+        if ability.tap_cost:
+            if _is_tapped(card):
+                return False
+            is_creature = getattr(card, 'is_creature', None)
+            if (is_creature is not None and is_creature()
+                    and getattr(card, 'summoning_sick', False)
+                    and 'haste' not in (getattr(card, 'oracle_text', '') or '').lower()):
+                return False
+        return True
+
+    def attackers(self, player_id: int, defender: Optional[int] = None) -> List[Any]:
+        """
+        Get the creatures that could attack a defending player.
+
+        Args:
+            player_id: Attacking player
+            defender: Defending player (default: the next player)
+
+        Returns:
+            Creatures CombatManager would accept as attackers
+        """
+        engine = self.game_engine
+        if defender is None:
+            defender = (player_id + 1) % len(engine.players)
+        facts = self.facts(player_id)
+        if defender not in facts.attackers:
+            battlefield = engine.players[player_id].battlefield
+            creatures = battlefield.creatures() if hasattr(battlefield, 'creatures') else battlefield
+            combat_manager = getattr(engine, 'combat_manager', None)
+            if combat_manager is not None:
+                facts.attackers[defender] = [
+                    c for c in creatures if combat_manager.can_attack(c, defender)[0]
+                ]
+            else:
+                facts.attackers[defender] = [c for c in creatures if not _is_tapped(c)]
+        return list(facts.attackers[defender])
+
+    def attack_actions(self, player_id: int) -> List[LegalAction]:
+        """
+        Get the attacks a player can declare (only in their declare attackers step).
+
+        Args:
+            player_id: Attacking player
+
+        Returns:
+            One ATTACK action per creature and defending player
+        """
+        engine = self.game_engine
+        if (player_id != engine.active_player_index
+                or getattr(engine.current_step, 'name', None) != 'DECLARE_ATTACKERS'):
+            return []
+        return [
+            LegalAction(ActionType.ATTACK, creature, defender=defender)
+            for defender, opponent in enumerate(engine.players)
+            if defender != player_id and not opponent.lost_game
+            for creature in self.attackers(player_id, defender)
+        ]
+
+    def legal_actions(self, player_id: int) -> List[LegalAction]:
+        """
+        Get every legal action for a player.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            Land drops, spells, activated abilities, then attacks
+        """
+        return (
+            self.playable_lands(player_id)
+            + self.castable_spells(player_id)
+            + self.activatable_abilities(player_id)
+            + self.attack_actions(player_id)
+        )
+
+    def tap_payment(self, player_id: int, payment: ManaPayment):
+        """
+        Tap a payment's sources, adding their mana to the player's pool.
+
+        Args:
+            player_id: Player paying
+            payment: Payment from a legal action
+        """
+        mana_manager = self.game_engine.mana_manager
+        pool = mana_manager.get_mana_pool(player_id) or mana_manager.create_mana_pool(player_id)
+        for source, mana_type in payment.sources:
+            source.tapped = True
+            pool.add_mana(mana_type)
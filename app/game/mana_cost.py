@@ -0,0 +1,511 @@
+"""
+Compiled mana costs and mana payment solver.
+
+Mana cost strings are compiled once into immutable, interned ManaCost
+objects. Payment is solved as a flow problem: colored shards on one side,
+units of mana (floating pool mana and untapped sources) on the other, with
+generic mana paid from whatever is left. Solutions depend only on the cost
+and the shape of the available mana, so they are memoized on that
+signature and repeated checks during AI move generation are cheap.
+
+Classes:
+    ManaCost: Immutable compiled mana cost
+    ManaPayment: Which pool mana, sources and life pay a cost
+
+Functions:
+    compile_mana_cost: Compile (and intern) a mana cost string
+    mana_options: Mana types a permanent can tap for
+    solve_payment: Find a payment for a cost
+    can_pay: Check whether a cost can be paid
+
+Usage:
+    cost = compile_mana_cost("{1}{W/U}{G/P}")
+    payment = solve_payment(cost, pool.mana, sources=[(land, mana_options(land))])
+    if payment:
+        for land, mana_type in payment.sources:
+            ...
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+from app.game.mana_system import ManaType
+
+logger = logging.getLogger(__name__)
+
+
+# Mana types that can be in a pool or produced by a source, in symbol order
+MANA_ORDER = (
+    ManaType.WHITE, ManaType.BLUE, ManaType.BLACK,
+    ManaType.RED, ManaType.GREEN, ManaType.COLORLESS
+)
+SYMBOL_TO_MANA = {mana_type.value: mana_type for mana_type in MANA_ORDER}
+ALL_COLORS = frozenset(MANA_ORDER[:5])
+
+BASIC_LAND_TYPES = {
+    'plains': ManaType.WHITE,
+    'island': ManaType.BLUE,
+    'swamp': ManaType.BLACK,
+    'mountain': ManaType.RED,
+    'forest': ManaType.GREEN,
+    'wastes': ManaType.COLORLESS,
+}
+
+# Life paid for a Phyrexian symbol instead of mana
+PHYREXIAN_LIFE = 2
+
+_BRACE_SYMBOL = re.compile(r'\{([^}]*)\}')
+_ADD_MANA = re.compile(r'add ((?:\{[wubrgc]\})+)', re.IGNORECASE)
+
+
+@dataclass(frozen=True, eq=False)
+class ManaCost:
+    """
+    Immutable compiled mana cost.
+
+    Colored shards are grouped by the mana types that can pay them, so
+    "{W}{W}" is one shard group of count 2 and "{W/U}" is a group with two
+    options. Costs are interned by compile_mana_cost and compare by
+    identity, which keeps them cheap to use as cache keys.
+    """
+    text: str
+    generic: int = 0
+    shards: Tuple[Tuple[FrozenSet[ManaType], int], ...] = ()  # (options, count)
+    twobrid: Tuple[Tuple[ManaType, int, int], ...] = ()  # (color, generic alternative, count)
+    phyrexian: Tuple[Tuple[FrozenSet[ManaType], int], ...] = ()  # (options, count)
+    x_count: int = 0
+
+    @property
+    def mana_value(self) -> int:
+        """Mana value (converted mana cost), counting X as 0."""
+        return (
+            self.generic
+            + sum(count for _, count in self.shards)
+            + sum(alternative * count for _, alternative, count in self.twobrid)
+            + sum(count for _, count in self.phyrexian)
+        )
+
+    @property
+    def colors(self) -> FrozenSet[ManaType]:
+        """Colors of mana symbols in the cost."""
+        colors = set()
+        for options, _ in self.shards + self.phyrexian:
+            colors.update(options)
+        colors.update(color for color, _, _ in self.twobrid)
+        colors.discard(ManaType.COLORLESS)
+        return frozenset(colors)
+
+    @property
+    def is_free(self) -> bool:
+        """True if the cost needs no mana or life."""
+        return not (self.generic or self.shards or self.twobrid or self.phyrexian)
+
+    def amounts(self) -> Dict[ManaType, int]:
+        """
+        Get the cost as mana type amounts.
+
+        Only single-type shards and generic mana are included; hybrid and
+        Phyrexian symbols have no single amount.
+
+        Returns:
+            Dictionary of mana types to amounts
+        """
+        result: Dict[ManaType, int] = {}
+        if self.generic:
+            result[ManaType.GENERIC] = self.generic
+        for options, count in self.shards:
+            if len(options) == 1:
+                (mana_type,) = options
+                result[mana_type] = count
+        return result
+
+
+@dataclass(frozen=True)
+class ManaPayment:
+    """How a cost is paid."""
+    pool: Tuple[Tuple[ManaType, int], ...] = ()  # Pool mana spent
+    sources: Tuple[Tuple[object, ManaType], ...] = ()  # (source, mana type it taps for)
+    life: int = 0  # Life paid for Phyrexian symbols
+
+    def pool_amounts(self) -> Dict[ManaType, int]:
+        """Get pool mana spent as a dictionary."""
+        return dict(self.pool)
+
+
+def compile_mana_cost(cost: Union[str, ManaCost, None]) -> ManaCost:
+    """
+    Compile a mana cost.
+
+    Accepts brace notation ("{2}{U}{U}", "{W/U}", "{2/G}", "{B/P}", "{X}")
+    and the compact form used by the game engine ("2UU"). The same string
+    always returns the same ManaCost object.
+
+    Args:
+        cost: Mana cost string or an already compiled cost
+
+    Returns:
+        Compiled ManaCost
+    """
+    if isinstance(cost, ManaCost):
+        return cost
+    return _compile(cost or "")
+
+
+@lru_cache(maxsize=None)
+def _compile(text: str) -> ManaCost:
+    """Compile a cost string (interned by text)."""
+    generic = 0
+    x_count = 0
+    shards: Dict[FrozenSet[ManaType], int] = {}
+    twobrid: Dict[Tuple[ManaType, int], int] = {}
+    phyrexian: Dict[FrozenSet[ManaType], int] = {}
+
+    if '{' in text:
+        symbols = [symbol.upper() for symbol in _BRACE_SYMBOL.findall(text)]
+    else:
+        symbols = re.findall(r'\d+|\S', text.upper())
+
+    for symbol in symbols:
+        if symbol.isdigit():
+            generic += int(symbol)
+        elif symbol in SYMBOL_TO_MANA:
+            options = frozenset((SYMBOL_TO_MANA[symbol],))
+            shards[options] = shards.get(options, 0) + 1
+        elif symbol in ('X', 'Y', 'Z'):
+            x_count += 1
+        elif symbol == 'S':
+            generic += 1  # Snow mana is not tracked, treat as generic
+        elif '/' in symbol:
+            parts = symbol.split('/')
+            options = frozenset(SYMBOL_TO_MANA[part] for part in parts if part in SYMBOL_TO_MANA)
+            if 'P' in parts and options:
+                phyrexian[options] = phyrexian.get(options, 0) + 1
+            elif parts[0].isdigit() and len(options) == 1:
+                (color,) = options
+                key = (color, int(parts[0]))
+                twobrid[key] = twobrid.get(key, 0) + 1
+            elif options:
+                shards[options] = shards.get(options, 0) + 1
+            else:
+                logger.debug(f"Ignoring mana symbol {{{symbol}}} in {text!r}")
+        else:
+            logger.debug(f"Ignoring mana symbol {symbol!r} in {text!r}")
+
+    return ManaCost(
+        text=text,
+        generic=generic,
+        shards=_sorted_groups(shards),
+        twobrid=tuple(
+            (color, alternative, count)
+            for (color, alternative), count in sorted(
+                twobrid.items(), key=lambda item: MANA_ORDER.index(item[0][0])
+            )
+        ),
+        phyrexian=_sorted_groups(phyrexian),
+        x_count=x_count
+    )
+
+
+def _sorted_groups(groups: Dict[FrozenSet[ManaType], int]) -> Tuple[Tuple[FrozenSet[ManaType], int], ...]:
+    """Sort shard groups into a canonical order (most restrictive first)."""
+    return tuple(sorted(groups.items(), key=lambda item: (len(item[0]), _options_key(item[0]))))
+
+
+def _options_key(options: FrozenSet[ManaType]) -> Tuple[int, ...]:
+    """Canonical sort key for a set of mana types."""
+    return tuple(sorted(MANA_ORDER.index(mana_type) for mana_type in options))
+
+
+def mana_options(card) -> FrozenSet[ManaType]:
+    """
+    Get the mana types a permanent can tap for.
+
+    Uses basic land types and "Add {X}" / "any color" oracle text.
+
+    Args:
+        card: Permanent to inspect
+
+    Returns:
+        Frozen set of mana types (empty if it doesn't produce mana)
+    """
+    type_line = getattr(card, 'type_line', '') or ' '.join(getattr(card, 'types', []) or [])
+    return _mana_options(
+        type_line,
+        getattr(card, 'oracle_text', '') or '',
+        getattr(card, 'name', '') or ''
+    )
+
+
+@lru_cache(maxsize=4096)
+def _mana_options(type_line: str, oracle_text: str, name: str) -> FrozenSet[ManaType]:
+    """Mana options for a card definition (cached by its text)."""
+    options = set()
+    lowered_types = type_line.lower()
+    words = set(re.findall(r'[a-z]+', lowered_types))
+    if 'land' in words and not oracle_text and name.lower() in BASIC_LAND_TYPES:
+        words.add(name.lower())  # Bare basic lands built without subtypes
+
+    for land_type, mana_type in BASIC_LAND_TYPES.items():
+        if land_type in words:
+            options.add(mana_type)
+
+    text = oracle_text.lower()
+    if 'mana of any color' in text:
+        options.update(ALL_COLORS)
+    for symbols in _ADD_MANA.findall(oracle_text):
+        options.update(SYMBOL_TO_MANA[symbol.upper()] for symbol in _BRACE_SYMBOL.findall(symbols))
+
+    return frozenset(options)
+
+
+def solve_payment(
+    cost: Union[str, ManaCost, None],
+    pool: Optional[Mapping[ManaType, int]] = None,
+    sources: Sequence[Tuple[object, FrozenSet[ManaType]]] = (),
+    life: int = 0,
+    x_value: int = 0
+) -> Optional[ManaPayment]:
+    """
+    Find a way to pay a cost.
+
+    Pool mana is used before sources, and single-type sources are tapped
+    before flexible ones, so the payment leaves as many options open as it
+    can. Generic mana is paid last from what the colored shards did not need.
+
+    Args:
+        cost: Cost to pay
+        pool: Floating mana by type
+        sources: Untapped sources as (source, mana types it can produce)
+        life: Life that may be paid for Phyrexian symbols
+        x_value: Value chosen for X
+
+    Returns:
+        ManaPayment, or None if the cost can't be paid
+    """
+    cost = compile_mana_cost(cost)
+    supply, source_groups = _supply(pool, sources)
+    plan = _solve(cost, supply, life // PHYREXIAN_LIFE, x_value)
+    if plan is None:
+        return None
+
+    used_by_class, life_paid = plan
+    pool_used = []
+    tapped = []
+    for (kind, options, _), used in zip(supply, used_by_class):
+        if kind == 0:
+            pool_used.extend(used)
+        else:
+            group = iter(source_groups[options])
+            for mana_type, count in used:
+                tapped.extend((next(group), mana_type) for _ in range(count))
+
+    return ManaPayment(pool=tuple(pool_used), sources=tuple(tapped), life=life_paid)
+
+
+def can_pay(
+    cost: Union[str, ManaCost, None],
+    pool: Optional[Mapping[ManaType, int]] = None,
+    sources: Sequence[Tuple[object, FrozenSet[ManaType]]] = (),
+    life: int = 0,
+    x_value: int = 0
+) -> bool:
+    """
+    Check whether a cost can be paid.
+
+    Args:
+        cost: Cost to pay
+        pool: Floating mana by type
+        sources: Untapped sources as (source, mana types it can produce)
+        life: Life that may be paid for Phyrexian symbols
+        x_value: Value chosen for X
+
+    Returns:
+        True if the cost can be paid
+    """
+    supply, _ = _supply(pool, sources)
+    return _solve(compile_mana_cost(cost), supply, life // PHYREXIAN_LIFE, x_value) is not None
+
+
+def _supply(
+    pool: Optional[Mapping[ManaType, int]],
+    sources: Sequence[Tuple[object, FrozenSet[ManaType]]]
+) -> Tuple[tuple, Dict[FrozenSet[ManaType], List[object]]]:
+    """
+    Group available mana into supply classes.
+
+    Returns:
+        Tuple of (supply classes as (kind, options, count) with pool classes
+        first, sources grouped by their options)
+    """
+    supply = []
+    if pool:
+        for mana_type in MANA_ORDER:
+            count = pool.get(mana_type, 0)
+            if count > 0:
+                supply.append((0, frozenset((mana_type,)), count))
+
+    source_groups: Dict[FrozenSet[ManaType], List[object]] = {}
+    for source, options in sources:
+        if options:
+            source_groups.setdefault(frozenset(options), []).append(source)
+    for options in sorted(source_groups, key=lambda options: (len(options), _options_key(options))):
+        supply.append((1, options, len(source_groups[options])))
+
+    return tuple(supply), source_groups
+
+
+@lru_cache(maxsize=8192)
+def _solve(cost: ManaCost, supply: tuple, life_shards: int, x_value: int):
+    """
+    Solve a payment on the shape of the available mana.
+
+    Returns:
+        (mana used per supply class as ((ManaType, count), ...), life paid),
+        or None if the cost can't be paid
+    """
+    total_supply = sum(count for _, _, count in supply)
+    base_generic = cost.generic + cost.x_count * x_value
+
+    for shards, generic, life_paid in _alternatives(cost, base_generic, life_shards):
+        colored = sum(count for _, count in shards)
+        if colored + generic > total_supply:
+            continue
+
+        flows = _match(shards, supply)
+        if flows is None:
+            continue
+
+        return _allocate_generic(shards, supply, flows, generic), life_paid
+
+    return None
+
+
+def _alternatives(cost: ManaCost, generic: int, life_shards: int):
+    """
+    Yield the ways to pay a cost's flexible symbols, cheapest first.
+
+    Two-brid symbols ({2/W}) are paid with their color or generic mana,
+    Phyrexian symbols with mana or life.
+
+    Yields:
+        Tuples of (shard groups, generic amount, life paid)
+    """
+    choices = [[(cost.shards, generic, 0)]]
+
+    for color, alternative, count in cost.twobrid:
+        choices.append([
+            (((frozenset((color,)), paid),) if paid else (), alternative * (count - paid), 0)
+            for paid in range(count, -1, -1)
+        ])
+
+    for options, count in cost.phyrexian:
+        choices.append([
+            (((options, paid),) if paid else (), 0, (count - paid) * PHYREXIAN_LIFE)
+            for paid in range(count, -1, -1)
+            if count - paid <= life_shards
+        ])
+
+    def combine(index, shards, generic, life):
+        if index == len(choices):
+            if life <= life_shards * PHYREXIAN_LIFE:
+                yield _merge_shards(shards), generic, life
+            return
+        for extra_shards, extra_generic, extra_life in choices[index]:
+            yield from combine(index + 1, shards + extra_shards, generic + extra_generic, life + extra_life)
+
+    yield from combine(0, (), 0, 0)
+
+
+def _merge_shards(shards) -> Tuple[Tuple[FrozenSet[ManaType], int], ...]:
+    """Merge shard groups with the same options."""
+    merged: Dict[FrozenSet[ManaType], int] = {}
+    for options, count in shards:
+        merged[options] = merged.get(options, 0) + count
+    return _sorted_groups(merged)
+
+
+def _match(shards, supply) -> Optional[List[List[int]]]:
+    """
+    Match colored shards to supply classes with augmenting paths.
+
+    Args:
+        shards: Shard groups as (options, count)
+        supply: Supply classes as (kind, options, count)
+
+    Returns:
+        flows[shard][supply class] if every shard is matched, else None
+    """
+    remaining = [count for _, _, count in supply]
+    flows = [[0] * len(supply) for _ in shards]
+    edges = [
+        [j for j, (_, options, _) in enumerate(supply) if options & shard_options]
+        for shard_options, _ in shards
+    ]
+
+    def augment(i, visited):
+        """Find a path that gives shard group i one more unit."""
+        for j in edges[i]:
+            if j in visited:
+                continue
+            visited.add(j)
+            if remaining[j] > 0:
+                remaining[j] -= 1
+                flows[i][j] += 1
+                return True
+            # Reroute a unit of class j from another shard group
+            for k in range(len(shards)):
+                if flows[k][j] > 0 and k != i and augment(k, visited):
+                    flows[k][j] -= 1
+                    flows[i][j] += 1
+                    return True
+        return False
+
+    for i, (_, count) in enumerate(shards):
+        for _ in range(count):
+            if not augment(i, set()):
+                return None
+    return flows
+
+
+def _allocate_generic(shards, supply, flows, generic: int) -> tuple:
+    """
+    Turn shard flows into mana used per supply class, adding generic mana.
+
+    Generic mana comes from colorless pool mana first, then the most plentiful
+    pool colors, then the least flexible sources.
+    """
+    used: List[Dict[ManaType, int]] = [{} for _ in supply]
+    remaining = [count for _, _, count in supply]
+
+    for i, (shard_options, _) in enumerate(shards):
+        for j, amount in enumerate(flows[i]):
+            if not amount:
+                continue
+            options = supply[j][1] & shard_options
+            mana_type = min(options, key=MANA_ORDER.index)
+            used[j][mana_type] = used[j].get(mana_type, 0) + amount
+            remaining[j] -= amount
+
+    def generic_order(j):
+        kind, options, _ = supply[j]
+        if kind == 0:
+            return (0, ManaType.COLORLESS not in options, -remaining[j])
+        return (1, len(options), 0)
+
+    for j in sorted(range(len(supply)), key=generic_order):
+        if generic <= 0:
+            break
+        amount = min(generic, remaining[j])
+        if amount:
+            options = supply[j][1]
+            mana_type = ManaType.COLORLESS if ManaType.COLORLESS in options else min(options, key=MANA_ORDER.index)
+            used[j][mana_type] = used[j].get(mana_type, 0) + amount
+            generic -= amount
+
+    return tuple(
+        tuple((mana_type, count) for mana_type, count in sorted(amounts.items(), key=lambda item: MANA_ORDER.index(item[0])))
+        for amounts in used
+    )
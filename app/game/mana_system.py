@@ -1,9 +1,11 @@
 """
 Mana pool and mana ability system for MTG.
+
+Costs are compiled and paid by app.game.mana_cost.
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -97,61 +99,38 @@ class ManaPool:
         Check if can pay mana cost.
         
         Args:
-            cost: Mana cost string (e.g., "2UU", "WUBRG")
+            cost: Mana cost string (e.g., "2UU", "{1}{W/U}", "WUBRG")
             
         Returns:
             True if cost can be paid
         """
-        required_mana = self._parse_mana_cost(cost)
-        
-        # Check colored mana requirements
-        for mana_type, amount in required_mana.items():
-            if mana_type == ManaType.GENERIC:
-                continue
-            if not self.has_mana(mana_type, amount):
-                return False
-        
-        # Check generic mana requirement
-        generic_required = required_mana.get(ManaType.GENERIC, 0)
-        total_mana = sum(self.mana.values())
-        colored_required = sum(
-            amount for mana_type, amount in required_mana.items()
-            if mana_type != ManaType.GENERIC
-        )
+        from app.game.mana_cost import can_pay
         
-        return total_mana >= (colored_required + generic_required)
+        return can_pay(cost, self.mana)
     
     def pay_cost(self, cost: str) -> bool:
         """
         Pay mana cost from pool.
         
+        Colored requirements are matched first; generic mana is then paid
+        from colorless and the most plentiful colors so needed colors
+        aren't stranded.
+        
         Args:
             cost: Mana cost string
             
         Returns:
             True if cost was paid
         """
-        if not self.can_pay_cost(cost):
-            return False
+        from app.game.mana_cost import solve_payment
         
-        required_mana = self._parse_mana_cost(cost)
+        payment = solve_payment(cost, self.mana)
+        if payment is None:
+            return False
         
-        # Pay colored mana first
-        for mana_type, amount in required_mana.items():
-            if mana_type == ManaType.GENERIC:
-                continue
+        for mana_type, amount in payment.pool:
             self.remove_mana(mana_type, amount)
         
-        # Pay generic mana with any remaining mana
-        generic_required = required_mana.get(ManaType.GENERIC, 0)
-        paid = 0
-        
-        for mana_type in [ManaType.WHITE, ManaType.BLUE, ManaType.BLACK, 
-                         ManaType.RED, ManaType.GREEN, ManaType.COLORLESS]:
-            while self.mana[mana_type] > 0 and paid < generic_required:
-                self.remove_mana(mana_type, 1)
-                paid += 1
-        
         logger.info(f"Player {self.player_id} paid cost: {cost}")
         return True
     
@@ -181,36 +160,9 @@ class ManaPool:
         Returns:
             Dictionary of mana types to amounts
         """
-        result: Dict[ManaType, int] = {}
-        
-        i = 0
-        while i < len(cost):
-            char = cost[i]
-            
-            if char.isdigit():
-                # Generic mana
-                num = ""
-                while i < len(cost) and cost[i].isdigit():
-                    num += cost[i]
-                    i += 1
-                result[ManaType.GENERIC] = result.get(ManaType.GENERIC, 0) + int(num)
-                continue
-            elif char == 'W':
-                result[ManaType.WHITE] = result.get(ManaType.WHITE, 0) + 1
-            elif char == 'U':
-                result[ManaType.BLUE] = result.get(ManaType.BLUE, 0) + 1
-            elif char == 'B':
-                result[ManaType.BLACK] = result.get(ManaType.BLACK, 0) + 1
-            elif char == 'R':
-                result[ManaType.RED] = result.get(ManaType.RED, 0) + 1
-            elif char == 'G':
-                result[ManaType.GREEN] = result.get(ManaType.GREEN, 0) + 1
-            elif char == 'C':
-                result[ManaType.COLORLESS] = result.get(ManaType.COLORLESS, 0) + 1
-            
-            i += 1
+        from app.game.mana_cost import compile_mana_cost
         
-        return result
+        return compile_mana_cost(cost).amounts()
 
 
 class ManaAbility:
@@ -368,6 +320,65 @@ class ManaManager:
                     abilities.append(ability)
         return abilities
     
+    def get_mana_sources(self, player_id: int) -> List[Tuple[object, FrozenSet[ManaType]]]:
+        """
+        Get the untapped mana sources a player controls.
+        
+        Registered mana abilities are used for their cards; other lands on
+        the battlefield produce the mana their land types and text allow.
+        
+        Args:
+            player_id: Player ID
+            
+        Returns:
+            List of (source card, mana types it can produce)
+        """
+        from app.game.mana_cost import mana_options
+        
+        sources = []
+        seen = set()
+        for ability in self.get_available_mana_abilities(player_id):
+            options = frozenset(mana_type for mana_type, _ in ability.mana_produced)
+            sources.append((ability.source_card, options))
+            seen.add(id(ability.source_card))
+        
+        players = getattr(self.game_engine, 'players', [])
+        if 0 <= player_id < len(players):
+            battlefield = players[player_id].battlefield
+            lands = battlefield.lands() if hasattr(battlefield, 'lands') else battlefield
+            for card in lands:
+                if id(card) in seen or _is_tapped(card):
+                    continue
+                options = mana_options(card)
+                if options:
+                    sources.append((card, options))
+        
+        return sources
+    
+    def find_payment(self, player_id: int, cost: str, life: int = 0, x_value: int = 0):
+        """
+        Find how a player can pay a cost from their pool and untapped sources.
+        
+        Args:
+            player_id: Player ID
+            cost: Mana cost string
+            life: Life the player is willing to pay for Phyrexian symbols
+            x_value: Value chosen for X
+            
+        Returns:
+            ManaPayment, or None if the cost can't be paid
+        """
+        from app.game.mana_cost import solve_payment
+        
+        pool = self.get_mana_pool(player_id)
+        return solve_payment(
+            cost,
+            pool.mana if pool else None,
+            self.get_mana_sources(player_id),
+            life=life,
+            x_value=x_value
+        )
+    
     def activate_land_for_mana(self, card, player_id: int):
         """
         Activate a land for mana.
@@ -397,3 +408,8 @@ class ManaManager:
         
         card.is_tapped = True
         logger.info(f"Player {player_id} tapped {card.name} for mana")
+
+
+def _is_tapped(card) -> bool:
+    """Check a card's tapped state (game cards use 'tapped', others 'is_tapped')."""
+    return bool(getattr(card, 'is_tapped', False) or getattr(card, 'tapped', False))
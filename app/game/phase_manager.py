@@ -6,6 +6,8 @@ import logging
 from typing import Optional, Callable
 from enum import Enum
 
+from app.game.legal_actions import LAND_DROPS_PER_TURN, sorcery_timing_error
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,7 +87,7 @@ class PhaseManager:
         self.active_player = player_id
         
         logger.info(f"=== Turn {self.turn_number} - Player {player_id} ===")
-        self.game_engine.log_event(f"Turn {self.turn_number} begins")
+        self.game_engine.log_event("Turn %s begins", self.turn_number)
         
         # Start with beginning phase
         self.enter_phase(Phase.BEGINNING)
@@ -99,7 +101,7 @@ class PhaseManager:
         """
         self.current_phase = phase
         logger.info(f"Entering {phase.value}")
-        self.game_engine.log_event(f"{phase.value}")
+        self.game_engine.log_event(phase.value)
         
         # Trigger phase callbacks
         for callback in self.phase_callbacks.get(phase, []):
@@ -186,7 +188,7 @@ class PhaseManager:
                 card = library.cards.pop(0)
                 hand.add_card(card)
                 logger.info(f"Player {self.active_player} draws a card")
-                self.game_engine.log_event(f"Player {self.active_player} draws a card")
+                self.game_engine.log_event("Player %s draws a card", self.active_player)
     
     def _cleanup_step(self):
         """Cleanup step actions."""
@@ -218,6 +220,10 @@ class PhaseManager:
     
     def next_step(self):
         """Advance to next step."""
+        notify_step_end = getattr(self.game_engine, 'notify_step_end', None)
+        if notify_step_end:
+            notify_step_end()
+        
         if self.current_phase == Phase.BEGINNING:
             if self.current_step == Step.UNTAP:
                 self.enter_step(Step.UPKEEP)
@@ -254,7 +260,7 @@ class PhaseManager:
     def end_turn(self):
         """End the current turn."""
         logger.info(f"Turn {self.turn_number} ends")
-        self.game_engine.log_event(f"Turn {self.turn_number} ends")
+        self.game_engine.log_event("Turn %s ends", self.turn_number)
         
         # Move to next player's turn
         next_player = (self.active_player + 1) % len(self.game_engine.players)
@@ -271,17 +277,11 @@ class PhaseManager:
             True if sorcery-speed is allowed
         """
         # Can only play sorceries during own main phase with empty stack
-        if player_id != self.active_player:
-            return False
-        
-        if self.current_phase not in [Phase.PRECOMBAT_MAIN, Phase.POSTCOMBAT_MAIN]:
-            return False
-        
-        if hasattr(self.game_engine, 'stack_manager'):
-            if not self.game_engine.stack_manager.is_empty():
-                return False
-        
-        return True
+        stack_manager = getattr(self.game_engine, 'stack_manager', None)
+        stack_empty = stack_manager is None or stack_manager.is_empty()
+        return sorcery_timing_error(
+            player_id, self.active_player, self.current_phase, stack_empty
+        ) is None
     
     def can_play_land(self, player_id: int) -> bool:
         """
@@ -298,7 +298,9 @@ class PhaseManager:
             return False
         
         # Check if player has already played a land this turn
-        # (This would be tracked elsewhere in the game engine)
+        players = getattr(self.game_engine, 'players', [])
+        if 0 <= player_id < len(players):
+            return players[player_id].lands_played_this_turn < LAND_DROPS_PER_TURN
         return True
     
     def add_phase_callback(self, phase: Phase, callback: Callable):
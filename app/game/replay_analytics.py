@@ -0,0 +1,536 @@
+"""
+Replay analytics store.
+
+Ingests recorded games into a local SQLite database so questions can be
+asked across thousands of replays ("win rate when on the play", "average
+turn Lightning Bolt is cast", "which cards show up most in wins") without
+loading the replays back into memory. Replays are ingested in batches, one
+at a time (stream files are read lazily), and per-card and per-deck
+aggregates are updated with each batch so the common queries are single
+row lookups.
+
+Classes:
+    ReplayAnalyticsStore: SQLite store with bulk ingest and a query API
+
+Tables:
+    games: One row per game (winner, turns, who went first)
+    game_players: One row per player per game (on the play, won, deck)
+    card_events: Card-related actions (draws, land drops, casts) by turn
+    deck_cards: Recorded decklists, keyed by deck hash
+    card_stats: Per-card aggregates
+    deck_stats: Per-deck aggregates
+
+Usage:
+    store = ReplayAnalyticsStore("data/replays.sqlite")
+    store.ingest(Path("replays").glob("*.mtgr"))
+    store.win_rate_on_play()             # {'on_play': 0.54, 'on_draw': 0.46, ...}
+    store.average_cast_turn("Lightning Bolt")
+    store.top_cards_in_wins(limit=10)
+"""
+
+import hashlib
+import logging
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.game.game_replay import ActionType, GameReplay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Action types whose card counts as "seen" for a player in a game
+SEEN_ACTIONS = frozenset({ActionType.DRAW_CARD, ActionType.PLAY_LAND, ActionType.CAST_SPELL})
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS games (
+        game_id TEXT PRIMARY KEY,
+        start_time TEXT,
+        game_mode TEXT,
+        num_players INTEGER,
+        winner INTEGER,
+        first_player INTEGER,
+        total_turns INTEGER,
+        duration_seconds REAL,
+        action_count INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS game_players (
+        game_id TEXT NOT NULL,
+        player_id INTEGER NOT NULL,
+        name TEXT,
+        deck_key TEXT,
+        on_play INTEGER NOT NULL,
+        won INTEGER NOT NULL,
+        PRIMARY KEY (game_id, player_id)
+    );
+    CREATE TABLE IF NOT EXISTS card_events (
+        game_id TEXT NOT NULL,
+        player_id INTEGER,
+        turn INTEGER,
+        action_type TEXT NOT NULL,
+        card TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS deck_cards (
+        deck_key TEXT NOT NULL,
+        card TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (deck_key, card)
+    );
+    CREATE INDEX IF NOT EXISTS idx_card_events_card ON card_events(card, action_type);
+    CREATE INDEX IF NOT EXISTS idx_card_events_game ON card_events(game_id, player_id);
+    CREATE INDEX IF NOT EXISTS idx_game_players_deck ON game_players(deck_key);
+    CREATE TABLE IF NOT EXISTS card_stats (
+        card TEXT PRIMARY KEY,
+        seen_games INTEGER NOT NULL DEFAULT 0,
+        seen_wins INTEGER NOT NULL DEFAULT 0,
+        casts INTEGER NOT NULL DEFAULT 0,
+        cast_turn_sum INTEGER NOT NULL DEFAULT 0,
+        deck_games INTEGER NOT NULL DEFAULT 0,
+        deck_wins INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS deck_stats (
+        deck_key TEXT PRIMARY KEY,
+        name TEXT,
+        games INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        play_games INTEGER NOT NULL DEFAULT 0,
+        play_wins INTEGER NOT NULL DEFAULT 0,
+        turns_sum INTEGER NOT NULL DEFAULT 0
+    );
+"""
+
+CARD_STAT_COLUMNS = ('seen_games', 'seen_wins', 'casts', 'cast_turn_sum', 'deck_games', 'deck_wins')
+DECK_STAT_COLUMNS = ('games', 'wins', 'play_games', 'play_wins', 'turns_sum')
+
+
+def deck_key(decklist: Optional[List[str]], fallback: str) -> str:
+    """
+    Get the key a deck is aggregated under.
+
+    Args:
+        decklist: Card names in the deck (order does not matter)
+        fallback: Key used when no decklist was recorded (e.g. player name)
+
+    Returns:
+        Short hash of the sorted decklist, or the fallback
+    """
+    if not decklist:
+        return fallback
+    digest = hashlib.sha1('\n'.join(sorted(decklist)).encode('utf-8')).hexdigest()
+    return digest[:16]
+
+
+def _card_name(data: Dict[str, Any]) -> Optional[str]:
+    """Get the card name recorded in an action's data, if any."""
+    name = data.get('card') or data.get('card_name')
+    return name if isinstance(name, str) else None
+
+
+class ReplayAnalyticsStore:
+    """
+    SQLite store of ingested replays with precomputed aggregates.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        """
+        Open (or create) an analytics store.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a temporary store)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        if self.db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        logger.info(f"ReplayAnalyticsStore opened: {self.db_path}")
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(
+        self,
+        replays: Iterable[Union[GameReplay, str, Path]],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """
+        Ingest replays in batches.
+
+        Replays may be GameReplay objects or replay files (JSON, pickle or
+        replay streams). Files are opened one at a time, so memory use does
+        not grow with the number of replays. Games already in the store
+        are skipped.
+
+        Args:
+            replays: Replays or replay file paths
+            batch_size: Replays per transaction
+
+        Returns:
+            Number of games added
+        """
+        added = 0
+        batch = _Batch()
+        for source in replays:
+            try:
+                if isinstance(source, GameReplay):
+                    batch_added = self._collect(source, batch)
+                else:
+                    batch_added = self._collect_file(Path(source), batch)
+            except Exception as e:
+                logger.error(f"Failed to ingest replay {source}: {e}")
+                continue
+            added += batch_added
+            if batch.size >= batch_size:
+                self._flush(batch)
+                batch = _Batch()
+        self._flush(batch)
+
+        logger.info(f"Ingested {added} replays")
+        return added
+
+    def ingest_replay(self, replay: GameReplay) -> bool:
+        """
+        Ingest a single replay.
+
+        Args:
+            replay: Replay to add
+
+        Returns:
+            True if the game was added (False if already present)
+        """
+        return self.ingest([replay]) == 1
+
+    def _collect_file(self, path: Path, batch: '_Batch') -> int:
+        """Read a replay file and collect its rows."""
+        from app.game.replay_stream import ReplayReader, is_replay_stream
+
+        if is_replay_stream(path):
+            with ReplayReader(path) as reader:
+                return self._collect(reader.to_replay(lazy=True), batch)
+
+        file_format = 'pickle' if path.suffix == '.pkl' else 'json'
+        return self._collect(GameReplay.load_from_file(str(path), format=file_format), batch)
+
+    def _collect(self, replay: GameReplay, batch: '_Batch') -> int:
+        """Collect the rows and aggregate increments for one replay."""
+        game_id = replay.game_id
+        if game_id in batch.game_ids or self.connection.execute(
+            "SELECT 1 FROM games WHERE game_id = ?", (game_id,)
+        ).fetchone():
+            return 0
+
+        first_player = None
+        action_count = 0
+        total_turns = 0
+        events = []
+        casts = []
+        seen = defaultdict(set)  # player id -> card names
+        for action in replay.actions:
+            action_count += 1
+            turn = action.turn_number
+            if turn > total_turns:
+                total_turns = turn
+            if first_player is None and turn >= 1:
+                first_player = action.active_player
+            card = _card_name(action.data) if action.data else None
+            if card is None:
+                continue
+            events.append((game_id, action.actor, turn, action.action_type.name, card))
+            if action.action_type in SEEN_ACTIONS:
+                seen[action.actor].add(card)
+            if action.action_type == ActionType.CAST_SPELL:
+                casts.append((card, turn))
+
+        total_turns = replay.total_turns or total_turns
+        if first_player is None:
+            first_player = 0
+        winner = replay.winner
+
+        # Everything is read; only now touch the batch
+        for card, turn in casts:
+            stats = batch.card_stats[card]
+            stats['casts'] += 1
+            stats['cast_turn_sum'] += turn
+
+        batch.game_ids.add(game_id)
+        batch.games.append((
+            game_id, replay.start_time.isoformat(), replay.game_mode, replay.num_players,
+            winner, first_player, total_turns, replay.duration_seconds, action_count
+        ))
+        batch.events.extend(events)
+
+        for player_id in range(replay.num_players):
+            name = (replay.player_names[player_id] if player_id < len(replay.player_names)
+                    else f"Player {player_id}")
+            decklist = replay.decklists.get(player_id)
+            key = deck_key(decklist, name)
+            on_play = int(player_id == first_player)
+            won = int(winner is not None and player_id == winner)
+            batch.players.append((game_id, player_id, name, key, on_play, won))
+
+            deck = batch.deck_stats[key]
+            batch.deck_names[key] = name
+            deck['games'] += 1
+            deck['wins'] += won
+            deck['play_games'] += on_play
+            deck['play_wins'] += won & on_play
+            deck['turns_sum'] += total_turns
+
+            for card in seen.get(player_id, ()):
+                stats = batch.card_stats[card]
+                stats['seen_games'] += 1
+                stats['seen_wins'] += won
+            if decklist and key not in batch.deck_cards:
+                counts = defaultdict(int)
+                for card in decklist:
+                    counts[card] += 1
+                batch.deck_cards[key] = counts
+            for card in set(decklist or ()):
+                stats = batch.card_stats[card]
+                stats['deck_games'] += 1
+                stats['deck_wins'] += won
+
+        batch.size += 1
+        return 1
+
+    def _flush(self, batch: '_Batch'):
+        """Write a batch of rows and aggregate increments in one transaction."""
+        if not batch.size:
+            return
+
+        card_updates = ', '.join(f"{c} = {c} + excluded.{c}" for c in CARD_STAT_COLUMNS)
+        deck_updates = ', '.join(f"{c} = {c} + excluded.{c}" for c in DECK_STAT_COLUMNS)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch.games
+            )
+            self.connection.executemany(
+                "INSERT INTO game_players VALUES (?, ?, ?, ?, ?, ?)", batch.players
+            )
+            self.connection.executemany(
+                "INSERT INTO card_events VALUES (?, ?, ?, ?, ?)", batch.events
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO deck_cards VALUES (?, ?, ?)",
+                [(key, card, count) for key, counts in batch.deck_cards.items()
+                 for card, count in counts.items()]
+            )
+            self.connection.executemany(
+                f"INSERT INTO card_stats (card, {', '.join(CARD_STAT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(CARD_STAT_COLUMNS))}) "
+                f"ON CONFLICT(card) DO UPDATE SET {card_updates}",
+                [(card, *(stats[c] for c in CARD_STAT_COLUMNS))
+                 for card, stats in batch.card_stats.items()]
+            )
+            self.connection.executemany(
+                f"INSERT INTO deck_stats (deck_key, name, {', '.join(DECK_STAT_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(DECK_STAT_COLUMNS))}) "
+                f"ON CONFLICT(deck_key) DO UPDATE SET {deck_updates}",
+                [(key, batch.deck_names[key], *(stats[c] for c in DECK_STAT_COLUMNS))
+                 for key, stats in batch.deck_stats.items()]
+            )
+        logger.debug(f"Flushed {batch.size} replays")
+
+    def rebuild_aggregates(self):
+        """Recompute card_stats and deck_stats from the base tables."""
+        seen_actions = tuple(action.name for action in SEEN_ACTIONS)
+        placeholders = ', '.join('?' * len(seen_actions))
+        with self.connection:
+            self.connection.execute("DELETE FROM card_stats")
+            self.connection.execute("DELETE FROM deck_stats")
+            self.connection.execute(f"""
+                INSERT INTO card_stats (card, seen_games, seen_wins)
+                SELECT seen.card, COUNT(*), SUM(gp.won)
+                FROM (SELECT DISTINCT game_id, player_id, card FROM card_events
+                      WHERE action_type IN ({placeholders})) AS seen
+                JOIN game_players gp
+                  ON gp.game_id = seen.game_id AND gp.player_id = seen.player_id
+                GROUP BY seen.card
+            """, seen_actions)
+            self.connection.execute("""
+                INSERT INTO card_stats (card, casts, cast_turn_sum)
+                SELECT card, COUNT(*), SUM(turn) FROM card_events
+                WHERE action_type = ?
+                GROUP BY card
+                ON CONFLICT(card) DO UPDATE SET
+                    casts = excluded.casts, cast_turn_sum = excluded.cast_turn_sum
+            """, (ActionType.CAST_SPELL.name,))
+            self.connection.execute("""
+                INSERT INTO card_stats (card, deck_games, deck_wins)
+                SELECT dc.card, COUNT(*), SUM(gp.won)
+                FROM deck_cards dc JOIN game_players gp ON gp.deck_key = dc.deck_key
+                GROUP BY dc.card
+                ON CONFLICT(card) DO UPDATE SET
+                    deck_games = excluded.deck_games, deck_wins = excluded.deck_wins
+            """)
+            self.connection.execute("""
+                INSERT INTO deck_stats (deck_key, name, games, wins, play_games, play_wins, turns_sum)
+                SELECT gp.deck_key, MAX(gp.name), COUNT(*), SUM(gp.won), SUM(gp.on_play),
+                       SUM(gp.won * gp.on_play), SUM(g.total_turns)
+                FROM game_players gp JOIN games g ON g.game_id = gp.game_id
+                GROUP BY gp.deck_key
+            """)
+        logger.info("Rebuilt replay aggregates")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def game_count(self) -> int:
+        """Get the number of ingested games."""
+        return self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def win_rate_on_play(self) -> Dict[str, float]:
+        """
+        Get win rates for players on the play and on the draw.
+
+        Returns:
+            Dictionary with 'on_play' and 'on_draw' win rates and the
+            number of games each is based on
+        """
+        result = {'on_play': 0.0, 'on_draw': 0.0, 'play_games': 0, 'draw_games': 0}
+        rows = self.connection.execute(
+            "SELECT on_play, COUNT(*), AVG(won) FROM game_players "
+            "WHERE game_id IN (SELECT game_id FROM games WHERE winner IS NOT NULL) "
+            "GROUP BY on_play"
+        )
+        for on_play, games, win_rate in rows:
+            if on_play:
+                result['on_play'], result['play_games'] = win_rate, games
+            else:
+                result['on_draw'], result['draw_games'] = win_rate, games
+        return result
+
+    def average_cast_turn(self, card: str) -> Optional[float]:
+        """
+        Get the average turn a card is cast on.
+
+        Args:
+            card: Card name
+
+        Returns:
+            Average turn, or None if the card was never cast
+        """
+        row = self.connection.execute(
+            "SELECT casts, cast_turn_sum FROM card_stats WHERE card = ?", (card,)
+        ).fetchone()
+        if not row or not row['casts']:
+            return None
+        return row['cast_turn_sum'] / row['casts']
+
+    def get_card_stats(self, card: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the aggregates for a card.
+
+        Args:
+            card: Card name
+
+        Returns:
+            Dictionary of aggregates plus win rates, or None if unknown
+        """
+        row = self.connection.execute(
+            "SELECT * FROM card_stats WHERE card = ?", (card,)
+        ).fetchone()
+        return self._card_row(row) if row else None
+
+    def top_cards_in_wins(self, limit: int = 10, min_games: int = 1) -> List[Dict[str, Any]]:
+        """
+        Get the cards seen most often by the winning player.
+
+        A card is "seen" by a player in a game if they drew, played or
+        cast it.
+
+        Args:
+            limit: Number of cards to return
+            min_games: Minimum games the card was seen in
+
+        Returns:
+            Card aggregates, most wins first
+        """
+        rows = self.connection.execute(
+            "SELECT * FROM card_stats WHERE seen_games >= ? "
+            "ORDER BY seen_wins DESC, seen_games ASC, card LIMIT ?",
+            (min_games, limit)
+        )
+        return [self._card_row(row) for row in rows]
+
+    def get_deck_stats(self, min_games: int = 1) -> List[Dict[str, Any]]:
+        """
+        Get per-deck aggregates.
+
+        Args:
+            min_games: Minimum games played by the deck
+
+        Returns:
+            Deck aggregates with win rates, most games first
+        """
+        rows = self.connection.execute(
+            "SELECT * FROM deck_stats WHERE games >= ? ORDER BY games DESC, deck_key",
+            (min_games,)
+        )
+        decks = []
+        for row in rows:
+            deck = dict(row)
+            deck['win_rate'] = deck['wins'] / deck['games']
+            deck['play_win_rate'] = (deck['play_wins'] / deck['play_games']
+                                     if deck['play_games'] else None)
+            deck['average_turns'] = deck['turns_sum'] / deck['games']
+            decks.append(deck)
+        return decks
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Run an arbitrary read query against the store.
+
+        Args:
+            sql: SELECT statement
+            params: Query parameters
+
+        Returns:
+            Rows as dictionaries
+        """
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> 'ReplayAnalyticsStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _card_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a card_stats row to a dictionary with derived rates."""
+        card = dict(row)
+        card['seen_win_rate'] = card['seen_wins'] / card['seen_games'] if card['seen_games'] else None
+        card['average_cast_turn'] = card['cast_turn_sum'] / card['casts'] if card['casts'] else None
+        return card
+
+
+class _Batch:
+    """Rows and aggregate increments collected for one ingest transaction."""
+
+    def __init__(self):
+        self.size = 0
+        self.game_ids = set()
+        self.games: List[Tuple] = []
+        self.players: List[Tuple] = []
+        self.events: List[Tuple] = []
+        self.card_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(CARD_STAT_COLUMNS, 0)
+        )
+        self.deck_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(DECK_STAT_COLUMNS, 0)
+        )
+        self.deck_names: Dict[str, str] = {}
+        self.deck_cards: Dict[str, Dict[str, int]] = {}
@@ -0,0 +1,623 @@
+"""
+Compact streaming replay container.
+
+Replays are written incrementally while a game is played, as an
+append-only stream of length-prefixed records:
+
+    header    b'MTGR' + version + length-prefixed JSON (game metadata)
+    records   kind byte + varint length + payload, one of
+                ACTION    varint-packed action (type, turn, players, time) + JSON data
+                KEYFRAME  full state snapshot
+                DELTA     state changes relative to the latest keyframe
+    footer    JSON index (metadata, action checkpoints, turn starts, states)
+    trailer   8-byte footer offset + b'MTGRIDX1'
+
+Every state is either a keyframe or a delta against one keyframe, so
+restoring any state is one keyframe read plus at most one delta. The
+footer index lets a reader seek by turn or action with a bisect and read
+only the records it needs. Files without a footer (a game that crashed
+while recording) are still readable: the index is rebuilt by scanning.
+
+Classes:
+    ReplayWriter: Writes a replay stream incrementally
+    ReplayReader: Lazily reads a replay stream (a sequence of GameActions)
+
+Functions:
+    write_replay: Write a complete GameReplay as a stream
+    is_replay_stream: Check if a file is a replay stream
+
+Usage:
+    writer = ReplayWriter("game.mtgr", replay)
+    writer.write_action(action)
+    writer.close(replay)
+
+    with ReplayReader("game.mtgr") as reader:
+        start = reader.turn_start(5)
+        state = reader.state_at(start)
+"""
+
+import json
+import logging
+import struct
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from app.game.game_replay import ActionType, GameAction, GameReplay
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MTGR'
+FOOTER_MAGIC = b'MTGRIDX1'
+FORMAT_VERSION = 1
+
+RECORD_ACTION = 1
+RECORD_KEYFRAME = 2
+RECORD_DELTA = 3
+RECORD_FOOTER = 4
+
+# Write a keyframe after this many deltas
+DEFAULT_KEYFRAME_INTERVAL = 8
+# Index the file offset of every Nth action
+DEFAULT_CHECKPOINT_INTERVAL = 32
+
+_TRAILER = struct.Struct('<Q8s')
+_MISSING = object()
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode a non-negative int as a LEB128 varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode a varint at pos, returning (value, next position)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed int to an unsigned one for varint encoding."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    """Inverse of _zigzag."""
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+def _read_varint(f: BinaryIO) -> Optional[int]:
+    """Read a varint from a file, or None at end of file."""
+    result = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return result
+        shift += 7
+
+
+def _dumps(value: Any) -> bytes:
+    """Compact JSON encoding."""
+    return json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _state_delta(base: Dict, state: Dict) -> Dict:
+    """
+    Compute the changes from a keyframe to a state.
+
+    Returns:
+        Dict with 'set' (changed or added keys) and 'del' (removed keys)
+    """
+    changed = {key: value for key, value in state.items() if base.get(key, _MISSING) != value}
+    removed = [key for key in base if key not in state]
+    return {'set': changed, 'del': removed}
+
+
+def _apply_delta(base: Dict, delta: Dict) -> Dict:
+    """Apply a delta to a copy of a keyframe."""
+    state = dict(base)
+    for key in delta.get('del', []):
+        state.pop(key, None)
+    state.update(delta.get('set', {}))
+    return state
+
+
+class ReplayWriter:
+    """
+    Writes a replay stream incrementally.
+    """
+
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        replay: GameReplay,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+    ):
+        """
+        Open a replay stream and write its header.
+
+        Args:
+            filepath: Path to write to
+            replay: Replay whose configuration goes in the header
+            keyframe_interval: Deltas written between keyframes
+            checkpoint_interval: Actions between indexed file offsets
+        """
+        self.path = Path(filepath)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self.checkpoint_interval = checkpoint_interval
+
+        self.action_count = 0
+        self.checkpoints: List[Tuple[int, int]] = []  # (action index, offset)
+        self.turns: List[Tuple[int, int]] = []  # (turn, first action index)
+        self.states: List[Tuple[int, int, int]] = []  # (action index, offset, kind)
+
+        self._base_time = replay.start_time.timestamp()
+        self._action_types = [action_type.name for action_type in ActionType]
+        self._action_codes = {name: i for i, name in enumerate(self._action_types)}
+        self._keyframe: Optional[Dict] = None
+        self._keyframe_offset = 0
+        self._deltas_since_keyframe = 0
+
+        header = {
+            'game_id': replay.game_id,
+            'start_time': replay.start_time.isoformat(),
+            'num_players': replay.num_players,
+            'game_mode': replay.game_mode,
+            'player_names': replay.player_names,
+            'starting_life': replay.starting_life,
+            'decklists': {str(k): v for k, v in replay.decklists.items()},
+            'action_types': self._action_types,
+        }
+        self._file = open(self.path, 'wb')
+        header_bytes = _dumps(header)
+        self._file.write(MAGIC + bytes([FORMAT_VERSION]) + _encode_varint(len(header_bytes)) + header_bytes)
+
+    def write_action(self, action: GameAction):
+        """
+        Append an action (and its state snapshot, if any).
+
+        Args:
+            action: Action to write
+        """
+        index = self.action_count
+        offset = self._file.tell()
+
+        if index % self.checkpoint_interval == 0:
+            self.checkpoints.append((index, offset))
+        if not self.turns or action.turn_number != self.turns[-1][0]:
+            self.turns.append((action.turn_number, index))
+            self._file.flush()
+
+        payload = bytearray()
+        payload += _encode_varint(self._action_codes[action.action_type.name])
+        payload += _encode_varint(max(0, action.turn_number))
+        payload += _encode_varint(_zigzag(action.active_player or 0))
+        payload += _encode_varint(_zigzag(action.actor or 0))
+        payload += _encode_varint(_zigzag(round((action.timestamp - self._base_time) * 1000)))
+        if action.data:
+            payload += _dumps(action.data)
+        self._write_record(RECORD_ACTION, bytes(payload))
+        self.action_count += 1
+
+        if action.state_snapshot is not None:
+            self.write_state(index, action.state_snapshot)
+
+    def write_state(self, action_index: int, state: Dict):
+        """
+        Append a state snapshot as a keyframe or a delta.
+
+        Args:
+            action_index: Action the state belongs to
+            state: State snapshot (JSON-serializable dict)
+        """
+        offset = self._file.tell()
+        state_bytes = _dumps(state)
+
+        if self._keyframe is not None and self._deltas_since_keyframe < self.keyframe_interval:
+            delta_bytes = _dumps(_state_delta(self._keyframe, state))
+            if len(delta_bytes) < len(state_bytes):
+                payload = _encode_varint(action_index) + _encode_varint(self._keyframe_offset) + delta_bytes
+                self._write_record(RECORD_DELTA, payload)
+                self.states.append((action_index, offset, RECORD_DELTA))
+                self._deltas_since_keyframe += 1
+                return
+
+        self._write_record(RECORD_KEYFRAME, _encode_varint(action_index) + state_bytes)
+        self.states.append((action_index, offset, RECORD_KEYFRAME))
+        self._keyframe = json.loads(state_bytes)
+        self._keyframe_offset = offset
+        self._deltas_since_keyframe = 0
+
+    def close(self, replay: Optional[GameReplay] = None):
+        """
+        Write the footer index and close the file.
+
+        Args:
+            replay: Finished replay whose results go in the footer
+        """
+        if self._file.closed:
+            return
+
+        metadata = {}
+        if replay is not None:
+            metadata = {
+                'end_time': replay.end_time.isoformat() if replay.end_time else None,
+                'winner': replay.winner,
+                'total_turns': replay.total_turns,
+                'duration_seconds': replay.duration_seconds,
+                'tags': replay.tags,
+                'notes': replay.notes,
+                'stats': replay.stats,
+            }
+
+        footer = {
+            'metadata': metadata,
+            'action_count': self.action_count,
+            'checkpoint_interval': self.checkpoint_interval,
+            'checkpoints': self.checkpoints,
+            'turns': self.turns,
+            'states': self.states,
+        }
+        offset = self._file.tell()
+        self._write_record(RECORD_FOOTER, _dumps(footer))
+        self._file.write(_TRAILER.pack(offset, FOOTER_MAGIC))
+        self._file.close()
+        logger.info(f"Wrote replay stream {self.path} ({self.action_count} actions)")
+
+    def _write_record(self, kind: int, payload: bytes):
+        """Write one length-prefixed record."""
+        self._file.write(bytes([kind]) + _encode_varint(len(payload)) + payload)
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayReader:
+    """
+    Lazily reads a replay stream.
+
+    The reader is a read-only sequence of GameActions: len() and indexing
+    work without loading the file, seeking to the nearest indexed
+    checkpoint and reading forward from there.
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        """
+        Open a replay stream and read its header and index.
+
+        Args:
+            filepath: Path to read
+
+        Raises:
+            ValueError: If the file is not a replay stream
+        """
+        self.path = Path(filepath)
+        self._file = open(self.path, 'rb')
+
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"Not a replay stream: {filepath}")
+        self.version = self._file.read(1)[0]
+        header_length = _read_varint(self._file)
+        self.header: Dict = json.loads(self._file.read(header_length))
+        self._records_start = self._file.tell()
+
+        self._action_types = [ActionType[name] for name in self.header['action_types']]
+        self._base_time = datetime.fromisoformat(self.header['start_time']).timestamp()
+        self._position: Tuple[int, int] = (0, self._records_start)  # Next action index, offset
+
+        if not self._read_footer():
+            self._rebuild_index()
+
+        self._checkpoint_indices = [index for index, _ in self.checkpoints]
+        self._turn_numbers = [turn for turn, _ in self.turns]
+        self._state_indices = [state[0] for state in self.states]
+
+    @property
+    def metadata(self) -> Dict:
+        """Results written when recording finished (empty if unfinished)."""
+        return self._metadata
+
+    def __len__(self) -> int:
+        return self.action_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.action_count))]
+        if index < 0:
+            index += self.action_count
+        if not 0 <= index < self.action_count:
+            raise IndexError("replay action index out of range")
+        return next(self.iter_actions(index))
+
+    def __iter__(self) -> Iterator[GameAction]:
+        return self.iter_actions(0)
+
+    def iter_actions(self, start: int = 0, stop: Optional[int] = None) -> Iterator[GameAction]:
+        """
+        Iterate over actions from an index.
+
+        Args:
+            start: First action index
+            stop: Stop before this index (default: end of replay)
+
+        Yields:
+            GameAction objects
+        """
+        stop = self.action_count if stop is None else min(stop, self.action_count)
+        index, offset = self._seek_action(start)
+
+        while index < stop:
+            self._file.seek(offset)
+            kind, payload = self._read_record()
+            offset = self._file.tell()
+            if kind is None:
+                return
+            if kind != RECORD_ACTION:
+                continue
+            if index >= start:
+                self._position = (index + 1, offset)
+                action = self._decode_action(index, payload)
+                yield action
+            index += 1
+
+    def turn_start(self, turn_number: int) -> int:
+        """
+        Get the index of the first action at or after a turn.
+
+        Args:
+            turn_number: Turn to seek to
+
+        Returns:
+            Action index (len(self) if the turn is past the end)
+        """
+        i = bisect_left(self._turn_numbers, turn_number)
+        if i >= len(self.turns):
+            return self.action_count
+        return self.turns[i][1]
+
+    def actions_for_turn(self, turn_number: int) -> List[GameAction]:
+        """
+        Get all actions of a turn.
+
+        Args:
+            turn_number: Turn number
+
+        Returns:
+            List of actions
+        """
+        start = bisect_left(self._turn_numbers, turn_number)
+        end = bisect_right(self._turn_numbers, turn_number)
+        actions = []
+        for i in range(start, end):
+            first = self.turns[i][1]
+            last = self.turns[i + 1][1] if i + 1 < len(self.turns) else self.action_count
+            actions.extend(self.iter_actions(first, last))
+        return actions
+
+    def state_at(self, action_index: int) -> Optional[Dict]:
+        """
+        Restore the latest state snapshot at or before an action.
+
+        Args:
+            action_index: Action index
+
+        Returns:
+            State snapshot, or None if none was recorded that early
+        """
+        i = bisect_right(self._state_indices, action_index) - 1
+        if i < 0:
+            return None
+
+        _, offset, kind = self.states[i]
+        self._file.seek(offset)
+        record_kind, payload = self._read_record()
+        _, pos = _decode_varint(payload, 0)
+
+        if record_kind == RECORD_KEYFRAME:
+            return json.loads(payload[pos:])
+
+        keyframe_offset, pos = _decode_varint(payload, pos)
+        delta = json.loads(payload[pos:])
+        self._file.seek(keyframe_offset)
+        _, keyframe_payload = self._read_record()
+        _, keyframe_pos = _decode_varint(keyframe_payload, 0)
+        return _apply_delta(json.loads(keyframe_payload[keyframe_pos:]), delta)
+
+    def to_replay(self, lazy: bool = True) -> GameReplay:
+        """
+        Build a GameReplay from the stream.
+
+        Args:
+            lazy: If True the replay's actions are this reader (read on
+                demand); otherwise all actions are loaded into a list
+
+        Returns:
+            GameReplay
+        """
+        header = self.header
+        metadata = self._metadata
+        return GameReplay(
+            game_id=header['game_id'],
+            start_time=datetime.fromisoformat(header['start_time']),
+            end_time=datetime.fromisoformat(metadata['end_time']) if metadata.get('end_time') else None,
+            num_players=header['num_players'],
+            game_mode=header['game_mode'],
+            player_names=header.get('player_names', []),
+            starting_life=header.get('starting_life', 20),
+            decklists={int(k): v for k, v in header.get('decklists', {}).items()},
+            actions=self if lazy else list(self),
+            winner=metadata.get('winner'),
+            total_turns=metadata.get('total_turns', self.turns[-1][0] if self.turns else 0),
+            duration_seconds=metadata.get('duration_seconds', 0.0),
+            tags=metadata.get('tags', []),
+            notes=metadata.get('notes', ''),
+            stats=metadata.get('stats', {})
+        )
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _seek_action(self, index: int) -> Tuple[int, int]:
+        """Get the closest known (action index, offset) at or before an index."""
+        next_index, next_offset = self._position
+        i = bisect_right(self._checkpoint_indices, index) - 1
+        checkpoint = self.checkpoints[i] if i >= 0 else (0, self._records_start)
+        if checkpoint[0] <= next_index <= index:
+            return next_index, next_offset
+        return checkpoint[0], checkpoint[1]
+
+    def _read_record(self) -> Tuple[Optional[int], bytes]:
+        """Read the record at the current file position."""
+        kind = self._file.read(1)
+        if not kind:
+            return None, b''
+        length = _read_varint(self._file)
+        if length is None:
+            return None, b''
+        payload = self._file.read(length)
+        if len(payload) < length:
+            return None, b''  # Truncated record from an interrupted write
+        return kind[0], payload
+
+    def _decode_action(self, index: int, payload: bytes) -> GameAction:
+        """Decode an action record."""
+        code, pos = _decode_varint(payload, 0)
+        turn, pos = _decode_varint(payload, pos)
+        active, pos = _decode_varint(payload, pos)
+        actor, pos = _decode_varint(payload, pos)
+        millis, pos = _decode_varint(payload, pos)
+
+        action = GameAction(
+            action_type=self._action_types[code],
+            timestamp=self._base_time + _unzigzag(millis) / 1000,
+            turn_number=turn,
+            active_player=_unzigzag(active),
+            actor=_unzigzag(actor),
+            data=json.loads(payload[pos:]) if pos < len(payload) else {}
+        )
+
+        i = bisect_left(self._state_indices, index)
+        if i < len(self._state_indices) and self._state_indices[i] == index:
+            action.state_snapshot = self.state_at(index)
+            self._file.seek(self._position[1])
+        return action
+
+    def _read_footer(self) -> bool:
+        """Read the footer index. Returns False if there is none."""
+        try:
+            self._file.seek(-_TRAILER.size, 2)
+        except OSError:
+            return False
+        trailer = self._file.read(_TRAILER.size)
+        if len(trailer) != _TRAILER.size:
+            return False
+        offset, magic = _TRAILER.unpack(trailer)
+        if magic != FOOTER_MAGIC:
+            return False
+
+        self._file.seek(offset)
+        kind, payload = self._read_record()
+        if kind != RECORD_FOOTER:
+            return False
+
+        footer = json.loads(payload)
+        self._metadata = footer.get('metadata', {})
+        self.action_count = footer['action_count']
+        self.checkpoints = [tuple(entry) for entry in footer['checkpoints']]
+        self.turns = [tuple(entry) for entry in footer['turns']]
+        self.states = [tuple(entry) for entry in footer['states']]
+        return True
+
+    def _rebuild_index(self):
+        """Rebuild the index by scanning records (file has no footer)."""
+        logger.warning(f"Replay stream {self.path} has no index, scanning")
+        self._metadata = {}
+        self.checkpoints = []
+        self.turns = []
+        self.states = []
+        index = 0
+
+        self._file.seek(self._records_start)
+        while True:
+            offset = self._file.tell()
+            kind, payload = self._read_record()
+            if kind is None or kind == RECORD_FOOTER:
+                break
+            if kind == RECORD_ACTION:
+                if index % DEFAULT_CHECKPOINT_INTERVAL == 0:
+                    self.checkpoints.append((index, offset))
+                _, pos = _decode_varint(payload, 0)
+                turn, _ = _decode_varint(payload, pos)
+                if not self.turns or self.turns[-1][0] != turn:
+                    self.turns.append((turn, index))
+                index += 1
+            else:
+                action_index, _ = _decode_varint(payload, 0)
+                self.states.append((action_index, offset, kind))
+
+        self.action_count = index
+
+
+def write_replay(replay: GameReplay, filepath: Union[str, Path], **kwargs):
+    """
+    Write a complete replay as a stream.
+
+    Args:
+        replay: Replay to write
+        filepath: Path to write to
+        **kwargs: ReplayWriter options
+    """
+    writer = ReplayWriter(filepath, replay, **kwargs)
+    for action in replay.actions:
+        writer.write_action(action)
+    writer.close(replay)
+
+
+def is_replay_stream(filepath: Union[str, Path]) -> bool:
+    """
+    Check if a file is a replay stream.
+
+    Args:
+        filepath: Path to check
+
+    Returns:
+        True if the file starts with the replay stream magic
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
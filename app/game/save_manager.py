@@ -2,40 +2,67 @@
 Save and load system for MTG games.
 
 Supports:
-- Full game state serialization
+- Full GameEngine state serialization (zones, stack, mana pools, triggers, phase)
+- Compact binary saves (MessagePack encoding, optionally zlib-compressed)
+- JSON and pickle saves
+- Atomic writes (temp file + rename), so a crash never leaves a half-written save
 - Deck saving/loading
 - Quick save/load
-- Auto-save
+- Auto-save from snapshots taken at step boundaries, written in the background
 - Multiple save slots
-- Compression
 
 Classes:
     SaveData: Complete save file data
+    GameStateData: Serializable engine state
     SaveManager: Handles saving and loading
     DeckSerializer: Deck import/export
 
+Card definitions (name, types, cost, text...) are stored once in a table;
+card instances reference them by index and zones, the stack and triggers
+reference instances by index. Callables (stack effects, trigger effects and
+trigger conditions) cannot be saved: stack items are restored without their
+effect, and trigger effects are rebound through an optional effect_resolver.
+
 Usage:
     manager = SaveManager()
     manager.save_game(game, "my_game")
     game = manager.load_game("my_game")
     
-    # Auto-save
+    # Auto-save (snapshot on the game thread at the end of a step,
+    # encoded and written on a background thread)
     manager.enable_auto_save(game, interval=60)
 """
 
 import logging
 import json
+import os
 import pickle
 import gzip
-import os
-from typing import Dict, List, Optional, Any
+import struct
+import tempfile
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
 import threading
 
+from app.game.state_codec import packb, unpackb
+
 logger = logging.getLogger(__name__)
 
+# Binary save header: magic, format version, flags
+SAVE_MAGIC = b'MTGS'
+SAVE_FORMAT_VERSION = 2
+_SAVE_HEADER = struct.Struct('<4sBB')
+FLAG_ZLIB = 1
+
+SAVE_EXTENSIONS = ['.mtgs', '.json', '.json.gz', '.pkl', '.pkl.gz']
+
 
 @dataclass
 class DeckData:
@@ -57,15 +84,15 @@ class DeckData:
 
 @dataclass
 class PlayerData:
-    """Serializable player data."""
+    """Serializable player data (zones hold indices into GameStateData.cards)."""
     name: str
     life: int
     deck: DeckData
-    hand: List[Dict[str, Any]]
-    library: List[Dict[str, Any]]
-    graveyard: List[Dict[str, Any]]
-    exile: List[Dict[str, Any]]
-    battlefield: List[Dict[str, Any]]
+    hand: List[int]
+    library: List[int]
+    graveyard: List[int]
+    exile: List[int]
+    battlefield: List[int]
     
     # Resources
     mana_pool: Dict[str, int]
@@ -76,6 +103,13 @@ class PlayerData:
     is_ai: bool = False
     ai_difficulty: Optional[str] = None
     
+    # Additional state
+    command_zone: List[int] = field(default_factory=list)
+    poison_counters: int = 0
+    has_drawn_this_turn: bool = False
+    max_hand_size: int = 7
+    lost_game: bool = False
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
         return asdict(self)
@@ -101,8 +135,8 @@ class GameStateData:
     # Players
     players: List[PlayerData]
     
-    # Stack
-    stack: List[Dict[str, Any]]
+    # Stack (EnhancedStackManager items)
+    stack: List[Any]
     
     # Game settings
     format: str
@@ -112,6 +146,28 @@ class GameStateData:
     game_id: str
     created_at: str
     
+    # Engine state
+    current_step: str = ""
+    game_over: bool = False
+    winner: Optional[int] = None
+    
+    # Card definitions and instances referenced by zones, stack and triggers
+    card_definitions: List[List[Any]] = field(default_factory=list)
+    cards: List[List[Any]] = field(default_factory=list)
+    
+    # Legacy engine stack (dicts, card references as {'$card': index})
+    legacy_stack: List[Any] = field(default_factory=list)
+    
+    # Triggered abilities and the indices of pending ones
+    triggers: List[List[Any]] = field(default_factory=list)
+    pending_triggers: List[int] = field(default_factory=list)
+    
+    # Mana pools held by the ManaManager, by player id
+    manager_mana_pools: Dict[int, Dict[str, int]] = field(default_factory=dict)
+    
+    # PhaseManager state
+    phase_manager: Dict[str, Any] = field(default_factory=dict)
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
         data = asdict(self)
@@ -125,13 +181,18 @@ class GameStateData:
         # Convert player data
         if 'players' in data:
             data['players'] = [PlayerData.from_dict(p) for p in data['players']]
+        if 'manager_mana_pools' in data:
+            # JSON turns int keys into strings
+            data['manager_mana_pools'] = {
+                int(player_id): pool for player_id, pool in data['manager_mana_pools'].items()
+            }
         return cls(**data)
 
 
 @dataclass
 class SaveData:
     """Complete save file data."""
-    version: str = "1.0.0"
+    version: str = "2.0.0"
     save_name: str = ""
     saved_at: str = ""
     
@@ -158,6 +219,445 @@ class SaveData:
         return cls(**data)
 
 
+# Zones saved for each player, in PlayerData field order
+PLAYER_ZONE_NAMES = ('hand', 'library', 'graveyard', 'exile', 'battlefield', 'command_zone')
+
+
+class _CardTable:
+    """Assigns indices to cards and definitions while capturing a game."""
+    
+    def __init__(self):
+        self.definitions: List[List[Any]] = []
+        self.cards: List[List[Any]] = []
+        self._definition_index: Dict[Tuple, int] = {}
+        self._card_index: Dict[int, int] = {}
+    
+    def ref(self, card) -> int:
+        """Get the index of a card, adding it on first sight."""
+        index = self._card_index.get(id(card))
+        if index is not None:
+            return index
+        
+        definition = (
+            card.name,
+            tuple(getattr(card, 'types', ()) or ()),
+            getattr(card, 'mana_cost', '') or '',
+            getattr(card, 'power', None),
+            getattr(card, 'toughness', None),
+            tuple(getattr(card, 'abilities', ()) or ()),
+            getattr(card, 'oracle_text', '') or '',
+            tuple(getattr(card, 'colors', ()) or ()),
+        )
+        definition_index = self._definition_index.get(definition)
+        if definition_index is None:
+            definition_index = len(self.definitions)
+            self._definition_index[definition] = definition_index
+            self.definitions.append([
+                definition[0], list(definition[1]), definition[2], definition[3],
+                definition[4], list(definition[5]), definition[6], list(definition[7])
+            ])
+        
+        zone = getattr(card, 'zone', None)
+        counters = getattr(card, 'counters', None) or {}
+        index = len(self.cards)
+        self._card_index[id(card)] = index
+        self.cards.append([
+            definition_index,
+            zone.value if isinstance(zone, Enum) else zone,
+            getattr(card, 'controller', None),
+            bool(getattr(card, 'tapped', False)),
+            bool(getattr(card, 'summoning_sick', False)),
+            getattr(card, 'damage', 0),
+            {name: count for name, count in counters.items() if count},
+        ])
+        return index
+    
+    def encode(self, value: Any) -> Any:
+        """Convert a value to plain data, replacing cards with references."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, (list, tuple)):
+            return [self.encode(item) for item in value]
+        if isinstance(value, dict):
+            return {key if isinstance(key, (int, str)) else str(key): self.encode(item)
+                    for key, item in value.items()}
+        if hasattr(value, 'name') and hasattr(value, 'types'):
+            return {'$card': self.ref(value)}
+        if hasattr(value, 'player_id') and hasattr(value, 'life'):
+            return {'$player': value.player_id}
+        if callable(value):
+            return None
+        return str(value)
+
+
+def _pool_amounts(pool) -> Dict[str, int]:
+    """Get the non-zero amounts in a mana pool (ManaPool or legacy dict)."""
+    if pool is None:
+        return {}
+    amounts = pool.mana if hasattr(pool, 'mana') else pool
+    return {
+        (mana_type.value if isinstance(mana_type, Enum) else mana_type): amount
+        for mana_type, amount in amounts.items() if amount
+    }
+
+
+def _enum_value(value: Any) -> Any:
+    """Get an enum's value (or pass the value through)."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def capture_game_state(engine: Any, game_id: str = "") -> GameStateData:
+    """
+    Snapshot a GameEngine as plain data.
+    
+    The snapshot shares no mutable objects with the engine, so it can be
+    encoded and written on another thread while the game goes on. Call it
+    from the game thread at a point where the state is consistent (e.g. a
+    step listener).
+    
+    Args:
+        engine: GameEngine to capture
+        game_id: Identifier stored with the state
+    
+    Returns:
+        GameStateData snapshot
+    """
+    table = _CardTable()
+    
+    players = []
+    for player in engine.players:
+        zones = {name: [table.ref(card) for card in getattr(player, name, ())]
+                 for name in PLAYER_ZONE_NAMES}
+        players.append(PlayerData(
+            name=player.name,
+            life=player.life,
+            deck=DeckData(name=f"{player.name}'s deck", cards=[]),
+            hand=zones['hand'],
+            library=zones['library'],
+            graveyard=zones['graveyard'],
+            exile=zones['exile'],
+            battlefield=zones['battlefield'],
+            mana_pool=_pool_amounts(getattr(player, 'mana_pool', None)),
+            lands_played_this_turn=player.lands_played_this_turn,
+            player_id=player.player_id,
+            is_ai=getattr(player, 'is_ai', False),
+            ai_difficulty=getattr(player, 'ai_difficulty', None),
+            command_zone=zones['command_zone'],
+            poison_counters=player.poison_counters,
+            has_drawn_this_turn=player.has_drawn_this_turn,
+            max_hand_size=player.max_hand_size,
+            lost_game=player.lost_game,
+        ))
+    
+    stack = []
+    stack_manager = getattr(engine, 'stack_manager', None)
+    if stack_manager is not None:
+        for item in stack_manager.stack:
+            source = item.source_card
+            stack.append([
+                _enum_value(item.item_type),
+                item.name,
+                item.controller,
+                table.ref(source) if source is not None else None,
+                table.encode(item.targets),
+                item.cost_paid,
+                item.countered,
+            ])
+    
+    triggers = []
+    pending = []
+    trigger_manager = getattr(engine, 'trigger_manager', None)
+    if trigger_manager is not None:
+        trigger_index = {}
+        
+        def add_trigger(ability, registered: bool) -> int:
+            index = trigger_index.get(id(ability))
+            if index is None:
+                index = trigger_index[id(ability)] = len(triggers)
+                condition = ability.condition
+                triggers.append([
+                    table.ref(ability.source_card) if ability.source_card is not None else None,
+                    _enum_value(ability.trigger_type),
+                    ability.description,
+                    ability.times_triggered,
+                    ability.enabled,
+                    [condition.controller, list(condition.card_types), list(condition.colors),
+                     condition.source_only] if condition else None,
+                    registered,
+                ])
+            return index
+        
+        for ability in trigger_manager.registry:
+            add_trigger(ability, True)
+        pending = [add_trigger(ability, False) for ability in trigger_manager.pending_triggers]
+    
+    manager_pools = {}
+    mana_manager = getattr(engine, 'mana_manager', None)
+    if mana_manager is not None:
+        manager_pools = {player_id: _pool_amounts(pool)
+                         for player_id, pool in mana_manager.mana_pools.items()}
+    
+    phase_state = {}
+    phase_manager = getattr(engine, 'phase_manager', None)
+    if phase_manager is not None:
+        phase_state = {
+            'phase': _enum_value(phase_manager.current_phase),
+            'step': _enum_value(phase_manager.current_step),
+            'active_player': phase_manager.active_player,
+            'turn_number': phase_manager.turn_number,
+        }
+    
+    return GameStateData(
+        turn_number=engine.turn_number,
+        active_player_id=engine.active_player_index,
+        priority_player_id=engine.priority_player_index,
+        current_phase=_enum_value(engine.current_phase),
+        players=players,
+        stack=stack,
+        format=getattr(engine, 'format', '') or '',
+        starting_life=engine.starting_life,
+        game_id=game_id,
+        created_at=datetime.now().isoformat(),
+        current_step=_enum_value(engine.current_step),
+        game_over=engine.game_over,
+        winner=engine.winner,
+        card_definitions=table.definitions,
+        cards=table.cards,
+        legacy_stack=table.encode(list(engine.stack)),
+        triggers=triggers,
+        pending_triggers=pending,
+        manager_mana_pools=manager_pools,
+        phase_manager=phase_state,
+    )
+
+
+def _missing_effect(description: str) -> Callable:
+    """Build a placeholder effect for a trigger whose effect was not rebound."""
+    def effect(event_data):
+        logger.warning(f"Trigger '{description}' has no effect after loading")
+    return effect
+
+
+def restore_game_state(
+    state: GameStateData,
+    effect_resolver: Optional[Callable[[Any, str], Optional[Callable]]] = None
+) -> Any:
+    """
+    Rebuild a GameEngine from a captured state.
+    
+    Args:
+        state: State captured by capture_game_state
+        effect_resolver: Called with (source card, description) for each
+            triggered ability to get its effect function back; abilities
+            without one get an effect that only logs a warning
+    
+    Returns:
+        Restored GameEngine
+    """
+    # Imported here: the engine imports its subsystems at module level
+    from app.game.game_engine import Card, GameEngine, GamePhase, GameStep, Player, Zone
+    from app.game.mana_system import ManaType
+    
+    engine = GameEngine(num_players=len(state.players), starting_life=state.starting_life)
+    
+    definitions = state.card_definitions
+    cards = []
+    for definition_index, zone, controller, tapped, sick, damage, counters in state.cards:
+        name, types, mana_cost, power, toughness, abilities, oracle_text, colors = \
+            definitions[definition_index]
+        cards.append(Card(
+            name=name,
+            types=list(types),
+            mana_cost=mana_cost,
+            power=power,
+            toughness=toughness,
+            abilities=list(abilities),
+            oracle_text=oracle_text,
+            colors=list(colors),
+            zone=Zone(zone) if zone is not None else Zone.LIBRARY,
+            controller=controller,
+            tapped=tapped,
+            summoning_sick=sick,
+            damage=damage,
+            counters=defaultdict(int, counters),
+        ))
+    
+    def decode(value: Any) -> Any:
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+        if isinstance(value, dict):
+            if len(value) == 1:
+                if '$card' in value:
+                    return cards[value['$card']]
+                if '$player' in value:
+                    return engine.players[value['$player']]
+            return {key: decode(item) for key, item in value.items()}
+        return value
+    
+    def fill_pool(pool, amounts: Dict[str, int]):
+        if pool is None:
+            return
+        if hasattr(pool, 'mana'):
+            for mana_type, amount in amounts.items():
+                pool.mana[ManaType(mana_type)] = amount
+        else:
+            pool.update(amounts)
+    
+    for data in state.players:
+        player = Player(player_id=data.player_id, name=data.name, life=data.life)
+        for zone_name in PLAYER_ZONE_NAMES:
+            setattr(player, zone_name, [cards[index] for index in getattr(data, zone_name)])
+        fill_pool(player.mana_pool, data.mana_pool)
+        player.poison_counters = data.poison_counters
+        player.lands_played_this_turn = data.lands_played_this_turn
+        player.has_drawn_this_turn = data.has_drawn_this_turn
+        player.max_hand_size = data.max_hand_size
+        player.lost_game = data.lost_game
+        if data.is_ai:
+            player.is_ai = True
+            player.ai_difficulty = data.ai_difficulty
+        engine.players.append(player)
+    
+    engine.turn_number = state.turn_number
+    engine.active_player_index = state.active_player_id
+    engine.priority_player_index = state.priority_player_id
+    engine.current_phase = GamePhase(state.current_phase)
+    if state.current_step:
+        engine.current_step = GameStep(state.current_step)
+    engine.game_over = state.game_over
+    engine.winner = state.winner
+    engine.stack = decode(state.legacy_stack)
+    if state.format:
+        engine.format = state.format
+    
+    if engine.mana_manager is not None:
+        for player_id, amounts in state.manager_mana_pools.items():
+            fill_pool(engine.mana_manager.create_mana_pool(player_id), amounts)
+    
+    if engine.stack_manager is not None and state.stack:
+        from app.game.enhanced_stack_manager import StackItem, StackItemType
+        for item_type, name, controller, source, targets, cost_paid, countered in state.stack:
+            engine.stack_manager.stack.append(StackItem(
+                item_type=StackItemType(item_type),
+                name=name,
+                controller=controller,
+                source_card=cards[source] if source is not None else None,
+                targets=decode(targets),
+                cost_paid=cost_paid,
+                countered=countered,
+            ))
+    
+    if engine.trigger_manager is not None and state.triggers:
+        from app.game.triggers import TriggerCondition, TriggeredAbility, TriggerType
+        abilities = []
+        for source, trigger_type, description, times, enabled, condition, registered in state.triggers:
+            source_card = cards[source] if source is not None else None
+            effect = effect_resolver(source_card, description) if effect_resolver else None
+            ability = TriggeredAbility(
+                source_card=source_card,
+                trigger_type=TriggerType(trigger_type),
+                effect=effect or _missing_effect(description),
+                condition=TriggerCondition(
+                    controller=condition[0],
+                    card_types=list(condition[1]),
+                    colors=list(condition[2]),
+                    source_only=condition[3],
+                ) if condition else None,
+                description=description,
+                times_triggered=times,
+                enabled=enabled,
+            )
+            abilities.append(ability)
+            if registered:
+                engine.trigger_manager.register_trigger(ability)
+        engine.trigger_manager.pending_triggers = [abilities[i] for i in state.pending_triggers]
+    
+    if engine.phase_manager is not None and state.phase_manager:
+        from app.game.phase_manager import Phase, Step
+        phase_state = state.phase_manager
+        phase_manager = engine.phase_manager
+        phase_manager.current_phase = Phase(phase_state['phase']) if phase_state['phase'] else None
+        phase_manager.current_step = Step(phase_state['step']) if phase_state['step'] else None
+        phase_manager.active_player = phase_state['active_player']
+        phase_manager.turn_number = phase_state['turn_number']
+    
+    return engine
+
+
+def encode_save(save_data: SaveData, compress: bool = True) -> bytes:
+    """
+    Encode save data in the binary save format.
+    
+    Args:
+        save_data: Save to encode
+        compress: zlib-compress the encoded body
+    
+    Returns:
+        File contents
+    """
+    body = packb(save_data.to_dict())
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    return _SAVE_HEADER.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION, flags) + body
+
+
+def decode_save(data: bytes) -> SaveData:
+    """
+    Decode a binary save.
+    
+    Args:
+        data: File contents
+    
+    Returns:
+        SaveData
+    
+    Raises:
+        ValueError: If the data is not a supported binary save
+    """
+    if len(data) < _SAVE_HEADER.size:
+        raise ValueError("Not a binary save file")
+    magic, version, flags = _SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a binary save file")
+    if version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported save format version {version}")
+    body = data[_SAVE_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    return SaveData.from_dict(unpackb(body))
+
+
+def write_atomic(filepath: Path, data: bytes):
+    """
+    Write a file atomically.
+    
+    The data is written to a temporary file in the same directory and
+    renamed over the target, so readers see either the old or the new file.
+    
+    Args:
+        filepath: Target file
+        data: File contents
+    """
+    filepath = Path(filepath)
+    fd, temp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 class SaveManager:
     """
     Manages saving and loading game states.
@@ -173,6 +673,10 @@ class SaveManager:
         self.auto_save_interval = 60  # seconds
         self.auto_save_timer: Optional[threading.Timer] = None
         self.auto_save_game = None
+        self.auto_save_name = "autosave"
+        self._last_auto_save = 0.0
+        self._pending_save: Optional[Future] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
         
         logger.info(f"SaveManager initialized with directory: {save_directory}")
     
@@ -181,7 +685,8 @@ class SaveManager:
         game: Any,
         save_name: str,
         compress: bool = True,
-        use_pickle: bool = False
+        use_pickle: bool = False,
+        format: str = 'binary'
     ) -> bool:
         """
         Save a game state.
@@ -190,93 +695,80 @@ class SaveManager:
             game: Game instance to save
             save_name: Name for the save file
             compress: Whether to compress the save
-            use_pickle: Use pickle instead of JSON (faster, less portable)
+            use_pickle: Use pickle instead of the chosen format
+            format: 'binary' (compact, default), 'json' or 'pickle'
         
         Returns:
             True if successful
         """
         try:
-            # Create save data
             save_data = self._serialize_game(game, save_name)
-            
-            # Choose format
-            if use_pickle:
-                filepath = self.save_directory / f"{save_name}.pkl"
-                if compress:
-                    filepath = self.save_directory / f"{save_name}.pkl.gz"
-                    with gzip.open(filepath, 'wb') as f:
-                        pickle.dump(save_data.to_dict(), f)
-                else:
-                    with open(filepath, 'wb') as f:
-                        pickle.dump(save_data.to_dict(), f)
-            else:
-                filepath = self.save_directory / f"{save_name}.json"
-                if compress:
-                    filepath = self.save_directory / f"{save_name}.json.gz"
-                    with gzip.open(filepath, 'wt', encoding='utf-8') as f:
-                        json.dump(save_data.to_dict(), f, indent=2)
-                else:
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(save_data.to_dict(), f, indent=2)
-            
-            logger.info(f"Game saved to {filepath}")
+            self._write_save(save_data, save_name, 'pickle' if use_pickle else format, compress)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save game: {e}")
             return False
     
-    def load_game(self, save_name: str) -> Optional[Any]:
+    def load_game(
+        self,
+        save_name: str,
+        effect_resolver: Optional[Callable[[Any, str], Optional[Callable]]] = None
+    ) -> Optional[Any]:
         """
         Load a game state.
         
         Args:
             save_name: Name of the save file
+            effect_resolver: Rebinds trigger effects (see restore_game_state)
         
         Returns:
             Game instance or None if failed
         """
         try:
-            # Try different extensions
-            extensions = ['.json', '.json.gz', '.pkl', '.pkl.gz']
-            filepath = None
-            
-            for ext in extensions:
-                candidate = self.save_directory / f"{save_name}{ext}"
-                if candidate.exists():
-                    filepath = candidate
-                    break
-            
-            if not filepath:
-                logger.error(f"Save file not found: {save_name}")
+            save_data = self.load_save_data(save_name)
+            if save_data is None:
                 return None
             
-            # Load based on format
-            if filepath.suffix == '.gz':
-                with gzip.open(filepath, 'rb' if '.pkl' in filepath.name else 'rt') as f:
-                    if '.pkl' in filepath.name:
-                        data = pickle.load(f)
-                    else:
-                        data = json.load(f)
-            else:
-                with open(filepath, 'rb' if filepath.suffix == '.pkl' else 'r') as f:
-                    if filepath.suffix == '.pkl':
-                        data = pickle.load(f)
-                    else:
-                        data = json.load(f)
-            
-            save_data = SaveData.from_dict(data)
-            
             # Deserialize game
-            game = self._deserialize_game(save_data)
+            game = self._deserialize_game(save_data, effect_resolver)
             
-            logger.info(f"Game loaded from {filepath}")
+            logger.info(f"Game loaded: {save_name}")
             return game
             
         except Exception as e:
             logger.error(f"Failed to load game: {e}")
             return None
     
+    def load_save_data(self, save_name: str) -> Optional[SaveData]:
+        """
+        Read a save file without rebuilding the game.
+        
+        Args:
+            save_name: Name of the save file
+        
+        Returns:
+            SaveData, or None if no save exists
+        """
+        filepath = self._find_save(save_name)
+        if not filepath:
+            logger.error(f"Save file not found: {save_name}")
+            return None
+        
+        name = filepath.name
+        if name.endswith('.mtgs'):
+            return decode_save(filepath.read_bytes())
+        
+        # Load based on format
+        if name.endswith('.gz'):
+            with gzip.open(filepath, 'rb' if '.pkl' in name else 'rt') as f:
+                data = pickle.load(f) if '.pkl' in name else json.load(f)
+        else:
+            with open(filepath, 'rb' if filepath.suffix == '.pkl' else 'r') as f:
+                data = pickle.load(f) if filepath.suffix == '.pkl' else json.load(f)
+        
+        return SaveData.from_dict(data)
+    
     def quick_save(self, game: Any, slot: int = 0) -> bool:
         """Quick save to a slot."""
         save_name = f"quicksave_{slot}"
@@ -292,12 +784,15 @@ class SaveManager:
         saves = []
         
         for filepath in self.save_directory.glob("*"):
-            if filepath.suffix in ['.json', '.pkl'] or '.json.gz' in filepath.name or '.pkl.gz' in filepath.name:
+            name = filepath.name
+            extension = next((ext for ext in SAVE_EXTENSIONS if name.endswith(ext)), None)
+            if extension and not name.startswith('.'):
+                stat = filepath.stat()
                 save_info = {
-                    'name': filepath.stem.replace('.json', '').replace('.pkl', ''),
+                    'name': name[:-len(extension)],
                     'filepath': str(filepath),
-                    'size_bytes': filepath.stat().st_size,
-                    'modified': datetime.fromtimestamp(filepath.stat().st_mtime).isoformat()
+                    'size_bytes': stat.st_size,
+                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
                 }
                 saves.append(save_info)
         
@@ -309,14 +804,11 @@ class SaveManager:
     def delete_save(self, save_name: str) -> bool:
         """Delete a save file."""
         try:
-            extensions = ['.json', '.json.gz', '.pkl', '.pkl.gz']
-            
-            for ext in extensions:
-                filepath = self.save_directory / f"{save_name}{ext}"
-                if filepath.exists():
-                    filepath.unlink()
-                    logger.info(f"Deleted save: {filepath}")
-                    return True
+            filepath = self._find_save(save_name)
+            if filepath:
+                filepath.unlink()
+                logger.info(f"Deleted save: {filepath}")
+                return True
             
             logger.warning(f"Save not found: {save_name}")
             return False
@@ -325,19 +817,31 @@ class SaveManager:
             logger.error(f"Failed to delete save: {e}")
             return False
     
-    def enable_auto_save(self, game: Any, interval: int = 60):
+    def enable_auto_save(self, game: Any, interval: int = 60, save_name: str = "autosave"):
         """
         Enable auto-save.
         
+        For a GameEngine, a snapshot is taken on the game thread at the end
+        of a step once `interval` seconds have passed since the last one,
+        then encoded and written atomically on a background thread. Games
+        without step listeners fall back to a timer.
+        
         Args:
             game: Game instance to auto-save
-            interval: Save interval in seconds
+            interval: Minimum seconds between saves
+            save_name: Name for the auto-save file
         """
+        self.disable_auto_save()
         self.auto_save_enabled = True
         self.auto_save_interval = interval
         self.auto_save_game = game
+        self.auto_save_name = save_name
+        self._last_auto_save = time.monotonic()
         
-        self._schedule_auto_save()
+        if hasattr(game, 'add_step_listener'):
+            game.add_step_listener(self._on_step_end)
+        else:
+            self._schedule_auto_save()
         
         logger.info(f"Auto-save enabled (interval: {interval}s)")
     
@@ -349,40 +853,148 @@ class SaveManager:
             self.auto_save_timer.cancel()
             self.auto_save_timer = None
         
+        if self.auto_save_game is not None and hasattr(self.auto_save_game, 'remove_step_listener'):
+            self.auto_save_game.remove_step_listener(self._on_step_end)
+        self.auto_save_game = None
+        
         logger.info("Auto-save disabled")
     
+    def wait_for_auto_save(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a background auto-save write to finish.
+        
+        Args:
+            timeout: Seconds to wait (None to wait indefinitely)
+        
+        Returns:
+            True if no write is pending or the pending write succeeded
+        """
+        pending = self._pending_save
+        if pending is None:
+            return True
+        try:
+            pending.result(timeout=timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Auto-save failed: {e}")
+            return False
+    
+    def close(self):
+        """Stop auto-saving and finish any pending write."""
+        self.disable_auto_save()
+        self.wait_for_auto_save()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+    
+    def _on_step_end(self, game: Any):
+        """Step listener: snapshot the game and write it in the background."""
+        if not self.auto_save_enabled:
+            return
+        now = time.monotonic()
+        if now - self._last_auto_save < self.auto_save_interval:
+            return
+        if self._pending_save is not None and not self._pending_save.done():
+            return  # Previous write still running; try again next step
+        
+        self._last_auto_save = now
+        save_data = self._serialize_game(game, self.auto_save_name)
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending_save = self._writer.submit(
+            self._write_save, save_data, self.auto_save_name, 'binary', True
+        )
+    
     def _schedule_auto_save(self):
-        """Schedule the next auto-save."""
+        """Schedule the next timer auto-save (games without step listeners)."""
         if not self.auto_save_enabled:
             return
         
         def auto_save_task():
             if self.auto_save_game and self.auto_save_enabled:
-                self.save_game(self.auto_save_game, "autosave", compress=True)
+                self.save_game(self.auto_save_game, self.auto_save_name, compress=True)
                 self._schedule_auto_save()
         
         self.auto_save_timer = threading.Timer(self.auto_save_interval, auto_save_task)
         self.auto_save_timer.daemon = True
         self.auto_save_timer.start()
     
+    def _find_save(self, save_name: str) -> Optional[Path]:
+        """Find the file for a save name, trying each format."""
+        for ext in SAVE_EXTENSIONS:
+            candidate = self.save_directory / f"{save_name}{ext}"
+            if candidate.exists():
+                return candidate
+        return None
+    
+    def _write_save(self, save_data: SaveData, save_name: str, format: str, compress: bool) -> Path:
+        """
+        Encode save data and write it atomically.
+        
+        Args:
+            save_data: Save to write
+            save_name: Name for the save file
+            format: 'binary', 'json' or 'pickle'
+            compress: Whether to compress the save
+        
+        Returns:
+            Path written
+        """
+        if format == 'binary':
+            filepath = self.save_directory / f"{save_name}.mtgs"
+            data = encode_save(save_data, compress)
+        elif format == 'pickle':
+            filepath = self.save_directory / f"{save_name}.pkl"
+            data = pickle.dumps(save_data.to_dict(), protocol=pickle.HIGHEST_PROTOCOL)
+        elif format == 'json':
+            filepath = self.save_directory / f"{save_name}.json"
+            if compress:
+                data = json.dumps(save_data.to_dict(), separators=(',', ':')).encode('utf-8')
+            else:
+                data = json.dumps(save_data.to_dict(), indent=2).encode('utf-8')
+        else:
+            raise ValueError(f"Unknown save format: {format}")
+        
+        if compress and format != 'binary':
+            filepath = filepath.with_name(filepath.name + '.gz')
+            data = gzip.compress(data, compresslevel=6)
+        
+        write_atomic(filepath, data)
+        # Only one format per save name, so loading never finds a stale file;
+        # the others go only once the new one is written
+        for ext in SAVE_EXTENSIONS:
+            other = self.save_directory / f"{save_name}{ext}"
+            if other != filepath and other.exists():
+                other.unlink()
+        logger.info(f"Game saved to {filepath}")
+        return filepath
+    
     def _serialize_game(self, game: Any, save_name: str) -> SaveData:
         """Serialize a game to SaveData."""
-        # This is a placeholder - actual implementation depends on game structure
         save_data = SaveData(
             save_name=save_name,
             saved_at=datetime.now().isoformat()
         )
         
-        # Would serialize game state here
-        # save_data.game_state = GameStateData(...)
+        if hasattr(game, 'players') and hasattr(game, 'turn_number'):
+            save_data.game_state = capture_game_state(
+                game, game_id=getattr(game, 'game_id', '') or save_name
+            )
+        else:
+            logger.warning(f"Cannot capture state of {type(game).__name__}; saving metadata only")
         
         return save_data
     
-    def _deserialize_game(self, save_data: SaveData) -> Any:
+    def _deserialize_game(
+        self,
+        save_data: SaveData,
+        effect_resolver: Optional[Callable[[Any, str], Optional[Callable]]] = None
+    ) -> Any:
         """Deserialize SaveData to a game."""
-        # This is a placeholder - actual implementation depends on game structure
-        # Would reconstruct game from save_data.game_state
-        return None
+        if save_data.game_state is None:
+            logger.warning(f"Save '{save_data.save_name}' has no game state")
+            return None
+        return restore_game_state(save_data.game_state, effect_resolver)
 
 
 class DeckSerializer:
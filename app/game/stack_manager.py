@@ -31,6 +31,8 @@ from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.game.legal_actions import cast_timing_error
+
 logger = logging.getLogger(__name__)
 
 
@@ -175,7 +177,7 @@ class StackManager:
         )
         
         self.push(stack_obj)
-        self.game_engine.log_event(f"{player.name} casts {card.name}")
+        self.game_engine.log_event("%s casts %s", player.name, card.name)
         
         # Give priority after casting
         self.game_engine.give_priority()
@@ -218,7 +220,7 @@ class StackManager:
         )
         
         self.push(stack_obj)
-        self.game_engine.log_event(f"{player.name} activates {card.name}")
+        self.game_engine.log_event("%s activates %s", player.name, card.name)
         
         # Give priority after activating
         self.game_engine.give_priority()
@@ -247,7 +249,7 @@ class StackManager:
         )
         
         self.push(stack_obj)
-        self.game_engine.log_event(f"{card.name} triggers")
+        self.game_engine.log_event("%s triggers", card.name)
     
     def counter_spell(self, stack_object: StackObject):
         """
@@ -264,7 +266,7 @@ class StackManager:
             if stack_object.object_type == StackObjectType.SPELL and stack_object.source_card:
                 self.game_engine.move_to_graveyard(stack_object.source_card)
             
-            self.game_engine.log_event(f"{stack_object.name} is countered")
+            self.game_engine.log_event("%s is countered", stack_object.name)
             logger.info(f"Countered: {stack_object.name}")
     
     def resolve_top(self):
@@ -280,7 +282,7 @@ class StackManager:
             logger.info(f"{stack_obj.name} was countered, not resolving")
             return
         
-        self.game_engine.log_event(f"Resolving: {stack_obj.name}")
+        self.game_engine.log_event("Resolving: %s", stack_obj.name)
         
         # Resolve based on type
         if stack_obj.object_type == StackObjectType.SPELL:
@@ -366,14 +368,16 @@ class StackManager:
                 if hasattr(target, 'life'):
                     target.life -= damage
                     self.game_engine.log_event(
-                        f"{stack_obj.name} deals {damage} damage to {target.name}"
+                        "%s deals %s damage to %s",
+                        stack_obj.name, damage, target.name
                     )
                 
                 # Check if target is a creature
                 elif hasattr(target, 'damage'):
                     target.damage += damage
                     self.game_engine.log_event(
-                        f"{stack_obj.name} deals {damage} damage to {target.name}"
+                        "%s deals %s damage to %s",
+                        stack_obj.name, damage, target.name
                     )
         
         # Draw effects
@@ -386,7 +390,8 @@ class StackManager:
                 for _ in range(num_cards):
                     controller.draw_card()
                 self.game_engine.log_event(
-                    f"{controller.name} draws {num_cards} card(s)"
+                    "%s draws %s card(s)",
+                    controller.name, num_cards
                 )
         
         # Destroy effects
@@ -394,7 +399,10 @@ class StackManager:
             for target in stack_obj.targets:
                 if hasattr(target, 'zone'):
                     self.game_engine.move_to_graveyard(target)
-                    self.game_engine.log_event(f"{stack_obj.name} destroys {target.name}")
+                    self.game_engine.log_event(
+                        "%s destroys %s",
+                        stack_obj.name, target.name
+                    )
         
         # Many more effects would go here in a complete implementation
         else:
@@ -411,28 +419,17 @@ class StackManager:
         Returns:
             True if can cast
         """
-        # Must have priority
-        if player.player_id != self.game_engine.priority_player_index:
-            logger.warning("Player doesn't have priority")
-            return False
-        
-        # Instant speed check
-        if card.is_instant_or_flash():
-            # Can cast anytime with priority
-            return True
-        
-        # Sorcery speed check (main phase, stack empty, active player)
-        if player.player_id != self.game_engine.active_player_index:
-            logger.warning("Only active player can cast sorcery-speed spells")
-            return False
-        
-        from app.game.game_engine import GamePhase
-        if self.game_engine.current_phase not in [GamePhase.PRECOMBAT_MAIN, GamePhase.POSTCOMBAT_MAIN]:
-            logger.warning("Can only cast sorcery-speed spells during main phase")
-            return False
-        
-        if not self.is_empty():
-            logger.warning("Can only cast sorcery-speed spells when stack is empty")
+        # Priority, then sorcery timing unless it's an instant or has flash
+        error = cast_timing_error(
+            card,
+            player.player_id,
+            self.game_engine.priority_player_index,
+            self.game_engine.active_player_index,
+            self.game_engine.current_phase,
+            self.is_empty()
+        )
+        if error:
+            logger.warning(error)
             return False
         
         return True
@@ -572,7 +569,7 @@ class ResponseWindow:
         Args:
             prompt: Prompt message for players
         """
-        self.game_engine.log_event(f"Response window: {prompt}")
+        self.game_engine.log_event("Response window: %s", prompt)
         self.responses_received.clear()
         
         # In a real implementation, would wait for player input
@@ -1,12 +1,17 @@
 """
 State-based actions system.
 Implements all MTG state-based actions that are checked continuously.
+
+Only cards and players that changed since the previous check are examined;
+`check_all(full_scan=True)` forces a scan of everything.
 """
 
 import logging
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 from enum import Enum
 
+from app.game.zones import CardZone, card_has_type
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,12 +50,33 @@ class StateBasedAction(Enum):
     COPY_TOKEN_EFFECT_ENDS = "copy_token_effect_ends"
 
 
+# Card attributes read by the permanent/card SBAs. Writes to anything else
+# (tapped, summoning_sick, ...) do not make a card dirty.
+SBA_CARD_ATTRIBUTES = frozenset({
+    'damage', 'toughness', 'has_deathtouch_damage', 'loyalty',
+    'plus_counters', 'minus_counters', 'counters',
+    'types', 'type_line', 'name', 'oracle_text', 'controller',
+    'attached_to', 'is_token', 'zone',
+})
+
+# Player zones the SBAs look at
+SBA_ZONES = ('battlefield', 'graveyard', 'exile', 'hand')
+
+
 class StateBasedActionsChecker:
     """
     Checks and performs state-based actions.
     
     State-based actions are checked whenever a player would receive priority
     and are performed simultaneously.
+    
+    Checking is driven by change tracking: the checker subscribes to each
+    player's zones and only re-examines cards that entered a zone or had an
+    SBA-relevant attribute written since the last check (plus auras and
+    equipment attached to them), and players whose life, poison or loss
+    status changed. Objects that cannot report their own changes (cards
+    without TrackedCard, zones that are plain lists) are examined on every
+    check, so the result is always the same as a full scan.
     """
     
     def __init__(self, game_engine):
@@ -62,30 +88,175 @@ class StateBasedActionsChecker:
         """
         self.game_engine = game_engine
         self.actions_performed: List[str] = []
+        
+        # Change tracking
+        self._zones: Dict[int, CardZone] = {}
+        self._dirty: Dict[int, object] = {}
+        self._untracked: Dict[int, object] = {}
+        self._attachments: Dict[int, Dict[int, object]] = {}
+        self._volatile_attachments: Dict[int, object] = {}
+        self._player_versions: Dict[int, int] = {}
+        self._full_scan = False
+        self._round_cards: Dict[int, List] = {}
+        self._round_players: List = []
         logger.info("StateBasedActionsChecker initialized")
     
-    def check_all(self) -> bool:
+    def check_all(self, full_scan: bool = False) -> bool:
         """
         Check all state-based actions.
         
+        Args:
+            full_scan: Examine every permanent and player instead of only
+                the ones that changed since the last check
+        
         Returns:
             True if any actions were performed
         """
         self.actions_performed.clear()
         actions_taken = False
+        self._sync_zones()
+        self._full_scan = full_scan
         
         # Keep checking until no more actions are performed
-        while True:
-            round_actions = self._check_round()
-            if not round_actions:
-                break
-            actions_taken = True
+        try:
+            while True:
+                round_actions = self._check_round()
+                if not round_actions:
+                    break
+                actions_taken = True
+        finally:
+            self._full_scan = False
+            self._round_cards = {}
+            self._round_players = []
         
         if self.actions_performed:
             logger.info(f"SBAs performed: {len(self.actions_performed)}")
         
         return actions_taken
     
+    def mark_all_dirty(self):
+        """Force the next check to examine every card and player."""
+        self._sync_zones()
+        for zone in self._zones.values():
+            for card in zone:
+                self._dirty[id(card)] = card
+        self._player_versions.clear()
+    
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+    
+    def _sync_zones(self):
+        """Subscribe to the players' current zones (new zones start dirty)."""
+        current = {}
+        for player in self.game_engine.players:
+            for attr in SBA_ZONES:
+                zone = getattr(player, attr, None)
+                if isinstance(zone, CardZone):
+                    current[id(zone)] = zone
+        
+        for key, zone in list(self._zones.items()):
+            if key not in current:
+                zone.remove_listener(self._on_zone_event)
+                del self._zones[key]
+        
+        for key, zone in current.items():
+            if key not in self._zones:
+                zone.add_listener(self._on_zone_event)
+                self._zones[key] = zone
+                for card in zone:
+                    self._on_zone_event('enter', zone, card, None)
+    
+    def _on_zone_event(self, event: str, zone, card, attribute: Optional[str]):
+        """Record cards that need re-examination."""
+        key = id(card)
+        if event == 'leave':
+            self._untracked.pop(key, None)
+            self._volatile_attachments.pop(key, None)
+            # Auras/equipment on a card that left may now be illegal
+            self._mark_attached_dirty(key)
+            return
+        
+        if event == 'change' and attribute is not None and attribute not in SBA_CARD_ATTRIBUTES:
+            return
+        
+        self._dirty[key] = card
+        if not getattr(type(card), 'TRACKS_CHANGES', False):
+            self._untracked[key] = card
+        self._mark_attached_dirty(key)
+    
+    def _mark_attached_dirty(self, key: int):
+        """Mark auras and equipment attached to a card as dirty."""
+        attached = self._attachments.get(key)
+        if attached:
+            self._dirty.update(attached)
+    
+    def _record_attachment(self, permanent, attached_to):
+        """Remember what an aura/equipment is attached to."""
+        key = id(permanent)
+        if attached_to is None:
+            self._volatile_attachments.pop(key, None)
+            return
+        self._attachments.setdefault(id(attached_to), {})[key] = permanent
+        # Changes to objects that don't report them can't be observed, so
+        # attachments to them are re-examined on every check.
+        if getattr(type(attached_to), 'TRACKS_CHANGES', False):
+            self._volatile_attachments.pop(key, None)
+        else:
+            self._volatile_attachments[key] = permanent
+    
+    def _start_round(self):
+        """Collect the cards and players to examine this round."""
+        candidates = dict(self._dirty)
+        candidates.update(self._untracked)
+        candidates.update(self._volatile_attachments)
+        self._dirty.clear()
+        
+        self._round_cards = {}
+        if not self._full_scan:
+            for key, zone in self._zones.items():
+                self._round_cards[key] = [c for c in candidates.values() if c in zone]
+        
+        self._round_players = []
+        for player in self.game_engine.players:
+            version = getattr(player, 'state_version', None)
+            if (self._full_scan or version is None
+                    or self._player_versions.get(id(player)) != version):
+                self._round_players.append(player)
+    
+    def _finish_round(self):
+        """Remember the player state that has been examined."""
+        for player in self._round_players:
+            version = getattr(player, 'state_version', None)
+            if version is not None:
+                self._player_versions[id(player)] = version
+    
+    def _changed(self, zone, card_type: Optional[str] = None) -> List:
+        """
+        Cards of a zone to examine this round.
+        
+        Args:
+            zone: Player zone (CardZone or plain list)
+            card_type: Only return cards of this type
+            
+        Returns:
+            Cards still in the zone that changed since the last check (every
+            card for full scans and untracked zones)
+        """
+        if self._full_scan or not isinstance(zone, CardZone) or id(zone) not in self._zones:
+            if card_type is not None and isinstance(zone, CardZone):
+                return list(zone.view(card_type))
+            return [c for c in zone if card_type is None or card_has_type(c, card_type)]
+        
+        return [
+            c for c in self._round_cards.get(id(zone), ())
+            if c in zone and (card_type is None or card_has_type(c, card_type))
+        ]
+    
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+    
     def _check_round(self) -> bool:
         """
         Perform one round of SBA checks.
@@ -93,6 +264,7 @@ class StateBasedActionsChecker:
         Returns:
             True if any actions were performed
         """
+        self._start_round()
         actions_this_round = False
         
         # Player-based SBAs
@@ -121,13 +293,14 @@ class StateBasedActionsChecker:
         # Counter interactions
         actions_this_round |= self._check_counter_cancellation()
         
+        self._finish_round()
         return actions_this_round
     
     def _check_player_life(self) -> bool:
         """Check if any players have 0 or less life."""
         actions = False
         
-        for player in self.game_engine.players:
+        for player in self._round_players:
             if player.life <= 0 and not player.lost_game:
                 self._log_action(f"Player {player.player_id} loses (life: {player.life})")
                 player.lost_game = True
@@ -139,7 +312,7 @@ class StateBasedActionsChecker:
         """Check if any players have 10+ poison counters."""
         actions = False
         
-        for player in self.game_engine.players:
+        for player in self._round_players:
             if hasattr(player, 'poison_counters') and player.poison_counters >= 10 and not player.lost_game:
                 self._log_action(f"Player {player.player_id} loses (poison: {player.poison_counters})")
                 player.lost_game = True
@@ -158,10 +331,7 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield[:]:
-                if not self._is_creature(permanent):
-                    continue
-                
+            for permanent in self._changed(player.battlefield, 'Creature'):
                 damage = getattr(permanent, 'damage', 0)
                 toughness = getattr(permanent, 'toughness', 0)
                 
@@ -177,10 +347,7 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield[:]:
-                if not self._is_creature(permanent):
-                    continue
-                
+            for permanent in self._changed(player.battlefield, 'Creature'):
                 toughness = getattr(permanent, 'toughness', 0)
                 
                 if toughness <= 0:
@@ -195,10 +362,7 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield[:]:
-                if not self._is_creature(permanent):
-                    continue
-                
+            for permanent in self._changed(player.battlefield, 'Creature'):
                 if hasattr(permanent, 'has_deathtouch_damage') and permanent.has_deathtouch_damage:
                     self._log_action(f"{permanent.name} dies (deathtouch)")
                     self.game_engine.move_to_graveyard(permanent)
@@ -211,10 +375,7 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield[:]:
-                if not self._is_planeswalker(permanent):
-                    continue
-                
+            for permanent in self._changed(player.battlefield, 'Planeswalker'):
                 loyalty = getattr(permanent, 'loyalty', 0)
                 
                 if loyalty <= 0:
@@ -229,14 +390,18 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
+            # Only names of legendaries that changed can have new duplicates
+            changed_names = {p.name for p in self._changed(player.battlefield, 'Legendary')}
+            if not changed_names:
+                continue
+            
             # Group legendaries by name
             legendaries = {}
             
-            for permanent in player.battlefield:
-                if not self._is_legendary(permanent):
-                    continue
-                
+            for permanent in self._legendaries(player.battlefield):
                 name = permanent.name
+                if name not in changed_names:
+                    continue
                 if name not in legendaries:
                     legendaries[name] = []
                 legendaries[name].append(permanent)
@@ -253,27 +418,33 @@ class StateBasedActionsChecker:
         
         return actions
     
+    def _legendaries(self, battlefield) -> List:
+        """All legendary permanents on a battlefield, in battlefield order."""
+        if isinstance(battlefield, CardZone):
+            return list(battlefield.view('Legendary'))
+        return [p for p in battlefield if self._is_legendary(p)]
+    
     def _check_tokens_in_wrong_zones(self) -> bool:
         """Remove tokens from zones other than battlefield."""
         actions = False
         
         for player in self.game_engine.players:
             # Check graveyard
-            for card in player.graveyard[:]:
+            for card in self._changed(player.graveyard):
                 if getattr(card, 'is_token', False):
                     self._log_action(f"Token {card.name} ceases to exist (in graveyard)")
                     player.graveyard.remove(card)
                     actions = True
             
             # Check exile
-            for card in player.exile[:]:
+            for card in self._changed(player.exile):
                 if getattr(card, 'is_token', False):
                     self._log_action(f"Token {card.name} ceases to exist (in exile)")
                     player.exile.remove(card)
                     actions = True
             
             # Check hand (shouldn't happen but check anyway)
-            for card in player.hand[:]:
+            for card in self._changed(player.hand):
                 if getattr(card, 'is_token', False):
                     self._log_action(f"Token {card.name} ceases to exist (in hand)")
                     player.hand.remove(card)
@@ -286,12 +457,13 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield[:]:
+            for permanent in self._changed(player.battlefield, 'Aura'):
                 if not self._is_aura(permanent):
                     continue
                 
                 # Aura must be attached to something
                 attached_to = getattr(permanent, 'attached_to', None)
+                self._record_attachment(permanent, attached_to)
                 
                 if not attached_to:
                     self._log_action(f"{permanent.name} put into graveyard (not attached)")
@@ -312,11 +484,12 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield:
+            for permanent in self._changed(player.battlefield, 'Equipment'):
                 if not self._is_equipment(permanent):
                     continue
                 
                 attached_to = getattr(permanent, 'attached_to', None)
+                self._record_attachment(permanent, attached_to)
                 
                 if attached_to:
                     # Equipment must be attached to creature you control
@@ -336,7 +509,7 @@ class StateBasedActionsChecker:
         actions = False
         
         for player in self.game_engine.players:
-            for permanent in player.battlefield:
+            for permanent in self._changed(player.battlefield):
                 plus_counters = getattr(permanent, 'plus_counters', 0)
                 minus_counters = getattr(permanent, 'minus_counters', 0)
                 
@@ -356,33 +529,15 @@ class StateBasedActionsChecker:
     def _is_creature(self, card) -> bool:
         """Check if card is a creature."""
         # Some tests/legacy code use `types` list instead of a type_line string
-        type_line = getattr(card, 'type_line', '') or ''
-        if 'Creature' in type_line:
-            return True
-        types_list = getattr(card, 'types', [])
-        if isinstance(types_list, (list, tuple)) and 'Creature' in types_list:
-            return True
-        return False
+        return card_has_type(card, 'Creature')
     
     def _is_planeswalker(self, card) -> bool:
         """Check if card is a planeswalker."""
-        type_line = getattr(card, 'type_line', '') or ''
-        if 'Planeswalker' in type_line:
-            return True
-        types_list = getattr(card, 'types', [])
-        if isinstance(types_list, (list, tuple)) and 'Planeswalker' in types_list:
-            return True
-        return False
+        return card_has_type(card, 'Planeswalker')
     
     def _is_legendary(self, card) -> bool:
         """Check if card is legendary."""
-        type_line = getattr(card, 'type_line', '') or ''
-        if 'Legendary' in type_line:
-            return True
-        types_list = getattr(card, 'types', [])
-        if isinstance(types_list, (list, tuple)) and 'Legendary' in types_list:
-            return True
-        return False
+        return card_has_type(card, 'Legendary')
     
     def _is_aura(self, card) -> bool:
         """Check if card is an aura."""
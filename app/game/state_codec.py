@@ -0,0 +1,246 @@
+"""
+Compact binary encoding for saved game state.
+
+Encodes plain data (None, bools, ints, floats, strings, bytes, lists,
+tuples and dicts) in the MessagePack wire format. The `msgpack` package is
+used when it is installed; otherwise a pure-Python encoder/decoder that
+writes the same bytes is used, so files are readable either way.
+
+Functions:
+    packb: Encode a value to bytes
+    unpackb: Decode bytes to a value (arrays decode as lists)
+
+Usage:
+    data = packb({'turn': 3, 'life': [20, 17]})
+    state = unpackb(data)
+"""
+
+import logging
+import struct
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_pack_uint8 = struct.Struct('>B').pack
+_pack_uint16 = struct.Struct('>H').pack
+_pack_uint32 = struct.Struct('>I').pack
+_pack_uint64 = struct.Struct('>Q').pack
+_pack_int8 = struct.Struct('>b').pack
+_pack_int16 = struct.Struct('>h').pack
+_pack_int32 = struct.Struct('>i').pack
+_pack_int64 = struct.Struct('>q').pack
+_pack_float64 = struct.Struct('>d').pack
+
+
+def _pack_int(value: int, out: List[bytes]):
+    """Append the smallest encoding of an int."""
+    if 0 <= value < 0x80:
+        out.append(_pack_uint8(value))
+    elif -32 <= value < 0:
+        out.append(_pack_int8(value))
+    elif value >= 0:
+        if value <= 0xff:
+            out.append(b'\xcc' + _pack_uint8(value))
+        elif value <= 0xffff:
+            out.append(b'\xcd' + _pack_uint16(value))
+        elif value <= 0xffffffff:
+            out.append(b'\xce' + _pack_uint32(value))
+        else:
+            out.append(b'\xcf' + _pack_uint64(value))
+    elif value >= -0x80:
+        out.append(b'\xd0' + _pack_int8(value))
+    elif value >= -0x8000:
+        out.append(b'\xd1' + _pack_int16(value))
+    elif value >= -0x80000000:
+        out.append(b'\xd2' + _pack_int32(value))
+    else:
+        out.append(b'\xd3' + _pack_int64(value))
+
+
+def _pack_header(size: int, fix_base: Optional[int], fix_limit: int, codes: Tuple,
+                 out: List[bytes]):
+    """Append a length header for strings, binaries, arrays or maps."""
+    if fix_base is not None and size < fix_limit:
+        out.append(_pack_uint8(fix_base | size))
+    elif codes[0] is not None and size <= 0xff:
+        out.append(codes[0] + _pack_uint8(size))
+    elif size <= 0xffff:
+        out.append(codes[1] + _pack_uint16(size))
+    else:
+        out.append(codes[2] + _pack_uint32(size))
+
+
+_STR_CODES = (b'\xd9', b'\xda', b'\xdb')
+_BIN_CODES = (b'\xc4', b'\xc5', b'\xc6')
+_ARRAY_CODES = (None, b'\xdc', b'\xdd')
+_MAP_CODES = (None, b'\xde', b'\xdf')
+
+
+def _pack(value: Any, out: List[bytes]):
+    """Append the encoding of a value."""
+    if value is None:
+        out.append(b'\xc0')
+    elif value is True:
+        out.append(b'\xc3')
+    elif value is False:
+        out.append(b'\xc2')
+    elif isinstance(value, int):
+        _pack_int(value, out)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _pack_header(len(encoded), 0xa0, 32, _STR_CODES, out)
+        out.append(encoded)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, 16, _ARRAY_CODES, out)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        _pack_header(len(value), 0x80, 16, _MAP_CODES, out)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    elif isinstance(value, float):
+        out.append(b'\xcb' + _pack_float64(value))
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_header(len(value), None, 0, _BIN_CODES, out)
+        out.append(bytes(value))
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+class _Unpacker:
+    """Decoder over a bytes buffer."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def _take(self, size: int) -> memoryview:
+        start = self.pos
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("Truncated data")
+        self.pos = end
+        return self.data[start:end]
+
+    def _unpack_struct(self, fmt: struct.Struct):
+        return fmt.unpack(self._take(fmt.size))[0]
+
+    def _array(self, size: int) -> list:
+        read = self.read
+        return [read() for _ in range(size)]
+
+    def _map(self, size: int) -> dict:
+        read = self.read
+        result = {}
+        for _ in range(size):
+            key = read()
+            result[key] = read()
+        return result
+
+    def _str(self, size: int) -> str:
+        return str(self._take(size), 'utf-8')
+
+    def read(self) -> Any:
+        """Decode the next value."""
+        if self.pos >= len(self.data):
+            raise ValueError("Truncated data")
+        code = self.data[self.pos]
+        self.pos += 1
+
+        if code < 0x80:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if code < 0x90:
+            return self._map(code & 0x0f)
+        if code < 0xa0:
+            return self._array(code & 0x0f)
+        if code < 0xc0:
+            return self._str(code & 0x1f)
+
+        handler = _HANDLERS.get(code)
+        if handler is None:
+            raise ValueError(f"Unsupported type code 0x{code:02x}")
+        return handler(self)
+
+
+_U8, _U16, _U32, _U64 = (struct.Struct(f) for f in ('>B', '>H', '>I', '>Q'))
+_I8, _I16, _I32, _I64 = (struct.Struct(f) for f in ('>b', '>h', '>i', '>q'))
+_F32, _F64 = struct.Struct('>f'), struct.Struct('>d')
+
+_HANDLERS: dict = {
+    0xc0: lambda u: None,
+    0xc2: lambda u: False,
+    0xc3: lambda u: True,
+    0xc4: lambda u: bytes(u._take(u._unpack_struct(_U8))),
+    0xc5: lambda u: bytes(u._take(u._unpack_struct(_U16))),
+    0xc6: lambda u: bytes(u._take(u._unpack_struct(_U32))),
+    0xca: lambda u: u._unpack_struct(_F32),
+    0xcb: lambda u: u._unpack_struct(_F64),
+    0xcc: lambda u: u._unpack_struct(_U8),
+    0xcd: lambda u: u._unpack_struct(_U16),
+    0xce: lambda u: u._unpack_struct(_U32),
+    0xcf: lambda u: u._unpack_struct(_U64),
+    0xd0: lambda u: u._unpack_struct(_I8),
+    0xd1: lambda u: u._unpack_struct(_I16),
+    0xd2: lambda u: u._unpack_struct(_I32),
+    0xd3: lambda u: u._unpack_struct(_I64),
+    0xd9: lambda u: u._str(u._unpack_struct(_U8)),
+    0xda: lambda u: u._str(u._unpack_struct(_U16)),
+    0xdb: lambda u: u._str(u._unpack_struct(_U32)),
+    0xdc: lambda u: u._array(u._unpack_struct(_U16)),
+    0xdd: lambda u: u._array(u._unpack_struct(_U32)),
+    0xde: lambda u: u._map(u._unpack_struct(_U16)),
+    0xdf: lambda u: u._map(u._unpack_struct(_U32)),
+}
+
+
+def _py_packb(value: Any) -> bytes:
+    """Encode a value with the pure-Python encoder."""
+    out: List[bytes] = []
+    _pack(value, out)
+    return b''.join(out)
+
+
+def _py_unpackb(data: bytes) -> Any:
+    """Decode a value with the pure-Python decoder."""
+    unpacker = _Unpacker(data)
+    value = unpacker.read()
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError("Extra data after encoded value")
+    return value
+
+
+if msgpack is not None:
+    def packb(value: Any) -> bytes:
+        """
+        Encode a value to MessagePack bytes.
+
+        Args:
+            value: Plain data (None, bool, int, float, str, bytes, list, tuple, dict)
+
+        Returns:
+            Encoded bytes
+        """
+        return msgpack.packb(value, use_bin_type=True)
+
+    def unpackb(data: bytes) -> Any:
+        """
+        Decode MessagePack bytes.
+
+        Args:
+            data: Encoded bytes
+
+        Returns:
+            Decoded value (arrays as lists)
+        """
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+else:
+    packb: Callable[[Any], bytes] = _py_packb
+    unpackb: Callable[[bytes], Any] = _py_unpackb
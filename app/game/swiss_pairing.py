@@ -0,0 +1,296 @@
+"""
+Swiss pairing engine.
+
+Pairs a Swiss round as a minimum-cost matching instead of greedily walking
+down the standings. Players are grouped by match points; each score group
+(plus players floated down from the group above) is split into a top and
+bottom half, and the halves are matched with a minimum-cost assignment:
+
+    cost(i, j) = |i - j|              distance from the ideal "top half
+                                       player i meets bottom half player i"
+               + rematch penalty      larger than any sum of distances
+
+The assignment starts from the ideal pairing and only re-solves the players
+whose ideal opponent is a rematch, using shortest augmenting paths over a
+window of nearby opponents (widened to the whole group if needed). Players
+who can only be paired as a rematch float down to the next score group;
+the bottom group accepts rematches, which are then swapped away against
+other pairings where possible. With an odd number of players the bye goes
+to the lowest-ranked player in the lowest score group that has not had one
+yet.
+
+Functions:
+    pair_swiss: Pair one round
+    choose_bye: Pick the player who gets the bye
+    min_cost_assignment: Minimum-cost assignment solver
+
+Usage:
+    pairings, bye = pair_swiss(ranked_ids, points, played_pairs, byes)
+"""
+
+import heapq
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Opponents within this many places of the ideal one are tried first
+DEFAULT_WINDOW = 6
+
+INF = float('inf')
+
+
+def pair_key(player1: int, player2: int) -> Tuple[int, int]:
+    """Get the order-independent key for a pairing."""
+    return (player1, player2) if player1 < player2 else (player2, player1)
+
+
+def choose_bye(ranked: Sequence[int], points: Dict[int, int], byes: Dict[int, int]) -> int:
+    """
+    Pick the player who gets the bye.
+
+    Args:
+        ranked: Player ids, best first
+        points: Match points by player id
+        byes: Byes already received by player id
+
+    Returns:
+        The lowest-ranked player with the fewest byes among the lowest
+        score group that has such a player
+    """
+    fewest = min(byes.get(player, 0) for player in ranked)
+    lowest = min(points[player] for player in ranked if byes.get(player, 0) == fewest)
+    for player in reversed(ranked):
+        if byes.get(player, 0) == fewest and points[player] == lowest:
+            return player
+
+
+def min_cost_assignment(
+    size: int,
+    cost: Callable[[int, int], int],
+    candidates: Callable[[int], Iterable[int]],
+    initial: Optional[List[int]] = None
+) -> Optional[List[int]]:
+    """
+    Solve a square assignment problem by successive shortest paths.
+
+    Args:
+        size: Number of rows (and columns)
+        cost: Non-negative cost of assigning row i to column j
+        candidates: Columns row i may be assigned to
+        initial: Optional starting assignment (row -> column or -1); every
+            assigned pair must have cost 0
+
+    Returns:
+        Column assigned to each row, or None if some row has no feasible
+        column among its candidates
+    """
+    row_match = list(initial) if initial else [-1] * size
+    col_match = [-1] * size
+    for row, col in enumerate(row_match):
+        if col >= 0:
+            col_match[col] = row
+
+    # Potentials keep reduced costs non-negative so Dijkstra applies
+    row_pot = [0] * size
+    col_pot = [0] * size
+
+    for root in range(size):
+        if row_match[root] >= 0:
+            continue
+
+        row_dist = {root: 0}
+        col_dist: Dict[int, float] = {}
+        came_from: Dict[int, int] = {}
+        settled_rows = []
+        settled_cols = []
+        heap = [(0, 0, root)]  # (distance, is_column, node)
+        found = -1
+        found_dist = 0
+
+        while heap:
+            dist, is_column, node = heapq.heappop(heap)
+            if is_column:
+                if dist > col_dist[node]:
+                    continue
+                settled_cols.append(node)
+                row = col_match[node]
+                if row < 0:
+                    found, found_dist = node, dist
+                    break
+                if dist < row_dist.get(row, INF):
+                    row_dist[row] = dist  # Matched edges have zero reduced cost
+                    heapq.heappush(heap, (dist, 0, row))
+            else:
+                if dist > row_dist[node]:
+                    continue
+                settled_rows.append(node)
+                base = dist + row_pot[node]
+                matched = row_match[node]
+                for col in candidates(node):
+                    if col == matched:
+                        continue
+                    new_dist = base + cost(node, col) - col_pot[col]
+                    if new_dist < col_dist.get(col, INF):
+                        col_dist[col] = new_dist
+                        came_from[col] = node
+                        heapq.heappush(heap, (new_dist, 1, col))
+
+        if found < 0:
+            return None
+
+        # Johnson update: settled nodes move by (distance - found distance)
+        for row in settled_rows:
+            if row_dist[row] < found_dist:
+                row_pot[row] += row_dist[row] - found_dist
+        for col in settled_cols:
+            if col_dist[col] < found_dist:
+                col_pot[col] += col_dist[col] - found_dist
+
+        # Flip the augmenting path
+        col = found
+        while True:
+            row = came_from[col]
+            previous = row_match[row]
+            row_match[row] = col
+            col_match[col] = row
+            if row == root:
+                break
+            col = previous
+
+    return row_match
+
+
+def _pair_bracket(
+    members: List[int],
+    played: Set[Tuple[int, int]],
+    window: int,
+    allow_rematch: bool
+) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Pair a score bracket (even size) top half against bottom half.
+
+    Returns:
+        (pairings, players left unpaired because only rematches remained)
+    """
+    half = len(members) // 2
+    top, bottom = members[:half], members[half:]
+    penalty = half * half + 1
+
+    def is_rematch(i: int, j: int) -> bool:
+        return pair_key(top[i], bottom[j]) in played
+
+    def cost(i: int, j: int) -> int:
+        distance = i - j if i > j else j - i
+        return distance + penalty if is_rematch(i, j) else distance
+
+    def near(i: int) -> List[int]:
+        return [j for j in range(max(0, i - window), min(half, i + window + 1))
+                if not is_rematch(i, j)]
+
+    initial = [i if not is_rematch(i, i) else -1 for i in range(half)]
+    assignment = min_cost_assignment(half, cost, near, initial)
+    if assignment is None:
+        # Some player has no legal opponent nearby: solve over the whole bracket
+        assignment = min_cost_assignment(half, cost, lambda i: range(half), initial)
+
+    pairings = []
+    unpaired = []
+    for i, j in enumerate(assignment):
+        if is_rematch(i, j) and not allow_rematch:
+            unpaired.extend((top[i], bottom[j]))
+        else:
+            pairings.append((top[i], bottom[j]))
+    return pairings, unpaired
+
+
+def _repair_rematches(
+    pairings: List[Tuple[int, int]],
+    points: Dict[int, int],
+    played: Set[Tuple[int, int]]
+):
+    """
+    Swap opponents between a rematch and another pairing, in place.
+
+    Brackets only pair top half against bottom half and only float
+    downward, so the bottom bracket can be left with rematches that a swap
+    with a pairing higher up removes. The swap that keeps opponents'
+    points closest is used.
+    """
+    def spread(player1: int, player2: int) -> int:
+        return abs(points[player1] - points[player2])
+
+    for index in range(len(pairings) - 1, -1, -1):
+        first, second = pairings[index]
+        if pair_key(first, second) not in played:
+            continue
+        best = None
+        for other_index in range(len(pairings) - 1, -1, -1):
+            third, fourth = pairings[other_index]
+            if other_index == index:
+                continue
+            for swapped in (((first, third), (second, fourth)), ((first, fourth), (second, third))):
+                if any(pair_key(*pair) in played for pair in swapped):
+                    continue
+                score = sum(spread(*pair) for pair in swapped)
+                if best is None or score < best[0]:
+                    best = (score, other_index, swapped)
+        if best is not None:
+            _, other_index, swapped = best
+            pairings[index], pairings[other_index] = swapped
+
+
+def pair_swiss(
+    ranked: Sequence[int],
+    points: Dict[int, int],
+    played: Set[Tuple[int, int]],
+    byes: Optional[Dict[int, int]] = None,
+    window: int = DEFAULT_WINDOW
+) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """
+    Pair one Swiss round.
+
+    Args:
+        ranked: Active player ids in standings order, best first
+        points: Match points by player id
+        played: Pairings already played, as pair_key tuples
+        byes: Byes already received by player id
+        window: Opponents tried around each player's ideal opponent before
+            searching the whole score group
+
+    Returns:
+        (pairings, player receiving the bye or None)
+    """
+    ranked = list(ranked)
+    byes = byes or {}
+    bye = None
+    if len(ranked) % 2:
+        bye = choose_bye(ranked, points, byes)
+        ranked.remove(bye)
+
+    rank = {player: index for index, player in enumerate(ranked)}
+    groups: List[List[int]] = []
+    for player in ranked:
+        if groups and points[groups[-1][0]] == points[player]:
+            groups[-1].append(player)
+        else:
+            groups.append([player])
+
+    pairings: List[Tuple[int, int]] = []
+    floaters: List[int] = []
+    for index, group in enumerate(groups):
+        members = floaters + group
+        floaters = []
+        last = index == len(groups) - 1
+        if len(members) % 2:
+            floaters.append(members.pop())
+        pairs, unpaired = _pair_bracket(members, played, window, allow_rematch=last)
+        pairings.extend(pairs)
+        if unpaired:
+            floaters = sorted(unpaired + floaters, key=rank.__getitem__)
+
+    _repair_rematches(pairings, points, played)
+    rematches = sum(1 for pair in pairings if pair_key(*pair) in played)
+    if rematches:
+        logger.warning(f"Swiss pairing needed {rematches} rematch(es)")
+    return pairings, bye
@@ -161,9 +161,12 @@ class TargetingSystem:
                     legal_targets.append(player)
         
         elif requirement.target_type in [TargetType.CREATURE, TargetType.PERMANENT]:
-            # Permanents on battlefield
+            # Permanents on battlefield (creature targets only scan the creature view)
             for player in self.game_engine.players:
-                for card in player.battlefield:
+                candidates = (player.battlefield.creatures()
+                              if requirement.target_type == TargetType.CREATURE
+                              else player.battlefield)
+                for card in candidates:
                     if self._is_valid_target(card, requirement, controller):
                         legal_targets.append(card)
         
@@ -4,10 +4,11 @@ Tournament system for organizing and running MTG tournaments.
 Supports:
 - Single elimination
 - Double elimination
-- Swiss rounds
+- Swiss rounds (minimum-cost pairings, see swiss_pairing.py)
 - Round robin
 - Leaderboard tracking
 - Match history
+- Tiebreakers (OMW%, GW%) kept up to date as results are reported
 
 Classes:
     TournamentFormat: Tournament format types
@@ -30,12 +31,14 @@ Usage:
 import logging
 import random
 from enum import Enum, auto
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from collections import defaultdict
 import json
 
+from app.game.swiss_pairing import pair_key, pair_swiss
+
 logger = logging.getLogger(__name__)
 
 
@@ -135,6 +138,7 @@ class PlayerRecord:
     # Tiebreakers
     opponent_match_win_percentage: float = 0.0
     game_win_percentage: float = 0.0
+    byes: int = 0
     
     # Metadata
     is_active: bool = True
@@ -160,8 +164,10 @@ class PlayerRecord:
         self.games_won += games_won
         self.games_lost += games_lost
         
-        if result == MatchResult.WIN:
+        if result in (MatchResult.WIN, MatchResult.BYE):
             self.wins += 1
+            if result == MatchResult.BYE:
+                self.byes += 1
         elif result == MatchResult.LOSS:
             self.losses += 1
         elif result == MatchResult.DRAW:
@@ -177,6 +183,24 @@ class PlayerRecord:
                 f"({self.match_points} points)")
 
 
+def _bracket_seeds(size: int) -> List[int]:
+    """
+    Get seed indices in bracket order, so that in a full bracket the top
+    seeds can only meet in the latest rounds (1v8, 4v5, 2v7, 3v6 for 8).
+    
+    Args:
+        size: Number of players
+        
+    Returns:
+        Seed indices (0 = top seed), padded to the next power of two
+    """
+    seeds = [0]
+    while len(seeds) < size:
+        count = len(seeds) * 2
+        seeds = [s for seed in seeds for s in (seed, count - 1 - seed)]
+    return seeds
+
+
 class Tournament:
     """
     Main tournament manager.
@@ -187,13 +211,25 @@ class Tournament:
         name: str,
         tournament_format: TournamentFormat = TournamentFormat.SWISS,
         num_rounds: int = 3,
-        best_of: int = 3
+        best_of: int = 3,
+        seeded: bool = False
     ):
-        """Initialize tournament."""
+        """
+        Initialize tournament.
+        
+        Args:
+            name: Tournament name
+            tournament_format: Format
+            num_rounds: Number of rounds
+            best_of: Games per match
+            seeded: For elimination, players are seeded in the order they were
+                added (first seed meets last) instead of shuffled
+        """
         self.name = name
         self.format = tournament_format
         self.num_rounds = num_rounds
         self.best_of = best_of  # Best of X games per match
+        self.seeded = seeded
         
         # Players
         self.players: Dict[int, PlayerRecord] = {}
@@ -208,6 +244,17 @@ class Tournament:
         # Pairings history (for Swiss)
         self.pairing_history: Set[Tuple[int, int]] = set()
         
+        # Bracket order (for elimination); adjacent survivors meet. Until the
+        # first round is paired, None marks a bye slot
+        self.bracket: List[Optional[int]] = []
+        # Players from top seed down (for elimination)
+        self.seeds: List[int] = []
+        
+        # Distinct reported opponents (a rematch counts once) and the sum of
+        # their match win percentages, so tiebreakers can be updated incrementally
+        self.opponents: Dict[int, Set[int]] = defaultdict(set)
+        self._opponent_mwp_sum: Dict[int, float] = defaultdict(float)
+        
         logger.info(f"Tournament '{name}' created: {tournament_format.name}, {num_rounds} rounds")
     
     def add_player(self, name: str, deck: Any) -> int:
@@ -290,7 +337,7 @@ class Tournament:
             return self._random_pairings(active_players)
     
     def _swiss_pairings(self, players: List[int]) -> List[Tuple[int, int]]:
-        """Generate Swiss pairings."""
+        """Generate Swiss pairings (minimum-cost matching per score group)."""
         # Sort by points, then tiebreakers
         sorted_players = sorted(
             players,
@@ -301,36 +348,17 @@ class Tournament:
             )
         )
         
-        pairings = []
-        paired = set()
-        
-        for i, player1 in enumerate(sorted_players):
-            if player1 in paired:
-                continue
-            
-            # Find best available opponent
-            for j in range(i + 1, len(sorted_players)):
-                player2 = sorted_players[j]
-                
-                if player2 in paired:
-                    continue
-                
-                # Check if they've played before
-                pairing = tuple(sorted([player1, player2]))
-                if pairing in self.pairing_history:
-                    continue
-                
-                # Pair them
-                pairings.append((player1, player2))
-                paired.add(player1)
-                paired.add(player2)
-                self.pairing_history.add(pairing)
-                break
-            
-            # If no opponent found, give bye
-            if player1 not in paired:
-                self._give_bye(player1)
-                paired.add(player1)
+        pairings, bye = pair_swiss(
+            sorted_players,
+            {p: self.players[p].match_points for p in sorted_players},
+            self.pairing_history,
+            {p: self.players[p].byes for p in sorted_players}
+        )
+        
+        for player1, player2 in pairings:
+            self.pairing_history.add(pair_key(player1, player2))
+        if bye is not None:
+            self._give_bye(bye)
         
         return pairings
     
@@ -352,17 +380,35 @@ class Tournament:
     
     def _elimination_pairings(self, players: List[int]) -> List[Tuple[int, int]]:
         """Generate elimination bracket pairings."""
-        # Shuffle for initial bracket
-        if self.current_round == 1:
-            random.shuffle(players)
-        
         pairings = []
-        for i in range(0, len(players) - 1, 2):
-            pairings.append((players[i], players[i + 1]))
+        # Build the bracket in the first round: the slots padding the field to
+        # a power of two face the top seeds, who get first-round byes
+        if not self.bracket:
+            if not self.seeded:
+                random.shuffle(players)
+            self.seeds = list(players)
+            self.bracket = [players[seed] if seed < len(players) else None
+                            for seed in _bracket_seeds(len(players))]
+            for i in range(0, len(self.bracket), 2):
+                player1, player2 = self.bracket[i:i + 2]
+                if player2 is None:
+                    self._give_bye(player1)
+                else:
+                    pairings.append((player1, player2))
+            self.bracket = [pid for pid in self.bracket if pid is not None]
+            return pairings
+        
+        active = set(players)
+        players = [pid for pid in self.bracket if pid in active]
         
-        # Handle odd number (bye to highest seed)
+        # Handle odd number after drops (bye to highest seed)
         if len(players) % 2 == 1:
-            self._give_bye(players[-1])
+            top_seed = min(players, key=self.seeds.index)
+            players.remove(top_seed)
+            self._give_bye(top_seed)
+        
+        for i in range(0, len(players) - 1, 2):
+            pairings.append((players[i], players[i + 1]))
         
         return pairings
     
@@ -380,8 +426,12 @@ class Tournament:
         return pairings
     
     def _give_bye(self, player_id: int):
-        """Give a player a bye."""
-        self.players[player_id].record_match(MatchResult.BYE)
+        """Give a player a bye (counts as a match win, 2-0 in games)."""
+        record = self.players[player_id]
+        old_mwp = record.match_win_percentage
+        record.record_match(MatchResult.BYE, self.best_of // 2 + 1, 0)
+        self._propagate_mwp_change(player_id, old_mwp)
+        self._refresh_tiebreakers(player_id)
         logger.info(f"{self.players[player_id].player_name} received a bye")
     
     def _create_match(self, player1_id: int, player2_id: int) -> Match:
@@ -407,6 +457,8 @@ class Tournament:
         # Update player records
         player1 = self.players[match.player1_id]
         player2 = self.players[match.player2_id]
+        old_mwp1 = player1.match_win_percentage
+        old_mwp2 = player2.match_win_percentage
         
         if is_draw:
             player1.record_match(MatchResult.DRAW, match.games_won[0], match.games_won[1])
@@ -418,8 +470,60 @@ class Tournament:
             player1.record_match(MatchResult.LOSS, match.games_won[0], match.games_won[1])
             player2.record_match(MatchResult.WIN, match.games_won[1], match.games_won[0])
         
+        self._update_tiebreakers(match.player1_id, match.player2_id, old_mwp1, old_mwp2)
+        
+        # Losers are out of single elimination
+        if self.format == TournamentFormat.SINGLE_ELIMINATION and not is_draw:
+            loser = match.player2_id if winner == match.player1_id else match.player1_id
+            self.players[loser].drop(match.round_number)
+        
         logger.info(f"Match reported: {match}")
     
+    def _update_tiebreakers(self, player1_id: int, player2_id: int, old_mwp1: float, old_mwp2: float):
+        """
+        Update tiebreakers after a reported match.
+        
+        Only the two players and their opponents are touched: the players'
+        new match win percentages are pushed into their opponents' sums,
+        then the two are linked as opponents unless they already were.
+        
+        Args:
+            player1_id: First player
+            player2_id: Second player
+            old_mwp1: First player's match win percentage before the match
+            old_mwp2: Second player's match win percentage before the match
+        """
+        self._propagate_mwp_change(player1_id, old_mwp1)
+        self._propagate_mwp_change(player2_id, old_mwp2)
+        
+        if player2_id not in self.opponents[player1_id]:
+            self.opponents[player1_id].add(player2_id)
+            self.opponents[player2_id].add(player1_id)
+            self._opponent_mwp_sum[player1_id] += self.players[player2_id].match_win_percentage
+            self._opponent_mwp_sum[player2_id] += self.players[player1_id].match_win_percentage
+        
+        self._refresh_tiebreakers(player1_id)
+        self._refresh_tiebreakers(player2_id)
+    
+    def _propagate_mwp_change(self, player_id: int, old_mwp: float):
+        """Push a change in a player's match win percentage to their opponents."""
+        delta = self.players[player_id].match_win_percentage - old_mwp
+        if not delta:
+            return
+        for opponent_id in self.opponents.get(player_id, ()):
+            self._opponent_mwp_sum[opponent_id] += delta
+            self._refresh_tiebreakers(opponent_id)
+    
+    def _refresh_tiebreakers(self, player_id: int):
+        """Recompute a player's OMW% and GW% from the running sums."""
+        record = self.players[player_id]
+        opponents = self.opponents.get(player_id)
+        if opponents:
+            record.opponent_match_win_percentage = self._opponent_mwp_sum[player_id] / len(opponents)
+        total_games = record.games_won + record.games_lost
+        if total_games > 0:
+            record.game_win_percentage = record.games_won / total_games
+    
     def get_standings(self) -> List[PlayerRecord]:
         """Get current standings."""
         standings = sorted(
@@ -436,9 +540,6 @@ class Tournament:
         """Finish the tournament."""
         self.is_finished = True
         
-        # Calculate final tiebreakers
-        self._calculate_tiebreakers()
-        
         standings = self.get_standings()
         
         logger.info(f"Tournament '{self.name}' finished!")
@@ -447,30 +548,14 @@ class Tournament:
             logger.info(f"{i}. {player}")
     
     def _calculate_tiebreakers(self):
-        """Calculate tiebreaker percentages."""
-        # Opponent match win percentage
-        for player_id, record in self.players.items():
-            opponent_ids = set()
-            
-            # Find all opponents
-            for match in self.matches:
-                if match.player1_id == player_id:
-                    opponent_ids.add(match.player2_id)
-                elif match.player2_id == player_id:
-                    opponent_ids.add(match.player1_id)
-            
-            # Calculate their average match win percentage
-            if opponent_ids:
-                omw = sum(
-                    self.players[oid].match_win_percentage
-                    for oid in opponent_ids
-                ) / len(opponent_ids)
-                record.opponent_match_win_percentage = omw
-            
-            # Game win percentage
-            total_games = record.games_won + record.games_lost
-            if total_games > 0:
-                record.game_win_percentage = record.games_won / total_games
+        """Recalculate all tiebreakers from the reported opponents."""
+        self._opponent_mwp_sum.clear()
+        for player_id, opponent_ids in self.opponents.items():
+            self._opponent_mwp_sum[player_id] = sum(
+                self.players[oid].match_win_percentage for oid in opponent_ids
+            )
+        for player_id in self.players:
+            self._refresh_tiebreakers(player_id)
     
     def get_summary(self) -> str:
         """Get tournament summary."""
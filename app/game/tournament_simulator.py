@@ -0,0 +1,672 @@
+"""
+Simulated tournament mode.
+
+Plays every match of a Tournament automatically: each Match is a best-of-N
+series of headless GameEngine games between two EnhancedAI players, and the
+matches of a round run concurrently in a process pool. Results are fed back
+through Tournament.report_match, so pairings, standings and tiebreakers work
+exactly as for a hand-run event. A Swiss event can be followed by a seeded
+single-elimination top cut.
+
+Decks are described by picklable DeckSpecs (card definitions plus the AI
+strategy that pilots them). Decks from AIDeckManager are loaded through the
+card database when one is given and have a deck file; otherwise a 60-card
+deck with the archetype's creature curve in the deck's colors is generated.
+
+Classes:
+    DeckSpec: A deck and the AI that plays it
+    MatchTask: One match to simulate
+    MatchOutcome: Result of a simulated match
+    HeadlessGame: Plays one game between two AIs
+    TournamentSimulator: Plays a Tournament's rounds in a worker pool
+
+Functions:
+    deck_spec_from_metadata: Build a DeckSpec from AIDeckManager metadata
+    play_game: Play one game
+    play_match: Play a best-of-N match
+    run_simulated_event: Run a Swiss event plus top cut unattended
+
+Usage:
+    manager = AIDeckManager()
+    decks = [deck_spec_from_metadata(d) for d in manager.search_by_archetype(DeckArchetype.ANY)]
+    results = run_simulated_event(decks, rounds=5, top_cut=8)
+    print(results['champion'])
+"""
+
+import logging
+import math
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.game.enhanced_ai import AIDifficulty, AIStrategy, EnhancedAI
+from app.game.game_engine import Card, GameEngine, GamePhase, GameStep
+from app.game.tournament import Match, PlayerRecord, Tournament, TournamentFormat
+
+logger = logging.getLogger(__name__)
+
+# Games still running after this many turns are draws
+DEFAULT_MAX_TURNS = 40
+
+# Cap on spells cast per main phase (guards against AI loops)
+MAX_ACTIONS_PER_PHASE = 20
+
+BASIC_LANDS = {'W': "Plains", 'U': "Island", 'B': "Swamp", 'R': "Mountain", 'G': "Forest"}
+COLOR_NAMES = {'W': "White", 'U': "Blue", 'B': "Black", 'R': "Red", 'G': "Green"}
+
+# Archetype name keywords -> AI strategy
+ARCHETYPE_STRATEGIES = (
+    (('AGGRO', 'RED_DECK_WINS', 'WHITE_WEENIE', 'SLIGH', 'BURN', 'GOBLINS', 'VOLTRON'), AIStrategy.AGGRO),
+    (('CONTROL', 'PRISON', 'MILL'), AIStrategy.CONTROL),
+    (('TEMPO', 'DELVER', 'MERFOLK'), AIStrategy.TEMPO),
+    (('COMBO', 'STORM', 'REANIMATOR'), AIStrategy.COMBO),
+)
+
+# Generated decks: (lands, [(mana value, power, toughness, oracle text, copies)])
+STRATEGY_CURVES = {
+    AIStrategy.AGGRO: (22, [
+        (1, 2, 1, "", 10), (2, 3, 2, "", 12), (3, 3, 3, "Haste", 10), (4, 4, 3, "", 6),
+    ]),
+    AIStrategy.TEMPO: (23, [
+        (1, 1, 2, "Flying", 8), (2, 2, 3, "", 12), (3, 3, 3, "Flying", 10), (4, 4, 4, "", 7),
+    ]),
+    AIStrategy.MIDRANGE: (24, [
+        (2, 2, 2, "", 8), (3, 3, 3, "", 10), (4, 4, 4, "", 10), (5, 5, 5, "Trample", 8),
+    ]),
+    AIStrategy.CONTROL: (26, [
+        (2, 0, 4, "Defender", 8), (4, 3, 5, "", 8), (5, 5, 5, "Flying", 10), (6, 6, 6, "Trample", 8),
+    ]),
+}
+
+
+def strategy_for_archetype(archetype: Any) -> AIStrategy:
+    """
+    Pick the AI strategy that pilots a deck archetype.
+
+    Args:
+        archetype: DeckArchetype (or its name)
+
+    Returns:
+        AIStrategy (MIDRANGE when nothing more specific fits)
+    """
+    name = getattr(archetype, 'name', str(archetype)).upper()
+    for keywords, strategy in ARCHETYPE_STRATEGIES:
+        if any(keyword in name for keyword in keywords):
+            return strategy
+    return AIStrategy.MIDRANGE
+
+
+@dataclass
+class DeckSpec:
+    """A deck (as plain card definitions) and the AI that plays it."""
+    name: str
+    cards: List[Dict[str, Any]]
+    strategy: AIStrategy = AIStrategy.MIDRANGE
+    difficulty: AIDifficulty = AIDifficulty.MEDIUM
+
+    def build(self) -> List[Card]:
+        """Create fresh game cards for one game."""
+        return [
+            Card(
+                name=card['name'],
+                types=list(card.get('types', [])),
+                mana_cost=card.get('mana_cost', ''),
+                power=card.get('power'),
+                toughness=card.get('toughness'),
+                oracle_text=card.get('oracle_text', ''),
+                colors=list(card.get('colors', [])),
+            )
+            for card in self.cards
+        ]
+
+    @classmethod
+    def generate(cls, name: str, colors: Sequence[str], strategy: AIStrategy,
+                 difficulty: AIDifficulty = AIDifficulty.MEDIUM) -> 'DeckSpec':
+        """
+        Generate a 60-card deck with a strategy's creature curve.
+
+        Args:
+            name: Deck name
+            colors: Color letters (W/U/B/R/G); lands and costs are split among them
+            strategy: AI strategy, which also picks the curve
+            difficulty: AI difficulty
+
+        Returns:
+            DeckSpec
+        """
+        colors = [c for c in colors if c in BASIC_LANDS] or ['G']
+        land_count, curve = STRATEGY_CURVES.get(strategy, STRATEGY_CURVES[AIStrategy.MIDRANGE])
+
+        cards = [
+            {'name': BASIC_LANDS[colors[i % len(colors)]], 'types': ["Land"]}
+            for i in range(land_count)
+        ]
+        for index, (mana_value, power, toughness, text, copies) in enumerate(curve):
+            color = colors[index % len(colors)]
+            card = {
+                'name': f"{COLOR_NAMES[color]} {power}/{toughness}"
+                        + (f" {text}" if text else ""),
+                'types': ["Creature"],
+                'mana_cost': (f"{{{mana_value - 1}}}" if mana_value > 1 else "") + f"{{{color}}}",
+                'power': power,
+                'toughness': toughness,
+                'oracle_text': text,
+                'colors': [color],
+            }
+            cards.extend(dict(card) for _ in range(copies))
+
+        return cls(name=name, cards=cards, strategy=strategy, difficulty=difficulty)
+
+
+def _game_card_definition(game_card: Any) -> Dict[str, Any]:
+    """Convert a deck converter GameCard into a card definition."""
+    def stat(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0 if value is not None else None
+
+    types = game_card.type_line.split('—')[0].split()
+    return {
+        'name': game_card.name,
+        'types': types,
+        'mana_cost': game_card.mana_cost or '',
+        'power': stat(game_card.power),
+        'toughness': stat(game_card.toughness),
+        'oracle_text': game_card.oracle_text or '',
+        'colors': list(game_card.colors or []),
+    }
+
+
+def deck_spec_from_metadata(metadata: Any, card_database: Any = None,
+                            difficulty: AIDifficulty = AIDifficulty.MEDIUM) -> DeckSpec:
+    """
+    Build a DeckSpec from AIDeckManager deck metadata.
+
+    Args:
+        metadata: DeckMetadata
+        card_database: Card database for loading deck files (optional)
+        difficulty: AI difficulty
+
+    Returns:
+        DeckSpec with the real decklist when it can be loaded, otherwise a
+        generated deck for the archetype and colors
+    """
+    strategy = strategy_for_archetype(metadata.archetype)
+
+    if card_database is not None and metadata.filepath:
+        from app.game.deck_converter import DeckConverter
+        game_deck = DeckConverter(card_database).convert_deck_from_file(metadata.filepath)
+        if game_deck and game_deck.cards:
+            return DeckSpec(
+                name=metadata.name,
+                cards=[_game_card_definition(card) for card in game_deck.cards],
+                strategy=strategy,
+                difficulty=difficulty
+            )
+        logger.warning(f"Could not load {metadata.name}, using a generated deck")
+
+    return DeckSpec.generate(metadata.name, metadata.colors, strategy, difficulty)
+
+
+class HeadlessGame:
+    """
+    Plays one game between two AI players without a UI.
+
+    The engine runs the turn structure and rules; the AIs choose land drops,
+    spells, attackers and blockers. The player in seat 0 goes first.
+    """
+
+    def __init__(self, decks: Sequence[DeckSpec], max_turns: int = DEFAULT_MAX_TURNS):
+        """
+        Set up the game.
+
+        Args:
+            decks: Deck for each seat (seat 0 plays first)
+            max_turns: Turn limit; the game is a draw when reached
+        """
+        self.max_turns = max_turns
+        self.engine = GameEngine(num_players=len(decks), log_enabled=False)
+        for deck in decks:
+            self.engine.add_player(deck.name, deck.build())
+        self.ais = [
+            EnhancedAI(seat, strategy=deck.strategy, difficulty=deck.difficulty)
+            for seat, deck in enumerate(decks)
+        ]
+
+    def play(self) -> Optional[int]:
+        """
+        Play the game to the end.
+
+        Returns:
+            Winning seat, or None for a draw
+        """
+        engine = self.engine
+        engine.start_game()
+        engine.active_player_index = engine.priority_player_index = 0
+        engine.begin_turn()
+
+        while not self._is_over() and engine.turn_number <= self.max_turns:
+            player_id = engine.active_player_index
+            self._main_phase(player_id, GamePhase.PRECOMBAT_MAIN)
+            if not self._is_over():
+                self._combat(player_id)
+            if not self._is_over():
+                self._main_phase(player_id, GamePhase.POSTCOMBAT_MAIN)
+            if not self._is_over():
+                # Cleanup ends the turn and begins the next one
+                engine.end_phase()
+
+        return self._winner()
+
+    def _is_over(self) -> bool:
+        """Check whether at most one player is still in the game."""
+        return sum(not player.lost_game for player in self.engine.players) <= 1
+
+    def _winner(self) -> Optional[int]:
+        """Get the winning seat once the game is over."""
+        remaining = [player.player_id for player in self.engine.players if not player.lost_game]
+        return remaining[0] if len(remaining) == 1 else None
+
+    def _main_phase(self, player_id: int, phase: GamePhase):
+        """Play a land, then cast what the AI chooses until it passes."""
+        engine = self.engine
+        engine.current_phase = phase
+        engine.main_phase()
+        player = engine.players[player_id]
+        ai = self.ais[player_id]
+
+        if engine.legal_actions.can_play_land(player_id):
+            land = self._choose_land(player)
+            if land is not None:
+                engine.play_land(player, land)
+
+        for _ in range(MAX_ACTIONS_PER_PHASE):
+            decision = ai.make_decision(engine)
+            card = decision.action[0] if isinstance(decision.action, tuple) else decision.action
+            if decision.decision_type in ('attack', 'pass', 'hold_counter') or card not in player.hand:
+                break
+            if card.is_land():
+                if player.lands_played_this_turn or not engine.play_land(player, card):
+                    break
+            elif not self._cast(player_id, card):
+                break
+            ai.execute_decision(engine, decision)
+            if self._is_over():
+                break
+
+        engine.mana_manager.empty_all_pools()
+
+    def _choose_land(self, player) -> Optional[Card]:
+        """Pick the land that helps cast the most cards in hand."""
+        lands = [action.card for action in self.engine.legal_actions.playable_lands(player.player_id)]
+        if not lands:
+            return None
+        needed = {}
+        for card in player.hand:
+            for color in card.colors:
+                needed[color] = needed.get(color, 0) + 1
+        on_board = {}
+        for card in player.battlefield:
+            for color, land_name in BASIC_LANDS.items():
+                if card.name == land_name:
+                    on_board[color] = on_board.get(color, 0) + 1
+
+        def value(land):
+            return max((needed.get(color, 0) - on_board.get(color, 0)
+                        for color, name in BASIC_LANDS.items() if name == land.name), default=0)
+
+        return max(lands, key=value)
+
+    def _cast(self, player_id: int, card: Card) -> bool:
+        """Tap mana for a spell, cast it and let it resolve."""
+        engine = self.engine
+        action = next(
+            (a for a in engine.legal_actions.castable_spells(player_id) if a.card is card), None
+        )
+        if action is None:
+            return False
+
+        engine.legal_actions.tap_payment(player_id, action.payment)
+        if not engine.cast_spell(player_id, card):
+            return False
+        # Opponents pass priority: the spell resolves
+        engine.stack_manager.resolve_top()
+        return True
+
+    def _combat(self, player_id: int):
+        """Run combat with AI-chosen attackers and blockers."""
+        engine = self.engine
+        combat = engine.combat_manager
+        defender = (player_id + 1) % len(engine.players)
+
+        engine.current_phase = GamePhase.COMBAT
+        combat.start_combat()
+
+        engine.current_step = GameStep.DECLARE_ATTACKERS
+        attackers = [
+            creature for creature in self.ais[player_id].choose_attackers(engine)
+            if combat.declare_attacker(creature, defender)
+        ]
+
+        if attackers:
+            engine.current_step = GameStep.DECLARE_BLOCKERS
+            for blocker, attacker in self.ais[defender].choose_blockers(engine, attackers):
+                combat.declare_blocker(blocker, attacker)
+
+            engine.current_step = GameStep.COMBAT_DAMAGE
+            combat.assign_first_strike_damage()
+            engine.check_state_based_actions()
+            combat.assign_normal_damage()
+            engine.check_state_based_actions()
+
+        engine.current_step = GameStep.END_COMBAT
+        combat.end_combat()
+
+
+def play_game(first: DeckSpec, second: DeckSpec, seed: Optional[int] = None,
+              max_turns: int = DEFAULT_MAX_TURNS) -> Optional[int]:
+    """
+    Play one game.
+
+    The engine shuffles with the module-level random generator, so it is
+    seeded for the game and restored afterwards.
+
+    Args:
+        first: Deck on the play
+        second: Deck on the draw
+        seed: Random seed for shuffles
+        max_turns: Turn limit (draw when reached)
+
+    Returns:
+        0 if the first deck won, 1 if the second did, None for a draw
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return HeadlessGame([first, second], max_turns).play()
+    finally:
+        random.setstate(state)
+
+
+@dataclass
+class MatchTask:
+    """One match to simulate."""
+    match_id: str
+    decks: Tuple[DeckSpec, DeckSpec]
+    best_of: int = 3
+    seed: Optional[int] = None
+    max_turns: int = DEFAULT_MAX_TURNS
+
+
+@dataclass
+class MatchOutcome:
+    """Result of a simulated match (indices refer to MatchTask.decks)."""
+    match_id: str
+    games_won: Tuple[int, int]
+    games_drawn: int = 0
+    winner: Optional[int] = None
+    game_winners: List[Optional[int]] = field(default_factory=list)
+
+
+def play_match(task: MatchTask) -> MatchOutcome:
+    """
+    Play a best-of-N match.
+
+    The first game's starting player is random; afterwards the loser of
+    the previous game plays first. Drawn games don't count toward the
+    games needed, but the match ends after best_of games either way.
+
+    Args:
+        task: Match to play
+
+    Returns:
+        MatchOutcome
+    """
+    rng = random.Random(task.seed)
+    needed = task.best_of // 2 + 1
+    wins = [0, 0]
+    drawn = 0
+    game_winners: List[Optional[int]] = []
+    on_play = rng.randrange(2)
+
+    while max(wins) < needed and len(game_winners) < task.best_of:
+        order = (on_play, 1 - on_play)
+        result = play_game(task.decks[order[0]], task.decks[order[1]],
+                           seed=rng.getrandbits(32), max_turns=task.max_turns)
+        winner = None if result is None else order[result]
+        game_winners.append(winner)
+        if winner is None:
+            drawn += 1
+        else:
+            wins[winner] += 1
+            on_play = 1 - winner
+
+    match_winner = None
+    if wins[0] != wins[1]:
+        match_winner = 0 if wins[0] > wins[1] else 1
+
+    return MatchOutcome(
+        match_id=task.match_id,
+        games_won=(wins[0], wins[1]),
+        games_drawn=drawn,
+        winner=match_winner,
+        game_winners=game_winners
+    )
+
+
+class TournamentSimulator:
+    """
+    Plays a Tournament's matches with AI players.
+
+    Each round's matches are independent, so they are played concurrently
+    in a process pool (games are CPU-bound) and reported back in order.
+    """
+
+    def __init__(
+        self,
+        tournament: Tournament,
+        decks: Dict[int, DeckSpec],
+        max_workers: Optional[int] = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        seed: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize simulator.
+
+        Args:
+            tournament: Tournament whose matches are played
+            decks: DeckSpec for each tournament player id
+            max_workers: Worker processes (1 plays matches in this process;
+                None uses one per CPU)
+            max_turns: Turn limit per game
+            seed: Seed for reproducible events
+            executor: Existing executor to share (not shut down by close())
+        """
+        self.tournament = tournament
+        self.decks = decks
+        self.max_workers = max_workers
+        self.max_turns = max_turns
+        self.rng = random.Random(seed)
+        self._executor = executor
+        self._owns_executor = False
+        self.outcomes: Dict[str, MatchOutcome] = {}
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Get the worker pool, starting it on first use (None when playing inline)."""
+        if self._executor is None and self.max_workers != 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._owns_executor = True
+        return self._executor
+
+    def _map(self, func: Callable, tasks: List[Any]) -> Iterable:
+        """Run tasks in the worker pool (or inline with one worker)."""
+        executor = self._get_executor()
+        if executor is None:
+            return map(func, tasks)
+        return executor.map(func, tasks)
+
+    def pending_matches(self) -> List[Match]:
+        """Get matches that have been paired but not reported."""
+        return [match for match in self.tournament.matches if match.end_time is None]
+
+    def play_round(self) -> List[Match]:
+        """
+        Play and report every unreported match.
+
+        Returns:
+            The matches played
+        """
+        matches = self.pending_matches()
+        tasks = [
+            MatchTask(
+                match_id=match.match_id,
+                decks=(self.decks[match.player1_id], self.decks[match.player2_id]),
+                best_of=self.tournament.best_of,
+                seed=self.rng.getrandbits(32),
+                max_turns=self.max_turns
+            )
+            for match in matches
+        ]
+        elimination = self.tournament.format in (
+            TournamentFormat.SINGLE_ELIMINATION, TournamentFormat.DOUBLE_ELIMINATION
+        )
+
+        for match, outcome in zip(matches, self._map(play_match, tasks)):
+            self.outcomes[match.match_id] = outcome
+            match.games_won = {0: outcome.games_won[0], 1: outcome.games_won[1]}
+            winner = outcome.winner
+            if winner is None and elimination:
+                # Drawn elimination matches go to the higher seed
+                winner = 0 if match.player1_id < match.player2_id else 1
+            if winner is None:
+                self.tournament.report_match(match, None, is_draw=True)
+            else:
+                self.tournament.report_match(
+                    match, match.player1_id if winner == 0 else match.player2_id
+                )
+
+        logger.info(f"Simulated {len(matches)} matches")
+        return matches
+
+    def run(self) -> List[PlayerRecord]:
+        """
+        Play the tournament to the end.
+
+        Returns:
+            Final standings
+        """
+        if not self.tournament.is_started:
+            self.tournament.start()
+        while not self.tournament.is_finished:
+            self.play_round()
+            self.tournament.run_round()
+        return self.tournament.get_standings()
+
+    def run_top_cut(self, size: int = 8) -> Tournament:
+        """
+        Play a seeded single-elimination cut of the top players.
+
+        Args:
+            size: Players in the cut (rounded down to a power of two)
+
+        Returns:
+            The finished top cut Tournament (player ids are seeds, 0 = first)
+        """
+        standings = self.tournament.get_standings()
+        size = min(size, len(standings))
+        size = 1 << (size.bit_length() - 1) if size else 0
+
+        cut = Tournament(
+            f"{self.tournament.name} Top {size}",
+            TournamentFormat.SINGLE_ELIMINATION,
+            num_rounds=max(1, int(math.log2(size))) if size > 1 else 1,
+            best_of=self.tournament.best_of,
+            seeded=True
+        )
+        decks = {}
+        for record in standings[:size]:
+            decks[cut.add_player(record.player_name, record.deck)] = self.decks[record.player_id]
+
+        if size < 2:
+            return cut
+
+        simulator = TournamentSimulator(
+            cut, decks, max_workers=self.max_workers, max_turns=self.max_turns,
+            seed=self.rng.getrandbits(32), executor=self._get_executor()
+        )
+        simulator.run()
+        self.outcomes.update(simulator.outcomes)
+        return cut
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+        self._executor = None
+        self._owns_executor = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_simulated_event(
+    decks: Sequence[Any],
+    name: str = "Simulated Event",
+    rounds: Optional[int] = None,
+    best_of: int = 3,
+    top_cut: int = 8,
+    max_workers: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[int] = None,
+    card_database: Any = None
+) -> Dict[str, Any]:
+    """
+    Run a Swiss event plus top cut unattended.
+
+    Args:
+        decks: DeckSpecs or AIDeckManager DeckMetadata (one entrant each)
+        name: Event name
+        rounds: Swiss rounds (defaults to ceil(log2(players)))
+        best_of: Games per match
+        top_cut: Players in the single-elimination cut (0 for none)
+        max_workers: Worker processes (1 plays in this process)
+        max_turns: Turn limit per game
+        seed: Seed for reproducible events
+        card_database: Card database for loading deck files
+
+    Returns:
+        Dict with 'swiss' standings, the 'top_cut' Tournament (or None),
+        the 'champion' name and the 'tournament'
+    """
+    specs = [
+        deck if isinstance(deck, DeckSpec) else deck_spec_from_metadata(deck, card_database)
+        for deck in decks
+    ]
+    if rounds is None:
+        rounds = max(1, math.ceil(math.log2(max(2, len(specs)))))
+
+    tournament = Tournament(name, TournamentFormat.SWISS, num_rounds=rounds, best_of=best_of)
+    entrants = {}
+    for spec in specs:
+        entrants[tournament.add_player(spec.name, spec)] = spec
+
+    with TournamentSimulator(tournament, entrants, max_workers=max_workers,
+                             max_turns=max_turns, seed=seed) as simulator:
+        standings = simulator.run()
+        cut = simulator.run_top_cut(top_cut) if top_cut > 1 else None
+
+    champion = (cut.get_standings()[0] if cut and cut.players else standings[0]).player_name
+    logger.info(f"{name} champion: {champion}")
+
+    return {
+        'tournament': tournament,
+        'swiss': standings,
+        'top_cut': cut,
+        'champion': champion,
+    }
@@ -1,10 +1,16 @@
 """
 Triggered abilities system.
 Handles all types of triggered abilities in MTG.
+
+Triggers are kept in a TriggerRegistry indexed by event and by the
+subject they listen for (any object, only their source card, or only
+objects of one controller), so firing an event only looks at abilities
+that can possibly match and unregistering is O(1).
 """
 
+import itertools
 import logging
-from typing import Dict, List, Optional, Set, Callable, Any
+from typing import Dict, Iterator, List, Optional, Set, Callable, Any, Hashable
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -76,6 +82,7 @@ class TriggerCondition:
     power_condition: Optional[Callable[[int], bool]] = None  # e.g., lambda p: p >= 3
     toughness_condition: Optional[Callable[[int], bool]] = None
     custom_condition: Optional[Callable[[Any], bool]] = None
+    source_only: bool = False  # Only events whose 'card' is the source card
 
 
 @dataclass
@@ -107,6 +114,11 @@ class TriggeredAbility:
         if not self.condition:
             return True
         
+        # Check source ("when this creature ...")
+        if self.condition.source_only:
+            if event_data.get('card') is not self.source_card:
+                return False
+        
         # Check controller
         if self.condition.controller is not None:
             if event_data.get('controller') != self.condition.controller:
@@ -163,6 +175,233 @@ class TriggeredAbility:
             self.effect(event_data)
 
 
+@dataclass(eq=False)
+class TriggerRegistration:
+    """Bookkeeping for one registered trigger."""
+    ability: Any
+    event: Hashable
+    source: object
+    bucket: tuple
+    order: int
+    zone: Any = None
+
+
+class TriggerRegistry:
+    """
+    Trigger registry indexed by event and subject filter.
+    
+    Each ability is filed under one bucket for its event: abilities that
+    only care about their own source card are filed under that card,
+    abilities restricted to a controller under that controller, and the
+    rest under the event alone. Looking up the candidates for an event
+    only touches the buckets that event's data can match. Abilities are
+    keyed by identity, so unregistering one is O(1).
+    
+    Abilities can be any object; the registry does not evaluate their
+    conditions, it only narrows down which ones need to be evaluated.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._registrations: Dict[int, TriggerRegistration] = {}
+        self._buckets: Dict[tuple, Dict[int, TriggerRegistration]] = {}
+        self._by_source: Dict[int, Dict[int, TriggerRegistration]] = {}
+        self._order = itertools.count()
+    
+    def register(
+        self,
+        ability,
+        event: Hashable,
+        source=None,
+        controller: Optional[int] = None,
+        source_only: bool = False,
+        zone: Any = None
+    ) -> TriggerRegistration:
+        """
+        Register an ability for an event.
+        
+        Args:
+            ability: Ability object to return from lookups
+            event: Event key (e.g. a TriggerType)
+            source: Card the ability belongs to
+            controller: Only events with this 'controller' can match
+            source_only: Only events whose 'card' is the source can match
+            zone: Only match while the source card is in this zone
+            
+        Returns:
+            The TriggerRegistration for the ability
+        """
+        self.unregister(ability)
+        
+        if source_only and source is not None:
+            bucket = (event, 'source', id(source))
+        elif controller is not None:
+            bucket = (event, 'controller', controller)
+        else:
+            bucket = (event, None)
+        
+        registration = TriggerRegistration(
+            ability=ability,
+            event=event,
+            source=source,
+            bucket=bucket,
+            order=next(self._order),
+            zone=zone
+        )
+        key = id(ability)
+        self._registrations[key] = registration
+        self._buckets.setdefault(bucket, {})[key] = registration
+        if source is not None:
+            self._by_source.setdefault(id(source), {})[key] = registration
+        return registration
+    
+    def unregister(self, ability) -> bool:
+        """
+        Remove an ability.
+        
+        Args:
+            ability: Ability to remove
+            
+        Returns:
+            True if the ability was registered
+        """
+        key = id(ability)
+        registration = self._registrations.pop(key, None)
+        if registration is None:
+            return False
+        
+        self._discard(self._buckets, registration.bucket, key)
+        if registration.source is not None:
+            self._discard(self._by_source, id(registration.source), key)
+        return True
+    
+    def unregister_source(self, source) -> List[Any]:
+        """
+        Remove every ability of a source card.
+        
+        Args:
+            source: Card whose abilities should be removed
+            
+        Returns:
+            List of removed abilities
+        """
+        registrations = self._by_source.pop(id(source), {})
+        for key, registration in registrations.items():
+            del self._registrations[key]
+            self._discard(self._buckets, registration.bucket, key)
+        return [registration.ability for registration in registrations.values()]
+    
+    def for_source(self, source) -> List[Any]:
+        """
+        Get the abilities of a source card in registration order.
+        
+        Args:
+            source: Card to look up
+            
+        Returns:
+            List of abilities
+        """
+        registrations = self._by_source.get(id(source))
+        if not registrations:
+            return []
+        return [registration.ability for registration in registrations.values()]
+    
+    def for_event(self, event: Hashable) -> List[Any]:
+        """
+        Get every ability registered for an event, in registration order.
+        
+        Args:
+            event: Event key
+            
+        Returns:
+            List of abilities
+        """
+        registrations = [
+            registration
+            for bucket, entries in self._buckets.items()
+            if bucket[0] == event
+            for registration in entries.values()
+        ]
+        registrations.sort(key=lambda registration: registration.order)
+        return [registration.ability for registration in registrations]
+    
+    def candidates(self, event: Hashable, event_data: Optional[Dict] = None) -> List[Any]:
+        """
+        Get the abilities that may trigger on an event.
+        
+        Only abilities whose bucket can match the event's 'card' and
+        'controller' (and whose source is in the required zone) are
+        returned, in registration order. Their own conditions still need
+        to be checked.
+        
+        Args:
+            event: Event key
+            event_data: Data about the event
+            
+        Returns:
+            List of candidate abilities
+        """
+        event_data = event_data or {}
+        buckets = [self._buckets.get((event, None))]
+        
+        subject = event_data.get('card')
+        if subject is not None:
+            buckets.append(self._buckets.get((event, 'source', id(subject))))
+        
+        controller = event_data.get('controller')
+        if controller is not None:
+            try:
+                buckets.append(self._buckets.get((event, 'controller', controller)))
+            except TypeError:
+                pass  # Unhashable controller can't match an index key
+        
+        buckets = [bucket for bucket in buckets if bucket]
+        if not buckets:
+            return []
+        
+        if len(buckets) == 1:
+            registrations = list(buckets[0].values())
+        else:
+            registrations = [
+                registration for bucket in buckets for registration in bucket.values()
+            ]
+            registrations.sort(key=lambda registration: registration.order)
+        
+        return [
+            registration.ability
+            for registration in registrations
+            if registration.zone is None
+            or getattr(registration.source, 'zone', None) == registration.zone
+        ]
+    
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over all abilities in registration order."""
+        for registration in list(self._registrations.values()):
+            yield registration.ability
+    
+    def __len__(self) -> int:
+        return len(self._registrations)
+    
+    def __contains__(self, ability) -> bool:
+        return id(ability) in self._registrations
+    
+    def clear(self):
+        """Remove all abilities."""
+        self._registrations.clear()
+        self._buckets.clear()
+        self._by_source.clear()
+    
+    @staticmethod
+    def _discard(index: Dict, index_key, key: int):
+        """Remove a registration from an index, dropping empty buckets."""
+        entries = index.get(index_key)
+        if entries is None:
+            return
+        entries.pop(key, None)
+        if not entries:
+            del index[index_key]
+
+
 class TriggerManager:
     """
     Manages all triggered abilities in the game.
@@ -176,12 +415,18 @@ class TriggerManager:
             game_engine: Reference to main GameEngine
         """
         self.game_engine = game_engine
-        self.triggers: Dict[TriggerType, List[TriggeredAbility]] = {
-            trigger_type: [] for trigger_type in TriggerType
-        }
+        self.registry = TriggerRegistry()
         self.pending_triggers: List[TriggeredAbility] = []
         logger.info("TriggerManager initialized")
     
+    @property
+    def triggers(self) -> Dict[TriggerType, List[TriggeredAbility]]:
+        """Registered abilities grouped by trigger type."""
+        return {
+            trigger_type: self.registry.for_event(trigger_type)
+            for trigger_type in TriggerType
+        }
+    
     def register_trigger(self, ability: TriggeredAbility):
         """
         Register a triggered ability.
@@ -189,7 +434,14 @@ class TriggerManager:
         Args:
             ability: TriggeredAbility to register
         """
-        self.triggers[ability.trigger_type].append(ability)
+        condition = ability.condition
+        self.registry.register(
+            ability,
+            ability.trigger_type,
+            source=ability.source_card,
+            controller=condition.controller if condition else None,
+            source_only=condition.source_only if condition else False
+        )
         logger.debug(f"Registered trigger: {ability.description}")
     
     def unregister_trigger(self, ability: TriggeredAbility):
@@ -199,8 +451,7 @@ class TriggerManager:
         Args:
             ability: TriggeredAbility to remove
         """
-        if ability in self.triggers[ability.trigger_type]:
-            self.triggers[ability.trigger_type].remove(ability)
+        if self.registry.unregister(ability):
             logger.debug(f"Unregistered trigger: {ability.description}")
     
     def fire_trigger(self, trigger_type: TriggerType, event_data: Dict):
@@ -211,9 +462,7 @@ class TriggerManager:
             trigger_type: Type of trigger to fire
             event_data: Data about the event
         """
-        triggered_abilities = self.triggers.get(trigger_type, [])
-        
-        for ability in triggered_abilities:
+        for ability in self.registry.candidates(trigger_type, event_data):
             if ability.check_condition(event_data):
                 self.pending_triggers.append(ability)
                 logger.info(f"Trigger queued: {ability.description}")
@@ -249,7 +498,11 @@ class TriggerManager:
     
     def create_etb_trigger(self, card, effect: Callable, description: str = "") -> TriggeredAbility:
         """
-        Create an enters-the-battlefield trigger.
+        Create a "when this enters" trigger.
+        
+        The trigger is source-only: it fires when `card` enters the
+        battlefield, not when other cards do. For "whenever a creature
+        enters" triggers, build a TriggeredAbility without source_only.
         
         Args:
             card: Card with the trigger
@@ -263,6 +516,7 @@ class TriggerManager:
             source_card=card,
             trigger_type=TriggerType.ENTERS_BATTLEFIELD,
             effect=effect,
+            condition=TriggerCondition(source_only=True),
             description=description or f"{card.name} enters the battlefield"
         )
     
@@ -273,7 +527,7 @@ class TriggerManager:
         description: str = ""
     ) -> TriggeredAbility:
         """
-        Create a combat damage trigger.
+        Create a trigger for combat damage dealt by `card` itself.
         
         Args:
             card: Card with the trigger
@@ -287,12 +541,14 @@ class TriggerManager:
             source_card=card,
             trigger_type=TriggerType.DEALS_COMBAT_DAMAGE,
             effect=effect,
+            condition=TriggerCondition(source_only=True),
             description=description or f"{card.name} deals combat damage"
         )
     
     def create_attack_trigger(self, card, effect: Callable, description: str = "") -> TriggeredAbility:
         """
-        Create an attack trigger.
+        Create a "whenever this attacks" trigger (source-only, like the
+        enters trigger).
         
         Args:
             card: Card with the trigger
@@ -306,12 +562,14 @@ class TriggerManager:
             source_card=card,
             trigger_type=TriggerType.ATTACKS,
             effect=effect,
+            condition=TriggerCondition(source_only=True),
             description=description or f"{card.name} attacks"
         )
     
     def create_dies_trigger(self, card, effect: Callable, description: str = "") -> TriggeredAbility:
         """
-        Create a dies trigger.
+        Create a "when this dies" trigger (source-only: other creatures
+        dying don't fire it).
         
         Args:
             card: Card with the trigger
@@ -325,6 +583,7 @@ class TriggerManager:
             source_card=card,
             trigger_type=TriggerType.DIES,
             effect=effect,
+            condition=TriggerCondition(source_only=True),
             description=description or f"{card.name} dies"
         )
     
@@ -365,10 +624,7 @@ class TriggerManager:
         Returns:
             List of TriggeredAbility objects
         """
-        all_triggers = []
-        for trigger_list in self.triggers.values():
-            all_triggers.extend([t for t in trigger_list if t.source_card == card])
-        return all_triggers
+        return self.registry.for_source(card)
     
     def clear_card_triggers(self, card):
         """
@@ -377,9 +633,5 @@ class TriggerManager:
         Args:
             card: Card whose triggers should be removed
         """
-        for trigger_type in TriggerType:
-            self.triggers[trigger_type] = [
-                t for t in self.triggers[trigger_type]
-                if t.source_card != card
-            ]
+        self.registry.unregister_source(card)
         logger.debug(f"Cleared triggers for {card.name}")
@@ -0,0 +1,471 @@
+"""
+Indexed card zones for the game engine.
+
+Zones (library, hand, battlefield, graveyard, exile, command) used to be plain
+lists, so drawing (`pop(0)`), membership checks and removals were all linear
+scans. CardZone keeps cards in an insertion-ordered, identity-keyed mapping so
+the common operations are O(1) while still behaving like the list the rest of
+the engine (and the tests) expect.
+
+Classes:
+    TrackedCard: Mixin that reports card attribute changes to the card's zone
+    CardZone: Ordered card container with O(1) draw/append/remove/contains
+    CombinedZoneView: Cached read-only view over several zones (e.g. all battlefields)
+
+Usage:
+    library = CardZone(Zone.LIBRARY, cards)
+    card = library.popleft()          # draw from the top
+    hand.append(card)                 # moves the card out of library bookkeeping
+    for creature in battlefield.creatures():
+        ...
+"""
+
+import logging
+import random
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def card_has_type(card, card_type: str) -> bool:
+    """
+    Check whether a card has a type.
+
+    Game cards carry a `types` list while some AI/test objects only carry a
+    `type_line` string, so both are checked.
+
+    Args:
+        card: Card-like object
+        card_type: Type name (e.g. "Creature", "Land", "Legendary")
+
+    Returns:
+        True if the card has the type
+    """
+    types_list = getattr(card, 'types', None)
+    if isinstance(types_list, (list, tuple)) and card_type in types_list:
+        return True
+    type_line = getattr(card, 'type_line', '') or ''
+    return isinstance(type_line, str) and card_type in type_line
+
+
+# Attributes whose change invalidates the cached per-type views
+TYPE_ATTRIBUTES = frozenset({'types', 'type_line'})
+
+
+class TrackedCard:
+    """
+    Mixin for cards that report their own attribute changes to their zone.
+
+    Every write to a public attribute of a card that sits in a CardZone is
+    forwarded to `CardZone.notify_change`, so zone listeners (the state-based
+    action checker, evaluators) can work from what changed instead of
+    rescanning. In-place mutations (e.g. `card.types.append(...)`) are not
+    seen; call `mark_changed()` after them.
+    """
+
+    TRACKS_CHANGES = True
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name[0] != '_':
+            container = self.__dict__.get('_zone_container')
+            if container is not None:
+                container.notify_change(self, name)
+
+    def mark_changed(self, attribute: Optional[str] = None):
+        """Report an in-place change to the card's zone."""
+        container = self.__dict__.get('_zone_container')
+        if container is not None:
+            container.notify_change(self, attribute)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_zone_container', None)
+        return state
+
+
+class CardZone(Sequence):
+    """
+    An ordered zone of cards with O(1) bookkeeping.
+
+    Cards are keyed by identity, so a card is in a zone at most once. Index 0
+    is the top of the zone (the top of the library is drawn with `popleft`).
+    Zones belonging to the same player share a location index, which lets the
+    engine find a card's current zone in O(1) and keeps a card from sitting in
+    two of that player's zones at once: adding a card to one zone removes it
+    from the other.
+
+    Iteration runs over a cached snapshot, so it is safe to move cards out of a
+    zone while iterating it (the same guarantee `zone[:]` gave for lists).
+    """
+
+    def __init__(self, zone: Any = None, cards: Optional[Iterable] = None,
+                 locations: Optional[Dict[int, 'CardZone']] = None):
+        """
+        Initialize a zone.
+
+        Args:
+            zone: Zone identifier assigned to `card.zone` on entry (e.g. Zone.HAND)
+            cards: Initial cards, top first
+            locations: Location index shared with the owner's other zones
+        """
+        self.zone = zone
+        self._cards: "OrderedDict[int, Any]" = OrderedDict()
+        self._locations = locations if locations is not None else {}
+        self._version = 0
+        self._snapshot: Optional[Tuple] = None
+        self._views: Dict[str, Tuple[int, Tuple]] = {}
+        self._listeners: List[Callable] = []
+        if cards:
+            self.extend(cards)
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every mutation (used for cache invalidation)."""
+        return self._version
+
+    @property
+    def cards(self) -> 'CardZone':
+        """The zone itself (compatibility with the old `get_zone(...).cards`)."""
+        return self
+
+    def _touch(self):
+        self._version += 1
+        self._snapshot = None
+
+    def _enter(self, card):
+        previous = self._locations.get(id(card))
+        if previous is not None and previous is not self:
+            previous._discard(card)
+        self._locations[id(card)] = self
+        if self.zone is not None:
+            try:
+                card.zone = self.zone
+            except AttributeError:
+                pass
+
+    def _entered(self, card):
+        self._touch()
+        if getattr(type(card), 'TRACKS_CHANGES', False):
+            object.__setattr__(card, '_zone_container', self)
+        self._emit('enter', card)
+
+    def _discard(self, card) -> bool:
+        if self._cards.pop(id(card), None) is None:
+            return False
+        self._leave(card)
+        return True
+
+    def _leave(self, card):
+        if self._locations.get(id(card)) is self:
+            del self._locations[id(card)]
+        if getattr(card, '__dict__', {}).get('_zone_container') is self:
+            object.__setattr__(card, '_zone_container', None)
+        self._touch()
+        self._emit('leave', card)
+
+    def _emit(self, event: str, card, attribute: Optional[str] = None):
+        for listener in self._listeners:
+            listener(event, self, card, attribute)
+
+    def _items(self) -> Tuple:
+        if self._snapshot is None:
+            self._snapshot = tuple(self._cards.values())
+        return self._snapshot
+
+    def zone_of(self, card) -> Optional['CardZone']:
+        """
+        Find which of the owner's zones holds a card.
+
+        Args:
+            card: Card to look up
+
+        Returns:
+            The CardZone holding the card, or None
+        """
+        return self._locations.get(id(card))
+
+    # ------------------------------------------------------------------
+    # Change notification
+    # ------------------------------------------------------------------
+
+    def add_listener(self, listener: Callable):
+        """
+        Subscribe to zone events.
+
+        The listener is called as `listener(event, zone, card, attribute)` where
+        event is 'enter', 'leave' or 'change'. 'change' is only reported for
+        cards that track their own attribute writes (see TrackedCard);
+        attribute names the field that was written, or None for changes
+        reported through `mark_changed`.
+
+        Args:
+            listener: Callable receiving zone events
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable):
+        """Unsubscribe from zone events."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def notify_change(self, card, attribute: Optional[str] = None):
+        """
+        Report that a card in this zone changed.
+
+        Args:
+            card: Card that changed
+            attribute: Name of the changed attribute, if known
+        """
+        if id(card) not in self._cards:
+            return
+        if attribute is None or attribute in TYPE_ATTRIBUTES:
+            self._views.clear()
+            self._touch()
+        self._emit('change', card, attribute)
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __bool__(self) -> bool:
+        return bool(self._cards)
+
+    def __contains__(self, card) -> bool:
+        return id(card) in self._cards
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items()[index])
+        if index == 0 and self._cards:
+            return next(iter(self._cards.values()))
+        if index == -1 and self._cards:
+            return next(reversed(self._cards.values()))
+        return self._items()[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CardZone, list, tuple)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        zone_name = getattr(self.zone, 'value', self.zone)
+        return f"CardZone({zone_name!r}, {len(self)} cards)"
+
+    def index(self, card, start: int = 0, stop: Optional[int] = None) -> int:
+        """Position of a card in the zone (0 = top)."""
+        if card not in self:
+            raise ValueError(f"{getattr(card, 'name', card)!r} is not in zone")
+        items = self._items()
+        for position in range(start, len(items) if stop is None else stop):
+            if items[position] is card:
+                return position
+        raise ValueError(f"{getattr(card, 'name', card)!r} is not in zone")
+
+    def count(self, card) -> int:
+        """Number of times a card is in the zone (0 or 1)."""
+        return 1 if card in self else 0
+
+    def copy(self) -> List:
+        """Plain list copy of the zone, top first."""
+        return list(self._items())
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def append(self, card):
+        """Put a card at the bottom/end of the zone."""
+        if id(card) in self._cards:
+            return
+        self._enter(card)
+        self._cards[id(card)] = card
+        self._entered(card)
+
+    add_card = append
+
+    def appendleft(self, card):
+        """Put a card on top of the zone (e.g. top of library)."""
+        self.append(card)
+        self._cards.move_to_end(id(card), last=False)
+        self._touch()
+
+    def extend(self, cards: Iterable):
+        """Append several cards in order."""
+        for card in cards:
+            self.append(card)
+
+    def insert(self, index: int, card):
+        """Insert a card at a position (0 = top)."""
+        if index <= 0 or not self._cards:
+            self.appendleft(card)
+            return
+        if index >= len(self._cards):
+            self.append(card)
+            return
+        items = [c for c in self._items() if c is not card]
+        items.insert(index, card)
+        self._enter(card)
+        self._cards = OrderedDict((id(c), c) for c in items)
+        self._entered(card)
+
+    def remove(self, card):
+        """
+        Remove a card from the zone.
+
+        Raises:
+            ValueError: If the card is not in the zone
+        """
+        if not self._discard(card):
+            raise ValueError(f"{getattr(card, 'name', card)!r} is not in zone")
+
+    remove_card = remove
+
+    def discard(self, card) -> bool:
+        """Remove a card if present. Returns True if it was removed."""
+        return self._discard(card)
+
+    def popleft(self):
+        """Remove and return the top card."""
+        if not self._cards:
+            raise IndexError("pop from empty zone")
+        _, card = self._cards.popitem(last=False)
+        self._leave(card)
+        return card
+
+    def pop(self, index: int = -1):
+        """Remove and return the card at a position (default: last)."""
+        if not self._cards:
+            raise IndexError("pop from empty zone")
+        if index == 0:
+            return self.popleft()
+        if index == -1 or index == len(self._cards) - 1:
+            _, card = self._cards.popitem(last=True)
+            self._leave(card)
+            return card
+        card = self._items()[index]
+        self._discard(card)
+        return card
+
+    def clear(self):
+        """Remove all cards."""
+        while self._cards:
+            self.pop()
+
+    def shuffle(self, rng: Optional[random.Random] = None):
+        """Randomize the order of the zone."""
+        items = list(self._items())
+        (rng or random).shuffle(items)
+        self._cards = OrderedDict((id(c), c) for c in items)
+        self._touch()
+
+    # ------------------------------------------------------------------
+    # Cached per-type views
+    # ------------------------------------------------------------------
+
+    def view(self, card_type: str) -> Tuple:
+        """
+        Cards in the zone with a given type.
+
+        The result is cached until the zone changes. Effects that change a
+        permanent's types without moving it must call `invalidate_views()`.
+
+        Args:
+            card_type: Type name (e.g. "Creature")
+
+        Returns:
+            Tuple of matching cards, in zone order
+        """
+        cached = self._views.get(card_type)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        cards = tuple(c for c in self._items() if card_has_type(c, card_type))
+        self._views[card_type] = (self._version, cards)
+        return cards
+
+    def creatures(self) -> Tuple:
+        """Creatures in the zone."""
+        return self.view("Creature")
+
+    def lands(self) -> Tuple:
+        """Lands in the zone."""
+        return self.view("Land")
+
+    def planeswalkers(self) -> Tuple:
+        """Planeswalkers in the zone."""
+        return self.view("Planeswalker")
+
+    def invalidate_views(self):
+        """Drop cached views (call after a card's types change in place)."""
+        self._views.clear()
+
+
+class CombinedZoneView:
+    """
+    Read-only view over several zones, e.g. every player's battlefield.
+
+    The concatenated card tuple is rebuilt only when one of the underlying
+    zones changes.
+    """
+
+    def __init__(self, zones_getter):
+        """
+        Initialize the view.
+
+        Args:
+            zones_getter: Callable returning the current list of CardZones
+        """
+        self._zones_getter = zones_getter
+        self._key: Optional[Tuple] = None
+        self._cards: Tuple = ()
+        self._views: Dict[str, Tuple[Tuple, Tuple]] = {}
+
+    def _current_key(self) -> Tuple:
+        return tuple((id(z), z.version) for z in self._zones_getter())
+
+    @property
+    def cards(self) -> Tuple:
+        """All cards across the zones."""
+        key = self._current_key()
+        if key != self._key:
+            self._cards = tuple(c for z in self._zones_getter() for c in z)
+            self._key = key
+        return self._cards
+
+    def view(self, card_type: str) -> Tuple:
+        """Cards of a given type across the zones."""
+        key = self._current_key()
+        cached = self._views.get(card_type)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        cards = tuple(c for z in self._zones_getter() for c in z.view(card_type))
+        self._views[card_type] = (key, cards)
+        return cards
+
+    def creatures(self) -> Tuple:
+        """Creatures across the zones."""
+        return self.view("Creature")
+
+    def __iter__(self) -> Iterator:
+        return iter(self.cards)
+
+    def __len__(self) -> int:
+        return sum(len(z) for z in self._zones_getter())
+
+    def __contains__(self, card) -> bool:
+        return any(card in z for z in self._zones_getter())
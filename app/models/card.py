@@ -51,6 +51,7 @@ class Card:
     text: Optional[str] = None
     oracle_text: Optional[str] = None
     flavor_text: Optional[str] = None
+    keywords: Optional[List[str]] = None
     
     # Stats
     power: Optional[str] = None
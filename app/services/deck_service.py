@@ -1,9 +1,18 @@
 """
 Deck management service.
+
+Deck statistics are sums over the deck's cards, so they are kept as running
+totals per deck in the deck_stats_cache table: add_card, remove_card and
+set_commander apply the changed card's contribution in the same transaction
+as the edit, and compute_deck_stats reads one row. A deck without cached
+totals (or after the card index is rebuilt) is totalled with one grouped
+SQL aggregate.
 """
 
+import json
 import logging
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from collections import Counter
 
@@ -12,6 +21,132 @@ from app.models import Deck, DeckCard, DeckStats
 
 logger = logging.getLogger(__name__)
 
+COMMANDER_DECK_SIZE = 100
+
+STATS_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS deck_stats_cache (
+        deck_id INTEGER PRIMARY KEY,
+        totals TEXT NOT NULL,
+        FOREIGN KEY (deck_id) REFERENCES decks(id) ON DELETE CASCADE
+    )
+"""
+
+# Stats type group of a card (first match wins; no group without a type line)
+TYPE_GROUP_SQL = """
+    CASE
+        WHEN c.type_line IS NULL OR c.type_line = '' THEN NULL
+        WHEN lower(c.type_line) LIKE '%land%' THEN 'lands'
+        WHEN lower(c.type_line) LIKE '%creature%' THEN 'creatures'
+        WHEN lower(c.type_line) LIKE '%instant%' THEN 'instants'
+        WHEN lower(c.type_line) LIKE '%sorcery%' THEN 'sorceries'
+        WHEN lower(c.type_line) LIKE '%artifact%' THEN 'artifacts'
+        WHEN lower(c.type_line) LIKE '%enchantment%' THEN 'enchantments'
+        WHEN lower(c.type_line) LIKE '%planeswalker%' THEN 'planeswalkers'
+        WHEN lower(c.type_line) LIKE '%battle%' THEN 'battles'
+        ELSE 'other'
+    END
+"""
+DECK_TOTALS_QUERY = f"""
+    SELECT dc.is_commander, {TYPE_GROUP_SQL} AS type_group,
+           CAST(c.mana_value AS INTEGER) AS mana_value, c.colors,
+           SUM(dc.quantity) AS quantity
+    FROM deck_cards dc
+    JOIN cards c ON dc.uuid = c.uuid
+    WHERE dc.deck_id = ?
+    GROUP BY dc.is_commander, type_group, CAST(c.mana_value AS INTEGER), c.colors
+"""
+DUPLICATES_QUERY = """
+    SELECT c.name, SUM(dc.quantity) AS quantity
+    FROM deck_cards dc
+    JOIN cards c ON dc.uuid = c.uuid
+    WHERE dc.deck_id = ? AND dc.is_commander = 0
+    GROUP BY c.name
+    HAVING SUM(dc.quantity) > 1
+"""
+CARD_TOTALS_QUERY = f"""
+    SELECT c.name, {TYPE_GROUP_SQL} AS type_group,
+           CAST(c.mana_value AS INTEGER) AS mana_value, c.colors
+    FROM cards c
+    WHERE c.uuid = ?
+"""
+NAME_COUNT_QUERY = """
+    SELECT SUM(dc.quantity) AS quantity
+    FROM deck_cards dc
+    JOIN cards c ON dc.uuid = c.uuid
+    WHERE dc.deck_id = ? AND dc.is_commander = 0 AND c.name = ?
+"""
+
+
+@dataclass
+class DeckTotals:
+    """
+    Running totals behind a deck's statistics.
+    
+    Everything but the commander-only total leaves commander cards out.
+    """
+    total_cards: int = 0
+    total_with_commander: int = 0
+    type_counts: Counter = field(default_factory=Counter)
+    mana_curve: Counter = field(default_factory=Counter)
+    color_counts: Counter = field(default_factory=Counter)
+    total_mana_value: float = 0.0
+    mana_value_count: int = 0
+    # Card names with more than one copy
+    duplicates: Dict[str, int] = field(default_factory=dict)
+    
+    def add(self, type_group: Optional[str], mana_value: Optional[int], colors: Optional[str],
+            quantity: int, is_commander: bool):
+        """
+        Add copies of a card (a negative quantity removes them).
+        
+        Args:
+            type_group: Stats type group (see TYPE_GROUP_SQL)
+            mana_value: Whole mana value, or None if unknown
+            colors: Colors as stored in the cards table ("W,U")
+            quantity: Copies to add
+            is_commander: Whether the copies are commanders
+        """
+        self.total_with_commander += quantity
+        if is_commander:
+            return
+        self.total_cards += quantity
+        if type_group:
+            self.type_counts[type_group] += quantity
+        if mana_value is not None:
+            self.mana_curve[mana_value] += quantity
+            self.total_mana_value += mana_value * quantity
+            self.mana_value_count += quantity
+        for color in colors.split(',') if colors else []:
+            self.color_counts[color] += quantity
+    
+    def to_json(self) -> str:
+        """Serialize for the cache table."""
+        return json.dumps({
+            'total_cards': self.total_cards,
+            'total_with_commander': self.total_with_commander,
+            'type_counts': self.type_counts,
+            'mana_curve': self.mana_curve,
+            'color_counts': self.color_counts,
+            'total_mana_value': self.total_mana_value,
+            'mana_value_count': self.mana_value_count,
+            'duplicates': self.duplicates
+        })
+    
+    @classmethod
+    def from_json(cls, text: str) -> 'DeckTotals':
+        """Deserialize from the cache table."""
+        data = json.loads(text)
+        return cls(
+            total_cards=data['total_cards'],
+            total_with_commander=data['total_with_commander'],
+            type_counts=Counter(data['type_counts']),
+            mana_curve=Counter({int(mana_value): count for mana_value, count in data['mana_curve'].items()}),
+            color_counts=Counter(data['color_counts']),
+            total_mana_value=data['total_mana_value'],
+            mana_value_count=data['mana_value_count'],
+            duplicates=data['duplicates']
+        )
+
 
 class DeckService:
     """
@@ -26,6 +161,8 @@ class DeckService:
             database: Database instance
         """
         self.db = database
+        with self.db.transaction():
+            self.db.execute(STATS_CACHE_SCHEMA)
     
     def create_deck(
         self,
@@ -200,8 +337,9 @@ class DeckService:
             True if successful
         """
         with self.db.transaction():
-            # Delete deck cards first
+            # Delete deck cards and cached stats first
             self.db.execute("DELETE FROM deck_cards WHERE deck_id = ?", (deck_id,))
+            self.db.execute("DELETE FROM deck_stats_cache WHERE deck_id = ?", (deck_id,))
             # Delete deck
             self.db.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
         
@@ -235,14 +373,12 @@ class DeckService:
             return False
 
         # Check if card already exists in deck
-        query = "SELECT quantity FROM deck_cards WHERE deck_id = ? AND uuid = ?"
-        cursor = self.db.execute(query, (deck_id, uuid))
-        row = cursor.fetchone()
+        before = self._deck_card_state(deck_id, uuid)
         
         with self.db.transaction():
-            if row:
+            if before:
                 # Update quantity
-                new_quantity = row['quantity'] + quantity
+                new_quantity = before[0] + quantity
                 update_query = """
                     UPDATE deck_cards SET quantity = ?, is_commander = ?
                     WHERE deck_id = ? AND uuid = ?
@@ -250,12 +386,15 @@ class DeckService:
                 self.db.execute(update_query, (new_quantity, int(is_commander), deck_id, uuid))
             else:
                 # Insert new card
+                new_quantity = quantity
                 insert_query = """
                     INSERT INTO deck_cards (deck_id, uuid, quantity, is_commander)
                     VALUES (?, ?, ?, ?)
                 """
                 self.db.execute(insert_query, (deck_id, uuid, quantity, int(is_commander)))
             
+            self._update_cached_totals(deck_id, uuid, before, (new_quantity, is_commander))
+            
             # Update modified date
             self.db.execute(
                 "UPDATE decks SET modified_date = ? WHERE id = ?",
@@ -284,22 +423,19 @@ class DeckService:
             logger.warning(f"Attempted to remove unknown card UUID {uuid} from deck {deck_id}")
             return False
 
+        before = self._deck_card_state(deck_id, uuid)
+        after = None
+        
         if quantity is None:
             # Remove completely
             query = "DELETE FROM deck_cards WHERE deck_id = ? AND uuid = ?"
             params = (deck_id, uuid)
         else:
             # Decrease quantity
-            cursor = self.db.execute(
-                "SELECT quantity FROM deck_cards WHERE deck_id = ? AND uuid = ?",
-                (deck_id, uuid)
-            )
-            row = cursor.fetchone()
-            
-            if not row:
+            if not before:
                 return False
             
-            new_quantity = row['quantity'] - quantity
+            new_quantity = before[0] - quantity
             
             if new_quantity <= 0:
                 query = "DELETE FROM deck_cards WHERE deck_id = ? AND uuid = ?"
@@ -307,6 +443,7 @@ class DeckService:
             else:
                 query = "UPDATE deck_cards SET quantity = ? WHERE deck_id = ? AND uuid = ?"
                 params = (new_quantity, deck_id, uuid)
+                after = (new_quantity, before[1])
         
         with self.db.transaction():
             self.db.execute(query, params)
@@ -314,6 +451,7 @@ class DeckService:
                 "UPDATE decks SET modified_date = ? WHERE id = ?",
                 (datetime.now().isoformat(), deck_id)
             )
+            self._update_cached_totals(deck_id, uuid, before, after)
         
         logger.info(f"Removed card {uuid} from deck {deck_id}")
         return True
@@ -330,8 +468,9 @@ class DeckService:
         Returns:
             True if successful
         """
-        field = "partner_commander_uuid" if is_partner else "commander_uuid"
-        query = f"UPDATE decks SET {field} = ? WHERE id = ?"
+        commander_field = "partner_commander_uuid" if is_partner else "commander_uuid"
+        query = f"UPDATE decks SET {commander_field} = ? WHERE id = ?"
+        before = self._deck_card_state(deck_id, uuid)
         
         with self.db.transaction():
             self.db.execute(query, (uuid, deck_id))
@@ -340,6 +479,8 @@ class DeckService:
                 "UPDATE deck_cards SET is_commander = 1 WHERE deck_id = ? AND uuid = ?",
                 (deck_id, uuid)
             )
+            if before:
+                self._update_cached_totals(deck_id, uuid, before, (before[0], True))
         
         logger.info(f"Set commander {uuid} for deck {deck_id}")
         return True
@@ -348,94 +489,29 @@ class DeckService:
         """
         Compute statistics for a deck.
         
+        Reads the deck's cached totals (totalling the deck once if there are
+        none), so this doesn't depend on the deck's size.
+        
         Args:
             deck_id: Deck ID
             
         Returns:
             DeckStats object
         """
-        deck = self.get_deck(deck_id)
-        if not deck:
+        cursor = self.db.execute("SELECT format, commander_uuid FROM decks WHERE id = ?", (deck_id,))
+        row = cursor.fetchone()
+        if not row:
             raise ValueError(f"Deck {deck_id} not found")
         
-        # Initialize counters
-        total_cards = 0
-        type_counts = Counter()
-        mana_curve = Counter()
-        color_count = Counter()
-        color_identity_set = set()
-        total_mana_value = 0.0
-        mana_value_count = 0
-        
-        for deck_card in deck.cards:
-            if deck_card.is_commander:
-                continue  # Don't count commander in deck stats
-
-            qty = deck_card.quantity
-            total_cards += qty
-
-            # Fallback: fetch latest card metadata from DB to ensure type_line/colors exist
-            cursor = self.db.execute(
-                "SELECT type_line, colors, mana_value FROM cards WHERE uuid = ?",
-                (deck_card.uuid,)
-            )
-            card_row = cursor.fetchone()
-
-            type_line_val = None
-            colors_val = None
-            mana_value_val = None
-            if card_row:
-                type_line_val = card_row['type_line']
-                colors_val = card_row['colors'].split(',') if card_row['colors'] else []
-                mana_value_val = card_row['mana_value']
-            
-            # Count by type (prefer deck_card value, else DB fallback)
-            type_line = (deck_card.type_line or type_line_val)
-            if type_line:
-                type_line = type_line.lower()
-                if 'land' in type_line:
-                    type_counts['lands'] += qty
-                elif 'creature' in type_line:
-                    type_counts['creatures'] += qty
-                elif 'instant' in type_line:
-                    type_counts['instants'] += qty
-                elif 'sorcery' in type_line:
-                    type_counts['sorceries'] += qty
-                elif 'artifact' in type_line:
-                    type_counts['artifacts'] += qty
-                elif 'enchantment' in type_line:
-                    type_counts['enchantments'] += qty
-                elif 'planeswalker' in type_line:
-                    type_counts['planeswalkers'] += qty
-                elif 'battle' in type_line:
-                    type_counts['battles'] += qty
-                else:
-                    type_counts['other'] += qty
-            
-            # Mana curve: prefer deck_card's mana_value, else fallback
-            mana_val = deck_card.mana_value if deck_card.mana_value is not None else mana_value_val
-            if mana_val is not None:
-                try:
-                    mv = int(mana_val)
-                except Exception:
-                    mv = None
-                mana_curve[mv] += qty
-                # Use mv (fallback validated int) for average mana calculation
-                if mv is not None:
-                    total_mana_value += mv * qty
-                mana_value_count += qty
-            
-            # Color distribution: prefer deck_card's colors else DB fallback
-            colors_to_use = deck_card.colors if deck_card.colors else colors_val
-            if colors_to_use:
-                for color in colors_to_use:
-                    color_count[color] += qty
-                    color_identity_set.add(color)
-        
-        avg_mana_value = total_mana_value / mana_value_count if mana_value_count > 0 else 0.0
+        totals = self.get_deck_totals(deck_id)
+        type_counts = totals.type_counts
+        violations = self._get_commander_violations(row['format'], row['commander_uuid'], totals)
+        avg_mana_value = (
+            totals.total_mana_value / totals.mana_value_count if totals.mana_value_count > 0 else 0.0
+        )
         
         return DeckStats(
-            total_cards=total_cards,
+            total_cards=totals.total_cards,
             total_lands=type_counts['lands'],
             total_creatures=type_counts['creatures'],
             total_instants=type_counts['instants'],
@@ -445,14 +521,106 @@ class DeckService:
             total_planeswalkers=type_counts['planeswalkers'],
             total_battles=type_counts['battles'],
             total_other=type_counts['other'],
-            mana_curve=dict(mana_curve),
-            color_distribution=dict(color_count),
-            color_identity=sorted(color_identity_set),
+            mana_curve={mana_value: count for mana_value, count in totals.mana_curve.items() if count},
+            color_distribution={color: count for color, count in totals.color_counts.items() if count},
+            color_identity=sorted(color for color, count in totals.color_counts.items() if count),
             average_mana_value=avg_mana_value,
-            is_commander_legal=self._check_commander_legality(deck),
-            commander_violations=self._get_commander_violations(deck)
+            is_commander_legal=not violations,
+            commander_violations=violations
+        )
+    
+    def get_deck_totals(self, deck_id: int) -> DeckTotals:
+        """
+        Get a deck's running totals, totalling and caching them if needed.
+        
+        Args:
+            deck_id: Deck ID
+            
+        Returns:
+            DeckTotals
+        """
+        totals = self._load_cached_totals(deck_id)
+        if totals is not None:
+            return totals
+        
+        totals = DeckTotals()
+        for row in self.db.execute(DECK_TOTALS_QUERY, (deck_id,)).fetchall():
+            totals.add(row['type_group'], row['mana_value'], row['colors'], row['quantity'],
+                       bool(row['is_commander']))
+        totals.duplicates = {
+            row['name']: row['quantity']
+            for row in self.db.execute(DUPLICATES_QUERY, (deck_id,)).fetchall()
+        }
+        with self.db.transaction():
+            self._save_cached_totals(deck_id, totals)
+        return totals
+    
+    def clear_stats_cache(self):
+        """Drop every deck's cached totals (e.g. after card data changed)."""
+        with self.db.transaction():
+            self.db.execute("DELETE FROM deck_stats_cache")
+    
+    def _load_cached_totals(self, deck_id: int) -> Optional[DeckTotals]:
+        """Cached totals of a deck, or None if there are none."""
+        cursor = self.db.execute("SELECT totals FROM deck_stats_cache WHERE deck_id = ?", (deck_id,))
+        row = cursor.fetchone()
+        return DeckTotals.from_json(row['totals']) if row else None
+    
+    def _save_cached_totals(self, deck_id: int, totals: DeckTotals):
+        """Store a deck's totals (call inside a transaction)."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO deck_stats_cache (deck_id, totals) VALUES (?, ?)",
+            (deck_id, totals.to_json())
         )
     
+    def _deck_card_state(self, deck_id: int, uuid: str) -> Optional[Tuple[int, bool]]:
+        """A card's (quantity, is_commander) in a deck, or None if it isn't in it."""
+        cursor = self.db.execute(
+            "SELECT quantity, is_commander FROM deck_cards WHERE deck_id = ? AND uuid = ?",
+            (deck_id, uuid)
+        )
+        row = cursor.fetchone()
+        return (row['quantity'], bool(row['is_commander'])) if row else None
+    
+    def _update_cached_totals(
+        self,
+        deck_id: int,
+        uuid: str,
+        before: Optional[Tuple[int, bool]],
+        after: Optional[Tuple[int, bool]]
+    ):
+        """
+        Apply one card's change to the deck's cached totals.
+        
+        Called inside the transaction making the change, after deck_cards
+        is updated. Decks without cached totals are left to be totalled
+        when next read.
+        
+        Args:
+            deck_id: Deck ID
+            uuid: Card UUID
+            before: The card's (quantity, is_commander) before the change
+            after: The card's (quantity, is_commander) after the change
+        """
+        totals = self._load_cached_totals(deck_id)
+        if totals is None or before == after:
+            return
+        card = self.db.execute(CARD_TOTALS_QUERY, (uuid,)).fetchone()
+        if not card:
+            return
+        
+        for state, sign in ((before, -1), (after, 1)):
+            if state:
+                totals.add(card['type_group'], card['mana_value'], card['colors'],
+                           sign * state[0], state[1])
+        
+        count = self.db.execute(NAME_COUNT_QUERY, (deck_id, card['name'])).fetchone()['quantity'] or 0
+        if count > 1:
+            totals.duplicates[card['name']] = count
+        else:
+            totals.duplicates.pop(card['name'], None)
+        self._save_cached_totals(deck_id, totals)
+    
     def _get_deck_cards(self, deck_id: int) -> List[DeckCard]:
         """Get all cards in a deck."""
         query = """
@@ -481,57 +649,28 @@ class DeckService:
         
         return cards
     
-    def _check_commander_legality(self, deck: Deck) -> bool:
-        """Check if deck follows Commander format rules."""
-        if deck.format != "Commander":
-            return True  # Not a commander deck
-        
-        # Basic checks
-        total = deck.total_with_commander()
-        
-        # Commander deck should have exactly 100 cards
-        if total != 100:
-            return False
-        
-        # Should have at least one commander
-        if not deck.commander_uuid:
-            return False
-        
-        # Check singleton rule (except basic lands)
-        card_counts = {}
-        for card in deck.cards:
-            if not card.is_commander:
-                card_counts[card.card_name] = card_counts.get(card.card_name, 0) + card.quantity
-        
-        # TODO: Exclude basic lands from singleton check
-        for name, count in card_counts.items():
-            if count > 1:
-                return False
-        
-        return True
-    
-    def _get_commander_violations(self, deck: Deck) -> List[str]:
+    def _get_commander_violations(
+        self,
+        deck_format: str,
+        commander_uuid: Optional[str],
+        totals: DeckTotals
+    ) -> List[str]:
         """Get list of commander format violations."""
         violations = []
         
-        if deck.format != "Commander":
+        if deck_format != "Commander":
             return violations
         
-        total = deck.total_with_commander()
-        if total != 100:
-            violations.append(f"Deck has {total} cards, should have exactly 100")
+        total = totals.total_with_commander
+        if total != COMMANDER_DECK_SIZE:
+            violations.append(f"Deck has {total} cards, should have exactly {COMMANDER_DECK_SIZE}")
         
-        if not deck.commander_uuid:
+        if not commander_uuid:
             violations.append("Deck has no commander")
         
         # Check singleton
-        card_counts = {}
-        for card in deck.cards:
-            if not card.is_commander:
-                card_counts[card.card_name] = card_counts.get(card.card_name, 0) + card.quantity
-        
-        for name, count in card_counts.items():
-            if count > 1:
-                violations.append(f"{name} appears {count} times (should be 1)")
+        # TODO: Exclude basic lands from singleton check
+        for name, count in sorted(totals.duplicates.items()):
+            violations.append(f"{name} appears {count} times (should be 1)")
         
         return violations
@@ -124,6 +124,7 @@ class IntegratedMainWindow(QMainWindow):
         from app.utils.shortcuts import ShortcutManager
         from app.utils.undo_redo import CommandHistory
         from app.utils.deck_validator import DeckValidator
+        from app.utils.legality_checker import LegalityIndex
         from app.utils.fun_features import (
             RandomCardGenerator, CardOfTheDay, 
             DeckWizard, ComboFinder
@@ -141,7 +142,8 @@ class IntegratedMainWindow(QMainWindow):
         self.theme_manager = ThemeManager(QApplication.instance())
         self.shortcut_manager = ShortcutManager(self)
         self.command_history = CommandHistory()
-        self.deck_validator = DeckValidator()
+        self.legality_index = LegalityIndex(self.db.db_path)
+        self.deck_validator = DeckValidator(legality_index=self.legality_index)
         self.random_generator = RandomCardGenerator(self.repository)
         self.card_of_day = CardOfTheDay(self.repository)
         self.deck_wizard = DeckWizard(self.repository, self.deck_service)
@@ -163,7 +165,7 @@ class IntegratedMainWindow(QMainWindow):
         
         self.deck_importer = DeckImporter()
         self.price_tracker = PriceTracker(scryfall_client=self.scryfall)
-        self.legality_checker = DeckLegalityChecker()
+        self.legality_checker = DeckLegalityChecker(self.legality_index)
         
         # Round 6 features (game engine)
         from app.game.game_engine import GameEngine
@@ -1205,6 +1207,16 @@ class IntegratedMainWindow(QMainWindow):
                 # TODO: Advance to next step
                 logger.info("Step advanced")
                 self.game_viewer.update_display()
+        elif action_type in ('play_land', 'cast_spell'):
+            if self.game_engine:
+                player_id = parameters['player']
+                action = parameters['action']
+                if action_type == 'play_land':
+                    self.game_engine.play_land(self.game_engine.players[player_id], action.card)
+                else:
+                    self.game_engine.legal_actions.tap_payment(player_id, action.payment)
+                    self.game_engine.cast_spell(player_id, action.card)
+                self.game_viewer.update_display()
     
     def _update_undo_redo(self):
         """Update undo/redo action states."""
@@ -14,6 +14,7 @@ from app.ui.advanced_widgets import DeckStatsWidget
 
 from app.services import DeckService
 from app.data_access import MTGRepository
+from app.utils.deck_analyzer import DeckAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,7 @@ class DeckPanel(QWidget):
         
         self.deck_service = deck_service
         self.repository = repository
+        self.deck_analyzer = DeckAnalyzer(repository)
         
         # Create new deck if none provided
         if deck_id is None:
@@ -95,6 +97,10 @@ class DeckPanel(QWidget):
         stats_layout.addStretch()
         layout.addLayout(stats_layout)
         
+        # Exact consistency figures (recomputed on every edit, memoized by composition)
+        self.consistency_label = QLabel("")
+        layout.addWidget(self.consistency_label)
+        
         # Mainboard group
         # DeckStatsWidget already imported at module top
         self.deck_stats_widget = DeckStatsWidget()
@@ -235,7 +241,6 @@ class DeckPanel(QWidget):
             self.deck_warning_label.setText("")
         else:
             # If commander deck and not legal, show violations
-            deck = self.deck_service.get_deck(self.deck_id)
             if deck and deck.format == 'Commander' and not stats.is_commander_legal:
                 violations = stats.commander_violations
                 if violations:
@@ -245,6 +250,38 @@ class DeckPanel(QWidget):
                     self.deck_warning_label.setText('Commander: Invalid')
             else:
                 self.deck_warning_label.setText("")
+        
+        self._refresh_consistency(deck)
+    
+    def _refresh_consistency(self, deck):
+        """Show exact land, color and mulligan probabilities for the deck."""
+        if not deck or not deck.cards:
+            self.consistency_label.setText("")
+            self.consistency_label.setToolTip("")
+            return
+        try:
+            report = self.deck_analyzer.analyze_mana_consistency(deck)
+        except Exception:
+            logger.exception("Failed to compute deck consistency")
+            self.consistency_label.setText("")
+            return
+        land_drops = report['land_drops']
+        turn_three = land_drops[2] if len(land_drops) > 2 else None
+        parts = [
+            f"2-4 lands in 7: {report['two_to_four_lands']:.1f}%",
+            f"Keep 7: {report['keep_rate']:.1f}%",
+        ]
+        if turn_three:
+            parts.append(f"T3 land drop: {turn_three['on_play']:.1f}% play / "
+                         f"{turn_three['on_draw']:.1f}% draw")
+        self.consistency_label.setText(" | ".join(parts))
+        tooltip = [f"Turn {drop['turn']} land drop: {drop['on_play']:.1f}% play, "
+                   f"{drop['on_draw']:.1f}% draw" for drop in land_drops]
+        tooltip += [f"{color} source by turn 3: {by_turn[2]:.1f}%"
+                    for color, by_turn in report['color_sources'].items() if len(by_turn) > 2]
+        tooltip.append(f"Average hand kept (London mulligan): "
+                       f"{report['mulligan']['average_hand_size']:.2f} cards")
+        self.consistency_label.setToolTip("\n".join(tooltip))
     
     def _on_mainboard_item_clicked(self, item):
         """Handle mainboard item click."""
@@ -0,0 +1,290 @@
+"""
+Cheaper, functionally similar replacements for the cards of a deck.
+
+The alternatives index is built from the card index once per index build:
+every card name gets a feature vector (main card type, mana value band,
+color identity bits, synergy/mechanic tag bits from SynergyFinder) and its
+cheapest USD price, and cards are filed in buckets by (type, band, color
+identity), each sorted by price. Replacing a card scans only the buckets of
+its type and neighbouring bands whose identity fits the deck, and within a
+bucket only the cards cheaper than it (found by bisection). Candidates are
+ranked by how many tags they share with the card, then by price.
+
+Classes:
+    BudgetAlternativeFinder: Alternatives index and search
+
+Usage:
+    finder = BudgetAlternativeFinder(SynergyFinder(repository))
+    finder.build_index('data/mtg_index.sqlite', SynergyTagStore(path), index_version)
+    replacements = finder.suggest_for_deck([('Mana Crypt', 1), ('Sol Ring', 1)], min_price=5.0)
+"""
+
+import bisect
+import logging
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from app.utils.color_utils import color_mask
+from app.utils.legality_checker import LegalityIndex, MTGFormat, format_from_name
+from app.utils.synergy_finder import CARD_TYPE_TAGS, SynergyFinder, SynergyTagStore
+
+logger = logging.getLogger(__name__)
+
+# Main card type of a type line: the first of these it contains
+CARD_TYPES = ('Land', 'Creature', 'Planeswalker', 'Battle', 'Instant', 'Sorcery',
+              'Artifact', 'Enchantment')
+# Mana values from this one up share the last band
+TOP_MANA_VALUE_BAND = 6
+# Candidates may be this many bands away from the card they replace
+BAND_REACH = 1
+# Similarity lost per band of mana value difference
+BAND_PENALTY = 0.25
+DEFAULT_ALTERNATIVES = 3
+DEFAULT_MIN_PRICE = 1.0
+
+CARD_QUERY = """
+    SELECT c.uuid, c.name, c.type_line, c.mana_value, c.color_identity, MIN(p.price)
+    FROM cards c
+    JOIN card_prices p ON p.uuid = c.uuid
+    WHERE c.is_token = 0 AND p.currency = 'usd' AND p.price > 0
+    GROUP BY c.uuid
+"""
+
+
+def _card_type(type_line: Optional[str]) -> str:
+    """Main card type of a type line ('' if it has none of CARD_TYPES)."""
+    types = (type_line or '').split('—')[0]
+    return next((card_type for card_type in CARD_TYPES if card_type in types), '')
+
+
+def _mana_value_band(mana_value: Optional[float]) -> int:
+    """Mana value band of a card."""
+    return min(int(mana_value or 0), TOP_MANA_VALUE_BAND)
+
+
+class BudgetAlternativeFinder:
+    """
+    Finds cheaper cards sharing type, mana value band, color identity and tags.
+    """
+
+    def __init__(self, finder: SynergyFinder, legality_index: Optional[LegalityIndex] = None):
+        """
+        Initialize the finder.
+
+        Args:
+            finder: Synergy finder whose tags describe what cards do
+            legality_index: Card legality, to keep alternatives legal in a format
+        """
+        self.finder = finder
+        self.legality_index = legality_index
+        # One entry per card name (its cheapest printing)
+        self.uuids: List[str] = []
+        self.names: List[str] = []
+        self.types: List[str] = []
+        self.bands: List[int] = []
+        self.colors: List[int] = []
+        self.bits: List[int] = []
+        self.prices: List[float] = []
+        self._positions: Dict[str, int] = {}
+        # (type, band) -> identity -> (prices ascending, positions)
+        self._buckets: Dict[Tuple[str, int], Dict[int, Tuple[List[float], List[int]]]] = {}
+        # Bits compared between cards (card type tags are implied by the bucket)
+        self._feature_mask = 0
+        self._legal: Dict[MTGFormat, Set[int]] = {}
+
+    def build_index(self, db_path: Union[str, Path], store: SynergyTagStore, index_version: str) -> int:
+        """
+        Build the alternatives index over every priced card in the card index.
+
+        Tags come from SynergyFinder.build_tag_index, so they are computed
+        once per index version and only loaded afterwards.
+
+        Args:
+            db_path: Card index database (cards and card_prices tables)
+            store: Tag store for the finder
+            index_version: Version of the card index
+
+        Returns:
+            Number of distinct cards indexed
+        """
+        self.finder.build_tag_index(db_path, store, index_version)
+        type_mask = 0
+        for _, tag in CARD_TYPE_TAGS:
+            type_mask |= self.finder.tag_bit(tag)
+        self._feature_mask = ~type_mask
+
+        cheapest: Dict[str, tuple] = {}
+        connection = sqlite3.connect(str(db_path))
+        try:
+            for row in connection.execute(CARD_QUERY):
+                if row[1] not in cheapest or (row[5], row[0]) < (cheapest[row[1]][5], cheapest[row[1]][0]):
+                    cheapest[row[1]] = row
+        finally:
+            connection.close()
+
+        self.uuids, self.names, self.types, self.bands, self.colors, self.bits, self.prices = (
+            [], [], [], [], [], [], []
+        )
+        buckets = defaultdict(lambda: defaultdict(list))
+        for name in sorted(cheapest):
+            uuid, _, type_line, mana_value, color_identity, price = cheapest[name]
+            entry = self.finder.card_tag_bits(uuid)
+            position = len(self.uuids)
+            self.uuids.append(uuid)
+            self.names.append(name)
+            self.types.append(_card_type(type_line))
+            self.bands.append(_mana_value_band(mana_value))
+            self.colors.append(color_mask(color_identity))
+            self.bits.append(entry[1] & self._feature_mask if entry else 0)
+            self.prices.append(price)
+            buckets[self.types[position], self.bands[position]][self.colors[position]].append(
+                (price, position)
+            )
+        self._positions = {name: position for position, name in enumerate(self.names)}
+        self._legal = {}
+
+        self._buckets = {}
+        for key, by_identity in buckets.items():
+            self._buckets[key] = {}
+            for identity, entries in by_identity.items():
+                entries.sort()
+                self._buckets[key][identity] = ([price for price, _ in entries],
+                                                [position for _, position in entries])
+        logger.info(f"Indexed {len(self.names)} priced cards in {len(self._buckets)} type/mana value buckets")
+        return len(self.names)
+
+    def _legal_positions(self, deck_format: Optional[str]) -> Optional[Set[int]]:
+        """Positions of cards playable in a format (None to allow every card)."""
+        legality_format = format_from_name(deck_format) if deck_format else None
+        if legality_format is None or self.legality_index is None:
+            return None
+        legal = self._legal.get(legality_format)
+        if legal is None:
+            legality = self.legality_index.format_legality(legality_format)
+            if legality is None:
+                return None
+            names = self.legality_index.names
+            playable = legality.playable.to_bytes((len(names) + 7) // 8, 'little')
+            legal = self._legal[legality_format] = {
+                self._positions[name]
+                for index, name in enumerate(names)
+                if playable[index >> 3] >> (index & 7) & 1 and name in self._positions
+            }
+        return legal
+
+    def alternatives(self,
+                     card_name: str,
+                     limit: int = DEFAULT_ALTERNATIVES,
+                     color_identity: Optional[Iterable[str]] = None,
+                     deck_format: Optional[str] = None,
+                     exclude: Iterable[str] = ()) -> List[Dict]:
+        """
+        Cheaper cards similar to one card, best first.
+
+        Args:
+            card_name: Card to replace
+            limit: Maximum alternatives to return
+            color_identity: Allowed colors (defaults to the card's own identity)
+            deck_format: Only suggest cards legal in this format
+            exclude: Card names not to suggest (e.g. already in the deck)
+
+        Returns:
+            Alternatives with uuid, name, price, savings, similarity and
+            shared_tags (empty if the card isn't indexed)
+        """
+        position = self._positions.get(card_name)
+        if position is None:
+            return []
+        allowed = self.colors[position] if color_identity is None else color_mask(color_identity)
+        return self._alternatives(position, limit, allowed, self._legal_positions(deck_format),
+                                  {self._positions[name] for name in exclude if name in self._positions})
+
+    def _alternatives(self, position: int, limit: int, allowed: int,
+                      legal: Optional[Set[int]], excluded) -> List[Dict]:
+        """Rank the cheaper candidates for a card."""
+        price, bits = self.prices[position], self.bits[position]
+        tag_count = bits.bit_count()
+        scored = []
+        for band in range(self.bands[position] - BAND_REACH, self.bands[position] + BAND_REACH + 1):
+            by_identity = self._buckets.get((self.types[position], band))
+            if not by_identity:
+                continue
+            penalty = abs(band - self.bands[position]) * BAND_PENALTY
+            for identity, (prices, positions) in by_identity.items():
+                if identity & ~allowed:
+                    continue
+                for candidate in positions[:bisect.bisect_left(prices, price)]:
+                    shared = self.bits[candidate] & bits
+                    if tag_count and not shared:
+                        continue
+                    union = (self.bits[candidate] | bits).bit_count()
+                    similarity = (shared.bit_count() / union if union else 1.0) - penalty
+                    scored.append((-similarity, self.prices[candidate], candidate))
+        scored.sort()
+
+        results = []
+        for negated, candidate_price, candidate in scored:
+            if candidate == position or candidate in excluded or (legal is not None and candidate not in legal):
+                continue
+            results.append({
+                'uuid': self.uuids[candidate],
+                'name': self.names[candidate],
+                'price': candidate_price,
+                'savings': round(price - candidate_price, 2),
+                'similarity': round(-negated, 3),
+                'shared_tags': self.finder.bit_names(self.bits[candidate] & bits)
+            })
+            if len(results) == limit:
+                break
+        return results
+
+    def suggest_for_deck(self,
+                         deck_cards: List[Tuple[str, int]],
+                         min_price: float = DEFAULT_MIN_PRICE,
+                         per_card: int = DEFAULT_ALTERNATIVES,
+                         color_identity: Optional[Iterable[str]] = None,
+                         deck_format: Optional[str] = None) -> List[Dict]:
+        """
+        Cheaper replacements for every card of a deck costing at least min_price.
+
+        Args:
+            deck_cards: List of (card name, quantity) tuples
+            min_price: Only replace cards costing at least this much
+            per_card: Alternatives listed per card
+            color_identity: Allowed colors (defaults to the deck's color identity)
+            deck_format: Only suggest cards legal in this format
+
+        Returns:
+            One entry per replaceable card (name, quantity, price and its
+            alternatives), largest possible savings first
+        """
+        quantities: Dict[int, int] = defaultdict(int)
+        for name, quantity in deck_cards:
+            position = self._positions.get(name)
+            if position is not None:
+                quantities[position] += quantity
+        if color_identity is None:
+            allowed = 0
+            for position in quantities:
+                allowed |= self.colors[position]
+        else:
+            allowed = color_mask(color_identity)
+        legal = self._legal_positions(deck_format)
+
+        suggestions = []
+        for position, quantity in quantities.items():
+            if self.prices[position] < min_price:
+                continue
+            alternatives = self._alternatives(position, per_card, allowed, legal, quantities)
+            if alternatives:
+                suggestions.append({
+                    'name': self.names[position],
+                    'uuid': self.uuids[position],
+                    'quantity': quantity,
+                    'price': self.prices[position],
+                    'alternatives': alternatives
+                })
+        suggestions.sort(key=lambda s: (-s['alternatives'][0]['savings'] * s['quantity'], s['name']))
+        return suggestions
@@ -0,0 +1,251 @@
+"""
+Card recommendations over the whole card pool.
+
+Scores every card in the index against a deck without visiting cards that
+can't score: an inverted index maps each synergy feature (theme, creature
+type, producing or wanting a theme) to the cards that have it. A deck turns
+into a weight per feature - how many deck cards a card with that feature
+would synergize with - and a candidate's score is the sum of the weights of
+its features, which equals the synergy count SynergyFinder.suggest_cards_for_deck
+computes pair by pair. Candidates outside the deck's color identity or not
+legal in its format are dropped, and the best are taken with a heap.
+
+Classes:
+    CardRecommender: Inverted-index recommendation engine
+
+Usage:
+    recommender = CardRecommender(SynergyFinder(repository), LegalityIndex('data/mtg_index.sqlite'))
+    recommender.build_index('data/mtg_index.sqlite', SynergyTagStore(path), index_version)
+    additions = recommender.recommend(deck_cards, deck_format='commander', limit=20)
+"""
+
+import heapq
+import logging
+import sqlite3
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from app.utils.color_utils import color_mask
+from app.utils.legality_checker import LegalityIndex, MTGFormat, format_from_name
+from app.utils.synergy_finder import SynergyFinder, SynergyTagStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+# Reasons listed per recommendation
+MAX_REASONS = 5
+
+CANDIDATE_QUERY = """
+    SELECT uuid, name, color_identity
+    FROM cards
+    WHERE is_token = 0
+    ORDER BY name, uuid
+"""
+
+# Feature kinds in the inverted index (feature = (kind, bit position))
+TAG = 0  # Has a theme or creature type tag
+PRODUCES = 1  # Produces for a theme but doesn't want it
+WANTS = 2  # Wants a theme but doesn't produce for it
+PRODUCES_AND_WANTS = 3
+
+
+class CardRecommender:
+    """
+    Recommends cards from the whole index for a deck.
+    """
+
+    def __init__(self, finder: SynergyFinder, legality_index: Optional[LegalityIndex] = None):
+        """
+        Initialize the recommender.
+
+        Args:
+            finder: Synergy finder whose tags and reasons are used
+            legality_index: Card legality, to keep recommendations legal in a format
+        """
+        self.finder = finder
+        self.legality_index = legality_index
+        self.db_path: Optional[str] = None
+        # One entry per card name (the first printing by uuid)
+        self.uuids: List[str] = []
+        self.names: List[str] = []
+        self.bits: List[int] = []
+        self.colors: List[int] = []
+        # Every printing's uuid -> card position
+        self._positions: Dict[str, int] = {}
+        self._postings: Dict[Tuple[int, int], List[int]] = {}
+        self._legal: Dict[MTGFormat, Set[int]] = {}
+
+    def build_index(self, db_path: Union[str, Path], store: SynergyTagStore,
+                    index_version: str) -> int:
+        """
+        Build the inverted index over every non-token card in the card index.
+
+        Tags come from SynergyFinder.build_tag_index, so they are computed
+        once per index version and only loaded afterwards.
+
+        Args:
+            db_path: Card index database
+            store: Tag store for the finder
+            index_version: Version of the card index
+
+        Returns:
+            Number of distinct cards indexed
+        """
+        self.finder.build_tag_index(db_path, store, index_version)
+        self.db_path = str(db_path)
+        self.uuids, self.names, self.bits, self.colors = [], [], [], []
+        self._positions = {}
+        self._legal = {}
+
+        connection = sqlite3.connect(self.db_path)
+        try:
+            positions_by_name: Dict[str, int] = {}
+            for uuid, name, color_identity in connection.execute(CANDIDATE_QUERY):
+                position = positions_by_name.get(name)
+                if position is None:
+                    entry = self.finder.card_tag_bits(uuid)
+                    if entry is None:
+                        continue
+                    position = positions_by_name[name] = len(self.uuids)
+                    self.uuids.append(uuid)
+                    self.names.append(name)
+                    self.bits.append(entry[1])
+                    self.colors.append(color_mask(color_identity))
+                self._positions[uuid] = position
+        finally:
+            connection.close()
+
+        postings = defaultdict(list)
+        feature_mask = self.finder.feature_mask
+        for position, bits in enumerate(self.bits):
+            for feature in self._features(bits, feature_mask):
+                postings[feature].append(position)
+        self._postings = dict(postings)
+        logger.info(f"Indexed {len(self.uuids)} cards under {len(self._postings)} synergy features")
+        return len(self.uuids)
+
+    def _features(self, bits: int, feature_mask: int) -> Iterable[Tuple[int, int]]:
+        """Inverted-index features of a card's tag bits."""
+        tags = bits & feature_mask
+        while tags:
+            low = tags & -tags
+            yield TAG, low.bit_length() - 1
+            tags ^= low
+        produces, wants = self.finder.relation_masks(bits)
+        for kind, themes in ((PRODUCES, produces & ~wants), (WANTS, wants & ~produces),
+                             (PRODUCES_AND_WANTS, produces & wants)):
+            while themes:
+                low = themes & -themes
+                yield kind, low.bit_length() - 1
+                themes ^= low
+
+    def _legal_positions(self, deck_format: Optional[str]) -> Optional[Set[int]]:
+        """Positions of cards playable in a format (None to allow every card)."""
+        legality_format = format_from_name(deck_format) if deck_format else None
+        if legality_format is None or self.legality_index is None:
+            return None
+        legal = self._legal.get(legality_format)
+        if legal is None:
+            legality = self.legality_index.format_legality(legality_format)
+            if legality is None:
+                return None
+            positions = {name: position for position, name in enumerate(self.names)}
+            names = self.legality_index.names
+            playable = legality.playable.to_bytes((len(names) + 7) // 8, 'little')
+            legal = self._legal[legality_format] = {
+                positions[name]
+                for index, name in enumerate(names)
+                if playable[index >> 3] >> (index & 7) & 1 and name in positions
+            }
+        return legal
+
+    def feature_weights(self, deck_bits: List[int]) -> Dict[Tuple[int, int], int]:
+        """
+        Weight of each feature: the synergy reasons a card with it would add.
+
+        A shared theme or creature type counts once per deck card with it.
+        Producing for a theme counts once per deck card wanting it, wanting a
+        theme once per deck card producing it, and doing both once per deck
+        card doing either (a pair names each theme's relation once).
+
+        Args:
+            deck_bits: Tag bits of each deck card
+
+        Returns:
+            Weight by feature (features of weight zero are left out)
+        """
+        weights: Counter = Counter()
+        feature_mask = self.finder.feature_mask
+        for bits in deck_bits:
+            tags = bits & feature_mask
+            while tags:
+                low = tags & -tags
+                weights[TAG, low.bit_length() - 1] += 1
+                tags ^= low
+            produces, wants = self.finder.relation_masks(bits)
+            for theme in range(self.finder.theme_count):
+                produced, wanted = produces >> theme & 1, wants >> theme & 1
+                weights[PRODUCES, theme] += wanted
+                weights[WANTS, theme] += produced
+                weights[PRODUCES_AND_WANTS, theme] += produced | wanted
+        return {feature: weight for feature, weight in weights.items() if weight}
+
+    def recommend(self,
+                  deck_cards: List[Tuple[str, int]],
+                  deck_format: Optional[str] = None,
+                  limit: int = DEFAULT_LIMIT,
+                  color_identity: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Best additions for a deck from the whole index.
+
+        Args:
+            deck_cards: List of (uuid, quantity) tuples
+            deck_format: Only recommend cards legal in this format
+            limit: Maximum recommendations to return
+            color_identity: Allowed colors (defaults to the deck's color identity)
+
+        Returns:
+            Recommendations, best first, with uuid, name, synergy_count and
+            the most frequent reasons
+        """
+        deck_positions = {self._positions[uuid] for uuid, _ in deck_cards if uuid in self._positions}
+        deck_bits = [entry[1] for entry in map(self.finder.card_tag_bits, (uuid for uuid, _ in deck_cards))
+                     if entry]
+        if color_identity is None:
+            allowed_colors = 0
+            for position in deck_positions:
+                allowed_colors |= self.colors[position]
+        else:
+            allowed_colors = color_mask(color_identity)
+
+        scores: Dict[int, int] = defaultdict(int)
+        for feature, weight in self.feature_weights(deck_bits).items():
+            for position in self._postings.get(feature, ()):
+                scores[position] += weight
+
+        legal = self._legal_positions(deck_format)
+        colors = self.colors
+        best = heapq.nlargest(
+            limit,
+            (
+                (score, -position)
+                for position, score in scores.items()
+                if position not in deck_positions
+                and not colors[position] & ~allowed_colors
+                and (legal is None or position in legal)
+            )
+        )
+        return [self._recommendation(-negated, score, deck_bits) for score, negated in best]
+
+    def _recommendation(self, position: int, score: int, deck_bits: List[int]) -> Dict:
+        """Describe a recommended card, naming its most frequent reasons."""
+        reasons = Counter()
+        for bits in deck_bits:
+            reasons.update(self.finder.synergy_reasons(self.bits[position], bits))
+        return {
+            'uuid': self.uuids[position],
+            'name': self.names[position],
+            'synergy_count': score,
+            'reasons': [reason for reason, _ in reasons.most_common(MAX_REASONS)]
+        }
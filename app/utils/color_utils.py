@@ -2,7 +2,7 @@
 Utility functions for color and mana handling.
 """
 
-from typing import List, Optional, Set
+from typing import Iterable, List, Optional, Set
 import re
 
 
@@ -25,6 +25,40 @@ COLOR_SYMBOLS = {
     'C': '◇'
 }
 
+# The five colors in WUBRG order; bit i of a color mask is COLOR_ORDER[i]
+COLOR_ORDER = ('W', 'U', 'B', 'R', 'G')
+
+
+def color_mask(colors: Optional[Iterable[str]]) -> int:
+    """
+    Convert colors to a bitmask over COLOR_ORDER.
+    
+    Args:
+        colors: Color codes, or a color identity string as stored in the
+            card index (e.g., "W,U"); anything else is ignored
+        
+    Returns:
+        Bitmask with bit i set for COLOR_ORDER[i]
+    """
+    bits = 0
+    for color in colors or ():
+        if color in COLOR_ORDER:
+            bits |= 1 << COLOR_ORDER.index(color)
+    return bits
+
+
+def mask_colors(mask: int) -> Set[str]:
+    """
+    Convert a bitmask from color_mask back to color codes.
+    
+    Args:
+        mask: Bitmask over COLOR_ORDER
+        
+    Returns:
+        Set of color codes
+    """
+    return {color for bit, color in enumerate(COLOR_ORDER) if mask >> bit & 1}
+
 
 def parse_color_identity(color_string: Optional[str]) -> Set[str]:
     """
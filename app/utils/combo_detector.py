@@ -1,14 +1,96 @@
 """
 Card combo detection system.
 Identifies known combos and infinite/game-winning combinations.
+
+Combos live in a ComboStore (SQLite; in memory by default, or a file that
+large datasets are imported into once). Card names are normalized to card
+ids, and each combo is indexed by its pieces, so finding complete and
+near-complete combos counts pieces per combo for the deck's cards only:
+the work grows with the deck and the combos its cards are in, not with
+the size of the combo database. Combos are only turned into Combo objects
+when returned.
+
+Classes:
+    Combo: A card combo
+    ComboStore: SQLite combo database indexed card -> combos
+    ComboDetector: Detects card combos in decks
+
+Functions:
+    card_key: Normalize a card name for matching
+    load_combo_file: Read combos from a JSON dataset
+
+Usage:
+    store = ComboStore('data/combos.sqlite')
+    store.add_combos(load_combo_file('combos.json'))  # once
+    detector = ComboDetector(repository, store)
+    detector.find_partial_combos(card_names)
 """
 
+import json
 import logging
-from typing import List, Dict, Set, Tuple, Optional
+from functools import lru_cache
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from collections import Counter
 from dataclasses import dataclass
 
+from app.utils.color_utils import color_mask, mask_colors
+from app.utils.versioned_store import SQLiteStore
+
 logger = logging.getLogger(__name__)
 
+# Partial combos may miss at most this many pieces
+MAX_MISSING_PIECES = 2
+# Card keys per IN (...) query (stays under SQLite's variable limit)
+QUERY_CHUNK = 500
+# Card names whose keys are kept
+KEY_CACHE_SIZE = 1 << 16
+# Memory-map file-backed stores up to this many bytes
+MMAP_SIZE = 256 * 1024 * 1024
+
+COMBO_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS combos (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT NOT NULL DEFAULT '',
+        steps TEXT NOT NULL DEFAULT '[]',
+        result TEXT NOT NULL DEFAULT '',
+        colors INTEGER NOT NULL DEFAULT 0,
+        combo_type TEXT NOT NULL DEFAULT '',
+        difficulty TEXT NOT NULL DEFAULT '',
+        requires_setup INTEGER NOT NULL DEFAULT 0,
+        piece_count INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS combo_cards (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        name_key TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS combo_pieces (
+        combo_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        card_id INTEGER NOT NULL,
+        PRIMARY KEY (combo_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS idx_combo_pieces_card ON combo_pieces(card_id, combo_id);
+    CREATE INDEX IF NOT EXISTS idx_combos_type ON combos(combo_type);
+"""
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def card_key(name: str) -> str:
+    """
+    Normalize a card name for matching (case and spacing don't matter).
+    
+    Args:
+        name: Card name
+    
+    Returns:
+        Normalized key
+    """
+    return ' '.join(name.casefold().split())
+
 
 @dataclass
 class Combo:
@@ -24,21 +106,271 @@ class Combo:
     requires_setup: bool
 
 
+def _combo_from_entry(entry: Dict[str, Any]) -> Optional[Combo]:
+    """
+    Build a combo from one dataset entry.
+    
+    Entries use the Combo field names; "uses" (card names, or objects with
+    card.name), "identity" (e.g. "UB") and "produces" are accepted as well,
+    as in Commander Spellbook exports.
+    """
+    cards = entry.get('cards')
+    if cards is None:
+        cards = [
+            use['card']['name'] if isinstance(use, dict) else use
+            for use in entry.get('uses', [])
+        ]
+    cards = list(dict.fromkeys(name for name in cards if name))
+    if len(cards) < 2:
+        return None
+    
+    produces = [
+        item.get('name', '') if isinstance(item, dict) else str(item)
+        for item in entry.get('produces', [])
+    ]
+    result = entry.get('result') or ', '.join(produces)
+    steps = entry.get('steps', [])
+    if isinstance(steps, str):
+        steps = [line for line in steps.splitlines() if line.strip()]
+    colors = entry.get('colors', entry.get('identity', ''))
+    return Combo(
+        name=entry.get('name') or ' + '.join(cards),
+        cards=cards,
+        description=entry.get('description') or result,
+        steps=list(steps),
+        result=result,
+        colors=mask_colors(color_mask(colors)),
+        combo_type=entry.get('combo_type', 'other'),
+        difficulty=entry.get('difficulty', 'medium'),
+        requires_setup=bool(entry.get('requires_setup', False))
+    )
+
+
+def load_combo_file(path: Union[str, Path]) -> List[Combo]:
+    """
+    Read combos from a JSON dataset (a list of entries, or {"combos": [...]}).
+    
+    Entries with fewer than two cards are skipped.
+    
+    Args:
+        path: Dataset file
+    
+    Returns:
+        Combos in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data.get('combos', []) if isinstance(data, dict) else data
+    
+    combos = []
+    for entry in entries:
+        combo = _combo_from_entry(entry)
+        if combo is None:
+            logger.debug(f"Skipping combo entry without two cards: {entry.get('name', entry)}")
+            continue
+        combos.append(combo)
+    return combos
+
+
+class ComboStore(SQLiteStore):
+    """
+    SQLite combo database, indexed from each card to the combos using it.
+    """
+    
+    SCHEMA = COMBO_SCHEMA
+    
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        """
+        Open (or create) a combo store.
+        
+        Args:
+            db_path: SQLite database file (":memory:" for a temporary store)
+        """
+        super().__init__(db_path)
+        if self.db_path != ":memory:":
+            self.connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM combos").fetchone()[0]
+    
+    def add_combos(self, combos: Iterable[Combo]) -> int:
+        """
+        Add combos, skipping any whose name is already stored.
+        
+        Args:
+            combos: Combos to add
+        
+        Returns:
+            Number of combos added
+        """
+        added = 0
+        card_ids: Dict[str, int] = {}
+        with self.connection:
+            cursor = self.connection.cursor()
+            for combo in combos:
+                pieces = list(dict.fromkeys(card_key(name) for name in combo.cards))
+                cursor.execute(
+                    "INSERT OR IGNORE INTO combos (name, description, steps, result, colors, "
+                    "combo_type, difficulty, requires_setup, piece_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (combo.name, combo.description, json.dumps(combo.steps), combo.result,
+                     color_mask(combo.colors), combo.combo_type, combo.difficulty,
+                     int(combo.requires_setup), len(pieces))
+                )
+                if not cursor.rowcount:
+                    continue
+                combo_id = cursor.lastrowid
+                names = {card_key(name): name for name in reversed(combo.cards)}
+                for position, key in enumerate(pieces):
+                    card_id = card_ids.get(key)
+                    if card_id is None:
+                        card_id = card_ids[key] = self._card_id(cursor, key, names[key])
+                    cursor.execute(
+                        "INSERT INTO combo_pieces (combo_id, position, card_id) VALUES (?, ?, ?)",
+                        (combo_id, position, card_id)
+                    )
+                added += 1
+        return added
+    
+    @staticmethod
+    def _card_id(cursor: sqlite3.Cursor, key: str, name: str) -> int:
+        """Get the id of a card key, adding the card if it's new."""
+        cursor.execute("INSERT OR IGNORE INTO combo_cards (name, name_key) VALUES (?, ?)", (name, key))
+        return cursor.execute("SELECT id FROM combo_cards WHERE name_key = ?", (key,)).fetchone()[0]
+    
+    def piece_counts(self, keys: Iterable[str]) -> Dict[int, Tuple[int, int]]:
+        """
+        Count the given cards in every combo that uses any of them.
+        
+        Args:
+            keys: Card keys (see card_key)
+        
+        Returns:
+            (pieces present, pieces in combo) by combo id
+        """
+        keys = list(dict.fromkeys(keys))
+        present: Counter = Counter()
+        piece_counts: Dict[int, int] = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            rows = self.connection.execute(
+                "SELECT p.combo_id, c.piece_count FROM combo_cards k "
+                "JOIN combo_pieces p ON p.card_id = k.id "
+                "JOIN combos c ON c.id = p.combo_id "
+                f"WHERE k.name_key IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            for combo_id, piece_count in rows:
+                present[combo_id] += 1
+                piece_counts[combo_id] = piece_count
+        return {combo_id: (count, piece_counts[combo_id]) for combo_id, count in present.items()}
+    
+    def search(self, query: Optional[str] = None, combo_type: Optional[str] = None,
+               colors: Optional[Set[str]] = None) -> List[int]:
+        """
+        Find combo ids by text, type and color identity.
+        
+        Args:
+            query: Case-insensitive text in the name, description or a card name
+            combo_type: Exact combo type
+            colors: Colors the combo must fit within
+        
+        Returns:
+            Matching combo ids in insertion order
+        """
+        clauses, params = [], []
+        if combo_type:
+            clauses.append("c.combo_type = ?")
+            params.append(combo_type)
+        if colors:
+            clauses.append("(c.colors & ?) = c.colors")
+            params.append(color_mask(colors))
+        if query:
+            pattern = '%' + query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clauses.append(
+                "(lower(c.name) LIKE ? ESCAPE '\\' OR lower(c.description) LIKE ? ESCAPE '\\' "
+                "OR EXISTS (SELECT 1 FROM combo_pieces p JOIN combo_cards k ON k.id = p.card_id "
+                "WHERE p.combo_id = c.id AND lower(k.name) LIKE ? ESCAPE '\\'))"
+            )
+            params.extend([pattern] * 3)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [row[0] for row in self.connection.execute(
+            f"SELECT c.id FROM combos c {where} ORDER BY c.id", params
+        )]
+    
+    def combo_ids_for_card(self, key: str) -> List[int]:
+        """Ids of the combos using a card, in insertion order."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT p.combo_id FROM combo_cards k JOIN combo_pieces p ON p.card_id = k.id "
+            "WHERE k.name_key = ? ORDER BY p.combo_id", (key,)
+        )]
+    
+    def combo_types(self) -> List[str]:
+        """Every combo type, sorted."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT combo_type FROM combos ORDER BY combo_type"
+        )]
+    
+    def get_combos(self, combo_ids: Iterable[int]) -> Dict[int, Combo]:
+        """
+        Load combos by id.
+        
+        Args:
+            combo_ids: Combo ids
+        
+        Returns:
+            Combos by id (unknown ids are left out)
+        """
+        combo_ids = list(combo_ids)
+        combos: Dict[int, Combo] = {}
+        for start in range(0, len(combo_ids), QUERY_CHUNK):
+            chunk = combo_ids[start:start + QUERY_CHUNK]
+            marks = ', '.join('?' for _ in chunk)
+            cards: Dict[int, List[str]] = {}
+            for combo_id, name in self.connection.execute(
+                    "SELECT p.combo_id, k.name FROM combo_pieces p JOIN combo_cards k ON k.id = p.card_id "
+                    f"WHERE p.combo_id IN ({marks}) ORDER BY p.combo_id, p.position", chunk):
+                cards.setdefault(combo_id, []).append(name)
+            for row in self.connection.execute(
+                    "SELECT id, name, description, steps, result, colors, combo_type, difficulty, "
+                    f"requires_setup FROM combos WHERE id IN ({marks})", chunk):
+                combos[row[0]] = Combo(
+                    name=row[1],
+                    cards=cards.get(row[0], []),
+                    description=row[2],
+                    steps=json.loads(row[3]),
+                    result=row[4],
+                    colors=mask_colors(row[5]),
+                    combo_type=row[6],
+                    difficulty=row[7],
+                    requires_setup=bool(row[8])
+                )
+        return combos
+    
+    def all_ids(self) -> List[int]:
+        """Every combo id, in insertion order."""
+        return [row[0] for row in self.connection.execute("SELECT id FROM combos ORDER BY id")]
+    
+
 class ComboDetector:
     """
     Detects card combos in decks.
     """
     
-    def __init__(self, repository):
+    def __init__(self, repository, store: Optional[ComboStore] = None):
         """
         Initialize combo detector.
         
         Args:
             repository: MTG repository for card lookups
+            store: Combo database (an in-memory store by default); the
+                built-in combos are added to it if missing
         """
         self.repository = repository
-        self.combos: List[Combo] = self._build_combo_database()
-        logger.info(f"Combo detector initialized with {len(self.combos)} known combos")
+        self.store = store if store is not None else ComboStore()
+        self.store.add_combos(self._build_combo_database())
+        self._combo_cache: Dict[int, Combo] = {}
+        logger.info(f"Combo detector initialized with {len(self.store)} known combos")
     
     def _build_combo_database(self) -> List[Combo]:
         """Build database of known combos."""
@@ -285,6 +617,32 @@ class ComboDetector:
         
         return combos
     
+    @property
+    def combos(self) -> List[Combo]:
+        """Every combo in the store (loads them all; queries don't need this)."""
+        return self._load(self.store.all_ids())
+    
+    def load_dataset(self, path: Union[str, Path]) -> int:
+        """
+        Import a combo dataset file into the store.
+        
+        Args:
+            path: JSON dataset (see load_combo_file)
+        
+        Returns:
+            Number of new combos
+        """
+        added = self.store.add_combos(load_combo_file(path))
+        logger.info(f"Imported {added} combos from {path}")
+        return added
+    
+    def _load(self, combo_ids: List[int]) -> List[Combo]:
+        """Combos by id, in the given order (loaded once, then cached)."""
+        missing = [combo_id for combo_id in combo_ids if combo_id not in self._combo_cache]
+        if missing:
+            self._combo_cache.update(self.store.get_combos(missing))
+        return [self._combo_cache[combo_id] for combo_id in combo_ids if combo_id in self._combo_cache]
+    
     def find_combos_in_deck(self, card_names: List[str]) -> List[Combo]:
         """
         Find all complete combos present in deck.
@@ -295,16 +653,10 @@ class ComboDetector:
         Returns:
             List of Combo objects that are complete
         """
-        found_combos = []
-        card_names_set = set(card_names)
-        
-        for combo in self.combos:
-            # Check if all combo pieces are in deck
-            combo_pieces = set(combo.cards)
-            if combo_pieces.issubset(card_names_set):
-                found_combos.append(combo)
-        
-        return found_combos
+        counts = self.store.piece_counts(card_key(name) for name in card_names)
+        return self._load(sorted(
+            combo_id for combo_id, (present, pieces) in counts.items() if present == pieces
+        ))
     
     def find_partial_combos(self, card_names: List[str]) -> List[Dict]:
         """
@@ -316,22 +668,23 @@ class ComboDetector:
         Returns:
             List of dictionaries with combo and missing pieces
         """
-        partial_combos = []
-        card_names_set = set(card_names)
+        deck_keys = {card_key(name) for name in card_names}
+        counts = self.store.piece_counts(deck_keys)
+        partial_ids = sorted(
+            combo_id for combo_id, (present, pieces) in counts.items()
+            if 0 < pieces - present <= MAX_MISSING_PIECES
+        )
         
-        for combo in self.combos:
-            combo_pieces = set(combo.cards)
-            present = combo_pieces & card_names_set
-            missing = combo_pieces - card_names_set
-            
-            # If we have some pieces but not all
-            if present and missing and len(missing) <= 2:
-                partial_combos.append({
-                    'combo': combo,
-                    'present': list(present),
-                    'missing': list(missing),
-                    'completion': len(present) / len(combo_pieces) * 100
-                })
+        partial_combos = []
+        for combo in self._load(partial_ids):
+            present = [name for name in combo.cards if card_key(name) in deck_keys]
+            missing = [name for name in combo.cards if card_key(name) not in deck_keys]
+            partial_combos.append({
+                'combo': combo,
+                'present': present,
+                'missing': missing,
+                'completion': len(present) / len(combo.cards) * 100
+            })
         
         # Sort by completion percentage
         partial_combos.sort(key=lambda x: x['completion'], reverse=True)
@@ -349,27 +702,7 @@ class ComboDetector:
         Returns:
             List of matching combos
         """
-        results = self.combos
-        
-        # Filter by type
-        if combo_type:
-            results = [c for c in results if c.combo_type == combo_type]
-        
-        # Filter by colors
-        if colors:
-            results = [c for c in results if c.colors.issubset(colors)]
-        
-        # Text search
-        if query:
-            query_lower = query.lower()
-            results = [
-                c for c in results
-                if query_lower in c.name.lower() or
-                   query_lower in c.description.lower() or
-                   any(query_lower in card.lower() for card in c.cards)
-            ]
-        
-        return results
+        return self._load(self.store.search(query, combo_type, colors))
     
     def get_combo_suggestions(self, card_name: str) -> List[Combo]:
         """
@@ -381,13 +714,7 @@ class ComboDetector:
         Returns:
             List of combos involving this card
         """
-        suggestions = []
-        
-        for combo in self.combos:
-            if card_name in combo.cards:
-                suggestions.append(combo)
-        
-        return suggestions
+        return self._load(self.store.combo_ids_for_card(card_key(card_name)))
     
     def analyze_combo_density(self, card_names: List[str]) -> Dict[str, any]:
         """
@@ -416,5 +743,4 @@ class ComboDetector:
     
     def get_all_combo_types(self) -> List[str]:
         """Get list of all combo types in database."""
-        types = set(combo.combo_type for combo in self.combos)
-        return sorted(list(types))
+        return self.store.combo_types()
@@ -1,15 +1,272 @@
 """
 Advanced deck analysis tools.
 Analyzes deck composition, mana curve, color distribution, synergies, and more.
+
+Every statistic is a sum over the deck's cards of what each card adds, so
+cards are fetched once (in one batch when the repository supports it),
+reduced to CardFacts once per UUID, and a deck is analyzed in a single pass
+that fills every total in a DeckStatistics. Adding or removing copies of a
+card only adds or subtracts that card's facts, so statistics can be kept up
+to date on every edit without re-reading the deck.
+
+Classes:
+    CardFacts: What one copy of a card adds to each statistic
+    DeckStatistics: Running totals for a deck
+    DeckAnalyzer: Comprehensive deck analysis and statistics
+
+Usage:
+    analyzer = DeckAnalyzer(repository)
+    statistics = analyzer.build_statistics(deck)
+    analyzer.add_card(statistics, uuid)
+    statistics.mana_curve()
 """
 
 import logging
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from collections import Counter, defaultdict
 from app.models import Deck
 
 logger = logging.getLogger(__name__)
 
+COLORS = ['W', 'U', 'B', 'R', 'G']
+# Mana curve buckets stop at 7+
+MAX_CURVE_BUCKET = 7
+# Creature types shared by fewer cards aren't reported as tribal synergies
+MIN_TRIBAL_COUNT = 3
+
+COMMON_KEYWORDS = [
+    'Flying', 'First Strike', 'Double Strike', 'Deathtouch', 'Hexproof',
+    'Indestructible', 'Lifelink', 'Menace', 'Reach', 'Trample', 'Vigilance',
+    'Haste', 'Defender', 'Flash', 'Ward', 'Protection', 'Shroud',
+    'Landfall', 'Proliferate', 'Cascade', 'Storm', 'Affinity', 'Convoke',
+    'Delve', 'Emerge', 'Exploit', 'Flashback', 'Kicker', 'Madness',
+    'Miracle', 'Overload', 'Rebound', 'Retrace', 'Suspend', 'Mutate'
+]
+REMOVAL_KEYWORDS = ['destroy', 'exile', 'damage', 'fight', '-x/-x']
+COUNTER_KEYWORDS = ['counter target']
+WIPE_KEYWORDS = ['destroy all', 'exile all', 'damage to each']
+
+# Primary card type by the first of these found in the type line
+TYPE_CATEGORIES = [
+    ('Creature', 'Creatures'), ('Planeswalker', 'Planeswalkers'), ('Instant', 'Instants'),
+    ('Sorcery', 'Sorceries'), ('Enchantment', 'Enchantments'), ('Artifact', 'Artifacts'),
+    ('Land', 'Lands'), ('Battle', 'Battles')
+]
+
+
+def _is_land(type_line: str, types: Any) -> bool:
+    """Whether a card is a land by its type line or types (a list or a string)."""
+    if 'Land' in type_line:
+        return True
+    if isinstance(types, list):
+        return 'Land' in types or any('land' in str(t).lower() for t in types)
+    if isinstance(types, str):
+        return 'land' in types.lower()
+    return False
+
+
+@dataclass(frozen=True)
+class CardFacts:
+    """What one copy of a card adds to each deck statistic."""
+    curve_bucket: Optional[int]  # None for lands
+    spell_mana_value: Optional[float]  # Counted in the average CMC; None for lands
+    colors: Tuple[str, ...]  # ('Colorless',) for colorless cards
+    color_identity: Tuple[str, ...]
+    card_type: str
+    mana_source: Optional[str]  # 'lands', 'mana_rocks' or 'mana_dorks'
+    land_colors: Tuple[str, ...]  # Colors a land's text adds
+    keywords: Tuple[str, ...]
+    creature_types: Tuple[str, ...]
+    interaction: Tuple[str, ...]  # 'removal', 'counterspells' and/or 'board_wipes'
+    
+    @classmethod
+    def from_card(cls, card: Any) -> 'CardFacts':
+        """
+        Work out a card's contributions.
+        
+        Args:
+            card: Card object from the repository
+        
+        Returns:
+            CardFacts
+        """
+        type_line = getattr(card, 'type_line', None) or ''
+        raw_text = getattr(card, 'oracle_text', None) or ''
+        oracle_text = raw_text.lower()
+        mana_value = getattr(card, 'mana_value', None) or 0
+        
+        card_type = 'Other'
+        for word, category in TYPE_CATEGORIES:
+            if word in type_line:
+                card_type = category
+                break
+        
+        land_colors: Tuple[str, ...] = ()
+        if _is_land(type_line, getattr(card, 'types', None) or []):
+            mana_source = 'lands'
+            if 'add' in oracle_text:
+                land_colors = tuple(color for color in COLORS if f'{{{color}}}' in raw_text)
+        elif 'add' in oracle_text or 'mana' in oracle_text:
+            if 'Artifact' in type_line:
+                mana_source = 'mana_rocks'
+            elif 'Creature' in type_line:
+                mana_source = 'mana_dorks'
+            else:
+                mana_source = None
+        else:
+            mana_source = None
+        
+        creature_types: Tuple[str, ...] = ()
+        if 'Creature' in type_line and '—' in type_line:
+            creature_types = tuple(
+                creature_type for creature_type in type_line.split('—')[1].strip().split()
+                if creature_type.lower() not in ['token', 'creature']
+            )
+        
+        interaction = tuple(
+            name for name, keywords in (('removal', REMOVAL_KEYWORDS),
+                                        ('counterspells', COUNTER_KEYWORDS),
+                                        ('board_wipes', WIPE_KEYWORDS))
+            if any(keyword in oracle_text for keyword in keywords)
+        )
+        
+        return cls(
+            curve_bucket=None if 'land' in type_line.lower() else min(int(mana_value), MAX_CURVE_BUCKET),
+            spell_mana_value=None if 'Land' in type_line else mana_value,
+            colors=tuple(getattr(card, 'colors', None) or ['Colorless']),
+            color_identity=tuple(getattr(card, 'color_identity', None) or []),
+            card_type=card_type,
+            mana_source=mana_source,
+            land_colors=land_colors,
+            keywords=tuple(keyword for keyword in COMMON_KEYWORDS if keyword.lower() in oracle_text),
+            creature_types=creature_types,
+            interaction=interaction
+        )
+
+
+class DeckStatistics:
+    """
+    Running totals of every deck statistic.
+    
+    Totals are kept per card copy, so adding a card and removing it again
+    leaves them as they were.
+    """
+    
+    def __init__(self):
+        self.quantities: Dict[str, int] = {}  # Copies by UUID
+        self.missing: Dict[str, int] = {}  # Copies of UUIDs not found
+        self.curve = Counter()
+        self.mana_value_total = 0.0
+        self.spell_count = 0
+        self.colors = Counter()
+        self.color_identity = Counter()
+        self.card_types = Counter()
+        self.mana_sources = Counter()
+        self.land_colors = Counter()
+        self.keywords = Counter()
+        self.creature_types = Counter()
+        self.interaction = Counter()
+    
+    def apply(self, uuid: str, facts: Optional[CardFacts], quantity: int):
+        """
+        Add copies of a card (a negative quantity removes them).
+        
+        Args:
+            uuid: Card UUID
+            facts: The card's facts (None if the card wasn't found)
+            quantity: Copies to add
+        """
+        remaining = self.quantities.get(uuid, 0) + quantity
+        if remaining:
+            self.quantities[uuid] = remaining
+        else:
+            self.quantities.pop(uuid, None)
+        if facts is None:
+            self.missing[uuid] = remaining
+            if not remaining:
+                del self.missing[uuid]
+            return
+        
+        if facts.curve_bucket is not None:
+            self.curve[facts.curve_bucket] += quantity
+        if facts.spell_mana_value is not None:
+            self.mana_value_total += facts.spell_mana_value * quantity
+            self.spell_count += quantity
+        for color in facts.colors:
+            self.colors[color] += quantity
+        for color in facts.color_identity:
+            self.color_identity[color] += quantity
+        self.card_types[facts.card_type] += quantity
+        if facts.mana_source:
+            self.mana_sources[facts.mana_source] += quantity
+        for color in facts.land_colors:
+            self.land_colors[color] += quantity
+        for keyword in facts.keywords:
+            self.keywords[keyword] += quantity
+        for creature_type in facts.creature_types:
+            self.creature_types[creature_type] += quantity
+        for kind in facts.interaction:
+            self.interaction[kind] += quantity
+    
+    @staticmethod
+    def _nonzero(counter: Counter) -> Dict:
+        """Counts left after removals, without the ones back at zero."""
+        return {key: count for key, count in counter.items() if count}
+    
+    def mana_curve(self) -> Dict[int, int]:
+        """Nonland cards by mana value (7 means 7+)."""
+        return self._nonzero(self.curve)
+    
+    def average_cmc(self) -> float:
+        """Average mana value of nonland cards."""
+        return self.mana_value_total / self.spell_count if self.spell_count > 0 else 0.0
+    
+    def color_distribution(self) -> Dict[str, int]:
+        """Cards per color (multicolored cards count for each)."""
+        return self._nonzero(self.colors)
+    
+    def color_identity_list(self) -> List[str]:
+        """Sorted colors in the deck's color identity."""
+        return sorted(color for color, count in self.color_identity.items() if count > 0)
+    
+    def card_type_counts(self) -> Dict[str, int]:
+        """Cards per primary card type."""
+        return self._nonzero(self.card_types)
+    
+    def mana_source_summary(self) -> Dict[str, Any]:
+        """Lands, mana rocks and mana dorks, with the colors lands add."""
+        lands = self.mana_sources['lands']
+        mana_rocks = self.mana_sources['mana_rocks']
+        mana_dorks = self.mana_sources['mana_dorks']
+        return {
+            'lands': lands,
+            'mana_rocks': mana_rocks,
+            'mana_dorks': mana_dorks,
+            'total_sources': lands + mana_rocks + mana_dorks,
+            'color_sources': self._nonzero(self.land_colors)
+        }
+    
+    def keyword_counts(self) -> Dict[str, int]:
+        """Cards mentioning each common keyword."""
+        return self._nonzero(self.keywords)
+    
+    def tribal_synergies(self) -> Dict[str, int]:
+        """Creature types shared by at least MIN_TRIBAL_COUNT cards."""
+        return {k: v for k, v in self.creature_types.items() if v >= MIN_TRIBAL_COUNT}
+    
+    def interaction_density(self) -> Dict[str, int]:
+        """Removal, counterspells and board wipes."""
+        removal = self.interaction['removal']
+        counterspells = self.interaction['counterspells']
+        board_wipes = self.interaction['board_wipes']
+        return {
+            'removal': removal,
+            'counterspells': counterspells,
+            'board_wipes': board_wipes,
+            'total_interaction': removal + counterspells + board_wipes
+        }
+
 
 class DeckAnalyzer:
     """
@@ -24,37 +281,145 @@ class DeckAnalyzer:
             repository: MTG repository for card lookups
         """
         self.repository = repository
+        # Cards and their facts by UUID (None for UUIDs not found)
+        self._cards: Dict[str, Any] = {}
+        self._facts: Dict[str, Optional[CardFacts]] = {}
+        # Latest statistics by deck id, brought up to date by diffing quantities
+        self._statistics: Dict[Any, DeckStatistics] = {}
     
-    def analyze_mana_curve(self, deck: Deck) -> Dict[int, int]:
+    def clear_cache(self):
+        """Forget fetched cards (e.g. after the card index is rebuilt)."""
+        self._cards.clear()
+        self._facts.clear()
+        self._statistics.clear()
+    
+    def _fetch(self, uuids: Iterable[str]):
+        """Fetch cards not seen yet, in one batch when the repository can."""
+        missing = [uuid for uuid in dict.fromkeys(uuids) if uuid not in self._facts]
+        if not missing:
+            return
+        batch_lookup = getattr(self.repository, 'get_cards_by_uuids', None)
+        if batch_lookup is not None:
+            found = batch_lookup(missing)
+        else:
+            found = {uuid: self.repository.get_card_by_uuid(uuid) for uuid in missing}
+        for uuid in missing:
+            card = found.get(uuid)
+            self._cards[uuid] = card
+            self._facts[uuid] = CardFacts.from_card(card) if card else None
+    
+    def card_facts(self, uuid: str) -> Optional[CardFacts]:
         """
-        Calculate mana curve distribution.
+        Facts for a card, fetching it the first time.
+        
+        Args:
+            uuid: Card UUID
+        
+        Returns:
+            CardFacts, or None if the card isn't found
+        """
+        self._fetch([uuid])
+        return self._facts[uuid]
+    
+    @staticmethod
+    def _quantities(deck: Deck) -> Dict[str, int]:
+        """Copies of each card in the deck."""
+        quantities = defaultdict(int)
+        for deck_card in deck.cards:
+            quantities[deck_card.uuid] += deck_card.quantity
+        return quantities
+    
+    def build_statistics(self, deck: Deck) -> DeckStatistics:
+        """
+        Fill every statistic in one pass over the deck.
         
         Args:
             deck: Deck to analyze
             
         Returns:
-            Dictionary mapping mana value to card count
+            DeckStatistics
+        """
+        quantities = self._quantities(deck)
+        self._fetch(quantities)
+        statistics = DeckStatistics()
+        for uuid, quantity in quantities.items():
+            statistics.apply(uuid, self._facts[uuid], quantity)
+        return statistics
+    
+    def add_card(self, statistics: DeckStatistics, uuid: str, quantity: int = 1):
         """
-        curve = defaultdict(int)
+        Update statistics for copies of a card added to the deck.
         
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
+        Args:
+            statistics: Statistics to update
+            uuid: Card UUID
+            quantity: Copies added
+        """
+        statistics.apply(uuid, self.card_facts(uuid), quantity)
+    
+    def remove_card(self, statistics: DeckStatistics, uuid: str, quantity: int = 1):
+        """
+        Update statistics for copies of a card removed from the deck.
+        
+        Args:
+            statistics: Statistics to update
+            uuid: Card UUID
+            quantity: Copies removed
+        """
+        statistics.apply(uuid, self.card_facts(uuid), -quantity)
+    
+    def update_statistics(self, statistics: DeckStatistics, deck: Deck) -> DeckStatistics:
+        """
+        Bring statistics up to date with an edited deck.
+        
+        Only cards whose quantity changed are applied, so one edit costs one
+        card's update.
+        
+        Args:
+            statistics: Statistics of an earlier version of the deck
+            deck: The deck now
             
-            # Skip lands from mana curve
-            type_line = (card.type_line if card.type_line else '').lower()
-            if 'land' in type_line:
-                continue
+        Returns:
+            The updated statistics
+        """
+        quantities = self._quantities(deck)
+        changes = {
+            uuid: quantities.get(uuid, 0) - statistics.quantities.get(uuid, 0)
+            for uuid in set(quantities) | set(statistics.quantities)
+        }
+        changes = {uuid: change for uuid, change in changes.items() if change}
+        self._fetch(changes)
+        for uuid, change in changes.items():
+            statistics.apply(uuid, self._facts[uuid], change)
+        return statistics
+    
+    def deck_statistics(self, deck: Deck) -> DeckStatistics:
+        """
+        Statistics for a deck, updated from the last ones for the same deck id.
+        
+        Args:
+            deck: Deck to analyze
             
-            mana_value = (card.mana_value if card.mana_value is not None else 0)
-            if mana_value is not None:
-                cmc = int(mana_value)
-                # Cap at 7+ for display
-                cmc = min(cmc, 7)
-                curve[cmc] += deck_card.quantity
+        Returns:
+            DeckStatistics (kept by the analyzer; don't modify)
+        """
+        statistics = self._statistics.get(deck.id)
+        if statistics is None:
+            statistics = self._statistics[deck.id] = self.build_statistics(deck)
+            return statistics
+        return self.update_statistics(statistics, deck)
+    
+    def analyze_mana_curve(self, deck: Deck) -> Dict[int, int]:
+        """
+        Calculate mana curve distribution.
         
-        return dict(curve)
+        Args:
+            deck: Deck to analyze
+            
+        Returns:
+            Dictionary mapping mana value to card count
+        """
+        return self.build_statistics(deck).mana_curve()
     
     def analyze_color_distribution(self, deck: Deck) -> Dict[str, int]:
         """
@@ -66,21 +431,7 @@ class DeckAnalyzer:
         Returns:
             Dictionary mapping colors to card counts
         """
-        colors = defaultdict(int)
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            card_colors = (card.colors if card.colors else [])
-            if not card_colors:
-                colors['Colorless'] += deck_card.quantity
-            else:
-                for color in card_colors:
-                    colors[color] += deck_card.quantity
-        
-        return dict(colors)
+        return self.build_statistics(deck).color_distribution()
     
     def analyze_color_identity(self, deck: Deck) -> List[str]:
         """
@@ -92,17 +443,7 @@ class DeckAnalyzer:
         Returns:
             List of colors in deck identity
         """
-        identity = set()
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            card_identity = (card.color_identity if card.color_identity else [])
-            identity.update(card_identity)
-        
-        return sorted(list(identity))
+        return self.build_statistics(deck).color_identity_list()
     
     def analyze_card_types(self, deck: Deck) -> Dict[str, int]:
         """
@@ -114,36 +455,7 @@ class DeckAnalyzer:
         Returns:
             Dictionary mapping card types to counts
         """
-        types = defaultdict(int)
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            type_line = (card.type_line if card.type_line else '')
-            
-            # Categorize by primary type
-            if 'Creature' in type_line:
-                types['Creatures'] += deck_card.quantity
-            elif 'Planeswalker' in type_line:
-                types['Planeswalkers'] += deck_card.quantity
-            elif 'Instant' in type_line:
-                types['Instants'] += deck_card.quantity
-            elif 'Sorcery' in type_line:
-                types['Sorceries'] += deck_card.quantity
-            elif 'Enchantment' in type_line:
-                types['Enchantments'] += deck_card.quantity
-            elif 'Artifact' in type_line:
-                types['Artifacts'] += deck_card.quantity
-            elif 'Land' in type_line:
-                types['Lands'] += deck_card.quantity
-            elif 'Battle' in type_line:
-                types['Battles'] += deck_card.quantity
-            else:
-                types['Other'] += deck_card.quantity
-        
-        return dict(types)
+        return self.build_statistics(deck).card_type_counts()
     
     def analyze_mana_sources(self, deck: Deck) -> Dict[str, any]:
         """
@@ -155,53 +467,32 @@ class DeckAnalyzer:
         Returns:
             Dictionary with mana source analysis
         """
-        lands = 0
-        mana_rocks = 0
-        mana_dorks = 0
-        mana_colors = defaultdict(int)
+        return self.build_statistics(deck).mana_source_summary()
+    
+    def analyze_mana_consistency(self, deck: Deck, on_play: bool = True) -> Dict[str, any]:
+        """
+        Exact opening-hand, land-drop, color-source and mulligan probabilities.
         
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            # Check both type_line and types
-            type_line = (card.type_line if hasattr(card, 'type_line') and card.type_line else '')
-            types = (card.types if hasattr(card, 'types') and card.types else [])
-            oracle_text = (card.oracle_text if hasattr(card, 'oracle_text') and card.oracle_text else '').lower()
-            
-            # Check if it's a land (in type_line or types list)
-            # Handle types being either list or string
-            is_land = False
-            if 'Land' in type_line:
-                is_land = True
-            elif types:
-                if isinstance(types, list):
-                    is_land = 'Land' in types or any('land' in str(t).lower() for t in types)
-                elif isinstance(types, str):
-                    is_land = 'land' in types.lower()
-            
-            if is_land:
-                lands += deck_card.quantity
-                # Try to determine what colors it produces
-                if 'add' in oracle_text:
-                    for color in ['W', 'U', 'B', 'R', 'G']:
-                        if f'{{{color}}}' in (card.oracle_text if card.oracle_text else ''):
-                            mana_colors[color] += deck_card.quantity
-            
-            elif 'Artifact' in type_line and ('add' in oracle_text or 'mana' in oracle_text):
-                mana_rocks += deck_card.quantity
+        Args:
+            deck: Deck to analyze
+            on_play: Whether color sources and on-curve plays are counted on the play
             
-            elif 'Creature' in type_line and ('add' in oracle_text or 'mana' in oracle_text):
-                mana_dorks += deck_card.quantity
+        Returns:
+            Consistency report in percent (see deck_probability.consistency_report)
+        """
+        return self._mana_consistency(self.build_statistics(deck), on_play)
+    
+    def _mana_consistency(self, statistics: DeckStatistics, on_play: bool = True) -> Dict[str, any]:
+        """Consistency report for a deck's statistics, from the cards already fetched."""
+        from app.utils.hand_simulator import HandSimulator, ResolvedDeck
+        from app.utils.deck_probability import DeckComposition, consistency_report
         
-        return {
-            'lands': lands,
-            'mana_rocks': mana_rocks,
-            'mana_dorks': mana_dorks,
-            'total_sources': lands + mana_rocks + mana_dorks,
-            'color_sources': dict(mana_colors)
-        }
+        resolved = ResolvedDeck()
+        for uuid, quantity in statistics.quantities.items():
+            resolved.add(self._cards.get(uuid), quantity)
+        return consistency_report(
+            DeckComposition.from_resolved(resolved), HandSimulator(self.repository).keep_rule(), on_play
+        )
     
     def analyze_keywords(self, deck: Deck) -> Dict[str, int]:
         """
@@ -213,30 +504,7 @@ class DeckAnalyzer:
         Returns:
             Dictionary mapping keywords to counts
         """
-        keywords = defaultdict(int)
-        
-        common_keywords = [
-            'Flying', 'First Strike', 'Double Strike', 'Deathtouch', 'Hexproof',
-            'Indestructible', 'Lifelink', 'Menace', 'Reach', 'Trample', 'Vigilance',
-            'Haste', 'Defender', 'Flash', 'Ward', 'Protection', 'Shroud',
-            'Landfall', 'Proliferate', 'Cascade', 'Storm', 'Affinity', 'Convoke',
-            'Delve', 'Emerge', 'Exploit', 'Flashback', 'Kicker', 'Madness',
-            'Miracle', 'Overload', 'Rebound', 'Retrace', 'Suspend', 'Mutate'
-        ]
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            oracle_text = (card.oracle_text if card.oracle_text else '')
-            
-            # Scan oracle text for common keywords
-            for keyword in common_keywords:
-                if keyword.lower() in oracle_text.lower():
-                    keywords[keyword] += deck_card.quantity
-        
-        return dict(keywords)
+        return self.build_statistics(deck).keyword_counts()
     
     def calculate_average_cmc(self, deck: Deck) -> float:
         """
@@ -248,24 +516,7 @@ class DeckAnalyzer:
         Returns:
             Average CMC
         """
-        total_cmc = 0
-        total_nonland = 0
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            type_line = (card.type_line if card.type_line else '')
-            if 'Land' in type_line:
-                continue
-            
-            mana_value = (card.mana_value if card.mana_value is not None else 0)
-            if mana_value is not None:
-                total_cmc += mana_value * deck_card.quantity
-                total_nonland += deck_card.quantity
-        
-        return total_cmc / total_nonland if total_nonland > 0 else 0.0
+        return self.build_statistics(deck).average_cmc()
     
     def find_tribal_synergies(self, deck: Deck) -> Dict[str, int]:
         """
@@ -277,29 +528,7 @@ class DeckAnalyzer:
         Returns:
             Dictionary mapping creature types to counts
         """
-        creature_types = defaultdict(int)
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            type_line = (card.type_line if card.type_line else '')
-            if 'Creature' not in type_line:
-                continue
-            
-            # Extract creature types (everything after '—')
-            if '—' in type_line:
-                types_part = type_line.split('—')[1].strip()
-                types = types_part.split()
-                
-                for creature_type in types:
-                    # Skip non-creature type words
-                    if creature_type.lower() not in ['token', 'creature']:
-                        creature_types[creature_type] += deck_card.quantity
-        
-        # Only return types that appear multiple times (synergy potential)
-        return {k: v for k, v in creature_types.items() if v >= 3}
+        return self.build_statistics(deck).tribal_synergies()
     
     def analyze_interaction_density(self, deck: Deck) -> Dict[str, int]:
         """
@@ -311,59 +540,32 @@ class DeckAnalyzer:
         Returns:
             Dictionary with interaction counts
         """
-        removal = 0
-        counterspells = 0
-        board_wipes = 0
-        
-        removal_keywords = ['destroy', 'exile', 'damage', 'fight', '-x/-x']
-        counter_keywords = ['counter target']
-        wipe_keywords = ['destroy all', 'exile all', 'damage to each']
-        
-        for deck_card in deck.cards:
-            card = self.repository.get_card_by_uuid(deck_card.uuid)
-            if not card:
-                continue
-            
-            oracle_text = (card.oracle_text if card.oracle_text else '').lower()
-            
-            # Count removal
-            if any(keyword in oracle_text for keyword in removal_keywords):
-                removal += deck_card.quantity
-            
-            # Count counterspells
-            if any(keyword in oracle_text for keyword in counter_keywords):
-                counterspells += deck_card.quantity
-            
-            # Count board wipes
-            if any(keyword in oracle_text for keyword in wipe_keywords):
-                board_wipes += deck_card.quantity
-        
-        return {
-            'removal': removal,
-            'counterspells': counterspells,
-            'board_wipes': board_wipes,
-            'total_interaction': removal + counterspells + board_wipes
-        }
+        return self.build_statistics(deck).interaction_density()
     
     def get_comprehensive_analysis(self, deck: Deck) -> Dict[str, any]:
         """
         Get complete deck analysis.
         
+        Cards are fetched once and every statistic comes from one pass; for a
+        deck analyzed before (same id), only edited cards are applied.
+        
         Args:
             deck: Deck to analyze
             
         Returns:
             Comprehensive analysis dictionary
         """
+        statistics = self.deck_statistics(deck)
         return {
             'total_cards': deck.total_cards(),
-            'mana_curve': self.analyze_mana_curve(deck),
-            'average_cmc': round(self.calculate_average_cmc(deck), 2),
-            'color_distribution': self.analyze_color_distribution(deck),
-            'color_identity': self.analyze_color_identity(deck),
-            'card_types': self.analyze_card_types(deck),
-            'mana_sources': self.analyze_mana_sources(deck),
-            'keywords': self.analyze_keywords(deck),
-            'tribal_synergies': self.find_tribal_synergies(deck),
-            'interaction': self.analyze_interaction_density(deck)
+            'mana_curve': statistics.mana_curve(),
+            'average_cmc': round(statistics.average_cmc(), 2),
+            'color_distribution': statistics.color_distribution(),
+            'color_identity': statistics.color_identity_list(),
+            'card_types': statistics.card_type_counts(),
+            'mana_sources': statistics.mana_source_summary(),
+            'mana_consistency': self._mana_consistency(statistics),
+            'keywords': statistics.keyword_counts(),
+            'tribal_synergies': statistics.tribal_synergies(),
+            'interaction': statistics.interaction_density()
         }
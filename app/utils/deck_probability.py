@@ -0,0 +1,376 @@
+"""
+Exact deck consistency probabilities.
+
+Answers the questions HandSimulator estimates by sampling - how many lands
+the opening hand holds, whether the Nth land drop arrives on turn N, when a
+color source shows up, whether there is an on-curve play, and how often a
+London mulligan keeps - with exact multivariate hypergeometric counts.
+
+A deck is reduced to a hashable DeckComposition (lands by the colors they
+produce, spells by mana value, unknown cards). Each question splits it into a
+few categories and sums the ways of drawing every count of each category,
+built up one category at a time (_draw_counts). Results are memoized by
+composition, so re-asking after an edit that didn't change the composition
+(or asking again for the same deck) costs a dictionary lookup.
+
+Classes:
+    DeckComposition: Card category counts for a deck
+
+Functions:
+    cards_seen: Cards seen by a turn
+    land_distribution: Distribution of lands among drawn cards
+    land_drop_probability: Chance of having N lands by turn N
+    color_source_probability: Chance of a source of every given color by a turn
+    on_curve_probability: Chance of a land drop and a spell costing exactly the turn
+    mulligan_keep_rates: London mulligan keep rates under a keep rule
+    consistency_report: All of the above for a deck, in percent
+
+Usage:
+    composition = DeckComposition.from_resolved(simulator.resolve_deck(deck_cards))
+    report = consistency_report(composition, simulator.keep_rule())
+"""
+
+import copy
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+from typing import Any, Dict, FrozenSet, Tuple
+
+from app.utils.hand_simulator import (
+    COLORS, EARLY_MANA_VALUE, MAX_EARLY_PLAYS, OPENING_HAND_SIZE, ResolvedDeck
+)
+
+logger = logging.getLogger(__name__)
+
+# Turns covered by consistency_report
+REPORT_TURNS = 4
+# Keepable hand shapes: (cards in hand, lands, early plays capped at MAX_EARLY_PLAYS)
+KeepRule = FrozenSet[Tuple[int, int, int]]
+
+
+@dataclass(frozen=True)
+class DeckComposition:
+    """
+    Card category counts for a deck, hashable so results can be memoized.
+
+    Cards the repository couldn't find are counted in deck_size only: they
+    take up draws but are neither lands nor spells.
+    """
+    deck_size: int = 0
+    land_colors: Tuple[Tuple[int, int], ...] = ()  # (color bitmask, count), sorted
+    spells_by_cost: Tuple[Tuple[int, int], ...] = ()  # (mana value, count), sorted
+
+    @classmethod
+    def from_resolved(cls, deck: ResolvedDeck) -> 'DeckComposition':
+        """
+        Count the categories of a resolved deck.
+
+        Args:
+            deck: Deck resolved by HandSimulator.resolve_deck
+
+        Returns:
+            DeckComposition
+        """
+        land_colors: Dict[int, int] = {}
+        spells_by_cost: Dict[int, int] = {}
+        for is_land, mana_value, colors, found in zip(
+                deck.is_land, deck.mana_value, deck.land_colors, deck.found):
+            if is_land:
+                land_colors[colors] = land_colors.get(colors, 0) + 1
+            elif found:
+                cost = int(mana_value)
+                spells_by_cost[cost] = spells_by_cost.get(cost, 0) + 1
+        return cls(len(deck), tuple(sorted(land_colors.items())),
+                   tuple(sorted(spells_by_cost.items())))
+
+    @property
+    def lands(self) -> int:
+        """Number of lands."""
+        return sum(count for _, count in self.land_colors)
+
+    @property
+    def spells(self) -> int:
+        """Number of nonland cards."""
+        return sum(count for _, count in self.spells_by_cost)
+
+    @property
+    def unknown(self) -> int:
+        """Number of cards that couldn't be looked up."""
+        return self.deck_size - self.lands - self.spells
+
+    def spells_costing(self, low: float, high: float) -> int:
+        """Number of spells with mana value between low and high inclusive."""
+        return sum(count for cost, count in self.spells_by_cost if low <= cost <= high)
+
+    def color_sources(self, colors: int) -> int:
+        """Number of lands producing any of the colors in a bitmask."""
+        return sum(count for mask, count in self.land_colors if mask & colors)
+
+
+@lru_cache(maxsize=4096)
+def _draw_counts(counts: Tuple[int, ...], draws: int) -> Dict[Tuple[int, ...], float]:
+    """
+    Distribution of how many cards of each category a random draw contains.
+
+    Adds one category at a time: after each step, ways[drawn] is the number
+    of ways to draw exactly those counts from the categories so far, keeping
+    only partial draws the remaining categories can still complete.
+
+    Args:
+        counts: Cards per category
+        draws: Cards drawn (capped at the deck size)
+
+    Returns:
+        Probability of each tuple of per-category counts
+    """
+    total = sum(counts)
+    draws = min(draws, total)
+    ways = {(): 1}
+    remaining = total
+    for count in counts:
+        remaining -= count
+        next_ways = {}
+        for drawn, way_count in ways.items():
+            taken = sum(drawn)
+            for k in range(max(0, draws - taken - remaining), min(count, draws - taken) + 1):
+                next_ways[drawn + (k,)] = way_count * comb(count, k)
+        ways = next_ways
+    hands = comb(total, draws)
+    return {drawn: way_count / hands for drawn, way_count in ways.items()}
+
+
+def _at_least(successes: int, population: int, draws: int, needed: int) -> float:
+    """Chance that a draw contains at least `needed` of `successes` cards."""
+    return sum(p for (hits, _), p in _draw_counts(
+        (successes, population - successes), draws).items() if hits >= needed)
+
+
+def cards_seen(turn: int, on_play: bool = True) -> int:
+    """
+    Cards seen by a turn: the opening hand plus one draw per turn, skipping
+    the first draw on the play.
+
+    Args:
+        turn: Turn number, starting at 1
+        on_play: Whether on the play (True) or draw (False)
+
+    Returns:
+        Number of cards seen
+    """
+    return OPENING_HAND_SIZE + turn - (1 if on_play else 0)
+
+
+def land_distribution(composition: DeckComposition,
+                      cards: int = OPENING_HAND_SIZE) -> Dict[int, float]:
+    """
+    Distribution of lands among the first cards drawn.
+
+    Args:
+        composition: Deck composition
+        cards: Cards drawn
+
+    Returns:
+        Dictionary mapping land count to probability
+    """
+    lands = composition.lands
+    return {
+        hits: p
+        for (hits, _), p in _draw_counts((lands, composition.deck_size - lands), cards).items()
+    }
+
+
+def land_drop_probability(composition: DeckComposition, turn: int,
+                          on_play: bool = True) -> float:
+    """
+    Chance of having drawn at least `turn` lands by that turn.
+
+    Args:
+        composition: Deck composition
+        turn: Turn number
+        on_play: Whether on the play or draw
+
+    Returns:
+        Probability
+    """
+    return _at_least(composition.lands, composition.deck_size,
+                     cards_seen(turn, on_play), turn)
+
+
+def color_source_probability(composition: DeckComposition, colors: str, turn: int,
+                             on_play: bool = True) -> float:
+    """
+    Chance of having drawn a land producing each of the given colors by a turn.
+
+    One land may cover several colors, so the chance of missing some color
+    is counted by inclusion-exclusion over the sets of missing colors.
+
+    Args:
+        composition: Deck composition
+        colors: Color letters, e.g. 'U' or 'WU'
+        turn: Turn number
+        on_play: Whether on the play or draw
+
+    Returns:
+        Probability
+    """
+    bits = [1 << COLORS.index(color) for color in dict.fromkeys(colors)]
+    deck_size = composition.deck_size
+    seen = min(cards_seen(turn, on_play), deck_size)
+    hands = comb(deck_size, seen)
+    if hands == 0:
+        return 0.0
+
+    ways = 0
+    for subset in range(1 << len(bits)):
+        missing = 0
+        for index, bit in enumerate(bits):
+            if subset >> index & 1:
+                missing |= bit
+        sign = -1 if bin(subset).count('1') % 2 else 1
+        ways += sign * comb(deck_size - composition.color_sources(missing), seen)
+    return ways / hands
+
+
+def on_curve_probability(composition: DeckComposition, turn: int,
+                         on_play: bool = True) -> float:
+    """
+    Chance of having `turn` lands and a spell costing exactly `turn` by that turn.
+
+    Args:
+        composition: Deck composition
+        turn: Turn number
+        on_play: Whether on the play or draw
+
+    Returns:
+        Probability
+    """
+    lands = composition.lands
+    on_curve = composition.spells_costing(turn, turn)
+    rest = composition.deck_size - lands - on_curve
+    return sum(
+        p for (land_hits, spell_hits, _), p in _draw_counts(
+            (lands, on_curve, rest), cards_seen(turn, on_play)).items()
+        if land_hits >= turn and spell_hits >= 1
+    )
+
+
+def _keepable(keep_rule: KeepRule, lands: int, early: int, other: int,
+              unknown: int, bottom: int) -> bool:
+    """Whether some choice of `bottom` cards to put back leaves a keepable hand."""
+    for bottom_unknown in range(min(unknown, bottom) + 1):
+        for bottom_lands in range(min(lands, bottom - bottom_unknown) + 1):
+            left = bottom - bottom_unknown - bottom_lands
+            for bottom_early in range(min(early, left) + 1):
+                bottom_other = left - bottom_early
+                if bottom_other > other:
+                    continue
+                kept_lands = lands - bottom_lands
+                kept_early = early - bottom_early
+                size = kept_lands + kept_early + other - bottom_other
+                if (size, kept_lands, min(kept_early, MAX_EARLY_PLAYS)) in keep_rule:
+                    return True
+    return False
+
+
+def mulligan_keep_rates(composition: DeckComposition, keep_rule: KeepRule) -> Dict[str, Any]:
+    """
+    London mulligan: draw seven, and after each mulligan put one more card on
+    the bottom, keeping the first hand that some choice of bottomed cards
+    makes keepable.
+
+    Args:
+        composition: Deck composition
+        keep_rule: Keepable hand shapes (see HandSimulator.keep_rule)
+
+    Returns:
+        Keep chance at each hand size ('keep_rates'), chance of ending on
+        each hand size ('kept_at'; the last hand is always kept) and the
+        average kept hand size
+    """
+    early = composition.spells_costing(0, EARLY_MANA_VALUE)
+    other = composition.spells - early
+    draws = _draw_counts((composition.lands, early, other, composition.unknown),
+                         OPENING_HAND_SIZE)
+
+    keep_rates: Dict[int, float] = {}
+    kept_at: Dict[int, float] = {}
+    still_drawing = 1.0
+    for bottom in range(OPENING_HAND_SIZE):
+        hand_size = OPENING_HAND_SIZE - bottom
+        rate = sum(p for drawn, p in draws.items() if _keepable(keep_rule, *drawn, bottom))
+        keep_rates[hand_size] = rate
+        kept = still_drawing if hand_size == 1 else still_drawing * rate
+        kept_at[hand_size] = kept
+        still_drawing -= kept
+    return {
+        'keep_rates': keep_rates,
+        'kept_at': kept_at,
+        'average_hand_size': sum(size * p for size, p in kept_at.items()),
+    }
+
+
+def _percent(probability: float) -> float:
+    """Probability as a percentage rounded like HandSimulator's statistics."""
+    return round(float(probability) * 100, 1)
+
+
+@lru_cache(maxsize=256)
+def _consistency_report(composition: DeckComposition, keep_rule: KeepRule,
+                        on_play: bool, turns: int) -> Dict[str, Any]:
+    opening = land_distribution(composition)
+    mulligan = mulligan_keep_rates(composition, keep_rule)
+    produced = 0
+    for mask, _ in composition.land_colors:
+        produced |= mask
+    turn_numbers = range(1, turns + 1)
+    return {
+        'deck_size': composition.deck_size,
+        'lands': composition.lands,
+        'opening_lands': {lands: _percent(p) for lands, p in opening.items()},
+        'two_to_four_lands': _percent(sum(p for lands, p in opening.items() if 2 <= lands <= 4)),
+        'land_drops': [
+            {
+                'turn': turn,
+                'on_play': _percent(land_drop_probability(composition, turn, True)),
+                'on_draw': _percent(land_drop_probability(composition, turn, False)),
+            }
+            for turn in turn_numbers
+        ],
+        'color_sources': {
+            color: [_percent(color_source_probability(composition, color, turn, on_play))
+                    for turn in turn_numbers]
+            for bit, color in enumerate(COLORS) if produced >> bit & 1
+        },
+        'on_curve': [_percent(on_curve_probability(composition, turn, on_play))
+                     for turn in turn_numbers],
+        'keep_rate': _percent(mulligan['keep_rates'][OPENING_HAND_SIZE]),
+        'mulligan': {
+            'keep_rates': {size: _percent(p) for size, p in mulligan['keep_rates'].items()},
+            'kept_at': {size: _percent(p) for size, p in mulligan['kept_at'].items() if p > 0},
+            'average_hand_size': round(mulligan['average_hand_size'], 2),
+        },
+    }
+
+
+def consistency_report(composition: DeckComposition, keep_rule: KeepRule,
+                       on_play: bool = True, turns: int = REPORT_TURNS) -> Dict[str, Any]:
+    """
+    Exact consistency figures for a deck, in percent.
+
+    Memoized by (composition, keep rule, on_play, turns); each call returns
+    its own copy.
+
+    Args:
+        composition: Deck composition
+        keep_rule: Keepable hand shapes (see HandSimulator.keep_rule)
+        on_play: Whether color sources and on-curve plays are counted on the play
+        turns: Turns to report land drops, color sources and on-curve plays for
+
+    Returns:
+        Dictionary with the opening land distribution, the 2-4 land chance,
+        land drops by turn on the play and draw, color sources by turn,
+        on-curve plays by turn, the seven-card keep rate and the London
+        mulligan breakdown
+    """
+    return copy.deepcopy(_consistency_report(composition, keep_rule, on_play, turns))
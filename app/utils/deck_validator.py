@@ -1,7 +1,9 @@
 """
 Deck validation system for MTG Deck Builder.
 
-Validates decks against format rules and provides detailed warnings.
+Validates decks against format rules and provides detailed warnings. The
+format rules are the legality checker's; with a legality index, banned,
+restricted and not legal cards are reported from the card index as well.
 """
 
 import logging
@@ -9,8 +11,16 @@ from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from app.utils.legality_checker import (
+    BASIC_LANDS, FORMAT_RULES, UNLIMITED_CARDS, DeckLegalityChecker, FormatRules, LegalityIndex,
+    format_from_name, format_name
+)
+
 logger = logging.getLogger(__name__)
 
+# Legality checker violations reported by the validator
+CARD_LEGALITY_VIOLATIONS = ('banned', 'restricted', 'not_legal')
+
 
 class ValidationSeverity(Enum):
     """Validation message severity levels."""
@@ -28,103 +38,53 @@ class ValidationMessage:
     suggestion: Optional[str] = None
 
 
+def _validation_rules(rules: FormatRules) -> dict:
+    """Format rules as the validator's rule dictionary."""
+    entry = {
+        'min_deck_size': rules.min_deck_size,
+        'max_deck_size': rules.max_deck_size,
+        'max_copies': rules.max_copies,
+        'max_sideboard': rules.max_sideboard,
+        'basic_land_exception': True
+    }
+    if rules.restricted_list:
+        entry['restricted_list'] = True  # Some cards limited to 1 copy
+    if rules.commander_required:
+        entry['commander_required'] = True
+    if rules.max_copies == 1:
+        entry['singleton'] = True
+    if rules.commons_only:
+        entry['commons_only'] = True
+    return entry
+
+
 class DeckValidator:
     """
     Validates MTG decks against format rules.
     """
     
-    # Format rules
+    # Format rules by display name, from the legality checker's rules
     FORMAT_RULES = {
-        'Standard': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        },
-        'Pioneer': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        },
-        'Modern': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        },
-        'Legacy': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        },
-        'Vintage': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True,
-            'restricted_list': True  # Some cards limited to 1 copy
-        },
-        'Commander': {
-            'min_deck_size': 100,
-            'max_deck_size': 100,
-            'max_copies': 1,
-            'max_sideboard': 0,
-            'basic_land_exception': True,
-            'commander_required': True,
-            'singleton': True
-        },
-        'Pauper': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True,
-            'commons_only': True
-        },
-        'Historic': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        },
-        'Alchemy': {
-            'min_deck_size': 60,
-            'max_deck_size': None,
-            'max_copies': 4,
-            'max_sideboard': 15,
-            'basic_land_exception': True
-        }
+        format_name(deck_format): _validation_rules(rules)
+        for deck_format, rules in FORMAT_RULES.items()
     }
     
     # Basic land names
-    BASIC_LANDS = {
-        'Plains', 'Island', 'Swamp', 'Mountain', 'Forest',
-        'Wastes', 'Snow-Covered Plains', 'Snow-Covered Island',
-        'Snow-Covered Swamp', 'Snow-Covered Mountain', 'Snow-Covered Forest'
-    }
+    BASIC_LANDS = BASIC_LANDS
     
     # Special cards with unlimited copies
-    UNLIMITED_CARDS = {
-        'Relentless Rats', 'Rat Colony', 'Persistent Petitioners',
-        'Dragon\'s Approach', 'Shadowborn Apostle', 'Seven Dwarves'
-    }
+    UNLIMITED_CARDS = UNLIMITED_CARDS
     
-    def __init__(self, database=None):
+    def __init__(self, database=None, legality_index: Optional[LegalityIndex] = None):
         """
         Initialize deck validator.
         
         Args:
             database: Optional database instance for legality checks
+            legality_index: Optional card legality from the card index
         """
         self.database = database
+        self.legality_checker = DeckLegalityChecker(legality_index)
     
     def validate_deck(
         self,
@@ -173,6 +133,9 @@ class DeckValidator:
         if rules.get('commons_only') and self.database:
             messages.extend(self._validate_commons_only(deck_cards))
         
+        if self.legality_checker.legality_index is not None:
+            messages.extend(self._validate_card_legality(deck_cards, sideboard_cards, format_name, commander))
+        
         # Check for empty deck
         if total_cards == 0:
             messages.append(ValidationMessage(
@@ -295,6 +258,35 @@ class DeckValidator:
         
         return messages
     
+    def _validate_card_legality(
+        self,
+        deck_cards: dict[str, int],
+        sideboard_cards: dict[str, int],
+        format_name: str,
+        commander: Optional[str]
+    ) -> list[ValidationMessage]:
+        """Validate banned, restricted and not legal cards against the legality index."""
+        deck_format = format_from_name(format_name)
+        if deck_format is None:
+            return []
+        
+        deck_data = {
+            'mainboard': [{'name': name, 'quantity': count} for name, count in deck_cards.items()],
+            'sideboard': [{'name': name, 'quantity': count} for name, count in sideboard_cards.items()],
+            'commander': commander
+        }
+        result = self.legality_checker.check_deck(deck_data, deck_format)
+        return [
+            ValidationMessage(
+                ValidationSeverity.ERROR,
+                violation.message,
+                card_name=violation.card_name,
+                suggestion=violation.suggestion
+            )
+            for violation in result.violations
+            if violation.violation_type in CARD_LEGALITY_VIOLATIONS
+        ]
+    
     def _validate_commons_only(
         self,
         deck_cards: dict[str, int]
@@ -1,15 +1,88 @@
 """
 Opening hand simulator and mulligan analyzer.
 Simulates opening hands and helps with mulligan decisions.
+
+Deck-wide statistics (run_simulation, goldfish_simulation) resolve the deck
+once into per-card arrays (land flag, mana value, land colors) and play
+100k+ trials in batches: each batch draws the first cards of a random
+permutation per trial and scores every hand at once with NumPy, using
+keep/mulligan lookup tables built from the same rules analyze_hand uses.
+Trials can be fanned out to worker processes. exact_probabilities answers the
+opening-hand, land-drop, color and mulligan questions exactly instead.
 """
 
 import logging
 import random
-from typing import List, Dict, Tuple, Optional
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, List, Dict, Tuple, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TRIALS = 100_000
+# Trials drawn and scored together (bounds memory at ~BATCH_SIZE x deck size)
+BATCH_SIZE = 25_000
+OPENING_HAND_SIZE = 7
+COLORS = ('W', 'U', 'B', 'R', 'G')
+QUALITIES = ('excellent', 'good', 'average', 'poor', 'unkeepable')
+# Spells at or below this mana value count as playable early
+EARLY_MANA_VALUE = 2
+# Early plays beyond this many never change a hand's quality
+MAX_EARLY_PLAYS = 2
+
+
+def _card_value(card: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a card dictionary or Card object."""
+    value = card.get(name) if isinstance(card, dict) else getattr(card, name, None)
+    return default if value is None else value
+
+
+@dataclass
+class ResolvedDeck:
+    """
+    A deck list resolved once into per-card arrays (one entry per copy).
+    
+    Cards the repository can't find stay in the deck (they still take up a
+    draw) but are neither lands nor spells.
+    """
+    names: List[str] = field(default_factory=list)
+    is_land: List[bool] = field(default_factory=list)
+    mana_value: List[float] = field(default_factory=list)
+    land_colors: List[int] = field(default_factory=list)  # Bit i set: produces COLORS[i]
+    found: List[bool] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def add(self, card: Any, quantity: int):
+        """
+        Add copies of a card.
+        
+        Args:
+            card: Card dictionary or Card object (None if not found)
+            quantity: Number of copies
+        """
+        if card is None:
+            entry = ("", False, 0.0, 0, False)
+        else:
+            is_land = 'Land' in _card_value(card, 'type_line', '')
+            oracle_text = _card_value(card, 'oracle_text', '')
+            colors = 0
+            if is_land:
+                for bit, color in enumerate(COLORS):
+                    if f'{{{color}}}' in oracle_text:
+                        colors |= 1 << bit
+            entry = (_card_value(card, 'name', ''), is_land,
+                     float(_card_value(card, 'mana_value', 0)), colors, True)
+        for _ in range(quantity):
+            self.names.append(entry[0])
+            self.is_land.append(entry[1])
+            self.mana_value.append(entry[2])
+            self.land_colors.append(entry[3])
+            self.found.append(entry[4])
+
 
 class HandSimulator:
     """
@@ -25,6 +98,21 @@ class HandSimulator:
         """
         self.repository = repository
     
+    def resolve_deck(self, deck_cards: List[Tuple[str, int]]) -> ResolvedDeck:
+        """
+        Look every card up once and build the deck's per-card arrays.
+        
+        Args:
+            deck_cards: List of (uuid, quantity) tuples
+        
+        Returns:
+            ResolvedDeck
+        """
+        deck = ResolvedDeck()
+        for uuid, quantity in deck_cards:
+            deck.add(self.repository.get_card_by_uuid(uuid), quantity)
+        return deck
+    
     def simulate_opening_hand(
         self, 
         deck_cards: List[Tuple[str, int]], 
@@ -193,8 +281,10 @@ class HandSimulator:
     def run_simulation(
         self,
         deck_cards: List[Tuple[str, int]],
-        num_trials: int = 100,
-        on_play: bool = True
+        num_trials: int = DEFAULT_TRIALS,
+        on_play: bool = True,
+        workers: int = 1,
+        seed: Optional[int] = None
     ) -> Dict[str, any]:
         """
         Run multiple hand simulations to analyze deck consistency.
@@ -203,42 +293,107 @@ class HandSimulator:
             deck_cards: List of (uuid, quantity) tuples
             num_trials: Number of hands to simulate
             on_play: Whether on play or draw
-            
+            workers: Worker processes to split the trials across
+            seed: Seed for reproducible results
+        
         Returns:
             Simulation statistics
         """
-        quality_counts = Counter()
-        land_counts = Counter()
-        avg_cmcs = []
-        mulligan_count = 0
-        
-        for _ in range(num_trials):
-            hand = self.simulate_opening_hand(deck_cards, hand_size=7, on_play=on_play)
-            analysis = self.analyze_hand(hand)
-            
-            quality_counts[analysis['quality']] += 1
-            land_counts[analysis['lands']] += 1
-            avg_cmcs.append(analysis['avg_cmc'])
-            
-            if 'Mulligan' in analysis['recommendation']:
-                mulligan_count += 1
+        deck = self.resolve_deck(deck_cards)
+        quality_table, mulligan_table = self._hand_tables()
+        totals = _fan_out(
+            _simulate_hands, num_trials, workers, seed,
+            deck, quality_table, mulligan_table
+        )
         
         # Calculate statistics
-        keepable_rate = (num_trials - mulligan_count) / num_trials * 100
+        land_counts = {lands: count for lands, count in enumerate(totals['lands']) if count}
+        keepable_rate = (num_trials - totals['mulligans']) / num_trials * 100
         avg_lands = sum(count * lands for lands, count in land_counts.items()) / num_trials
-        avg_hand_cmc = sum(avg_cmcs) / len(avg_cmcs) if avg_cmcs else 0
         
         return {
             'trials': num_trials,
             'keepable_rate': round(keepable_rate, 1),
             'mulligan_rate': round(100 - keepable_rate, 1),
-            'quality_distribution': dict(quality_counts),
-            'land_distribution': dict(land_counts),
+            'quality_distribution': {
+                quality: count for quality, count in zip(QUALITIES, totals['quality']) if count
+            },
+            'land_distribution': land_counts,
             'avg_lands_in_hand': round(avg_lands, 2),
-            'avg_hand_cmc': round(avg_hand_cmc, 2),
-            'most_common_lands': land_counts.most_common(1)[0][0] if land_counts else 0
+            'avg_hand_cmc': round(totals['cmc'] / num_trials, 2),
+            'most_common_lands': max(land_counts, key=land_counts.get) if land_counts else 0,
+            'color_availability': {
+                color: round(count / num_trials * 100, 1)
+                for color, count in zip(COLORS, totals['colors'])
+            }
         }
     
+    def _hand_tables(self) -> Tuple[List[List[List[int]]], List[List[bool]]]:
+        """
+        Tabulate hand quality and the mulligan decision for every hand shape.
+        
+        Returns:
+            (quality index by [hand size][lands][early plays, capped],
+             mulligan flag by [hand size][quality index])
+        """
+        quality_table = [
+            [
+                [
+                    QUALITIES.index(self._evaluate_hand_quality(
+                        lands=lands, spells=hand_size - lands, hand_size=hand_size,
+                        avg_cmc=0, playable_early=early
+                    ))
+                    for early in range(MAX_EARLY_PLAYS + 1)
+                ]
+                for lands in range(OPENING_HAND_SIZE + 1)
+            ]
+            for hand_size in range(OPENING_HAND_SIZE + 1)
+        ]
+        mulligan_table = [
+            ['Mulligan' in self._get_mulligan_recommendation(quality, hand_size)
+             for quality in QUALITIES]
+            for hand_size in range(OPENING_HAND_SIZE + 1)
+        ]
+        return quality_table, mulligan_table
+    
+    def keep_rule(self) -> FrozenSet[Tuple[int, int, int]]:
+        """
+        Hand shapes analyze_hand recommends keeping.
+        
+        Returns:
+            Frozen set of (cards in hand, lands, early plays capped at MAX_EARLY_PLAYS)
+        """
+        quality_table, mulligan_table = self._hand_tables()
+        return frozenset(
+            (hand_size, lands, early)
+            for hand_size in range(OPENING_HAND_SIZE + 1)
+            for lands in range(hand_size + 1)
+            for early in range(MAX_EARLY_PLAYS + 1)
+            if not mulligan_table[hand_size][quality_table[hand_size][lands][early]]
+        )
+    
+    def exact_probabilities(
+        self,
+        deck_cards: List[Tuple[str, int]],
+        on_play: bool = True,
+        turns: int = 4
+    ) -> Dict[str, any]:
+        """
+        Exact consistency figures, without sampling (see deck_probability).
+        
+        Args:
+            deck_cards: List of (uuid, quantity) tuples
+            on_play: Whether on play or draw
+            turns: Turns to report land drops, color sources and on-curve plays for
+        
+        Returns:
+            Consistency report in percent
+        """
+        from app.utils.deck_probability import DeckComposition, consistency_report
+        
+        composition = DeckComposition.from_resolved(self.resolve_deck(deck_cards))
+        return consistency_report(composition, self.keep_rule(), on_play, turns)
+    
     def compare_mulligan_scenarios(
         self,
         deck_cards: List[Tuple[str, int]],
@@ -304,68 +459,336 @@ class HandSimulator:
         Args:
             deck_cards: Deck card list
             turns: Number of turns to simulate
-            
+        
         Returns:
             Goldfish results
         """
-        # Build deck
-        deck = []
-        for uuid, quantity in deck_cards:
-            deck.extend([uuid] * quantity)
-        random.shuffle(deck)
+        deck = self.resolve_deck(deck_cards)
+        order = list(range(len(deck)))
+        random.shuffle(order)
         
-        # Draw opening hand
-        hand = [self.repository.get_card_by_uuid(uuid) for uuid in deck[:7]]
-        hand = [c for c in hand if c]  # Filter None
-        deck = deck[7:]
-        
-        # Track game state
-        lands_played = 0
-        cards_played = []
-        turn_by_turn = []
-        
-        for turn in range(1, turns + 1):
-            # Draw card (skip turn 1 on play)
-            if turn > 1 and deck:
-                drawn_uuid = deck.pop(0)
-                drawn_card = self.repository.get_card_by_uuid(drawn_uuid)
-                if drawn_card:
-                    hand.append(drawn_card)
-            
-            # Play land
-            land_played_this_turn = False
-            for card in hand[:]:
-                if 'Land' in card.get('type_line', '') and not land_played_this_turn:
-                    hand.remove(card)
-                    lands_played += 1
-                    land_played_this_turn = True
-                    cards_played.append((turn, card.get('name'), 'land'))
-                    break
-            
-            # Play spells
-            available_mana = lands_played
-            for card in sorted(hand, key=lambda c: c.get('mana_value', 0)):
-                if 'Land' in card.get('type_line', ''):
-                    continue
-                
-                cmc = card.get('mana_value', 0)
-                if cmc <= available_mana:
-                    hand.remove(card)
-                    available_mana -= cmc
-                    cards_played.append((turn, card.get('name'), 'spell'))
-            
-            turn_by_turn.append({
-                'turn': turn,
-                'cards_in_hand': len(hand),
-                'lands_in_play': lands_played,
-                'spells_cast_this_turn': len([c for t, c, typ in cards_played if t == turn and typ == 'spell'])
-            })
+        game = _play_goldfish(deck, order, turns)
+        cards_played = [
+            (turn, deck.names[slot], kind) for turn, slot, kind in game['cards_played']
+        ]
         
         return {
             'turns_simulated': turns,
-            'final_hand_size': len(hand),
-            'lands_played': lands_played,
+            'final_hand_size': game['final_hand_size'],
+            'lands_played': game['lands_played'],
             'spells_cast': len([c for _, c, typ in cards_played if typ == 'spell']),
             'cards_played': [(t, c) for t, c, _ in cards_played],
-            'turn_by_turn': turn_by_turn
+            'turn_by_turn': game['turn_by_turn']
         }
+    
+    def goldfish_simulation(
+        self,
+        deck_cards: List[Tuple[str, int]],
+        turns: int = 5,
+        num_trials: int = DEFAULT_TRIALS,
+        workers: int = 1,
+        seed: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Goldfish many games and summarize how the deck curves out.
+        
+        Each game plays like goldfish_test: a land per turn if one is in
+        hand, then the cheapest spells that fit the available mana.
+        
+        Args:
+            deck_cards: Deck card list
+            turns: Number of turns per game
+            num_trials: Number of games
+            workers: Worker processes to split the games across
+            seed: Seed for reproducible results
+        
+        Returns:
+            Per-turn averages, the land-drop rate, how much of the available
+            mana was spent, and the rate of games that hit every land drop
+            and spent all their mana every turn (curve-outs)
+        """
+        deck = self.resolve_deck(deck_cards)
+        totals = _fan_out(_simulate_goldfish, num_trials, workers, seed, deck, turns)
+        
+        available = sum(totals['lands_in_play'])
+        return {
+            'trials': num_trials,
+            'turns_simulated': turns,
+            'curve_out_rate': round(totals['curve_outs'] / num_trials * 100, 1),
+            'mana_efficiency': round(sum(totals['mana_spent']) / available * 100, 1) if available else 0.0,
+            'turn_by_turn': [
+                {
+                    'turn': turn + 1,
+                    'avg_lands_in_play': round(totals['lands_in_play'][turn] / num_trials, 2),
+                    'land_drop_rate': round(totals['land_drops'][turn] / num_trials * 100, 1),
+                    'avg_spells_cast': round(totals['spells_cast'][turn] / num_trials, 2),
+                    'avg_mana_spent': round(totals['mana_spent'][turn] / num_trials, 2),
+                    'avg_cards_in_hand': round(totals['cards_in_hand'][turn] / num_trials, 2)
+                }
+                for turn in range(turns)
+            ]
+        }
+
+
+# ----------------------------------------------------------------------
+# Simulation engine
+# ----------------------------------------------------------------------
+
+def _fan_out(simulate, num_trials: int, workers: int, seed: Optional[int], *args) -> Dict[str, Any]:
+    """
+    Run `simulate(trials, seed, *args)` over the trials and add up the totals.
+    
+    With several workers the trials are split evenly across processes, each
+    with its own seed drawn from `seed`.
+    """
+    rng = random.Random(seed)
+    workers = max(1, min(workers, num_trials))
+    shares = [num_trials // workers + (1 if i < num_trials % workers else 0) for i in range(workers)]
+    seeds = [rng.getrandbits(63) for _ in shares]
+    
+    if workers == 1:
+        return simulate(shares[0], seeds[0], *args)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(simulate, share, share_seed, *args)
+                   for share, share_seed in zip(shares, seeds)]
+        parts = [future.result() for future in futures]
+    
+    totals = parts[0]
+    for part in parts[1:]:
+        for key, value in part.items():
+            if isinstance(value, list):
+                totals[key] = [a + b for a, b in zip(totals[key], value)]
+            else:
+                totals[key] += value
+    return totals
+
+
+def _deck_arrays(deck: ResolvedDeck) -> Dict[str, Any]:
+    """Convert a resolved deck to NumPy arrays indexed by deck position."""
+    is_land = np.array(deck.is_land, dtype=bool)
+    found = np.array(deck.found, dtype=bool)
+    mana_value = np.array(deck.mana_value, dtype=float)
+    return {
+        'is_land': is_land,
+        'is_spell': found & ~is_land,
+        'found': found,
+        'mana_value': mana_value,
+        'land_colors': np.array(deck.land_colors, dtype=np.int64),
+    }
+
+
+def _draw_orders(rng, batch: int, deck_size: int, count: int):
+    """
+    Draw the first `count` cards of a random deck order for each trial.
+    
+    Returns:
+        (batch, count) array of deck positions in draw order
+    """
+    keys = rng.random((batch, deck_size))
+    if count >= deck_size:
+        return keys.argsort(axis=1)
+    top = np.argpartition(keys, count - 1, axis=1)[:, :count]
+    order = np.take_along_axis(keys, top, axis=1).argsort(axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _simulate_hands(trials: int, seed: int, deck: ResolvedDeck,
+                    quality_table: List, mulligan_table: List) -> Dict[str, Any]:
+    """Score opening hands; returns summed counts (see run_simulation)."""
+    totals = {
+        'quality': [0] * len(QUALITIES),
+        'lands': [0] * (OPENING_HAND_SIZE + 1),
+        'colors': [0] * len(COLORS),
+        'mulligans': 0,
+        'cmc': 0.0,
+    }
+    hand_size = min(OPENING_HAND_SIZE, len(deck))
+    if trials <= 0 or hand_size == 0:
+        return totals
+    
+    arrays = _deck_arrays(deck)
+    is_spell = arrays['is_spell']
+    early = is_spell & (arrays['mana_value'] <= EARLY_MANA_VALUE)
+    spell_cmc = np.where(is_spell, arrays['mana_value'], 0.0)
+    quality_lookup = np.array(quality_table)
+    mulligan_lookup = np.array(mulligan_table)
+    rng = np.random.default_rng(seed)
+    
+    for start in range(0, trials, BATCH_SIZE):
+        batch = min(BATCH_SIZE, trials - start)
+        hands = _draw_orders(rng, batch, len(deck), hand_size)
+        
+        lands = arrays['is_land'][hands].sum(axis=1)
+        sizes = arrays['found'][hands].sum(axis=1)
+        spells = is_spell[hands].sum(axis=1)
+        early_plays = np.minimum(early[hands].sum(axis=1), MAX_EARLY_PLAYS)
+        cmc = spell_cmc[hands].sum(axis=1)
+        avg_cmc = np.round(np.divide(cmc, spells, out=np.zeros(batch), where=spells > 0), 2)
+        
+        qualities = quality_lookup[sizes, lands, early_plays]
+        colors = np.bitwise_or.reduce(arrays['land_colors'][hands], axis=1)
+        
+        totals['quality'] = [a + int(b) for a, b in zip(
+            totals['quality'], np.bincount(qualities, minlength=len(QUALITIES)))]
+        totals['lands'] = [a + int(b) for a, b in zip(
+            totals['lands'], np.bincount(lands, minlength=OPENING_HAND_SIZE + 1))]
+        totals['colors'] = [a + int(((colors >> bit) & 1).sum())
+                            for bit, a in enumerate(totals['colors'])]
+        totals['mulligans'] += int(mulligan_lookup[sizes, qualities].sum())
+        totals['cmc'] += float(avg_cmc.sum())
+    return totals
+
+
+def _goldfish_totals(turns: int) -> Dict[str, Any]:
+    """Empty per-turn goldfish totals."""
+    return {
+        'lands_in_play': [0] * turns,
+        'land_drops': [0] * turns,
+        'spells_cast': [0] * turns,
+        'mana_spent': [0.0] * turns,
+        'cards_in_hand': [0] * turns,
+        'curve_outs': 0,
+    }
+
+
+def _simulate_goldfish(trials: int, seed: int, deck: ResolvedDeck, turns: int) -> Dict[str, Any]:
+    """Goldfish games; returns summed per-turn totals (see goldfish_simulation)."""
+    if trials <= 0 or len(deck) == 0:
+        return _goldfish_totals(turns)
+    
+    rng = np.random.default_rng(seed)
+    draws = min(len(deck), OPENING_HAND_SIZE + max(turns - 1, 0))
+    totals = _goldfish_totals(turns)
+    for start in range(0, trials, BATCH_SIZE):
+        batch = min(BATCH_SIZE, trials - start)
+        part = _goldfish_batch(deck, _draw_orders(rng, batch, len(deck), draws), turns)
+        for key, value in part.items():
+            if isinstance(value, list):
+                totals[key] = [a + b for a, b in zip(totals[key], value)]
+            else:
+                totals[key] += value
+    return totals
+
+
+def _goldfish_batch(deck: ResolvedDeck, orders, turns: int) -> Dict[str, Any]:
+    """
+    Play goldfish games for a batch of deck orders at once.
+    
+    Spells in hand are kept as counts per distinct mana value; casting the
+    cheapest spells that fit is then one pass over the mana values.
+    """
+    arrays = _deck_arrays(deck)
+    batch = len(orders)
+    values = np.unique(arrays['mana_value'][arrays['is_spell']])
+    # One-hot mana value bucket per deck position (all zero for lands and missing cards)
+    buckets = np.zeros((len(deck), len(values)), dtype=np.int64)
+    spell_positions = np.flatnonzero(arrays['is_spell'])
+    buckets[spell_positions, np.searchsorted(values, arrays['mana_value'][spell_positions])] = 1
+    is_land = arrays['is_land'].astype(np.int64)
+    
+    opening = orders[:, :OPENING_HAND_SIZE]
+    spells_in_hand = buckets[opening].sum(axis=1)
+    lands_in_hand = is_land[opening].sum(axis=1)
+    lands_played = np.zeros(batch, dtype=np.int64)
+    curved_out = np.ones(batch, dtype=bool)
+    totals = _goldfish_totals(turns)
+    
+    for turn in range(turns):
+        # Draw card (skip turn 1 on play)
+        draw_index = OPENING_HAND_SIZE + turn - 1
+        if turn > 0 and draw_index < orders.shape[1]:
+            drawn = orders[:, draw_index]
+            spells_in_hand += buckets[drawn]
+            lands_in_hand += is_land[drawn]
+        
+        # Play land
+        land_drop = lands_in_hand > 0
+        lands_in_hand -= land_drop
+        lands_played += land_drop
+        
+        # Play the cheapest spells that fit
+        available = lands_played.astype(float)
+        cast = np.zeros(batch, dtype=np.int64)
+        for bucket, mana_value in enumerate(values):
+            in_hand = spells_in_hand[:, bucket]
+            if mana_value <= 0:
+                count = in_hand.copy()
+            else:
+                count = np.minimum(in_hand, np.floor(available / mana_value + 1e-9).astype(np.int64))
+            spells_in_hand[:, bucket] -= count
+            available -= count * mana_value
+            cast += count
+        
+        curved_out &= land_drop & (available < 1e-9)
+        totals['lands_in_play'][turn] = int(lands_played.sum())
+        totals['land_drops'][turn] = int(land_drop.sum())
+        totals['spells_cast'][turn] = int(cast.sum())
+        totals['mana_spent'][turn] = float((lands_played - available).sum())
+        totals['cards_in_hand'][turn] = int((lands_in_hand + spells_in_hand.sum(axis=1)).sum())
+    totals['curve_outs'] = int(curved_out.sum())
+    return totals
+
+
+def _play_goldfish(deck: ResolvedDeck, order: List[int], turns: int) -> Dict[str, Any]:
+    """
+    Play one goldfish game from a deck order.
+    
+    Returns:
+        final_hand_size, lands_played, cards_played as (turn, deck position,
+        'land'/'spell'), and turn_by_turn with the mana spent each turn
+    """
+    hand = [i for i in order[:OPENING_HAND_SIZE] if deck.found[i]]
+    library = list(order[OPENING_HAND_SIZE:])
+    
+    # Track game state
+    lands_played = 0
+    cards_played = []
+    turn_by_turn = []
+    
+    for turn in range(1, turns + 1):
+        # Draw card (skip turn 1 on play)
+        if turn > 1 and library:
+            drawn = library.pop(0)
+            if deck.found[drawn]:
+                hand.append(drawn)
+        
+        # Play land
+        land_played_this_turn = False
+        for card in hand:
+            if deck.is_land[card]:
+                hand.remove(card)
+                lands_played += 1
+                land_played_this_turn = True
+                cards_played.append((turn, card, 'land'))
+                break
+        
+        # Play spells
+        available_mana = lands_played
+        spells_cast = 0
+        for card in sorted(hand, key=lambda c: deck.mana_value[c]):
+            if deck.is_land[card]:
+                continue
+            
+            cmc = deck.mana_value[card]
+            if cmc <= available_mana:
+                hand.remove(card)
+                available_mana -= cmc
+                spells_cast += 1
+                cards_played.append((turn, card, 'spell'))
+        
+        turn_by_turn.append({
+            'turn': turn,
+            'cards_in_hand': len(hand),
+            'lands_in_play': lands_played,
+            'spells_cast_this_turn': spells_cast,
+            'land_drop': land_played_this_turn,
+            'mana_spent': lands_played - available_mana
+        })
+    
+    return {
+        'final_hand_size': len(hand),
+        'lands_played': lands_played,
+        'cards_played': cards_played,
+        'turn_by_turn': turn_by_turn
+    }
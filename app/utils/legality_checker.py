@@ -5,12 +5,26 @@ This module provides comprehensive deck legality checking for all major MTG form
 including detailed explanations of violations, banned/restricted card checking,
 and format-specific rules validation.
 
+Card legality comes from the card_legalities table of the card index when a
+LegalityIndex is given: each format is loaded once into bitmaps over card
+names (legal, restricted, banned), a deck becomes one bitmap of its cards,
+and checking it against a format is a few AND operations. Without an index,
+the built-in banned and restricted lists are used.
+
 Classes:
     MTGFormat: Enum of supported formats
     LegalityViolation: Individual legality violation
     LegalityResult: Complete legality check result
+    FormatRules: Deck construction rules of a format
+    LegalityIndex: Per-format legality bitmaps loaded from the card index
+    DeckCards: A deck's card counts and legality bits
     DeckLegalityChecker: Main legality checker
 
+Functions:
+    format_name: Display name of a format
+    format_from_name: Format for a display name or format key
+    deck_data_from_deck: Deck data for a saved Deck
+
 Features:
     - Support for 15+ major formats (Standard, Modern, Commander, etc.)
     - Banned and restricted card checking
@@ -18,20 +32,25 @@ Features:
     - Detailed violation explanations
     - Suggestions for fixing violations
     - Commander-specific validation (color identity, partner, etc.)
+    - Checking every saved deck against every format in one pass
 
 Usage:
-    checker = DeckLegalityChecker()
+    checker = DeckLegalityChecker(LegalityIndex('data/mtg_index.sqlite'))
     result = checker.check_deck(deck_data, MTGFormat.MODERN)
     if result.is_legal:
         print("Deck is legal!")
     else:
         for violation in result.violations:
             print(f"- {violation.message}")
+    
+    results = checker.check_decks(deck_service.get_all_decks())
 """
 
 import logging
+import sqlite3
 from enum import Enum
-from typing import Dict, List, Set, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from collections import Counter
 
@@ -100,6 +119,273 @@ class LegalityResult:
             return f"❌ Deck is NOT legal in {self.format.value.title()} ({len(self.violations)} violations)"
 
 
+@dataclass(frozen=True)
+class FormatRules:
+    """Deck construction rules of a format."""
+    min_deck_size: int = 60
+    max_deck_size: Optional[int] = None  # None = no max
+    max_copies: int = 4
+    max_sideboard: int = 15
+    commander_required: bool = False
+    restricted_list: bool = False
+    commons_only: bool = False
+
+
+# Deck construction rules, shared with DeckValidator
+FORMAT_RULES: Dict[MTGFormat, FormatRules] = {
+    MTGFormat.STANDARD: FormatRules(),
+    MTGFormat.PIONEER: FormatRules(),
+    MTGFormat.MODERN: FormatRules(),
+    MTGFormat.LEGACY: FormatRules(),
+    MTGFormat.VINTAGE: FormatRules(restricted_list=True),
+    MTGFormat.COMMANDER: FormatRules(100, 100, 1, 0, commander_required=True),
+    MTGFormat.COMMANDER_1V1: FormatRules(100, 100, 1, 0, commander_required=True),
+    MTGFormat.PAUPER: FormatRules(commons_only=True),
+    MTGFormat.HISTORIC: FormatRules(),
+    MTGFormat.EXPLORER: FormatRules(),
+    MTGFormat.ALCHEMY: FormatRules(),
+    # Exactly 60 (or 100 in historic brawl)
+    MTGFormat.BRAWL: FormatRules(60, 60, 1, 0, commander_required=True),
+    MTGFormat.OATHBREAKER: FormatRules(60, 60, 1, 0),
+    MTGFormat.PENNY_DREADFUL: FormatRules(),
+    MTGFormat.OLDSCHOOL: FormatRules(restricted_list=True),
+}
+
+BASIC_LANDS = frozenset({
+    'Plains', 'Island', 'Swamp', 'Mountain', 'Forest',
+    'Wastes', 'Snow-Covered Plains', 'Snow-Covered Island',
+    'Snow-Covered Swamp', 'Snow-Covered Mountain', 'Snow-Covered Forest'
+})
+
+# Special cards with unlimited copies
+UNLIMITED_CARDS = frozenset({
+    'Relentless Rats', 'Rat Colony', 'Persistent Petitioners',
+    'Dragon\'s Approach', 'Shadowborn Apostle', 'Seven Dwarves'
+})
+
+# Format keys of the card_legalities table (MTGJSON) where they differ
+LEGALITY_FORMATS = {
+    MTGFormat.COMMANDER_1V1: 'duel',
+    MTGFormat.PENNY_DREADFUL: 'penny',
+}
+
+# Display names that aren't the title-cased format value
+FORMAT_NAMES = {
+    MTGFormat.COMMANDER_1V1: 'Commander 1v1',
+    MTGFormat.PENNY_DREADFUL: 'Penny Dreadful',
+    MTGFormat.OLDSCHOOL: 'Old School',
+}
+
+NAMES_QUERY = "SELECT DISTINCT name FROM cards WHERE is_token = 0 ORDER BY name"
+FORMAT_LEGALITY_QUERY = """
+    SELECT DISTINCT c.name, l.status
+    FROM card_legalities l
+    JOIN cards c ON c.uuid = l.uuid
+    WHERE l.format = ? AND c.is_token = 0
+"""
+
+
+def format_name(deck_format: MTGFormat) -> str:
+    """Display name of a format ('Modern', 'Commander 1v1')."""
+    return FORMAT_NAMES.get(deck_format, deck_format.value.title())
+
+
+def format_from_name(name: str) -> Optional[MTGFormat]:
+    """
+    Format for a display name, format value or card_legalities key.
+    
+    Args:
+        name: Name such as 'Commander', 'penny_dreadful' or 'duel'
+        
+    Returns:
+        The format, or None if the name isn't a supported format
+    """
+    key = name.strip().lower()
+    for deck_format in MTGFormat:
+        if key in (deck_format.value, format_name(deck_format).lower(),
+                   LEGALITY_FORMATS.get(deck_format)):
+            return deck_format
+    return None
+
+
+def _bit_positions(bits: int) -> Iterable[int]:
+    """Positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FormatLegality(NamedTuple):
+    """Legality bitmaps of one format (bit i = card name i of the index)."""
+    legal: int
+    restricted: int
+    banned: int
+    
+    @property
+    def playable(self) -> int:
+        """Cards allowed in a deck (legal or restricted)."""
+        return self.legal | self.restricted
+
+
+class LegalityIndex:
+    """
+    Per-format card legality loaded from the card index.
+    
+    Card names are numbered once; each format is read from card_legalities
+    the first time it's needed and kept as bitmaps. A name counts as legal
+    (or restricted, or banned) if any printing has that status; a name with
+    no row for a format is not legal in it.
+    """
+    
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the index.
+        
+        Args:
+            db_path: Card index database (cards and card_legalities tables)
+        """
+        self.db_path = str(db_path)
+        self.names: List[str] = []
+        self._positions: Optional[Dict[str, int]] = None
+        self._formats: Dict[MTGFormat, Optional[FormatLegality]] = {}
+    
+    def reload(self):
+        """Forget loaded legality so it's read again (after a ban list update or index rebuild)."""
+        self.names = []
+        self._positions = None
+        self._formats = {}
+    
+    def _load_names(self) -> Dict[str, int]:
+        """Card name -> bit position (loaded once)."""
+        if self._positions is None:
+            connection = sqlite3.connect(self.db_path)
+            try:
+                self.names = [name for name, in connection.execute(NAMES_QUERY)]
+            finally:
+                connection.close()
+            self._positions = {name: position for position, name in enumerate(self.names)}
+            logger.info(f"Legality index numbered {len(self.names)} card names")
+        return self._positions
+    
+    def format_legality(self, deck_format: MTGFormat) -> Optional[FormatLegality]:
+        """
+        Legality bitmaps of a format.
+        
+        Args:
+            deck_format: Format to load
+            
+        Returns:
+            The bitmaps, or None if the index has no legality rows for the format
+        """
+        if deck_format in self._formats:
+            return self._formats[deck_format]
+        
+        positions = self._load_names()
+        size = (len(self.names) + 7) // 8
+        bitmaps = {'Legal': bytearray(size), 'Restricted': bytearray(size), 'Banned': bytearray(size)}
+        rows = 0
+        connection = sqlite3.connect(self.db_path)
+        try:
+            key = LEGALITY_FORMATS.get(deck_format, deck_format.value)
+            for name, status in connection.execute(FORMAT_LEGALITY_QUERY, (key,)):
+                position = positions.get(name)
+                bitmap = bitmaps.get(status)
+                if position is not None and bitmap is not None:
+                    bitmap[position >> 3] |= 1 << (position & 7)
+                    rows += 1
+        finally:
+            connection.close()
+        
+        legality = None
+        if rows:
+            legality = FormatLegality(*(int.from_bytes(bitmaps[status], 'little')
+                                        for status in ('Legal', 'Restricted', 'Banned')))
+        self._formats[deck_format] = legality
+        return legality
+    
+    def card_bits(self, names: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        Bitmap of card names.
+        
+        Args:
+            names: Card names
+            
+        Returns:
+            Tuple of (bitmap of the names in the index, names not in the index)
+        """
+        positions = self._load_names()
+        found = bytearray((len(self.names) + 7) // 8)
+        unknown = []
+        for name in names:
+            position = positions.get(name)
+            if position is None:
+                unknown.append(name)
+            else:
+                found[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(found, 'little'), unknown
+    
+    def card_names(self, bits: int) -> List[str]:
+        """Card names of a bitmap, in name order."""
+        return [self.names[position] for position in _bit_positions(bits)]
+
+
+@dataclass
+class DeckCards:
+    """A deck's card counts and legality bits, shared by the checks of every format."""
+    counts: Counter  # Mainboard and sideboard copies by name
+    commander: Optional[str] = None
+    bits: int = 0  # Every card, commander included
+    multiple_bits: int = 0  # Cards with more than one copy
+    unknown: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_deck_data(cls, deck_data: Dict, index: Optional[LegalityIndex] = None) -> 'DeckCards':
+        """
+        Count a deck's cards and look them all up in the index at once.
+        
+        Args:
+            deck_data: Deck data with mainboard, sideboard and commander
+            index: Legality index (no bits are computed without one)
+            
+        Returns:
+            The deck's cards
+        """
+        counts = Counter()
+        for card in deck_data.get('mainboard', []) + deck_data.get('sideboard', []):
+            counts[card.get('name', '')] += card.get('quantity', 1)
+        commander = deck_data.get('commander')
+        deck = cls(counts=counts, commander=commander if isinstance(commander, str) else None)
+        
+        if index is not None:
+            names = list(counts)
+            if deck.commander and deck.commander not in counts:
+                names.append(deck.commander)
+            deck.bits, deck.unknown = index.card_bits(names)
+            deck.multiple_bits, _ = index.card_bits(name for name, count in counts.items() if count > 1)
+        return deck
+
+
+def deck_data_from_deck(deck) -> Dict:
+    """
+    Deck data for a saved Deck.
+    
+    Saved decks have no sideboard and count their commander among their
+    cards, so every card (commander included) goes in the mainboard.
+    
+    Args:
+        deck: Deck with cards
+        
+    Returns:
+        Deck data with mainboard, sideboard and commander
+    """
+    mainboard, commander = [], None
+    for card in deck.cards:
+        mainboard.append({'name': card.card_name, 'quantity': card.quantity})
+        if card.is_commander and commander is None:
+            commander = card.card_name
+    return {'mainboard': mainboard, 'sideboard': [], 'commander': commander}
+
 class DeckLegalityChecker:
     """
     Check deck legality for various MTG formats.
@@ -108,35 +394,14 @@ class DeckLegalityChecker:
     and format-specific requirements.
     """
     
-    # Format-specific deck size requirements
+    # Format-specific deck size requirements (min, max; None = no max)
     DECK_SIZE_REQUIREMENTS = {
-        MTGFormat.STANDARD: (60, None),  # Min, Max (None = no max)
-        MTGFormat.PIONEER: (60, None),
-        MTGFormat.MODERN: (60, None),
-        MTGFormat.LEGACY: (60, None),
-        MTGFormat.VINTAGE: (60, None),
-        MTGFormat.COMMANDER: (100, 100),  # Exactly 100
-        MTGFormat.COMMANDER_1V1: (100, 100),
-        MTGFormat.PAUPER: (60, None),
-        MTGFormat.HISTORIC: (60, None),
-        MTGFormat.EXPLORER: (60, None),
-        MTGFormat.ALCHEMY: (60, None),
-        MTGFormat.BRAWL: (60, 60),  # Exactly 60 (or 100 in historic brawl)
-        MTGFormat.OATHBREAKER: (60, 60),
+        deck_format: (rules.min_deck_size, rules.max_deck_size)
+        for deck_format, rules in FORMAT_RULES.items()
     }
     
     # Sideboard size limits
-    SIDEBOARD_LIMITS = {
-        MTGFormat.STANDARD: 15,
-        MTGFormat.PIONEER: 15,
-        MTGFormat.MODERN: 15,
-        MTGFormat.LEGACY: 15,
-        MTGFormat.VINTAGE: 15,
-        MTGFormat.COMMANDER: 0,  # No sideboard in Commander
-        MTGFormat.PAUPER: 15,
-        MTGFormat.HISTORIC: 15,
-        MTGFormat.EXPLORER: 15,
-    }
+    SIDEBOARD_LIMITS = {deck_format: rules.max_sideboard for deck_format, rules in FORMAT_RULES.items()}
     
     # Mock banned/restricted lists (in production, fetch from Scryfall or official source)
     BANNED_CARDS = {
@@ -208,24 +473,41 @@ class DeckLegalityChecker:
         }
     }
     
-    def __init__(self):
-        """Initialize the legality checker."""
+    def __init__(self, legality_index: Optional[LegalityIndex] = None):
+        """
+        Initialize the legality checker.
+        
+        Args:
+            legality_index: Card legality from the card index (the built-in
+                banned and restricted lists are used without one)
+        """
+        self.legality_index = legality_index
         logger.info("DeckLegalityChecker initialized")
     
-    def check_deck(self, deck_data: Dict, deck_format: MTGFormat) -> LegalityResult:
+    def _format_legality(self, deck_format: MTGFormat) -> Optional[FormatLegality]:
+        """Legality bitmaps of a format, or None to use the built-in lists."""
+        if self.legality_index is None:
+            return None
+        return self.legality_index.format_legality(deck_format)
+    
+    def check_deck(self, deck_data: Dict, deck_format: MTGFormat,
+                   deck: Optional[DeckCards] = None) -> LegalityResult:
         """
         Check deck legality for a specific format.
         
         Args:
             deck_data: Deck data with mainboard and sideboard
             deck_format: Format to check against
+            deck: The deck's cards, when already looked up for another format
             
         Returns:
             LegalityResult with violations and warnings
         """
-        logger.info(f"Checking deck legality for {deck_format.value}")
+        logger.debug(f"Checking deck legality for {deck_format.value}")
         
         result = LegalityResult(is_legal=True, format=deck_format)
+        if deck is None:
+            deck = DeckCards.from_deck_data(deck_data, self.legality_index)
         
         # Check deck size
         self._check_deck_size(deck_data, deck_format, result)
@@ -234,25 +516,81 @@ class DeckLegalityChecker:
         self._check_sideboard_size(deck_data, deck_format, result)
         
         # Check card limits
-        self._check_card_limits(deck_data, deck_format, result)
+        self._check_card_limits(deck, deck_format, result)
         
-        # Check banned cards
-        self._check_banned_cards(deck_data, deck_format, result)
-        
-        # Check restricted cards
-        self._check_restricted_cards(deck_data, deck_format, result)
+        # Check banned, restricted and not legal cards
+        legality = self._format_legality(deck_format)
+        if legality is not None:
+            self._check_card_legality(deck, deck_format, legality, result)
+        else:
+            self._check_banned_cards(deck, deck_format, result)
+            self._check_restricted_cards(deck, deck_format, result)
         
         # Format-specific checks
         if deck_format in [MTGFormat.COMMANDER, MTGFormat.COMMANDER_1V1]:
             self._check_commander_rules(deck_data, result)
         elif deck_format == MTGFormat.PAUPER:
-            self._check_pauper_rules(deck_data, result)
+            self._check_pauper_rules(deck_data, result, legality is not None)
         elif deck_format == MTGFormat.BRAWL:
-            self._check_brawl_rules(deck_data, result)
+            self._check_brawl_rules(deck_data, result, legality is not None)
         
-        logger.info(f"Legality check complete: {result.get_summary()}")
+        logger.debug(f"Legality check complete: {result.get_summary()}")
         return result
     
+    def check_formats(self, deck_data: Dict,
+                      formats: Optional[Iterable[MTGFormat]] = None) -> Dict[MTGFormat, LegalityResult]:
+        """
+        Check a deck against several formats, looking its cards up once.
+        
+        Args:
+            deck_data: Deck data with mainboard and sideboard
+            formats: Formats to check (all formats by default)
+            
+        Returns:
+            Result by format
+        """
+        deck = DeckCards.from_deck_data(deck_data, self.legality_index)
+        return {
+            deck_format: self.check_deck(deck_data, deck_format, deck)
+            for deck_format in (formats if formats is not None else MTGFormat)
+        }
+    
+    def check_all_formats(self, deck) -> Dict[str, bool]:
+        """
+        Whether a deck is legal in each format.
+        
+        Args:
+            deck: Saved Deck or deck data
+            
+        Returns:
+            Legality by format display name
+        """
+        deck_data = deck if isinstance(deck, dict) else deck_data_from_deck(deck)
+        return {
+            format_name(deck_format): result.is_legal
+            for deck_format, result in self.check_formats(deck_data).items()
+        }
+    
+    def check_decks(self, decks: Iterable,
+                    formats: Optional[Iterable[MTGFormat]] = None) -> Dict[Optional[int], Dict[MTGFormat, LegalityResult]]:
+        """
+        Check every saved deck against every format in one pass.
+        
+        Each format's legality is loaded once and each deck's cards are
+        looked up once, so a deck costs a few bitmap operations per format.
+        
+        Args:
+            decks: Saved Decks (e.g. DeckService.get_all_decks())
+            formats: Formats to check (all formats by default)
+            
+        Returns:
+            Results by format, by deck id
+        """
+        formats = list(formats) if formats is not None else list(MTGFormat)
+        results = {deck.id: self.check_formats(deck_data_from_deck(deck), formats) for deck in decks}
+        logger.info(f"Checked legality of {len(results)} decks in {len(formats)} formats")
+        return results
+    
     def _check_deck_size(self, deck_data: Dict, deck_format: MTGFormat, result: LegalityResult):
         """Check deck size requirements."""
         mainboard = deck_data.get('mainboard', [])
@@ -303,27 +641,15 @@ class DeckLegalityChecker:
                 severity='error'
             ))
     
-    def _check_card_limits(self, deck_data: Dict, deck_format: MTGFormat, result: LegalityResult):
+    def _check_card_limits(self, deck: DeckCards, deck_format: MTGFormat, result: LegalityResult):
         """Check card quantity limits (4-of rule, etc.)."""
-        # Combine mainboard and sideboard
-        all_cards = deck_data.get('mainboard', []) + deck_data.get('sideboard', [])
-        
-        # Count card copies
-        card_counts = Counter()
-        for card in all_cards:
-            card_name = card.get('name', '')
-            # Skip basic lands
-            if card_name in ['Plains', 'Island', 'Swamp', 'Mountain', 'Forest', 
-                            'Wastes', 'Snow-Covered Plains', 'Snow-Covered Island',
-                            'Snow-Covered Swamp', 'Snow-Covered Mountain', 'Snow-Covered Forest']:
-                continue
-            card_counts[card_name] += card.get('quantity', 1)
-        
         # Check limits (4 for most formats, 1 for Commander/Brawl)
-        limit = 1 if deck_format in [MTGFormat.COMMANDER, MTGFormat.COMMANDER_1V1, 
-                                      MTGFormat.BRAWL, MTGFormat.OATHBREAKER] else 4
+        limit = FORMAT_RULES.get(deck_format, FormatRules()).max_copies
         
-        for card_name, count in card_counts.items():
+        for card_name, count in deck.counts.items():
+            # Skip basic lands and cards allowing any number of copies
+            if card_name in BASIC_LANDS or card_name in UNLIMITED_CARDS:
+                continue
             if count > limit:
                 result.add_violation(LegalityViolation(
                     violation_type='card_limit',
@@ -333,48 +659,67 @@ class DeckLegalityChecker:
                     severity='error'
                 ))
     
-    def _check_banned_cards(self, deck_data: Dict, deck_format: MTGFormat, result: LegalityResult):
+    def _check_card_legality(self, deck: DeckCards, deck_format: MTGFormat,
+                             legality: FormatLegality, result: LegalityResult):
+        """Check banned, restricted and not legal cards against the index bitmaps."""
+        index = self.legality_index
+        for card_name in index.card_names(deck.bits & legality.banned):
+            self._add_banned(card_name, deck_format, result)
+        for card_name in index.card_names(deck.multiple_bits & legality.restricted):
+            self._add_restricted(card_name, deck.counts[card_name], deck_format, result)
+        for card_name in index.card_names(deck.bits & ~(legality.playable | legality.banned)):
+            result.add_violation(LegalityViolation(
+                violation_type='not_legal',
+                card_name=card_name,
+                message=f"'{card_name}' is not legal in {deck_format.value.title()}",
+                suggestion=f"Replace '{card_name}' with a card legal in {deck_format.value.title()}",
+                severity='error'
+            ))
+        if deck.unknown:
+            result.info.append(f"Not in the card index (legality unknown): {', '.join(deck.unknown)}")
+    
+    def _check_banned_cards(self, deck: DeckCards, deck_format: MTGFormat, result: LegalityResult):
         """Check for banned cards."""
         banned_list = self.BANNED_CARDS.get(deck_format, set())
         if not banned_list:
             return
         
-        all_cards = deck_data.get('mainboard', []) + deck_data.get('sideboard', [])
-        
-        for card in all_cards:
-            card_name = card.get('name', '')
+        names = list(deck.counts)
+        if deck.commander and deck.commander not in deck.counts:
+            names.append(deck.commander)
+        for card_name in names:
             if card_name in banned_list:
-                result.add_violation(LegalityViolation(
-                    violation_type='banned',
-                    card_name=card_name,
-                    message=f"'{card_name}' is banned in {deck_format.value.title()}",
-                    suggestion=f"Remove all copies of '{card_name}' from the deck",
-                    severity='error'
-                ))
+                self._add_banned(card_name, deck_format, result)
     
-    def _check_restricted_cards(self, deck_data: Dict, deck_format: MTGFormat, result: LegalityResult):
+    def _check_restricted_cards(self, deck: DeckCards, deck_format: MTGFormat, result: LegalityResult):
         """Check restricted cards (Vintage only)."""
         restricted_list = self.RESTRICTED_CARDS.get(deck_format, set())
         if not restricted_list:
             return
         
-        all_cards = deck_data.get('mainboard', []) + deck_data.get('sideboard', [])
-        
-        card_counts = Counter()
-        for card in all_cards:
-            card_name = card.get('name', '')
-            if card_name in restricted_list:
-                card_counts[card_name] += card.get('quantity', 1)
-        
-        for card_name, count in card_counts.items():
-            if count > 1:
-                result.add_violation(LegalityViolation(
-                    violation_type='restricted',
-                    card_name=card_name,
-                    message=f"'{card_name}' is restricted in {deck_format.value.title()} (max 1 copy)",
-                    suggestion=f"Remove {count - 1} copies of '{card_name}'",
-                    severity='error'
-                ))
+        for card_name, count in deck.counts.items():
+            if card_name in restricted_list and count > 1:
+                self._add_restricted(card_name, count, deck_format, result)
+    
+    def _add_banned(self, card_name: str, deck_format: MTGFormat, result: LegalityResult):
+        """Add a banned card violation."""
+        result.add_violation(LegalityViolation(
+            violation_type='banned',
+            card_name=card_name,
+            message=f"'{card_name}' is banned in {deck_format.value.title()}",
+            suggestion=f"Remove all copies of '{card_name}' from the deck",
+            severity='error'
+        ))
+    
+    def _add_restricted(self, card_name: str, count: int, deck_format: MTGFormat, result: LegalityResult):
+        """Add a violation for more than one copy of a restricted card."""
+        result.add_violation(LegalityViolation(
+            violation_type='restricted',
+            card_name=card_name,
+            message=f"'{card_name}' is restricted in {deck_format.value.title()} (max 1 copy)",
+            suggestion=f"Remove {count - 1} copies of '{card_name}'",
+            severity='error'
+        ))
     
     def _check_commander_rules(self, deck_data: Dict, result: LegalityResult):
         """Check Commander-specific rules."""
@@ -391,12 +736,13 @@ class DeckLegalityChecker:
         # Add info about color identity check
         result.info.append("Color identity checking not yet implemented (requires card database)")
     
-    def _check_pauper_rules(self, deck_data: Dict, result: LegalityResult):
+    def _check_pauper_rules(self, deck_data: Dict, result: LegalityResult, indexed: bool = False):
         """Check Pauper-specific rules (commons only)."""
-        # Would need card database to check rarity
-        result.info.append("Rarity checking not yet implemented (requires card database)")
+        # Pauper legality in the index already rules out non-commons
+        if not indexed:
+            result.info.append("Rarity checking not yet implemented (requires card database)")
     
-    def _check_brawl_rules(self, deck_data: Dict, result: LegalityResult):
+    def _check_brawl_rules(self, deck_data: Dict, result: LegalityResult, indexed: bool = False):
         """Check Brawl-specific rules."""
         # Check for commander
         commander = deck_data.get('commander')
@@ -408,7 +754,8 @@ class DeckLegalityChecker:
                 severity='error'
             ))
         
-        result.info.append("Standard legality checking not yet implemented (requires card database)")
+        if not indexed:
+            result.info.append("Standard legality checking not yet implemented (requires card database)")
     
     def get_format_info(self, deck_format: MTGFormat) -> Dict:
         """
@@ -420,16 +767,20 @@ class DeckLegalityChecker:
         Returns:
             Dictionary with format information
         """
-        deck_size = self.DECK_SIZE_REQUIREMENTS.get(deck_format, (60, None))
-        sideboard_size = self.SIDEBOARD_LIMITS.get(deck_format, 15)
-        card_limit = 1 if deck_format in [MTGFormat.COMMANDER, MTGFormat.BRAWL] else 4
+        rules = FORMAT_RULES.get(deck_format, FormatRules())
+        legality = self._format_legality(deck_format)
+        if legality is not None:
+            banned_count, restricted_count = legality.banned.bit_count(), legality.restricted.bit_count()
+        else:
+            banned_count = len(self.BANNED_CARDS.get(deck_format, set()))
+            restricted_count = len(self.RESTRICTED_CARDS.get(deck_format, set()))
         
         return {
             'name': deck_format.value.title(),
-            'deck_size_min': deck_size[0],
-            'deck_size_max': deck_size[1],
-            'sideboard_max': sideboard_size,
-            'card_limit': card_limit,
-            'banned_count': len(self.BANNED_CARDS.get(deck_format, set())),
-            'restricted_count': len(self.RESTRICTED_CARDS.get(deck_format, set())),
+            'deck_size_min': rules.min_deck_size,
+            'deck_size_max': rules.max_deck_size,
+            'sideboard_max': rules.max_sideboard,
+            'card_limit': rules.max_copies,
+            'banned_count': banned_count,
+            'restricted_count': restricted_count,
         }
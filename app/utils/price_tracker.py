@@ -5,9 +5,17 @@ This module provides comprehensive price tracking functionality including
 fetching current prices from multiple sources, historical price tracking,
 budget analysis, and price alerts.
 
+Prices live in a PriceStore (SQLite): an append-only, indexed history plus
+the current price of each card. Fetched prices are written in one
+transaction per lookup batch, decks are priced with one batched lookup, and
+MTGJSON price files are streamed into the store in batches.
+
 Classes:
     PriceSource: Enum for price data sources
     CardPrice: Individual card price data
+    PriceStore: SQLite price history and current prices
+    PriceCache: Current prices read through from the store
+    PriceHistory: Price history read from the store
     PriceTracker: Main price tracking system
     BudgetAnalyzer: Deck budget analysis
     PriceAlert: Price alert system
@@ -18,27 +26,104 @@ Features:
     - Budget analysis with breakdown by card type
     - Price alerts for target prices
     - Total deck value calculation
-    - Alternative printing suggestions for budget
+    - Cheaper, functionally similar replacements (with a BudgetAlternativeFinder)
 
 Usage:
     tracker = PriceTracker()
+    tracker.store.ingest_mtgjson_prices('cardPrices.csv', 'data/mtg_index.sqlite')
     price = tracker.get_card_price("Lightning Bolt", "M10")
     deck_value = tracker.get_deck_value(deck_data)
     analyzer = BudgetAnalyzer(deck_data)
     breakdown = analyzer.get_price_breakdown()
 """
 
+import csv
 import json
 import logging
+import sqlite3
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from app.utils.versioned_store import SQLiteStore
+
 logger = logging.getLogger(__name__)
 
+# Card keys per IN (...) query (stays under SQLite's variable limit)
+QUERY_CHUNK = 500
+# History rows per transaction when ingesting price files
+INGEST_BATCH_SIZE = 5000
+# MTGJSON price provider ingested by default
+DEFAULT_PROVIDER = 'tcgplayer'
+
+PRICE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS price_history (
+        card_key TEXT NOT NULL,
+        recorded TEXT NOT NULL,
+        source TEXT NOT NULL,
+        price REAL,
+        price_foil REAL,
+        UNIQUE (card_key, recorded, source)
+    );
+    CREATE TABLE IF NOT EXISTS current_prices (
+        card_key TEXT PRIMARY KEY,
+        name_key TEXT NOT NULL,
+        card_name TEXT NOT NULL,
+        set_code TEXT NOT NULL,
+        source TEXT NOT NULL,
+        price REAL,
+        price_foil REAL,
+        last_updated TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_current_prices_name ON current_prices(name_key, price);
+"""
+# Columns in CardPrice field order; foil-only cards are priced at their foil price
+PRICE_COLUMNS = "card_name, set_code, COALESCE(price, price_foil), price_foil, source, last_updated"
+CURRENT_PRICES_QUERY = f"SELECT card_key, {PRICE_COLUMNS} FROM current_prices WHERE card_key IN ({{}})"
+CHEAPEST_PRINTING_QUERY = """
+    SELECT name_key, card_name, set_code, MIN(COALESCE(price, price_foil)), price_foil, source, last_updated
+    FROM current_prices
+    WHERE name_key IN ({}) AND COALESCE(price, price_foil) IS NOT NULL
+    GROUP BY name_key
+"""
+UPSERT_CURRENT_PRICE = "INSERT OR REPLACE INTO current_prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+# Ingested prices don't replace newer ones (e.g. fetched from Scryfall since)
+INGEST_CURRENT_PRICE = """
+    INSERT INTO current_prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (card_key) DO UPDATE SET
+        name_key = excluded.name_key, card_name = excluded.card_name, set_code = excluded.set_code,
+        source = excluded.source, price = excluded.price, price_foil = excluded.price_foil,
+        last_updated = excluded.last_updated
+    WHERE excluded.last_updated >= current_prices.last_updated
+"""
+APPEND_HISTORY = """
+    INSERT OR IGNORE INTO price_history (card_key, recorded, source, price, price_foil)
+    VALUES (?, ?, ?, ?, ?)
+"""
+# Normal and foil prices of a card arrive as separate rows, and printings
+# sharing a name and set (borderless, showcase...) share a key: each day keeps
+# the cheapest normal and the cheapest foil price
+MERGE_HISTORY = """
+    INSERT INTO price_history (card_key, recorded, source, price, price_foil)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (card_key, recorded, source) DO UPDATE SET
+        price = COALESCE(MIN(excluded.price, price), excluded.price, price),
+        price_foil = COALESCE(MIN(excluded.price_foil, price_foil), excluded.price_foil, price_foil)
+"""
+HISTORY_QUERY = """
+    SELECT recorded, price, price_foil FROM price_history
+    WHERE card_key = ? ORDER BY recorded, rowid
+"""
+LATEST_HISTORY_QUERY = """
+    SELECT card_key, MAX(recorded), price, price_foil FROM price_history
+    WHERE source = ? AND card_key IN ({})
+    GROUP BY card_key
+"""
+INDEX_CARDS_QUERY = "SELECT uuid, name, set_code FROM cards"
+
 
 class PriceSource(Enum):
     """Price data sources."""
@@ -48,6 +133,10 @@ class PriceSource(Enum):
     SCRYFALL = "scryfall"  # Aggregated from Scryfall API
 
 
+# Source of prices fetched by PriceTracker (the only ones that go stale)
+FETCH_SOURCE = PriceSource.SCRYFALL.value
+
+
 @dataclass
 class CardPrice:
     """Card price information."""
@@ -80,6 +169,266 @@ class CardPrice:
             return True
 
 
+def _parse_price(value) -> Optional[float]:
+    """Price from a CSV field (None if empty or not a number)."""
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+class PriceStore(SQLiteStore):
+    """
+    SQLite price store: append-only history plus the current price per card.
+    
+    Cards are keyed like PriceTracker's cache ("name|set", lowercased). A key
+    without a set code also matches the cheapest current printing of the name.
+    """
+    
+    SCHEMA = PRICE_SCHEMA
+    
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM current_prices").fetchone()[0]
+    
+    def get_prices(self, keys: Iterable[str]) -> Dict[str, CardPrice]:
+        """
+        Current prices of many cards in one pass.
+        
+        Args:
+            keys: Card keys ("name|set", lowercased)
+        
+        Returns:
+            Price by key, for the keys with a stored price
+        """
+        keys = list(dict.fromkeys(keys))
+        prices: Dict[str, CardPrice] = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            query = CURRENT_PRICES_QUERY.format(', '.join('?' * len(chunk)))
+            for key, *row in self.connection.execute(query, chunk):
+                prices[key] = CardPrice(*row)
+        
+        # Keys without a set code fall back to the cheapest printing of the name
+        by_name = {key[:-1]: key for key in keys if key.endswith('|') and key not in prices}
+        names = list(by_name)
+        for start in range(0, len(names), QUERY_CHUNK):
+            chunk = names[start:start + QUERY_CHUNK]
+            query = CHEAPEST_PRINTING_QUERY.format(', '.join('?' * len(chunk)))
+            for name_key, *row in self.connection.execute(query, chunk):
+                prices[by_name[name_key]] = CardPrice(*row)
+        return prices
+    
+    def get_price(self, key: str) -> Optional[CardPrice]:
+        """Current price of a card, or None if none is stored."""
+        return self.get_prices([key]).get(key)
+    
+    def record(self, prices: Dict[str, CardPrice]):
+        """
+        Store new current prices and append them to the history, in one transaction.
+        
+        Args:
+            prices: Price by card key
+        """
+        with self.connection:
+            self.connection.executemany(UPSERT_CURRENT_PRICE, [
+                (key, price.card_name.lower(), price.card_name, price.set_code, price.source,
+                 price.price_usd, price.price_usd_foil, price.last_updated)
+                for key, price in prices.items()
+            ])
+            self.connection.executemany(APPEND_HISTORY, [
+                (key, price.last_updated, price.source, price.price_usd, price.price_usd_foil)
+                for key, price in prices.items()
+            ])
+    
+    def append_history(self, rows: Iterable[Tuple]):
+        """
+        Append history rows, in one transaction.
+        
+        Args:
+            rows: (card_key, date, source, price, price_foil) tuples
+        """
+        with self.connection:
+            self.connection.executemany(APPEND_HISTORY, rows)
+    
+    def history(self, key: str) -> List[Dict]:
+        """
+        Price history of a card, oldest first.
+        
+        Args:
+            key: Card key
+        
+        Returns:
+            History entries with date, price and price_foil
+        """
+        return [
+            {'date': recorded, 'price': price, 'price_foil': price_foil}
+            for recorded, price, price_foil in self.connection.execute(HISTORY_QUERY, (key,))
+        ]
+    
+    def history_keys(self) -> int:
+        """Number of cards with a price history."""
+        return self.connection.execute("SELECT COUNT(DISTINCT card_key) FROM price_history").fetchone()[0]
+    
+    def clear_current(self):
+        """Forget current prices (the history is kept)."""
+        with self.connection:
+            self.connection.execute("DELETE FROM current_prices")
+    
+    def ingest_mtgjson_prices(self, csv_path: Union[str, Path], index_db_path: Union[str, Path],
+                              provider: str = DEFAULT_PROVIDER, batch_size: int = INGEST_BATCH_SIZE) -> int:
+        """
+        Stream an MTGJSON cardPrices.csv into the history and current prices.
+        
+        Both layouts are read: one row per price with providerListing,
+        cardFinish and currency columns, or retail/retailFoil columns.
+        Only USD paper retail prices of one provider are kept. Rows are keyed
+        by the card's name and set from the card index, so printings sharing
+        both keep the cheapest price of each day, and written in batches;
+        ingesting the same file again changes nothing. A card's current price
+        is replaced only by a price at least as recent.
+        
+        Args:
+            csv_path: MTGJSON cardPrices.csv
+            index_db_path: Card index database (cards table) to name uuids
+            provider: Price provider to ingest
+            batch_size: History rows per transaction
+        
+        Returns:
+            Number of price rows ingested
+        """
+        connection = sqlite3.connect(str(index_db_path))
+        try:
+            cards = {uuid: (name, set_code or '')
+                     for uuid, name, set_code in connection.execute(INDEX_CARDS_QUERY)}
+        finally:
+            connection.close()
+        
+        batch: List[Tuple] = []
+        names: Dict[str, Tuple[str, str]] = {}
+        count = 0
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('priceProvider', provider) != provider:
+                    continue
+                if row.get('gameAvailability', 'paper') != 'paper' or \
+                   row.get('currency', 'USD').upper() != 'USD' or \
+                   row.get('providerListing', 'retail') != 'retail':
+                    continue
+                card = cards.get(row.get('uuid'))
+                if card is None:
+                    continue
+                
+                if 'cardFinish' in row:
+                    price = _parse_price(row.get('price'))
+                    price, price_foil = (None, price) if row['cardFinish'] != 'normal' else (price, None)
+                else:
+                    price, price_foil = _parse_price(row.get('retail')), _parse_price(row.get('retailFoil'))
+                if price is None and price_foil is None:
+                    continue
+                
+                key = f"{card[0]}|{card[1]}".lower()
+                names[key] = card
+                batch.append((key, row.get('date') or '', provider, price, price_foil))
+                if len(batch) >= batch_size:
+                    count += self._ingest_batch(batch)
+                    batch = []
+        if batch:
+            count += self._ingest_batch(batch)
+        
+        self._refresh_current(names, provider)
+        logger.info(f"Ingested {count} {provider} prices for {len(names)} cards from {csv_path}")
+        return count
+    
+    def _ingest_batch(self, batch: List[Tuple]) -> int:
+        """Merge a batch of ingested rows into the history."""
+        with self.connection:
+            self.connection.executemany(MERGE_HISTORY, batch)
+        return len(batch)
+    
+    def _refresh_current(self, names: Dict[str, Tuple[str, str]], provider: str):
+        """Make each ingested card's latest history row its current price, unless it is newer."""
+        keys = list(names)
+        rows = []
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            query = LATEST_HISTORY_QUERY.format(', '.join('?' * len(chunk)))
+            for key, recorded, price, price_foil in self.connection.execute(query, [provider] + chunk):
+                name, set_code = names[key]
+                rows.append((key, name.lower(), name, set_code, provider, price, price_foil, recorded))
+        with self.connection:
+            self.connection.executemany(INGEST_CURRENT_PRICE, rows)
+
+
+class PriceCache(dict):
+    """
+    Current prices used this session, read through from the price store.
+    
+    Looking up a key that isn't held loads it from the store; load() does
+    that for many keys with one query.
+    """
+    
+    def __init__(self, store: PriceStore):
+        super().__init__()
+        self.store = store
+    
+    def __missing__(self, key: str) -> CardPrice:
+        price = self.store.get_price(key)
+        if price is None:
+            raise KeyError(key)
+        self[key] = price
+        return price
+    
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def load(self, keys: Iterable[str]) -> Dict[str, CardPrice]:
+        """
+        Prices of many keys, loading the ones not held yet in one pass.
+        
+        Args:
+            keys: Card keys
+        
+        Returns:
+            Price by key, for the keys with a price
+        """
+        keys = list(keys)
+        missing = [key for key in keys if not dict.__contains__(self, key)]
+        if missing:
+            self.update(self.store.get_prices(missing))
+        return {key: dict.__getitem__(self, key) for key in keys if dict.__contains__(self, key)}
+    
+    def clear(self):
+        """Forget current prices here and in the store."""
+        super().clear()
+        self.store.clear_current()
+
+
+class PriceHistory(dict):
+    """Price history by card key, read from the price store."""
+    
+    def __init__(self, store: PriceStore):
+        super().__init__()
+        self.store = store
+    
+    def __missing__(self, key: str) -> List[Dict]:
+        return self.store.history(key)
+    
+    def __contains__(self, key) -> bool:
+        return bool(self.store.history(key))
+    
+    def __len__(self) -> int:
+        return self.store.history_keys()
+    
+    def get(self, key, default=None):
+        return self.store.history(key) or default
+
+
 class PriceTracker:
     """
     Track card prices from multiple sources.
@@ -99,55 +448,40 @@ class PriceTracker:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.scryfall_client = scryfall_client
         
-        self.price_cache: Dict[str, CardPrice] = {}
-        self.price_history: Dict[str, List[Dict]] = defaultdict(list)
+        self.store = PriceStore(self.data_dir / 'prices.sqlite')
+        self.price_cache = PriceCache(self.store)
+        self.price_history = PriceHistory(self.store)
         
         self._load_cache()
         logger.info("PriceTracker initialized")
     
     def _load_cache(self):
-        """Load price cache from disk."""
+        """Move prices saved by earlier versions (JSON files) into the price store."""
         cache_file = self.data_dir / 'price_cache.json'
         history_file = self.data_dir / 'price_history.json'
         
         if cache_file.exists():
             try:
                 with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    self.price_cache = {
-                        key: CardPrice.from_dict(price_data)
-                        for key, price_data in data.items()
-                    }
-                logger.info(f"Loaded {len(self.price_cache)} cached prices")
+                    prices = {key: CardPrice.from_dict(price_data) for key, price_data in json.load(f).items()}
+                self.store.record(prices)
+                cache_file.rename(cache_file.with_suffix('.json.imported'))
+                logger.info(f"Imported {len(prices)} cached prices")
             except Exception as e:
-                logger.error(f"Failed to load price cache: {e}")
+                logger.error(f"Failed to import price cache: {e}")
         
         if history_file.exists():
             try:
                 with open(history_file, 'r') as f:
-                    self.price_history = defaultdict(list, json.load(f))
-                logger.info(f"Loaded price history for {len(self.price_history)} cards")
-            except Exception as e:
-                logger.error(f"Failed to load price history: {e}")
-    
-    def _save_cache(self):
-        """Save price cache to disk."""
-        try:
-            cache_file = self.data_dir / 'price_cache.json'
-            with open(cache_file, 'w') as f:
-                json.dump(
-                    {key: price.to_dict() for key, price in self.price_cache.items()},
-                    f,
-                    indent=2
+                    history = json.load(f)
+                self.store.append_history(
+                    (key, entry['date'], PriceSource.SCRYFALL.value, entry.get('price'), entry.get('price_foil'))
+                    for key, entries in history.items() for entry in entries
                 )
-            
-            history_file = self.data_dir / 'price_history.json'
-            with open(history_file, 'w') as f:
-                json.dump(dict(self.price_history), f, indent=2)
-            
-            logger.info("Saved price cache")
-        except Exception as e:
-            logger.error(f"Failed to save price cache: {e}")
+                history_file.rename(history_file.with_suffix('.json.imported'))
+                logger.info(f"Imported price history for {len(history)} cards")
+            except Exception as e:
+                logger.error(f"Failed to import price history: {e}")
     
     def _get_cache_key(self, card_name: str, set_code: str = "") -> str:
         """Generate cache key for card."""
@@ -165,32 +499,53 @@ class PriceTracker:
         Returns:
             CardPrice or None if not found
         """
-        cache_key = self._get_cache_key(card_name, set_code)
+        return self.get_card_prices([(card_name, set_code)], force_refresh).get(
+            self._get_cache_key(card_name, set_code)
+        )
+    
+    def get_card_prices(self, cards: Iterable[Tuple[str, str]],
+                        force_refresh: bool = False) -> Dict[str, CardPrice]:
+        """
+        Get prices for many cards with one store lookup.
         
-        # Check cache
-        if not force_refresh and cache_key in self.price_cache:
-            cached_price = self.price_cache[cache_key]
-            if not cached_price.is_stale():
-                logger.debug(f"Using cached price for {card_name}")
-                return cached_price
-        
-        # Fetch fresh price
-        price = self._fetch_price(card_name, set_code)
-        
-        if price:
-            # Update cache
-            self.price_cache[cache_key] = price
-            
-            # Add to history
-            self.price_history[cache_key].append({
-                'date': price.last_updated,
-                'price': price.price_usd,
-                'price_foil': price.price_usd_foil
-            })
+        Stored prices are loaded together; cards without a fresh price are
+        fetched and saved (with their history entries) in one transaction.
+        Only fetched prices go stale: prices ingested from a provider's price
+        file keep their own date and are replaced by the next ingest.
+        
+        Args:
+            cards: (card_name, set_code) pairs
+            force_refresh: Force fetch fresh data
             
-            self._save_cache()
+        Returns:
+            CardPrice by cache key, for the cards with a price
+        """
+        cards = {self._get_cache_key(card_name, set_code): (card_name, set_code)
+                 for card_name, set_code in cards}
+        prices: Dict[str, CardPrice] = {}
         
-        return price
+        # Check cache
+        if not force_refresh:
+            for cache_key, cached_price in self.price_cache.load(cards).items():
+                if cached_price.source != FETCH_SOURCE or not cached_price.is_stale():
+                    prices[cache_key] = cached_price
+            logger.debug(f"Using {len(prices)} cached prices")
+        
+        # Fetch fresh prices
+        fetched = {}
+        for cache_key, (card_name, set_code) in cards.items():
+            if cache_key not in prices:
+                price = self._fetch_price(card_name, set_code)
+                if price:
+                    fetched[cache_key] = price
+        
+        if fetched:
+            # Update cache and history
+            self.store.record(fetched)
+            self.price_cache.update(fetched)
+            prices.update(fetched)
+        
+        return prices
     
     def _fetch_price(self, card_name: str, set_code: str = "") -> Optional[CardPrice]:
         """
@@ -234,7 +589,7 @@ class PriceTracker:
             set_code=set_code,
             price_usd=round(base_price, 2),
             price_usd_foil=round(base_price * foil_multiplier, 2),
-            source=PriceSource.SCRYFALL.value
+            source=FETCH_SOURCE
         )
     
     def get_deck_value(self, deck_data: Dict, use_foil: bool = False) -> Dict:
@@ -252,31 +607,26 @@ class PriceTracker:
         sideboard_value = 0.0
         missing_prices = []
         
-        # Calculate mainboard value
-        for card in deck_data.get('mainboard', []):
-            card_name = card.get('name', '')
-            set_code = card.get('set_code', '')
-            quantity = card.get('quantity', 1)
-            
-            price = self.get_card_price(card_name, set_code)
-            if price:
-                card_price = price.price_usd_foil if use_foil and price.price_usd_foil else price.price_usd
-                mainboard_value += card_price * quantity
-            else:
-                missing_prices.append(card_name)
+        mainboard = deck_data.get('mainboard', [])
+        sideboard = deck_data.get('sideboard', [])
+        prices = self.get_card_prices(
+            (card.get('name', ''), card.get('set_code', '')) for card in mainboard + sideboard
+        )
         
-        # Calculate sideboard value
-        for card in deck_data.get('sideboard', []):
-            card_name = card.get('name', '')
-            set_code = card.get('set_code', '')
-            quantity = card.get('quantity', 1)
-            
-            price = self.get_card_price(card_name, set_code)
-            if price:
-                card_price = price.price_usd_foil if use_foil and price.price_usd_foil else price.price_usd
-                sideboard_value += card_price * quantity
-            else:
-                missing_prices.append(card_name)
+        for board, cards in (('mainboard', mainboard), ('sideboard', sideboard)):
+            for card in cards:
+                card_name = card.get('name', '')
+                quantity = card.get('quantity', 1)
+                
+                price = prices.get(self._get_cache_key(card_name, card.get('set_code', '')))
+                if price:
+                    card_price = price.price_usd_foil if use_foil and price.price_usd_foil else price.price_usd
+                    if board == 'mainboard':
+                        mainboard_value += card_price * quantity
+                    else:
+                        sideboard_value += card_price * quantity
+                else:
+                    missing_prices.append(card_name)
         
         total_value = mainboard_value + sideboard_value
         
@@ -305,9 +655,8 @@ class PriceTracker:
         return self.price_history.get(cache_key, [])
     
     def clear_cache(self):
-        """Clear all cached prices."""
+        """Clear all cached prices (the price history is kept)."""
         self.price_cache.clear()
-        self._save_cache()
         logger.info("Price cache cleared")
 
 
@@ -316,16 +665,20 @@ class BudgetAnalyzer:
     Analyze deck budget and provide cost breakdowns.
     """
     
-    def __init__(self, deck_data: Dict, price_tracker: Optional[PriceTracker] = None):
+    def __init__(self, deck_data: Dict, price_tracker: Optional[PriceTracker] = None,
+                 alternative_finder=None):
         """
         Initialize budget analyzer.
         
         Args:
             deck_data: Deck data
             price_tracker: PriceTracker instance
+            alternative_finder: BudgetAlternativeFinder with a built index, for
+                functionally similar replacements
         """
         self.deck_data = deck_data
         self.price_tracker = price_tracker or PriceTracker()
+        self.alternative_finder = alternative_finder
         logger.info("BudgetAnalyzer initialized")
     
     def get_price_breakdown(self) -> Dict:
@@ -346,13 +699,16 @@ class BudgetAnalyzer:
         all_cards = []
         all_cards.extend(self.deck_data.get('mainboard', []))
         all_cards.extend(self.deck_data.get('sideboard', []))
+        prices = self.price_tracker.get_card_prices(
+            (card.get('name', ''), card.get('set_code', '')) for card in all_cards
+        )
         
         for card in all_cards:
             card_name = card.get('name', '')
             set_code = card.get('set_code', '')
             quantity = card.get('quantity', 1)
             
-            price = self.price_tracker.get_card_price(card_name, set_code)
+            price = prices.get(self.price_tracker._get_cache_key(card_name, set_code))
             if price:
                 total_price = price.price_usd * quantity
                 breakdown['by_card'].append({
@@ -405,6 +761,9 @@ class BudgetAnalyzer:
         breakdown = self.get_price_breakdown()
         expensive = breakdown['expensive_cards']
         
+        if self.alternative_finder is not None:
+            return self._suggest_similar_cards(breakdown['by_card'], current_value, max_budget)
+        
         for card_data in expensive:
             if current_value <= max_budget:
                 break
@@ -423,6 +782,48 @@ class BudgetAnalyzer:
         logger.info(f"Generated {len(suggestions)} budget suggestions")
         return suggestions
     
+    def _suggest_similar_cards(self, by_card: List[Dict], current_value: float, max_budget: float) -> List[Dict]:
+        """
+        Replace the most expensive cards with cheaper similar ones until within budget.
+        
+        Args:
+            by_card: Priced cards, most expensive first
+            current_value: Current deck value
+            max_budget: Maximum budget
+            
+        Returns:
+            List of suggested alternatives
+        """
+        deck_cards = [(card['name'], card['quantity']) for card in by_card]
+        alternatives = {
+            suggestion['name']: suggestion['alternatives'][0]
+            for suggestion in self.alternative_finder.suggest_for_deck(
+                deck_cards, min_price=0.0, per_card=1, deck_format=self.deck_data.get('format')
+            )
+        }
+        
+        suggestions = []
+        for card_data in by_card:
+            if current_value <= max_budget:
+                break
+            alternative = alternatives.get(card_data['name'])
+            if alternative is None or alternative['price'] >= card_data['unit_price']:
+                continue
+            savings = (card_data['unit_price'] - alternative['price']) * card_data['quantity']
+            suggestions.append({
+                'card_name': card_data['name'],
+                'current_price': card_data['unit_price'],
+                'alternative_name': alternative['name'],
+                'alternative_set': None,
+                'alternative_price': alternative['price'],
+                'savings': savings,
+                'shared_tags': alternative['shared_tags']
+            })
+            current_value -= savings
+        
+        logger.info(f"Generated {len(suggestions)} budget suggestions")
+        return suggestions
+    
     def get_budget_summary(self, target_budget: Optional[float] = None) -> Dict:
         """
         Get budget summary with recommendations.
@@ -524,6 +925,8 @@ class PriceAlert:
         """
         Check all alerts and return triggered ones.
         
+        The prices of every pending alert's card are looked up together.
+        
         Args:
             price_tracker: PriceTracker instance
             
@@ -531,12 +934,11 @@ class PriceAlert:
             List of triggered alerts
         """
         triggered = []
+        pending = [alert for alert in self.alerts.values() if not alert['triggered']]
+        prices = price_tracker.get_card_prices((alert['card_name'], '') for alert in pending)
         
-        for alert_key, alert in self.alerts.items():
-            if alert['triggered']:
-                continue
-            
-            card_price = price_tracker.get_card_price(alert['card_name'])
+        for alert in pending:
+            card_price = prices.get(price_tracker._get_cache_key(alert['card_name']))
             if not card_price:
                 continue
             
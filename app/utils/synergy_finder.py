@@ -1,14 +1,71 @@
 """
 Card synergy detection system.
 Identifies potential synergies between cards based on mechanics, types, and abilities.
+
+Every tag (theme, produced resource, card type, creature type) has a bit
+position, so a card's tags are one integer and the producer/wants relation
+of each theme is a pair of masks: checking a pair of cards is a few AND
+operations. Card tags are computed once per card and cached by uuid, and
+build_tag_index tags the whole card index once per index build and stores
+the bitsets (SynergyTagStore) so later sessions only load them.
+
+Classes:
+    SynergyFinder: Detects and ranks card synergies
+    SynergyTagStore: SQLite store of card tag bitsets per index version
+
+Usage:
+    finder = SynergyFinder(repository)
+    finder.build_tag_index('data/mtg_index.sqlite', SynergyTagStore(path), index_version)
+    analysis = finder.analyze_deck_synergies(deck_cards)
 """
 
 import logging
-from typing import List, Dict, Tuple, Set
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 from collections import defaultdict
 
+from app.utils.versioned_store import VersionedStore, content_version
+
 logger = logging.getLogger(__name__)
 
+# (type line word, tag) added for card types
+CARD_TYPE_TAGS = (
+    ('Creature', 'creature'),
+    ('Instant', 'instant'),
+    ('Sorcery', 'sorcery'),
+    ('Artifact', 'artifact'),
+    ('Enchantment', 'enchantment'),
+)
+TRIBAL_PREFIX = 'tribal:'
+
+TAG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS synergy_tag_names (
+        version TEXT NOT NULL,
+        bit INTEGER NOT NULL,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (version, bit)
+    );
+    CREATE TABLE IF NOT EXISTS synergy_card_tags (
+        version TEXT NOT NULL,
+        uuid TEXT NOT NULL,
+        name TEXT,
+        bits TEXT NOT NULL,
+        PRIMARY KEY (version, uuid)
+    );
+"""
+# {keywords} is the keywords column, or NULL for indexes built before it existed
+CARD_TAG_QUERY = """
+    SELECT uuid, name, type_line, COALESCE(oracle_text, text) AS oracle_text, {keywords}
+    FROM cards
+"""
+
+
+def _card_field(card: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a card dictionary or Card object."""
+    value = card.get(name) if isinstance(card, dict) else getattr(card, name, None)
+    return default if value is None else value
+
 
 class SynergyFinder:
     """
@@ -77,6 +134,146 @@ class SynergyFinder:
                 'wants': ['ramp', 'land recursion']
             }
         }
+        self._compile_patterns()
+        # uuid -> (card name, tag bits)
+        self._card_bits: Dict[str, Tuple[str, int]] = {}
+    
+    def _compile_patterns(self):
+        """Assign a bit to every tag and turn each theme's relations into masks."""
+        self._tag_names: List[str] = []
+        self._tag_bits: Dict[str, int] = {}
+        self._tribal_mask = 0
+        
+        for theme in self.synergy_patterns:
+            self.tag_bit(theme)
+        self._theme_mask = (1 << len(self.synergy_patterns)) - 1
+        
+        # (keyword, bits added when it appears)
+        self._keyword_bits: List[Tuple[str, int]] = []
+        # (produces mask, wants mask) of each theme, in theme order
+        self._relations: List[Tuple[int, int]] = []
+        for theme, pattern in self.synergy_patterns.items():
+            produces = self._tags_to_bits(pattern['produces'])
+            wants = self._tags_to_bits(pattern['wants'])
+            for keyword in pattern['keywords']:
+                self._keyword_bits.append((keyword, produces | self.tag_bit(theme)))
+            self._relations.append((produces, wants))
+        self._relation_names = [f"{theme}_synergy" for theme in self.synergy_patterns]
+        # tag bits -> (themes it produces for, themes it wants), as theme bitsets
+        self._relation_cache: Dict[int, Tuple[int, int]] = {}
+        self._type_bits = [(word, self.tag_bit(tag)) for word, tag in CARD_TYPE_TAGS]
+    
+    def tag_bit(self, tag: str) -> int:
+        """
+        Get the bit of a tag, assigning the next free bit to a new tag.
+        
+        Args:
+            tag: Tag name (theme, card type, or 'tribal_' creature type)
+        
+        Returns:
+            Single-bit mask of the tag
+        """
+        index = self._tag_bits.get(tag)
+        if index is None:
+            index = len(self._tag_names)
+            self._tag_bits[tag] = index
+            self._tag_names.append(tag)
+            if tag.startswith(TRIBAL_PREFIX):
+                self._tribal_mask |= 1 << index
+        return 1 << index
+    
+    def _tags_to_bits(self, tags: Iterable[str]) -> int:
+        """Combine the bits of several tags."""
+        bits = 0
+        for tag in tags:
+            bits |= self.tag_bit(tag)
+        return bits
+    
+    def bit_names(self, bits: int, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Get the names of the bits set in a bitset.
+        
+        Args:
+            bits: Bitset to decode
+            names: Name of each bit (tag names by default)
+        
+        Returns:
+            Names of the set bits, in bit order
+        """
+        names = self._tag_names if names is None else names
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(names[low.bit_length() - 1])
+            bits ^= low
+        return result
+    
+    @property
+    def theme_count(self) -> int:
+        """Number of synergy themes; theme bitsets have one bit per theme, in pattern order."""
+        return len(self._relations)
+    
+    @property
+    def feature_mask(self) -> int:
+        """Tag bits that are a synergy reason when two cards share them (themes and creature types)."""
+        return self._theme_mask | self._tribal_mask
+    
+    def relation_masks(self, bits: int) -> Tuple[int, int]:
+        """
+        Get the themes a card's tags produce for and want.
+        
+        Args:
+            bits: Card tag bits
+        
+        Returns:
+            (themes produced for, themes wanted), as bitsets over the themes
+        """
+        masks = self._relation_cache.get(bits)
+        if masks is None:
+            produces_themes = wants_themes = 0
+            for index, (produces, wants) in enumerate(self._relations):
+                if bits & produces:
+                    produces_themes |= 1 << index
+                if bits & wants:
+                    wants_themes |= 1 << index
+            masks = self._relation_cache[bits] = (produces_themes, wants_themes)
+        return masks
+    
+    @property
+    def pattern_version(self) -> str:
+        """Short hash of the synergy patterns; stored tags are only reusable under the same one."""
+        return content_version(self.synergy_patterns)
+    
+    def tag_version(self, index_version: str) -> str:
+        """
+        Get the key stored tag bitsets are filed under.
+        
+        Args:
+            index_version: Card index version
+        
+        Returns:
+            Index version combined with the pattern version
+        """
+        return f"{index_version}/{self.pattern_version}"
+    
+    def card_tag_bits(self, uuid: str) -> Optional[Tuple[str, int]]:
+        """
+        Get a card's name and tag bits, looking the card up only the first time.
+        
+        Args:
+            uuid: Card UUID
+        
+        Returns:
+            (name, tag bits), or None if the card isn't found
+        """
+        entry = self._card_bits.get(uuid)
+        if entry is None:
+            card = self.repository.get_card_by_uuid(uuid)
+            if not card:
+                return None
+            entry = (_card_field(card, 'name'), self._card_tag_bits(card))
+            self._card_bits[uuid] = entry
+        return entry
     
     def find_synergies_with_card(self, card_uuid: str, deck_cards: List[str]) -> List[Dict]:
         """
@@ -89,29 +286,26 @@ class SynergyFinder:
         Returns:
             List of synergy dictionaries with card and reason
         """
-        target_card = self.repository.get_card_by_uuid(card_uuid)
-        if not target_card:
+        target = self.card_tag_bits(card_uuid)
+        if target is None:
             return []
+        target_bits = target[1]
         
         synergies = []
-        target_tags = self._get_card_tags(target_card)
-        
         for other_uuid in deck_cards:
             if other_uuid == card_uuid:
                 continue
             
-            other_card = self.repository.get_card_by_uuid(other_uuid)
-            if not other_card:
+            other = self.card_tag_bits(other_uuid)
+            if other is None:
                 continue
             
-            other_tags = self._get_card_tags(other_card)
-            
             # Check for synergies
-            synergy_reasons = self._check_synergy(target_tags, other_tags)
+            synergy_reasons = self.synergy_reasons(target_bits, other[1])
             
             if synergy_reasons:
                 synergies.append({
-                    'card': other_card,
+                    'card': self.repository.get_card_by_uuid(other_uuid),
                     'uuid': other_uuid,
                     'reasons': synergy_reasons,
                     'strength': len(synergy_reasons)
@@ -131,31 +325,28 @@ class SynergyFinder:
         Returns:
             Dictionary with synergy analysis
         """
-        card_uuids = [uuid for uuid, _ in deck_cards]
+        cards = [
+            (name, bits) + self.relation_masks(bits)
+            for name, bits in filter(None, (self.card_tag_bits(uuid) for uuid, _ in deck_cards))
+        ]
+        theme_mask, tribal_mask = self._theme_mask, self._tribal_mask
         
         # Find all pairwise synergies
         all_synergies = []
         synergy_themes = defaultdict(int)
         
-        for i, (uuid1, _) in enumerate(deck_cards):
-            card1 = self.repository.get_card_by_uuid(uuid1)
-            if not card1:
-                continue
-            
-            tags1 = self._get_card_tags(card1)
-            
-            for uuid2, _ in deck_cards[i+1:]:
-                card2 = self.repository.get_card_by_uuid(uuid2)
-                if not card2:
+        for i, (name1, bits1, produces1, wants1) in enumerate(cards):
+            for name2, bits2, produces2, wants2 in cards[i+1:]:
+                common = bits1 & bits2
+                related = (produces1 & wants2) | (produces2 & wants1)
+                if not (common & (theme_mask | tribal_mask) or related):
                     continue
-                
-                tags2 = self._get_card_tags(card2)
-                reasons = self._check_synergy(tags1, tags2)
+                reasons = self._reasons(common, related)
                 
                 if reasons:
                     all_synergies.append({
-                        'card1': card1.get('name'),
-                        'card2': card2.get('name'),
+                        'card1': name1,
+                        'card2': name2,
                         'reasons': reasons
                     })
                     
@@ -176,68 +367,75 @@ class SynergyFinder:
     
     def _get_card_tags(self, card: dict) -> Set[str]:
         """Extract synergy tags from card."""
-        tags = set()
-        
-        oracle_text = card.get('oracle_text', '').lower()
-        type_line = card.get('type_line', '')
-        keywords = [k.lower() for k in card.get('keywords', [])]
+        return set(self.bit_names(self._card_tag_bits(card)))
+    
+    def _card_tag_bits(self, card: Any) -> int:
+        """Extract synergy tags from a card dictionary or Card object as a bitset."""
+        return self._tag_text(
+            _card_field(card, 'oracle_text', ''),
+            _card_field(card, 'type_line', ''),
+            _card_field(card, 'keywords', [])
+        )
+    
+    def _tag_text(self, oracle_text: str, type_line: str, keywords: Iterable[str] = ()) -> int:
+        """Tag bits for a card's rules text, type line and keyword abilities."""
+        oracle_text = oracle_text.lower()
+        keyword_text = ' '.join(k.lower() for k in keywords)
+        bits = 0
         
         # Check against synergy patterns
-        for theme, pattern in self.synergy_patterns.items():
-            for keyword in pattern['keywords']:
-                if keyword in oracle_text or keyword in ' '.join(keywords):
-                    tags.update(pattern['produces'])
-                    tags.add(theme)
+        for keyword, keyword_bits in self._keyword_bits:
+            if keyword in oracle_text or keyword in keyword_text:
+                bits |= keyword_bits
         
         # Add card types
-        if 'Creature' in type_line:
-            tags.add('creature')
-        if 'Instant' in type_line:
-            tags.add('instant')
-        if 'Sorcery' in type_line:
-            tags.add('sorcery')
-        if 'Artifact' in type_line:
-            tags.add('artifact')
-        if 'Enchantment' in type_line:
-            tags.add('enchantment')
+        for word, type_bit in self._type_bits:
+            if word in type_line:
+                bits |= type_bit
         
         # Extract creature types for tribal
         if 'Creature' in type_line and '—' in type_line:
             types_part = type_line.split('—')[1].strip()
-            creature_types = types_part.split()
-            for ct in creature_types:
-                tags.add(f'tribal:{ct.lower()}')
+            for ct in types_part.split():
+                bits |= self.tag_bit(f'{TRIBAL_PREFIX}{ct.lower()}')
         
-        return tags
+        return bits
     
     def _check_synergy(self, tags1: Set[str], tags2: Set[str]) -> List[str]:
         """Check if two card tag sets synergize."""
-        reasons = []
+        return self.synergy_reasons(self._tags_to_bits(tags1), self._tags_to_bits(tags2))
+    
+    def synergy_reasons(self, bits1: int, bits2: int) -> List[str]:
+        """
+        Check if two cards' tag bitsets synergize.
         
-        # Direct theme matches
-        common_themes = tags1 & tags2
-        for theme in common_themes:
-            if theme in self.synergy_patterns:
-                reasons.append(theme)
+        Args:
+            bits1: Tag bits of one card
+            bits2: Tag bits of the other card
         
-        # Producer/consumer relationships
-        for theme, pattern in self.synergy_patterns.items():
-            produces = set(pattern['produces'])
-            wants = set(pattern['wants'])
-            
-            if tags1 & produces and tags2 & wants:
-                reasons.append(f"{theme}_synergy")
-            elif tags2 & produces and tags1 & wants:
-                reasons.append(f"{theme}_synergy")
-        
-        # Tribal synergies
-        tribal1 = {t for t in tags1 if t.startswith('tribal:')}
-        tribal2 = {t for t in tags2 if t.startswith('tribal:')}
-        common_tribes = tribal1 & tribal2
-        if common_tribes:
-            for tribe in common_tribes:
-                reasons.append(tribe)
+        Returns:
+            Synergy reasons (empty when the cards don't synergize)
+        """
+        produces1, wants1 = self.relation_masks(bits1)
+        produces2, wants2 = self.relation_masks(bits2)
+        return self._reasons(bits1 & bits2, (produces1 & wants2) | (produces2 & wants1))
+    
+    def _reasons(self, common: int, related: int) -> List[str]:
+        """
+        Name the synergies of a pair of cards.
         
+        Args:
+            common: Tag bits both cards have
+            related: Themes where one card produces what the other wants
+        
+        Returns:
+            Shared themes, then producer/consumer themes, then shared creature types
+        """
+        reasons = self.bit_names(common & self._theme_mask)
+        if related:
+            reasons.extend(self.bit_names(related, self._relation_names))
+        if common & self._tribal_mask:
+            reasons.extend(self.bit_names(common & self._tribal_mask))
         return reasons
     
     def _identify_archetypes(self, synergy_themes: Dict[str, int], deck_cards: List) -> List[str]:
@@ -286,35 +484,26 @@ class SynergyFinder:
         """
         suggestions = []
         
-        # Get tags for all deck cards
-        deck_tags = set()
-        for uuid in deck_cards:
-            card = self.repository.get_card_by_uuid(uuid)
-            if card:
-                deck_tags.update(self._get_card_tags(card))
+        # Get tags for all deck cards once
+        deck_bits = [entry[1] for entry in map(self.card_tag_bits, deck_cards) if entry]
+        in_deck = set(deck_cards)
         
         # Evaluate each card in pool
         for uuid in card_pool:
-            if uuid in deck_cards:
+            if uuid in in_deck:
                 continue
             
-            card = self.repository.get_card_by_uuid(uuid)
-            if not card:
+            entry = self.card_tag_bits(uuid)
+            if entry is None:
                 continue
-            
-            card_tags = self._get_card_tags(card)
+            card_bits = entry[1]
             
             # Calculate synergy with deck
             synergy_count = 0
             synergy_reasons = []
             
-            for deck_uuid in deck_cards:
-                deck_card = self.repository.get_card_by_uuid(deck_uuid)
-                if not deck_card:
-                    continue
-                
-                deck_card_tags = self._get_card_tags(deck_card)
-                reasons = self._check_synergy(card_tags, deck_card_tags)
+            for bits in deck_bits:
+                reasons = self.synergy_reasons(card_bits, bits)
                 
                 if reasons:
                     synergy_count += len(reasons)
@@ -322,7 +511,7 @@ class SynergyFinder:
             
             if synergy_count > 0:
                 suggestions.append({
-                    'card': card,
+                    'card': self.repository.get_card_by_uuid(uuid),
                     'uuid': uuid,
                     'synergy_count': synergy_count,
                     'reasons': list(set(synergy_reasons))[:5]  # Top 5 unique reasons
@@ -331,3 +520,108 @@ class SynergyFinder:
         # Sort by synergy count
         suggestions.sort(key=lambda x: x['synergy_count'], reverse=True)
         return suggestions[:limit]
+    
+    def build_tag_index(self,
+                        db_path: Union[str, Path],
+                        store: 'SynergyTagStore',
+                        index_version: str) -> int:
+        """
+        Load the tag bitsets for an index version, tagging every card if needed.
+        
+        Cards sharing a type line, rules text and keywords (reprints) are
+        tagged once. Keywords are read from the index's comma-separated
+        keywords column, as the repository does for Card objects.
+        Bitsets from other index or pattern versions are removed once the new
+        ones are stored.
+        
+        Args:
+            db_path: Card index database (cards table)
+            store: Tag store
+            index_version: Version of the card index
+        
+        Returns:
+            Number of cards with cached tags
+        """
+        version = self.tag_version(index_version)
+        if not store.has_version(version):
+            self._card_bits.clear()
+            by_text: Dict[Tuple[str, str, str], int] = {}
+            connection = sqlite3.connect(str(db_path))
+            try:
+                columns = {row[1] for row in connection.execute("PRAGMA table_info(cards)")}
+                query = CARD_TAG_QUERY.format(keywords='keywords' if 'keywords' in columns else 'NULL')
+                for uuid, name, type_line, oracle_text, keywords in connection.execute(query):
+                    key = (type_line or '', oracle_text or '', keywords or '')
+                    bits = by_text.get(key)
+                    if bits is None:
+                        bits = by_text[key] = self._tag_text(key[1], key[0], key[2].split(','))
+                    self._card_bits[uuid] = (name, bits)
+            finally:
+                connection.close()
+            store.save(version, self._tag_names, self._card_bits)
+            store.prune(keep=version)
+            logger.info(f"Stored synergy tags for {len(self._card_bits)} cards under {version}")
+            return len(self._card_bits)
+        
+        tag_names, cards = store.load(version)
+        self._compile_patterns()
+        for tag in tag_names:
+            self.tag_bit(tag)
+        if self._tag_names != tag_names:
+            raise ValueError(f"Stored synergy tags for {version} don't match the patterns")
+        self._card_bits = cards
+        return len(cards)
+
+
+class SynergyTagStore(VersionedStore):
+    """
+    SQLite store of card tag bitsets per version (SynergyFinder.tag_version).
+    
+    The tag of each bit is stored with the bitsets, so loaded bits are read
+    against the names they were built with.
+    """
+    
+    SCHEMA = TAG_SCHEMA
+    TABLES = ('synergy_tag_names', 'synergy_card_tags')
+    
+    def save(self, version: str, tag_names: List[str], cards: Dict[str, Tuple[str, int]]) -> None:
+        """
+        Store the tag of each bit and every card's bitset under a version.
+        
+        Args:
+            version: Tag version
+            tag_names: Tag of each bit position
+            cards: (name, tag bits) by card UUID
+        """
+        with self.connection:
+            self._delete_version(version)
+            self.connection.executemany(
+                "INSERT INTO synergy_tag_names (version, bit, tag) VALUES (?, ?, ?)",
+                ((version, bit, tag) for bit, tag in enumerate(tag_names))
+            )
+            # Hex text: bitsets outgrow SQLite's 64-bit integers once creature types are added
+            self.connection.executemany(
+                "INSERT INTO synergy_card_tags (version, uuid, name, bits) VALUES (?, ?, ?, ?)",
+                ((version, uuid, name, format(bits, 'x')) for uuid, (name, bits) in cards.items())
+            )
+    
+    def load(self, version: str) -> Tuple[List[str], Dict[str, Tuple[str, int]]]:
+        """
+        Load everything stored under a version.
+        
+        Args:
+            version: Tag version
+        
+        Returns:
+            (tag of each bit position, (name, tag bits) by card UUID)
+        """
+        tag_names = [row[0] for row in self.connection.execute(
+            "SELECT tag FROM synergy_tag_names WHERE version = ? ORDER BY bit", (version,)
+        )]
+        cards = {
+            uuid: (name, int(bits, 16))
+            for uuid, name, bits in self.connection.execute(
+                "SELECT uuid, name, bits FROM synergy_card_tags WHERE version = ?", (version,)
+            )
+        }
+        return tag_names, cards
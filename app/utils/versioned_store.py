@@ -0,0 +1,114 @@
+"""
+SQLite stores of precomputed card data filed under a version string.
+
+Card profiles and synergy tag bitsets are computed once per card index
+build and stored under a version combining the index version with a short
+hash of the rules that produced them (content_version). A rebuilt index or
+an edited rule set gives a new version, so stale data is never served, and
+prune() drops every other version once the new one is stored.
+
+Classes:
+    SQLiteStore: Base class for SQLite stores opened with a schema
+    VersionedStore: Base class for SQLite stores keyed by version
+
+Functions:
+    content_version: Short hash of JSON-serializable content
+
+Usage:
+    class ProfileStore(VersionedStore):
+        SCHEMA = "CREATE TABLE IF NOT EXISTS profiles (version TEXT NOT NULL, ...);"
+        TABLES = ("profiles",)
+
+    store = ProfileStore("data/profiles.sqlite")
+    if not store.has_version(version):
+        ...
+        store.prune(keep=version)
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, List, Tuple, Union
+
+
+def content_version(content: Any) -> str:
+    """
+    Get a short hash of JSON-serializable content (patterns, effect libraries).
+    
+    Args:
+        content: Value to hash; dictionaries are hashed with sorted keys
+    
+    Returns:
+        First 12 hex digits of the SHA-1 of the JSON encoding
+    """
+    encoded = json.dumps(content, sort_keys=True)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:12]
+
+
+class SQLiteStore:
+    """
+    SQLite store opened with a schema.
+    
+    Subclasses set SCHEMA (run on open) and add their own methods.
+    """
+    
+    SCHEMA = ""
+    
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        """
+        Open (or create) a store.
+        
+        Args:
+            db_path: SQLite database file (":memory:" for a temporary store)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+
+class VersionedStore(SQLiteStore):
+    """
+    SQLite store whose rows are filed under a version string.
+    
+    Subclasses set SCHEMA (run on open) and TABLES (every table with a
+    version column; the first one is checked for stored versions) and add
+    their own save/load methods.
+    """
+    
+    TABLES: Tuple[str, ...] = ()
+    
+    def has_version(self, version: str) -> bool:
+        """Check whether anything is stored for a version."""
+        row = self.connection.execute(
+            f"SELECT 1 FROM {self.TABLES[0]} WHERE version = ? LIMIT 1", (version,)
+        ).fetchone()
+        return row is not None
+    
+    def versions(self) -> List[str]:
+        """Get every stored version."""
+        return [row[0] for row in self.connection.execute(
+            f"SELECT DISTINCT version FROM {self.TABLES[0]} ORDER BY version"
+        )]
+    
+    def _delete_version(self, version: str) -> None:
+        """Remove everything stored under a version, inside the caller's transaction."""
+        for table in self.TABLES:
+            self.connection.execute(f"DELETE FROM {table} WHERE version = ?", (version,))
+    
+    def prune(self, keep: str) -> None:
+        """
+        Remove everything stored under every version but one.
+        
+        Args:
+            keep: Version to keep
+        """
+        with self.connection:
+            for table in self.TABLES:
+                self.connection.execute(f"DELETE FROM {table} WHERE version != ?", (keep,))
@@ -0,0 +1,155 @@
+"""Board evaluator benchmarking script."""
+import random
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.enhanced_ai import KEYWORD_BONUS, BoardEvaluator, _is_creature, _is_land
+from app.game.game_engine import Card, GameEngine
+
+BOARD_SIZES = (10, 40, 160)
+EVALUATIONS = 5000
+# One game action (tap, damage, pump, creature in/out) every this many evaluations
+MUTATE_EVERY = 10
+SEED = 7
+
+
+class RescanBoardEvaluator(BoardEvaluator):
+    """The previous evaluator: rescans every zone and rescores every creature per call."""
+
+    def evaluate_board(self, game_engine, player_id: int) -> float:
+        score = 0.0
+        player_life = game_engine.players[player_id].life
+        opponent_life = sum(
+            p.life for i, p in enumerate(game_engine.players) if i != player_id
+        ) / max(1, len(game_engine.players) - 1)
+        score += (player_life - opponent_life) * self.weights['life']
+
+        hand_size = len(game_engine.zones[player_id]['hand'])
+        opponent_hand = sum(
+            len(game_engine.zones[i]['hand'])
+            for i in range(len(game_engine.players)) if i != player_id
+        ) / max(1, len(game_engine.players) - 1)
+        score += (hand_size - opponent_hand) * self.weights['cards_in_hand']
+
+        battlefield = game_engine.zones[player_id]['battlefield']
+        creatures = [c for c in battlefield if _is_creature(c)]
+        creature_power = sum(c.power or 0 for c in creatures)
+        opponent_creatures = []
+        for i in range(len(game_engine.players)):
+            if i != player_id:
+                opponent_bf = game_engine.zones[i]['battlefield']
+                opponent_creatures.extend([c for c in opponent_bf if _is_creature(c)])
+        opponent_power = sum(c.power or 0 for c in opponent_creatures)
+        score += (creature_power - opponent_power) * self.weights['creatures']
+
+        lands = [c for c in battlefield if _is_land(c)]
+        score += len(lands) * self.weights['mana_sources']
+        return score
+
+    def evaluate_creature(self, creature) -> float:
+        if not _is_creature(creature):
+            return 0.0
+        value = (creature.power or 0) + (getattr(creature, 'toughness', None) or 0)
+        if hasattr(creature, 'keywords'):
+            for keyword in creature.keywords:
+                kw_name = keyword.value if hasattr(keyword, 'value') else str(keyword)
+                value += KEYWORD_BONUS.get(kw_name.lower(), 0.5)
+        return value
+
+    def find_best_target(self, game_engine, player_id: int, target_type: str = "creature"):
+        targets = []
+        for i in range(len(game_engine.players)):
+            if i == player_id:
+                continue
+            battlefield = game_engine.zones[i]['battlefield']
+            if target_type == "creature":
+                targets.extend([c for c in battlefield if _is_creature(c)])
+        if not targets:
+            return None
+        scored = [(self.evaluate_creature(t), t) for t in targets]
+        scored.sort(reverse=True, key=lambda x: x[0])
+        return scored[0][1]
+
+
+def make_engine(rng: random.Random, permanents: int) -> GameEngine:
+    """Two players with half creatures, half lands each."""
+    engine = GameEngine()
+    for player_id in range(2):
+        engine.add_player(f"Player {player_id + 1}", [])
+        player = engine.players[player_id]
+        for i in range(permanents):
+            if i % 2:
+                card = Card(name=f"Land {i}", types=["Land"], controller=player_id)
+            else:
+                card = Card(name=f"Creature {i}", types=["Creature"], controller=player_id,
+                            power=rng.randint(0, 6), toughness=rng.randint(1, 6))
+            player.battlefield.append(card)
+        for i in range(7):
+            player.hand.append(Card(name=f"Spell {i}", types=["Instant"], controller=player_id))
+    return engine
+
+
+def mutate(rng: random.Random, engine: GameEngine, step: int):
+    """Apply one game action."""
+    player = engine.players[rng.randrange(2)]
+    creatures = player.battlefield.creatures()
+    action = step % 4
+    if action == 0 and creatures:
+        card = rng.choice(creatures)
+        card.tapped = not card.tapped
+    elif action == 1 and creatures:
+        rng.choice(creatures).damage += 1
+    elif action == 2 and creatures:
+        rng.choice(creatures).power += 1
+    elif action == 3:
+        if creatures and rng.random() < 0.5:
+            engine.move_to_graveyard(rng.choice(creatures))
+        else:
+            player.battlefield.append(Card(name="Token", types=["Creature"], power=1,
+                                           toughness=1, controller=player.player_id))
+
+
+def run(evaluator_class, permanents: int) -> tuple:
+    """Evaluate boards and targets between game actions; returns (seconds, results)."""
+    rng = random.Random(SEED)
+    engine = make_engine(rng, permanents)
+    evaluator = evaluator_class()
+    results = []
+    elapsed = 0.0
+    for step in range(EVALUATIONS):
+        if step % MUTATE_EVERY == 0:
+            mutate(rng, engine, step // MUTATE_EVERY)
+        start = time.perf_counter()
+        scores = (evaluator.evaluate_board(engine, 0), evaluator.evaluate_board(engine, 1))
+        target = evaluator.find_best_target(engine, 0)
+        elapsed += time.perf_counter() - start
+        results.append((scores, target.name if target else None))
+    return elapsed, results
+
+
+def main():
+    """Run board evaluator benchmarks."""
+    print("=" * 60)
+    print("BOARD EVALUATOR BENCHMARK")
+    print("=" * 60)
+    print()
+
+    for size in BOARD_SIZES:
+        rescan_time, rescan_results = run(RescanBoardEvaluator, size)
+        cached_time, cached_results = run(BoardEvaluator, size)
+        same = "equal" if rescan_results == cached_results else "MISMATCH"
+        per_call = 1e6 / EVALUATIONS
+        print(f"{size} permanents per player ({EVALUATIONS} evaluations, scores {same}):")
+        print(f"  Rescan      {rescan_time * per_call:8.1f}us/evaluation")
+        print(f"  Incremental {cached_time * per_call:8.1f}us/evaluation  "
+              f"({rescan_time / cached_time:.1f}x)")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
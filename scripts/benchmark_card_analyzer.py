@@ -0,0 +1,192 @@
+"""Card effect analyzer benchmarking script."""
+import os
+import random
+import tempfile
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.card_effect_analyzer import (
+    MECHANIC_CATEGORIES, BoardState, CardAnalyzer, CardProfile, CardProfileStore, CastContext
+)
+
+LIBRARY_DIR = Path(__file__).parent.parent / "app" / "game"
+CARD_COUNTS = (2000, 20000)
+WORDS_PER_CARD = 40
+DETECTIONS = 20000
+SEED = 11
+
+FILLER = ("target", "creature", "you", "control", "each", "opponent", "card", "the", "a",
+          "of", "to", "and", "until", "end", "turn", "gets", "+1/+1", "deals", "damage")
+TYPES = ("Creature", "Instant", "Sorcery", "Artifact", "Enchantment", "Land", "Planeswalker")
+SUBTYPES = ("Elf", "Goblin", "Dragon", "Human", "Wizard", "Zombie", "Angel", "Merfolk")
+
+
+class SubstringCardAnalyzer(CardAnalyzer):
+    """The previous analyzer: one lowercase substring search per pattern per card and event."""
+
+    def analyze_card(self, card_data):
+        profile = super().analyze_card(card_data)
+        profile.impact_event_tags = None
+        return profile
+
+    def _tag_text(self, profile: CardProfile) -> None:
+        text_lower = profile.oracle_text.lower()
+        for category in MECHANIC_CATEGORIES:
+            for entry in self.effect_library.get(category, []):
+                for pattern in entry.get("matchPatterns", []):
+                    if pattern.lower() in text_lower:
+                        profile.mechanic_tags.add(entry.get("mechanicTag", ""))
+                        break
+        combined_text = (profile.oracle_text + " " + profile.flavor_text).lower()
+        for flavor_profile in self.effect_library.get("flavorCues", []):
+            for pattern in flavor_profile.get("matchPatterns", []):
+                if pattern.lower() in combined_text:
+                    profile.flavor_tags.add(flavor_profile.get("flavorTag", ""))
+                    break
+
+    def _tag_types(self, profile: CardProfile) -> None:
+        type_line = " ".join(profile.types + profile.subtypes).lower()
+        for category in MECHANIC_CATEGORIES:
+            for entry in self.effect_library.get(category, []):
+                for pattern in entry.get("matchPatterns", []):
+                    if pattern.lower() in type_line:
+                        profile.mechanic_tags.add(entry.get("mechanicTag", ""))
+                        break
+        for type_profile in self.effect_library.get("cardTypeProfiles", []):
+            card_type = type_profile.get("cardTypeTag", "").lower()
+            if card_type in type_line:
+                profile.mechanic_tags.add(f"type::{card_type}")
+        subtypes = " ".join(profile.subtypes).lower()
+        for tribal_profile in self.effect_library.get("tribalAndFlavorProfiles", []):
+            for pattern in tribal_profile.get("matchPatterns", []):
+                if pattern.lower() in subtypes:
+                    profile.tribal_tags.add(tribal_profile.get("tribalTag", ""))
+                    break
+
+    def detect_high_impact_events(self, profile, board, context):
+        matches = []
+        for event in self.high_impact_events.get("highImpactEventProfiles", []):
+            patterns = event.get("triggerHeuristics", {}).get("cardTextPatterns", [])
+            text_lower = profile.oracle_text.lower()
+            if patterns and not any(pattern.lower() in text_lower for pattern in patterns):
+                continue
+            heuristics = event.get("triggerHeuristics", {})
+            if heuristics.get("boardStateConditions") and not self._check_board_conditions(
+                    board, context.controller, heuristics["boardStateConditions"]):
+                continue
+            if heuristics.get("numericThresholds") and not self._check_numeric_thresholds(
+                    board, context, heuristics["numericThresholds"]):
+                continue
+            matches.append(event)
+        return matches
+
+
+def library_paths():
+    """Paths of the shipped libraries."""
+    return (LIBRARY_DIR / "effect_library.json", LIBRARY_DIR / "high_impact_events.json",
+            LIBRARY_DIR / "card_profile_template.json")
+
+
+def make_cards(rng: random.Random, count: int, analyzer: CardAnalyzer) -> list:
+    """Cards whose text mixes library patterns with filler words."""
+    patterns = [
+        pattern
+        for entries in analyzer.effect_library.values()
+        for entry in entries
+        for pattern in entry.get("matchPatterns", [])
+    ] + [
+        pattern
+        for event in analyzer.high_impact_events.get("highImpactEventProfiles", [])
+        for pattern in event.get("triggerHeuristics", {}).get("cardTextPatterns", [])
+    ]
+    cards = []
+    for i in range(count):
+        words = [rng.choice(patterns) if rng.random() < 0.1 else rng.choice(FILLER)
+                 for _ in range(WORDS_PER_CARD)]
+        cards.append({
+            "name": f"Card {i}",
+            "types": [rng.choice(TYPES)],
+            "subtypes": rng.sample(SUBTYPES, rng.randint(0, 2)),
+            "rarity": rng.choice(("common", "uncommon", "rare", "mythic")),
+            "text": " ".join(words),
+            "flavorText": " ".join(rng.choice(FILLER) for _ in range(12)),
+        })
+    return cards
+
+
+def time_analysis(analyzer_class, cards: list) -> tuple:
+    """Analyze every card; returns (seconds, tags per card)."""
+    analyzer = analyzer_class(*library_paths())
+    start = time.perf_counter()
+    profiles = [analyzer.analyze_card(card) for card in cards]
+    elapsed = time.perf_counter() - start
+    return elapsed, [(p.mechanic_tags, p.tribal_tags, p.flavor_tags) for p in profiles]
+
+
+def time_detection(analyzer_class, cards: list) -> tuple:
+    """Detect high-impact events for cast cards; returns (seconds, event tags)."""
+    rng = random.Random(SEED)
+    analyzer = analyzer_class(*library_paths())
+    profiles = [analyzer.analyze_card(card) for card in cards[:500]]
+    board = BoardState()
+    board.creatures_on_board = {"you": [1] * 3, "opponent": [1] * 4}
+    board.graveyards = {"you": [1] * 4, "opponent": []}
+    board.spells_cast_this_turn = {"you": 3, "opponent": 0}
+    casts = [rng.choice(profiles) for _ in range(DETECTIONS)]
+
+    results = []
+    start = time.perf_counter()
+    for profile in casts:
+        context = CastContext(card=profile, controller="you", x_value=10)
+        results.append([e["eventTag"] for e in analyzer.detect_high_impact_events(profile, board, context)])
+    return time.perf_counter() - start, results
+
+
+def main():
+    """Run card analyzer benchmarks."""
+    print("=" * 60)
+    print("CARD EFFECT ANALYZER BENCHMARK")
+    print("=" * 60)
+    print()
+
+    rng = random.Random(SEED)
+    for count in CARD_COUNTS:
+        cards = make_cards(rng, count, CardAnalyzer(*library_paths()))
+        old_time, old_tags = time_analysis(SubstringCardAnalyzer, cards)
+        new_time, new_tags = time_analysis(CardAnalyzer, cards)
+        same = "equal" if old_tags == new_tags else "MISMATCH"
+        print(f"Profiling {count} cards (tags {same}):")
+        print(f"  Substring scan    {old_time * 1e6 / count:8.1f}us/card")
+        print(f"  Compiled matcher  {new_time * 1e6 / count:8.1f}us/card  ({old_time / new_time:.1f}x)")
+
+        analyzer = CardAnalyzer(*library_paths())
+        start = time.perf_counter()
+        analyzer.analyze_batch(cards)
+        batch_time = time.perf_counter() - start
+        print(f"  Batch, {os.cpu_count()} CPU(s)  {batch_time * 1e6 / count:8.1f}us/card  ({old_time / batch_time:.1f}x)")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CardProfileStore(Path(tmp) / "profiles.sqlite")
+            store.save("bench", analyzer._card_cache.values())
+            start = time.perf_counter()
+            store_count = len(store.load("bench"))
+            load_time = time.perf_counter() - start
+            store.close()
+        print(f"  Load stored       {load_time * 1e6 / store_count:8.1f}us/card")
+        print()
+
+    old_time, old_events = time_detection(SubstringCardAnalyzer, cards)
+    new_time, new_events = time_detection(CardAnalyzer, cards)
+    same = "equal" if old_events == new_events else "MISMATCH"
+    print(f"High-impact detection ({DETECTIONS} casts, events {same}):")
+    print(f"  Substring scan    {old_time * 1e6 / DETECTIONS:8.1f}us/cast")
+    print(f"  Profile lookup    {new_time * 1e6 / DETECTIONS:8.1f}us/cast  ({old_time / new_time:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
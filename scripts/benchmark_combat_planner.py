@@ -0,0 +1,97 @@
+"""Combat planner benchmarking script."""
+import random
+import time
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.combat_planner import (
+    CombatPlanner, LETHAL, creature_signature, life_point_value, resolve_group,
+    signature_value
+)
+
+BOARD_SIZES = (4, 8, 16, 24, 32)
+BUDGETS = (2000, 5000, 20000)
+KEYWORDS = ["", "", "", "Flying", "Reach", "First strike", "Double strike",
+            "Deathtouch", "Trample", "Lifelink", "Vigilance", "Menace"]
+LIFE = 12
+SEED = 99
+
+
+def make_board(rng: random.Random, size: int, prefix: str) -> list:
+    """Random creatures with combat keywords."""
+    return [
+        SimpleNamespace(name=f"{prefix}{i}", power=rng.randint(1, 6),
+                        toughness=rng.randint(1, 6), damage=0,
+                        oracle_text=rng.choice(KEYWORDS))
+        for i in range(size)
+    ]
+
+
+def greedy_blocks(attackers: list, blockers: list) -> list:
+    """Block the old way: biggest attacker first, with a blocker that kills it and survives."""
+    available = list(blockers)
+    pairs = []
+    for attacker in sorted(attackers, key=lambda a: a.power, reverse=True):
+        for blocker in available:
+            if blocker.toughness > attacker.power and blocker.power >= attacker.toughness:
+                pairs.append((blocker, attacker))
+                available.remove(blocker)
+                break
+    return pairs
+
+
+def block_value(attackers: list, pairs: list, life: int) -> float:
+    """Score blocks with the planner's objective (defender's point of view)."""
+    value = 0.0
+    damage = 0
+    for attacker in attackers:
+        group = [blocker for blocker, blocked in pairs if blocked is attacker]
+        group.sort(key=lambda b: -signature_value(creature_signature(b)))
+        outcome = resolve_group(creature_signature(attacker),
+                                tuple(creature_signature(b) for b in group))
+        damage += outcome.player_damage
+        value += outcome.defender_life_gain * life_point_value(life)
+        if outcome.attacker_dies:
+            value += signature_value(creature_signature(attacker))
+        for blocker, dead in zip(group, outcome.blockers_dead):
+            if dead:
+                value -= signature_value(creature_signature(blocker))
+    return value - (LETHAL if damage >= life else damage * life_point_value(life))
+
+
+def main():
+    """Run combat planner benchmarks."""
+    print("=" * 60)
+    print("COMBAT PLANNER BENCHMARK")
+    print("=" * 60)
+    print()
+
+    for size in BOARD_SIZES:
+        rng = random.Random(SEED + size)
+        ours, theirs = make_board(rng, size, "A"), make_board(rng, size, "D")
+        greedy = block_value(ours, greedy_blocks(ours, theirs), LIFE)
+        print(f"{size} vs {size} creatures (greedy blocks value {greedy:.1f}):")
+        for budget in BUDGETS:
+            planner = CombatPlanner(max_evaluations=budget)
+            start = time.perf_counter()
+            attack = planner.plan_attacks(ours, theirs, LIFE, LIFE)
+            attack_ms = (time.perf_counter() - start) * 1000
+
+            planner.clear_cache()
+            start = time.perf_counter()
+            blocks = planner.plan_blocks(ours, theirs, LIFE)
+            block_ms = (time.perf_counter() - start) * 1000
+            print(f"  budget {budget:6d}  attack {attack_ms:8.1f}ms "
+                  f"({len(attack.attackers):2d} attack)  "
+                  f"block {block_ms:8.1f}ms (value {blocks.value:7.1f}, "
+                  f"{'exact' if blocks.exact else 'budget'})")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
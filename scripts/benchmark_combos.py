@@ -0,0 +1,79 @@
+"""Combo detection benchmarking script."""
+import random
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.combo_detector import Combo, ComboDetector, ComboStore
+
+COMBOS = 30_000
+CARD_POOL = 25_000
+DECK_SIZE = 100
+DECKS = 20
+SEED = 11
+
+
+def generated_combos(rng: random.Random) -> list:
+    """Combos of two to four cards drawn from the card pool."""
+    return [
+        Combo(name=f'Combo {i}', cards=[f'Card {c}' for c in rng.sample(range(CARD_POOL), rng.randint(2, 4))],
+              description='', steps=[], result='', colors=set(), combo_type='win',
+              difficulty='easy', requires_setup=False)
+        for i in range(COMBOS)
+    ]
+
+
+def linear_partial(combos: list, card_names: list) -> list:
+    """The previous scan: compare every combo with the deck."""
+    names = set(card_names)
+    found = []
+    for combo in combos:
+        pieces = set(combo.cards)
+        present, missing = pieces & names, pieces - names
+        if present and missing and len(missing) <= 2:
+            found.append(combo.name)
+    return found
+
+
+def main():
+    """Run combo detection benchmarks."""
+    print("=" * 60)
+    print("COMBO DETECTION BENCHMARK")
+    print("=" * 60)
+    rng = random.Random(SEED)
+    combos = generated_combos(rng)
+    decks = [[f'Card {c}' for c in rng.sample(range(CARD_POOL), DECK_SIZE)] for _ in range(DECKS)]
+    print(f"{COMBOS} combos, {DECKS} decks of {DECK_SIZE} cards")
+    print()
+
+    start = time.perf_counter()
+    store = ComboStore()
+    store.add_combos(combos)
+    import_time = time.perf_counter() - start
+    start = time.perf_counter()
+    detector = ComboDetector(repository=None, store=store)
+    startup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [linear_partial(combos, deck) for deck in decks]
+    linear_time = (time.perf_counter() - start) / DECKS
+
+    start = time.perf_counter()
+    indexed = [detector.find_partial_combos(deck) for deck in decks]
+    indexed_time = (time.perf_counter() - start) / DECKS
+
+    same = all(sorted(p['combo'].name for p in found) == sorted(names)
+               for found, names in zip(indexed, expected))
+    print(f"Import:            {import_time:8.2f}s (once per dataset)")
+    print(f"Detector startup:  {startup_time * 1000:8.2f}ms")
+    print(f"Linear scan:       {linear_time * 1000:8.2f}ms per deck")
+    print(f"Indexed lookup:    {indexed_time * 1000:8.2f}ms per deck")
+    print(f"Results equal:     {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Hand simulator benchmarking script."""
+import random
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.hand_simulator import HandSimulator, np
+
+TRIALS = 100_000
+# The previous per-trial loop is slow; time it on fewer trials and scale up
+REFERENCE_TRIALS = 2000
+GOLDFISH_TURNS = 4
+SEED = 3
+
+CARDS = {
+    'mountain': {'name': 'Mountain', 'type_line': 'Basic Land — Mountain',
+                 'oracle_text': '({T}: Add {R}.)', 'mana_value': 0},
+    'forest': {'name': 'Forest', 'type_line': 'Basic Land — Forest',
+               'oracle_text': '({T}: Add {G}.)', 'mana_value': 0},
+    'elf': {'name': 'Llanowar Elves', 'type_line': 'Creature — Elf Druid',
+            'oracle_text': '{T}: Add {G}.', 'mana_value': 1},
+    'bolt': {'name': 'Lightning Bolt', 'type_line': 'Instant', 'oracle_text': '', 'mana_value': 1},
+    'bear': {'name': 'Grizzly Bears', 'type_line': 'Creature — Bear', 'oracle_text': '',
+             'mana_value': 2},
+    'centaur': {'name': 'Centaur Courser', 'type_line': 'Creature — Centaur', 'oracle_text': '',
+                'mana_value': 3},
+    'giant': {'name': 'Hill Giant', 'type_line': 'Creature — Giant', 'oracle_text': '',
+              'mana_value': 4},
+    'dragon': {'name': 'Shivan Dragon', 'type_line': 'Creature — Dragon', 'oracle_text': '',
+               'mana_value': 6},
+}
+
+
+class CardRepository:
+    """In-memory stand-in for MTGRepository (a real lookup is a SQLite query)."""
+
+    def get_card_by_uuid(self, uuid):
+        return CARDS.get(uuid)
+
+
+def deck_with_lands(lands: int) -> list:
+    """A 60-card red-green deck with the given land count."""
+    spells = 60 - lands
+    return [
+        ('mountain', lands // 2), ('forest', lands - lands // 2),
+        ('elf', 4), ('bolt', 4), ('bear', spells // 4), ('centaur', spells // 4),
+        ('giant', spells - 8 - 2 * (spells // 4) - 2), ('dragon', 2),
+    ]
+
+
+def run_reference(simulator: HandSimulator, deck: list) -> float:
+    """Seconds per trial of the previous loop (shuffle and look up every hand)."""
+    random.seed(SEED)
+    start = time.perf_counter()
+    for _ in range(REFERENCE_TRIALS):
+        simulator.analyze_hand(simulator.simulate_opening_hand(deck))
+    return (time.perf_counter() - start) / REFERENCE_TRIALS
+
+
+def main():
+    """Run hand simulator benchmarks."""
+    print("=" * 60)
+    print("HAND SIMULATOR BENCHMARK")
+    print("=" * 60)
+    print(f"{TRIALS} trials per run ({'NumPy' if np is not None else 'pure Python'})")
+    print()
+
+    simulator = HandSimulator(CardRepository())
+    reference = run_reference(simulator, deck_with_lands(24))
+    print(f"Previous loop: {reference * TRIALS:.2f}s per {TRIALS} hands (estimated)")
+    print()
+
+    for lands in (23, 24):
+        deck = deck_with_lands(lands)
+        start = time.perf_counter()
+        hands = simulator.run_simulation(deck, num_trials=TRIALS, seed=SEED)
+        hands_time = time.perf_counter() - start
+        start = time.perf_counter()
+        goldfish = simulator.goldfish_simulation(deck, turns=GOLDFISH_TURNS, num_trials=TRIALS, seed=SEED)
+        goldfish_time = time.perf_counter() - start
+
+        turn_four = goldfish['turn_by_turn'][3]
+        print(f"{lands} lands:")
+        print(f"  Opening hands  {hands_time:6.2f}s  keep {hands['keepable_rate']:5.1f}%  "
+              f"avg lands {hands['avg_lands_in_hand']:.2f}")
+        print(f"  Goldfish       {goldfish_time:6.2f}s  turn-4 land drop {turn_four['land_drop_rate']:5.1f}%  "
+              f"mana used {goldfish['mana_efficiency']:5.1f}%  curve-out {goldfish['curve_out_rate']:5.1f}%")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Particle system frame-time benchmarking script."""
+import math
+import random
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.color_particles import (
+    COLOR_PROFILES, ManaColor, MulticolorParticleEmitter, Particle, ParticleEmitter,
+    ParticleSystem
+)
+
+# Live particles on screen (particles live 1s on average, so this is also particles/second)
+PARTICLE_COUNTS = (1000, 5000, 20000, 50000)
+EFFECTS = 8  # Spell/ETB effects on screen at once
+FRAME_TIME = 1 / 60
+FRAME_BUDGET_MS = 16.0
+WARMUP_FRAMES = 90
+MEASURED_FRAMES = 240
+SEED = 5
+
+
+class ListEmitter:
+    """The previous emitter: a list of Particle objects updated one by one."""
+
+    def __init__(self, x: float, y: float, profile, emission_rate: int):
+        self.x, self.y = x, y
+        self.profile = profile
+        self.emission_rate = emission_rate
+        self.carry = 0.0
+        self.particles = []
+
+    def update(self, delta_time: float):
+        self.carry += self.emission_rate * delta_time
+        count = int(self.carry)
+        self.carry -= count
+        for _ in range(count):
+            angle = random.uniform(0, 2 * math.pi)
+            speed = random.uniform(50, 150)
+            mix = random.random()
+            color = tuple(int(a * (1 - mix) + b * mix)
+                          for a, b in zip(self.profile.primary_rgb, self.profile.secondary_rgb))
+            self.particles.append(Particle(
+                x=self.x, y=self.y, velocity_x=math.cos(angle) * speed,
+                velocity_y=math.sin(angle) * speed, lifetime=random.uniform(0.5, 1.5),
+                color=color, size=random.uniform(3, 8)
+            ))
+        self.particles = [p for p in self.particles if p.update(delta_time)]
+
+    @property
+    def count(self) -> int:
+        return len(self.particles)
+
+
+def make_effects(particles: int, kind: str) -> list:
+    """Emitters sharing the particle load, alternating single and multicolor effects."""
+    rate = particles // EFFECTS
+    colors = list(ManaColor)
+    effects = []
+    for i in range(EFFECTS):
+        x, y = 100 + 120 * i, 360
+        if kind == "list":
+            effects.append(ListEmitter(x, y, COLOR_PROFILES[colors[i % 6]], rate))
+        elif i % 2:
+            effects.append(MulticolorParticleEmitter(x, y, [colors[i % 5], colors[(i + 1) % 5]],
+                                                     emission_rate=rate, duration=1e9, seed=SEED + i))
+        else:
+            effects.append(ParticleEmitter(x, y, COLOR_PROFILES[colors[i % 6]],
+                                           emission_rate=rate, duration=1e9, seed=SEED + i))
+    return effects
+
+
+def run(particles: int, kind: str) -> tuple:
+    """Run frames; returns (mean ms, p95 ms, live particles at the end)."""
+    random.seed(SEED)
+    effects = make_effects(particles, kind)
+    system = None
+    if kind != "list":
+        system = ParticleSystem(bounds=(-2000, -2000, 4000, 4000))
+        for effect in effects:
+            system.add(effect)
+
+    frame_times = []
+    for frame in range(WARMUP_FRAMES + MEASURED_FRAMES):
+        start = time.perf_counter()
+        if system is not None:
+            system.update(FRAME_TIME)
+        else:
+            for effect in effects:
+                effect.update(FRAME_TIME)
+        if frame >= WARMUP_FRAMES:
+            frame_times.append((time.perf_counter() - start) * 1000)
+
+    frame_times.sort()
+    live = system.particle_count if system is not None else sum(e.count for e in effects)
+    return sum(frame_times) / len(frame_times), frame_times[int(len(frame_times) * 0.95)], live
+
+
+def main():
+    """Run particle benchmarks."""
+    print("=" * 60)
+    print("PARTICLE SYSTEM BENCHMARK")
+    print("=" * 60)
+    print(f"{EFFECTS} effects, {MEASURED_FRAMES} frames at 60 fps, budget {FRAME_BUDGET_MS:.0f}ms/frame")
+    print()
+
+    kinds = [("list", "Particle objects"), ("numpy", "SoA, NumPy")]
+
+    for particles in PARTICLE_COUNTS:
+        print(f"~{particles} live particles:")
+        for kind, label in kinds:
+            mean, p95, live = run(particles, kind)
+            verdict = "within budget" if p95 <= FRAME_BUDGET_MS else "over budget"
+            print(f"  {label:18s} {mean:7.2f}ms mean  {p95:7.2f}ms p95  "
+                  f"({live} live, {verdict})")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Price tracker benchmarking script."""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.price_tracker import CardPrice, PriceTracker
+
+DECK_SIZE = 100
+# Prices already cached (a tracker that has been in use for a while)
+CACHED_PRICES = 20_000
+
+
+def deck(offset: int) -> dict:
+    """A deck of DECK_SIZE cards not priced yet."""
+    return {'mainboard': [{'name': f'Card {offset + i}', 'set_code': 'TST', 'quantity': 1}
+                          for i in range(DECK_SIZE)], 'sideboard': []}
+
+
+def run_reference(data_dir: Path, cached: dict) -> float:
+    """Seconds to value a deck the previous way (both JSON files rewritten per card)."""
+    cache = dict(cached)
+    history = {key: [{'date': price['last_updated'], 'price': price['price_usd'], 'price_foil': None}]
+               for key, price in cached.items()}
+    start = time.perf_counter()
+    for card in deck(CACHED_PRICES)['mainboard']:
+        key = f"{card['name']}|{card['set_code']}".lower()
+        price = CardPrice(card['name'], card['set_code'], 1.0).to_dict()
+        cache[key] = price
+        history[key] = [{'date': price['last_updated'], 'price': 1.0, 'price_foil': None}]
+        with open(data_dir / 'price_cache.json', 'w') as f:
+            json.dump(cache, f, indent=2)
+        with open(data_dir / 'price_history.json', 'w') as f:
+            json.dump(history, f, indent=2)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run price tracker benchmarks."""
+    print("=" * 60)
+    print("PRICE TRACKER BENCHMARK")
+    print("=" * 60)
+    print(f"{DECK_SIZE}-card deck, {CACHED_PRICES} prices already cached")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cached = {f"cached {i}|tst": CardPrice(f"Cached {i}", 'TST', 1.0).to_dict()
+                  for i in range(CACHED_PRICES)}
+        reference = run_reference(Path(tmp), cached)
+        print(f"Previous (JSON rewrite per card): {reference * 1000:8.1f}ms")
+
+        tracker = PriceTracker(data_dir=Path(tmp) / 'store')
+        tracker.store.record({key: CardPrice.from_dict(price) for key, price in cached.items()})
+        start = time.perf_counter()
+        tracker.get_deck_value(deck(CACHED_PRICES))
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        tracker.get_deck_value(deck(CACHED_PRICES))
+        second = time.perf_counter() - start
+        tracker.store.close()
+        print(f"Price store, new prices:          {first * 1000:8.1f}ms")
+        print(f"Price store, cached prices:       {second * 1000:8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
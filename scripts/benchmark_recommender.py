@@ -0,0 +1,131 @@
+"""Card recommender benchmarking script."""
+import random
+import sqlite3
+import tempfile
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.card_recommender import CardRecommender
+from app.utils.legality_checker import LegalityIndex
+from app.utils.synergy_finder import SynergyFinder, SynergyTagStore
+
+POOL_SIZE = 30_000
+PRINTINGS = 3
+DECK_SIZE = 100
+LIMIT = 20
+SEED = 17
+
+TEXT_PIECES = (
+    "Sacrifice a creature: Scry 1.", "Whenever a creature you control dies, draw a card.",
+    "Create a 1/1 white Soldier creature token.", "You gain 3 life.", "Lifelink",
+    "Flashback {2}{B}", "Put a +1/+1 counter on target creature.", "Proliferate.",
+    "Whenever you cast an instant or sorcery spell, scry 1.", "Mill three cards.",
+    "Landfall — Whenever a land enters the battlefield under your control, you gain 1 life.",
+    "Flying", "Trample", "Vigilance", "Destroy target creature.", "Counter target spell.",
+)
+TYPE_LINES = (
+    "Creature — Elf Druid", "Creature — Goblin Warrior", "Creature — Human Cleric",
+    "Creature — Zombie", "Creature — Merfolk Wizard", "Instant", "Sorcery", "Artifact",
+    "Enchantment", "Artifact Creature — Thopter", "Legendary Creature — Elf Warrior", "Land",
+)
+IDENTITIES = ("", "W", "U", "B", "R", "G", "W,U", "B,R", "G,W", "U,B,R")
+
+
+class CardRepository:
+    """In-memory stand-in for MTGRepository (a real lookup is a SQLite query)."""
+
+    def __init__(self, cards):
+        self.cards = cards
+
+    def get_card_by_uuid(self, uuid):
+        return self.cards.get(uuid)
+
+
+def make_index(path: Path, rng: random.Random) -> dict:
+    """Write a card index with POOL_SIZE cards in PRINTINGS printings each; returns cards by uuid."""
+    cards, rows, legalities = {}, [], []
+    for i in range(POOL_SIZE):
+        card = {
+            'name': f"Card {i:05d}",
+            'type_line': rng.choice(TYPE_LINES),
+            'oracle_text': " ".join(rng.sample(TEXT_PIECES, rng.randint(1, 3))),
+        }
+        identity = rng.choice(IDENTITIES)
+        legal = rng.random() < 0.8
+        for printing in range(PRINTINGS):
+            uuid = f"{i:05d}-{printing}"
+            cards[uuid] = card
+            rows.append((uuid, card['name'], card['type_line'], card['oracle_text'], identity))
+            legalities.append((uuid, 'commander', 'Legal' if legal else 'Banned'))
+    connection = sqlite3.connect(str(path))
+    connection.executescript("""
+        CREATE TABLE cards (uuid TEXT PRIMARY KEY, name TEXT, type_line TEXT, text TEXT,
+                            oracle_text TEXT, color_identity TEXT, is_token INTEGER DEFAULT 0);
+        CREATE TABLE card_legalities (uuid TEXT, format TEXT, status TEXT, PRIMARY KEY (uuid, format));
+        CREATE INDEX idx_legalities_format ON card_legalities(format);
+    """)
+    connection.executemany(
+        "INSERT INTO cards (uuid, name, type_line, oracle_text, color_identity) VALUES (?, ?, ?, ?, ?)", rows)
+    connection.executemany("INSERT INTO card_legalities VALUES (?, ?, ?)", legalities)
+    connection.commit()
+    connection.close()
+    return cards
+
+
+def main():
+    """Run card recommender benchmarks."""
+    print("=" * 60)
+    print("CARD RECOMMENDER BENCHMARK")
+    print("=" * 60)
+    print(f"{POOL_SIZE} cards ({POOL_SIZE * PRINTINGS} printings), {DECK_SIZE}-card deck, top {LIMIT}")
+    print()
+
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "index.sqlite"
+        cards = make_index(db_path, rng)
+        repository = CardRepository(cards)
+        deck = [(f"{i:05d}-0", 1) for i in rng.sample(range(POOL_SIZE), DECK_SIZE)]
+        pool = [uuid for uuid in cards if uuid.endswith("-0")]
+
+        store = SynergyTagStore(Path(tmp) / "tags.sqlite")
+        recommender = CardRecommender(SynergyFinder(repository))
+        start = time.perf_counter()
+        recommender.build_index(db_path, store, "bench")
+        build_time = time.perf_counter() - start
+
+        loaded = CardRecommender(SynergyFinder(repository), LegalityIndex(db_path))
+        start = time.perf_counter()
+        loaded.build_index(db_path, store, "bench")
+        load_time = time.perf_counter() - start
+        store.close()
+
+        start = time.perf_counter()
+        suggestions = recommender.finder.suggest_cards_for_deck([uuid for uuid, _ in deck], pool, LIMIT)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        unfiltered = loaded.recommend(deck, limit=LIMIT, color_identity=list("WUBRG"))
+        first_time = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded.recommend(deck, deck_format='Commander', limit=LIMIT)
+        filtered_time = time.perf_counter() - start
+
+    same = ("equal" if [s['synergy_count'] for s in suggestions]
+            == [r['synergy_count'] for r in unfiltered] else "MISMATCH")
+    print(f"Index build (tag every card)   {build_time:8.2f}s")
+    print(f"Index load (stored tags)       {load_time:8.2f}s")
+    print()
+    print(f"Best {LIMIT} additions (scores {same}):")
+    print(f"  Pair-by-pair over the pool   {scan_time * 1000:8.1f}ms")
+    print(f"  Inverted index               {first_time * 1000:8.1f}ms  ({scan_time / first_time:.1f}x)")
+    print(f"  + color and format filters   {filtered_time * 1000:8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Swiss pairing benchmarking script."""
+import random
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.tournament import Tournament, TournamentFormat
+
+FIELD_SIZES = (64, 512, 4096)
+# Many rounds for a small field, where rematches are hard to avoid
+DEEP_EVENT = (64, 20)
+SEED = 1234
+
+
+def greedy_pairings(tournament: Tournament, players: list) -> list:
+    """Pair the old way: walk down the standings, bye when no opponent is left."""
+    sorted_players = sorted(
+        players,
+        key=lambda p: (
+            -tournament.players[p].match_points,
+            -tournament.players[p].opponent_match_win_percentage,
+            -tournament.players[p].game_win_percentage
+        )
+    )
+
+    pairings = []
+    paired = set()
+    for i, player1 in enumerate(sorted_players):
+        if player1 in paired:
+            continue
+        for player2 in sorted_players[i + 1:]:
+            if player2 in paired:
+                continue
+            pairing = tuple(sorted([player1, player2]))
+            if pairing in tournament.pairing_history:
+                continue
+            pairings.append((player1, player2))
+            paired.update(pairing)
+            tournament.pairing_history.add(pairing)
+            break
+        if player1 not in paired:
+            tournament._give_bye(player1)
+            paired.add(player1)
+    return pairings
+
+
+def run_event(num_players: int, num_rounds: int, greedy: bool = False) -> dict:
+    """
+    Run a Swiss event with random results.
+
+    Args:
+        num_players: Number of entrants (one extra so there is a bye)
+        num_rounds: Rounds to pair
+        greedy: Use the old greedy pairer
+
+    Returns:
+        Dict with pairing time, reporting time, rematches, byes and score spread
+    """
+    rng = random.Random(SEED)
+    tournament = Tournament("Bench", TournamentFormat.SWISS, num_rounds=num_rounds)
+    for i in range(num_players + 1):
+        tournament.add_player(f"P{i}", None)
+    if greedy:
+        tournament._swiss_pairings = lambda players: greedy_pairings(tournament, players)
+    tournament.is_started = True
+    tournament.current_round = 1
+
+    pair_time = report_time = 0.0
+    seen = set()
+    rematches = spread = 0
+    for _ in range(num_rounds):
+        start = time.perf_counter()
+        tournament.run_round()
+        pair_time += time.perf_counter() - start
+
+        matches = [m for m in tournament.matches if m.end_time is None]
+        start = time.perf_counter()
+        for match in matches:
+            key = tuple(sorted((match.player1_id, match.player2_id)))
+            rematches += key in seen
+            seen.add(key)
+            spread += abs(tournament.players[match.player1_id].match_points -
+                          tournament.players[match.player2_id].match_points) > 0
+            winner = match.player1_id if rng.random() < 0.5 else match.player2_id
+            match.games_won = {0: 2, 1: 1} if winner == match.player1_id else {0: 1, 1: 2}
+            tournament.report_match(match, winner)
+        report_time += time.perf_counter() - start
+
+    return {
+        'pair_ms': pair_time / num_rounds * 1000,
+        'report_ms': report_time / num_rounds * 1000,
+        'rematches': rematches,
+        'byes': sum(p.byes for p in tournament.players.values()),
+        'cross_group': spread,
+    }
+
+
+def main():
+    """Run Swiss pairing benchmarks."""
+    print("=" * 60)
+    print("SWISS PAIRING BENCHMARK")
+    print("=" * 60)
+    print()
+
+    events = [(size, max(3, (size - 1).bit_length())) for size in FIELD_SIZES]
+    for size, num_rounds in events + [DEEP_EVENT]:
+        print(f"{size + 1} players, {num_rounds} rounds:")
+        for name, greedy in (("Greedy", True), ("Min-cost", False)):
+            result = run_event(size, num_rounds, greedy)
+            print(f"  {name:9s} pair {result['pair_ms']:8.2f}ms/round  "
+                  f"report {result['report_ms']:7.2f}ms/round  "
+                  f"byes {result['byes']:3d}  rematches {result['rematches']:3d}  "
+                  f"cross-group {result['cross_group']}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Synergy finder benchmarking script."""
+import random
+import time
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.synergy_finder import SynergyFinder
+
+DECK_SIZE = 100
+RUNS = 5
+SEED = 13
+
+TEXT_PIECES = (
+    "Sacrifice a creature: Scry 1.", "Whenever a creature you control dies, draw a card.",
+    "Create a 1/1 white Soldier creature token.", "You gain 3 life.", "Lifelink",
+    "Flashback {2}{B}", "Put a +1/+1 counter on target creature.", "Proliferate.",
+    "Whenever you cast an instant or sorcery spell, put a +1/+1 counter on it.",
+    "Landfall — Whenever a land enters the battlefield under your control, you gain 1 life.",
+    "Destroy target artifact or enchantment.", "Mill three cards.", "Flying", "Trample",
+)
+TYPE_LINES = (
+    "Creature — Elf Druid", "Creature — Goblin Warrior", "Creature — Human Cleric",
+    "Instant", "Sorcery", "Artifact", "Enchantment", "Artifact Creature — Thopter",
+    "Legendary Creature — Elf Warrior", "Land",
+)
+
+
+class CardRepository:
+    """In-memory stand-in for MTGRepository (a real lookup is a SQLite query)."""
+
+    def __init__(self, cards):
+        self.cards = cards
+
+    def get_card_by_uuid(self, uuid):
+        return self.cards.get(uuid)
+
+
+class ScanningSynergyFinder(SynergyFinder):
+    """The previous finder: tag every card from its text on every pair, compare string sets."""
+
+    def analyze_deck_synergies(self, deck_cards):
+        all_synergies = []
+        synergy_themes = defaultdict(int)
+        for i, (uuid1, _) in enumerate(deck_cards):
+            card1 = self.repository.get_card_by_uuid(uuid1)
+            if not card1:
+                continue
+            tags1 = self._get_card_tags(card1)
+            for uuid2, _ in deck_cards[i+1:]:
+                card2 = self.repository.get_card_by_uuid(uuid2)
+                if not card2:
+                    continue
+                tags2 = self._get_card_tags(card2)
+                reasons = self._check_synergy(tags1, tags2)
+                if reasons:
+                    all_synergies.append({'card1': card1.get('name'), 'card2': card2.get('name'),
+                                          'reasons': reasons})
+                    for reason in reasons:
+                        synergy_themes[reason] += 1
+        return {
+            'total_synergies': len(all_synergies),
+            'synergy_pairs': all_synergies[:20],
+            'themes': dict(synergy_themes),
+            'archetypes': self._identify_archetypes(synergy_themes, deck_cards),
+            'synergy_score': self._calculate_synergy_score(len(all_synergies), len(deck_cards))
+        }
+
+    def _get_card_tags(self, card):
+        tags = set()
+        oracle_text = card.get('oracle_text', '').lower()
+        type_line = card.get('type_line', '')
+        keywords = [k.lower() for k in card.get('keywords', [])]
+        for theme, pattern in self.synergy_patterns.items():
+            for keyword in pattern['keywords']:
+                if keyword in oracle_text or keyword in ' '.join(keywords):
+                    tags.update(pattern['produces'])
+                    tags.add(theme)
+        for word in ('Creature', 'Instant', 'Sorcery', 'Artifact', 'Enchantment'):
+            if word in type_line:
+                tags.add(word.lower())
+        if 'Creature' in type_line and '—' in type_line:
+            for ct in type_line.split('—')[1].strip().split():
+                tags.add(f'tribal:{ct.lower()}')
+        return tags
+
+    def _check_synergy(self, tags1, tags2):
+        reasons = [theme for theme in tags1 & tags2 if theme in self.synergy_patterns]
+        for theme, pattern in self.synergy_patterns.items():
+            produces = set(pattern['produces'])
+            wants = set(pattern['wants'])
+            if tags1 & produces and tags2 & wants:
+                reasons.append(f"{theme}_synergy")
+            elif tags2 & produces and tags1 & wants:
+                reasons.append(f"{theme}_synergy")
+        reasons.extend(t for t in tags1 & tags2 if t.startswith('tribal:'))
+        return reasons
+
+
+def make_cards(rng: random.Random, count: int) -> dict:
+    """Cards with random rules text and type lines."""
+    return {
+        f"card-{i}": {
+            'name': f"Card {i}",
+            'type_line': rng.choice(TYPE_LINES),
+            'oracle_text': " ".join(rng.sample(TEXT_PIECES, rng.randint(1, 3))),
+            'keywords': rng.sample(['Flying', 'Lifelink', 'Prowess', 'Trample'], rng.randint(0, 2)),
+        }
+        for i in range(count)
+    }
+
+
+def normalized(analysis: dict) -> tuple:
+    """Analysis with reasons sorted (the previous finder listed them in set order)."""
+    pairs = [(p['card1'], p['card2'], sorted(p['reasons'])) for p in analysis['synergy_pairs']]
+    return analysis['total_synergies'], pairs, analysis['themes'], sorted(analysis['archetypes'])
+
+
+def time_deck(finder: SynergyFinder, deck: list) -> tuple:
+    """Best-of-RUNS seconds for a full deck analysis, and the analysis."""
+    best = float('inf')
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        analysis = finder.analyze_deck_synergies(deck)
+        best = min(best, time.perf_counter() - start)
+    return best, analysis
+
+
+def main():
+    """Run synergy finder benchmarks."""
+    print("=" * 60)
+    print("SYNERGY FINDER BENCHMARK")
+    print("=" * 60)
+    print(f"{DECK_SIZE}-card deck, {DECK_SIZE * (DECK_SIZE - 1) // 2} pairs")
+    print()
+
+    rng = random.Random(SEED)
+    repository = CardRepository(make_cards(rng, DECK_SIZE))
+    deck = [(uuid, 1) for uuid in repository.cards]
+
+    old_time, old = time_deck(ScanningSynergyFinder(repository), deck)
+    finder = SynergyFinder(repository)
+    start = time.perf_counter()
+    finder.analyze_deck_synergies(deck)
+    first_time = time.perf_counter() - start
+    new_time, new = time_deck(finder, deck)
+
+    same = "equal" if normalized(old) == normalized(new) else "MISMATCH"
+    print(f"Full synergy matrix ({new['total_synergies']} synergies, results {same}):")
+    print(f"  Text scan per pair     {old_time * 1000:8.2f}ms")
+    print(f"  Bitsets, first call    {first_time * 1000:8.2f}ms  ({old_time / first_time:.1f}x)")
+    print(f"  Bitsets, tags cached   {new_time * 1000:8.2f}ms  ({old_time / new_time:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
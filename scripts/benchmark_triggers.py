@@ -0,0 +1,119 @@
+"""Trigger dispatch benchmarking script."""
+import time
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.game_engine import Card, GameEngine, Zone
+from app.game.triggers import TriggerCondition, TriggeredAbility, TriggerManager, TriggerType
+
+BOARD_SIZE = 200
+
+
+def build_board(manager: TriggerManager, board_size: int = BOARD_SIZE) -> list:
+    """
+    Put a token swarm on the battlefield, each token with ETB and dies triggers.
+
+    Every tenth token also has a "whenever a creature you control dies" trigger.
+
+    Args:
+        manager: TriggerManager to register triggers with
+        board_size: Number of permanents
+
+    Returns:
+        List of cards on the board
+    """
+    cards = []
+    for i in range(board_size):
+        card = Card(f"Token{i}", ["Creature"], controller=i % 2)
+        card.zone = Zone.BATTLEFIELD
+        manager.register_trigger(manager.create_etb_trigger(card, lambda data: None))
+        manager.register_trigger(manager.create_dies_trigger(card, lambda data: None))
+        if i % 10 == 0:
+            manager.register_trigger(TriggeredAbility(
+                source_card=card,
+                trigger_type=TriggerType.DIES,
+                effect=lambda data: None,
+                condition=TriggerCondition(controller=card.controller),
+                description=f"Whenever a creature you control dies ({card.name})"
+            ))
+        cards.append(card)
+    return cards
+
+
+def linear_fire(triggers: dict, trigger_type: TriggerType, event_data: dict) -> int:
+    """Fire an event the old way: check every ability of the trigger type."""
+    matched = 0
+    for ability in triggers[trigger_type]:
+        if ability.check_condition(event_data):
+            matched += 1
+    return matched
+
+
+def benchmark(name: str, fire, cards: list, iterations: int = 20) -> float:
+    """
+    Fire ETB and dies events for every card on the board.
+
+    Args:
+        name: Name of the benchmark
+        fire: Callable taking (trigger_type, event_data)
+        cards: Cards on the board
+        iterations: Number of passes over the board
+
+    Returns:
+        Average time per event in microseconds
+    """
+    events = [
+        (trigger_type, {'card': card, 'controller': card.controller})
+        for card in cards
+        for trigger_type in (TriggerType.ENTERS_BATTLEFIELD, TriggerType.DIES)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for trigger_type, event_data in events:
+            fire(trigger_type, event_data)
+    elapsed = time.perf_counter() - start
+
+    per_event = elapsed / (iterations * len(events)) * 1_000_000
+    print(f"{name}:")
+    print(f"  Events: {iterations * len(events)}")
+    print(f"  Per event: {per_event:.2f}us")
+    print()
+    return per_event
+
+
+def main():
+    """Run trigger dispatch benchmarks."""
+    print("=" * 60)
+    print("TRIGGER DISPATCH BENCHMARK")
+    print("=" * 60)
+    print(f"Board: {BOARD_SIZE} permanents")
+    print()
+
+    engine = GameEngine(num_players=2)
+    manager = TriggerManager(engine)
+    cards = build_board(manager)
+
+    def indexed_fire(trigger_type, event_data):
+        manager.fire_trigger(trigger_type, event_data)
+        manager.pending_triggers.clear()
+
+    triggers = manager.triggers
+    linear = benchmark("Linear scan", lambda t, d: linear_fire(triggers, t, d), cards)
+    indexed = benchmark("Indexed registry", indexed_fire, cards)
+
+    start = time.perf_counter()
+    for card in cards:
+        manager.clear_card_triggers(card)
+    clear_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Speedup: {linear / indexed:.1f}x")
+    print(f"Clearing {BOARD_SIZE} cards' triggers: {clear_ms:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
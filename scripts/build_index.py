@@ -60,6 +60,9 @@ class IndexBuilder:
             
             # Load cards
             self._load_cards()
+            # Card data changed: cached deck statistics must be recomputed
+            from app.services.deck_service import DeckService
+            DeckService(self.db).clear_stats_cache()
             # Populate FTS index if available
             try:
                 from app.data_access.mtg_repository import MTGRepository
@@ -212,7 +215,8 @@ class IndexBuilder:
             self._parse_bool(row.get('hasNonFoil')),
             row.get('artist'),
             row.get('frameVersion'),
-            row.get('borderColor')
+            row.get('borderColor'),
+            row.get('keywords')
         )
     
     def _insert_cards_batch(self, cards_data: List[tuple]):
@@ -224,8 +228,8 @@ class IndexBuilder:
              rarity, text, oracle_text, flavor_text, power, toughness, loyalty,
              layout, edhrec_rank, edhrec_saltiness, is_token, is_online_only,
              is_promo, is_foil_only, has_foil, has_non_foil, artist, frame_version,
-             border_color)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             border_color, keywords)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         
         with self.db.transaction():
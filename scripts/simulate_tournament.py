@@ -0,0 +1,69 @@
+"""
+Run a simulated tournament of AI decks.
+
+Every AIDeckManager deck enters (optionally several copies), a Swiss event
+is played headlessly by the AI, followed by a top cut, and the standings
+are printed and optionally exported to JSON.
+"""
+import argparse
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.ai_deck_manager import AIDeckManager, DeckArchetype
+from app.game.tournament_simulator import deck_spec_from_metadata, run_simulated_event
+
+
+def main():
+    """Run the simulated event."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--copies', type=int, default=4, help="Entries per deck")
+    parser.add_argument('--rounds', type=int, default=None, help="Swiss rounds")
+    parser.add_argument('--best-of', type=int, default=3, help="Games per match")
+    parser.add_argument('--top-cut', type=int, default=8, help="Players in the top cut")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--decks-dir', default="ai_decks", help="AI deck directory")
+    parser.add_argument('--output', default=None, help="Export results to this JSON file")
+    args = parser.parse_args()
+
+    manager = AIDeckManager(args.decks_dir)
+    decks = [deck_spec_from_metadata(deck) for deck in manager.search_by_archetype(DeckArchetype.ANY)]
+    entrants = []
+    for copy in range(args.copies):
+        for deck in decks:
+            entrants.append(deck if args.copies == 1 else replace(deck, name=f"{deck.name} #{copy + 1}"))
+
+    print("=" * 60)
+    print(f"SIMULATED TOURNAMENT: {len(entrants)} players")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    results = run_simulated_event(
+        entrants, rounds=args.rounds, best_of=args.best_of, top_cut=args.top_cut,
+        max_workers=args.workers, seed=args.seed
+    )
+    elapsed = time.perf_counter() - start
+
+    print("\nSwiss standings:")
+    for place, record in enumerate(results['swiss'], 1):
+        print(f"  {place:3d}. {record}  OMW {record.opponent_match_win_percentage:.3f}"
+              f"  GW {record.game_win_percentage:.3f}")
+    if results['top_cut']:
+        print("\nTop cut:")
+        for match in results['top_cut'].matches:
+            print(f"  {match}")
+    print(f"\nChampion: {results['champion']}")
+    print(f"Matches: {len(results['tournament'].matches)}  Time: {elapsed:.1f}s")
+
+    if args.output:
+        results['tournament'].export_results(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
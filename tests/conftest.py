@@ -155,6 +155,67 @@ def mock_database(tmp_path):
     db.close()
 
 
+class FakeRepository:
+    """Repository returning cards by uuid and counting lookups.
+
+    Single and batched lookups are counted separately; with batch=False the
+    repository has no batched lookup, so callers fall back to single ones.
+    """
+
+    def __init__(self, cards=None, batch=True):
+        self.cards = cards if cards is not None else {}
+        self.lookups = 0
+        self.batch_lookups = 0
+        if not batch:
+            self.get_cards_by_uuids = None
+
+    def get_card_by_uuid(self, uuid):
+        self.lookups += 1
+        return self.cards.get(uuid)
+
+    def get_cards_by_uuids(self, uuids):
+        self.batch_lookups += 1
+        return {uuid: self.cards[uuid] for uuid in uuids if uuid in self.cards}
+
+
+@pytest.fixture
+def fake_repository():
+    """Return a factory for repositories over cards by uuid."""
+    return FakeRepository
+
+
+@pytest.fixture
+def make_card_index(tmp_path):
+    """Return a factory building card indexes with the app's own schema.
+
+    The factory takes card column values by uuid (set_code defaults to 'TST'),
+    optional (uuid, provider, currency, price) prices and (uuid, format, status)
+    legalities, and the index file name; it returns the index path.
+    """
+    from app.data_access.database import Database
+
+    def make(cards, prices=(), legalities=(), name="index.sqlite"):
+        db = Database(str(tmp_path / name))
+        db.create_tables()
+        with db.transaction() as conn:
+            for uuid, columns in cards.items():
+                row = {'uuid': uuid, 'set_code': 'TST', **columns}
+                conn.execute(
+                    f"INSERT INTO cards ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                    list(row.values())
+                )
+            conn.executemany(
+                "INSERT INTO card_prices (uuid, provider, currency, price) VALUES (?, ?, ?, ?)", prices
+            )
+            conn.executemany(
+                "INSERT INTO card_legalities (uuid, format, status) VALUES (?, ?, ?)", legalities
+            )
+        db.close()
+        return db.db_path
+
+    return make
+
+
 @pytest.fixture
 def resolve_stack_fixture():
     """Return helper to resolve stack and run SBAs deterministically in tests."""
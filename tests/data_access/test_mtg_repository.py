@@ -381,3 +381,30 @@ class TestEdgeCases:
         results = repo.search_cards(filters)
         
         assert len(results) == 0
+
+
+class TestBatchLookup:
+    """Test fetching many cards at once."""
+    
+    def test_matches_single_lookups(self, tmp_path):
+        """Batch lookup returns the same cards as looking each one up."""
+        db = Database(str(tmp_path / 'index.sqlite'))
+        db.create_tables()
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO sets(code, name) VALUES ('SET', 'Test Set')")
+            conn.executemany(
+                "INSERT INTO cards(uuid, name, set_code, collector_number, mana_value, colors, type_line) "
+                "VALUES (?, ?, 'SET', ?, ?, ?, ?)",
+                [('uuid-bolt', 'Lightning Bolt', '1', 1, 'R', 'Instant'),
+                 ('uuid-swamp', 'Swamp', '2', 0, '', 'Basic Land — Swamp')]
+            )
+            conn.execute("INSERT INTO card_legalities(uuid, format, status) VALUES ('uuid-bolt', 'modern', 'Legal')")
+        repo = MTGRepository(db)
+        
+        cards = repo.get_cards_by_uuids(['uuid-bolt', 'uuid-swamp', 'uuid-bolt', 'missing'])
+        
+        assert set(cards) == {'uuid-bolt', 'uuid-swamp'}
+        assert cards['uuid-bolt'] == repo.get_card_by_uuid('uuid-bolt')
+        assert cards['uuid-bolt'].legalities == {'modern': 'Legal'}
+        assert cards['uuid-swamp'] == repo.get_card_by_uuid('uuid-swamp')
+        db.close()
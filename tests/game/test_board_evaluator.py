@@ -0,0 +1,114 @@
+"""
+Tests for enhanced_ai.py BoardEvaluator - incremental board evaluation.
+
+Tests that running zone totals and cached creature values follow zone
+moves and stat changes, so a long-lived evaluator always scores the same
+as a fresh one, including for cards that can't report their own changes.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from app.game.enhanced_ai import BoardEvaluator
+from app.game.game_engine import Card, GameEngine
+
+
+@pytest.fixture
+def engine():
+    """Engine with two players, a few creatures and lands."""
+    engine = GameEngine()
+    engine.add_player("Player 1", [])
+    engine.add_player("Player 2", [])
+    for player_id, stats in ((0, [(2, 2), (3, 1)]), (1, [(4, 4), (1, 1)])):
+        player = engine.players[player_id]
+        for power, toughness in stats:
+            player.battlefield.append(creature(f"P{player_id} {power}/{toughness}", power, toughness, player_id))
+        for _ in range(3):
+            player.battlefield.append(Card(name="Forest", types=["Land"], controller=player_id))
+        player.hand.append(Card(name="Shock", types=["Instant"], controller=player_id))
+    return engine
+
+
+def creature(name, power, toughness, controller=0):
+    """Create a creature card."""
+    return Card(name=name, types=["Creature"], power=power, toughness=toughness,
+                controller=controller)
+
+
+def fresh_scores(engine):
+    """Scores from an evaluator with nothing cached."""
+    evaluator = BoardEvaluator()
+    scores = [evaluator.evaluate_board(engine, i) for i in range(2)]
+    evaluator.detach()
+    return scores
+
+
+class TestIncrementalEvaluation:
+    """Test that cached totals follow the game."""
+
+    def test_matches_fresh_after_changes(self, engine):
+        """Zone moves and stat changes update the running totals."""
+        evaluator = BoardEvaluator()
+        assert [evaluator.evaluate_board(engine, i) for i in range(2)] == fresh_scores(engine)
+
+        player, opponent = engine.players
+        bear = player.battlefield.creatures()[0]
+        bear.power = 5
+        engine.move_to_graveyard(opponent.battlefield.creatures()[0])
+        player.battlefield.append(creature("Elk", 3, 3))
+        player.battlefield.lands()[0].types = ["Land", "Creature"]
+        player.battlefield.lands()[0].power = 2
+        opponent.hand.append(Card(name="Bolt", types=["Instant"], controller=1))
+
+        assert [evaluator.evaluate_board(engine, i) for i in range(2)] == fresh_scores(engine)
+
+    def test_untracked_cards_are_reread(self, engine):
+        """Cards that don't report changes are read on every evaluation."""
+        evaluator = BoardEvaluator()
+        token = SimpleNamespace(name="Token", power=1, toughness=1, is_creature=lambda: True,
+                                is_land=lambda: False)
+        engine.players[0].battlefield.append(token)
+        before = evaluator.evaluate_board(engine, 0)
+
+        token.power = 4
+
+        assert evaluator.evaluate_board(engine, 0) == before + 3 * evaluator.weights['creatures']
+
+    def test_creature_values_are_cached_and_invalidated(self, engine):
+        """Creature values are recomputed only after a relevant write."""
+        evaluator = BoardEvaluator()
+        bear = engine.players[0].battlefield.creatures()[0]
+        calls = []
+        compute = evaluator._creature_value
+        evaluator._creature_value = lambda card: calls.append(card) or compute(card)
+
+        assert evaluator.evaluate_creature(bear) == 4
+        bear.tapped = True
+        assert evaluator.evaluate_creature(bear) == 4
+        assert len(calls) == 1
+
+        bear.toughness = 5
+        assert evaluator.evaluate_creature(bear) == 7
+        assert len(calls) == 2
+
+    def test_best_target(self, engine):
+        """The best target follows creatures entering and leaving."""
+        evaluator = BoardEvaluator()
+        opponent = engine.players[1]
+        assert evaluator.find_best_target(engine, 0).name == "P1 4/4"
+
+        dragon = creature("Dragon", 6, 6, 1)
+        opponent.battlefield.append(dragon)
+        assert evaluator.find_best_target(engine, 0) is dragon
+
+        engine.move_to_graveyard(dragon)
+        assert evaluator.find_best_target(engine, 0).name == "P1 4/4"
+
+    def test_detach(self, engine):
+        """Detaching unsubscribes from every zone."""
+        evaluator = BoardEvaluator()
+        evaluator.evaluate_board(engine, 0)
+        evaluator.detach()
+
+        assert all(evaluator._on_zone_event not in player.battlefield._listeners
+                   for player in engine.players)
@@ -0,0 +1,140 @@
+"""
+Tests for card_effect_analyzer.py - Card tagging and profile storage.
+
+Tests the compiled pattern matcher against plain substring search, card
+tagging and high-impact detection with the shipped libraries, batch
+profiling in worker processes, and profiles persisted per index version.
+"""
+
+from pathlib import Path
+
+import pytest
+from app.game.card_effect_analyzer import (
+    BoardState, CardAnalyzer, CardProfileStore, CastContext, PatternMatcher,
+    profile_from_dict, profile_to_dict
+)
+
+LIBRARY_DIR = Path(__file__).parent.parent.parent / "app" / "game"
+
+WRATH = {
+    "name": "Wrath of God", "manaCost": "{2}{W}{W}", "colors": ["W"], "types": ["Sorcery"],
+    "text": "Destroy all creatures. They can't be regenerated.", "rarity": "rare"
+}
+DRAGON = {
+    "name": "Shivan Dragon", "manaCost": "{4}{R}{R}", "colors": ["R"], "types": ["Creature"],
+    "subtypes": ["Dragon"], "text": "Flying\n{R}: Shivan Dragon gets +1/+0 until end of turn.",
+    "flavorText": "The undisputed master of the mountains, breathing fire.", "rarity": "rare"
+}
+
+
+@pytest.fixture
+def analyzer():
+    """Analyzer with the shipped libraries."""
+    return CardAnalyzer(LIBRARY_DIR / "effect_library.json",
+                        LIBRARY_DIR / "high_impact_events.json",
+                        LIBRARY_DIR / "card_profile_template.json")
+
+
+class TestPatternMatcher:
+    """Test the compiled matcher."""
+
+    def test_matches_substring_search(self):
+        """Overlapping, nested and repeated patterns are all found, case-insensitively."""
+        patterns = [("he", 1), ("she", 2), ("his", 3), ("hers", 4), ("Destroy all", 5),
+                    ("destroy all creatures", 6), ("", 7)]
+        matcher = PatternMatcher(patterns)
+
+        for text in ("ushers", "DESTROY ALL CREATURES", "this", "destroy", "sHe is hers"):
+            expected = {value for pattern, value in patterns if pattern.lower() in text.lower()}
+            assert matcher.search(text) == expected
+
+    def test_search_prefix(self):
+        """Matches inside the prefix are reported apart from ones crossing into the rest."""
+        matcher = PatternMatcher([("fire", "fire"), ("flying", "flying"), ("ing fi", "across")])
+
+        in_prefix, everywhere = matcher.search_prefix("Flying", " fire")
+
+        assert in_prefix == {"flying"}
+        assert everywhere == {"flying", "fire", "across"}
+
+
+class TestCardAnalyzer:
+    """Test tagging with the shipped libraries."""
+
+    def test_tags(self, analyzer):
+        """Mechanic, type, tribal and flavor tags come from the right fields."""
+        profile = analyzer.analyze_card(DRAGON)
+
+        assert {"flying", "type::creature"} <= profile.mechanic_tags
+        assert "dragon" in profile.tribal_tags
+        assert "fire_magic" in profile.flavor_tags
+        assert profile.impact_event_tags == set()
+
+    def test_high_impact_events(self, analyzer):
+        """Text patterns are matched at analysis; board conditions are checked per cast."""
+        profile = analyzer.analyze_card(WRATH)
+        board = BoardState()
+        context = CastContext(card=profile, controller="you")
+
+        assert "board_wipe_destroy" in profile.impact_event_tags
+        assert analyzer.detect_high_impact_events(profile, board, context) == []
+        board.creatures_on_board = {"you": [1, 2], "opponent": [1, 2]}
+        events = analyzer.detect_high_impact_events(profile, board, context)
+        assert [event["eventTag"] for event in events] == ["board_wipe_destroy"]
+
+    def test_library_version_follows_libraries(self, analyzer):
+        """Editing a library changes the version profiles are stored under."""
+        version = analyzer.library_version
+        edited = CardAnalyzer.from_libraries(
+            {**analyzer.effect_library, "flavorCues": []}, analyzer.high_impact_events
+        )
+
+        assert analyzer.profile_version("v1") != analyzer.profile_version("v2")
+        assert edited.library_version != version
+        assert CardAnalyzer.from_libraries(
+            analyzer.effect_library, analyzer.high_impact_events
+        ).library_version == version
+
+
+class TestBatchProfiles:
+    """Test batch profiling and persistence."""
+
+    def test_parallel_batch_matches_inline(self, analyzer):
+        """Worker processes produce the same profiles as analyzing in this process."""
+        cards = [dict(DRAGON, name=f"Dragon {i}") for i in range(6)] + [WRATH, WRATH]
+        inline = CardAnalyzer.from_libraries(analyzer.effect_library, analyzer.high_impact_events)
+
+        parallel = analyzer.analyze_batch(cards, max_workers=2, chunk_size=2)
+        expected = inline.analyze_batch(cards, max_workers=1)
+
+        assert [profile_to_dict(p) for p in parallel] == [profile_to_dict(p) for p in expected]
+        assert len(parallel) == 7
+        assert analyzer.analyze_card(WRATH) is parallel[-1]
+
+    def test_profile_round_trip(self, analyzer):
+        """Profiles survive conversion to and from their JSON form."""
+        profile = analyzer.analyze_card(WRATH)
+
+        assert profile_from_dict(profile_to_dict(profile)) == profile
+
+    def test_build_profile_index(self, analyzer, tmp_path, make_card_index):
+        """Profiles are built once per index version and then only loaded."""
+        db_path = make_card_index({
+            "0": {"name": "Shivan Dragon", "types": "Creature", "subtypes": "Dragon", "text": "Flying"},
+            "1": {"name": "Wrath of God", "types": "Sorcery", "text": "Destroy all creatures."},
+        })
+        store = CardProfileStore(tmp_path / "profiles.sqlite")
+
+        assert analyzer.build_profile_index(db_path, store, "v1", max_workers=1) == 2
+        assert store.versions() == [analyzer.profile_version("v1")]
+
+        fresh = CardAnalyzer.from_libraries(analyzer.effect_library, analyzer.high_impact_events)
+        fresh.analyze_batch = None  # loading must not re-analyze
+        assert fresh.build_profile_index(db_path, store, "v1") == 2
+        profile = fresh.analyze_card({"name": "Shivan Dragon"})
+        assert "flying" in profile.mechanic_tags and "dragon" in profile.tribal_tags
+
+        analyzer.clear_cache()
+        analyzer.build_profile_index(db_path, store, "v2", max_workers=1)
+        assert store.versions() == [analyzer.profile_version("v2")]
+        store.close()
@@ -0,0 +1,140 @@
+"""
+Tests for color_particles.py - Particle storage and effects.
+
+Tests batched spawn, movement, fading and culling in the store, emitters at
+60 fps emitting their full rate and finishing once their particles die,
+multicolor emission, and the particle system dropping finished effects.
+"""
+
+import pytest
+from app.game.color_particles import (
+    COLOR_PROFILES, ManaColor, ManaOrbEffect, MulticolorParticleEmitter, ParticleEmitter,
+    ParticleStore, ParticleSystem
+)
+
+
+def spawn_three(store):
+    """Spawn three particles moving right with lifetimes 1, 2 and 3 seconds."""
+    store.spawn(0.0, 0.0, velocity_x=[10.0, 10.0, 10.0], velocity_y=[0.0, 0.0, 0.0],
+                lifetime=[1.0, 2.0, 3.0], color=[(255, 0, 0), (0, 255, 0), (0, 0, 255)],
+                size=[4.0, 4.0, 4.0], rotation_speed=90.0)
+
+
+class TestParticleStore:
+    """Test the structure-of-arrays store."""
+
+    def test_update_moves_fades_and_rotates(self):
+        """Particles move by velocity, fade over their lifetime and rotate."""
+        store = ParticleStore(capacity=1)
+        spawn_three(store)
+
+        store.update(0.5)
+
+        assert len(store) == 3
+        assert list(store.column('x')) == [5.0, 5.0, 5.0]
+        assert list(store.column('alpha')) == pytest.approx([0.5, 0.75, 0.5 / 3 * 5])
+        particle = store.particles()[1]
+        assert particle.rotation == 45.0
+        assert particle.color == (0, 255, 0)
+
+    def test_dead_particles_are_compacted(self):
+        """Expired particles are dropped and the survivors keep their order and colors."""
+        store = ParticleStore()
+        spawn_three(store)
+
+        store.update(1.5)
+
+        assert len(store) == 2
+        assert [p.color for p in store.particles()] == [(0, 255, 0), (0, 0, 255)]
+        assert list(store.column('lifetime')) == [2.0, 3.0]
+
+    def test_bounds_cull(self):
+        """Particles leaving the bounds are culled."""
+        store = ParticleStore(bounds=(-10, -10, 10, 10))
+        store.spawn(0.0, 0.0, velocity_x=[5.0, 50.0], velocity_y=[0.0, 0.0],
+                    lifetime=[5.0, 5.0], color=[(1, 1, 1), (2, 2, 2)], size=[1.0, 1.0])
+
+        store.update(0.5)
+
+        assert [p.color for p in store.particles()] == [(1, 1, 1)]
+
+    def test_clear(self):
+        """Clearing removes every particle."""
+        store = ParticleStore()
+        spawn_three(store)
+
+        store.clear()
+        store.update(0.1)
+
+        assert len(store) == 0
+        assert store.particles() == []
+
+
+class TestEmitters:
+    """Test emitters on top of the store."""
+
+    def test_emits_full_rate_at_60fps(self):
+        """Short frames accumulate fractional particles instead of emitting none."""
+        emitter = ParticleEmitter(0, 0, COLOR_PROFILES[ManaColor.RED],
+                                  emission_rate=30, duration=1.0, seed=1)
+
+        for _ in range(30):
+            emitter.update(1 / 60)
+
+        assert len(emitter.store) == pytest.approx(15, abs=1)
+
+    def test_particles_die_after_emitter_stops(self):
+        """Particles keep updating after emission stops, so the emitter finishes."""
+        emitter = ParticleEmitter(0, 0, COLOR_PROFILES[ManaColor.GREEN],
+                                  emission_rate=60, duration=0.5, seed=2)
+
+        for _ in range(31):
+            emitter.update(1 / 60)
+        assert not emitter.active
+        assert not emitter.is_finished()
+
+        for _ in range(600):
+            emitter.update(1 / 60)
+        assert emitter.is_finished()
+        assert emitter.particles == []
+
+    def test_multicolor_uses_every_color(self):
+        """A multicolor emitter splits each batch across its colors."""
+        colors = [ManaColor.WHITE, ManaColor.BLACK]
+        emitter = MulticolorParticleEmitter(0, 0, colors, emission_rate=600, seed=3)
+
+        emitter.update(0.2)
+
+        palettes = [
+            {COLOR_PROFILES[c].primary_rgb, COLOR_PROFILES[c].secondary_rgb} for c in colors
+        ]
+        particle_colors = [p.color for p in emitter.particles]
+        assert len(particle_colors) == 120
+        for palette in palettes:
+            lows = [min(channel) for channel in zip(*palette)]
+            highs = [max(channel) for channel in zip(*palette)]
+            assert any(all(lo <= v <= hi for v, lo, hi in zip(rgb, lows, highs))
+                       for rgb in particle_colors)
+
+
+class TestParticleSystem:
+    """Test the per-frame effect owner."""
+
+    def test_drops_finished_effects(self):
+        """Finished emitters and orbs are removed, and the system shares its bounds."""
+        system = ParticleSystem(bounds=(0, 0, 100, 100))
+        emitter = ParticleEmitter(50, 50, COLOR_PROFILES[ManaColor.BLUE],
+                                  emission_rate=120, duration=0.25, seed=4)
+        system.add(emitter)
+        orb = ManaOrbEffect(10, 10, ManaColor.BLUE)
+        system.add(orb)
+
+        assert emitter.store.bounds == (0, 0, 100, 100)
+        system.update(0.1)
+        assert system.particle_count > 0
+        orb.consume_toward(90, 90)
+
+        for _ in range(600):
+            system.update(1 / 60)
+        assert system.is_finished()
+        assert system.particle_count == 0
@@ -491,7 +491,7 @@ class TestEdgeCases:
         assert engine.players[1].life == 20
     
     def test_blocker_dies_from_first_strike(self, combat, engine):
-        """Blocker without first strike still deals normal damage even after first strike kills it."""
+        """A blocker killed by first strike damage deals no normal damage."""
         attacker = create_creature("First Striker", 3, 3, 0, engine, "First strike")
         blocker = create_creature("Weak Blocker", 5, 2, 1, engine)  # No first strike
         
@@ -507,13 +507,25 @@ class TestEdgeCases:
         # Blocker doesn't have first strike, so doesn't deal damage yet
         assert attacker.damage == 0
         
-        # Normal damage - blocker still deals damage before being removed
-        # (This is how the combat manager currently works - damage is dealt
-        #  then dead creatures are removed)
+        # Normal damage - the destroyed blocker deals none
         combat.assign_normal_damage()
         
-        # Attacker takes damage from blocker in normal damage step
-        assert attacker.damage == 5
+        assert attacker.damage == 0
+    
+    def test_deathtouch_first_striker_stops_double_strike(self, combat, engine):
+        """A double striker hit by a deathtouch first striker deals no normal damage."""
+        attacker = create_creature("Double Striker", 2, 5, 0, engine, "Double strike")
+        blocker = create_creature("Assassin", 1, 4, 1, engine, "First strike, deathtouch")
+        
+        combat.start_combat()
+        combat.declare_attacker(attacker, 1)
+        combat.declare_blocker(blocker, attacker)
+        
+        combat.assign_first_strike_damage()
+        assert combat.is_destroyed(attacker)
+        combat.assign_normal_damage()
+        
+        assert blocker.damage == 2
     
     def test_empty_combat(self, combat, engine):
         """Combat with no attackers should complete cleanly."""
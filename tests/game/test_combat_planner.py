@@ -0,0 +1,227 @@
+"""
+Tests for combat_planner.py - AI attack and block search.
+
+Tests the damage simulation against the combat keywords, block choices
+(multi-blocks, trades, chump blocks at low life), attack choices (lethal,
+crack-back), the evaluation budget on large boards, and the AI opponents
+declaring through the planner.
+"""
+
+import random
+
+import pytest
+from app.game.ai_opponent import AIOpponent
+from app.game.combat_planner import (
+    CombatPlanner, creature_signature, resolve_group
+)
+from app.game.enhanced_ai import AIDifficulty, AIStrategy, EnhancedAI
+from app.game.game_engine import Card, GameEngine
+
+
+def creature(name, power, toughness, text="", controller=0, engine=None):
+    """Create a creature, on the battlefield when an engine is given."""
+    card = Card(name=name, types=["Creature"], power=power, toughness=toughness,
+                oracle_text=text, controller=controller)
+    if engine is not None:
+        engine.players[controller].battlefield.append(card)
+    return card
+
+
+def names(pairs):
+    """(blocker, attacker) pairs as names."""
+    return sorted((blocker.name, attacker.name) for blocker, attacker in pairs)
+
+
+class TestResolveGroup:
+    """Test combat damage simulation."""
+
+    def test_unblocked(self):
+        """Unblocked attackers hit the player; double strike hits twice."""
+        outcome = resolve_group(creature_signature(creature("Knight", 2, 2, "Double strike, lifelink")), ())
+
+        assert outcome.player_damage == 4
+        assert outcome.attacker_life_gain == 4
+        assert not outcome.attacker_dies
+
+    def test_first_strike_kills_before_damage(self):
+        """A first striker kills its blocker before the blocker deals damage."""
+        outcome = resolve_group(
+            creature_signature(creature("Duelist", 2, 2, "First strike")),
+            (creature_signature(creature("Bear", 2, 2)),)
+        )
+
+        assert outcome.blockers_dead == (True,)
+        assert not outcome.attacker_dies
+
+    def test_trample_and_deathtouch(self):
+        """Deathtouch needs one damage per blocker; trample carries the rest over."""
+        outcome = resolve_group(
+            creature_signature(creature("Wurm", 6, 6, "Trample, deathtouch")),
+            (creature_signature(creature("Wall", 0, 5)), creature_signature(creature("Bear", 2, 2)))
+        )
+
+        assert outcome.blockers_dead == (True, True)
+        assert outcome.player_damage == 4
+
+    def test_double_block(self):
+        """Two blockers share lethal damage; the attacker kills them in order."""
+        outcome = resolve_group(
+            creature_signature(creature("Ogre", 3, 3)),
+            (creature_signature(creature("Bear", 2, 2)), creature_signature(creature("Elf", 1, 1)))
+        )
+
+        assert outcome.attacker_dies
+        assert outcome.blockers_dead == (True, True)
+
+
+class TestPlanBlocks:
+    """Test block planning."""
+
+    def test_double_block_kills_big_attacker(self):
+        """Two small creatures team up when neither can kill the attacker alone."""
+        ogre = creature("Ogre", 4, 4)
+        plan = CombatPlanner().plan_blocks([ogre], [creature("Bear", 3, 3), creature("Cub", 2, 2)], 20)
+
+        assert names(plan.pairs) == [("Bear", "Ogre"), ("Cub", "Ogre")]
+        assert plan.damage_taken == 0
+
+    def test_chump_only_to_survive(self):
+        """Chump blocks happen only when the damage would be lethal."""
+        planner = CombatPlanner()
+        giant, elf = creature("Giant", 5, 5), creature("Elf", 1, 1)
+
+        assert planner.plan_blocks([giant], [elf], 20).pairs == []
+        assert names(planner.plan_blocks([giant], [elf], 5).pairs) == [("Elf", "Giant")]
+
+    def test_flying_and_menace(self):
+        """Flyers need flying or reach blockers; menace needs two blockers."""
+        drake = creature("Drake", 2, 2, "Flying")
+        brute = creature("Brute", 2, 2, "Menace")
+        blockers = [creature("Bear", 3, 3), creature("Spider", 1, 4, "Reach")]
+        plan = CombatPlanner().plan_blocks([drake, brute], blockers, 20)
+
+        assert ("Bear", "Drake") not in names(plan.pairs)
+        assert [blocker.name for blocker, attacker in plan.pairs if attacker is brute] != ["Bear"]
+
+    def test_identical_creatures_share_results(self):
+        """Token armies are searched by signature and memoized across calls."""
+        planner = CombatPlanner()
+        attackers = [creature(f"Goblin {i}", 1, 1) for i in range(12)]
+        blockers = [creature(f"Soldier {i}", 1, 2) for i in range(12)]
+
+        plan = planner.plan_blocks(attackers, blockers, 20)
+        assert len(plan.pairs) == 12
+        assert plan.exact
+
+        planner.plan_blocks(attackers, blockers, 20)
+        assert planner.evaluations == 0
+
+    def test_larger_budget_never_worse(self):
+        """Stopping the search later never gives a worse block plan."""
+        rng = random.Random(7)
+        keywords = ["", "", "Flying", "Reach", "First strike", "Deathtouch", "Trample",
+                    "Lifelink", "Menace"]
+
+        for size in (12, 16, 24):
+            ours, theirs = (
+                [creature(f"{prefix} {i}", rng.randint(1, 6), rng.randint(1, 6),
+                          rng.choice(keywords)) for i in range(size)]
+                for prefix in ("Ours", "Theirs")
+            )
+            values = [CombatPlanner(max_evaluations=budget).plan_blocks(ours, theirs, 12).value
+                      for budget in (250, 500, 1000, 2000, 5000)]
+
+            assert values == sorted(values)
+
+
+class TestPlanAttacks:
+    """Test attack planning."""
+
+    def test_lethal_attack(self):
+        """Attack with everything when the blockers can't stop lethal damage."""
+        attackers = [creature("Ogre", 3, 3), creature("Brute", 3, 3)]
+        plan = CombatPlanner().plan_attacks(attackers, [creature("Elf", 1, 1)], 20, 3)
+
+        assert plan.lethal
+        assert len(plan.attackers) == 2
+
+    def test_no_suicide_attack(self):
+        """Don't attack into a blocker that kills the attacker and survives."""
+        plan = CombatPlanner().plan_attacks([creature("Bear", 2, 2)], [creature("Wall", 3, 4)], 20, 20)
+
+        assert plan.attackers == []
+
+    def test_crack_back_keeps_blockers_home(self):
+        """Don't tap out when the opponent's swing back would be lethal."""
+        attacker = creature("Bear", 2, 2)
+        their_army = [creature(f"Raider {i}", 3, 3) for i in range(2)]
+        plan = CombatPlanner().plan_attacks([attacker], [], 4, 20, opponent_creatures=their_army)
+
+        assert plan.attackers == []
+
+    def test_budget_bounds_large_boards(self):
+        """Large boards stop at the evaluation budget and still produce a plan."""
+        rng = random.Random(3)
+        keywords = ["", "", "Flying", "First strike", "Deathtouch", "Trample", "Menace"]
+
+        def army(prefix):
+            return [creature(f"{prefix} {i}", rng.randint(1, 6), rng.randint(1, 6),
+                             rng.choice(keywords)) for i in range(24)]
+
+        ours, theirs = army("Ours"), army("Theirs")
+        planner = CombatPlanner(max_evaluations=2000)
+
+        attack = planner.plan_attacks(ours, theirs, 20, 20)
+        assert planner.evaluations <= 2000 + 24 * 25
+        blocks = planner.plan_blocks(ours, theirs, 20)
+        assert planner.evaluations <= 2000 + 24 * 25
+        assert len({id(blocker) for blocker, _ in blocks.pairs}) == len(blocks.pairs)
+        assert all(id(a) in {id(c) for c in ours} for a in attack.attackers)
+
+
+class TestAIIntegration:
+    """Test the AI opponents declaring through the planner."""
+
+    @pytest.fixture
+    def engine(self):
+        """Engine with two players and combat under way for player 0."""
+        engine = GameEngine()
+        engine.add_player("Player 1", [])
+        engine.add_player("Player 2", [])
+        engine.active_player_index = 0
+        engine.combat_manager.start_combat()
+        return engine
+
+    def test_ai_opponent_blocks(self, engine):
+        """AIOpponent double blocks an attacker its creatures can't kill alone."""
+        ogre = creature("Ogre", 4, 4, controller=0, engine=engine)
+        creature("Bear", 3, 3, controller=1, engine=engine)
+        creature("Cub", 2, 2, controller=1, engine=engine)
+        combat = engine.combat_manager
+        combat.declare_attacker(ogre, 1)
+
+        ai = AIOpponent(engine, 1, difficulty='hard')
+        blocks = ai.declare_blockers(combat, combat.attackers)
+
+        assert names(blocks) == [("Bear", "Ogre"), ("Cub", "Ogre")]
+
+    def test_ai_opponent_attacks(self, engine):
+        """AIOpponent attacks with creatures that can't be blocked profitably."""
+        creature("Drake", 3, 3, "Flying", controller=0, engine=engine)
+        creature("Bear", 2, 2, controller=0, engine=engine)
+        creature("Wall", 3, 6, "Defender", controller=1, engine=engine)
+
+        ai = AIOpponent(engine, 0, strategy='aggressive', difficulty='hard')
+        attackers = ai.declare_attackers(engine.combat_manager)
+
+        assert [card.name for card in attackers] == ["Drake"]
+
+    def test_enhanced_ai_blocks(self, engine):
+        """EnhancedAI trades when the planner favors it."""
+        bear = creature("Bear", 2, 2, controller=0, engine=engine)
+        creature("Cub", 2, 2, controller=1, engine=engine)
+        engine.combat_manager.declare_attacker(bear, 1)
+
+        ai = EnhancedAI(1, AIStrategy.MIDRANGE, AIDifficulty.HARD)
+
+        assert names(ai.choose_blockers(engine, [bear])) == [("Cub", "Bear")]
@@ -0,0 +1,112 @@
+"""
+Tests for game_log.py - Structured game event log.
+
+Tests lazy rendering, the bounded ring buffer, spilling to disk and
+switching logging off on the engine.
+"""
+
+from app.game.game_engine import GameEngine
+from app.game.game_log import GameEventType, GameLog, render_event
+
+
+class TestGameLog:
+    """Test the GameLog ring buffer."""
+
+    def test_renders_like_a_list_of_strings(self):
+        """Indexing renders the same text format as the old string log."""
+        log = GameLog()
+        log.record(GameEventType.CAST, "Alice", "Lightning Bolt", turn=3)
+        log.message("%s loses %d life", "Bob", 3, turn=3)
+
+        assert len(log) == 2
+        assert log[0].endswith("Turn 3 - Alice casts Lightning Bolt")
+        assert log[-1].endswith("Turn 3 - Bob loses 3 life")
+        assert log[-1].startswith("[")
+
+    def test_messages_without_args_are_not_formatted(self):
+        """Plain messages may contain '%' characters."""
+        log = GameLog()
+        log.message("100% done")
+
+        assert log[0].endswith("100% done")
+
+    def test_message_args_are_stored_as_text(self):
+        """Objects passed as message arguments are not kept alive by the log."""
+        class Player:
+            name = "Alice"
+
+            def __str__(self):
+                return self.name
+
+        player = Player()
+        log = GameLog()
+        log.message("Player %s draws a card", player)
+        player.name = "Bob"
+
+        assert log.events()[0].payload == ("Player %s draws a card", "Alice")
+        assert log[0].endswith("Player Alice draws a card")
+
+    def test_buffer_is_bounded(self):
+        """Only the most recent events are kept."""
+        log = GameLog(capacity=3)
+        for i in range(10):
+            log.message("event %d", i)
+
+        assert len(log) == 3
+        assert log.total_events == 10
+        assert [event.payload[1] for event in log.events()] == [7, 8, 9]
+
+    def test_since_returns_new_events(self):
+        """since() returns only events newer than a sequence number."""
+        log = GameLog()
+        log.message("first")
+        seen = log.last_seq
+        log.message("second")
+        log.message("third")
+
+        assert [render_event(e, timestamps=False) for e in log.since(seen)] == [
+            "Turn 0 - second", "Turn 0 - third"
+        ]
+        assert log.since(log.last_seq) == []
+
+    def test_spill_to_disk(self, tmp_path):
+        """Evicted events are written to the spill file."""
+        log = GameLog(capacity=2, spill_path=tmp_path / "log.jsonl")
+        for i in range(5):
+            log.record(GameEventType.DRAW, f"Player{i}")
+
+        spilled = list(log.read_spilled())
+        log.close()
+
+        assert [event.payload for event in spilled] == [("Player0",), ("Player1",), ("Player2",)]
+        assert render_event(spilled[0], timestamps=False) == "Turn 0 - Player0 draws a card"
+
+    def test_disabled_log_records_nothing(self):
+        """A disabled log ignores events."""
+        log = GameLog(enabled=False)
+        log.message("ignored")
+
+        assert len(log) == 0
+
+
+class TestEngineLogging:
+    """Test GameEngine logging switches."""
+
+    def test_engine_records_events(self):
+        """Engine events are recorded with the current turn."""
+        engine = GameEngine(num_players=2)
+        engine.turn_number = 4
+        engine.log_event("%s attacks", "Bear")
+
+        assert engine.game_log[-1].endswith("Turn 4 - Bear attacks")
+
+    def test_logging_can_be_switched_off(self):
+        """Simulations can turn the game log off."""
+        engine = GameEngine(num_players=2, log_enabled=False)
+        engine.log_event("ignored")
+        engine.record_event(GameEventType.DRAW, "Alice")
+        assert len(engine.game_log) == 0
+
+        engine.set_logging(True)
+        engine.log_event("recorded")
+        assert len(engine.game_log) == 1
@@ -0,0 +1,207 @@
+"""
+Tests for legal_actions.py - Legal action generation.
+
+Tests the shared timing rules, land drops, castable spells with their mana
+payments, activated abilities and attacks, that cached per-turn facts are
+reused until the game state changes, and the AI players acting through the
+generator.
+"""
+
+import pytest
+from app.game.ai_opponent import AIOpponent
+from app.game.enhanced_ai import AIDifficulty, AIStrategy, EnhancedAI
+from app.game.game_engine import Card, GameEngine, GamePhase, GameStep
+from app.game.legal_actions import (
+    ActionType, cast_timing_error, parse_activated_abilities, sorcery_timing_error
+)
+
+
+def land(name="Forest", controller=0):
+    """Create a basic land."""
+    return Card(name=name, types=["Land"], controller=controller)
+
+
+def spell(name, cost, types=("Creature",), text="", controller=0):
+    """Create a spell card."""
+    return Card(name=name, types=list(types), mana_cost=cost, oracle_text=text,
+                power=2 if "Creature" in types else None,
+                toughness=2 if "Creature" in types else None, controller=controller)
+
+
+@pytest.fixture
+def engine():
+    """Engine in player 0's precombat main phase with two Forests in play."""
+    engine = GameEngine()
+    engine.add_player("Player 1", [])
+    engine.add_player("Player 2", [])
+    engine.active_player_index = engine.priority_player_index = 0
+    engine.current_phase = GamePhase.PRECOMBAT_MAIN
+    engine.current_step = GameStep.MAIN
+    for _ in range(2):
+        engine.players[0].battlefield.append(land())
+    return engine
+
+
+def names(actions):
+    """Card names of actions."""
+    return [action.card.name for action in actions]
+
+
+class TestTimingRules:
+    """Test the shared timing checks."""
+
+    def test_sorcery_timing(self):
+        """Sorcery speed needs the active player's main phase and an empty stack."""
+        assert sorcery_timing_error(0, 0, GamePhase.POSTCOMBAT_MAIN, True) is None
+        assert sorcery_timing_error(1, 0, GamePhase.PRECOMBAT_MAIN, True) is not None
+        assert sorcery_timing_error(0, 0, GamePhase.COMBAT, True) is not None
+        assert sorcery_timing_error(0, 0, GamePhase.PRECOMBAT_MAIN, False) is not None
+
+    def test_instants_need_only_priority(self):
+        """Instants and flash spells can be cast whenever their caster has priority."""
+        bolt = spell("Bolt", "R", types=("Instant",))
+        ambusher = spell("Ambusher", "2G", text="Flash")
+
+        assert cast_timing_error(bolt, 1, 1, 0, GamePhase.COMBAT, False) is None
+        assert cast_timing_error(ambusher, 1, 1, 0, GamePhase.COMBAT, False) is None
+        assert cast_timing_error(bolt, 1, 0, 0, GamePhase.COMBAT, False) is not None
+
+
+class TestLegalActions:
+    """Test action generation."""
+
+    def test_land_drop(self, engine):
+        """Lands in hand are playable until the land drop is used."""
+        player = engine.players[0]
+        player.hand.extend([land("Forest"), land("Mountain")])
+        generator = engine.legal_actions
+
+        assert names(generator.playable_lands(0)) == ["Forest", "Mountain"]
+        assert engine.play_land(player, player.hand[0])
+        assert generator.playable_lands(0) == []
+
+    def test_castable_spells_with_payment(self, engine):
+        """Spells are castable when timing and colored mana allow, with the sources to tap."""
+        player = engine.players[0]
+        player.hand.extend([
+            spell("Bear", "1G"), spell("Elf", "G"), spell("Giant", "3G"),
+            spell("Goblin", "R"), spell("Growth", "G", types=("Instant",))
+        ])
+        generator = engine.legal_actions
+
+        castable = generator.castable_spells(0)
+        assert names(castable) == ["Bear", "Elf", "Growth"]
+        bear = castable[0]
+        assert bear.action_type == ActionType.CAST_SPELL
+        assert {id(source) for source, _ in bear.payment.sources} == {
+            id(card) for card in player.battlefield
+        }
+        assert generator.available_mana(0) == 2
+
+        engine.current_phase = GamePhase.COMBAT
+        assert names(generator.castable_spells(0)) == ["Growth"]
+        assert generator.castable_spells(1) == []
+
+    def test_facts_are_cached_until_state_changes(self, engine):
+        """Per-turn facts are reused, and tapping a land invalidates them."""
+        player = engine.players[0]
+        player.hand.append(spell("Bear", "1G"))
+        generator = engine.legal_actions
+        facts = generator.facts(0)
+
+        assert generator.facts(0) is facts
+        player.battlefield[0].tapped = True
+        assert generator.facts(0) is not facts
+        assert generator.castable_spells(0) == []
+
+        player.battlefield[0].damage = 1
+        assert generator.facts(0) is generator.facts(0)
+
+    def test_tap_payment_casts_spell(self, engine):
+        """Tapping a legal action's payment lets the engine cast the spell."""
+        player = engine.players[0]
+        bear = spell("Bear", "1G")
+        player.hand.append(bear)
+        generator = engine.legal_actions
+        action = generator.castable_spells(0)[0]
+
+        generator.tap_payment(0, action.payment)
+
+        assert all(card.tapped for card in player.battlefield)
+        assert engine.cast_spell(0, bear)
+
+    def test_activated_abilities(self, engine):
+        """Tap abilities need an untapped, non-summoning-sick source and payable mana."""
+        player = engine.players[0]
+        pinger = Card(name="Pinger", types=["Creature"], power=1, toughness=1, controller=0,
+                      oracle_text="{T}: Add {G}.\n{1}, {T}: Pinger deals 1 damage to any target.")
+        player.battlefield.append(pinger)
+
+        actions = engine.legal_actions.activatable_abilities(0)
+        assert [a.ability.mana_cost for a in actions] == ["{1}"]
+        assert actions[0].ability.tap_cost
+
+        pinger.summoning_sick = True
+        assert engine.legal_actions.activatable_abilities(0) == []
+
+    def test_parse_skips_mana_abilities(self):
+        """Mana abilities and static text aren't activated abilities."""
+        abilities = parse_activated_abilities(
+            "Flying\n{T}: Add {C}.\n{2}{U}: Draw a card. Activate only as a sorcery."
+        )
+
+        assert len(abilities) == 1
+        assert abilities[0].mana_cost == "{2}{U}"
+        assert abilities[0].sorcery_speed
+        assert not abilities[0].tap_cost
+
+    def test_attacks_only_when_declaring(self, engine):
+        """Attack actions exist in the active player's declare attackers step."""
+        player = engine.players[0]
+        bear = spell("Bear", "1G")
+        player.battlefield.append(bear)
+        sick = spell("Cub", "G")
+        sick.summoning_sick = True
+        player.battlefield.append(sick)
+        generator = engine.legal_actions
+
+        assert generator.attack_actions(0) == []
+        engine.current_phase = GamePhase.COMBAT
+        engine.current_step = GameStep.DECLARE_ATTACKERS
+        attacks = generator.attack_actions(0)
+        assert [(a.card.name, a.defender) for a in attacks] == [("Bear", 1)]
+        assert generator.legal_actions(0) == attacks
+
+
+class TestAIIntegration:
+    """Test the AI players acting through the generator."""
+
+    def test_ai_opponent_plays_land_and_casts(self, engine):
+        """AIOpponent plays the land that enables a new color, then casts what it can."""
+        player = engine.players[0]
+        player.hand.extend([land("Mountain"), land("Forest"), spell("Bear", "1G"),
+                            spell("Goblin", "1R"), spell("Giant", "4G")])
+        ai = AIOpponent(engine, 0, difficulty='hard')
+
+        ai.take_turn_actions()
+
+        assert [card.name for card in player.hand if card.is_land()] == ["Forest"]
+        remaining = [card.name for card in player.hand if not card.is_land()]
+        assert len(remaining) == 2 and "Giant" in remaining
+        assert engine.stack_manager.get_size() == 1
+
+    def test_ai_opponent_skips_uncastable(self, engine):
+        """Spells without a payment aren't cast."""
+        ai = AIOpponent(engine, 0, difficulty='hard')
+
+        assert not ai.should_cast_spell(spell("Goblin", "R"))
+
+    def test_enhanced_ai_plays_castable(self, engine):
+        """EnhancedAI only picks spells it can pay for."""
+        engine.players[0].hand.extend([spell("Giant", "4G"), spell("Bear", "1G")])
+        ai = EnhancedAI(0, AIStrategy.AGGRO, AIDifficulty.HARD)
+
+        decision = ai.make_decision(engine)
+
+        assert decision.decision_type == "play_creature"
+        assert decision.action.name == "Bear"
@@ -0,0 +1,134 @@
+"""
+Tests for mana_cost.py - Compiled mana costs and payment solver.
+
+Tests brace/hybrid/Phyrexian parsing, cost interning, and paying costs
+from a mana pool and untapped lands.
+"""
+
+from app.game.game_engine import GameEngine, Card
+from app.game.mana_cost import can_pay, compile_mana_cost, mana_options, solve_payment
+from app.game.mana_system import ManaType
+
+
+class LandCard:
+    """Minimal land for payment tests."""
+
+    def __init__(self, name, type_line, oracle_text=""):
+        self.name = name
+        self.type_line = type_line
+        self.oracle_text = oracle_text
+        self.is_tapped = False
+        self.controller = 0
+
+
+def sources(*lands):
+    """Build solver sources from lands."""
+    return [(land, mana_options(land)) for land in lands]
+
+
+class TestCompileManaCost:
+    """Test compiling mana costs."""
+
+    def test_brace_and_compact_notation(self):
+        """Brace and compact costs compile to the same amounts."""
+        assert compile_mana_cost("{2}{U}{U}").amounts() == compile_mana_cost("2UU").amounts()
+        assert compile_mana_cost("{10}").generic == 10
+
+    def test_costs_are_interned(self):
+        """Compiling the same string twice returns the same object."""
+        assert compile_mana_cost("{3}{G}{G}") is compile_mana_cost("{3}{G}{G}")
+
+    def test_hybrid_phyrexian_and_x(self):
+        """Special symbols are recognised and counted in mana value."""
+        cost = compile_mana_cost("{X}{W/U}{2/R}{G/P}")
+
+        assert cost.x_count == 1
+        assert cost.shards == ((frozenset({ManaType.WHITE, ManaType.BLUE}), 1),)
+        assert cost.twobrid == ((ManaType.RED, 2, 1),)
+        assert cost.phyrexian == ((frozenset({ManaType.GREEN}), 1),)
+        assert cost.mana_value == 4
+        assert cost.colors == {ManaType.WHITE, ManaType.BLUE, ManaType.RED, ManaType.GREEN}
+
+    def test_empty_cost(self):
+        """Missing costs compile to a free cost."""
+        assert compile_mana_cost(None).is_free
+        assert compile_mana_cost("").mana_value == 0
+
+
+class TestSolvePayment:
+    """Test the payment solver."""
+
+    def test_hybrid_does_not_strand_colors(self):
+        """Hybrid shards use the color the other shards don't need."""
+        pool = {ManaType.WHITE: 1, ManaType.BLUE: 1}
+
+        payment = solve_payment("{W/U}{W}", pool)
+
+        assert payment is not None
+        assert payment.pool_amounts() == {ManaType.WHITE: 1, ManaType.BLUE: 1}
+
+    def test_pays_from_lands(self):
+        """Payments say which lands to tap, keeping dual lands for colors."""
+        forest = LandCard("Forest", "Basic Land — Forest")
+        island = LandCard("Island", "Basic Land — Island")
+        fountain = LandCard("Hallowed Fountain", "Land — Plains Island")
+
+        payment = solve_payment("{1}{W}{G}", None, sources(forest, island, fountain))
+
+        tapped = {land.name: mana_type for land, mana_type in payment.sources}
+        assert tapped == {
+            "Forest": ManaType.GREEN,
+            "Hallowed Fountain": ManaType.WHITE,
+            "Island": ManaType.BLUE,
+        }
+        assert not can_pay("{W}{W}", None, sources(forest, island, fountain))
+
+    def test_any_color_sources(self):
+        """'Any color' lands can pay any colored shard."""
+        city = LandCard("City of Brass", "Land", "{T}: Add one mana of any color.")
+        assert mana_options(city) == frozenset(
+            {ManaType.WHITE, ManaType.BLUE, ManaType.BLACK, ManaType.RED, ManaType.GREEN}
+        )
+        assert can_pay("{B}", None, sources(city))
+
+    def test_phyrexian_life(self):
+        """Phyrexian symbols can be paid with life when it is offered."""
+        assert not can_pay("{B/P}{B/P}", {})
+        assert can_pay("{B/P}{B/P}", {}, life=4)
+
+        payment = solve_payment("{B/P}{B/P}", {ManaType.BLACK: 1}, life=3)
+        assert payment.pool_amounts() == {ManaType.BLACK: 1}
+        assert payment.life == 2
+
+    def test_twobrid_paid_with_generic(self):
+        """{2/B} can be paid with two mana of any type."""
+        assert can_pay("{2/B}", {ManaType.RED: 2})
+        assert not can_pay("{2/B}", {ManaType.RED: 1})
+        assert can_pay("{2/B}", {ManaType.BLACK: 1})
+
+    def test_x_value(self):
+        """X adds generic mana for the chosen value."""
+        pool = {ManaType.RED: 3}
+        assert can_pay("{X}{R}", pool, x_value=2)
+        assert not can_pay("{X}{R}", pool, x_value=3)
+
+
+class TestManaManagerPayment:
+    """Test finding payments from a player's lands."""
+
+    def test_find_payment_uses_untapped_lands(self):
+        """ManaManager finds payments from untapped lands on the battlefield."""
+        engine = GameEngine(num_players=2)
+        engine.add_player("Alice", [])
+        engine.add_player("Bob", [])
+        manager = engine.mana_manager
+
+        battlefield = engine.players[0].battlefield
+        battlefield.append(Card("Mountain", ["Land"], controller=0))
+        battlefield.append(Card("Mountain", ["Land"], controller=0))
+
+        assert manager.find_payment(0, "{1}{R}") is not None
+
+        battlefield[0].tapped = True
+        assert manager.find_payment(0, "{1}{R}") is None
+        assert manager.find_payment(0, "{R}") is not None
@@ -0,0 +1,142 @@
+"""
+Tests for replay_analytics.py - SQLite replay analytics store.
+
+Tests bulk ingest from replays and replay files, the query API and that
+incrementally maintained aggregates match a full rebuild.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+from app.game.game_replay import ActionType, GameAction, GameReplay
+from app.game.replay_analytics import ReplayAnalyticsStore
+from app.game.replay_stream import write_replay
+
+BURN = ["Mountain"] * 8 + ["Lightning Bolt"] * 4
+RAMP = ["Forest"] * 8 + ["Llanowar Elves"] * 4
+
+
+def make_game(game_id, first_player, winner, bolt_turn=None, decklists=True):
+    """Build a short replay between a burn and a ramp player."""
+    replay = GameReplay(
+        game_id=game_id,
+        start_time=datetime(2024, 1, 1),
+        player_names=["Burn", "Ramp"],
+        decklists={0: BURN, 1: RAMP} if decklists else {},
+    )
+
+    def add(action_type, turn, actor, card=None):
+        active = first_player if turn % 2 else 1 - first_player
+        replay.add_action(GameAction(
+            action_type=action_type, timestamp=0.0, turn_number=turn,
+            active_player=active, actor=actor, data={'card': card} if card else {}
+        ))
+
+    add(ActionType.START_GAME, 0, 0)
+    for turn in (1, 2, 3, 4):
+        actor = first_player if turn % 2 else 1 - first_player
+        add(ActionType.DRAW_CARD, turn, actor, "Mountain" if actor == 0 else "Forest")
+        if actor == 0 and turn == bolt_turn:
+            add(ActionType.CAST_SPELL, turn, 0, "Lightning Bolt")
+        if actor == 1:
+            add(ActionType.CAST_SPELL, turn, 1, "Llanowar Elves")
+    replay.winner = winner
+    return replay
+
+
+@pytest.fixture
+def games():
+    """A reproducible set of games."""
+    rng = random.Random(7)
+    result = []
+    for i in range(40):
+        first = i % 2
+        winner = first if rng.random() < 0.7 else 1 - first
+        result.append(make_game(f"g{i}", first, winner, bolt_turn=rng.choice([1, 3, None])))
+    return result
+
+
+class TestReplayAnalyticsStore:
+    """Test ingest and queries."""
+
+    def test_ingest_in_batches_skips_duplicates(self, games):
+        """Games are added once, across several batches."""
+        store = ReplayAnalyticsStore()
+
+        assert store.ingest(games, batch_size=7) == 40
+        assert store.ingest(games[:5]) == 0
+        assert store.game_count() == 40
+
+    def test_win_rate_on_play(self, games):
+        """Win rates on the play and draw add up to one in two-player games."""
+        store = ReplayAnalyticsStore()
+        store.ingest(games)
+
+        expected = sum(g.winner == g.actions[1].active_player for g in games) / len(games)
+        rates = store.win_rate_on_play()
+        assert rates['on_play'] == pytest.approx(expected)
+        assert rates['on_play'] + rates['on_draw'] == pytest.approx(1.0)
+        assert rates['play_games'] == 40
+
+    def test_card_queries(self, games):
+        """Cast turns and wins are aggregated per card."""
+        store = ReplayAnalyticsStore()
+        store.ingest(games)
+
+        cast_turns = [a.turn_number for g in games for a in g.actions
+                      if a.data.get('card') == "Lightning Bolt"]
+        assert store.average_cast_turn("Lightning Bolt") == pytest.approx(
+            sum(cast_turns) / len(cast_turns)
+        )
+        assert store.average_cast_turn("Shock") is None
+
+        elves = store.get_card_stats("Llanowar Elves")
+        ramp_wins = sum(g.winner == 1 for g in games)
+        assert elves['seen_games'] == 40
+        assert elves['seen_wins'] == ramp_wins
+        assert elves['deck_wins'] == ramp_wins
+
+        top = store.top_cards_in_wins(limit=2)
+        assert top[0]['seen_wins'] >= top[1]['seen_wins']
+
+    def test_deck_stats(self, games):
+        """Decks are keyed by decklist and track play/draw results."""
+        store = ReplayAnalyticsStore()
+        store.ingest(games)
+
+        decks = {deck['name']: deck for deck in store.get_deck_stats()}
+        assert decks["Burn"]['games'] == decks["Ramp"]['games'] == 40
+        assert decks["Burn"]['wins'] + decks["Ramp"]['wins'] == 40
+        assert decks["Burn"]['play_games'] == 20
+
+    def test_rebuild_matches_incremental(self, games):
+        """Recomputing aggregates from base tables gives the same numbers."""
+        store = ReplayAnalyticsStore()
+        for start in range(0, 40, 10):
+            store.ingest(games[start:start + 10])
+        cards = store.query("SELECT * FROM card_stats ORDER BY card")
+        decks = store.query("SELECT * FROM deck_stats ORDER BY deck_key")
+
+        store.rebuild_aggregates()
+
+        assert store.query("SELECT * FROM card_stats ORDER BY card") == cards
+        assert store.query("SELECT * FROM deck_stats ORDER BY deck_key") == decks
+
+    def test_ingest_files(self, games, tmp_path):
+        """Replay stream and JSON files are ingested from disk."""
+        paths = []
+        for i, game in enumerate(games[:6]):
+            if i % 2:
+                path = tmp_path / f"{game.game_id}.mtgr"
+                write_replay(game, path)
+            else:
+                path = tmp_path / f"{game.game_id}.json"
+                game.save_to_file(str(path))
+            paths.append(path)
+        (tmp_path / "broken.json").write_text("{")
+        paths.append(tmp_path / "broken.json")
+
+        with ReplayAnalyticsStore(tmp_path / "analytics.sqlite") as store:
+            assert store.ingest(paths) == 6
+            assert store.query("SELECT COUNT(*) AS n FROM card_events")[0]['n'] > 0
@@ -0,0 +1,177 @@
+"""
+Tests for replay_stream.py - Compact streaming replay container.
+
+Tests writing and lazily reading replay streams, seeking by turn,
+keyframe/delta state restore and reading files without an index.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from app.game.game_engine import GameEngine, Card
+from app.game.game_replay import ActionType, GameAction, GameReplay, ReplayManager, ReplayPlayer
+from app.game.replay_stream import ReplayReader, ReplayWriter, is_replay_stream, write_replay
+
+
+def make_replay(turns=10, actions_per_turn=6):
+    """Build a replay with a snapshot on the first action of every turn."""
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    replay = GameReplay(game_id="test", start_time=start, player_names=["Alice", "Bob"])
+    for turn in range(1, turns + 1):
+        for i in range(actions_per_turn):
+            action = GameAction(
+                action_type=ActionType.CAST_SPELL if i % 2 else ActionType.DRAW_CARD,
+                timestamp=start.timestamp() + turn * 60 + i,
+                turn_number=turn,
+                active_player=turn % 2,
+                actor=i % 2,
+                data={'card': f"Card{turn}-{i}"} if i % 2 else {}
+            )
+            if i == 0:
+                action.state_snapshot = {
+                    'turn': turn,
+                    'life_totals': [20 - turn, 20],
+                    'hand_sizes': [7, 7],
+                }
+            replay.add_action(action)
+    replay.winner = 1
+    return replay
+
+
+@pytest.fixture
+def stream(tmp_path):
+    """Write a sample replay stream."""
+    replay = make_replay()
+    path = tmp_path / "game.mtgr"
+    write_replay(replay, path, keyframe_interval=3, checkpoint_interval=8)
+    return replay, path
+
+
+class TestReplayStream:
+    """Test writing and reading replay streams."""
+
+    def test_round_trip(self, stream):
+        """All actions, data and metadata survive a round trip."""
+        replay, path = stream
+
+        loaded = GameReplay.load_from_file(str(path), format='stream')
+
+        assert loaded.game_id == "test"
+        assert loaded.winner == 1
+        assert len(loaded.actions) == len(replay.actions)
+        for original, read in zip(replay.actions, loaded.actions):
+            assert read.action_type == original.action_type
+            assert read.turn_number == original.turn_number
+            assert read.actor == original.actor
+            assert read.data == original.data
+            assert read.timestamp == pytest.approx(original.timestamp, abs=0.001)
+            assert read.state_snapshot == original.state_snapshot
+
+    def test_smaller_than_json(self, stream, tmp_path):
+        """The stream is much smaller than the indented JSON format."""
+        replay, path = stream
+        json_path = tmp_path / "game.json"
+        replay.save_to_file(str(json_path))
+
+        assert path.stat().st_size * 3 < json_path.stat().st_size
+        assert is_replay_stream(path)
+        assert not is_replay_stream(json_path)
+
+    def test_random_access(self, stream):
+        """Actions can be read by index in any order."""
+        replay, path = stream
+        with ReplayReader(path) as reader:
+            for index in (59, 0, 33, 34, 8, -1):
+                assert reader[index].data == replay.actions[index].data
+            assert len(reader[10:13]) == 3
+
+    def test_seek_by_turn_and_state_restore(self, stream):
+        """Turn starts are found by bisect and states restored from keyframes."""
+        replay, path = stream
+        with ReplayReader(path) as reader:
+            start = reader.turn_start(7)
+            assert start == 36
+            assert [a.turn_number for a in reader.actions_for_turn(7)] == [7] * 6
+            assert reader.state_at(start + 3) == replay.actions[36].state_snapshot
+            assert reader.state_at(0)['turn'] == 1
+            assert reader.turn_start(99) == len(reader)
+
+    def test_states_are_keyframes_and_deltas(self, stream):
+        """Snapshots between keyframes are stored as deltas."""
+        _, path = stream
+        with ReplayReader(path) as reader:
+            kinds = [kind for _, _, kind in reader.states]
+        assert kinds.count(2) >= 2  # Keyframes
+        assert kinds.count(3) >= 5  # Deltas
+
+    def test_unfinished_stream_is_readable(self, tmp_path):
+        """A stream without a footer is indexed by scanning."""
+        replay = make_replay(turns=3)
+        path = tmp_path / "crashed.mtgr"
+        writer = ReplayWriter(path, replay)
+        for action in replay.actions:
+            writer.write_action(action)
+        writer._file.close()  # Simulate a crash before close()
+
+        with ReplayReader(path) as reader:
+            assert len(reader) == len(replay.actions)
+            assert reader.turn_start(2) == 6
+            assert reader.metadata == {}
+
+
+class TestReplayPlayerStream:
+    """Test ReplayPlayer and ReplayManager with streams."""
+
+    def test_player_seeks_lazily(self, stream):
+        """ReplayPlayer seeks and lists turns on a lazily loaded stream."""
+        replay, path = stream
+        player = ReplayPlayer()
+        player.load_from_file(str(path), format='stream')
+
+        player.seek_to_turn(4)
+        assert player.current_action_index == 18
+        assert player.next_action().turn_number == 4
+        assert len(player.get_actions_for_turn(4)) == 6
+        assert player.get_state_at(20)['turn'] == 4
+
+    def test_player_closes_stream(self, stream):
+        """ReplayPlayer closes the previous stream on reload and on exit."""
+        _, path = stream
+        with ReplayPlayer() as player:
+            player.load_from_file(str(path), format='stream')
+            first = player._reader
+            player.load_from_file(str(path), format='stream')
+            assert first._file.closed
+            second = player._reader
+        assert second._file.closed
+        assert player._reader is None
+
+    def test_player_seeks_in_memory_replay(self):
+        """Seeking works the same on an in-memory replay."""
+        player = ReplayPlayer()
+        player.load_replay(make_replay())
+
+        player.seek_to_turn(4)
+        assert player.current_action_index == 18
+        assert len(player.get_actions_for_turn(4)) == 6
+        assert player.get_state_at(20)['turn'] == 4
+
+    def test_manager_streams_while_recording(self, tmp_path):
+        """ReplayManager writes actions to the stream as they are recorded."""
+        engine = GameEngine(num_players=2)
+        engine.add_player("Alice", [Card(f"Card{i}", ["Land"]) for i in range(10)])
+        engine.add_player("Bob", [Card(f"Card{i}", ["Land"]) for i in range(10)])
+        path = tmp_path / "live.mtgr"
+
+        manager = ReplayManager(engine)
+        manager.start_recording(stream_path=str(path))
+        manager.record_action(ActionType.DRAW_CARD, actor=0, snapshot=True)
+        manager.record_action(ActionType.PLAY_LAND, actor=0, data={'card': 'Card0'})
+        replay = manager.stop_recording()
+
+        with ReplayReader(path) as reader:
+            assert len(reader) == len(replay.actions) == 3
+            assert reader[2].data == {'card': 'Card0'}
+            assert reader.state_at(1)['library_sizes'] == [10, 10]
+            json.dumps(reader.metadata)
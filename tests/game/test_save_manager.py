@@ -0,0 +1,213 @@
+"""
+Tests for save_manager.py - Game state saving and loading.
+
+Tests the binary encoding, capturing and restoring GameEngine state,
+atomic writes (a failed write keeps the previous save) and auto-saving at
+step boundaries.
+"""
+
+import pytest
+from app.game.game_engine import GameEngine, Card
+from app.game import save_manager
+from app.game.mana_system import ManaType
+from app.game.save_manager import (
+    SaveManager, capture_game_state, decode_save, encode_save, restore_game_state, SaveData
+)
+from app.game.state_codec import _py_packb, _py_unpackb, packb, unpackb
+
+
+def make_deck(prefix, count=20):
+    """Build a simple deck of lands and creatures."""
+    deck = []
+    for i in range(count):
+        if i % 2:
+            deck.append(Card(f"{prefix} Bear {i}", ["Creature"], mana_cost="{1}{G}",
+                             power=2, toughness=2, colors=["G"]))
+        else:
+            deck.append(Card("Forest", ["Land"]))
+    return deck
+
+
+@pytest.fixture
+def engine():
+    """A started two-player game with a spell on the stack and a trigger."""
+    engine = GameEngine(num_players=2)
+    engine.add_player("Alice", make_deck("A"))
+    engine.add_player("Bob", make_deck("B"))
+    engine.start_game()
+
+    alice = engine.players[0]
+    bear = alice.hand[0]
+    alice.hand.remove(bear)
+    alice.battlefield.append(bear)
+    bear.tapped = True
+    bear.damage = 1
+    bear.counters['+1/+1'] = 2
+    alice.life = 17
+    alice.mana_pool.add_mana(ManaType.GREEN, 2)
+
+    target = engine.players[1].hand[0]
+    engine.stack_manager.add_spell("Giant Growth", 0, source_card=target, targets=[bear])
+    engine.trigger_manager.register_trigger(
+        engine.trigger_manager.create_etb_trigger(bear, lambda data: None, "Bear enters")
+    )
+    return engine
+
+
+class TestStateCodec:
+    """Test the MessagePack encoding."""
+
+    def test_round_trip(self):
+        """All supported values survive encoding."""
+        value = {
+            'ints': [0, 1, 127, 128, 255, 256, 65536, 2**32, 2**40, -1, -32, -33, -200, -40000, -2**40],
+            'floats': [0.5, -1.25],
+            'text': ["", "short", "x" * 40, "y" * 300, "z" * 70000, "Æther"],
+            'flags': [True, False, None],
+            'bytes': b'\x00\x01',
+            'nested': {1: {'a': list(range(20))}, 'map': {str(i): i for i in range(20)}},
+        }
+
+        assert _py_unpackb(_py_packb(value)) == value
+        assert unpackb(packb(value)) == value
+
+    def test_tuples_decode_as_lists(self):
+        """Tuples are encoded as arrays."""
+        assert _py_unpackb(_py_packb((1, (2, 3)))) == [1, [2, 3]]
+
+    def test_rejects_truncated_data(self):
+        """Truncated input raises ValueError."""
+        with pytest.raises(ValueError):
+            _py_unpackb(_py_packb(["abc", 1])[:-2])
+
+
+class TestGameStateSerialization:
+    """Test capturing and restoring engine state."""
+
+    def test_round_trip(self, engine):
+        """Zones, stack, mana, triggers and phase survive a save."""
+        state = decode_save(encode_save(SaveData(
+            save_name="test", game_state=capture_game_state(engine)
+        ))).game_state
+        restored = restore_game_state(state)
+
+        for original, player in zip(engine.players, restored.players):
+            assert player.name == original.name
+            assert player.life == original.life
+            for zone in ('hand', 'library', 'battlefield', 'graveyard', 'exile'):
+                assert [c.name for c in getattr(player, zone)] == \
+                    [c.name for c in getattr(original, zone)]
+
+        bear = restored.players[0].battlefield[0]
+        assert bear.tapped and bear.damage == 1 and bear.counters['+1/+1'] == 2
+        assert restored.players[0].zone_of(bear) is restored.players[0].battlefield
+        assert restored.players[0].mana_pool.mana[ManaType.GREEN] == 2
+
+        item = restored.stack_manager.peek_top()
+        assert item.name == "Giant Growth"
+        assert item.targets == [bear]
+
+        abilities = restored.trigger_manager.get_triggers_for_card(bear)
+        assert [a.description for a in abilities] == ["Bear enters"]
+
+        assert restored.turn_number == engine.turn_number
+        assert restored.active_player_index == engine.active_player_index
+        assert restored.current_step == engine.current_step
+        assert restored.phase_manager.current_step == engine.phase_manager.current_step
+
+    def test_identical_cards_share_a_definition(self, engine):
+        """Card text is stored once per distinct card."""
+        state = capture_game_state(engine)
+
+        assert len(state.cards) == 40
+        assert len(state.card_definitions) < 25
+
+    def test_snapshot_is_independent_of_the_game(self, engine):
+        """Changes after the snapshot do not leak into it."""
+        state = capture_game_state(engine)
+        engine.players[0].life = 1
+        engine.players[0].battlefield[0].counters['+1/+1'] = 9
+        engine.players[0].draw_card()
+
+        restored = restore_game_state(state)
+        assert restored.players[0].life == 17
+        assert restored.players[0].battlefield[0].counters['+1/+1'] == 2
+        assert len(restored.players[0].hand) == len(state.players[0].hand)
+
+    def test_effect_resolver_rebinds_triggers(self, engine):
+        """Trigger effects are looked up by source and description."""
+        calls = []
+        restored = restore_game_state(
+            capture_game_state(engine),
+            effect_resolver=lambda card, description: lambda data: calls.append(card.name)
+        )
+        ability = restored.trigger_manager.get_triggers_for_card(restored.players[0].battlefield[0])[0]
+        ability.effect({})
+
+        assert calls == [restored.players[0].battlefield[0].name]
+
+
+class TestSaveManager:
+    """Test SaveManager files and auto-save."""
+
+    def test_save_and_load_formats(self, engine, tmp_path):
+        """Binary saves are smaller than JSON and load the same game."""
+        manager = SaveManager(str(tmp_path))
+        assert manager.save_game(engine, "binary")
+        assert manager.save_game(engine, "json", compress=False, format='json')
+
+        binary = tmp_path / "binary.mtgs"
+        assert binary.stat().st_size * 4 < (tmp_path / "json.json").stat().st_size
+
+        for name in ("binary", "json"):
+            loaded = manager.load_game(name)
+            assert [p.life for p in loaded.players] == [17, 20]
+        assert {save['name'] for save in manager.list_saves()} == {"binary", "json"}
+
+    def test_overwrite_is_atomic_and_replaces_other_formats(self, engine, tmp_path):
+        """Saving replaces the previous file and leaves no temp files."""
+        manager = SaveManager(str(tmp_path))
+        manager.save_game(engine, "slot", format='json')
+        manager.save_game(engine, "slot")
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["slot.mtgs"]
+        assert manager.delete_save("slot")
+        assert manager.load_game("slot") is None
+
+    def test_failed_write_keeps_other_format(self, engine, tmp_path, monkeypatch):
+        """A save in another format is only removed once the new file is written."""
+        manager = SaveManager(str(tmp_path))
+        manager.save_game(engine, "slot", format='json')
+
+        def fail(filepath, data):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(save_manager, 'write_atomic', fail)
+        assert not manager.save_game(engine, "slot")
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["slot.json.gz"]
+        assert manager.load_game("slot").players[0].life == 17
+
+    def test_auto_save_at_step_end(self, engine, tmp_path):
+        """Auto-save snapshots at the end of a step and writes in the background."""
+        manager = SaveManager(str(tmp_path))
+        manager.enable_auto_save(engine, interval=0)
+        life = engine.players[0].life
+
+        engine.phase_manager.next_step()
+        assert manager.wait_for_auto_save(timeout=5)
+        manager.close()
+
+        loaded = manager.load_game("autosave")
+        assert loaded.players[0].life == life
+        assert manager._on_step_end not in engine.step_listeners
+
+    def test_auto_save_respects_interval(self, engine, tmp_path):
+        """No snapshot is taken before the interval has passed."""
+        manager = SaveManager(str(tmp_path))
+        manager.enable_auto_save(engine, interval=3600)
+
+        engine.phase_manager.next_step()
+        manager.close()
+
+        assert not (tmp_path / "autosave.mtgs").exists()
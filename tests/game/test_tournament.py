@@ -0,0 +1,209 @@
+"""
+Tests for tournament.py - Swiss pairings, tiebreakers and elimination.
+
+Tests that Swiss rounds avoid rematches and extra byes, that byes go to
+the right player, that incrementally maintained tiebreakers match a
+full recompute, and that seeded brackets give the top seeds their byes.
+"""
+
+import itertools
+import random
+import time
+
+import pytest
+from app.game.swiss_pairing import min_cost_assignment, pair_key, pair_swiss
+from app.game.tournament import Match, Tournament, TournamentFormat
+
+
+def make_tournament(num_players, num_rounds=5):
+    """Create a started-but-unpaired Swiss tournament."""
+    tournament = Tournament("Test", TournamentFormat.SWISS, num_rounds=num_rounds)
+    for i in range(num_players):
+        tournament.add_player(f"P{i}", None)
+    tournament.is_started = True
+    tournament.current_round = 1
+    return tournament
+
+
+def play_round(tournament, rng, draw_rate=0.0):
+    """Pair a round and report random results."""
+    tournament.run_round()
+    round_number = tournament.current_round - 1
+    for match in tournament.matches:
+        if match.round_number != round_number:
+            continue
+        if rng.random() < draw_rate:
+            match.games_won = {0: 1, 1: 1}
+            tournament.report_match(match, None, is_draw=True)
+            continue
+        winner = match.player1_id if rng.random() < 0.5 else match.player2_id
+        match.games_won = {0: 2, 1: rng.choice([0, 1])}
+        if winner != match.player1_id:
+            match.games_won = {0: match.games_won[1], 1: 2}
+        tournament.report_match(match, winner)
+
+
+class TestMinCostAssignment:
+    """Test the assignment solver."""
+
+    def test_matches_brute_force(self):
+        """The solver finds the optimal assignment on small random instances."""
+        rng = random.Random(3)
+        for _ in range(50):
+            size = rng.randint(1, 6)
+            costs = [[rng.randint(0, 9) for _ in range(size)] for _ in range(size)]
+            result = min_cost_assignment(size, lambda i, j: costs[i][j], lambda i: range(size))
+
+            best = min(sum(costs[i][p[i]] for i in range(size))
+                       for p in itertools.permutations(range(size)))
+            assert sorted(result) == list(range(size))
+            assert sum(costs[i][result[i]] for i in range(size)) == best
+
+    def test_infeasible_candidates(self):
+        """None is returned when some row cannot be assigned."""
+        assert min_cost_assignment(2, lambda i, j: 0, lambda i: [0]) is None
+
+
+class TestSwissPairing:
+    """Test Swiss pairing."""
+
+    def test_pairs_within_score_groups(self):
+        """Players meet opponents on the same points when possible."""
+        ranked = list(range(8))
+        points = {p: 3 if p < 4 else 0 for p in ranked}
+
+        pairings, bye = pair_swiss(ranked, points, set())
+
+        assert bye is None
+        assert all(points[a] == points[b] for a, b in pairings)
+        assert sorted(itertools.chain(*pairings)) == ranked
+
+    def test_avoids_rematch_inside_group(self):
+        """A rematch in the ideal pairing is resolved inside the group."""
+        ranked = list(range(4))
+        points = dict.fromkeys(ranked, 3)
+
+        pairings, _ = pair_swiss(ranked, points, {pair_key(0, 2), pair_key(1, 3)})
+
+        assert {pair_key(*pair) for pair in pairings} == {(0, 3), (1, 2)}
+
+    def test_bye_goes_to_lowest_player_without_one(self):
+        """The bye skips players who already had one."""
+        ranked = list(range(5))
+        points = {0: 6, 1: 3, 2: 3, 3: 0, 4: 0}
+
+        _, bye = pair_swiss(ranked, points, set(), byes={4: 1})
+
+        assert bye == 3
+
+    def test_many_rounds_without_rematches_or_extra_byes(self):
+        """Deep events stay rematch-free with exactly one bye per round."""
+        tournament = make_tournament(33, num_rounds=12)
+        rng = random.Random(11)
+        for _ in range(12):
+            play_round(tournament, rng)
+
+        pairs = [pair_key(m.player1_id, m.player2_id) for m in tournament.matches]
+        assert len(pairs) == len(set(pairs)) == 12 * 16
+        byes = [p.byes for p in tournament.players.values()]
+        assert sum(byes) == 12 and max(byes) == 1
+
+    def test_bye_scores_as_a_win(self):
+        """A bye is worth three points and a 2-0 game record."""
+        tournament = make_tournament(3)
+        tournament.run_round()
+
+        record = next(p for p in tournament.players.values() if p.byes)
+        assert record.match_points == 3
+        assert (record.games_won, record.games_lost) == (2, 0)
+
+    def test_large_field_is_fast(self):
+        """A 4096-player round pairs well under a second."""
+        tournament = make_tournament(4096)
+        rng = random.Random(5)
+        for _ in range(3):
+            play_round(tournament, rng)
+
+        start = time.perf_counter()
+        tournament.run_round()
+        assert time.perf_counter() - start < 1.0
+
+
+class TestTiebreakers:
+    """Test incremental tiebreakers."""
+
+    @pytest.mark.parametrize("num_players", [8, 17])
+    def test_incremental_matches_full_recompute(self, num_players):
+        """Tiebreakers after each report equal a full recompute."""
+        tournament = make_tournament(num_players)
+        rng = random.Random(num_players)
+        for _ in range(5):
+            play_round(tournament, rng, draw_rate=0.2)
+            incremental = {pid: (p.opponent_match_win_percentage, p.game_win_percentage)
+                           for pid, p in tournament.players.items()}
+
+            tournament._calculate_tiebreakers()
+            for pid, p in tournament.players.items():
+                assert incremental[pid] == pytest.approx(
+                    (p.opponent_match_win_percentage, p.game_win_percentage)
+                )
+
+    def test_omw_averages_opponents(self):
+        """OMW% is the mean of opponents' match win percentages, byes excluded."""
+        tournament = make_tournament(4)
+        play_round(tournament, random.Random(2))
+        play_round(tournament, random.Random(4))
+
+        for pid, record in tournament.players.items():
+            opponents = tournament.opponents[pid]
+            expected = sum(tournament.players[o].match_win_percentage
+                           for o in opponents) / len(opponents)
+            assert record.opponent_match_win_percentage == pytest.approx(expected)
+
+
+    def test_rematch_opponent_counts_once(self):
+        """A player met twice is averaged into OMW% once."""
+        tournament = make_tournament(3)
+        for round_number, (player1, player2, winner) in enumerate([(0, 1, 0), (0, 2, 2), (0, 1, 1)], 1):
+            match = Match(f"R{round_number}", round_number, player1, player2, f"P{player1}", f"P{player2}")
+            match.games_won = {0: 2, 1: 0} if winner == player1 else {0: 0, 1: 2}
+            tournament.report_match(match, winner)
+
+        players = tournament.players
+        assert tournament.opponents[0] == {1, 2}
+        assert players[0].opponent_match_win_percentage == pytest.approx(
+            (players[1].match_win_percentage + players[2].match_win_percentage) / 2)
+        incremental = players[0].opponent_match_win_percentage
+        tournament._calculate_tiebreakers()
+        assert players[0].opponent_match_win_percentage == pytest.approx(incremental)
+
+
+class TestElimination:
+    """Test seeded single-elimination brackets."""
+
+    @pytest.mark.parametrize("num_players, byes, first_round", [
+        (5, [0, 1, 2], [(3, 4)]),
+        (6, [0, 1], [(3, 4), (2, 5)]),
+        (7, [0], [(3, 4), (1, 6), (2, 5)]),
+    ])
+    def test_top_seeds_get_byes(self, num_players, byes, first_round):
+        """Fields short of a power of two give the top seeds first-round byes."""
+        tournament = Tournament("Test", TournamentFormat.SINGLE_ELIMINATION, num_rounds=3, seeded=True)
+        for i in range(num_players):
+            tournament.add_player(f"P{i}", None)
+        tournament.start()
+
+        rounds = []
+        for round_number in range(1, 4):
+            matches = [m for m in tournament.matches if m.round_number == round_number]
+            rounds.append([(m.player1_id, m.player2_id) for m in matches])
+            for match in matches:
+                # The higher seed always wins
+                match.games_won = {0: 2, 1: 0}
+                tournament.report_match(match, min(match.player1_id, match.player2_id))
+            tournament.run_round()
+
+        assert [pid for pid, p in tournament.players.items() if p.byes] == byes
+        assert rounds[0] == first_round
+        assert rounds[1] == [(0, 3), (1, 2)]
+        assert rounds[2] == [(0, 1)]
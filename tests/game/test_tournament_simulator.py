@@ -0,0 +1,128 @@
+"""
+Tests for tournament_simulator.py - AI-played tournaments.
+
+Tests generated decks, headless games and matches, playing Swiss rounds
+through Tournament.report_match, the seeded top cut, and that the worker
+pool gives the same results as playing inline.
+"""
+
+from app.game.ai_deck_manager import DeckArchetype, DeckFormat, DeckMetadata
+from app.game.enhanced_ai import AIStrategy
+from app.game.tournament import Tournament, TournamentFormat
+from app.game.tournament_simulator import (
+    DeckSpec, HeadlessGame, MatchTask, TournamentSimulator,
+    deck_spec_from_metadata, play_game, play_match, run_simulated_event
+)
+
+AGGRO = DeckSpec.generate("Aggro", ['R'], AIStrategy.AGGRO)
+MIDRANGE = DeckSpec.generate("Midrange", ['B', 'G'], AIStrategy.MIDRANGE)
+TEMPO = DeckSpec.generate("Tempo", ['U'], AIStrategy.TEMPO)
+
+
+# Short single-game matches keep whole simulated events fast
+EVENT_OPTIONS = {'best_of': 1, 'max_turns': 16}
+
+
+def make_field(count):
+    """Entrants cycling through the test decks."""
+    decks = [AGGRO, MIDRANGE, TEMPO]
+    return [DeckSpec(f"{decks[i % 3].name} {i}", decks[i % 3].cards, decks[i % 3].strategy)
+            for i in range(count)]
+
+
+class TestDecks:
+    """Test deck specs."""
+
+    def test_generated_deck(self):
+        """Generated decks have 60 cards in the deck's colors."""
+        cards = MIDRANGE.build()
+
+        assert len(cards) == 60
+        assert sum(card.is_land() for card in cards) == 24
+        assert {c for card in cards for c in card.colors} == {'B', 'G'}
+
+    def test_from_metadata(self):
+        """Archetypes pick the AI strategy."""
+        metadata = DeckMetadata(
+            name="Red Deck Wins", archetype=DeckArchetype.RED_DECK_WINS,
+            format=DeckFormat.STANDARD, colors=["R"]
+        )
+        spec = deck_spec_from_metadata(metadata)
+
+        assert spec.strategy == AIStrategy.AGGRO
+        assert spec.name == "Red Deck Wins"
+
+
+class TestHeadlessGames:
+    """Test single games and matches."""
+
+    def test_game_finishes(self):
+        """Games end with a winner whose opponent has lost."""
+        game = HeadlessGame([AGGRO, MIDRANGE])
+        winner = game.play()
+
+        assert winner in (0, 1)
+        loser = game.engine.players[1 - winner]
+        assert loser.lost_game
+        assert game.engine.turn_number <= 40
+
+    def test_seeded_games_repeat(self):
+        """The same seed plays the same game."""
+        results = [play_game(AGGRO, TEMPO, seed=seed) for seed in range(4)]
+
+        assert results == [play_game(AGGRO, TEMPO, seed=seed) for seed in range(4)]
+
+    def test_turn_limit_is_a_draw(self):
+        """Games that hit the turn limit are draws."""
+        assert play_game(MIDRANGE, MIDRANGE, seed=1, max_turns=2) is None
+
+    def test_best_of_three(self):
+        """Matches stop once a player has two wins."""
+        outcome = play_match(MatchTask("M1", (AGGRO, MIDRANGE), best_of=3, seed=5))
+
+        assert max(outcome.games_won) == 2
+        assert sum(outcome.games_won) + outcome.games_drawn == len(outcome.game_winners) <= 3
+        assert outcome.winner == outcome.games_won.index(2)
+
+
+class TestTournamentSimulator:
+    """Test simulated events."""
+
+    def test_swiss_rounds_are_reported(self):
+        """Every match is played and reported; standings add up."""
+        tournament = Tournament("Sim", TournamentFormat.SWISS, num_rounds=3, best_of=1)
+        decks = {tournament.add_player(spec.name, spec): spec for spec in make_field(9)}
+
+        with TournamentSimulator(tournament, decks, max_workers=1, seed=2, max_turns=16) as simulator:
+            standings = simulator.run()
+
+        assert tournament.is_finished
+        assert all(match.end_time is not None for match in tournament.matches)
+        assert len(tournament.matches) == 3 * 4
+        assert sum(record.byes for record in standings) == 3
+        assert sum(record.wins for record in standings) == len(tournament.matches) + 3 - \
+            sum(match.is_draw for match in tournament.matches)
+
+    def test_top_cut_is_seeded(self):
+        """The cut pairs first seed against eighth and produces one champion."""
+        results = run_simulated_event(make_field(10), rounds=2, top_cut=8, max_workers=1, seed=4,
+                                      **EVENT_OPTIONS)
+        cut = results['top_cut']
+
+        first_round = [(m.player1_id, m.player2_id) for m in cut.matches if m.round_number == 1]
+        assert first_round == [(0, 7), (3, 4), (1, 6), (2, 5)]
+        assert len(cut.matches) == 7
+        assert [p.is_active for p in cut.players.values()].count(True) == 1
+        assert results['champion'] == cut.get_standings()[0].player_name
+        assert [p.player_name for p in cut.players.values()] == \
+            [p.player_name for p in results['swiss'][:8]]
+
+    def test_worker_pool_matches_inline(self):
+        """Playing in worker processes gives the same event as inline."""
+        inline = run_simulated_event(make_field(6), rounds=2, top_cut=0, max_workers=1, seed=9,
+                                     **EVENT_OPTIONS)
+        pooled = run_simulated_event(make_field(6), rounds=2, top_cut=0, max_workers=2, seed=9,
+                                     **EVENT_OPTIONS)
+
+        assert [str(p) for p in pooled['swiss']] == [str(p) for p in inline['swiss']]
+        assert pooled['top_cut'] is None
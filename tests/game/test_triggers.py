@@ -0,0 +1,148 @@
+"""
+Tests for triggers.py - Triggered abilities.
+
+Tests the indexed trigger registry, TriggerManager dispatch and
+InteractionManager triggers sharing the same registry.
+"""
+
+import pytest
+from app.game.game_engine import GameEngine, Card, Zone
+from app.game.triggers import (
+    TriggerCondition, TriggeredAbility, TriggerManager, TriggerRegistry, TriggerType
+)
+from app.game.interaction_manager import InteractionManager, TriggerEvent
+
+
+@pytest.fixture
+def manager():
+    """Create a trigger manager for a two player game."""
+    return TriggerManager(GameEngine(num_players=2))
+
+
+def make_card(name, controller=0):
+    """Create a creature on the battlefield."""
+    card = Card(name, ["Creature"], controller=controller)
+    card.zone = Zone.BATTLEFIELD
+    return card
+
+
+class TestTriggerRegistry:
+    """Test the TriggerRegistry index."""
+
+    def test_candidates_by_bucket(self):
+        """Only abilities that can match the event's card and controller are returned."""
+        registry = TriggerRegistry()
+        bear, elf = make_card("Bear"), make_card("Elf")
+        registry.register("any", TriggerType.DIES)
+        registry.register("bear", TriggerType.DIES, source=bear, source_only=True)
+        registry.register("elf", TriggerType.DIES, source=elf, source_only=True)
+        registry.register("p1", TriggerType.DIES, source=elf, controller=1)
+
+        assert registry.candidates(TriggerType.DIES, {'card': bear}) == ["any", "bear"]
+        assert registry.candidates(TriggerType.DIES, {'card': elf, 'controller': 1}) == [
+            "any", "elf", "p1"
+        ]
+        assert registry.candidates(TriggerType.ATTACKS, {'card': bear}) == []
+
+    def test_unregister_and_unregister_source(self):
+        """Abilities can be removed one at a time or per source card."""
+        registry = TriggerRegistry()
+        bear = make_card("Bear")
+        registry.register("etb", TriggerType.ENTERS_BATTLEFIELD, source=bear)
+        registry.register("dies", TriggerType.DIES, source=bear)
+
+        assert registry.unregister("etb")
+        assert not registry.unregister("etb")
+        assert registry.for_source(bear) == ["dies"]
+
+        assert registry.unregister_source(bear) == ["dies"]
+        assert len(registry) == 0
+        assert registry.candidates(TriggerType.DIES, {}) == []
+
+    def test_zone_filter(self):
+        """Abilities with a zone only match while their source is in it."""
+        registry = TriggerRegistry()
+        bear = make_card("Bear")
+        registry.register("upkeep", TriggerType.BEGINNING_OF_UPKEEP, source=bear,
+                          zone=Zone.BATTLEFIELD)
+
+        assert registry.candidates(TriggerType.BEGINNING_OF_UPKEEP) == ["upkeep"]
+        bear.zone = Zone.GRAVEYARD
+        assert registry.candidates(TriggerType.BEGINNING_OF_UPKEEP) == []
+
+
+class TestTriggerManager:
+    """Test TriggerManager dispatch."""
+
+    def test_etb_trigger_only_fires_for_its_source(self, manager):
+        """'When this enters' triggers ignore other cards entering."""
+        bear, elf = make_card("Bear"), make_card("Elf")
+        ability = manager.create_etb_trigger(bear, lambda data: None)
+        manager.register_trigger(ability)
+
+        manager.fire_trigger(TriggerType.ENTERS_BATTLEFIELD, {'card': elf})
+        assert manager.pending_triggers == []
+
+        manager.fire_trigger(TriggerType.ENTERS_BATTLEFIELD, {'card': bear})
+        assert manager.pending_triggers == [ability]
+
+    def test_controller_condition(self, manager):
+        """Controller-restricted triggers only fire for that controller."""
+        bear = make_card("Bear")
+        ability = TriggeredAbility(
+            source_card=bear,
+            trigger_type=TriggerType.DIES,
+            effect=lambda data: None,
+            condition=TriggerCondition(controller=0)
+        )
+        manager.register_trigger(ability)
+
+        manager.fire_trigger(TriggerType.DIES, {'controller': 1})
+        assert manager.pending_triggers == []
+        manager.fire_trigger(TriggerType.DIES, {'controller': 0})
+        assert manager.pending_triggers == [ability]
+
+    def test_clear_card_triggers(self, manager):
+        """Clearing a card removes all of its triggers."""
+        bear = make_card("Bear")
+        manager.register_trigger(manager.create_etb_trigger(bear, lambda data: None))
+        manager.register_trigger(manager.create_dies_trigger(bear, lambda data: None))
+        assert len(manager.get_triggers_for_card(bear)) == 2
+
+        manager.clear_card_triggers(bear)
+
+        assert manager.get_triggers_for_card(bear) == []
+        assert manager.triggers[TriggerType.DIES] == []
+
+
+class TestInteractionManagerTriggers:
+    """Test InteractionManager triggers on the shared registry."""
+
+    def test_check_triggers_skips_cards_off_battlefield(self):
+        """Triggers of cards that are not on the battlefield don't fire."""
+        interactions = InteractionManager(GameEngine(num_players=2))
+        bear = make_card("Bear")
+        interactions.register_trigger(bear, TriggerEvent.UPKEEP, lambda ctx: None)
+
+        interactions.check_triggers(TriggerEvent.UPKEEP)
+        assert len(interactions.triggered_abilities_waiting) == 1
+
+        bear.zone = Zone.GRAVEYARD
+        interactions.check_triggers(TriggerEvent.UPKEEP)
+        assert len(interactions.triggered_abilities_waiting) == 1
+
+    def test_leaving_battlefield_keeps_triggers(self):
+        """A card's triggers stay registered and fire again once it returns."""
+        interactions = InteractionManager(GameEngine(num_players=2))
+        bear = make_card("Bear")
+        interactions.register_trigger(bear, TriggerEvent.UPKEEP, lambda ctx: None)
+
+        bear.zone = Zone.GRAVEYARD
+        interactions.handle_leaves_battlefield(bear)
+        assert len(interactions.triggers) == 1
+        interactions.check_triggers(TriggerEvent.UPKEEP)
+        assert interactions.triggered_abilities_waiting == []
+
+        bear.zone = Zone.BATTLEFIELD
+        interactions.check_triggers(TriggerEvent.UPKEEP)
+        assert len(interactions.triggered_abilities_waiting) == 1
@@ -0,0 +1,225 @@
+"""
+Tests for zones.py - Indexed card zones.
+
+Tests O(1) zone bookkeeping: drawing, membership, moves between a player's
+zones, cached per-type views, the engine's combined battlefield view and its
+cached zones by name.
+"""
+
+import pytest
+from app.game.game_engine import GameEngine, Card, Player, Zone
+from app.game.zones import CardZone, card_has_type
+
+
+def make_deck(count=10, types=None):
+    """Create a simple deck of distinct cards."""
+    return [Card(f"Card{i}", list(types or ["Land"])) for i in range(count)]
+
+
+class TestCardZone:
+    """Test the CardZone container."""
+
+    def test_behaves_like_a_list(self):
+        """Zones support len, indexing, slicing and iteration in order."""
+        cards = make_deck(5)
+        zone = CardZone(Zone.LIBRARY, cards)
+
+        assert len(zone) == 5
+        assert zone[0] is cards[0]
+        assert zone[-1] is cards[-1]
+        assert zone[1:3] == cards[1:3]
+        assert list(zone) == cards
+        assert zone == cards
+
+    def test_membership_is_by_identity(self):
+        """Equal-but-distinct cards are not confused with each other."""
+        first = Card("Forest", ["Land"])
+        twin = Card("Forest", ["Land"])
+        zone = CardZone(Zone.HAND, [first])
+
+        assert first in zone
+        assert twin not in zone
+        with pytest.raises(ValueError):
+            zone.remove(twin)
+
+    def test_popleft_and_pop(self):
+        """popleft draws from the top, pop(0) and pop() match list semantics."""
+        cards = make_deck(4)
+        zone = CardZone(Zone.LIBRARY, cards)
+
+        assert zone.popleft() is cards[0]
+        assert zone.pop(0) is cards[1]
+        assert zone.pop() is cards[3]
+        assert list(zone) == [cards[2]]
+
+    def test_append_sets_card_zone(self):
+        """Cards entering a zone record which zone they are in."""
+        card = Card("Bear", ["Creature"])
+        zone = CardZone(Zone.BATTLEFIELD)
+        zone.append(card)
+
+        assert card.zone == Zone.BATTLEFIELD
+
+    def test_appendleft_and_insert(self):
+        """Cards can be put on top or at a position."""
+        cards = make_deck(3)
+        zone = CardZone(Zone.LIBRARY, cards)
+        top = Card("Top", ["Land"])
+        middle = Card("Middle", ["Land"])
+
+        zone.appendleft(top)
+        zone.insert(2, middle)
+
+        assert zone[0] is top
+        assert zone.index(middle) == 2
+
+    def test_iteration_is_safe_while_removing(self):
+        """Removing cards while iterating does not skip or raise."""
+        cards = make_deck(5)
+        zone = CardZone(Zone.BATTLEFIELD, cards)
+
+        for card in zone:
+            zone.remove(card)
+
+        assert len(zone) == 0
+
+    def test_shuffle_keeps_cards(self):
+        """Shuffling reorders without losing cards."""
+        cards = make_deck(20)
+        zone = CardZone(Zone.LIBRARY, cards)
+        zone.shuffle()
+
+        assert len(zone) == 20
+        assert all(card in zone for card in cards)
+
+    def test_cached_type_views(self):
+        """Per-type views are cached until the zone changes."""
+        land = Card("Forest", ["Land"])
+        bear = Card("Bear", ["Creature"])
+        walker = Card("Jace", ["Legendary", "Planeswalker"])
+        zone = CardZone(Zone.BATTLEFIELD, [land, bear, walker])
+
+        creatures = zone.creatures()
+        assert creatures == (bear,)
+        assert zone.creatures() is creatures
+        assert zone.lands() == (land,)
+        assert zone.planeswalkers() == (walker,)
+
+        other = Card("Elf", ["Creature"])
+        zone.append(other)
+        assert zone.creatures() == (bear, other)
+
+    def test_card_has_type_accepts_type_line(self):
+        """Objects with only a type_line are classified too."""
+        class LineCard:
+            type_line = "Legendary Creature - Elf"
+
+        assert card_has_type(LineCard(), "Creature")
+        assert card_has_type(LineCard(), "Legendary")
+        assert not card_has_type(LineCard(), "Land")
+
+
+class TestPlayerZones:
+    """Test zone bookkeeping on Player."""
+
+    def test_player_zones_are_card_zones(self):
+        """Player zones are CardZones, even when assigned plain lists."""
+        player = Player(player_id=0, name="Alice")
+        assert isinstance(player.hand, CardZone)
+
+        player.hand = make_deck(3)
+        assert isinstance(player.hand, CardZone)
+        assert player.hand.zone == Zone.HAND
+        assert len(player.hand) == 3
+
+    def test_moving_between_zones(self):
+        """Adding a card to one zone removes it from the player's other zone."""
+        player = Player(player_id=0, name="Alice")
+        card = Card("Bear", ["Creature"])
+        player.hand.append(card)
+
+        player.battlefield.append(card)
+
+        assert card not in player.hand
+        assert card in player.battlefield
+        assert player.zone_of(card) is player.battlefield
+
+    def test_draw_card(self):
+        """Drawing takes the top card of the library."""
+        player = Player(player_id=0, name="Alice")
+        cards = make_deck(3)
+        player.library.extend(cards)
+
+        drawn = player.draw_card()
+
+        assert drawn is cards[0]
+        assert drawn.zone == Zone.HAND
+        assert drawn in player.hand
+        assert len(player.library) == 2
+
+
+class TestEngineZones:
+    """Test engine helpers built on zones."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = GameEngine(num_players=2)
+        engine.add_player("Alice", make_deck(10))
+        engine.add_player("Bob", make_deck(10))
+        return engine
+
+    def test_move_to_graveyard_from_any_zone(self, engine):
+        """move_to_graveyard finds the card's current zone."""
+        player = engine.players[0]
+        card = player.library[0]
+
+        engine.move_to_graveyard(card)
+
+        assert card not in player.library
+        assert card in player.graveyard
+        assert card.zone == Zone.GRAVEYARD
+
+    def test_get_zone_returns_player_zone(self, engine):
+        """get_zone returns the live zone, which supports add_card."""
+        hand = engine.get_zone("hand", 0)
+        card = Card("Bolt", ["Instant"])
+        hand.add_card(card)
+
+        assert card in engine.players[0].hand
+        assert hand.cards is engine.players[0].hand
+
+    def test_combined_battlefield_view_is_cached(self, engine):
+        """The battlefield view is only rebuilt when a battlefield changes."""
+        bear = Card("Bear", ["Creature"], controller=1)
+        engine.players[1].battlefield.append(bear)
+
+        battlefield = engine.get_zone("battlefield")
+        cards = battlefield.cards
+        assert bear in cards
+        assert battlefield.cards is cards
+
+        engine.move_to_graveyard(bear)
+        assert bear not in battlefield.cards
+
+    def test_combined_view_follows_type_changes(self, engine):
+        """A card gaining a type shows up in the engine-wide typed view."""
+        land = Card("Mutavault", ["Land"], controller=0)
+        engine.players[0].battlefield.append(land)
+        assert land not in engine.battlefield.creatures()
+
+        land.types = ["Land", "Creature"]
+
+        assert land in engine.players[0].battlefield.creatures()
+        assert land in engine.battlefield.creatures()
+
+    def test_zones_by_name_are_cached(self, engine):
+        """engine.zones is built once and follows zone reassignments."""
+        zones = engine.zones
+        assert engine.zones is zones
+        assert zones[1]['command'] is engine.players[1].command_zone
+
+        engine.players[0].hand = make_deck(2)
+        assert zones[0]['hand'] is engine.players[0].hand
+
+        engine.add_player("Carol", make_deck(5))
+        assert len(engine.zones) == 3
@@ -363,3 +363,115 @@ class TestStateBasedActionsAfterSpellResolution:
         # Creature should have taken damage and died from SBAs
         assert creature.damage >= 2  # Lethal
         assert creature in engine.players[0].graveyard
+
+
+class TestIncrementalStateBasedActions:
+    """Test that change-tracked SBA checks match a full scan."""
+    
+    def _make_engine(self):
+        engine = GameEngine(num_players=2)
+        engine.add_player("Alice", [Card(f"Card{i}", ["Land"]) for i in range(20)])
+        engine.add_player("Bob", [Card(f"Card{i}", ["Land"]) for i in range(20)])
+        return engine
+    
+    def _random_board(self, engine, rng):
+        """Put a random mix of creatures, legends and walkers on the battlefield."""
+        cards = []
+        for player in engine.players:
+            for i in range(rng.randint(5, 15)):
+                roll = rng.random()
+                if roll < 0.15:
+                    card = Card(f"Legend{rng.randint(0, 2)}", ["Legendary", "Creature"])
+                elif roll < 0.25:
+                    card = Card(f"Walker{i}", ["Planeswalker"])
+                    card.loyalty = rng.randint(0, 3)
+                else:
+                    card = Card(f"Creature{i}", ["Creature"])
+                card.toughness = rng.randint(0, 4)
+                card.damage = rng.randint(0, 3)
+                card.plus_counters = rng.randint(0, 2)
+                card.minus_counters = rng.randint(0, 2)
+                card.controller = player.player_id
+                player.battlefield.append(card)
+                cards.append(card)
+        return cards
+    
+    def _board_state(self, engine):
+        return [
+            (
+                [c.name for c in p.battlefield],
+                sorted(c.name for c in p.graveyard),
+                [(getattr(c, 'plus_counters', 0), getattr(c, 'minus_counters', 0)) for c in p.battlefield],
+                p.lost_game,
+            )
+            for p in engine.players
+        ]
+    
+    def test_incremental_matches_full_scan(self):
+        """Incremental checks end in the same state as full scans."""
+        import random
+        
+        for seed in range(25):
+            states = []
+            for full_scan in (False, True):
+                rng = random.Random(seed)
+                engine = self._make_engine()
+                cards = self._random_board(engine, rng)
+                engine.sba_checker.check_all(full_scan=full_scan)
+                
+                # Mutate a few cards and a player, then check again
+                for card in rng.sample(cards, 5):
+                    card.damage = rng.randint(0, 5)
+                engine.players[1].life = rng.randint(-1, 3)
+                engine.sba_checker.check_all(full_scan=full_scan)
+                states.append(self._board_state(engine))
+            
+            assert states[0] == states[1], f"seed {seed}"
+    
+    def test_unchanged_permanents_not_reexamined(self):
+        """A second check with no changes examines nothing."""
+        engine = self._make_engine()
+        bear = Card("Bear", ["Creature"], toughness=2)
+        bear.controller = 0
+        engine.players[0].battlefield.append(bear)
+        engine.check_state_based_actions()
+        
+        checker = engine.sba_checker
+        checker._start_round()
+        assert checker._changed(engine.players[0].battlefield) == []
+        assert checker._round_players == []
+    
+    def test_damage_after_check_is_seen(self):
+        """Damage dealt after a clean check is picked up by the next one."""
+        engine = self._make_engine()
+        bear = Card("Bear", ["Creature"], toughness=2)
+        bear.controller = 0
+        engine.players[0].battlefield.append(bear)
+        engine.check_state_based_actions()
+        assert bear in engine.players[0].battlefield
+        
+        bear.damage += 2
+        engine.check_state_based_actions()
+        
+        assert bear in engine.players[0].graveyard
+    
+    def test_equipment_rechecked_when_creature_changes(self):
+        """Equipment is re-examined when the creature it is attached to changes."""
+        engine = self._make_engine()
+        bear = Card("Bear", ["Creature"], toughness=2)
+        bear.controller = 0
+        engine.players[0].battlefield.append(bear)
+        
+        sword = Card("Sword", ["Artifact"])
+        sword.type_line = "Artifact - Equipment"
+        sword.controller = 0
+        sword.attached_to = bear
+        engine.players[0].battlefield.append(sword)
+        engine.check_state_based_actions()
+        assert sword.attached_to is bear
+        
+        # Bear changes control; only the bear was written to
+        bear.controller = 1
+        engine.check_state_based_actions()
+        
+        assert sword.attached_to is None
@@ -6,6 +6,7 @@ Tests deck operations beyond basic CRUD:
 - Commander and partner designation  
 - Deck cloning
 - Sideboard operations
+- Statistics from SQL aggregates and the per-deck stats cache
 """
 
 import pytest
@@ -265,3 +266,114 @@ class TestDeckStatistics:
         
         stats = deck_service.compute_deck_stats(deck_id)
         assert stats.total_cards == 36
+
+
+
+class TestDeckStatsCache:
+    """Test aggregated statistics and their incremental cache."""
+    
+    CARDS = [
+        ("bolt", "Lightning Bolt", 1.0, "R", "Instant"),
+        ("bolt-2", "Lightning Bolt", 1.0, "R", "Instant"),
+        ("bears", "Grizzly Bears", 2.0, "G", "Creature — Bear"),
+        ("charm", "Izzet Charm", 2.0, "U,R", "Instant"),
+        ("forest", "Forest", 0.0, "", "Basic Land — Forest"),
+        ("golos", "Golos, Tireless Pilgrim", 5.0, "", "Legendary Artifact Creature — Scout"),
+        ("mystery", "Mystery", None, None, None),
+    ]
+    
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(str(tmp_path / 'decks.sqlite'))
+        db.create_tables()
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO sets(code, name) VALUES ('SET', 'Test Set')")
+            conn.executemany(
+                "INSERT INTO cards(uuid, name, set_code, collector_number, mana_value, colors, type_line) "
+                "VALUES (?, ?, 'SET', '1', ?, ?, ?)",
+                self.CARDS
+            )
+        yield db
+        db.close()
+    
+    @pytest.fixture
+    def deck_service(self, db):
+        return DeckService(db)
+    
+    @staticmethod
+    def recomputed(deck_service, deck_id):
+        """Statistics totalled from scratch."""
+        deck_service.clear_stats_cache()
+        return deck_service.compute_deck_stats(deck_id)
+    
+    def test_aggregated_stats(self, deck_service):
+        """One aggregate gives every count, skipping commanders."""
+        deck_id = deck_service.create_deck("Stats", "Modern")
+        for uuid, quantity in [("bolt", 4), ("bears", 3), ("charm", 2), ("forest", 10), ("mystery", 1)]:
+            deck_service.add_card(deck_id, uuid, quantity)
+        
+        stats = self.recomputed(deck_service, deck_id)
+        
+        assert stats.total_cards == 20
+        assert (stats.total_instants, stats.total_creatures, stats.total_lands) == (6, 3, 10)
+        assert stats.total_other == 0
+        assert stats.mana_curve == {1: 4, 2: 5, 0: 10}
+        assert stats.average_mana_value == pytest.approx(14 / 19)
+        assert stats.color_distribution == {"R": 6, "G": 3, "U": 2}
+        assert stats.color_identity == ["G", "R", "U"]
+        assert stats.is_commander_legal
+    
+    def test_incremental_updates_match_recompute(self, deck_service):
+        """Edits update cached stats to what totalling the deck again gives."""
+        deck_id = deck_service.create_deck("Commander", "Commander")
+        deck_service.add_card(deck_id, "bolt", 1)
+        deck_service.compute_deck_stats(deck_id)  # cache the totals
+        
+        deck_service.add_card(deck_id, "golos", 1)
+        deck_service.set_commander(deck_id, "golos")
+        deck_service.add_card(deck_id, "bolt-2", 1)
+        deck_service.add_card(deck_id, "forest", 5)
+        deck_service.remove_card(deck_id, "forest", 2)
+        deck_service.add_card(deck_id, "charm", 2)
+        deck_service.remove_card(deck_id, "charm")
+        cached = deck_service.compute_deck_stats(deck_id)
+        
+        assert cached == self.recomputed(deck_service, deck_id)
+        assert cached.total_cards == 5 and cached.total_artifacts == 0
+        assert cached.commander_violations == [
+            "Deck has 6 cards, should have exactly 100",
+            "Forest appears 3 times (should be 1)",
+            "Lightning Bolt appears 2 times (should be 1)",
+        ]
+        
+        deck_service.remove_card(deck_id, "bolt-2", 1)
+        stats = deck_service.compute_deck_stats(deck_id)
+        assert stats.commander_violations == [
+            "Deck has 5 cards, should have exactly 100",
+            "Forest appears 3 times (should be 1)",
+        ]
+        assert stats == self.recomputed(deck_service, deck_id)
+    
+    def test_reads_cache_without_scanning(self, deck_service, db):
+        """Cached stats are read without touching the deck's cards."""
+        deck_id = deck_service.create_deck("Cached", "Modern")
+        deck_service.add_card(deck_id, "bears", 4)
+        expected = deck_service.compute_deck_stats(deck_id)
+        
+        with db.transaction():
+            db.execute("DELETE FROM deck_cards WHERE deck_id = ?", (deck_id,))
+        
+        assert deck_service.compute_deck_stats(deck_id) == expected
+        assert self.recomputed(deck_service, deck_id).total_cards == 0
+    
+    def test_delete_deck_drops_cache(self, deck_service, db):
+        """Deleting a deck removes its cached totals."""
+        deck_id = deck_service.create_deck("Gone", "Modern")
+        deck_service.add_card(deck_id, "bears", 4)
+        deck_service.compute_deck_stats(deck_id)
+        
+        deck_service.delete_deck(deck_id)
+        
+        assert db.execute("SELECT COUNT(*) FROM deck_stats_cache").fetchone()[0] == 0
+        with pytest.raises(ValueError):
+            deck_service.compute_deck_stats(deck_id)
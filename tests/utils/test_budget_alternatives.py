@@ -0,0 +1,121 @@
+"""
+Tests for budget alternatives.
+
+Tests the alternatives index (one entry per card name at its cheapest
+printing), ranking cheaper cards by shared tags and mana value band, color
+identity and format legality filtering, whole-deck suggestions, and
+BudgetAnalyzer replacing expensive cards with them.
+"""
+
+import pytest
+from app.utils.budget_alternatives import BudgetAlternativeFinder
+from app.utils.legality_checker import LegalityIndex
+from app.utils.price_tracker import BudgetAnalyzer, CardPrice, PriceTracker
+from app.utils.synergy_finder import SynergyFinder, SynergyTagStore
+
+SACRIFICE = 'Sacrifice a creature: Add {C}{C}.'
+# uuid -> (name, type line, mana value, rules text, color identity, price, commander status)
+ROWS = {
+    'phyrexian': ('Phyrexian Altar', 'Artifact', 3, SACRIFICE, '', 60.0, 'Legal'),
+    'ashnod': ("Ashnod's Altar", 'Artifact', 3, SACRIFICE, '', 20.0, 'Banned'),
+    'ashnod-2': ("Ashnod's Altar", 'Artifact', 3, SACRIFICE, '', 12.0, 'Banned'),
+    'dementia': ('Altar of Dementia', 'Artifact', 2,
+                 'Sacrifice a creature: Target player mills cards.', '', 5.0, 'Legal'),
+    'carrion': ('Carrion Altar', 'Artifact', 3, SACRIFICE, 'B', 1.0, 'Legal'),
+    'mind-stone': ('Mind Stone', 'Artifact', 2, '{T}: Add {C}.', '', 0.5, 'Legal'),
+    'seer': ('Viscera Seer', 'Creature — Vampire Wizard', 1, 'Sacrifice a creature: Scry 1.', 'B', 0.3,
+             'Legal'),
+    'gilded': ('Gilded Altar', 'Artifact', 3, SACRIFICE, '', 100.0, 'Legal'),
+}
+
+
+@pytest.fixture
+def db_path(make_card_index):
+    """Card index holding ROWS."""
+    return make_card_index(
+        {uuid: {'name': name, 'type_line': type_line, 'mana_value': mana_value, 'oracle_text': text,
+                'color_identity': identity}
+         for uuid, (name, type_line, mana_value, text, identity, _, _) in ROWS.items()},
+        prices=[(uuid, provider, 'usd', price * scale)
+                for uuid, (_, _, _, _, _, price, _) in ROWS.items()
+                for provider, scale in (('tcgplayer', 1), ('cardkingdom', 1.5))],
+        legalities=[(uuid, 'commander', status) for uuid, (*_, status) in ROWS.items()]
+    )
+
+
+@pytest.fixture
+def finder(db_path, fake_repository):
+    """Alternatives index over the test card index (tags come from the index)."""
+    finder = BudgetAlternativeFinder(SynergyFinder(fake_repository()), LegalityIndex(db_path))
+    finder.build_index(db_path, SynergyTagStore(), "v1")
+    return finder
+
+
+class TestIndex:
+    """Test building the index."""
+    
+    def test_one_entry_per_name_at_cheapest_price(self, finder):
+        """Printings collapse into their name, priced at the cheapest printing and provider."""
+        assert finder.names.count("Ashnod's Altar") == 1
+        position = finder.names.index("Ashnod's Altar")
+        assert finder.uuids[position] == 'ashnod-2'
+        assert finder.prices[position] == 12.0
+
+
+class TestAlternatives:
+    """Test alternatives for one card."""
+    
+    def test_ranked_cheaper_similar_cards(self, finder):
+        """Same-band cards sharing tags come first; other types and untagged cards are left out."""
+        alternatives = finder.alternatives('Phyrexian Altar')
+        
+        assert [a['name'] for a in alternatives] == ["Ashnod's Altar", 'Altar of Dementia']
+        assert alternatives[0]['savings'] == 48.0
+        assert alternatives[0]['similarity'] > alternatives[1]['similarity']
+        assert 'sacrifice' in alternatives[0]['shared_tags']
+    
+    def test_color_identity_and_legality(self, finder):
+        """Wider color identities allow more cards; equally similar cards rank cheapest first."""
+        names = [a['name'] for a in finder.alternatives('Phyrexian Altar', limit=5, color_identity=['B'])]
+        legal = [a['name'] for a in finder.alternatives('Phyrexian Altar', limit=5, color_identity=['B'],
+                                                        deck_format='commander')]
+        
+        assert names == ['Carrion Altar', "Ashnod's Altar", 'Altar of Dementia']
+        assert legal == ['Carrion Altar', 'Altar of Dementia']
+    
+    def test_unknown_card(self, finder):
+        """Cards without a price in the index have no alternatives."""
+        assert finder.alternatives('Nonexistent Card') == []
+
+
+class TestSuggestForDeck:
+    """Test whole-deck suggestions."""
+    
+    def test_suggest_for_deck(self, finder):
+        """Cards in the deck aren't suggested; biggest savings come first."""
+        suggestions = finder.suggest_for_deck(
+            [('Phyrexian Altar', 1), ("Ashnod's Altar", 2), ('Mind Stone', 4), ('Unknown', 1)]
+        )
+        
+        assert [(s['name'], s['quantity']) for s in suggestions] == [
+            ('Phyrexian Altar', 1), ("Ashnod's Altar", 2)
+        ]
+        assert [a['name'] for a in suggestions[0]['alternatives']] == ['Altar of Dementia']
+        assert suggestions[1]['alternatives'][0]['savings'] == 7.0
+    
+    def test_budget_analyzer_uses_finder(self, finder, tmp_path):
+        """BudgetAnalyzer replaces expensive cards with similar cheaper ones."""
+        tracker = PriceTracker(data_dir=tmp_path / "prices")
+        tracker.store.record({
+            'phyrexian altar|': CardPrice('Phyrexian Altar', '', 60.0),
+            'mind stone|': CardPrice('Mind Stone', '', 0.5),
+        })
+        deck_data = {'mainboard': [{'name': 'Phyrexian Altar', 'quantity': 1},
+                                   {'name': 'Mind Stone', 'quantity': 1}], 'sideboard': []}
+        
+        suggestions = BudgetAnalyzer(deck_data, tracker, finder).suggest_budget_alternatives(max_budget=10.0)
+        
+        assert [(s['card_name'], s['alternative_name']) for s in suggestions] == [
+            ('Phyrexian Altar', "Ashnod's Altar")
+        ]
+        assert suggestions[0]['savings'] == 48.0
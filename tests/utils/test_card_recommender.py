@@ -0,0 +1,111 @@
+"""
+Tests for card recommender.
+
+Tests inverted-index scores against SynergyFinder's pair-by-pair synergy
+counts, color identity and format legality filtering, one entry per card
+name, and top-k ordering.
+"""
+
+import pytest
+from app.utils.card_recommender import CardRecommender
+from app.utils.legality_checker import LegalityIndex
+from app.utils.synergy_finder import SynergyFinder, SynergyTagStore
+
+
+# uuid -> (name, type line, rules text, color identity, commander status)
+ROWS = {
+    'altar': ("Ashnod's Altar", 'Artifact', 'Sacrifice a creature: Add {C}{C}.', '', 'Legal'),
+    'raise': ('Raise the Alarm', 'Instant', 'Create two 1/1 white Soldier creature tokens.', 'W', 'Legal'),
+    'raise-2': ('Raise the Alarm', 'Instant', 'Create two 1/1 white Soldier creature tokens.', 'W', 'Legal'),
+    'bitterblossom': ('Bitterblossom', 'Enchantment',
+                      'At the beginning of your upkeep, you lose 1 life and create a 1/1 token.', 'B',
+                      'Banned'),
+    'carrion': ('Carrion Feeder', 'Creature — Zombie',
+                'Sacrifice a creature: Put a +1/+1 counter on Carrion Feeder.', 'B', 'Legal'),
+    'zombie': ('Gravecrawler', 'Creature — Zombie', 'Gravecrawler can\'t block.', 'B', 'Legal'),
+    'visionary': ('Elvish Visionary', 'Creature — Elf Shaman',
+                  'When this enters, each player draws a card.', 'G', 'Legal'),
+    'soldier': ('Soldier Token', 'Token Creature — Soldier', 'token', 'W', 'Legal'),
+}
+
+
+@pytest.fixture
+def cards():
+    """Card dictionaries by uuid."""
+    return {
+        uuid: {'name': name, 'type_line': type_line, 'oracle_text': text}
+        for uuid, (name, type_line, text, _, _) in ROWS.items()
+    }
+
+
+@pytest.fixture
+def recommender(cards, fake_repository, make_card_index):
+    """Recommender over a card index holding ROWS."""
+    db_path = make_card_index(
+        {uuid: {'name': name, 'type_line': type_line, 'oracle_text': text, 'color_identity': identity,
+                'is_token': int(uuid == 'soldier')}
+         for uuid, (name, type_line, text, identity, _) in ROWS.items()},
+        legalities=[(uuid, fmt, status) for uuid, (_, _, _, _, status) in ROWS.items()
+                    for fmt in ('commander', 'duel')]
+    )
+    
+    recommender = CardRecommender(SynergyFinder(fake_repository(cards)), LegalityIndex(db_path))
+    recommender.build_index(db_path, SynergyTagStore(), "v1")
+    return recommender
+
+
+class TestIndex:
+    """Test building the index."""
+    
+    def test_one_entry_per_name(self, recommender):
+        """Reprints share an entry and tokens are left out."""
+        assert recommender.names.count('Raise the Alarm') == 1
+        assert 'Soldier Token' not in recommender.names
+        assert len(recommender.uuids) == 6
+
+
+class TestRecommend:
+    """Test recommendations."""
+    
+    def test_scores_match_pairwise_counts(self, recommender):
+        """Every score equals the synergy count of checking each deck card in turn."""
+        deck = [('altar', 1), ('carrion', 1)]
+        pool = [uuid for uuid in recommender.uuids if uuid not in dict(deck)]
+        
+        recommended = recommender.recommend(deck, limit=10, color_identity='WUBRG')
+        expected = recommender.finder.suggest_cards_for_deck([uuid for uuid, _ in deck], pool, limit=10)
+        
+        assert {r['uuid']: r['synergy_count'] for r in recommended} == {
+            s['uuid']: s['synergy_count'] for s in expected}
+        assert [r['synergy_count'] for r in recommended] == sorted(
+            (r['synergy_count'] for r in recommended), reverse=True)
+        assert recommended[0]['reasons'][0] in {'sacrifice', 'sacrifice_synergy', 'tokens_synergy'}
+    
+    def test_color_identity(self, recommender):
+        """By default only cards within the deck's color identity are recommended."""
+        deck = [('altar', 1), ('carrion', 1)]
+        
+        names = {r['name'] for r in recommender.recommend(deck)}
+        
+        assert 'Raise the Alarm' not in names
+        assert 'Bitterblossom' in names
+    
+    def test_format_legality(self, recommender):
+        """Cards not legal in the deck's format are left out."""
+        deck = [('altar', 1), ('carrion', 1)]
+        
+        names = {r['name'] for r in recommender.recommend(deck, deck_format='Commander')}
+        duel = {r['name'] for r in recommender.recommend(deck, deck_format='Commander 1v1')}
+        
+        assert 'Bitterblossom' not in names
+        assert 'Gravecrawler' in names
+        assert duel == names
+    
+    def test_excludes_deck_cards_and_limits(self, recommender):
+        """Other printings of deck cards aren't recommended; limit caps the results."""
+        deck = [('raise-2', 1), ('altar', 1)]
+        
+        recommended = recommender.recommend(deck, limit=1, color_identity='WB')
+        
+        assert len(recommended) == 1
+        assert recommended[0]['name'] != 'Raise the Alarm'
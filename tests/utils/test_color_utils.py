@@ -12,6 +12,8 @@ from app.utils.color_utils import (
     is_mono_color,
     is_multicolor,
     is_colorless,
+    color_mask,
+    mask_colors,
     COLORS,
     COLOR_SYMBOLS
 )
@@ -288,6 +290,21 @@ class TestColorIdentityChecks:
         assert is_colorless({"W", "U"}) is False
 
 
+class TestColorMasks:
+    """Test color bitmasks."""
+    
+    def test_color_mask(self):
+        """Color codes and index strings give the same mask."""
+        assert color_mask(['W', 'U']) == color_mask("W,U") == 0b11
+        assert color_mask("WUBRG") == 0b11111
+        assert color_mask(None) == color_mask("") == color_mask(['C']) == 0
+        
+    def test_mask_colors(self):
+        """Masks convert back to color codes."""
+        assert mask_colors(color_mask("B,G")) == {'B', 'G'}
+        assert mask_colors(0) == set()
+
+
 class TestColorConstants:
     """Test color constant definitions."""
     
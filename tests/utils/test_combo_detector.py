@@ -2,11 +2,14 @@
 Comprehensive tests for card combo detection system.
 
 Tests ComboDetector functionality including combo finding, partial combo
-detection, combo searching, and deck analysis.
+detection, combo searching, and deck analysis, plus the SQLite combo
+store and importing combo datasets.
 """
 
+import json
+
 import pytest
-from app.utils.combo_detector import Combo, ComboDetector
+from app.utils.combo_detector import Combo, ComboDetector, ComboStore, card_key, load_combo_file
 
 
 class TestComboDataclass:
@@ -516,3 +519,86 @@ class TestSpecificCombos:
         assert len(combos) > 0
         mill_combo = combos[0]
         assert mill_combo.combo_type == 'win'
+
+
+def dataset_combo(index, cards):
+    """A dataset entry for a generated combo."""
+    return {'name': f'Combo {index}', 'cards': cards, 'description': f'Generated combo {index}',
+            'steps': ['Assemble the pieces'], 'result': 'Win the game', 'colors': ['B'],
+            'combo_type': 'win', 'difficulty': 'easy', 'requires_setup': False}
+
+
+class TestComboStore:
+    """Test the SQLite combo store and dataset import."""
+    
+    def test_matches_linear_scan(self):
+        """Indexed complete and partial combos equal checking every combo."""
+        entries = [dataset_combo(i, [f'Card {j}' for j in range(i % 7, i % 7 + 2 + i % 3)])
+                   for i in range(60)]
+        store = ComboStore()
+        store.add_combos(Combo(**dict(entry, colors=set(entry['colors']))) for entry in entries)
+        detector = ComboDetector(repository=None, store=store)
+        deck = ['Card 1', 'card  2', 'Card 3', 'Card 5', 'Palinchron']
+        deck_keys = {card_key(name) for name in deck}
+        
+        expected_complete, expected_partial = [], []
+        for combo in detector.combos:
+            pieces = {card_key(name) for name in combo.cards}
+            missing = pieces - deck_keys
+            if not missing:
+                expected_complete.append(combo.name)
+            elif len(missing) < len(pieces) and len(missing) <= 2:
+                expected_partial.append((combo.name, len(missing)))
+        
+        assert [c.name for c in detector.find_combos_in_deck(deck)] == expected_complete
+        partial = detector.find_partial_combos(deck)
+        assert sorted((p['combo'].name, len(p['missing'])) for p in partial) == sorted(expected_partial)
+        assert [p['completion'] for p in partial] == sorted((p['completion'] for p in partial), reverse=True)
+        high_tide = next(p for p in partial if p['combo'].name == 'Palinchron + High Tide')
+        assert high_tide['present'] == ['Palinchron'] and high_tide['missing'] == ['High Tide']
+    
+    def test_round_trip(self):
+        """Stored combos come back with every field."""
+        detector = ComboDetector(repository=None)
+        
+        assert detector.combos == detector._build_combo_database()
+        assert detector.get_combo_suggestions('heliod, sun-crowned')[0].cards[1] == 'Heliod, Sun-Crowned'
+    
+    def test_search(self):
+        """Search filters by type, colors and text like the in-memory search did."""
+        detector = ComboDetector(repository=None)
+        
+        assert {c.name for c in detector.search_combos(colors={'U', 'B'})} >= {
+            'Palinchron + High Tide', "Thassa's Oracle + Demonic Consultation"
+        }
+        assert all(c.colors <= {'U', 'B'} for c in detector.search_combos(colors={'U', 'B'}))
+        assert [c.name for c in detector.search_combos(query='VOLTAIC', combo_type='win')] == [
+            'Time Vault + Voltaic Key'
+        ]
+        assert detector.search_combos(query='100%') == []
+    
+    def test_load_dataset(self, tmp_path):
+        """Dataset files are imported once into a file store and reused."""
+        path = tmp_path / 'combos.json'
+        path.write_text(json.dumps({'combos': [
+            dataset_combo(1, ['Card A', 'Card B', 'Card C']),
+            {'uses': [{'card': {'name': 'Card D'}}, {'card': {'name': 'Card E'}}],
+             'identity': 'UR', 'produces': [{'name': 'Infinite mana'}]},
+            {'cards': ['Lonely Card']},
+        ]}))
+        
+        assert len(load_combo_file(path)) == 2
+        store = ComboStore(tmp_path / 'combos.sqlite')
+        detector = ComboDetector(repository=None, store=store)
+        builtin = len(store)
+        assert detector.load_dataset(path) == 2
+        assert detector.load_dataset(path) == 0
+        store.close()
+        
+        reopened = ComboDetector(repository=None, store=ComboStore(tmp_path / 'combos.sqlite'))
+        assert len(reopened.store) == builtin + 2
+        spellbook = reopened.get_combo_suggestions('Card E')[0]
+        assert spellbook.name == 'Card D + Card E'
+        assert spellbook.colors == {'U', 'R'} and spellbook.result == 'Infinite mana'
+        assert [p['missing'] for p in reopened.find_partial_combos(['Card A'])] == [['Card B', 'Card C']]
+        reopened.store.close()
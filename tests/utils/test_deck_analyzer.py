@@ -2,11 +2,14 @@
 Comprehensive tests for deck analyzer.
 
 Tests DeckAnalyzer functionality including mana curve analysis, color distribution,
-card type analysis, mana sources, keywords, and comprehensive deck statistics.
+card type analysis, mana sources, keywords, and comprehensive deck statistics,
+plus single-pass statistics over batched lookups and incremental updates.
 """
 
+from types import SimpleNamespace
+
 import pytest
-from app.utils.deck_analyzer import DeckAnalyzer
+from app.utils.deck_analyzer import CardFacts, DeckAnalyzer
 from app.models.deck import Deck, DeckCard
 from app.models.filters import SearchFilters
 from app.data_access.mtg_repository import MTGRepository
@@ -547,3 +550,116 @@ class TestComprehensiveAnalysis:
         if '.' in avg_str:
             decimals = len(avg_str.split('.')[1])
             assert decimals <= 2
+
+
+def fake_card(name, type_line, mana_value=0, colors=None, oracle_text='', types=None):
+    """Card object with the attributes the analyzer reads."""
+    return SimpleNamespace(name=name, type_line=type_line, mana_value=mana_value, colors=colors,
+                           color_identity=colors, oracle_text=oracle_text, types=types)
+
+
+FAKE_CARDS = {
+    'island': fake_card('Island', 'Basic Land — Island', oracle_text='({T}: Add {U}.)', types=['Land']),
+    'mountain': fake_card('Mountain', 'Basic Land — Mountain', oracle_text='({T}: Add {R}.)'),
+    'bolt': fake_card('Lightning Bolt', 'Instant', 1, ['R'], 'Lightning Bolt deals 3 damage to any target.'),
+    'counter': fake_card('Counterspell', 'Instant', 2, ['U'], 'Counter target spell.'),
+    'goblin': fake_card('Goblin Guide', 'Creature — Goblin Scout', 1, ['R'], 'Haste'),
+    'signet': fake_card('Izzet Signet', 'Artifact', 2, None, '{1}, {T}: Add {U}{R}.'),
+    'titan': fake_card('Ulamog', 'Legendary Creature — Eldrazi', 11, None, 'Annihilator 4'),
+}
+
+
+def fake_deck(**quantities):
+    """Deck with the given copies of fake cards."""
+    deck = Deck(id=7, name="Izzet", format="Modern")
+    for uuid, quantity in quantities.items():
+        deck.cards.append(DeckCard(uuid=uuid, card_name=uuid, quantity=quantity))
+    return deck
+
+
+class TestSinglePassStatistics:
+    """Test statistics from one batched fetch and one pass."""
+    
+    def test_statistics(self, fake_repository):
+        """Every statistic comes out of the one pass."""
+        analyzer = DeckAnalyzer(fake_repository(FAKE_CARDS))
+        deck = fake_deck(island=10, mountain=8, bolt=4, counter=4, goblin=4, signet=2, titan=1, missing=3)
+        
+        analysis = analyzer.get_comprehensive_analysis(deck)
+        
+        assert analysis['mana_curve'] == {1: 8, 2: 6, 7: 1}
+        assert analysis['average_cmc'] == round((4 + 8 + 4 + 4 + 11) / 15, 2)
+        assert analysis['color_distribution'] == {'Colorless': 21, 'R': 8, 'U': 4}
+        assert analysis['color_identity'] == ['R', 'U']
+        assert analysis['card_types'] == {'Lands': 18, 'Instants': 8, 'Creatures': 5, 'Artifacts': 2}
+        assert analysis['mana_sources'] == {'lands': 18, 'mana_rocks': 2, 'mana_dorks': 0,
+                                            'total_sources': 20, 'color_sources': {'U': 10, 'R': 8}}
+        assert analysis['keywords'] == {'Haste': 4}
+        assert analysis['tribal_synergies'] == {'Goblin': 4, 'Scout': 4}
+        assert analysis['interaction'] == {'removal': 4, 'counterspells': 4, 'board_wipes': 0,
+                                           'total_interaction': 8}
+        assert analysis['mana_consistency']['lands'] == 18
+    
+    def test_one_batched_fetch(self, fake_repository):
+        """Cards are fetched in one batch once, however many analyses run."""
+        repository = fake_repository(FAKE_CARDS)
+        analyzer = DeckAnalyzer(repository)
+        deck = fake_deck(island=10, bolt=4, counter=4)
+        
+        analyzer.get_comprehensive_analysis(deck)
+        analyzer.analyze_mana_curve(deck)
+        analyzer.analyze_keywords(deck)
+        
+        assert repository.batch_lookups == 1
+        assert repository.lookups == 0
+    
+    def test_single_lookup_fallback(self, fake_repository):
+        """Repositories without batch lookup are asked once per card."""
+        repository = fake_repository(FAKE_CARDS, batch=False)
+        analyzer = DeckAnalyzer(repository)
+        
+        assert analyzer.analyze_card_types(fake_deck(island=10, bolt=4)) == {'Lands': 10, 'Instants': 4}
+        analyzer.analyze_card_types(fake_deck(island=10, bolt=4))
+        assert repository.lookups == 2
+    
+    def test_card_facts(self):
+        """Facts follow the type line, text and mana value rules."""
+        facts = CardFacts.from_card(FAKE_CARDS['signet'])
+        
+        assert facts.curve_bucket == 2 and facts.spell_mana_value == 2
+        assert facts.mana_source == 'mana_rocks' and facts.land_colors == ()
+        assert CardFacts.from_card(FAKE_CARDS['island']).curve_bucket is None
+
+
+class TestIncrementalStatistics:
+    """Test updating statistics card by card."""
+    
+    def test_add_and_remove_match_rebuild(self, fake_repository):
+        """Adding and removing cards gives the statistics of the edited deck."""
+        analyzer = DeckAnalyzer(fake_repository(FAKE_CARDS))
+        statistics = analyzer.build_statistics(fake_deck(island=10, bolt=4, goblin=2))
+        
+        analyzer.add_card(statistics, 'titan')
+        analyzer.add_card(statistics, 'goblin', 2)
+        analyzer.remove_card(statistics, 'bolt', 4)
+        expected = analyzer.build_statistics(fake_deck(island=10, goblin=4, titan=1))
+        
+        assert statistics.quantities == expected.quantities
+        assert statistics.mana_curve() == expected.mana_curve() == {1: 4, 7: 1}
+        assert statistics.color_distribution() == expected.color_distribution()
+        assert statistics.interaction_density() == expected.interaction_density()
+        assert statistics.tribal_synergies() == expected.tribal_synergies() == {'Goblin': 4, 'Scout': 4}
+        assert statistics.color_identity_list() == ['R']
+    
+    def test_comprehensive_analysis_follows_edits(self, fake_repository):
+        """Re-analyzing an edited deck applies only the changed cards."""
+        analyzer = DeckAnalyzer(fake_repository(FAKE_CARDS))
+        deck = fake_deck(island=10, bolt=4)
+        analyzer.get_comprehensive_analysis(deck)
+        
+        deck.cards.append(DeckCard(uuid='counter', card_name='counter', quantity=2))
+        deck.cards[1].quantity = 3
+        analysis = analyzer.get_comprehensive_analysis(deck)
+        
+        assert analysis == DeckAnalyzer(fake_repository(FAKE_CARDS)).get_comprehensive_analysis(deck)
+        assert analysis['interaction']['total_interaction'] == 5
@@ -0,0 +1,184 @@
+"""
+Tests for exact deck consistency probabilities.
+
+Tests every probability against brute-force enumeration of all hands from a
+small deck, known values for a 60-card deck, agreement with the sampled
+hand simulator, memoization by composition, and the DeckAnalyzer entry point.
+"""
+
+from itertools import combinations
+
+import pytest
+from app.models.deck import Deck, DeckCard
+from app.utils.deck_analyzer import DeckAnalyzer
+from app.utils.deck_probability import (
+    DeckComposition, _consistency_report, cards_seen, color_source_probability,
+    consistency_report, land_distribution, land_drop_probability, mulligan_keep_rates,
+    on_curve_probability
+)
+from app.utils.hand_simulator import EARLY_MANA_VALUE, MAX_EARLY_PLAYS, HandSimulator, ResolvedDeck
+
+
+CARDS = {
+    'mountain': {'name': 'Mountain', 'type_line': 'Basic Land — Mountain',
+                 'oracle_text': '({T}: Add {R}.)', 'mana_value': 0},
+    'island': {'name': 'Island', 'type_line': 'Basic Land — Island',
+               'oracle_text': '({T}: Add {U}.)', 'mana_value': 0},
+    'volcanic': {'name': 'Volcanic Island', 'type_line': 'Land — Island Mountain',
+                 'oracle_text': '({T}: Add {U} or {R}.)', 'mana_value': 0},
+    'bolt': {'name': 'Lightning Bolt', 'type_line': 'Instant', 'oracle_text': '', 'mana_value': 1},
+    'bear': {'name': 'Grizzly Bears', 'type_line': 'Creature — Bear', 'oracle_text': '',
+             'mana_value': 2},
+    'giant': {'name': 'Hill Giant', 'type_line': 'Creature — Giant', 'oracle_text': '',
+              'mana_value': 4},
+}
+SMALL_DECK = [('mountain', 2), ('island', 1), ('volcanic', 1), ('bolt', 2), ('bear', 1),
+              ('giant', 2), ('missing', 1)]
+DECK = [('mountain', 12), ('island', 8), ('volcanic', 4), ('bolt', 12), ('bear', 12),
+        ('giant', 12)]
+
+
+@pytest.fixture
+def simulator(fake_repository):
+    """Hand simulator over the fake repository."""
+    return HandSimulator(fake_repository(CARDS))
+
+
+def brute_force(deck: ResolvedDeck, cards: int, event) -> float:
+    """Fraction of all `cards`-card draws (as sets of deck positions) satisfying event."""
+    draws = list(combinations(range(len(deck)), min(cards, len(deck))))
+    return sum(1 for draw in draws if event(draw)) / len(draws)
+
+
+class TestDeckComposition:
+    """Test reducing a deck to category counts."""
+    
+    def test_counts(self, simulator):
+        """Lands are grouped by colors, spells by mana value, missing cards kept apart."""
+        composition = DeckComposition.from_resolved(simulator.resolve_deck(SMALL_DECK))
+        
+        assert composition.deck_size == 10
+        assert composition.land_colors == ((2, 1), (8, 2), (10, 1))
+        assert composition.spells_by_cost == ((1, 2), (2, 1), (4, 2))
+        assert (composition.lands, composition.spells, composition.unknown) == (4, 5, 1)
+        assert composition.color_sources(1 << 1) == 2
+        assert hash(composition) == hash(DeckComposition.from_resolved(simulator.resolve_deck(SMALL_DECK)))
+
+
+class TestAgainstEnumeration:
+    """Compare exact results with every possible draw from a small deck."""
+    
+    @pytest.fixture
+    def deck(self, simulator):
+        return simulator.resolve_deck(SMALL_DECK)
+    
+    @pytest.fixture
+    def composition(self, deck):
+        return DeckComposition.from_resolved(deck)
+    
+    def test_land_distribution(self, deck, composition):
+        """The opening land distribution matches counting every hand."""
+        distribution = land_distribution(composition)
+        
+        assert sum(distribution.values()) == pytest.approx(1)
+        for lands, p in distribution.items():
+            assert p == pytest.approx(brute_force(
+                deck, 7, lambda draw: sum(deck.is_land[i] for i in draw) == lands))
+    
+    @pytest.mark.parametrize("on_play", [True, False])
+    def test_turn_probabilities(self, deck, composition, on_play):
+        """Land drops, color sources and on-curve plays match counting every draw."""
+        for turn in (1, 2):
+            seen = cards_seen(turn, on_play)
+            lands = lambda draw: sum(deck.is_land[i] for i in draw)
+            colors = lambda draw, bits: all(
+                any(deck.land_colors[i] & bit for i in draw) for bit in bits)
+            
+            assert land_drop_probability(composition, turn, on_play) == pytest.approx(
+                brute_force(deck, seen, lambda draw: lands(draw) >= turn))
+            assert color_source_probability(composition, 'U', turn, on_play) == pytest.approx(
+                brute_force(deck, seen, lambda draw: colors(draw, [1 << 1])))
+            assert color_source_probability(composition, 'UR', turn, on_play) == pytest.approx(
+                brute_force(deck, seen, lambda draw: colors(draw, [1 << 1, 1 << 3])))
+            assert on_curve_probability(composition, turn, on_play) == pytest.approx(
+                brute_force(deck, seen, lambda draw: lands(draw) >= turn and any(
+                    deck.found[i] and not deck.is_land[i] and deck.mana_value[i] == turn
+                    for i in draw)))
+    
+    def test_london_mulligan(self, simulator, deck, composition):
+        """Keep rates match trying every card to bottom in every hand."""
+        keep_rule = simulator.keep_rule()
+        
+        def keepable(draw, bottom):
+            for kept in combinations(draw, len(draw) - bottom):
+                lands = sum(deck.is_land[i] for i in kept)
+                size = sum(deck.found[i] for i in kept)
+                early = sum(1 for i in kept if deck.found[i] and not deck.is_land[i]
+                            and deck.mana_value[i] <= EARLY_MANA_VALUE)
+                if (size, lands, min(early, MAX_EARLY_PLAYS)) in keep_rule:
+                    return True
+            return False
+        
+        result = mulligan_keep_rates(composition, keep_rule)
+        
+        for bottom in range(3):
+            assert result['keep_rates'][7 - bottom] == pytest.approx(
+                brute_force(deck, 7, lambda draw: keepable(draw, bottom)))
+        assert sum(result['kept_at'].values()) == pytest.approx(1)
+
+
+class TestSixtyCardDeck:
+    """Test a 24-land, 60-card deck."""
+    
+    def test_known_values(self, simulator):
+        """Opening land counts follow the hypergeometric distribution."""
+        composition = DeckComposition.from_resolved(simulator.resolve_deck(DECK))
+        distribution = land_distribution(composition)
+        
+        # C(24,3) * C(36,4) / C(60,7)
+        assert distribution[3] == pytest.approx(0.30870, abs=1e-5)
+        assert sum(distribution[lands] for lands in (2, 3, 4)) == pytest.approx(0.77457, abs=1e-5)
+        # 7 cards on the play by turn 1, 8 on the draw
+        assert land_drop_probability(composition, 1, True) == pytest.approx(1 - distribution[0])
+        assert land_drop_probability(composition, 1, False) > land_drop_probability(composition, 1)
+    
+    def test_agrees_with_simulation(self, simulator):
+        """Exact figures sit within sampling error of the hand simulator."""
+        exact = simulator.exact_probabilities(DECK)
+        sampled = simulator.run_simulation(DECK, num_trials=100_000, seed=1)
+        
+        assert exact['keep_rate'] == pytest.approx(sampled['keepable_rate'], abs=0.7)
+        for color, by_turn in exact['color_sources'].items():
+            assert by_turn[0] == pytest.approx(sampled['color_availability'][color], abs=0.7)
+        for lands, percent in exact['opening_lands'].items():
+            assert percent == pytest.approx(
+                sampled['land_distribution'].get(lands, 0) / 1000, abs=0.7)
+    
+    def test_report_is_memoized_by_composition(self, simulator):
+        """The same composition is computed once; callers get their own copies."""
+        _consistency_report.cache_clear()
+        composition = DeckComposition.from_resolved(simulator.resolve_deck(DECK))
+        reordered = DeckComposition.from_resolved(simulator.resolve_deck(DECK[::-1]))
+        
+        first = consistency_report(composition, simulator.keep_rule())
+        first['lands'] = None
+        second = consistency_report(reordered, simulator.keep_rule())
+        
+        assert _consistency_report.cache_info().hits == 1
+        assert second['lands'] == 24
+        assert [drop['turn'] for drop in second['land_drops']] == [1, 2, 3, 4]
+        assert set(second['color_sources']) == {'U', 'R'}
+
+
+class TestDeckAnalyzer:
+    """Test the DeckAnalyzer entry point."""
+    
+    def test_analyze_mana_consistency(self, simulator, fake_repository):
+        """Deck models give the same report as the simulator's deck lists."""
+        deck = Deck(id=1, name="Test", format="Modern")
+        for uuid, quantity in DECK:
+            deck.cards.append(DeckCard(uuid=uuid, card_name=CARDS[uuid]['name'], quantity=quantity))
+        analyzer = DeckAnalyzer(fake_repository(CARDS))
+        
+        assert analyzer.analyze_mana_consistency(deck) == simulator.exact_probabilities(DECK)
+        assert analyzer.analyze_mana_consistency(Deck(id=2, name="Empty", format="Modern"))['lands'] == 0
@@ -305,3 +305,22 @@ class TestMultipleFormats:
         # Both should validate structure (may have legality warnings)
         assert isinstance(legacy_errors, list)
         assert isinstance(modern_errors, list)
+
+
+class TestCardLegality:
+    """Test card legality from a legality index."""
+    
+    def test_banned_card_reported(self, make_card_index):
+        """With an index, banned cards are validation errors."""
+        from app.utils.legality_checker import LegalityIndex
+        db_path = make_card_index(
+            {'forest': {'name': 'Forest'}, 'ponder': {'name': 'Ponder'}},
+            legalities=[('forest', 'modern', 'Legal'), ('ponder', 'modern', 'Banned')]
+        )
+        validator = DeckValidator(legality_index=LegalityIndex(db_path))
+        
+        messages = validator.validate_deck({"Forest": 56, "Ponder": 4}, {}, "Modern")
+        
+        errors = [m for m in messages if m.severity == ValidationSeverity.ERROR]
+        assert [m.card_name for m in errors] == ["Ponder"]
+        assert "banned" in errors[0].message
@@ -0,0 +1,170 @@
+"""
+Tests for hand simulator.
+
+Tests resolving a deck once, the batched opening-hand statistics against
+analyze_hand, goldfish games played in batches against the one-game
+version, and splitting trials across workers.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from app.utils.hand_simulator import (
+    HandSimulator, ResolvedDeck, _goldfish_batch, _goldfish_totals, _play_goldfish
+)
+
+
+CARDS = {
+    'mountain': {'name': 'Mountain', 'type_line': 'Basic Land — Mountain',
+                 'oracle_text': '({T}: Add {R}.)', 'mana_value': 0},
+    'island': {'name': 'Island', 'type_line': 'Basic Land — Island',
+               'oracle_text': '({T}: Add {U}.)', 'mana_value': 0},
+    'bolt': {'name': 'Lightning Bolt', 'type_line': 'Instant', 'oracle_text': '', 'mana_value': 1},
+    'bear': {'name': 'Grizzly Bears', 'type_line': 'Creature — Bear', 'oracle_text': '',
+             'mana_value': 2},
+    'giant': {'name': 'Hill Giant', 'type_line': 'Creature — Giant', 'oracle_text': '',
+              'mana_value': 4},
+    'ornithopter': {'name': 'Ornithopter', 'type_line': 'Artifact Creature', 'oracle_text': '',
+                    'mana_value': 0},
+}
+DECK = [('mountain', 14), ('island', 10), ('bolt', 12), ('bear', 12), ('giant', 10),
+        ('ornithopter', 2)]
+
+
+@pytest.fixture
+def simulator(fake_repository):
+    """Hand simulator over the fake repository."""
+    return HandSimulator(fake_repository(CARDS))
+
+
+def reference_hand_stats(simulator, deck_cards, trials, seed):
+    """Opening-hand statistics computed hand by hand with analyze_hand."""
+    random.seed(seed)
+    lands, mulligans = [], 0
+    for _ in range(trials):
+        analysis = simulator.analyze_hand(simulator.simulate_opening_hand(deck_cards))
+        lands.append(analysis['lands'])
+        mulligans += 'Mulligan' in analysis['recommendation']
+    return sum(lands) / trials, mulligans / trials * 100
+
+
+def add_goldfish_game(totals, game):
+    """Add one game from _play_goldfish to goldfish totals."""
+    curved_out = True
+    for index, turn in enumerate(game['turn_by_turn']):
+        totals['lands_in_play'][index] += turn['lands_in_play']
+        totals['land_drops'][index] += turn['land_drop']
+        totals['spells_cast'][index] += turn['spells_cast_this_turn']
+        totals['mana_spent'][index] += turn['mana_spent']
+        totals['cards_in_hand'][index] += turn['cards_in_hand']
+        curved_out = curved_out and turn['land_drop'] and turn['mana_spent'] >= turn['lands_in_play']
+    totals['curve_outs'] += curved_out
+
+
+class TestResolvedDeck:
+    """Test resolving the deck into per-card arrays."""
+    
+    def test_resolves_each_card_once(self, simulator):
+        """Every uuid is looked up once, whatever its quantity."""
+        deck = simulator.resolve_deck(DECK + [('missing', 3)])
+        
+        assert simulator.repository.lookups == len(DECK) + 1
+        assert len(deck) == 63
+        assert sum(deck.is_land) == 24
+        assert deck.land_colors[0] == 1 << 3 and deck.land_colors[14] == 1 << 1
+        assert deck.found.count(False) == 3
+    
+    def test_card_objects(self):
+        """Card objects from the real repository are read by attribute."""
+        class CardObject:
+            name, type_line, oracle_text, mana_value = 'Forest', 'Basic Land', '{T}: Add {G}.', None
+        
+        deck = ResolvedDeck()
+        deck.add(CardObject(), 2)
+        
+        assert deck.is_land == [True, True]
+        assert deck.mana_value == [0.0, 0.0]
+        assert deck.land_colors == [1 << 4] * 2
+
+
+class TestRunSimulation:
+    """Test opening-hand statistics."""
+    
+    def test_matches_hand_by_hand_analysis(self, simulator):
+        """Batched statistics agree with analyze_hand within sampling error."""
+        result = simulator.run_simulation(DECK, num_trials=100_000, seed=1)
+        avg_lands, mulligan_rate = reference_hand_stats(simulator, DECK, 3000, seed=1)
+        
+        assert result['trials'] == 100_000
+        assert sum(result['land_distribution'].values()) == 100_000
+        assert sum(result['quality_distribution'].values()) == 100_000
+        # 24 of 60 cards are lands: 2.8 expected per 7-card hand
+        assert result['avg_lands_in_hand'] == pytest.approx(2.8, abs=0.02)
+        assert result['avg_lands_in_hand'] == pytest.approx(avg_lands, abs=0.1)
+        assert result['mulligan_rate'] == pytest.approx(mulligan_rate, abs=2.5)
+        assert result['keepable_rate'] + result['mulligan_rate'] == pytest.approx(100)
+        assert set(result['color_availability']) == {'W', 'U', 'B', 'R', 'G'}
+        assert result['color_availability']['W'] == 0
+    
+    def test_seed_is_reproducible(self, simulator):
+        """The same seed gives the same statistics."""
+        assert (simulator.run_simulation(DECK, num_trials=5000, seed=3)
+                == simulator.run_simulation(DECK, num_trials=5000, seed=3))
+    
+    def test_all_lands_is_unkeepable(self, simulator):
+        """A deck of only lands never keeps."""
+        result = simulator.run_simulation([('mountain', 40)], num_trials=1000, seed=2)
+        
+        assert result['quality_distribution'] == {'unkeepable': 1000}
+        assert result['mulligan_rate'] == 100.0
+        assert result['land_distribution'] == {7: 1000}
+
+
+class TestGoldfish:
+    """Test goldfish games."""
+    
+    def test_batch_matches_single_games(self, simulator):
+        """Playing deck orders in a batch gives exactly the one-game results."""
+        deck = simulator.resolve_deck(DECK + [('missing', 2)])
+        rng = np.random.default_rng(5)
+        orders = np.array([rng.permutation(len(deck))[:13] for _ in range(300)])
+        
+        expected = _goldfish_totals(7)
+        for order in orders:
+            add_goldfish_game(expected, _play_goldfish(deck, order.tolist(), 7))
+        
+        assert _goldfish_batch(deck, orders, 7) == expected
+    
+    def test_goldfish_test_single_game(self, simulator):
+        """One game lists the cards played by turn."""
+        random.seed(6)
+        result = simulator.goldfish_test(DECK, turns=4)
+        
+        assert result['turns_simulated'] == 4
+        assert len(result['turn_by_turn']) == 4
+        assert result['lands_played'] == result['turn_by_turn'][-1]['lands_in_play']
+        assert all(name in {card['name'] for card in CARDS.values()}
+                   for _, name in result['cards_played'])
+    
+    def test_goldfish_simulation(self, simulator):
+        """Curve-out statistics are per-turn averages over every game."""
+        result = simulator.goldfish_simulation(DECK, turns=4, num_trials=20_000, seed=7)
+        
+        turns = result['turn_by_turn']
+        assert [turn['turn'] for turn in turns] == [1, 2, 3, 4]
+        assert turns[0]['avg_lands_in_play'] == pytest.approx(turns[0]['land_drop_rate'] / 100, abs=0.01)
+        assert all(a['avg_lands_in_play'] <= b['avg_lands_in_play'] for a, b in zip(turns, turns[1:]))
+        assert 0 < result['curve_out_rate'] < 100
+        assert 0 < result['mana_efficiency'] <= 100
+
+
+class TestWorkers:
+    """Test splitting trials across processes."""
+    
+    def test_workers_add_up(self, simulator):
+        """Worker shares sum to the requested trials."""
+        result = simulator.run_simulation(DECK, num_trials=10_001, workers=2, seed=9)
+        
+        assert sum(result['land_distribution'].values()) == 10_001
+        assert result['avg_lands_in_hand'] == pytest.approx(2.8, abs=0.05)
@@ -2,12 +2,17 @@
 Comprehensive tests for deck legality checker.
 
 Tests DeckLegalityChecker functionality including format validation,
-banned/restricted cards, deck size requirements, and format-specific rules.
+banned/restricted cards, deck size requirements, and format-specific rules,
+and legality read from the card index's card_legalities table.
 """
 
+import sqlite3
+
 import pytest
+from app.models.deck import Deck, DeckCard
 from app.utils.legality_checker import (
-    MTGFormat, LegalityViolation, LegalityResult, DeckLegalityChecker
+    MTGFormat, LegalityViolation, LegalityResult, DeckLegalityChecker, LegalityIndex,
+    format_from_name
 )
 
 
@@ -596,3 +601,152 @@ class TestComplexDecks:
         # Should be legal
         assert result.is_legal
         assert len(result.violations) == 0
+
+
+# (name, {format: status}) rows of the test card index
+INDEX_CARDS = [
+    ('Forest', {'modern': 'Legal', 'vintage': 'Legal', 'commander': 'Legal', 'duel': 'Legal'}),
+    ('Island', {'modern': 'Legal', 'vintage': 'Legal', 'commander': 'Legal', 'duel': 'Legal'}),
+    ('Lightning Bolt', {'modern': 'Legal', 'vintage': 'Legal', 'commander': 'Legal', 'duel': 'Legal'}),
+    ('Ponder', {'modern': 'Banned', 'vintage': 'Restricted', 'commander': 'Legal', 'duel': 'Legal'}),
+    ('Sol Ring', {'vintage': 'Restricted', 'commander': 'Legal', 'duel': 'Banned'}),
+    ('Ghalta, Primal Hunger', {'modern': 'Legal', 'vintage': 'Legal', 'commander': 'Legal',
+                               'duel': 'Legal'}),
+]
+
+
+def index_rows(cards=INDEX_CARDS):
+    """Card and legality rows for make_card_index, with two printings of every card."""
+    rows, legalities = {}, []
+    for i, (name, statuses) in enumerate(cards):
+        for printing in (f"{i}a", f"{i}b"):
+            rows[printing] = {'name': name}
+            legalities += [(printing, fmt, status) for fmt, status in statuses.items()]
+    return rows, legalities
+
+
+@pytest.fixture
+def index(make_card_index):
+    """Legality index over the test card index."""
+    cards, legalities = index_rows()
+    return LegalityIndex(make_card_index(cards, legalities=legalities))
+
+
+def modern_deck(*cards):
+    """A 60-card deck of Forests plus the given (name, quantity) cards."""
+    return {'mainboard': [{'name': 'Forest', 'quantity': 60}] +
+                         [{'name': name, 'quantity': quantity} for name, quantity in cards],
+            'sideboard': []}
+
+
+class TestLegalityIndex:
+    """Test legality read from the card index."""
+    
+    def test_format_bitmaps(self, index):
+        """Statuses become per-format bitmaps over card names."""
+        vintage = index.format_legality(MTGFormat.VINTAGE)
+        
+        assert index.card_names(vintage.restricted) == ['Ponder', 'Sol Ring']
+        assert vintage.banned == 0
+        assert index.card_names(index.format_legality(MTGFormat.COMMANDER_1V1).banned) == ['Sol Ring']
+        assert index.format_legality(MTGFormat.PAUPER) is None
+    
+    def test_card_bits(self, index):
+        """Names are looked up at once; names not in the index are returned."""
+        bits, unknown = index.card_bits(['Ponder', 'Forest', 'Nonexistent Card'])
+        
+        assert index.card_names(bits) == ['Forest', 'Ponder']
+        assert unknown == ['Nonexistent Card']
+    
+    def test_format_from_name(self):
+        """Display names, format values and card_legalities keys are recognized."""
+        assert format_from_name('Commander') == MTGFormat.COMMANDER
+        assert format_from_name('duel') == MTGFormat.COMMANDER_1V1
+        assert format_from_name('Penny Dreadful') == MTGFormat.PENNY_DREADFUL
+        assert format_from_name('Unknown') is None
+
+
+class TestIndexedLegality:
+    """Test checking decks against the index."""
+    
+    def test_banned_restricted_and_not_legal(self, index):
+        """Banned, restricted and not legal cards come from card_legalities."""
+        checker = DeckLegalityChecker(index)
+        
+        modern = checker.check_deck(modern_deck(('Ponder', 1), ('Sol Ring', 1)), MTGFormat.MODERN)
+        vintage = checker.check_deck(modern_deck(('Ponder', 2), ('Sol Ring', 1)), MTGFormat.VINTAGE)
+        
+        assert [(v.violation_type, v.card_name) for v in modern.violations] == [
+            ('banned', 'Ponder'), ('not_legal', 'Sol Ring')
+        ]
+        assert [(v.violation_type, v.card_name) for v in vintage.violations] == [('restricted', 'Ponder')]
+    
+    def test_index_replaces_builtin_lists(self, index):
+        """A card the built-in list bans is legal if the index says so."""
+        result = DeckLegalityChecker(index).check_deck(modern_deck(('Lightning Bolt', 4)), MTGFormat.MODERN)
+        
+        assert result.is_legal
+        assert 'Lightning Bolt' not in DeckLegalityChecker.BANNED_CARDS[MTGFormat.MODERN]
+        assert DeckLegalityChecker(index).get_format_info(MTGFormat.MODERN)['banned_count'] == 1
+    
+    def test_unknown_cards_and_missing_formats(self, index):
+        """Unknown cards are reported as info; formats without rows use the built-in lists."""
+        checker = DeckLegalityChecker(index)
+        
+        modern = checker.check_deck(modern_deck(('Homemade Card', 1)), MTGFormat.MODERN)
+        legacy = checker.check_deck(modern_deck(('Sol Ring', 1)), MTGFormat.LEGACY)
+        
+        assert modern.is_legal
+        assert any('Homemade Card' in line for line in modern.info)
+        assert [v.violation_type for v in legacy.violations] == ['banned']
+    
+    def test_reload_after_ban_update(self, index, tmp_path):
+        """Reloading picks up changed legality rows."""
+        checker = DeckLegalityChecker(index)
+        deck = modern_deck(('Lightning Bolt', 4))
+        assert checker.check_deck(deck, MTGFormat.MODERN).is_legal
+        
+        connection = sqlite3.connect(index.db_path)
+        connection.execute("UPDATE card_legalities SET status = 'Banned' "
+                           "WHERE format = 'modern' AND uuid IN ('2a', '2b')")
+        connection.commit()
+        connection.close()
+        index.reload()
+        
+        assert not checker.check_deck(deck, MTGFormat.MODERN).is_legal
+
+
+class TestAllFormats:
+    """Test checking decks against every format."""
+    
+    def test_check_all_formats(self, index):
+        """A saved deck counts its commander among its 100 cards."""
+        deck = Deck(id=1, cards=[DeckCard('0a', 'Forest', 98), DeckCard('4a', 'Sol Ring', 1),
+                                 DeckCard('5a', 'Ghalta, Primal Hunger', 1, is_commander=True)])
+        
+        legality = DeckLegalityChecker(index).check_all_formats(deck)
+        
+        assert legality['Commander'] is True
+        assert legality['Commander 1v1'] is False
+        assert legality['Modern'] is False
+        assert len(legality) == len(MTGFormat)
+    
+    def test_check_decks_matches_single_checks(self, index):
+        """Checking every deck in one pass gives the per-deck, per-format results."""
+        checker = DeckLegalityChecker(index)
+        decks = [
+            Deck(id=1, cards=[DeckCard('0a', 'Forest', 56), DeckCard('3a', 'Ponder', 4)]),
+            Deck(id=2, cards=[DeckCard('1a', 'Island', 59), DeckCard('4a', 'Sol Ring', 1)]),
+        ]
+        
+        results = checker.check_decks(decks)
+        
+        for deck in decks:
+            deck_data = {'mainboard': [{'name': card.card_name, 'quantity': card.quantity}
+                                       for card in deck.cards], 'sideboard': []}
+            for deck_format in MTGFormat:
+                expected = checker.check_deck(deck_data, deck_format)
+                assert [str(v) for v in results[deck.id][deck_format].violations] == \
+                    [str(v) for v in expected.violations]
+        assert results[1][MTGFormat.VINTAGE].violations[0].violation_type == 'restricted'
+        assert results[2][MTGFormat.VINTAGE].is_legal
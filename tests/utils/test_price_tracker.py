@@ -2,7 +2,8 @@
 Comprehensive tests for price tracking system.
 
 Tests PriceTracker, BudgetAnalyzer, and PriceAlert functionality including
-price caching, deck value calculation, budget analysis, and price alerts.
+price caching, deck value calculation, budget analysis, and price alerts,
+and the SQLite price store with MTGJSON price ingestion.
 """
 
 import pytest
@@ -10,7 +11,7 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from app.utils.price_tracker import (
-    PriceSource, CardPrice, PriceTracker, BudgetAnalyzer, PriceAlert
+    PriceSource, CardPrice, PriceStore, PriceTracker, BudgetAnalyzer, PriceAlert
 )
 
 
@@ -525,3 +526,156 @@ class TestPriceAlert:
         assert "Island" in card_names
         assert "Black Lotus" in card_names
         assert "Lightning Bolt" not in card_names
+
+
+# Card index rows: two printings of Lightning Bolt and one of Island
+INDEX_CARDS = {
+    'bolt-m10': {'name': 'Lightning Bolt', 'set_code': 'M10'},
+    'bolt-2xm': {'name': 'Lightning Bolt', 'set_code': '2XM'},
+    'island': {'name': 'Island', 'set_code': 'M21'},
+}
+
+
+class CountingStore(PriceStore):
+    """Price store counting batched lookups and writes."""
+    
+    lookups = 0
+    writes = 0
+    
+    def get_prices(self, keys):
+        self.lookups += 1
+        return super().get_prices(keys)
+    
+    def record(self, prices):
+        self.writes += 1
+        super().record(prices)
+
+
+class TestPriceStore:
+    """Test the SQLite price store."""
+    
+    def test_deck_value_is_one_lookup_and_one_write(self, tmp_path):
+        """A deck is priced with one lookup and its fetched prices saved in one transaction."""
+        tracker = PriceTracker(data_dir=tmp_path)
+        tracker.store = tracker.price_cache.store = CountingStore(tmp_path / 'counting.sqlite')
+        deck_data = {
+            'mainboard': [{'name': f'Card {i}', 'set_code': 'TST', 'quantity': 1} for i in range(100)],
+            'sideboard': [{'name': 'Card 0', 'set_code': 'TST', 'quantity': 2}]
+        }
+        
+        value = tracker.get_deck_value(deck_data)
+        
+        assert (tracker.store.lookups, tracker.store.writes) == (1, 1)
+        assert len(tracker.store) == 100
+        assert value['sideboard_value'] == round(2 * tracker.get_card_price('Card 0', 'TST').price_usd, 2)
+        assert not (tmp_path / 'price_cache.json').exists()
+    
+    def test_history_is_appended(self, tmp_path):
+        """Refreshing a price appends to its history and survives a restart."""
+        tracker = PriceTracker(data_dir=tmp_path)
+        tracker.get_card_price('Shock', 'M21')
+        tracker.get_card_price('Shock', 'M21', force_refresh=True)
+        
+        history = PriceTracker(data_dir=tmp_path).get_price_history('Shock', 'M21')
+        
+        assert len(history) == 2
+        assert history[0]['date'] < history[1]['date']
+    
+    def test_imports_json_files(self, tmp_path):
+        """Prices saved as JSON by earlier versions are moved into the store."""
+        price = CardPrice(card_name='Opt', set_code='XLN', price_usd=0.25)
+        (tmp_path / 'price_cache.json').write_text(json.dumps({'opt|xln': price.to_dict()}))
+        (tmp_path / 'price_history.json').write_text(json.dumps(
+            {'opt|xln': [{'date': '2024-01-01', 'price': 0.2, 'price_foil': None}]}
+        ))
+        
+        tracker = PriceTracker(data_dir=tmp_path)
+        
+        assert tracker.price_cache['opt|xln'].price_usd == 0.25
+        assert [entry['price'] for entry in tracker.get_price_history('Opt', 'XLN')] == [0.2, 0.25]
+        assert not (tmp_path / 'price_cache.json').exists()
+    
+    def test_ingest_mtgjson_prices(self, tmp_path, make_card_index):
+        """Both cardPrices.csv layouts are streamed in; ingesting twice changes nothing."""
+        make_card_index(INDEX_CARDS)
+        (tmp_path / 'long.csv').write_text(
+            "uuid,gameAvailability,priceProvider,providerListing,cardFinish,date,currency,price\n"
+            "bolt-m10,paper,tcgplayer,retail,normal,2024-05-01,USD,2.00\n"
+            "bolt-m10,paper,tcgplayer,retail,foil,2024-05-01,USD,9.00\n"
+            "bolt-m10,paper,tcgplayer,retail,normal,2024-05-02,USD,2.50\n"
+            "bolt-m10,paper,tcgplayer,buylist,normal,2024-05-02,USD,1.00\n"
+            "bolt-m10,mtgo,cardhoarder,retail,normal,2024-05-02,USD,0.05\n"
+            "bolt-2xm,paper,tcgplayer,retail,normal,2024-05-02,USD,1.50\n"
+            "unknown,paper,tcgplayer,retail,normal,2024-05-02,USD,3.00\n"
+        )
+        (tmp_path / 'wide.csv').write_text(
+            "uuid,priceProvider,date,retail,retailFoil\n"
+            "island,tcgplayer,2024-05-02,0.10,0.50\n"
+        )
+        store = PriceStore(tmp_path / 'prices.sqlite')
+        
+        assert store.ingest_mtgjson_prices(tmp_path / 'long.csv', tmp_path / 'index.sqlite') == 4
+        store.ingest_mtgjson_prices(tmp_path / 'long.csv', tmp_path / 'index.sqlite')
+        store.ingest_mtgjson_prices(tmp_path / 'wide.csv', tmp_path / 'index.sqlite')
+        
+        assert store.history('lightning bolt|m10') == [
+            {'date': '2024-05-01', 'price': 2.0, 'price_foil': 9.0},
+            {'date': '2024-05-02', 'price': 2.5, 'price_foil': None},
+        ]
+        prices = store.get_prices(['lightning bolt|m10', 'lightning bolt|', 'island|m21'])
+        assert prices['lightning bolt|m10'].price_usd == 2.5
+        assert prices['lightning bolt|'].set_code == '2XM'  # Cheapest printing
+        assert prices['island|m21'].price_usd_foil == 0.5
+        store.close()
+    
+    def test_ingest_keeps_cheapest_printing_and_newer_prices(self, tmp_path, make_card_index):
+        """Printings sharing a name and set keep the cheapest price; newer current prices stay."""
+        make_card_index({**INDEX_CARDS, 'bolt-2xm-showcase': {'name': 'Lightning Bolt', 'set_code': '2XM'}})
+        (tmp_path / 'prices.csv').write_text(
+            "uuid,gameAvailability,priceProvider,providerListing,cardFinish,date,currency,price\n"
+            "bolt-2xm,paper,tcgplayer,retail,normal,2024-05-02,USD,1.00\n"
+            "bolt-2xm-showcase,paper,tcgplayer,retail,normal,2024-05-02,USD,50.00\n"
+            "island,paper,tcgplayer,retail,normal,2024-05-02,USD,0.10\n"
+        )
+        store = PriceStore(tmp_path / 'prices.sqlite')
+        store.record({'island|m21': CardPrice('Island', 'M21', 0.25, last_updated='2024-06-01T12:00:00')})
+    
+        store.ingest_mtgjson_prices(tmp_path / 'prices.csv', tmp_path / 'index.sqlite')
+    
+        assert store.get_price('lightning bolt|2xm').price_usd == 1.0
+        assert store.history('lightning bolt|2xm') == [{'date': '2024-05-02', 'price': 1.0, 'price_foil': None}]
+        assert store.get_price('island|m21').price_usd == 0.25
+        assert [entry['price'] for entry in store.history('island|m21')] == [0.1, 0.25]
+        store.close()
+    
+    def test_ingested_prices_are_not_refetched(self, tmp_path, make_card_index):
+        """Prices from an older price file are used as they are, not replaced by fetched ones."""
+        make_card_index(INDEX_CARDS)
+        (tmp_path / 'prices.csv').write_text(
+            "uuid,priceProvider,date,retail,retailFoil\n"
+            "bolt-m10,tcgplayer,2024-05-02,1.23,\n"
+        )
+        tracker = PriceTracker(data_dir=tmp_path)
+        tracker.store.ingest_mtgjson_prices(tmp_path / 'prices.csv', tmp_path / 'index.sqlite')
+        
+        value = tracker.get_deck_value({'mainboard': [{'name': 'Lightning Bolt', 'set_code': 'M10', 'quantity': 4}]})
+        
+        assert value['mainboard_value'] == 4.92
+        price = tracker.get_card_price('Lightning Bolt', 'M10')
+        assert (price.price_usd, price.source) == (1.23, 'tcgplayer')
+        assert tracker.get_price_history('Lightning Bolt', 'M10') == [
+            {'date': '2024-05-02', 'price': 1.23, 'price_foil': None}
+        ]
+    
+    def test_check_alerts_is_one_lookup(self, tmp_path):
+        """Every pending alert's price comes from one lookup."""
+        tracker = PriceTracker(data_dir=tmp_path)
+        tracker.store = tracker.price_cache.store = CountingStore(tmp_path / 'counting.sqlite')
+        alert_system = PriceAlert(data_dir=tmp_path)
+        for name in ('Island', 'Black Lotus', 'Lightning Bolt'):
+            alert_system.add_alert(name, target_price=50.00, condition='below')
+        
+        triggered = alert_system.check_alerts(tracker)
+        
+        assert tracker.store.lookups == 1
+        assert {alert['card_name'] for alert in triggered} == {'Island', 'Lightning Bolt'}
@@ -0,0 +1,156 @@
+"""
+Tests for synergy finder.
+
+Tests card tags as bitsets, pairwise synergy reasons, looking each card up
+once per finder, suggestions, and tag bitsets (including keyword tags) built
+once per index version and loaded from the store afterwards.
+"""
+
+import sqlite3
+
+import pytest
+from app.utils.synergy_finder import SynergyFinder, SynergyTagStore
+
+
+CARDS = {
+    'altar': {'name': 'Ashnod\'s Altar', 'type_line': 'Artifact',
+              'oracle_text': 'Sacrifice a creature: Add {C}{C}.'},
+    'raise': {'name': 'Raise the Alarm', 'type_line': 'Instant',
+              'oracle_text': 'Create two 1/1 white Soldier creature tokens.'},
+    'elf': {'name': 'Elvish Visionary', 'type_line': 'Creature — Elf Shaman',
+            'oracle_text': 'When Elvish Visionary enters the battlefield, each player draws a card.'},
+    'archer': {'name': 'Elvish Archer', 'type_line': 'Creature — Elf Archer',
+               'oracle_text': 'First strike', 'keywords': ['First strike']},
+    'blade': {'name': 'Lifeblade', 'type_line': 'Artifact — Equipment',
+              'oracle_text': 'Equipped creature has lifelink.', 'keywords': ['Lifelink']},
+}
+
+
+@pytest.fixture
+def finder(fake_repository):
+    """Synergy finder over the fake repository."""
+    return SynergyFinder(fake_repository(CARDS))
+
+
+def index_rows(cards):
+    """Card index columns for card dictionaries by uuid."""
+    return {
+        uuid: {'name': card['name'], 'type_line': card['type_line'], 'oracle_text': card['oracle_text'],
+               'keywords': ', '.join(card.get('keywords', [])) or None}
+        for uuid, card in cards.items()
+    }
+
+
+class TestTags:
+    """Test tagging cards."""
+    
+    def test_card_tags(self, finder):
+        """Themes, produced resources, types and creature types are tagged."""
+        assert finder._get_card_tags(CARDS['altar']) == {
+            'sacrifice', 'sacrifice outlet', 'death trigger', 'artifact'}
+        assert finder._get_card_tags(CARDS['elf']) == {
+            'draw', 'card draw', 'creature', 'tribal:elf', 'tribal:shaman'}
+        assert 'lifegain' in finder._get_card_tags(CARDS['blade'])
+    
+    def test_card_objects(self, finder):
+        """Card objects from the real repository are read by attribute."""
+        class CardObject:
+            name, type_line, oracle_text, keywords = 'Bear', 'Creature — Bear', None, None
+        
+        assert finder._get_card_tags(CardObject()) == {'creature', 'tribal:bear'}
+
+
+class TestSynergies:
+    """Test pairwise synergies."""
+    
+    def test_reasons(self, finder):
+        """Shared themes, producer/consumer pairs and shared tribes are reported in order."""
+        altar, raise_alarm, elf, archer = (
+            finder._get_card_tags(CARDS[uuid]) for uuid in ('altar', 'raise', 'elf', 'archer'))
+        
+        assert finder._check_synergy(altar, raise_alarm) == ['sacrifice_synergy', 'tokens_synergy']
+        assert finder._check_synergy(raise_alarm, altar) == ['sacrifice_synergy', 'tokens_synergy']
+        assert finder._check_synergy(elf, archer) == ['tribal:elf']
+        assert finder._check_synergy(altar, elf) == []
+    
+    def test_analyze_deck_synergies(self, finder):
+        """Every pair is checked and each card is looked up once."""
+        deck = [(uuid, 1) for uuid in CARDS] + [('missing', 1)]
+        
+        analysis = finder.analyze_deck_synergies(deck)
+        finder.analyze_deck_synergies(deck)
+        
+        assert finder.repository.lookups == len(CARDS) + 2
+        assert analysis['total_synergies'] == 2
+        assert analysis['themes'] == {'sacrifice_synergy': 1, 'tokens_synergy': 1, 'tribal:elf': 1}
+        assert {'card1': 'Elvish Visionary', 'card2': 'Elvish Archer',
+                'reasons': ['tribal:elf']} in analysis['synergy_pairs']
+    
+    def test_find_and_suggest(self, finder):
+        """Synergies with one card and suggestions from a pool use the same reasons."""
+        synergies = finder.find_synergies_with_card('altar', list(CARDS))
+        suggestions = finder.suggest_cards_for_deck(['altar'], ['raise', 'elf', 'altar'])
+        
+        assert [s['uuid'] for s in synergies] == ['raise']
+        assert synergies[0]['strength'] == 2
+        assert [s['uuid'] for s in suggestions] == ['raise']
+        assert suggestions[0]['card'] is CARDS['raise']
+        assert sorted(suggestions[0]['reasons']) == ['sacrifice_synergy', 'tokens_synergy']
+
+
+class TestTagIndex:
+    """Test tag bitsets stored per index version."""
+    
+    def test_build_then_load(self, finder, tmp_path, fake_repository, make_card_index):
+        """Tags are built once per index version and then only loaded."""
+        cards = dict(CARDS)
+        # Enough creature types to push bitsets past 64 bits
+        for i in range(80):
+            cards[f'token-{i}'] = {'name': f'Token {i}', 'type_line': f'Creature — Kind{i}',
+                                   'oracle_text': ''}
+        db_path = make_card_index(index_rows(cards))
+        store = SynergyTagStore(tmp_path / "tags.sqlite")
+        
+        assert finder.build_tag_index(db_path, store, "v1") == len(cards)
+        assert store.versions() == [finder.tag_version("v1")]
+        expected = finder.analyze_deck_synergies([(uuid, 1) for uuid in cards])
+        
+        fresh = SynergyFinder(fake_repository({}))
+        assert fresh.build_tag_index(db_path, store, "v1") == len(cards)
+        assert fresh.card_tag_bits('token-79') == finder.card_tag_bits('token-79')
+        assert fresh.card_tag_bits('token-79')[1] >= 1 << 64
+        assert fresh.analyze_deck_synergies([(uuid, 1) for uuid in cards]) == expected
+        assert fresh.repository.lookups == 0
+        
+        fresh.build_tag_index(db_path, store, "v2")
+        assert store.versions() == [fresh.tag_version("v2")]
+        store.close()
+    
+    def test_index_keywords(self, finder, fake_repository, make_card_index):
+        """Keywords in the index are tagged as they are for repository cards."""
+        cards = {'vampire': {'name': 'Vampire Nighthawk', 'type_line': 'Creature — Vampire',
+                             'oracle_text': '', 'keywords': ['Flying', 'Lifelink']}}
+        expected = set(finder.bit_names(finder._card_tag_bits(cards['vampire'])))
+        assert 'lifegain' in expected
+        
+        for keywords in (True, False):
+            db_path = make_card_index(index_rows(cards), name=f"index-{keywords}.sqlite")
+            if not keywords:
+                connection = sqlite3.connect(str(db_path))
+                connection.execute("ALTER TABLE cards DROP COLUMN keywords")
+                connection.commit()
+                connection.close()
+            fresh = SynergyFinder(fake_repository({}))
+            fresh.build_tag_index(db_path, SynergyTagStore(), "v1")
+            tags = set(fresh.bit_names(fresh.card_tag_bits('vampire')[1]))
+            
+            # Indexes built before the keywords column only see the rules text
+            assert tags == (expected if keywords else expected - {'lifegain'})
+    
+    def test_pattern_version(self, finder, fake_repository):
+        """Editing the patterns changes the version tags are stored under."""
+        edited = SynergyFinder(fake_repository(CARDS))
+        edited.synergy_patterns['draw']['keywords'].append('scry')
+        
+        assert edited.tag_version("v1") != finder.tag_version("v1")
+        assert SynergyFinder(None).tag_version("v1") == finder.tag_version("v1")